@@ -0,0 +1,88 @@
+"""Add NRS submission outbox
+
+Revision ID: 20261018_1000
+Revises: fx_revaluation_001
+Create Date: 2026-10-18 10:00:00.000000
+
+Adds the nrs_outbox table written alongside invoice finalization and
+drained by the NRS dispatcher (SELECT ... FOR UPDATE SKIP LOCKED on the
+partial index of due PENDING rows). Invoices already waiting for an IRN
+are backfilled so the dispatcher picks them up.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1000'
+down_revision: Union[str, None] = 'fx_revaluation_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    outbox_status = postgresql.ENUM(
+        'PENDING', 'DELIVERED', 'FAILED',
+        name='nrsoutboxstatus',
+        create_type=False
+    )
+    outbox_status.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'nrs_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('invoice_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('invoices.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('business_entities.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('requested_by_id', postgresql.UUID(as_uuid=True), nullable=True),
+
+        # Delivery state
+        sa.Column('status', outbox_status, nullable=False, server_default='PENDING'),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default=sa.text('0')),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('last_error', sa.Text, nullable=True),
+
+        # Result
+        sa.Column('nrs_irn', sa.String(100), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+    op.create_index('ix_nrs_outbox_entity_id', 'nrs_outbox', ['entity_id'])
+
+    # Dispatchers only scan due PENDING rows
+    op.create_index(
+        'ix_nrs_outbox_due',
+        'nrs_outbox',
+        ['next_attempt_at'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        'uq_nrs_outbox_pending_invoice',
+        'nrs_outbox',
+        ['invoice_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+    # Invoices finalized before the outbox existed
+    op.execute("""
+        INSERT INTO nrs_outbox (invoice_id, entity_id, requested_by_id)
+        SELECT id, entity_id, updated_by_id
+        FROM invoices
+        WHERE status = 'PENDING' AND nrs_irn IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_nrs_outbox_pending_invoice', table_name='nrs_outbox')
+    op.drop_index('ix_nrs_outbox_due', table_name='nrs_outbox')
+    op.drop_index('ix_nrs_outbox_entity_id', table_name='nrs_outbox')
+    op.drop_table('nrs_outbox')
+    op.execute("DROP TYPE IF EXISTS nrsoutboxstatus")
@@ -0,0 +1,47 @@
+"""Add TIN verification cache table
+
+Revision ID: 20261018_1100
+Revises: 20261018_1000
+Create Date: 2026-10-18 11:00:00.000000
+
+Stores the last registry answer per (source, TIN) so repeated TIN checks
+are served locally while fresh (see app/services/tin_verification_cache.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1100'
+down_revision: Union[str, None] = '20261018_1000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tin_verifications',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('source', sa.String(20), nullable=False),
+        sa.Column('tin', sa.String(20), nullable=False),
+
+        # Registry answer
+        sa.Column('is_valid', sa.Boolean, nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('registered_name', sa.String(255), nullable=True),
+        sa.Column('details', postgresql.JSONB, nullable=True),
+        sa.Column('checked_at', sa.DateTime(timezone=True), nullable=False),
+
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+
+        # Lookups and upserts go through (source, tin)
+        sa.UniqueConstraint('source', 'tin', name='uq_tin_verifications_source_tin'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tin_verifications')
@@ -0,0 +1,117 @@
+"""Add entity daily summary rollup table
+
+Revision ID: 20261018_1200
+Revises: 20261018_1100
+Create Date: 2026-10-18 12:00:00.000000
+
+Per-entity, per-day totals of transactions (by transaction date) and
+invoices (by due date) read by the organization dashboard, kept current on
+every flush (see app/services/dashboard_rollup_service.py). Existing data
+is backfilled here.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1200'
+down_revision: Union[str, None] = '20261018_1100'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNT_COLUMNS = (
+    'income_count', 'expense_count', 'unverified_expense_count', 'pending_wren_count',
+    'invoice_count', 'invoices_draft', 'invoices_pending', 'invoices_submitted',
+    'invoices_accepted', 'invoices_rejected', 'invoices_disputed', 'invoices_cancelled',
+    'invoices_paid', 'invoices_partially_paid',
+)
+AMOUNT_COLUMNS = (
+    'income_amount', 'output_vat', 'expense_amount', 'input_vat', 'wht_deducted',
+    'pending_wren_amount', 'draft_invoice_amount', 'unpaid_invoice_amount',
+)
+
+BACKFILL = """
+INSERT INTO entity_daily_summaries (
+    entity_id, day, income_count, income_amount, output_vat, expense_count, expense_amount,
+    input_vat, wht_deducted, unverified_expense_count, pending_wren_count, pending_wren_amount,
+    invoice_count, invoices_draft, invoices_pending, invoices_submitted, invoices_accepted,
+    invoices_rejected, invoices_disputed, invoices_cancelled, invoices_paid,
+    invoices_partially_paid, draft_invoice_amount, unpaid_invoice_amount
+)
+SELECT entity_id, day, sum(income_count), sum(income_amount), sum(output_vat), sum(expense_count),
+       sum(expense_amount), sum(input_vat), sum(wht_deducted), sum(unverified_expense_count),
+       sum(pending_wren_count), sum(pending_wren_amount), sum(invoice_count), sum(invoices_draft),
+       sum(invoices_pending), sum(invoices_submitted), sum(invoices_accepted), sum(invoices_rejected),
+       sum(invoices_disputed), sum(invoices_cancelled), sum(invoices_paid),
+       sum(invoices_partially_paid), sum(draft_invoice_amount), sum(unpaid_invoice_amount)
+FROM (
+    SELECT entity_id, transaction_date AS day,
+           count(*) FILTER (WHERE transaction_type = 'INCOME') AS income_count,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = 'INCOME'), 0) AS income_amount,
+           coalesce(sum(vat_amount) FILTER (WHERE transaction_type = 'INCOME'), 0) AS output_vat,
+           count(*) FILTER (WHERE transaction_type = 'EXPENSE') AS expense_count,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = 'EXPENSE'), 0) AS expense_amount,
+           coalesce(sum(vat_amount) FILTER (WHERE transaction_type = 'EXPENSE'), 0) AS input_vat,
+           coalesce(sum(wht_amount) FILTER (WHERE transaction_type = 'EXPENSE'), 0) AS wht_deducted,
+           count(*) FILTER (WHERE transaction_type = 'EXPENSE' AND wren_verified_by_id IS NULL)
+               AS unverified_expense_count,
+           count(*) FILTER (WHERE transaction_type = 'EXPENSE'
+                            AND (category_id IS NULL OR wren_verified_by_id IS NULL)) AS pending_wren_count,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = 'EXPENSE'
+                                        AND (category_id IS NULL OR wren_verified_by_id IS NULL)), 0)
+               AS pending_wren_amount,
+           0 AS invoice_count, 0 AS invoices_draft, 0 AS invoices_pending, 0 AS invoices_submitted,
+           0 AS invoices_accepted, 0 AS invoices_rejected, 0 AS invoices_disputed, 0 AS invoices_cancelled,
+           0 AS invoices_paid, 0 AS invoices_partially_paid, 0 AS draft_invoice_amount,
+           0 AS unpaid_invoice_amount
+    FROM transactions
+    GROUP BY entity_id, transaction_date
+    UNION ALL
+    SELECT entity_id, due_date AS day,
+           0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+           count(*),
+           count(*) FILTER (WHERE status = 'DRAFT'),
+           count(*) FILTER (WHERE status = 'PENDING'),
+           count(*) FILTER (WHERE status = 'SUBMITTED'),
+           count(*) FILTER (WHERE status = 'ACCEPTED'),
+           count(*) FILTER (WHERE status = 'REJECTED'),
+           count(*) FILTER (WHERE status = 'DISPUTED'),
+           count(*) FILTER (WHERE status = 'CANCELLED'),
+           count(*) FILTER (WHERE status = 'PAID'),
+           count(*) FILTER (WHERE status = 'PARTIALLY_PAID'),
+           coalesce(sum(total_amount) FILTER (WHERE status = 'DRAFT'), 0),
+           coalesce(sum(total_amount) FILTER (WHERE status IN ('PENDING', 'SUBMITTED')), 0)
+    FROM invoices
+    GROUP BY entity_id, due_date
+) AS sources
+GROUP BY entity_id, day
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entity_daily_summaries',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('business_entities.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day', sa.Date, nullable=False),
+
+        # Transaction and invoice totals (all additive)
+        *[sa.Column(name, sa.Integer, nullable=False, server_default='0') for name in COUNT_COLUMNS],
+        *[sa.Column(name, sa.Numeric(18, 2), nullable=False, server_default='0') for name in AMOUNT_COLUMNS],
+
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+
+        # Upserts and dashboard range scans go through (entity_id, day)
+        sa.UniqueConstraint('entity_id', 'day', name='uq_entity_daily_summaries_entity_day'),
+    )
+
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_table('entity_daily_summaries')
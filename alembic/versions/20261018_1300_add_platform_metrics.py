@@ -0,0 +1,45 @@
+"""Add platform metrics counter table
+
+Revision ID: 20261018_1300
+Revises: 20261018_1200
+Create Date: 2026-10-18 13:00:00.000000
+
+Sharded platform-wide counters read by the staff dashboards, adjusted on
+every flush and recounted by the refresh-platform-metrics task (see
+app/services/platform_metrics_service.py). The table starts empty and is
+filled by the first refresh; until then dashboards show zeros with no
+refresh time.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1300'
+down_revision: Union[str, None] = '20261018_1200'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'platform_metrics',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('metric', sa.String(100), nullable=False),
+        sa.Column('shard', sa.SmallInteger, nullable=False, server_default='0'),
+        sa.Column('value', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+
+        # Increments upsert on (metric, shard)
+        sa.UniqueConstraint('metric', 'shard', name='uq_platform_metrics_metric_shard'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('platform_metrics')
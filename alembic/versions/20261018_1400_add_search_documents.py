@@ -0,0 +1,73 @@
+"""Add search documents for global search
+
+Revision ID: 20261018_1400
+Revises: 20261018_1300
+Create Date: 2026-10-18 14:00:00.000000
+
+One row per transaction, invoice, customer, vendor and inventory item,
+with a generated tsvector and trigram-indexed text, written on every flush
+(see app/services/search_index_service.py). Enables pg_trgm and btree_gin;
+btree_gin lets entity_id lead the GIN indexes so one index serves the
+tenant filter and the match.
+
+Existing rows are indexed by the backfill task after upgrading:
+    celery call app.tasks.celery_tasks.rebuild_search_index_task
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1400'
+down_revision: Union[str, None] = '20261018_1300'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+
+    op.create_table(
+        'search_documents',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('business_entities.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('resource_type', sa.String(30), nullable=False),
+        sa.Column('resource_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('title', sa.String(500), nullable=False),
+        sa.Column('subtitle', sa.String(500), nullable=True),
+        sa.Column('search_text', sa.Text, nullable=False),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR,
+            sa.Computed(
+                "setweight(to_tsvector('simple', lower(title)), 'A') || "
+                "setweight(to_tsvector('simple', search_text), 'B')",
+                persisted=True,
+            ),
+        ),
+
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+
+        # Flush upserts and deletes go through (resource_type, resource_id)
+        sa.UniqueConstraint('resource_type', 'resource_id', name='uq_search_documents_resource'),
+    )
+    op.create_index(
+        'ix_search_documents_entity_vector', 'search_documents', ['entity_id', 'search_vector'],
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_search_documents_entity_trgm', 'search_documents', ['entity_id', 'search_text'],
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_search_documents_entity_trgm', table_name='search_documents')
+    op.drop_index('ix_search_documents_entity_vector', table_name='search_documents')
+    op.drop_table('search_documents')
@@ -0,0 +1,63 @@
+"""Add bulk import jobs
+
+Revision ID: 20261018_1500
+Revises: 20261018_1400
+Create Date: 2026-10-18 15:00:00.000000
+
+Tracks background CSV imports, which commit chunk by chunk together with
+their progress so a retried job resumes where it stopped (see
+app/services/bulk_import_service.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1500'
+down_revision: Union[str, None] = '20261018_1400'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'bulk_import_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('business_entities.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('created_by_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('import_type', sa.String(20), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='bulkimportstatus'),
+            nullable=False,
+        ),
+
+        # Upload
+        sa.Column('file_id', sa.String(500), nullable=False),
+        sa.Column('filename', sa.String(255), nullable=False),
+        sa.Column('options', postgresql.JSONB, nullable=True),
+
+        # Progress
+        sa.Column('rows_processed', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('successful', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('failed', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('tins_checked', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('errors', postgresql.JSONB, nullable=True),
+        sa.Column('tin_warnings', postgresql.JSONB, nullable=True),
+        sa.Column('error_message', sa.Text, nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_bulk_import_jobs_entity_id', 'bulk_import_jobs', ['entity_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bulk_import_jobs_entity_id', table_name='bulk_import_jobs')
+    op.drop_table('bulk_import_jobs')
+    op.execute('DROP TYPE IF EXISTS bulkimportstatus')
@@ -0,0 +1,69 @@
+"""Add keyset pagination indexes
+
+Revision ID: 20261018_1600
+Revises: 20261018_1500
+Create Date: 2026-10-18 16:00:00.000000
+
+Composite indexes matching the sort keys of the main list endpoints, so a
+cursor page (WHERE owner = ? AND (key...) < (cursor...) ORDER BY key...
+DESC LIMIT n) is one backward range scan however deep it is (see
+keyset_paginate in app/utils/query_optimization.py):
+- Transactions by entity: (transaction_date, id)
+- Invoices by entity: (invoice_date, created_at, id)
+- Audit logs by entity: (created_at, id)
+- Notifications by user: (created_at, id)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1600'
+down_revision: Union[str, None] = '20261018_1500'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add keyset pagination indexes."""
+
+    op.create_index(
+        'ix_transactions_entity_date_id',
+        'transactions',
+        ['entity_id', 'transaction_date', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_index(
+        'ix_invoices_entity_date_created_id',
+        'invoices',
+        ['entity_id', 'invoice_date', 'created_at', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_index(
+        'ix_audit_logs_entity_created_id',
+        'audit_logs',
+        ['entity_id', 'created_at', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+    op.create_index(
+        'ix_notifications_user_created_id',
+        'notifications',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Remove keyset pagination indexes."""
+    op.drop_index('ix_notifications_user_created_id', table_name='notifications', if_exists=True)
+    op.drop_index('ix_audit_logs_entity_created_id', table_name='audit_logs', if_exists=True)
+    op.drop_index('ix_invoices_entity_date_created_id', table_name='invoices', if_exists=True)
+    op.drop_index('ix_transactions_entity_date_id', table_name='transactions', if_exists=True)
@@ -0,0 +1,62 @@
+"""Add entity backup jobs
+
+Revision ID: 20261018_1700
+Revises: 20261018_1600
+Create Date: 2026-10-18 17:00:00.000000
+
+Tracks background full-entity backups (archive kept in file storage) and
+restores of such archives (see app/services/entity_backup_service.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_1700'
+down_revision: Union[str, None] = '20261018_1600'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'entity_backup_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('business_entities.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('created_by_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column(
+            'operation',
+            sa.Enum('BACKUP', 'RESTORE', name='entitybackupoperation'),
+            nullable=False,
+        ),
+        sa.Column(
+            'status',
+            sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='entitybackupstatus'),
+            nullable=False,
+        ),
+        sa.Column('include_audit', sa.Boolean, nullable=False, server_default=sa.true()),
+
+        # Archive
+        sa.Column('file_id', sa.String(500), nullable=True),
+        sa.Column('filename', sa.String(255), nullable=True),
+        sa.Column('size_bytes', sa.BigInteger, nullable=True),
+        sa.Column('manifest', postgresql.JSONB, nullable=True),
+        sa.Column('row_count', sa.BigInteger, nullable=True),
+        sa.Column('error_message', sa.Text, nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+
+        # Timestamps
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_entity_backup_jobs_entity_id', 'entity_backup_jobs', ['entity_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entity_backup_jobs_entity_id', table_name='entity_backup_jobs')
+    op.drop_table('entity_backup_jobs')
+    op.execute('DROP TYPE IF EXISTS entitybackupstatus')
+    op.execute('DROP TYPE IF EXISTS entitybackupoperation')
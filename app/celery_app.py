@@ -19,7 +19,7 @@ celery_app = Celery(
     'tekvwarho_proaudit',
     broker=redis_url,
     backend=redis_url,
-    include=['app.tasks.celery_tasks'],
+    include=['app.tasks.celery_tasks', 'app.tasks.fanout'],
 )
 
 # Celery configuration
@@ -84,10 +84,11 @@ celery_app.conf.update(
             'schedule': crontab(day_of_month=8, hour=9, minute=0),
         },
         
-        # Retry failed NRS submissions every hour
-        'retry-nrs-submissions': {
-            'task': 'app.tasks.celery_tasks.retry_failed_nrs_submissions_task',
-            'schedule': crontab(minute=0),  # Every hour
+        # Drain the NRS submission outbox every minute (finalizing an
+        # invoice also wakes a dispatcher immediately)
+        'dispatch-nrs-outbox': {
+            'task': 'app.tasks.celery_tasks.nrs_dispatch_outbox_task',
+            'schedule': crontab(),  # Every minute
         },
         
         # Clean up old notifications weekly
@@ -108,6 +109,18 @@ celery_app.conf.update(
             'schedule': crontab(day_of_month=1, hour=6, minute=0),  # 1st of month 6 AM
         },
         
+        # Rebuild recent dashboard rollups from source tables nightly
+        'repair-dashboard-rollups': {
+            'task': 'app.tasks.celery_tasks.repair_dashboard_rollups_task',
+            'schedule': crontab(hour=1, minute=30),
+        },
+        
+        # Recount staff dashboard platform metrics every 15 minutes
+        'refresh-platform-metrics': {
+            'task': 'app.tasks.celery_tasks.refresh_platform_metrics_task',
+            'schedule': crontab(minute='*/15'),
+        },
+
         # ===========================================
         # BILLING & SUBSCRIPTION TASKS
         # ===========================================
@@ -173,6 +186,12 @@ celery_app.conf.update(
 )
 
 
+# One persistent event loop + DB pool per worker process (see worker_runtime)
+from app.tasks.worker_runtime import install_worker_signals
+
+install_worker_signals()
+
+
 # Task routing (optional - for scaling specific task types)
 celery_app.conf.task_routes = {
     'app.tasks.celery_tasks.send_email_*': {'queue': 'email'},
@@ -185,5 +204,7 @@ celery_app.conf.task_routes = {
     'app.tasks.celery_tasks.auto_resume_paused_*': {'queue': 'billing'},
     'app.tasks.celery_tasks.update_exchange_*': {'queue': 'billing'},
     'app.tasks.celery_tasks.process_scheduled_usage_*': {'queue': 'billing'},
+    # Model training is long and CPU-bound; keep it off the default workers
+    'app.tasks.celery_tasks.train_ml_*': {'queue': 'ml'},
     'app.tasks.celery_tasks.*': {'queue': 'default'},
 }
@@ -64,6 +64,103 @@ class Settings(BaseSettings):
     # ===========================================
     redis_url: str = "redis://localhost:6379/0"
     
+    # Celery worker database pool (one engine per worker process)
+    celery_db_pool_size: int = 5
+    celery_db_max_overflow: int = 5
+    celery_db_pool_recycle_seconds: int = 1800
+    
+    # Sharded periodic jobs: ids per subtask and how long shard results are kept
+    celery_shard_size: int = 200
+    celery_shard_result_ttl_seconds: int = 172800
+    
+    # ===========================================
+    # COMPUTE POOL (see app/services/compute_pool.py)
+    # CPU-bound work runs off the event loop: a process pool for GIL-bound
+    # Python (ReportLab, model training), a thread pool for GIL-releasing
+    # libraries (PIL, hashlib). 0 process workers routes everything to threads.
+    # ===========================================
+    compute_process_workers: int = 2
+    compute_process_start_method: str = "spawn"
+    compute_thread_workers: int = 4
+    compute_queue_limit: int = 32  # Waiting jobs per kind before 503
+    compute_render_concurrency: int = 2
+    compute_render_timeout_seconds: float = 120.0
+    compute_ml_concurrency: int = 1
+    compute_ml_timeout_seconds: float = 600.0
+    compute_image_concurrency: int = 4
+    compute_image_timeout_seconds: float = 60.0
+    compute_hash_concurrency: int = 4
+    compute_hash_timeout_seconds: float = 60.0
+
+    # ===========================================
+    # ML TRAINING JOBS & MODEL REGISTRY (see app/services/ml_model_registry.py)
+    # Training runs as a Celery job on the "ml" queue; weights are stored as
+    # .npz artifacts and memory-mapped by inference processes.
+    # ===========================================
+    ml_training_time_limit_seconds: int = 3600
+    ml_training_progress_interval_seconds: float = 2.0
+    ml_model_refresh_seconds: float = 30.0  # How often a process re-checks the active version
+    ml_model_cache_dir: str = "./ml_models/cache"  # Downloaded artifacts (remote storage only)
+
+    # ===========================================
+    # OCR PIPELINE (see app/services/advanced_ocr_service.py)
+    # Provider calls are bounded per process; multi-page PDFs/TIFFs are split
+    # into pages processed in parallel; results are cached by content hash.
+    # ===========================================
+    ocr_provider_concurrency: int = 4  # Concurrent Azure/Tesseract calls
+    ocr_max_split_pages: int = 50  # Longer documents are sent unsplit
+    ocr_result_cache_size: int = 512  # In-process ExtractedDocument LRU
+    ocr_result_cache_ttl_seconds: int = 604800  # Shared Redis copy, 7 days
+
+    # ===========================================
+    # WEBSOCKET DELIVERY
+    # Each connection has a bounded send queue drained by its own writer task.
+    # Policy when a slow client's queue is full: drop_oldest | coalesce | disconnect
+    # ===========================================
+    ws_send_queue_size: int = 256
+    ws_slow_consumer_policy: str = "drop_oldest"
+    ws_send_timeout_seconds: float = 10.0
+
+    # ===========================================
+    # DASHBOARD ROLLUPS (see app/services/dashboard_rollup_service.py)
+    # Widgets read a per-entity daily summary; widgets that still query their
+    # own tables run concurrently, each on its own pooled connection.
+    # ===========================================
+    dashboard_widget_concurrency: int = 4  # Connections one dashboard request may hold
+    dashboard_rollup_repair_days: int = 35  # Days rebuilt from source tables nightly
+
+    # ===========================================
+    # PLATFORM METRICS (see app/services/platform_metrics_service.py)
+    # Staff dashboards read materialized counters; a periodic task recounts
+    # them and corrects drift. Writers spread increments over shard rows.
+    # ===========================================
+    platform_metric_shards: int = 8  # Rows each counter is spread over for concurrent writers
+
+    # ===========================================
+    # GLOBAL SEARCH (see app/services/search_index_service.py)
+    # One ranked query over search_documents (pg_trgm + tsvector GIN indexes)
+    # ===========================================
+    search_candidate_limit: int = 2000  # Matches ranked per query; bounds broad terms
+    search_backfill_batch_size: int = 1000  # Source rows per rebuild batch
+
+    # ===========================================
+    # BULK IMPORT (see app/services/bulk_import_service.py)
+    # CSV rows are validated per chunk, COPY'd into staging and merged with
+    # one INSERT ... SELECT; large files run as resumable background jobs.
+    # ===========================================
+    bulk_import_chunk_rows: int = 5000  # Rows validated, copied and merged per chunk
+    bulk_import_inline_max_bytes: int = 2_000_000  # Larger uploads become background jobs
+    bulk_import_max_errors: int = 1000  # Row errors kept per job (counts stay exact)
+
+    # ===========================================
+    # ENTITY BACKUP (see app/services/entity_backup_service.py)
+    # Zip of per-table NDJSON parts streamed from server-side cursors, with a
+    # manifest of row counts and SHA-256 digests; restore is one transaction.
+    # ===========================================
+    backup_part_rows: int = 100_000  # Rows per NDJSON part in the archive
+    backup_fetch_rows: int = 2000  # Rows fetched per round trip from the cursor
+    backup_restore_batch_rows: int = 1000  # Rows per INSERT batch on restore
+
     # ===========================================
     # NRS/FIRS E-INVOICING API (Federal Inland Revenue Service)
     # Development: https://api-dev.i-fis.com
@@ -79,6 +176,29 @@ class Settings(BaseSettings):
     nrs_tin_api_url: str = "https://api.taxid.nrs.gov.ng"
     nrs_tin_api_key: str = ""  # May use same key as main NRS API
     
+    # NRS client pooling and rate control (see app/services/nrs_service.py)
+    nrs_http2: bool = False  # Requires the optional h2 package
+    nrs_max_connections: int = 20  # Pooled connections per environment
+    nrs_keepalive_seconds: float = 30.0
+    nrs_timeout_seconds: float = 30.0
+    nrs_bulk_concurrency: int = 10  # In-flight requests in bulk operations
+    nrs_rate_limit_per_second: float = 20.0  # Ceiling; lowered on 429/5xx, recovers on success
+    nrs_rate_burst: int = 10
+    nrs_max_retries: int = 3  # Retries after 429/503, honouring Retry-After
+    
+    # NRS submission outbox (see app/services/nrs_outbox_service.py)
+    nrs_outbox_batch_size: int = 50  # Rows claimed per dispatcher pass
+    nrs_outbox_max_attempts: int = 8
+    nrs_outbox_backoff_base_seconds: float = 30.0  # Doubles per attempt, with full jitter
+    nrs_outbox_backoff_max_seconds: float = 3600.0
+    nrs_outbox_lease_seconds: int = 300  # Claimed rows become claimable again if a dispatcher dies
+    nrs_outbox_drain_seconds: float = 60.0  # Time budget of one dispatcher task
+    
+    # TIN verification cache (see app/services/tin_verification_cache.py)
+    tin_cache_valid_ttl_hours: int = 720  # Registered TINs are re-checked monthly
+    tin_cache_invalid_ttl_hours: int = 24  # Negative cache; new registrations show up within a day
+    tin_cache_local_entries: int = 20000  # In-process LRU per registry
+    
     @property
     def nrs_active_url(self) -> str:
         """Get the active NRS API URL based on sandbox mode."""
@@ -205,6 +325,12 @@ class Settings(BaseSettings):
     mail_from: str = ""
     mail_from_name: str = "TekVwarho ProAudit"
     
+    # Mail transport pooling (see app/services/mail_transport.py)
+    mail_pool_size: int = 4  # Max concurrent SMTP sessions per process
+    mail_pool_max_idle_seconds: float = 60.0  # Recycle idle SMTP/HTTP connections
+    mail_timeout_seconds: float = 30.0
+    mail_batch_concurrency: int = 10  # Concurrent HTTP provider requests in a batch
+    
     # Support & Billing emails
     support_email: str = "support@tekvwarho.com"
     billing_email: str = "billing@tekvwarho.com"
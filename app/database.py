@@ -6,7 +6,7 @@ This module handles database connection setup using SQLAlchemy 2.0 async.
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
+from sqlalchemy import Connection, MetaData, text
 
 from app.config import settings
 
@@ -26,6 +26,17 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=convention)
 
 
+# Postgres extensions the models need (search_documents GIN indexes).
+# Alembic migrations create them too; create_all paths call create_extensions.
+REQUIRED_EXTENSIONS = ("pg_trgm", "btree_gin")
+
+
+def create_extensions(connection: Connection) -> None:
+    """Create REQUIRED_EXTENSIONS on a sync connection, before create_all."""
+    for extension in REQUIRED_EXTENSIONS:
+        connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+
+
 # Create async engine - use the property that auto-derives async URL
 engine = create_async_engine(
     settings.async_database_url,
@@ -71,6 +82,7 @@ async def init_db():
     For production, use Alembic migrations.
     """
     async with engine.begin() as conn:
+        await conn.run_sync(create_extensions)
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -39,9 +39,16 @@ from app.models.sku import (
 from app.models.entity import BusinessEntity
 from app.models.category import Category, CategoryType
 from app.models.vendor import Vendor
+from app.models.tin_verification import TINVerification
 from app.models.customer import Customer
 from app.models.transaction import Transaction, TransactionType
 from app.models.invoice import Invoice, InvoiceLineItem, InvoiceStatus
+from app.models.nrs_outbox import NRSOutbox, NRSOutboxStatus
+from app.models.entity_daily_summary import EntityDailySummary
+from app.models.platform_metric import PlatformMetric
+from app.models.search_document import SearchDocument
+from app.models.bulk_import_job import BulkImportJob, BulkImportStatus
+from app.models.entity_backup_job import EntityBackupJob, EntityBackupOperation, EntityBackupStatus
 from app.models.inventory import InventoryItem, StockMovement, StockWriteOff
 from app.models.tax import VATRecord, PAYERecord, TaxPeriod
 # Consolidated Audit System - all audit models in one file
@@ -271,6 +278,7 @@ __all__ = [
     "CategoryType",
     # Vendor
     "Vendor",
+    "TINVerification",
     # Customer
     "Customer",
     # Transaction
@@ -280,6 +288,16 @@ __all__ = [
     "Invoice",
     "InvoiceLineItem",
     "InvoiceStatus",
+    "NRSOutbox",
+    "NRSOutboxStatus",
+    "EntityDailySummary",
+    "PlatformMetric",
+    "SearchDocument",
+    "BulkImportJob",
+    "BulkImportStatus",
+    "EntityBackupJob",
+    "EntityBackupOperation",
+    "EntityBackupStatus",
     # Inventory
     "InventoryItem",
     "StockMovement",
@@ -0,0 +1,95 @@
+"""
+TekVwarho ProAudit - Bulk Import Job Model
+
+Background CSV imports of transactions, vendors, customers and inventory
+items.
+
+The upload is kept in file storage while the job runs. Each chunk of rows
+is committed together with the job's progress, so a job that is retried
+after a worker died resumes after the last committed row instead of
+importing the file again. See app/services/bulk_import_service.py.
+"""
+
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class BulkImportStatus(str, Enum):
+    """Import job lifecycle."""
+    QUEUED = "queued"         # Waiting for a worker
+    RUNNING = "running"       # Importing chunks
+    COMPLETED = "completed"   # Every row imported or reported
+    FAILED = "failed"         # Stopped; committed chunks are kept
+
+
+class BulkImportJob(BaseModel):
+    """
+    One background import of an uploaded CSV file.
+
+    rows_processed counts the data rows (valid or not) of every committed
+    chunk and is where a resumed job continues. errors and tin_warnings
+    keep the first settings.bulk_import_max_errors entries; failed and
+    tins_checked are exact.
+    """
+
+    __tablename__ = "bulk_import_jobs"
+
+    entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("business_entities.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_by_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    import_type: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="transactions, vendors, customers or inventory",
+    )
+    status: Mapped[BulkImportStatus] = mapped_column(
+        SQLEnum(BulkImportStatus),
+        default=BulkImportStatus.QUEUED,
+        nullable=False,
+    )
+
+    # Upload
+    file_id: Mapped[str] = mapped_column(String(500), nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    options: Mapped[Optional[dict]] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="skip_errors, validate_tins",
+    )
+
+    # Progress
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    successful: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tins_checked: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    errors: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
+    tin_warnings: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<BulkImportJob({self.import_type}, status={self.status}, rows={self.rows_processed})>"
@@ -0,0 +1,90 @@
+"""
+TekVwarho ProAudit - Entity Backup Job Model
+
+Background full-entity backups (NDPA data portability, auditor handover)
+and restores of such a backup into an entity, e.g. when migrating an
+entity between environments.
+
+A backup job writes its archive to file storage and keeps it there for
+download; a restore job reads the uploaded archive and deletes it when
+done. See app/services/entity_backup_service.py.
+"""
+
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, String, Text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class EntityBackupOperation(str, Enum):
+    """What a job does."""
+    BACKUP = "backup"     # Export the entity to an archive
+    RESTORE = "restore"   # Load an archive into the entity
+
+
+class EntityBackupStatus(str, Enum):
+    """Backup job lifecycle."""
+    QUEUED = "queued"         # Waiting for a worker
+    RUNNING = "running"       # Writing or loading the archive
+    COMPLETED = "completed"   # Archive written / fully restored
+    FAILED = "failed"         # Stopped; a failed restore leaves nothing behind
+
+
+class EntityBackupJob(BaseModel):
+    """
+    One backup or restore of a business entity's data.
+
+    manifest holds the archive's manifest (tables, row counts, part
+    digests) once a backup is written or a restore has verified it;
+    row_count is the total over its tables.
+    """
+
+    __tablename__ = "entity_backup_jobs"
+
+    entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("business_entities.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_by_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    operation: Mapped[EntityBackupOperation] = mapped_column(
+        SQLEnum(EntityBackupOperation),
+        nullable=False,
+    )
+    status: Mapped[EntityBackupStatus] = mapped_column(
+        SQLEnum(EntityBackupStatus),
+        default=EntityBackupStatus.QUEUED,
+        nullable=False,
+    )
+    include_audit: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+    # Archive
+    file_id: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    filename: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    manifest: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    row_count: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<EntityBackupJob({self.operation}, status={self.status}, rows={self.row_count})>"
@@ -0,0 +1,108 @@
+"""
+TekVwarho ProAudit - Entity Daily Summary Model
+
+Per-entity, per-day rollup of transactions and invoices for dashboards.
+
+Rows are maintained incrementally whenever transactions or invoices are
+flushed, and can be rebuilt from the source tables for any date range. See
+app/services/dashboard_rollup_service.py.
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Integer, Numeric, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class EntityDailySummary(BaseModel):
+    """
+    One day of activity for one business entity.
+    
+    Transaction columns are bucketed by transaction date. Invoice columns
+    are bucketed by due date, so "overdue" is a range predicate over the
+    same rows. Every column is additive: a posting adds its amounts, an
+    edit adds the difference, a deletion subtracts.
+    """
+    
+    __tablename__ = "entity_daily_summaries"
+    
+    entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("business_entities.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    
+    # ===========================================
+    # TRANSACTIONS (by transaction date)
+    # ===========================================
+    
+    income_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    income_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), default=Decimal("0.00"), nullable=False)
+    output_vat: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2),
+        default=Decimal("0.00"),
+        nullable=False,
+        comment="VAT on income transactions",
+    )
+    expense_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    expense_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), default=Decimal("0.00"), nullable=False)
+    input_vat: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2),
+        default=Decimal("0.00"),
+        nullable=False,
+        comment="VAT on expense transactions",
+    )
+    wht_deducted: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2),
+        default=Decimal("0.00"),
+        nullable=False,
+        comment="WHT withheld on expense transactions",
+    )
+    unverified_expense_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Expenses without a WREN verifier",
+    )
+    pending_wren_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Expenses uncategorized or without a WREN verifier",
+    )
+    pending_wren_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), default=Decimal("0.00"), nullable=False)
+    
+    # ===========================================
+    # INVOICES (by due date)
+    # ===========================================
+    
+    invoice_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_draft: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_pending: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_submitted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_accepted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_rejected: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_disputed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_cancelled: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_paid: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_partially_paid: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    draft_invoice_amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), default=Decimal("0.00"), nullable=False)
+    unpaid_invoice_amount: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2),
+        default=Decimal("0.00"),
+        nullable=False,
+        comment="Total of pending and submitted invoices",
+    )
+    
+    __table_args__ = (
+        UniqueConstraint('entity_id', 'day', name='uq_entity_daily_summaries_entity_day'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<EntityDailySummary({self.entity_id} {self.day})>"
@@ -0,0 +1,102 @@
+"""
+TekVwarho ProAudit - NRS Submission Outbox Model
+
+Transactional outbox for NRS e-invoice submission.
+
+A row is written in the same transaction that finalizes (or resubmits) an
+invoice, so the user's request never waits on the NRS API. Dispatcher
+workers claim due rows with SELECT ... FOR UPDATE SKIP LOCKED, submit them,
+and either mark them delivered or reschedule them with exponential backoff.
+"""
+
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import BaseModel
+
+if TYPE_CHECKING:
+    from app.models.invoice import Invoice
+
+
+class NRSOutboxStatus(str, Enum):
+    """Outbox row lifecycle."""
+    PENDING = "pending"       # Waiting for its next submission attempt
+    DELIVERED = "delivered"   # NRS issued an IRN
+    FAILED = "failed"         # Rejected by NRS or out of attempts
+
+
+class NRSOutbox(BaseModel):
+    """
+    One pending NRS submission of an invoice.
+    
+    Dispatchers only ever scan PENDING rows whose next_attempt_at is due,
+    which the partial index ix_nrs_outbox_due covers. A claim pushes
+    next_attempt_at forward by a lease, so rows held by a dispatcher that
+    died are picked up again once the lease runs out.
+    """
+    
+    __tablename__ = "nrs_outbox"
+    
+    invoice_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("invoices.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("business_entities.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    requested_by_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="User who finalized or resubmitted the invoice",
+    )
+    
+    status: Mapped[NRSOutboxStatus] = mapped_column(
+        SQLEnum(NRSOutboxStatus),
+        default=NRSOutboxStatus.PENDING,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Result
+    nrs_irn: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    delivered_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    
+    # Relationships
+    invoice: Mapped["Invoice"] = relationship("Invoice")
+    
+    __table_args__ = (
+        Index(
+            'ix_nrs_outbox_due',
+            'next_attempt_at',
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # At most one pending submission per invoice
+        Index(
+            'uq_nrs_outbox_pending_invoice',
+            'invoice_id',
+            unique=True,
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<NRSOutbox(invoice_id={self.invoice_id}, status={self.status}, attempts={self.attempts})>"
@@ -0,0 +1,50 @@
+"""
+TekVwarho ProAudit - Platform Metric Model
+
+Materialized platform-wide counters read by the staff dashboards.
+
+Counters are adjusted incrementally whenever organizations, users,
+invoices, transactions or support tickets are flushed, and recounted from
+the source tables by a periodic task. See
+app/services/platform_metrics_service.py.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, SmallInteger, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class PlatformMetric(BaseModel):
+    """
+    One shard of one platform counter.
+
+    A counter's value is the sum of its shards. Writers add to a random
+    shard, so concurrent signups and postings across tenants do not queue
+    on a single hot row; readers sum a fixed, small number of rows.
+    """
+
+    __tablename__ = "platform_metrics"
+
+    metric: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        comment="Dotted counter name, e.g. organizations.verification.submitted",
+    )
+    shard: Mapped[int] = mapped_column(SmallInteger, default=0, nullable=False)
+    value: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    refreshed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="When the counter was last recounted from source tables",
+    )
+
+    __table_args__ = (
+        UniqueConstraint('metric', 'shard', name='uq_platform_metrics_metric_shard'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PlatformMetric({self.metric}[{self.shard}]={self.value})>"
@@ -0,0 +1,75 @@
+"""
+TekVwarho ProAudit - Search Document Model
+
+One searchable row per transaction, invoice, customer, vendor and
+inventory item, so global search is a single indexed query per entity.
+
+Documents are written whenever a source row is flushed and can be rebuilt
+from the source tables. See app/services/search_index_service.py.
+"""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import Computed, ForeignKey, Index, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class SearchDocument(BaseModel):
+    """
+    Denormalized search text for one resource.
+
+    search_vector is generated by Postgres from title (weight A) and
+    search_text (weight B) with the 'simple' configuration, so names,
+    invoice numbers and TINs are indexed as written rather than stemmed.
+    search_text also carries a trigram index for typo-tolerant matching.
+    """
+
+    __tablename__ = "search_documents"
+
+    entity_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("business_entities.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    resource_type: Mapped[str] = mapped_column(
+        String(30),
+        nullable=False,
+        comment="transaction, invoice, customer, vendor or inventory",
+    )
+    resource_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+
+    # Display fields, so results render without loading the source rows
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    subtitle: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        comment="Lower-cased searchable fields joined with spaces",
+    )
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', lower(title)), 'A') || "
+            "setweight(to_tsvector('simple', search_text), 'B')",
+            persisted=True,
+        ),
+    )
+
+    __table_args__ = (
+        UniqueConstraint('resource_type', 'resource_id', name='uq_search_documents_resource'),
+        # btree_gin lets the entity filter and the text match share one index
+        Index('ix_search_documents_entity_vector', 'entity_id', 'search_vector', postgresql_using='gin'),
+        Index(
+            'ix_search_documents_entity_trgm', 'entity_id', 'search_text',
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'},
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<SearchDocument({self.resource_type} {self.resource_id})>"
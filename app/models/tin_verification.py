@@ -0,0 +1,63 @@
+"""
+TekVwarho ProAudit - TIN Verification Cache Model
+
+Last known registry answer for each TIN, per upstream source.
+
+Shared by every entity and process so repeated checks of the same vendor
+or customer TIN (on every invoice, import and onboarding) are answered
+locally while fresh. See app/services/tin_verification_cache.py for the
+freshness policy.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Boolean, DateTime, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class TINVerification(BaseModel):
+    """
+    Cached TIN registry lookup.
+    
+    Valid and invalid (not found, suspended) answers are both stored; the
+    cache treats them with different freshness windows. Transient upstream
+    errors are never stored.
+    """
+    
+    __tablename__ = "tin_verifications"
+    
+    source: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="Upstream registry: nrs (e-invoicing API) or taxid (TaxID portal)",
+    )
+    tin: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        comment="TIN digits without hyphens or spaces",
+    )
+    
+    # Registry answer
+    is_valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    registered_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    details: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Source-specific fields (entity type, RC number, tax office, ...)",
+    )
+    checked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+    
+    __table_args__ = (
+        UniqueConstraint('source', 'tin', name='uq_tin_verifications_source_tin'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<TINVerification({self.source}:{self.tin}, status={self.status})>"
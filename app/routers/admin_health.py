@@ -188,3 +188,23 @@ async def get_feature_usage_metrics(
     logger.info(f"Admin {current_user.email} accessed feature usage metrics")
     
     return json_response({"feature_usage": usage})
+
+
+@router.get("/compute-pool")
+async def get_compute_pool_metrics(
+    current_user: User = Depends(require_super_admin()),
+):
+    """
+    Get compute pool metrics for this server process.
+    
+    Returns, per work kind (render, ml_training, image, hash):
+    - Concurrency limit, queue bound and timeout
+    - Queued/running jobs and the peak queue depth
+    - Completed, failed, timed-out and rejected counts
+    - Average queue wait and run time
+    
+    - **Requires**: Super Admin role
+    """
+    from app.services.compute_pool import get_compute_pool
+    
+    return json_response({"compute_pool": get_compute_pool().get_stats()})
@@ -130,6 +130,12 @@ class TransactionPredictRequest(BaseModel):
     description: str
     amount: Decimal
     vendor_name: Optional[str] = None
+    transaction_type: str = "expense"
+
+
+class TransactionBatchPredictRequest(BaseModel):
+    """Batch AI transaction labelling request (bulk imports, bank statements)"""
+    transactions: List[TransactionPredictRequest] = Field(..., min_length=1, max_length=10000)
 
 
 # ============================================================================
@@ -861,6 +867,7 @@ async def predict_transaction_category(
     prediction = await ai_labelling_service.predict_category(
         description=request.description,
         amount=request.amount,
+        transaction_type=request.transaction_type,
         vendor_name=request.vendor_name,
         entity_id=str(entity_id)
     )
@@ -868,6 +875,23 @@ async def predict_transaction_category(
     return prediction.__dict__
 
 
+@router.post("/ai/predict-categories")
+async def predict_transaction_categories(
+    request: TransactionBatchPredictRequest,
+    current_user: User = Depends(get_current_user),
+    entity_id: UUID = Depends(get_current_entity_id)
+):
+    """Predict categories and GL accounts for many transactions at once"""
+    from app.services.ai_labelling import ai_labelling_service, LabelRequest
+    
+    predictions = await ai_labelling_service.predict_many(
+        [LabelRequest(**t.model_dump()) for t in request.transactions],
+        entity_id=str(entity_id)
+    )
+    
+    return {"predictions": [p.__dict__ for p in predictions]}
+
+
 @router.post("/ai/train")
 async def train_ml_model(
     db: AsyncSession = Depends(get_db),
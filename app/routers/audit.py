@@ -23,6 +23,7 @@ from app.services.audit_service import AuditService
 from app.services.audit_vault_service import AuditVaultService
 from app.models.user import User
 from app.models.audit_consolidated import AuditAction
+from app.utils.query_optimization import InvalidCursorError, next_page_cursor
 
 router = APIRouter(tags=["Audit Trail"])
 
@@ -38,6 +39,7 @@ async def get_audit_logs(
     end_date: Optional[date] = Query(None, description="Filter to date"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -62,18 +64,22 @@ async def get_audit_logs(
             )
     
     service = AuditService(db)
-    logs, total = await service.get_audit_logs(
-        entity_id=entity_id,
-        target_entity_type=target_entity_type,
-        target_entity_id=target_entity_id,
-        action=action_enum,
-        user_id=user_id,
-        start_date=start_date,
-        end_date=end_date,
-        skip=skip,
-        limit=limit,
-        return_total=True,
-    )
+    try:
+        logs, total = await service.get_audit_logs(
+            entity_id=entity_id,
+            target_entity_type=target_entity_type,
+            target_entity_id=target_entity_id,
+            action=action_enum,
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            skip=skip,
+            limit=limit,
+            return_total=True,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     return {
         "items": [
@@ -92,6 +98,7 @@ async def get_audit_logs(
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_page_cursor(logs, limit, AuditService.PAGE_KEY),
     }
 
 
@@ -22,7 +22,6 @@ from datetime import datetime, date, timedelta
 from pydantic import BaseModel, Field
 from decimal import Decimal
 from enum import Enum
-import hashlib
 import json
 import io
 import uuid
@@ -48,6 +47,7 @@ from app.services.audit_system_service import (
 )
 from app.services.audit_execution_service import AuditExecutionService
 from app.services.audit_export_service import AuditReadyExportService
+from app.services.compute_pool import sha256_hexdigest
 from app.utils.permissions import has_organization_permission, OrganizationPermission
 
 router = APIRouter(
@@ -946,7 +946,7 @@ async def upload_evidence_file(
     content = await file.read()
     
     # Calculate hash
-    content_hash = hashlib.sha256(content).hexdigest()
+    content_hash = await sha256_hexdigest(content)
     
     service = AdvancedAuditSystemService(db)
     
@@ -5,17 +5,18 @@ Provides endpoints for bulk import and export of transactions, vendors,
 customers, and inventory items.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 from pydantic import BaseModel
 import csv
 import io
 
+from app.config import settings
 from app.database import get_async_session
 from app.dependencies import get_current_active_user, verify_entity_access
 from app.models.user import User
@@ -23,8 +24,15 @@ from app.models.transaction import Transaction, TransactionType
 from app.models.vendor import Vendor
 from app.models.customer import Customer
 from app.models.inventory import InventoryItem
-from app.services.audit_service import AuditService
-from app.models.audit_consolidated import AuditAction
+from app.models.bulk_import_job import BulkImportJob, BulkImportStatus
+from app.services.bulk_import_service import (
+    TEMPLATES,
+    BulkImportError,
+    dispatch_bulk_import,
+    enqueue_bulk_import,
+    import_rows,
+    log_import,
+)
 
 router = APIRouter(
     prefix="/api/v1/{entity_id}/bulk",
@@ -37,11 +45,33 @@ router = APIRouter(
 # ===========================================
 
 class BulkImportResult(BaseModel):
-    """Result of a bulk import operation."""
+    """Result of a bulk import operation (or the job it was queued as)."""
     total_rows: int
     successful: int
     failed: int
     errors: List[dict]
+    tins_checked: int = 0
+    tin_warnings: List[dict] = []
+    status: str = "completed"
+    job_id: Optional[UUID] = None
+    status_url: Optional[str] = None
+
+
+class BulkImportJobStatus(BaseModel):
+    """Progress of a background import."""
+    job_id: UUID
+    import_type: str
+    filename: str
+    status: str
+    rows_processed: int
+    successful: int
+    failed: int
+    errors: List[dict]
+    tins_checked: int
+    tin_warnings: List[dict]
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
 
 
 class BulkExportInfo(BaseModel):
@@ -51,6 +81,175 @@ class BulkExportInfo(BaseModel):
     filename: str
 
 
+# ===========================================
+# IMPORT PIPELINE
+# ===========================================
+
+async def _import_csv(
+    import_type: str,
+    entity_id: UUID,
+    file: UploadFile,
+    response: Response,
+    current_user: User,
+    db: AsyncSession,
+    skip_errors: bool,
+    background: Optional[bool],
+    validate_tins: bool = False,
+) -> BulkImportResult:
+    """
+    Import an uploaded CSV inline, or queue it as a background job.
+    
+    Uploads over settings.bulk_import_inline_max_bytes (or any upload with
+    background=true) are stored and imported by a worker; the response is
+    202 with the job's status URL. Inline imports stream the upload through
+    the COPY pipeline in one transaction.
+    """
+    await verify_entity_access(entity_id, current_user, db)
+    
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only CSV files are supported",
+        )
+    
+    if background is None:
+        background = (file.size or 0) > settings.bulk_import_inline_max_bytes
+    if background:
+        await file.seek(0)
+        job = await enqueue_bulk_import(
+            db,
+            entity_id=entity_id,
+            import_type=import_type,
+            upload=file.file,
+            filename=file.filename,
+            created_by_id=current_user.id,
+            skip_errors=skip_errors,
+            validate_tins=validate_tins,
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return BulkImportResult(
+            total_rows=0,
+            successful=0,
+            failed=0,
+            errors=[],
+            status=job.status.value,
+            job_id=job.id,
+            status_url=f"/api/v1/{entity_id}/bulk/imports/{job.id}",
+        )
+    
+    stream = io.TextIOWrapper(file.file, encoding='utf-8-sig', newline='')
+    try:
+        progress = await import_rows(
+            db,
+            import_type,
+            stream,
+            entity_id,
+            created_by_id=current_user.id,
+            skip_errors=skip_errors,
+            validate_tins=validate_tins,
+        )
+    except BulkImportError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except UnicodeDecodeError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV files must be UTF-8 encoded",
+        )
+    finally:
+        # Leave the upload for FastAPI to close
+        stream.detach()
+    
+    await db.commit()
+    await log_import(db, entity_id, current_user.id, import_type, progress)
+    
+    return BulkImportResult(
+        total_rows=progress.rows_processed,
+        successful=progress.successful,
+        failed=progress.failed,
+        errors=progress.errors[:100],  # Limit errors returned
+        tins_checked=progress.tins_checked,
+        tin_warnings=progress.tin_warnings[:100],
+    )
+
+
+async def _get_import_job(entity_id: UUID, job_id: UUID, db: AsyncSession) -> BulkImportJob:
+    job = await db.get(BulkImportJob, job_id)
+    if job is None or job.entity_id != entity_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
+        )
+    return job
+
+
+def _job_status(job: BulkImportJob) -> BulkImportJobStatus:
+    return BulkImportJobStatus(
+        job_id=job.id,
+        import_type=job.import_type,
+        filename=job.filename,
+        status=job.status.value,
+        rows_processed=job.rows_processed or 0,
+        successful=job.successful or 0,
+        failed=job.failed or 0,
+        errors=(job.errors or [])[:100],
+        tins_checked=job.tins_checked or 0,
+        tin_warnings=(job.tin_warnings or [])[:100],
+        error_message=job.error_message,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+    )
+
+
+@router.get(
+    "/imports/{job_id}",
+    response_model=BulkImportJobStatus,
+    summary="Get background import status",
+    description="Progress, row errors and outcome of a queued CSV import.",
+)
+async def get_import_job(
+    entity_id: UUID,
+    job_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Get the status of a background import."""
+    await verify_entity_access(entity_id, current_user, db)
+    return _job_status(await _get_import_job(entity_id, job_id, db))
+
+
+@router.post(
+    "/imports/{job_id}/resume",
+    response_model=BulkImportJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Resume a failed background import",
+    description="Queue a failed import again; it continues after its last committed chunk.",
+)
+async def resume_import_job(
+    entity_id: UUID,
+    job_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Resume a failed background import."""
+    await verify_entity_access(entity_id, current_user, db)
+    job = await _get_import_job(entity_id, job_id, db)
+    if job.status != BulkImportStatus.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only failed imports can be resumed (status: {job.status.value})",
+        )
+    
+    job.status = BulkImportStatus.QUEUED
+    await db.commit()
+    await dispatch_bulk_import(db, job)
+    return _job_status(job)
+
+
 # ===========================================
 # TRANSACTIONS BULK OPERATIONS
 # ===========================================
@@ -59,86 +258,22 @@ class BulkExportInfo(BaseModel):
     "/transactions/import",
     response_model=BulkImportResult,
     summary="Bulk import transactions",
-    description="Import multiple transactions from a CSV file.",
+    description="Import multiple transactions from a CSV file. Large files are imported in the background.",
 )
 async def bulk_import_transactions(
     entity_id: UUID,
+    response: Response,
     file: UploadFile = File(..., description="CSV file with transactions"),
     skip_errors: bool = Query(False, description="Continue on errors"),
+    background: Optional[bool] = Query(None, description="Import as a background job (default: only large files)"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Import transactions from CSV."""
-    await verify_entity_access(entity_id, current_user, db)
-    
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are supported",
-        )
-    
-    content = await file.read()
-    decoded = content.decode('utf-8')
-    reader = csv.DictReader(io.StringIO(decoded))
-    
-    total_rows = 0
-    successful = 0
-    failed = 0
-    errors = []
-    
-    for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-        total_rows += 1
-        try:
-            # Parse and validate row
-            transaction = Transaction(
-                entity_id=entity_id,
-                transaction_date=date.fromisoformat(row.get('date', '')),
-                description=row.get('description', ''),
-                amount=float(row.get('amount', 0)),
-                transaction_type=TransactionType(row.get('type', 'expense')),
-                reference=row.get('reference'),
-                created_by_id=current_user.id,
-            )
-            db.add(transaction)
-            successful += 1
-        except Exception as e:
-            failed += 1
-            errors.append({
-                "row": row_num,
-                "error": str(e),
-                "data": row,
-            })
-            if not skip_errors:
-                await db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error on row {row_num}: {str(e)}",
-                )
-    
-    if successful > 0:
-        await db.commit()
-    
-    # Audit logging for bulk transaction import
-    audit_service = AuditService(db)
-    await audit_service.log_action(
-        business_entity_id=entity_id,
-        entity_type="bulk_import",
-        entity_id=f"transactions-{date.today().isoformat()}",
-        action=AuditAction.IMPORT,
-        user_id=current_user.id,
-        new_values={
-            "import_type": "transactions",
-            "total_rows": total_rows,
-            "successful": successful,
-            "failed": failed,
-        }
-    )
-    
-    return BulkImportResult(
-        total_rows=total_rows,
-        successful=successful,
-        failed=failed,
-        errors=errors[:100],  # Limit errors returned
+    return await _import_csv(
+        "transactions", entity_id, file, response, current_user, db,
+        skip_errors=skip_errors,
+        background=background,
     )
 
 
@@ -204,85 +339,24 @@ async def export_transactions(
     "/vendors/import",
     response_model=BulkImportResult,
     summary="Bulk import vendors",
-    description="Import multiple vendors from a CSV file.",
+    description="Import multiple vendors from a CSV file. Large files are imported in the background.",
 )
 async def bulk_import_vendors(
     entity_id: UUID,
+    response: Response,
     file: UploadFile = File(..., description="CSV file with vendors"),
     skip_errors: bool = Query(False, description="Continue on errors"),
+    validate_tins: bool = Query(True, description="Verify TINs with NRS (invalid TINs are reported, not rejected)"),
+    background: Optional[bool] = Query(None, description="Import as a background job (default: only large files)"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Import vendors from CSV."""
-    await verify_entity_access(entity_id, current_user, db)
-    
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are supported",
-        )
-    
-    content = await file.read()
-    decoded = content.decode('utf-8')
-    reader = csv.DictReader(io.StringIO(decoded))
-    
-    total_rows = 0
-    successful = 0
-    failed = 0
-    errors = []
-    
-    for row_num, row in enumerate(reader, start=2):
-        total_rows += 1
-        try:
-            vendor = Vendor(
-                entity_id=entity_id,
-                name=row.get('name', ''),
-                email=row.get('email'),
-                phone=row.get('phone'),
-                address=row.get('address'),
-                tin=row.get('tin'),
-                contact_person=row.get('contact_person'),
-            )
-            db.add(vendor)
-            successful += 1
-        except Exception as e:
-            failed += 1
-            errors.append({
-                "row": row_num,
-                "error": str(e),
-                "data": row,
-            })
-            if not skip_errors:
-                await db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error on row {row_num}: {str(e)}",
-                )
-    
-    if successful > 0:
-        await db.commit()
-    
-    # Audit logging for bulk vendor import
-    audit_service = AuditService(db)
-    await audit_service.log_action(
-        business_entity_id=entity_id,
-        entity_type="bulk_import",
-        entity_id=f"vendors-{date.today().isoformat()}",
-        action=AuditAction.IMPORT,
-        user_id=current_user.id,
-        new_values={
-            "import_type": "vendors",
-            "total_rows": total_rows,
-            "successful": successful,
-            "failed": failed,
-        }
-    )
-    
-    return BulkImportResult(
-        total_rows=total_rows,
-        successful=successful,
-        failed=failed,
-        errors=errors[:100],
+    return await _import_csv(
+        "vendors", entity_id, file, response, current_user, db,
+        skip_errors=skip_errors,
+        background=background,
+        validate_tins=validate_tins,
     )
 
 
@@ -336,85 +410,24 @@ async def export_vendors(
     "/customers/import",
     response_model=BulkImportResult,
     summary="Bulk import customers",
-    description="Import multiple customers from a CSV file.",
+    description="Import multiple customers from a CSV file. Large files are imported in the background.",
 )
 async def bulk_import_customers(
     entity_id: UUID,
+    response: Response,
     file: UploadFile = File(..., description="CSV file with customers"),
     skip_errors: bool = Query(False, description="Continue on errors"),
+    validate_tins: bool = Query(True, description="Verify TINs with NRS (invalid TINs are reported, not rejected)"),
+    background: Optional[bool] = Query(None, description="Import as a background job (default: only large files)"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Import customers from CSV."""
-    await verify_entity_access(entity_id, current_user, db)
-    
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are supported",
-        )
-    
-    content = await file.read()
-    decoded = content.decode('utf-8')
-    reader = csv.DictReader(io.StringIO(decoded))
-    
-    total_rows = 0
-    successful = 0
-    failed = 0
-    errors = []
-    
-    for row_num, row in enumerate(reader, start=2):
-        total_rows += 1
-        try:
-            customer = Customer(
-                entity_id=entity_id,
-                name=row.get('name', ''),
-                email=row.get('email'),
-                phone=row.get('phone'),
-                address=row.get('address'),
-                tin=row.get('tin'),
-                contact_person=row.get('contact_person'),
-            )
-            db.add(customer)
-            successful += 1
-        except Exception as e:
-            failed += 1
-            errors.append({
-                "row": row_num,
-                "error": str(e),
-                "data": row,
-            })
-            if not skip_errors:
-                await db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error on row {row_num}: {str(e)}",
-                )
-    
-    if successful > 0:
-        await db.commit()
-    
-    # Audit logging for bulk customer import
-    audit_service = AuditService(db)
-    await audit_service.log_action(
-        business_entity_id=entity_id,
-        entity_type="bulk_import",
-        entity_id=f"customers-{date.today().isoformat()}",
-        action=AuditAction.IMPORT,
-        user_id=current_user.id,
-        new_values={
-            "import_type": "customers",
-            "total_rows": total_rows,
-            "successful": successful,
-            "failed": failed,
-        }
-    )
-    
-    return BulkImportResult(
-        total_rows=total_rows,
-        successful=successful,
-        failed=failed,
-        errors=errors[:100],
+    return await _import_csv(
+        "customers", entity_id, file, response, current_user, db,
+        skip_errors=skip_errors,
+        background=background,
+        validate_tins=validate_tins,
     )
 
 
@@ -468,85 +481,22 @@ async def export_customers(
     "/inventory/import",
     response_model=BulkImportResult,
     summary="Bulk import inventory items",
-    description="Import multiple inventory items from a CSV file.",
+    description="Import multiple inventory items from a CSV file. Large files are imported in the background.",
 )
 async def bulk_import_inventory(
     entity_id: UUID,
+    response: Response,
     file: UploadFile = File(..., description="CSV file with inventory items"),
     skip_errors: bool = Query(False, description="Continue on errors"),
+    background: Optional[bool] = Query(None, description="Import as a background job (default: only large files)"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
     """Import inventory items from CSV."""
-    await verify_entity_access(entity_id, current_user, db)
-    
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are supported",
-        )
-    
-    content = await file.read()
-    decoded = content.decode('utf-8')
-    reader = csv.DictReader(io.StringIO(decoded))
-    
-    total_rows = 0
-    successful = 0
-    failed = 0
-    errors = []
-    
-    for row_num, row in enumerate(reader, start=2):
-        total_rows += 1
-        try:
-            item = InventoryItem(
-                entity_id=entity_id,
-                name=row.get('name', ''),
-                sku=row.get('sku'),
-                description=row.get('description'),
-                quantity=int(row.get('quantity', 0)),
-                unit_price=float(row.get('unit_price', 0)),
-                reorder_level=int(row.get('reorder_level', 10)),
-            )
-            db.add(item)
-            successful += 1
-        except Exception as e:
-            failed += 1
-            errors.append({
-                "row": row_num,
-                "error": str(e),
-                "data": row,
-            })
-            if not skip_errors:
-                await db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error on row {row_num}: {str(e)}",
-                )
-    
-    if successful > 0:
-        await db.commit()
-    
-    # Audit logging for bulk inventory import
-    audit_service = AuditService(db)
-    await audit_service.log_action(
-        business_entity_id=entity_id,
-        entity_type="bulk_import",
-        entity_id=f"inventory-{date.today().isoformat()}",
-        action=AuditAction.IMPORT,
-        user_id=current_user.id,
-        new_values={
-            "import_type": "inventory",
-            "total_rows": total_rows,
-            "successful": successful,
-            "failed": failed,
-        }
-    )
-    
-    return BulkImportResult(
-        total_rows=total_rows,
-        successful=successful,
-        failed=failed,
-        errors=errors[:100],
+    return await _import_csv(
+        "inventory", entity_id, file, response, current_user, db,
+        skip_errors=skip_errors,
+        background=background,
     )
 
 
@@ -567,7 +517,7 @@ async def export_inventory(
     query = select(InventoryItem).where(InventoryItem.entity_id == entity_id)
     
     if low_stock_only:
-        query = query.where(InventoryItem.quantity <= InventoryItem.reorder_level)
+        query = query.where(InventoryItem.quantity_on_hand <= InventoryItem.reorder_level)
     
     result = await db.execute(query)
     items = result.scalars().all()
@@ -581,7 +531,7 @@ async def export_inventory(
             item.name,
             item.sku or '',
             item.description or '',
-            item.quantity,
+            item.quantity_on_hand,
             float(item.unit_price),
             item.reorder_level,
         ])
@@ -615,12 +565,7 @@ async def download_template(
     """Download CSV template for bulk import."""
     await verify_entity_access(entity_id, current_user, db)
     
-    templates = {
-        "transactions": ['date', 'description', 'amount', 'type', 'reference'],
-        "vendors": ['name', 'email', 'phone', 'address', 'tin', 'contact_person'],
-        "customers": ['name', 'email', 'phone', 'address', 'tin', 'contact_person'],
-        "inventory": ['name', 'sku', 'description', 'quantity', 'unit_price', 'reorder_level'],
-    }
+    templates = TEMPLATES
     
     if resource_type not in templates:
         raise HTTPException(
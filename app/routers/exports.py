@@ -2,13 +2,15 @@
 Export and Download Router
 
 Provides endpoints for exporting financial reports and downloading data
-in various formats (PDF, Excel, CSV).
+in various formats (PDF, Excel, CSV), and for full entity backups and
+their restore.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse, Response
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 from uuid import UUID
 from datetime import date, datetime
 from pydantic import BaseModel
@@ -18,10 +20,14 @@ import json
 
 from app.database import get_async_session
 from app.dependencies import get_current_active_user, verify_entity_access
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.services.reports_service import ReportsService
 from app.services.audit_service import AuditService
 from app.models.audit_consolidated import AuditAction
+from app.models.entity_backup_job import EntityBackupJob, EntityBackupOperation, EntityBackupStatus
+from app.services.entity_backup_service import enqueue_backup, enqueue_restore
+from app.services.file_storage_service import FileStorageService
+from app.utils.permissions import OrganizationPermission, has_organization_permission
 
 router = APIRouter(
     prefix="/api/v1/{entity_id}/exports",
@@ -460,10 +466,60 @@ async def export_audit_trail(
 # DATA BACKUP EXPORT
 # ===========================================
 
-@router.get(
+class EntityBackupJobStatus(BaseModel):
+    """State of a background backup or restore."""
+    job_id: UUID
+    operation: str
+    status: str
+    include_audit: bool
+    filename: Optional[str] = None
+    size_bytes: Optional[int] = None
+    row_count: Optional[int] = None
+    tables: Dict[str, int] = {}
+    error_message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+
+
+def _backup_status(job: EntityBackupJob) -> EntityBackupJobStatus:
+    downloadable = (
+        job.operation == EntityBackupOperation.BACKUP and job.status == EntityBackupStatus.COMPLETED
+    )
+    return EntityBackupJobStatus(
+        job_id=job.id,
+        operation=job.operation.value,
+        status=job.status.value,
+        include_audit=job.include_audit,
+        filename=job.filename,
+        size_bytes=job.size_bytes,
+        row_count=job.row_count,
+        tables={table["name"]: table["rows"] for table in (job.manifest or {}).get("tables", [])},
+        error_message=job.error_message,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        download_url=f"/api/v1/{job.entity_id}/exports/backup/{job.id}/download" if downloadable else None,
+    )
+
+
+async def _get_backup_job(entity_id: UUID, job_id: UUID, db: AsyncSession) -> EntityBackupJob:
+    job = await db.get(EntityBackupJob, job_id)
+    if job is None or job.entity_id != entity_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Backup job not found",
+        )
+    return job
+
+
+@router.post(
     "/backup",
+    response_model=EntityBackupJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Export All Data",
-    description="Download a complete backup of all entity data for archival purposes.",
+    description="Queue a complete backup of the entity's data (zip of NDJSON tables with a SHA-256 manifest).",
 )
 async def export_full_backup(
     entity_id: UUID,
@@ -471,32 +527,147 @@ async def export_full_backup(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
-    """Export full data backup."""
+    """
+    Export full data backup.
+    
+    Transactions, invoices, journals, customers, vendors, inventory,
+    payroll and (optionally) audit logs are streamed table by table into
+    an archive in file storage; poll the job and download it when it
+    completes.
+    """
     await verify_entity_access(entity_id, current_user, db)
     
-    # In production, this would compile all entity data
-    # For now, return metadata
-    backup_data = {
-        "export_info": {
-            "entity_id": str(entity_id),
-            "exported_at": datetime.now().isoformat(),
-            "exported_by": current_user.email,
-            "version": "1.0",
-        },
-        "data_summary": {
-            "transactions": 0,
-            "invoices": 0,
-            "customers": 0,
-            "vendors": 0,
-            "inventory_items": 0,
-            "audit_logs": 0 if not include_audit else 0,
-        },
-    }
-    
-    return Response(
-        content=json.dumps(backup_data, indent=2),
-        media_type="application/json",
-        headers={
-            "Content-Disposition": f"attachment; filename=backup_{entity_id}_{date.today().isoformat()}.json"
-        }
+    if not has_organization_permission(current_user.role, OrganizationPermission.EXPORT_DATA):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="EXPORT_DATA permission required to back up entity data.",
+        )
+    
+    job = await enqueue_backup(db, entity_id, created_by_id=current_user.id, include_audit=include_audit)
+    return _backup_status(job)
+
+
+@router.get(
+    "/backup",
+    response_model=List[EntityBackupJobStatus],
+    summary="List backups",
+    description="Recent backup and restore jobs of the entity, newest first.",
+)
+async def list_backups(
+    entity_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """List backup and restore jobs."""
+    await verify_entity_access(entity_id, current_user, db)
+    
+    result = await db.execute(
+        select(EntityBackupJob)
+        .where(EntityBackupJob.entity_id == entity_id)
+        .order_by(EntityBackupJob.created_at.desc())
+        .limit(limit)
+    )
+    return [_backup_status(job) for job in result.scalars().all()]
+
+
+@router.get(
+    "/backup/{job_id}",
+    response_model=EntityBackupJobStatus,
+    summary="Get backup status",
+    description="Progress, table row counts and outcome of a backup or restore.",
+)
+async def get_backup(
+    entity_id: UUID,
+    job_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Get a backup or restore job."""
+    await verify_entity_access(entity_id, current_user, db)
+    return _backup_status(await _get_backup_job(entity_id, job_id, db))
+
+
+@router.get(
+    "/backup/{job_id}/download",
+    summary="Download backup",
+    description="Download a completed backup archive.",
+)
+async def download_backup(
+    entity_id: UUID,
+    job_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Download a backup archive (streamed from disk, or via a short-lived signed URL)."""
+    await verify_entity_access(entity_id, current_user, db)
+    
+    if not has_organization_permission(current_user.role, OrganizationPermission.EXPORT_DATA):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="EXPORT_DATA permission required to download backups of entity data.",
+        )
+    
+    job = await _get_backup_job(entity_id, job_id, db)
+    if job.operation != EntityBackupOperation.BACKUP or job.status != EntityBackupStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Backup is not ready (status: {job.status.value})",
+        )
+    
+    storage = FileStorageService()
+    path = storage.get_local_path(job.file_id)
+    if path is not None:
+        return FileResponse(path, media_type="application/zip", filename=job.filename)
+    url = storage.get_signed_url(job.file_id)
+    if url is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not create a download link for the backup",
+        )
+    return RedirectResponse(url)
+
+
+@router.post(
+    "/backup/restore",
+    response_model=EntityBackupJobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Restore backup",
+    description="Load a backup archive into this entity (e.g. migrating an entity from another environment).",
+)
+async def restore_backup(
+    entity_id: UUID,
+    file: UploadFile = File(..., description="Backup archive (.zip) from Export All Data"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Restore a backup into this entity.
+    
+    Owner or Admin only. Runs in the background: every part is checked
+    against the manifest's SHA-256 digests first, then all rows are
+    inserted in one transaction, so a failed restore leaves the entity
+    untouched. The archive's audit logs are not restored.
+    """
+    await verify_entity_access(entity_id, current_user, db)
+    
+    if current_user.role not in (UserRole.OWNER, UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the organization Owner or Admin can restore a backup.",
+        )
+    
+    if not (file.filename or "").lower().endswith(".zip"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Backups are .zip archives",
+        )
+    
+    job = await enqueue_restore(
+        db,
+        entity_id,
+        file.file,
+        file.filename,
+        created_by_id=current_user.id,
     )
+    return _backup_status(job)
@@ -29,6 +29,7 @@ from app.services.entity_service import EntityService
 from app.services.metering_service import MeteringService
 from app.schemas.auth import MessageResponse
 from app.utils.permissions import OrganizationPermission, has_organization_permission
+from app.utils.query_optimization import InvalidCursorError, next_page_cursor
 
 
 router = APIRouter()
@@ -144,6 +145,7 @@ class InvoiceListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class InvoiceSummaryResponse(BaseModel):
@@ -267,6 +269,7 @@ async def list_invoices(
     search: Optional[str] = Query(None, description="Search invoice number"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -290,23 +293,29 @@ async def list_invoices(
                 detail=f"Invalid status: {status}",
             )
     
-    invoices, total = await invoice_service.get_invoices_for_entity(
-        entity_id=entity_id,
-        status=status_enum,
-        customer_id=customer_id,
-        start_date=start_date,
-        end_date=end_date,
-        is_overdue=is_overdue,
-        search=search,
-        page=page,
-        page_size=page_size,
-    )
+    try:
+        invoices, total = await invoice_service.get_invoices_for_entity(
+            entity_id=entity_id,
+            status=status_enum,
+            customer_id=customer_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_overdue=is_overdue,
+            search=search,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        # The status query parameter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=str(e))
     
     return InvoiceListResponse(
         invoices=[invoice_to_response(inv) for inv in invoices],
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_page_cursor(invoices, page_size, InvoiceService.PAGE_KEY),
     )
 
 
@@ -767,9 +776,11 @@ async def submit_to_nrs(
     db: AsyncSession = Depends(get_async_session),
 ):
     """
-    Submit invoice to NRS (FIRS) for IRN generation.
+    Queue invoice for NRS (FIRS) submission and IRN generation.
     
-    This is a placeholder endpoint. Full NRS integration will be implemented in Segment 14.
+    Returns once the submission is queued; the IRN is delivered over the
+    WebSocket invoices channel (invoice_nrs_status) and stored on the invoice.
+    Finalized invoices are queued automatically.
     
     Requirements for NRS submission:
     - Invoice must be in PENDING or REJECTED status
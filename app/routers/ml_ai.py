@@ -18,7 +18,7 @@ Feature Flags: ML_ANOMALY_DETECTION, PREDICTIVE_FORECASTING, OCR_EXTRACTION, NLP
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status, Body
 from fastapi.responses import JSONResponse
@@ -32,12 +32,17 @@ from app.models.user import User
 from app.models.transaction import Transaction
 from app.models.entity import BusinessEntity
 from app.models.sku import Feature
-from app.services.ml_engine import ml_engine, ModelType, PredictionType
+from app.services.ml_engine import ml_engine, ModelType, PredictionType, SimpleNeuralNetwork
+from app.services.ml_job_service import MLJobService
+from app.services.ml_model_registry import get_active_model_cache
+from app.services.ml_training_runner import enqueue_neural_network_training, registry_model_name
 from app.services.advanced_ocr_service import (
     advanced_ocr_service, 
     DocumentType, 
     ExtractedDocument
 )
+from app.services.metering_service import MeteringService
+from app.services.websocket_manager import get_notification_broadcaster
 
 
 router = APIRouter(
@@ -71,6 +76,30 @@ class CashFlowForecastResponse(BaseModel):
     confidence_level: str
 
 
+class BatchForecastRequest(BaseModel):
+    """Request for forecasting many aligned series in one call."""
+    entity_id: UUID
+    metric: str = Field(..., min_length=1, max_length=100, description="Name of the forecast metric, e.g. expense_by_account")
+    last_period: str = Field(..., description="Period of the last column, e.g. 2026-09")
+    series: List[List[float]] = Field(..., min_items=1, max_items=5000, description="One row per series, oldest period first")
+    labels: Optional[List[str]] = None
+    periods: int = Field(12, ge=1, le=36, description="Number of periods to forecast")
+    method: str = Field("exponential_smoothing", description="Forecasting method: exponential_smoothing, arima")
+
+
+class BatchForecastResponse(BaseModel):
+    """Batch forecast response; forecast rows follow the request series."""
+    entity_id: str
+    metric: str
+    last_period: str
+    model: str
+    labels: Optional[List[str]]
+    forecast: List[List[float]]
+    lower_95: List[List[float]]
+    upper_95: List[List[float]]
+    cached: bool
+
+
 class GrowthPredictionRequest(BaseModel):
     """Request for growth prediction."""
     entity_id: UUID
@@ -136,17 +165,42 @@ class TrainModelRequest(BaseModel):
     feature_fields: List[str]
     epochs: int = Field(500, ge=100, le=5000)
     hidden_layers: List[int] = [16, 8]
+    activate: bool = Field(True, description="Serve the trained version once it is registered")
 
 
 class TrainModelResponse(BaseModel):
-    """Model training response."""
+    """Queued model training job."""
+    job_id: UUID
+    job_code: str
     model_name: str
-    model_path: str
+    status: str
     training_samples: int
-    epochs_trained: int
-    final_loss: float
-    r_squared: Optional[float]
-    feature_importance: Optional[Dict[str, float]]
+    status_url: str
+
+
+class TrainingJobStatusResponse(BaseModel):
+    """Model training job status."""
+    job_id: UUID
+    job_code: str
+    status: str
+    progress_percent: int
+    current_step: Optional[str]
+    model_id: Optional[UUID]
+    results: Optional[Dict[str, Any]]
+    error_message: Optional[str]
+
+
+class NeuralNetworkPredictRequest(BaseModel):
+    """Request for predictions from a trained neural network."""
+    model_name: str
+    records: List[Dict[str, Any]] = Field(..., min_items=1, max_items=10000)
+
+
+class NeuralNetworkPredictResponse(BaseModel):
+    """Neural network predictions."""
+    model_name: str
+    model_version: str
+    predictions: List[float]
 
 
 class TimeSeriesDecomposeRequest(BaseModel):
@@ -190,6 +244,17 @@ class OCRProcessResponse(BaseModel):
     warnings: List[str]
 
 
+class OCRBatchResponse(BaseModel):
+    """Batch OCR response; documents follow the upload order."""
+    batch_id: str
+    total: int
+    processed: int
+    cached: int
+    failed: int
+    pages_metered: int
+    documents: List[OCRProcessResponse]
+
+
 class SentimentBatchRequest(BaseModel):
     """Batch sentiment analysis request."""
     texts: List[str] = Field(..., min_items=1, max_items=100)
@@ -308,6 +373,40 @@ async def get_cash_flow_forecast(
     return await forecast_cash_flow(request, db, current_user)
 
 
+@router.post("/forecast/batch", response_model=BatchForecastResponse)
+async def forecast_batch(
+    request: BatchForecastRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Forecast many series (accounts, metrics) of an entity in one call.
+    
+    All rows must cover the same periods. Results are cached by entity,
+    metric and last period.
+    """
+    from app.services.batch_forecast_service import BatchForecastService
+    
+    if len({len(row) for row in request.series}) != 1:
+        raise HTTPException(status_code=400, detail="All series must have the same number of periods")
+    if len(request.series[0]) < 3:
+        raise HTTPException(status_code=400, detail="At least 3 periods of history are required")
+    
+    try:
+        result = await BatchForecastService().forecast(
+            request.entity_id,
+            request.metric,
+            request.last_period,
+            request.series,
+            labels=request.labels,
+            method=request.method,
+            forecast_periods=request.periods,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return BatchForecastResponse(**result)
+
+
 # =============================================================================
 # GROWTH PREDICTION ENDPOINTS
 # =============================================================================
@@ -555,15 +654,22 @@ async def classify_transactions_batch(
 # DEEP LEARNING / MODEL TRAINING ENDPOINTS
 # =============================================================================
 
-@router.post("/train/neural-network", response_model=TrainModelResponse)
+@router.post(
+    "/train/neural-network",
+    response_model=TrainModelResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def train_neural_network(
     request: TrainModelRequest,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
 ):
     """
-    Train a custom neural network on provided data.
+    Queue training of a custom neural network on provided data.
     
-    The model will be saved and can be used for predictions.
+    Training runs as a background ML job; poll the returned status URL.
+    When it completes the weights are registered as a new model version
+    and, if requested, served by /predict/neural-network.
     """
     if len(request.training_data) < 10:
         raise HTTPException(
@@ -571,21 +677,83 @@ async def train_neural_network(
             detail="Minimum 10 training samples required"
         )
     
-    result = ml_engine.train_neural_network(
+    job = await enqueue_neural_network_training(
+        db,
+        model_name=request.model_name,
         training_data=request.training_data,
         target_field=request.target_field,
         feature_fields=request.feature_fields,
-        epochs=request.epochs
+        epochs=request.epochs,
+        hidden_layers=request.hidden_layers,
+        organization_id=current_user.organization_id,
+        triggered_by_id=current_user.id,
+        activate=request.activate,
     )
     
     return TrainModelResponse(
+        job_id=job.id,
+        job_code=job.job_id,
+        model_name=request.model_name,
+        status=job.status.value,
+        training_samples=len(request.training_data),
+        status_url=f"/api/v1/ml/train/jobs/{job.id}",
+    )
+
+
+@router.get("/train/jobs/{job_id}", response_model=TrainingJobStatusResponse)
+async def get_training_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Get the status and progress of a model training job."""
+    job = await MLJobService(db).get_ml_job(job_id)
+    if not job or job.organization_id != current_user.organization_id:
+        raise HTTPException(status_code=404, detail="Training job not found")
+    
+    return TrainingJobStatusResponse(
+        job_id=job.id,
+        job_code=job.job_id,
+        status=job.status.value,
+        progress_percent=job.progress_percent or 0,
+        current_step=job.current_step,
+        model_id=job.model_id,
+        results=job.results_summary,
+        error_message=job.error_message,
+    )
+
+
+@router.post("/predict/neural-network", response_model=NeuralNetworkPredictResponse)
+async def predict_neural_network(
+    request: NeuralNetworkPredictRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Predict with the active version of a trained neural network.
+    
+    The model is loaded once per worker process (memory-mapped) and
+    reloaded when a new version is activated.
+    """
+    loaded = await get_active_model_cache().get(
+        db, registry_model_name(request.model_name, current_user.organization_id)
+    )
+    if loaded is None:
+        raise HTTPException(status_code=404, detail="No active model with that name")
+    
+    import numpy as np
+    
+    network = SimpleNeuralNetwork.from_arrays(loaded.arrays, **loaded.hyperparameters)
+    X = np.array(
+        [[float(record.get(f, 0)) for f in loaded.feature_columns] for record in request.records],
+        dtype=np.float64,
+    ).reshape(len(request.records), len(loaded.feature_columns))
+    predictions = network.predict(X)
+    
+    return NeuralNetworkPredictResponse(
         model_name=request.model_name,
-        model_path=result["model_path"],
-        training_samples=result["training_samples"],
-        epochs_trained=result["epochs_trained"],
-        final_loss=result["final_loss"],
-        r_squared=None,
-        feature_importance=None
+        model_version=loaded.version,
+        predictions=[float(p) for p in np.ravel(predictions)],
     )
 
 
@@ -673,60 +841,37 @@ async def get_model_capabilities(
 # OCR DOCUMENT PROCESSING ENDPOINTS
 # =============================================================================
 
-@router.post("/ocr/process", response_model=OCRProcessResponse)
-async def process_document_ocr(
-    file: UploadFile = File(...),
-    document_type: str = Form("general"),
-    preprocess: bool = Form(True),
-    current_user: User = Depends(get_current_active_user)
-):
-    """
-    Process a document using advanced OCR.
-    
-    Supports:
-    - Receipts
-    - Invoices
-    - Bank Statements
-    - General Documents
-    
-    Uses Azure Document Intelligence when configured,
-    with Tesseract or internal fallback.
-    """
-    # Validate file type
-    allowed_types = ["image/jpeg", "image/png", "image/tiff", "application/pdf"]
-    if file.content_type not in allowed_types:
+OCR_ALLOWED_TYPES = ["image/jpeg", "image/png", "image/tiff", "application/pdf"]
+OCR_MAX_FILE_BYTES = 10 * 1024 * 1024
+OCR_BATCH_MAX_FILES = 50
+
+OCR_DOCUMENT_TYPES = {
+    "receipt": DocumentType.RECEIPT,
+    "invoice": DocumentType.INVOICE,
+    "bank_statement": DocumentType.BANK_STATEMENT,
+    "tax_document": DocumentType.TAX_DOCUMENT,
+    "general": DocumentType.GENERAL
+}
+
+
+async def _read_ocr_upload(file: UploadFile) -> bytes:
+    """Validate type and size of an uploaded document and read it."""
+    if file.content_type not in OCR_ALLOWED_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"File type not supported. Allowed: {allowed_types}"
+            detail=f"File type not supported. Allowed: {OCR_ALLOWED_TYPES}"
         )
     
-    # Validate file size (10MB max)
     content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
+    if len(content) > OCR_MAX_FILE_BYTES:
         raise HTTPException(
             status_code=400,
             detail="File too large. Maximum size is 10MB."
         )
-    
-    # Map document type
-    doc_type_map = {
-        "receipt": DocumentType.RECEIPT,
-        "invoice": DocumentType.INVOICE,
-        "bank_statement": DocumentType.BANK_STATEMENT,
-        "tax_document": DocumentType.TAX_DOCUMENT,
-        "general": DocumentType.GENERAL
-    }
-    doc_type = doc_type_map.get(document_type, DocumentType.GENERAL)
-    
-    # Process document
-    result = await advanced_ocr_service.process_document(
-        file_content=content,
-        filename=file.filename,
-        content_type=file.content_type,
-        document_type=doc_type,
-        preprocess=preprocess
-    )
-    
+    return content
+
+
+def _ocr_response(result: ExtractedDocument) -> OCRProcessResponse:
     return OCRProcessResponse(
         document_id=result.document_id,
         document_type=result.document_type.value,
@@ -760,6 +905,100 @@ async def process_document_ocr(
     )
 
 
+@router.post("/ocr/process", response_model=OCRProcessResponse)
+async def process_document_ocr(
+    file: UploadFile = File(...),
+    document_type: str = Form("general"),
+    preprocess: bool = Form(True),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Process a document using advanced OCR.
+    
+    Supports:
+    - Receipts
+    - Invoices
+    - Bank Statements
+    - General Documents
+    
+    Uses Azure Document Intelligence when configured,
+    with Tesseract or internal fallback.
+    """
+    content = await _read_ocr_upload(file)
+    
+    # Process document
+    result = await advanced_ocr_service.process_document(
+        file_content=content,
+        filename=file.filename,
+        content_type=file.content_type,
+        document_type=OCR_DOCUMENT_TYPES.get(document_type, DocumentType.GENERAL),
+        preprocess=preprocess
+    )
+    
+    return _ocr_response(result)
+
+
+@router.post("/ocr/process-batch", response_model=OCRBatchResponse)
+async def process_documents_ocr_batch(
+    files: List[UploadFile] = File(...),
+    document_type: str = Form("general"),
+    preprocess: bool = Form(True),
+    batch_id: Optional[str] = Form(None, description="Echoed in ocr_batch_progress WebSocket events"),
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Process up to 50 documents concurrently.
+    
+    Progress is pushed to the caller's WebSocket connections as
+    ocr_batch_progress events. Duplicate uploads (within the batch or
+    seen before) are served from the result cache and not metered.
+    """
+    if len(files) > OCR_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum is {OCR_BATCH_MAX_FILES} per batch."
+        )
+    uploads = [
+        (await _read_ocr_upload(file), file.filename, file.content_type)
+        for file in files
+    ]
+    batch_id = batch_id or uuid4().hex
+    broadcaster = get_notification_broadcaster()
+    
+    async def report_progress(progress: Dict[str, Any]):
+        await broadcaster.notify_ocr_batch_progress(current_user.id, batch_id, progress)
+    
+    results = await advanced_ocr_service.batch_process(
+        uploads,
+        document_type=OCR_DOCUMENT_TYPES.get(document_type, DocumentType.GENERAL),
+        preprocess=preprocess,
+        progress_callback=report_progress
+    )
+    
+    succeeded = [r for r in results if not r.provider.endswith("error")]
+    processed = [r for r in succeeded if not r.cache_hit]
+    pages = sum(r.page_count for r in processed)
+    if pages and current_user.organization_id:
+        await MeteringService(db).record_ocr_pages(
+            organization_id=current_user.organization_id,
+            pages=pages,
+            user_id=current_user.id,
+            document_id=batch_id,
+        )
+        await db.commit()
+    
+    return OCRBatchResponse(
+        batch_id=batch_id,
+        total=len(results),
+        processed=len(processed),
+        cached=len(succeeded) - len(processed),
+        failed=len(results) - len(succeeded),
+        pages_metered=pages,
+        documents=[_ocr_response(r) for r in results]
+    )
+
+
 @router.get("/ocr/status")
 async def get_ocr_status(
     current_user: User = Depends(get_current_active_user)
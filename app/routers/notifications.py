@@ -24,6 +24,7 @@ from app.dependencies import get_current_active_user
 from app.models.user import User
 from app.models.notification import NotificationType, NotificationPriority
 from app.services.notification_service import NotificationService
+from app.utils.query_optimization import InvalidCursorError, next_page_cursor
 
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
@@ -57,6 +58,7 @@ class NotificationListResponse(BaseModel):
     notifications: List[NotificationResponse]
     total: int
     unread_count: int
+    next_cursor: Optional[str] = None
 
 
 class UnreadCountResponse(BaseModel):
@@ -134,6 +136,7 @@ async def list_notifications(
     entity_id: Optional[uuid.UUID] = Query(None, description="Filter by entity"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces offset"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -156,15 +159,19 @@ async def list_notifications(
         except ValueError:
             pass
     
-    notifications, total = await service.get_user_notifications(
-        user_id=current_user.id,
-        is_read=is_read,
-        notification_type=type_enum,
-        priority=priority_enum,
-        entity_id=entity_id,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        notifications, total = await service.get_user_notifications(
+            user_id=current_user.id,
+            is_read=is_read,
+            notification_type=type_enum,
+            priority=priority_enum,
+            entity_id=entity_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     unread_count = await service.get_unread_count(current_user.id)
     
@@ -172,6 +179,7 @@ async def list_notifications(
         notifications=[notification_to_response(n) for n in notifications],
         total=total,
         unread_count=unread_count,
+        next_cursor=next_page_cursor(notifications, limit, NotificationService.PAGE_KEY),
     )
 
 
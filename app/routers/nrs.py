@@ -338,7 +338,9 @@ async def validate_tin(
     result: NRSTINValidationResponse = await nrs_client.validate_tin(
         tin=request.tin,
         name=request.name,
+        db=db,
     )
+    await db.commit()
     
     return NRSTINValidateResponse(
         is_valid=result.is_valid,
@@ -370,7 +372,8 @@ async def validate_tins_bulk(
         )
     
     nrs_client = get_nrs_client()
-    results = await nrs_client.bulk_validate_tins(request.tins)
+    results = await nrs_client.bulk_validate_tins(request.tins, db=db)
+    await db.commit()
     
     return [
         NRSTINValidateResponse(
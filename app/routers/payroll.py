@@ -381,6 +381,7 @@ async def calculate_salary_breakdown(
         pension_percentage=data.pension_percentage,
         is_pension_exempt=data.is_pension_exempt,
         is_nhf_exempt=data.is_nhf_exempt,
+        include_paye_breakdown=True,
     )
     
     return SalaryBreakdownResponse(**result)
@@ -26,6 +26,7 @@ from app.models.user import User
 from app.models.sku_enums import Feature
 from app.models.payroll import Employee
 from app.services.payroll_advanced_service import PayrollAdvancedService
+from app.services.salary_scenario_engine import SalaryScenario
 from app.services.audit_service import AuditService
 from app.models.audit_consolidated import AuditAction
 from app.schemas.payroll_advanced import (
@@ -53,6 +54,7 @@ from app.schemas.payroll_advanced import (
     CTCTrendResponse,
     WhatIfSimulationRequest,
     WhatIfSimulationResponse,
+    SalaryScenarioSweepRequest,
     GhostWorkerDetectionResponse,
     GhostWorkerScanResult,
     ResolveGhostWorkerRequest,
@@ -1634,18 +1636,26 @@ async def run_salary_increase_simulation(
             detail="salary_increase parameters required",
         )
     
-    simulation = await service.run_salary_increase_simulation(
-        entity_id=entity_id,
-        user_id=current_user.id,
-        simulation_name=data.simulation_name,
-        increase_type=data.salary_increase.increase_type,
-        increase_value=data.salary_increase.increase_value,
-        apply_to=data.salary_increase.apply_to,
-        department=data.salary_increase.department,
-        employee_ids=data.salary_increase.employee_ids,
-        description=data.description,
-        save_simulation=data.save_simulation,
-    )
+    try:
+        simulation = await service.run_salary_increase_simulation(
+            entity_id=entity_id,
+            user_id=current_user.id,
+            simulation_name=data.simulation_name,
+            increase_type=data.salary_increase.increase_type,
+            increase_value=data.salary_increase.increase_value,
+            apply_to=data.salary_increase.apply_to,
+            department=data.salary_increase.department,
+            employee_ids=data.salary_increase.employee_ids,
+            description=data.description,
+            save_simulation=data.save_simulation,
+            job_grade=data.salary_increase.job_grade,
+        )
+    except ValueError as e:
+        # Invalid scenario (unknown increase type, decrease over 100%)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     
     return {
         "message": "Simulation completed successfully",
@@ -1653,6 +1663,40 @@ async def run_salary_increase_simulation(
     }
 
 
+@router.post(
+    "/simulations/salary-increase/sweep",
+    response_model=dict,
+    summary="Compare salary increase scenarios",
+    description="Evaluate up to 100 salary increase scenarios over the current payroll without saving them.",
+)
+async def sweep_salary_scenarios(
+    data: SalaryScenarioSweepRequest,
+    db: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_active_user),
+    entity_id: uuid.UUID = Depends(get_current_entity_id),
+):
+    """Evaluate several salary increase scenarios in one pass."""
+    service = PayrollAdvancedService(db)
+    
+    try:
+        scenarios = [
+            SalaryScenario(**scenario.model_dump())
+            for scenario in data.scenarios
+        ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    results = await service.sweep_salary_scenarios(entity_id, scenarios)
+    
+    return {
+        "scenario_count": len(results),
+        "scenarios": results,
+    }
+
+
 @router.delete(
     "/simulations/{simulation_id}",
     response_model=dict,
@@ -1747,7 +1791,7 @@ async def get_ghost_detection(
     response_model=dict,
     status_code=status.HTTP_201_CREATED,
     summary="Run ghost worker scan",
-    description="Scan for duplicate employees (ghost workers).",
+    description="Scan for duplicate and near-duplicate employees (ghost workers).",
 )
 async def run_ghost_worker_scan(
     db: AsyncSession = Depends(get_async_session),
@@ -1758,9 +1802,11 @@ async def run_ghost_worker_scan(
     Run ghost worker detection scan.
     
     Scans for:
-    - Duplicate BVNs
-    - Duplicate bank accounts
-    - Duplicate NINs
+    - Duplicate BVNs, NINs and bank accounts (critical)
+    - Near-duplicates: transposed or mistyped digits, the same account at
+      a differently spelled bank, similar names with the same date of birth
+    
+    Detections are ranked by match score.
     """
     service = PayrollAdvancedService(db)
     return await service.run_ghost_worker_scan(entity_id)
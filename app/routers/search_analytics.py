@@ -7,7 +7,7 @@ analytics/forecasting features.
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
+from sqlalchemy import select, func
 from typing import List, Optional, Literal
 from uuid import UUID
 from datetime import date, datetime, timedelta
@@ -19,8 +19,7 @@ from app.models.user import User
 from app.models.transaction import Transaction
 from app.models.invoice import Invoice
 from app.models.customer import Customer
-from app.models.vendor import Vendor
-from app.models.inventory import InventoryItem
+from app.services.search_index_service import RESULT_URLS, SEARCH_TYPES, search_documents
 
 router = APIRouter(
     prefix="/api/v1/{entity_id}",
@@ -102,140 +101,28 @@ async def global_search(
     """
     await verify_entity_access(entity_id, current_user, db)
     
-    search_term = f"%{q.lower()}%"
-    results = []
-    by_type = {}
-    
     # Determine which types to search
-    type_filter = types.split(",") if types else ["transactions", "invoices", "customers", "vendors", "inventory"]
-    
-    # Search transactions
-    if "transactions" in type_filter:
-        query = select(Transaction).where(
-            Transaction.entity_id == entity_id,
-            or_(
-                func.lower(Transaction.description).like(search_term),
-                func.lower(Transaction.reference).like(search_term),
-            )
-        ).limit(limit)
-        
-        result = await db.execute(query)
-        transactions = result.scalars().all()
-        
-        tx_results = []
-        for tx in transactions:
-            tx_results.append(SearchResult(
-                id=str(tx.id),
-                type="transaction",
-                title=tx.description or "Transaction",
-                subtitle=f"₦{tx.amount:,.2f} - {tx.transaction_date}",
-                url=f"/transactions/{tx.id}",
-            ))
-        results.extend(tx_results)
-        by_type["transactions"] = len(tx_results)
-    
-    # Search invoices
-    if "invoices" in type_filter:
-        query = select(Invoice).where(
-            Invoice.entity_id == entity_id,
-            or_(
-                func.lower(Invoice.invoice_number).like(search_term),
-                func.lower(Invoice.notes).like(search_term),
-            )
-        ).limit(limit)
-        
-        result = await db.execute(query)
-        invoices = result.scalars().all()
-        
-        inv_results = []
-        for inv in invoices:
-            inv_results.append(SearchResult(
-                id=str(inv.id),
-                type="invoice",
-                title=inv.invoice_number,
-                subtitle=f"₦{inv.total_amount:,.2f} - {inv.status.value}",
-                url=f"/invoices/{inv.id}",
-            ))
-        results.extend(inv_results)
-        by_type["invoices"] = len(inv_results)
-    
-    # Search customers
-    if "customers" in type_filter:
-        query = select(Customer).where(
-            Customer.entity_id == entity_id,
-            or_(
-                func.lower(Customer.name).like(search_term),
-                func.lower(Customer.email).like(search_term),
-                func.lower(Customer.phone).like(search_term),
-            )
-        ).limit(limit)
-        
-        result = await db.execute(query)
-        customers = result.scalars().all()
-        
-        cust_results = []
-        for c in customers:
-            cust_results.append(SearchResult(
-                id=str(c.id),
-                type="customer",
-                title=c.name,
-                subtitle=c.email or c.phone,
-                url=f"/customers/{c.id}",
-            ))
-        results.extend(cust_results)
-        by_type["customers"] = len(cust_results)
-    
-    # Search vendors
-    if "vendors" in type_filter:
-        query = select(Vendor).where(
-            Vendor.entity_id == entity_id,
-            or_(
-                func.lower(Vendor.name).like(search_term),
-                func.lower(Vendor.email).like(search_term),
-                func.lower(Vendor.tin).like(search_term),
-            )
-        ).limit(limit)
-        
-        result = await db.execute(query)
-        vendors = result.scalars().all()
-        
-        vendor_results = []
-        for v in vendors:
-            vendor_results.append(SearchResult(
-                id=str(v.id),
-                type="vendor",
-                title=v.name,
-                subtitle=v.email or v.tin,
-                url=f"/vendors/{v.id}",
-            ))
-        results.extend(vendor_results)
-        by_type["vendors"] = len(vendor_results)
-    
-    # Search inventory
-    if "inventory" in type_filter:
-        query = select(InventoryItem).where(
-            InventoryItem.entity_id == entity_id,
-            or_(
-                func.lower(InventoryItem.name).like(search_term),
-                func.lower(InventoryItem.sku).like(search_term),
-                func.lower(InventoryItem.description).like(search_term),
-            )
-        ).limit(limit)
-        
-        result = await db.execute(query)
-        items = result.scalars().all()
-        
-        inv_results = []
-        for item in items:
-            inv_results.append(SearchResult(
-                id=str(item.id),
-                type="inventory",
-                title=item.name,
-                subtitle=f"SKU: {item.sku} - Qty: {item.quantity}",
-                url=f"/inventory/{item.id}",
-            ))
-        results.extend(inv_results)
-        by_type["inventory"] = len(inv_results)
+    type_filter = [t.strip() for t in types.split(",")] if types else list(SEARCH_TYPES)
+    searched = {name: SEARCH_TYPES[name] for name in type_filter if name in SEARCH_TYPES}
+    
+    # One ranked query over the entity's search documents (see search_index_service)
+    rows = await search_documents(db, entity_id, q, searched.values(), limit) if searched else []
+    
+    results = [
+        SearchResult(
+            id=str(row.resource_id),
+            type=row.resource_type,
+            title=row.title,
+            subtitle=row.subtitle,
+            url=RESULT_URLS[row.resource_type].format(id=row.resource_id),
+            relevance_score=round(float(row.score), 4),
+        )
+        for row in rows
+    ]
+    by_type = {
+        name: sum(1 for result in results if result.type == resource_type)
+        for name, resource_type in searched.items()
+    }
     
     return GlobalSearchResponse(
         query=q,
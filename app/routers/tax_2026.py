@@ -15,6 +15,7 @@ from typing import Optional, List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, UploadFile, File, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
@@ -46,6 +47,7 @@ from app.services.compliance_penalty_service import (
     PENALTY_SCHEDULE,
 )
 from app.services.peppol_export_service import (
+    PeppolBatchExporter,
     PeppolExportService,
     PeppolInvoice,
     PeppolParty,
@@ -1317,7 +1319,7 @@ async def get_monthly_paye_breakdown(
         pension_percentage=Decimal(str(pension_percentage)),
     )
     
-    annual_tax = result.get("annual_paye_tax", 0)
+    annual_tax = result["annual_tax"]
     monthly_tax = annual_tax / 12
     monthly_gross = gross_annual_income / 12
     monthly_net = monthly_gross - monthly_tax - (gross_annual_income * pension_percentage / 100 / 12)
@@ -2005,7 +2007,8 @@ async def validate_tins_bulk(
     Validate multiple TINs in a single request.
     
     Useful for bulk vendor/customer onboarding.
-    Maximum 50 TINs per request.
+    Maximum 50 TINs per request. Duplicates and recently verified TINs
+    are answered from the TIN verification cache.
     """
     service = TINValidationService(db)
     
@@ -2013,9 +2016,7 @@ async def validate_tins_bulk(
     valid_count = 0
     invalid_count = 0
     
-    for tin in request.tins:
-        result = await service.validate_tin(tin=tin)
-        
+    for result in await service.bulk_validate_tins(request.tins):
         if result.is_valid:
             valid_count += 1
         else:
@@ -2706,6 +2707,7 @@ async def get_peppol_info():
             "CSID (Cryptographic Stamp ID) generation",
             "QR code data embedding",
             "NRS compliance metadata",
+            "Batch export to zip or NDJSON (streamed)",
         ],
         "compliance_reference": "Nigeria Tax Administration Act 2026",
     }
@@ -3178,6 +3180,85 @@ async def export_existing_invoice_json(
     )
 
 
+@router.get(
+    "/{entity_id}/peppol/export/batch",
+    summary="Batch export invoices as Peppol XML or JSON",
+    tags=["2026 Reform - Peppol Export"],
+)
+async def export_invoices_batch(
+    entity_id: UUID,
+    format: str = Query("xml", pattern="^(xml|json)$", description="Document format"),
+    container: str = Query("zip", pattern="^(zip|ndjson)$", description="zip (one file per invoice) or ndjson (JSON only)"),
+    start_date: Optional[date] = Query(None, description="First invoice date"),
+    end_date: Optional[date] = Query(None, description="Last invoice date"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Export an entity's finalized invoices for NRS submission or audit.
+    
+    Invoices are read from a server-side cursor and written to the
+    response one at a time (UBL 2.1 XML or Peppol JSON, each with its
+    CSID and QR data), so a month of invoices streams in constant memory.
+    """
+    await verify_entity_access(entity_id, current_user, db)
+    
+    if container == "ndjson" and format != "json":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="NDJSON exports carry JSON invoices; use format=json",
+        )
+    
+    from app.database import async_session_factory
+    from app.models.entity import BusinessEntity
+    from app.models.invoice import Invoice, InvoiceStatus
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+    
+    entity = await db.get(BusinessEntity, entity_id)
+    if not entity:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Entity not found",
+        )
+    
+    query = (
+        select(Invoice)
+        .options(selectinload(Invoice.customer), selectinload(Invoice.line_items))
+        .where(Invoice.entity_id == entity_id, Invoice.status != InvoiceStatus.DRAFT)
+        .order_by(Invoice.invoice_date, Invoice.invoice_number)
+        .execution_options(yield_per=500)
+    )
+    if start_date:
+        query = query.where(Invoice.invoice_date >= start_date)
+    if end_date:
+        query = query.where(Invoice.invoice_date <= end_date)
+    
+    service = PeppolExportService()
+    exporter = PeppolBatchExporter(service)
+    seller = service.party_from_entity(entity)
+    
+    async def invoices():
+        # Own session: the request's session may be closed once streaming starts
+        async with async_session_factory() as session:
+            result = await session.stream_scalars(query)
+            async for invoice in result:
+                yield service.invoice_from_model(invoice, seller)
+    
+    filename = f"peppol_{entity_id}_{start_date or 'all'}_{end_date or date.today()}"
+    if container == "ndjson":
+        return StreamingResponse(
+            exporter.aiter_ndjson(invoices()),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename={filename}.ndjson"},
+        )
+    return StreamingResponse(
+        exporter.aiter_zip(invoices(), format),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}_{format}.zip"},
+    )
+
+
 # ===========================================
 # SELF-ASSESSMENT & TAXPRO MAX EXPORT ENDPOINTS
 # ===========================================
@@ -37,6 +37,7 @@ from app.services.entity_service import EntityService
 from app.services.audit_service import AuditService
 from app.services.metering_service import MeteringService
 from app.utils.permissions import OrganizationPermission, has_organization_permission
+from app.utils.query_optimization import InvalidCursorError, keyset_paginate, next_page_cursor
 
 
 router = APIRouter()
@@ -91,6 +92,7 @@ class TransactionListResponse(BaseModel):
     total: int
     total_amount: float
     total_vat: float
+    next_cursor: Optional[str] = None
 
 
 class TransactionSummaryResponse(BaseModel):
@@ -121,6 +123,7 @@ async def list_transactions(
     category_id: Optional[UUID] = Query(None),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces offset"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -134,15 +137,19 @@ async def list_transactions(
         )
     
     transaction_service = TransactionService(db)
-    transactions, total = await transaction_service.get_transactions_for_entity(
-        entity_id,
-        start_date=start_date,
-        end_date=end_date,
-        transaction_type=transaction_type,
-        category_id=category_id,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        transactions, total = await transaction_service.get_transactions_for_entity(
+            entity_id,
+            start_date=start_date,
+            end_date=end_date,
+            transaction_type=transaction_type,
+            category_id=category_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     totals = await transaction_service.get_totals(
         entity_id,
@@ -180,6 +187,7 @@ async def list_transactions(
         total=total,
         total_amount=totals["total_amount"],
         total_vat=totals["total_vat"],
+        next_cursor=next_page_cursor(transactions, limit, TransactionService.PAGE_KEY),
     )
 
 
@@ -990,6 +998,7 @@ async def get_uncategorized_transactions(
     entity_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -1012,7 +1021,13 @@ async def get_uncategorized_transactions(
         Transaction.entity_id == entity_id,
         Transaction.category_id == None,
         Transaction.is_deleted == False,
-    ).offset(skip).limit(limit)
+    )
+    try:
+        query = keyset_paginate(query, TransactionService.PAGE_KEY, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not cursor:
+        query = query.offset(skip)
     
     result = await db.execute(query)
     transactions = result.scalars().all()
@@ -1022,6 +1037,7 @@ async def get_uncategorized_transactions(
         total=len(transactions),
         total_amount=sum(float(t.amount) for t in transactions),
         total_vat=sum(float(t.vat_amount) for t in transactions),
+        next_cursor=next_page_cursor(transactions, limit, TransactionService.PAGE_KEY),
     )
 
 
@@ -1035,6 +1051,7 @@ async def get_pending_wren_transactions(
     entity_id: UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_async_session),
 ):
@@ -1056,7 +1073,13 @@ async def get_pending_wren_transactions(
         Transaction.wren_status == WRENStatus.PENDING,
         Transaction.is_deleted == False,
         Transaction.created_by_id != current_user.id,  # Maker-Checker: can't verify own
-    ).offset(skip).limit(limit)
+    )
+    try:
+        query = keyset_paginate(query, TransactionService.PAGE_KEY, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not cursor:
+        query = query.offset(skip)
     
     result = await db.execute(query)
     transactions = result.scalars().all()
@@ -1066,6 +1089,7 @@ async def get_pending_wren_transactions(
         total=len(transactions),
         total_amount=sum(float(t.amount) for t in transactions),
         total_vat=sum(float(t.vat_amount) for t in transactions),
+        next_cursor=next_page_cursor(transactions, limit, TransactionService.PAGE_KEY),
     )
 
 
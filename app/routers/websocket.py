@@ -45,6 +45,7 @@ class WebSocketStats(BaseModel):
     unique_tenants: int
     channels: dict
     queued_messages: int
+    delivery: dict = {}
 
 
 class ChannelSubscription(BaseModel):
@@ -282,7 +283,8 @@ async def get_websocket_stats():
     """
     Get WebSocket connection statistics.
     
-    Returns current connection counts, channel subscriptions, and queue status.
+    Returns current connection counts, channel subscriptions, queue status,
+    and send-queue depth / latency metrics.
     """
     ws_manager = get_ws_manager()
     stats = ws_manager.get_stats()
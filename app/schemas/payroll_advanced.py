@@ -522,11 +522,22 @@ class SalaryIncreaseScenario(BaseModel):
     """Salary increase simulation parameters."""
     increase_type: Literal["percentage", "flat_amount"]
     increase_value: Decimal
-    apply_to: Literal["all", "department", "employee_list"]
+    apply_to: Literal["all", "department", "job_grade", "employee_list"]
     department: Optional[str] = None
+    job_grade: Optional[str] = None
     employee_ids: Optional[List[UUID]] = None
 
 
+class NamedSalaryScenario(SalaryIncreaseScenario):
+    """Salary increase scenario within a sweep."""
+    name: str = Field(..., max_length=255)
+
+
+class SalaryScenarioSweepRequest(BaseModel):
+    """Evaluate several salary increase scenarios without saving them."""
+    scenarios: List[NamedSalaryScenario] = Field(..., min_length=1, max_length=100)
+
+
 class NewHireScenario(BaseModel):
     """New hire simulation parameters."""
     count: int
@@ -613,6 +624,8 @@ class GhostWorkerDetectionResponse(BaseModel):
     duplicate_field: str
     duplicate_value: str
     severity: str
+    match_score: Optional[float] = None
+    features: Optional[Dict[str, Any]] = None
     
     is_resolved: bool
     resolution_note: Optional[str] = None
@@ -28,7 +28,7 @@ from app.services.organization_user_service import OrganizationUserService
 # 2026 Tax Reform Services
 from app.services.tin_validation_service import TINValidationService, get_tin_validation_service
 from app.services.compliance_penalty_service import CompliancePenaltyService, PenaltyType, PenaltyStatus
-from app.services.peppol_export_service import PeppolExportService, get_peppol_export_service
+from app.services.peppol_export_service import PeppolExportService, PeppolBatchExporter, get_peppol_export_service
 from app.services.buyer_review_service import BuyerReviewService
 from app.services.vat_recovery_service import VATRecoveryService
 from app.services.development_levy_service import DevelopmentLevyService
@@ -80,6 +80,7 @@ __all__ = [
     "PenaltyType",
     "PenaltyStatus",
     "PeppolExportService",
+    "PeppolBatchExporter",
     "get_peppol_export_service",
     "BuyerReviewService",
     "VATRecoveryService",
@@ -8,6 +8,8 @@ Comprehensive OCR service with:
 - Multi-language support
 - Image preprocessing
 - Confidence scoring
+- Batch processing: bounded provider concurrency, page-level parallelism
+  for multi-page PDFs/TIFFs and a content-hash result cache
 
 Nigerian Tax Reform 2026 Compliant
 """
@@ -15,18 +17,23 @@ Nigerian Tax Reform 2026 Compliant
 import os
 import re
 import io
+import time
 import base64
-import hashlib
+import asyncio
+import copy
 import logging
 import random
+import weakref
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Optional, List, Dict, Any, Tuple, Union
-from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple, Union, Callable, Awaitable
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 import numpy as np
 
 from app.config import settings
+from app.services.compute_pool import run_compute, sha256_hexdigest
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +162,7 @@ class ExtractedDocument:
     processing_time_ms: int = 0
     page_count: int = 1
     warnings: List[str] = field(default_factory=list)
+    cache_hit: bool = False
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -200,7 +208,34 @@ class ExtractedDocument:
             "processing_time_ms": self.processing_time_ms,
             "page_count": self.page_count,
             "warnings": self.warnings,
+            "cache_hit": self.cache_hit,
         }
+    
+    def to_cache_dict(self) -> Dict[str, Any]:
+        """Lossless JSON-safe form for the result cache."""
+        data = asdict(self)
+        data["document_type"] = self.document_type.value
+        for name in ("transaction_date", "due_date"):
+            if data[name]:
+                data[name] = data[name].isoformat()
+        return data
+    
+    @classmethod
+    def from_cache_dict(cls, data: Dict[str, Any]) -> "ExtractedDocument":
+        """Rebuild a document stored with to_cache_dict."""
+        data = dict(data)
+        data["document_type"] = DocumentType(data["document_type"])
+        for name in ("transaction_date", "due_date"):
+            if data.get(name):
+                data[name] = date.fromisoformat(data[name])
+        vendor = data.get("vendor")
+        if vendor:
+            address = vendor.get("address")
+            data["vendor"] = ExtractedVendor(**{
+                **vendor, "address": ExtractedAddress(**address) if address else None
+            })
+        data["line_items"] = [ExtractedLineItem(**item) for item in data.get("line_items") or []]
+        return cls(**data)
 
 
 # =============================================================================
@@ -254,6 +289,55 @@ class ImagePreprocessor:
             logger.warning(f"Image preprocessing failed: {e}")
             return image_bytes
     
+    @staticmethod
+    def split_pages(
+        file_content: bytes,
+        content_type: str,
+        max_pages: int
+    ) -> List[Tuple[bytes, str]]:
+        """
+        Split a multi-page PDF or TIFF into single-page documents.
+        
+        Returns (content, content_type) per page, or the original document
+        alone when it has one page, more than max_pages, or cannot be split
+        (PDF splitting needs the optional pypdf package).
+        """
+        unsplit = [(file_content, content_type)]
+        try:
+            if content_type == "application/pdf":
+                from pypdf import PdfReader, PdfWriter
+                
+                reader = PdfReader(io.BytesIO(file_content))
+                if not 1 < len(reader.pages) <= max_pages:
+                    return unsplit
+                pages = []
+                for page in reader.pages:
+                    writer = PdfWriter()
+                    writer.add_page(page)
+                    output = io.BytesIO()
+                    writer.write(output)
+                    pages.append((output.getvalue(), content_type))
+                return pages
+            
+            if content_type == "image/tiff":
+                from PIL import Image, ImageSequence
+                
+                image = Image.open(io.BytesIO(file_content))
+                if not 1 < getattr(image, "n_frames", 1) <= max_pages:
+                    return unsplit
+                pages = []
+                for frame in ImageSequence.Iterator(image):
+                    output = io.BytesIO()
+                    frame.save(output, format="PNG")
+                    pages.append((output.getvalue(), "image/png"))
+                return pages
+            
+        except ImportError:
+            logger.debug(f"No library to split {content_type}, processing unsplit")
+        except Exception as e:
+            logger.warning(f"Page splitting failed: {e}")
+        return unsplit
+    
     @staticmethod
     def detect_orientation(image_bytes: bytes) -> int:
         """Detect image orientation (0, 90, 180, 270 degrees)."""
@@ -274,59 +358,6 @@ class ImagePreprocessor:
 class NigerianDocumentPatterns:
     """Patterns for extracting data from Nigerian documents."""
     
-    # Nigerian TIN formats
-    TIN_PATTERNS = [
-        r'\b(\d{8}-\d{4})\b',  # Old format: XXXXXXXX-XXXX
-        r'\b(\d{10})\b',       # New format: 10 digits
-        r'TIN[:\s#]*(\d{10})',
-        r'Tax\s*ID[:\s#]*(\d{10})',
-    ]
-    
-    # Nigerian phone numbers
-    PHONE_PATTERNS = [
-        r'\b(0[789][01]\d{8})\b',           # 080x, 070x, 090x
-        r'\b(\+234[789][01]\d{8})\b',       # +234...
-        r'\b(234[789][01]\d{8})\b',         # 234...
-    ]
-    
-    # Bank account numbers (10 digits)
-    BANK_ACCOUNT_PATTERN = r'\b(\d{10})\b'
-    
-    # Money amounts (Naira)
-    MONEY_PATTERNS = [
-        r'(?:NGN|₦|N)\s*([\d,]+(?:\.\d{2})?)',
-        r'([\d,]+(?:\.\d{2})?)\s*(?:NGN|₦|Naira)',
-        r'Total[:\s]*([\d,]+(?:\.\d{2})?)',
-        r'Amount[:\s]*([\d,]+(?:\.\d{2})?)',
-    ]
-    
-    # VAT patterns
-    VAT_PATTERNS = [
-        r'VAT[:\s@]*(\d+(?:\.\d+)?)\s*%',
-        r'(\d+(?:\.\d+)?)\s*%\s*VAT',
-        r'VAT[:\s]*([\d,]+(?:\.\d{2})?)',
-    ]
-    
-    # WHT patterns
-    WHT_PATTERNS = [
-        r'WHT[:\s@]*(\d+(?:\.\d+)?)\s*%',
-        r'(?:Withholding\s*Tax)[:\s]*([\d,]+(?:\.\d{2})?)',
-    ]
-    
-    # Date patterns
-    DATE_PATTERNS = [
-        (r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})', 'DMY'),
-        (r'(\d{4})[/\-](\d{1,2})[/\-](\d{1,2})', 'YMD'),
-        (r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*[,\s]+(\d{4})', 'DMY_TEXT'),
-    ]
-    
-    # Invoice/Receipt numbers
-    INVOICE_PATTERNS = [
-        r'(?:Invoice|Inv)[#:\s-]*([A-Z0-9\-]+)',
-        r'(?:Receipt|Rcpt)[#:\s-]*([A-Z0-9\-]+)',
-        r'(?:Reference|Ref)[#:\s-]*([A-Z0-9\-]+)',
-    ]
-    
     # Nigerian states for address extraction
     NIGERIAN_STATES = [
         "Abia", "Adamawa", "Akwa Ibom", "Anambra", "Bauchi", "Bayelsa", "Benue",
@@ -343,110 +374,228 @@ class NigerianDocumentPatterns:
         "Ecobank", "Citibank", "Standard Chartered", "Heritage", "Providus",
         "Globus", "Titan Trust", "TAJ Bank", "Jaiz Bank", "Lotus Bank"
     ]
+    
+    MONTHS = {
+        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4,
+        'may': 5, 'jun': 6, 'jul': 7, 'aug': 8,
+        'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+    }
+    
+    # Label words (lowercase, spaces and hyphens removed) and the field of
+    # the value that follows them
+    LABELS = {
+        "subtotal": "subtotal", "total": "total", "amount": "amount",
+        "vat": "vat", "wht": "wht", "withholdingtax": "wht",
+        "tin": "tin", "taxid": "tin",
+    }
+    
+    # When labels follow each other ("Total VAT", "Total Amount") the more
+    # specific one wins
+    LABEL_PRIORITY = {"amount": 0, "total": 1, "subtotal": 1, "vat": 2, "wht": 2, "tin": 3}
+    
+    # Every field in one alternation, tried in order at each word start
+    # (the lookarounds reject other positions before any branch runs); the
+    # name of the outer matching group is the token kind. Plain words
+    # produce no token: text between a label and its value breaks the pair
+    # through FIELD_GAP.
+    FIELD_TOKEN = re.compile(
+        r"""
+        (?<![\w@])(?=[A-Za-z0-9+₦])(?:
+          (?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})
+        | (?P<date>\d{1,2}[/-]\d{1,2}[/-]\d{4}
+                 | \d{4}[/-]\d{1,2}[/-]\d{1,2}
+                 | \d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?[,\s]+\d{4}
+          )(?!\d)
+        | (?P<phone>(?:\+?234|0)[789][01]\d{8})(?!\d)
+        | (?P<tin>\d{8}-\d{2})(?![\d-])
+        | (?P<percent>\d+(?:\.\d+)?)[ \t]*%
+        | (?P<number>(?P<digits>\d[\d,]*(?:\.\d+)?)(?!\w)(?:[ \t]*(?:ngn|naira|₦)(?![A-Za-z]))?)
+        | (?P<money>(?:ngn|naira|₦|n)\.?[ \t]*(?P<money_digits>\d[\d,]*(?:\.\d+)?)(?!\w))
+        | (?P<code>(?:inv|rcpt?|ref)[-/#]?[A-Za-z]*\d[\w/-]*)
+        | (?P<reference>(?:invoice|inv|receipt|rcpt|reference|ref)\.?(?:[ \t]+(?:no|number|num|id)\.?)?[ \t:#-]*
+                        (?P<reference_value>(?=[\w/-]*\d)[A-Za-z0-9][\w/-]*))
+        | (?P<label>(?P<label_word>sub[\s-]*total|total|amount|vat|wht|withholding\s+tax|tin|tax\s*id)
+                    (?![\w-])(?:[ \t]+(?:due|payable|paid)(?!\w))?)
+        | (?P<state>""" + "|".join(s.replace(" ", r"\s+") for s in NIGERIAN_STATES) + r""")(?![A-Za-z])
+        )
+        """,
+        re.IGNORECASE | re.VERBOSE,
+    )
+    
+    # What may separate a label from its value: punctuation and at most
+    # one line break
+    FIELD_GAP = re.compile(r"[ \t:#@=()\-]*(?:\r?\n[ \t:#@=()\-]*)?")
+    
+    LINE = re.compile(r"[^\r\n]+")
+
+
+@dataclass
+class FieldCandidate:
+    """A field value found in text, with its position."""
+    field: str  # tin, phone, email, date, invoice_number, amount, vat_rate, ...
+    value: Any
+    start: int
+    end: int
+    label: Optional[str] = None  # amounts: total, subtotal, amount or currency
+    
+    def text_in(self, text: str) -> str:
+        return text[self.start:self.end]
 
 
 class TextExtractor:
-    """Extract structured data from raw text."""
+    """
+    Extract structured data from raw text.
+    
+    scan() reads the text once with a single compiled token pattern and
+    returns every field candidate with its position; extract_all() and the
+    extract_* helpers pick their fields from that list.
+    """
     
     def __init__(self):
         self.patterns = NigerianDocumentPatterns()
+        self._states = {state.lower(): state for state in self.patterns.NIGERIAN_STATES}
+    
+    def scan(self, text: str) -> List[FieldCandidate]:
+        """Find all field candidates in one pass over the text."""
+        patterns = self.patterns
+        adjacent = patterns.FIELD_GAP.fullmatch
+        candidates: List[FieldCandidate] = []
+        label: Optional[Tuple[str, int, int]] = None  # (field, start, end) awaiting a value
+        percent: Optional[Tuple[float, int, int]] = None  # rate awaiting a VAT/WHT label
+        
+        for match in patterns.FIELD_TOKEN.finditer(text):
+            kind = match.lastgroup
+            start, end = match.span()
+            if label and adjacent(text, label[2], start) is None:
+                label = None
+            
+            if kind == "number" or kind == "money":
+                digits = match.group("digits" if kind == "number" else "money_digits")
+                value = float(digits.replace(",", ""))
+                field = label[0] if label else None
+                if kind == "number" and len(digits) == 10 and digits.isdigit():
+                    candidates.append(FieldCandidate("tin", digits, start, start + 10, field))
+                if field in ("total", "subtotal", "amount"):
+                    candidates.append(FieldCandidate("amount", value, label[1], end, field))
+                elif field in ("vat", "wht"):
+                    suffix = "rate" if value <= 100 else "amount"
+                    candidates.append(FieldCandidate(f"{field}_{suffix}", value, label[1], end, field))
+                elif kind == "money" or end - start > len(digits):
+                    candidates.append(FieldCandidate("amount", value, start, end, "currency"))
+                label = None
+            
+            elif kind == "label":
+                word = match.group("label_word").lower().replace("-", " ")
+                field = patterns.LABELS["".join(word.split())]
+                if percent and field in ("vat", "wht") and adjacent(text, percent[2], start):
+                    candidates.append(FieldCandidate(f"{field}_rate", percent[0], percent[1], end, field))
+                if label is None or patterns.LABEL_PRIORITY[field] >= patterns.LABEL_PRIORITY[label[0]]:
+                    label = (field, label[1] if label else start, end)
+                else:
+                    label = (label[0], label[1], end)
+            
+            elif kind == "percent":
+                value = float(match.group(kind))
+                if label and label[0] in ("vat", "wht"):
+                    candidates.append(FieldCandidate(f"{label[0]}_rate", value, label[1], end, label[0]))
+                    label = None
+                else:
+                    percent = (value, start, end)
+                    continue
+            
+            else:
+                if kind == "date":
+                    value = self._parse_date(match.group(kind))
+                    if value:
+                        candidates.append(FieldCandidate("date", value, start, end))
+                elif kind == "tin":
+                    candidates.append(FieldCandidate(
+                        "tin", match.group(kind).replace("-", ""), start, end, label[0] if label else None
+                    ))
+                elif kind == "reference" or kind == "code":
+                    group = "reference_value" if kind == "reference" else kind
+                    candidates.append(FieldCandidate("invoice_number", match.group(group), *match.span(group)))
+                elif kind == "state":
+                    state = self._states[" ".join(match.group(kind).lower().split())]
+                    candidates.append(FieldCandidate("state", state, start, end))
+                else:  # email, phone
+                    candidates.append(FieldCandidate(kind, match.group(kind), start, end))
+                label = None
+            
+            percent = None
+        
+        return candidates
+    
+    def _parse_date(self, raw: str) -> Optional[date]:
+        parts = re.split(r"[/\-,.\s]+", raw.strip())
+        try:
+            if parts[1].isdigit():
+                if len(parts[0]) == 4:
+                    return date(int(parts[0]), int(parts[1]), int(parts[2]))
+                return date(int(parts[2]), int(parts[1]), int(parts[0]))
+            return date(int(parts[-1]), self.patterns.MONTHS[parts[1][:3].lower()], int(parts[0]))
+        except (ValueError, KeyError, IndexError):
+            return None
+    
+    @staticmethod
+    def _values(candidates: List[FieldCandidate], field: str) -> List[Any]:
+        return [c.value for c in candidates if c.field == field]
+    
+    def _pick_tin(self, candidates: List[FieldCandidate]) -> Optional[str]:
+        tins = [c for c in candidates if c.field == "tin"]
+        labelled = [c for c in tins if c.label == "tin"]
+        return (labelled or tins)[0].value if tins else None
+    
+    def _pick_address(self, candidates: List[FieldCandidate], text: str) -> Optional[ExtractedAddress]:
+        state = next((c for c in candidates if c.field == "state"), None)
+        if state is None:
+            return None
+        line_start = text.rfind("\n", 0, state.start) + 1
+        line_end = text.find("\n", state.end)
+        return ExtractedAddress(
+            full_address=text[line_start:line_end if line_end != -1 else len(text)].strip(),
+            state=state.value,
+            country="Nigeria"
+        )
     
     def extract_tin(self, text: str) -> Optional[str]:
-        """Extract TIN from text."""
-        for pattern in self.patterns.TIN_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                tin = match.group(1).replace("-", "")
-                if len(tin) == 10 and tin.isdigit():
-                    return tin
-        return None
+        """Extract TIN from text (a labelled TIN wins over a bare 10-digit number)."""
+        return self._pick_tin(self.scan(text))
     
     def extract_phone(self, text: str) -> List[str]:
         """Extract phone numbers from text."""
-        phones = []
-        for pattern in self.patterns.PHONE_PATTERNS:
-            matches = re.findall(pattern, text)
-            phones.extend(matches)
-        return list(set(phones))
+        return list(dict.fromkeys(self._values(self.scan(text), "phone")))
     
     def extract_money(self, text: str) -> List[Tuple[str, float]]:
-        """Extract money amounts from text."""
-        amounts = []
-        
-        for pattern in self.patterns.MONEY_PATTERNS:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    amount_str = match.group(1).replace(",", "")
-                    amount = float(amount_str)
-                    amounts.append((match.group(0), amount))
-                except (ValueError, IndexError):
-                    continue
-        
-        return amounts
+        """Extract labelled or currency-marked money amounts from text."""
+        return [(c.text_in(text), c.value) for c in self.scan(text) if c.field == "amount"]
     
     def extract_date(self, text: str) -> Optional[date]:
-        """Extract date from text."""
-        months = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4,
-            'may': 5, 'jun': 6, 'jul': 7, 'aug': 8,
-            'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-        }
-        
-        for pattern, fmt in self.patterns.DATE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    groups = match.groups()
-                    if fmt == 'DMY':
-                        day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
-                    elif fmt == 'YMD':
-                        year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                    elif fmt == 'DMY_TEXT':
-                        day = int(groups[0])
-                        month = months.get(groups[1].lower()[:3], 1)
-                        year = int(groups[2])
-                    else:
-                        continue
-                    
-                    return date(year, month, day)
-                except (ValueError, IndexError):
-                    continue
-        
-        return None
+        """Extract the first valid date from text."""
+        return next(iter(self._values(self.scan(text), "date")), None)
     
     def extract_vat(self, text: str) -> Tuple[Optional[float], Optional[float]]:
         """Extract VAT rate and amount."""
-        rate = None
-        amount = None
-        
-        for pattern in self.patterns.VAT_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    value = float(match.group(1).replace(",", ""))
-                    if value <= 100:  # Probably a rate
-                        rate = value
-                    else:  # Probably an amount
-                        amount = value
-                except (ValueError, IndexError):
-                    continue
-        
-        return rate, amount
+        candidates = self.scan(text)
+        return (
+            next(iter(self._values(candidates, "vat_rate")), None),
+            next(iter(self._values(candidates, "vat_amount")), None),
+        )
     
     def extract_invoice_number(self, text: str) -> Optional[str]:
         """Extract invoice or receipt number."""
-        for pattern in self.patterns.INVOICE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return None
+        return next(iter(self._values(self.scan(text), "invoice_number")), None)
     
     def extract_vendor_name(self, text: str) -> Optional[str]:
         """Extract vendor/company name (first non-empty line typically)."""
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
-        
-        for line in lines[:5]:  # Check first 5 lines
+        checked = 0
+        for match in self.patterns.LINE.finditer(text):
+            line = match.group().strip()
+            if not line:
+                continue
+            checked += 1
+            if checked > 5:  # Check first 5 lines
+                break
             # Skip common headers
             if any(skip in line.lower() for skip in ['invoice', 'receipt', 'date', 'tax']):
                 continue
@@ -457,60 +606,43 @@ class TextExtractor:
         return None
     
     def extract_address(self, text: str) -> Optional[ExtractedAddress]:
-        """Extract address from text."""
-        # Look for Nigerian state names
-        for state in self.patterns.NIGERIAN_STATES:
-            if state.lower() in text.lower():
-                # Try to find address context
-                pattern = rf'([^.]*{state}[^.]*)'
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    return ExtractedAddress(
-                        full_address=match.group(1).strip(),
-                        state=state,
-                        country="Nigeria"
-                    )
-        
-        return None
+        """Extract address: the line naming the first Nigerian state."""
+        return self._pick_address(self.scan(text), text)
     
     def extract_email(self, text: str) -> Optional[str]:
         """Extract email address."""
-        pattern = r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'
-        match = re.search(pattern, text)
-        return match.group(1) if match else None
+        return next(iter(self._values(self.scan(text), "email")), None)
     
     def extract_all(self, text: str) -> Dict[str, Any]:
-        """Extract all structured data from text."""
-        amounts = self.extract_money(text)
-        vat_rate, vat_amount = self.extract_vat(text)
+        """Extract all structured data from text in a single scan."""
+        candidates = self.scan(text)
+        amounts = [c for c in candidates if c.field == "amount"]
         
-        # Try to identify total, subtotal
-        total = None
-        subtotal = None
-        
-        for label, amount in amounts:
-            label_lower = label.lower()
-            if 'total' in label_lower and 'sub' not in label_lower:
-                total = amount
-            elif 'sub' in label_lower:
-                subtotal = amount
+        # Last labelled total/subtotal wins (running totals come first)
+        total = next((c.value for c in reversed(amounts) if c.label == "total"), None)
+        subtotal = next((c.value for c in reversed(amounts) if c.label == "subtotal"), None)
         
         # If no labeled total, use largest amount
         if not total and amounts:
-            total = max(a[1] for a in amounts)
+            total = max(c.value for c in amounts)
+        
+        def first(field: str):
+            return next((c.value for c in candidates if c.field == field), None)
         
         return {
             "vendor_name": self.extract_vendor_name(text),
-            "tin": self.extract_tin(text),
-            "phone_numbers": self.extract_phone(text),
-            "email": self.extract_email(text),
-            "transaction_date": self.extract_date(text),
-            "invoice_number": self.extract_invoice_number(text),
-            "address": self.extract_address(text),
-            "amounts": amounts,
+            "tin": self._pick_tin(candidates),
+            "phone_numbers": list(dict.fromkeys(self._values(candidates, "phone"))),
+            "email": first("email"),
+            "transaction_date": first("date"),
+            "invoice_number": first("invoice_number"),
+            "address": self._pick_address(candidates, text),
+            "amounts": [(c.text_in(text), c.value) for c in amounts],
             "subtotal": subtotal,
-            "vat_rate": vat_rate,
-            "vat_amount": vat_amount,
+            "vat_rate": first("vat_rate"),
+            "vat_amount": first("vat_amount"),
+            "wht_rate": first("wht_rate"),
+            "wht_amount": first("wht_amount"),
             "total_amount": total,
         }
 
@@ -524,12 +656,32 @@ class AdvancedOCRService:
     Advanced OCR Service with multiple provider support.
     """
     
+    # Multi-page formats split into pages for parallel OCR
+    SPLITTABLE_CONTENT_TYPES = ("application/pdf", "image/tiff")
+    
+    # Merging pages: header fields come from the first page that has them,
+    # totals from the last
+    HEADER_FIELDS = (
+        "vendor", "transaction_date", "due_date", "receipt_number", "invoice_number",
+        "po_number", "payment_method", "payment_reference",
+    )
+    TOTAL_FIELDS = (
+        "subtotal", "discount", "vat_amount", "vat_rate", "wht_amount", "wht_rate",
+        "total_amount", "amount_paid", "balance_due",
+    )
+    
     def __init__(self):
         self.azure_endpoint = getattr(settings, 'azure_form_recognizer_endpoint', '')
         self.azure_key = getattr(settings, 'azure_form_recognizer_key', '')
         self.preprocessor = ImagePreprocessor()
         self.extractor = TextExtractor()
         self.provider = self._determine_provider()
+        
+        # content hash/provider/type -> ExtractedDocument (LRU)
+        self._result_cache: "OrderedDict[str, ExtractedDocument]" = OrderedDict()
+        self._page_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
     
     def _determine_provider(self) -> OCRProvider:
         """Determine which OCR provider to use."""
@@ -557,6 +709,10 @@ class AdvancedOCRService:
         """
         Process a document and extract structured data.
         
+        Identical content is served from the result cache (cache_hit=True).
+        Multi-page PDFs and TIFFs are split and their pages processed in
+        parallel.
+        
         Args:
             file_content: Raw file bytes
             filename: Original filename
@@ -564,46 +720,176 @@ class AdvancedOCRService:
             document_type: Type of document
             preprocess: Whether to preprocess image
         """
-        import time
+        content_hash = await sha256_hexdigest(file_content)
+        return await self._process_document(
+            file_content, filename, content_type, document_type, preprocess, content_hash
+        )
+    
+    async def _process_document(
+        self,
+        file_content: bytes,
+        filename: str,
+        content_type: str,
+        document_type: DocumentType,
+        preprocess: bool,
+        content_hash: str
+    ) -> ExtractedDocument:
         start_time = time.time()
+        cache_key = f"{content_hash}:{self.provider.value}:{document_type.value}:{int(preprocess)}"
         
-        # Preprocess image if needed
-        if preprocess and content_type.startswith('image/'):
-            file_content = self.preprocessor.preprocess_for_ocr(file_content)
+        result = await self._get_cached_result(cache_key)
+        if result is not None:
+            result.processing_time_ms = int((time.time() - start_time) * 1000)
+            return result
         
-        # Select processing method based on provider and document type
-        if self.provider == OCRProvider.AZURE_DOCUMENT_INTELLIGENCE:
-            if document_type == DocumentType.RECEIPT:
-                result = await self._process_azure_receipt(file_content)
-            elif document_type == DocumentType.INVOICE:
-                result = await self._process_azure_invoice(file_content)
-            else:
-                result = await self._process_azure_general(file_content)
-        elif self.provider == OCRProvider.TESSERACT:
-            result = await self._process_tesseract(file_content)
+        pages = [(file_content, content_type)]
+        if content_type in self.SPLITTABLE_CONTENT_TYPES:
+            pages = await run_compute(
+                "image", self.preprocessor.split_pages,
+                file_content, content_type, settings.ocr_max_split_pages
+            )
+        
+        if len(pages) > 1:
+            result = self._merge_pages(await asyncio.gather(*(
+                self._process_page(page, filename, page_type, document_type, preprocess)
+                for page, page_type in pages
+            )))
         else:
-            result = await self._process_internal(file_content, filename)
+            result = await self._process_page(
+                file_content, filename, content_type, document_type, preprocess
+            )
         
         # Calculate processing time
         result.processing_time_ms = int((time.time() - start_time) * 1000)
-        result.document_id = hashlib.md5(file_content).hexdigest()[:16]
+        result.document_id = content_hash[:16]
         
+        await self._store_cached_result(cache_key, result)
         return result
     
+    async def _process_page(
+        self,
+        file_content: bytes,
+        filename: str,
+        content_type: str,
+        document_type: DocumentType,
+        preprocess: bool
+    ) -> ExtractedDocument:
+        """Preprocess and OCR one page, holding one of the provider slots."""
+        async with self._page_slot():
+            # Preprocess image if needed
+            if preprocess and content_type.startswith('image/'):
+                # PIL releases the GIL, so this runs on the compute thread pool
+                file_content = await run_compute(
+                    "image", self.preprocessor.preprocess_for_ocr, file_content
+                )
+            
+            # Select processing method based on provider and document type
+            if self.provider == OCRProvider.AZURE_DOCUMENT_INTELLIGENCE:
+                if document_type == DocumentType.RECEIPT:
+                    return await self._process_azure_receipt(file_content)
+                if document_type == DocumentType.INVOICE:
+                    return await self._process_azure_invoice(file_content)
+                return await self._process_azure_general(file_content)
+            if self.provider == OCRProvider.TESSERACT:
+                return await self._process_tesseract(file_content)
+            return await self._process_internal(file_content, filename)
+    
+    def _page_slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._page_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._page_semaphores[loop] = asyncio.Semaphore(
+                max(1, settings.ocr_provider_concurrency)
+            )
+        return semaphore
+    
+    def _merge_pages(self, pages: List[ExtractedDocument]) -> ExtractedDocument:
+        """Combine per-page results into one document."""
+        failed = [page.provider for page in pages if page.provider.endswith("error")]
+        merged = ExtractedDocument(
+            document_type=pages[0].document_type,
+            currency=pages[0].currency,
+            line_items=[item for page in pages for item in page.line_items],
+            raw_text="\n".join(page.raw_text for page in pages if page.raw_text) or None,
+            confidence_score=sum(page.confidence_score for page in pages) / len(pages),
+            provider=failed[0] if failed else pages[0].provider,
+            page_count=len(pages),
+            warnings=list(dict.fromkeys(w for page in pages for w in page.warnings)),
+        )
+        for name in self.HEADER_FIELDS:
+            setattr(merged, name, next(
+                (getattr(page, name) for page in pages if getattr(page, name) is not None), None
+            ))
+        for name in self.TOTAL_FIELDS:
+            setattr(merged, name, next(
+                (getattr(page, name) for page in reversed(pages) if getattr(page, name) is not None), None
+            ))
+        return merged
+    
+    # ---- result cache ----
+    
+    async def _get_cached_result(self, cache_key: str) -> Optional[ExtractedDocument]:
+        """Copy of a cached result, from this process or Redis."""
+        document = self._result_cache.get(cache_key)
+        if document is not None:
+            self._result_cache.move_to_end(cache_key)
+        else:
+            from app.services.cache_service import CacheService, get_cache_service
+            
+            data = await get_cache_service().get_json(f"{CacheService.PREFIX_OCR_DOCUMENT}:{cache_key}")
+            if not data:
+                return None
+            try:
+                document = ExtractedDocument.from_cache_dict(data)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Discarding unreadable cached OCR result: {e}")
+                return None
+            self._remember_result(cache_key, document)
+        
+        hit = copy.deepcopy(document)
+        hit.cache_hit = True
+        return hit
+    
+    async def _store_cached_result(self, cache_key: str, result: ExtractedDocument):
+        """Cache a successful result; provider errors are retried next time."""
+        if result.provider.endswith("error"):
+            return
+        from app.services.cache_service import CacheService, get_cache_service
+        
+        document = copy.deepcopy(result)
+        self._remember_result(cache_key, document)
+        await get_cache_service().set_json(
+            f"{CacheService.PREFIX_OCR_DOCUMENT}:{cache_key}",
+            document.to_cache_dict(),
+            settings.ocr_result_cache_ttl_seconds,
+        )
+    
+    def _remember_result(self, cache_key: str, document: ExtractedDocument):
+        self._result_cache[cache_key] = document
+        self._result_cache.move_to_end(cache_key)
+        while len(self._result_cache) > settings.ocr_result_cache_size:
+            self._result_cache.popitem(last=False)
+    
+    # ---- providers ----
+    
+    def _analyze_with_azure(self, model_id: str, file_content: bytes):
+        """Blocking Azure Document Intelligence call (runs on a worker thread)."""
+        from azure.ai.formrecognizer import DocumentAnalysisClient
+        from azure.core.credentials import AzureKeyCredential
+        
+        client = DocumentAnalysisClient(
+            endpoint=self.azure_endpoint,
+            credential=AzureKeyCredential(self.azure_key),
+        )
+        return client.begin_analyze_document(model_id, file_content).result()
+    
     async def _process_azure_receipt(self, file_content: bytes) -> ExtractedDocument:
         """Process receipt using Azure Document Intelligence."""
         try:
-            from azure.ai.formrecognizer import DocumentAnalysisClient
-            from azure.core.credentials import AzureKeyCredential
-            
-            client = DocumentAnalysisClient(
-                endpoint=self.azure_endpoint,
-                credential=AzureKeyCredential(self.azure_key),
+            result = await asyncio.to_thread(
+                self._analyze_with_azure, "prebuilt-receipt", file_content
             )
             
-            poller = client.begin_analyze_document("prebuilt-receipt", file_content)
-            result = poller.result()
-            
             if not result.documents:
                 return ExtractedDocument(
                     document_type=DocumentType.RECEIPT,
@@ -669,17 +955,10 @@ class AdvancedOCRService:
     async def _process_azure_invoice(self, file_content: bytes) -> ExtractedDocument:
         """Process invoice using Azure Document Intelligence."""
         try:
-            from azure.ai.formrecognizer import DocumentAnalysisClient
-            from azure.core.credentials import AzureKeyCredential
-            
-            client = DocumentAnalysisClient(
-                endpoint=self.azure_endpoint,
-                credential=AzureKeyCredential(self.azure_key),
+            result = await asyncio.to_thread(
+                self._analyze_with_azure, "prebuilt-invoice", file_content
             )
             
-            poller = client.begin_analyze_document("prebuilt-invoice", file_content)
-            result = poller.result()
-            
             if not result.documents:
                 return ExtractedDocument(
                     document_type=DocumentType.INVOICE,
@@ -747,17 +1026,10 @@ class AdvancedOCRService:
     async def _process_azure_general(self, file_content: bytes) -> ExtractedDocument:
         """Process general document using Azure Document Intelligence."""
         try:
-            from azure.ai.formrecognizer import DocumentAnalysisClient
-            from azure.core.credentials import AzureKeyCredential
-            
-            client = DocumentAnalysisClient(
-                endpoint=self.azure_endpoint,
-                credential=AzureKeyCredential(self.azure_key),
+            result = await asyncio.to_thread(
+                self._analyze_with_azure, "prebuilt-read", file_content
             )
             
-            poller = client.begin_analyze_document("prebuilt-read", file_content)
-            result = poller.result()
-            
             # Extract all text
             full_text = ""
             for page in result.pages:
@@ -785,6 +1057,8 @@ class AdvancedOCRService:
                 subtotal=extracted.get("subtotal"),
                 vat_rate=extracted.get("vat_rate"),
                 vat_amount=extracted.get("vat_amount"),
+                wht_rate=extracted.get("wht_rate"),
+                wht_amount=extracted.get("wht_amount"),
                 total_amount=extracted.get("total_amount"),
                 raw_text=full_text,
                 confidence_score=0.8,
@@ -803,21 +1077,28 @@ class AdvancedOCRService:
                 warnings=[str(e)]
             )
     
+    @staticmethod
+    def _run_tesseract(file_content: bytes) -> Tuple[str, float]:
+        """Blocking Tesseract OCR: text and average word confidence."""
+        import pytesseract
+        from PIL import Image
+        
+        image = Image.open(io.BytesIO(file_content))
+        
+        # Perform OCR
+        text = pytesseract.image_to_string(image, lang='eng')
+        
+        # Get confidence data
+        data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+        confidences = [int(c) for c in data['conf'] if c != '-1']
+        avg_confidence = sum(confidences) / len(confidences) / 100 if confidences else 0.5
+        return text, avg_confidence
+    
     async def _process_tesseract(self, file_content: bytes) -> ExtractedDocument:
         """Process document using Tesseract OCR."""
         try:
-            import pytesseract
-            from PIL import Image
-            
-            image = Image.open(io.BytesIO(file_content))
-            
-            # Perform OCR
-            text = pytesseract.image_to_string(image, lang='eng')
-            
-            # Get confidence data
-            data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
-            confidences = [int(c) for c in data['conf'] if c != '-1']
-            avg_confidence = sum(confidences) / len(confidences) / 100 if confidences else 0.5
+            # Tesseract runs as a subprocess; wait for it off the event loop
+            text, avg_confidence = await run_compute("image", self._run_tesseract, file_content)
             
             # Extract structured data
             extracted = self.extractor.extract_all(text)
@@ -841,6 +1122,8 @@ class AdvancedOCRService:
                 subtotal=extracted.get("subtotal"),
                 vat_rate=extracted.get("vat_rate"),
                 vat_amount=extracted.get("vat_amount"),
+                wht_rate=extracted.get("wht_rate"),
+                wht_amount=extracted.get("wht_amount"),
                 total_amount=extracted.get("total_amount"),
                 raw_text=text,
                 confidence_score=avg_confidence,
@@ -939,20 +1222,81 @@ class AdvancedOCRService:
     async def batch_process(
         self,
         files: List[Tuple[bytes, str, str]],
-        document_type: DocumentType = DocumentType.GENERAL
+        document_type: DocumentType = DocumentType.GENERAL,
+        preprocess: bool = True,
+        progress_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> List[ExtractedDocument]:
         """
-        Process multiple documents in batch.
+        Process multiple documents concurrently.
+        
+        Files with identical content are processed once; at most
+        ocr_provider_concurrency files (and provider calls) run at a time.
+        A failing file yields an error document instead of failing the batch.
         
         Args:
             files: List of (content, filename, content_type) tuples
+            progress_callback: Awaited after each file with completed/total,
+                filename, status (processed, cached, failed) and document_id
+        
+        Returns:
+            Results in the order of files
         """
-        results = []
-        for content, filename, content_type in files:
-            result = await self.process_document(
-                content, filename, content_type, document_type
-            )
-            results.append(result)
+        hashes = await asyncio.gather(*(sha256_hexdigest(content) for content, _, _ in files))
+        copies: Dict[str, List[int]] = {}
+        for index, content_hash in enumerate(hashes):
+            copies.setdefault(content_hash, []).append(index)
+        
+        results: List[Optional[ExtractedDocument]] = [None] * len(files)
+        file_slots = asyncio.Semaphore(max(1, settings.ocr_provider_concurrency))
+        completed = 0
+        
+        async def report(index: int):
+            nonlocal completed
+            completed += 1
+            if not progress_callback:
+                return
+            result = results[index]
+            if result.provider.endswith("error"):
+                status = "failed"
+            else:
+                status = "cached" if result.cache_hit else "processed"
+            try:
+                await progress_callback({
+                    "completed": completed,
+                    "total": len(files),
+                    "filename": files[index][1],
+                    "status": status,
+                    "document_id": result.document_id,
+                })
+            except Exception as e:
+                logger.warning(f"OCR progress callback failed: {e}")
+        
+        async def run(content_hash: str, indexes: List[int]):
+            content, filename, content_type = files[indexes[0]]
+            async with file_slots:
+                try:
+                    result = await self._process_document(
+                        content, filename, content_type, document_type, preprocess, content_hash
+                    )
+                except Exception as e:
+                    logger.error(f"OCR failed for {filename}: {e}")
+                    result = ExtractedDocument(
+                        document_type=document_type,
+                        confidence_score=0.0,
+                        provider="error",
+                        warnings=[str(e)]
+                    )
+            results[indexes[0]] = result
+            await report(indexes[0])
+            
+            # Repeated uploads in the same batch reuse the result
+            for index in indexes[1:]:
+                duplicate = copy.deepcopy(result)
+                duplicate.cache_hit = True
+                results[index] = duplicate
+                await report(index)
+        
+        await asyncio.gather(*(run(h, indexes) for h, indexes in copies.items()))
         return results
     
     def get_provider_status(self) -> Dict[str, Any]:
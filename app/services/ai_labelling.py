@@ -6,13 +6,16 @@ Implements "Zero-Touch" Autonomous Accounting for Nigerian Tax Reform 2026
 """
 
 import os
+import re
 import json
+import asyncio
 import hashlib
 import pickle
+from collections import OrderedDict
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List, Dict, Tuple, Any
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Tuple, Any, Union
+from dataclasses import asdict, dataclass, replace
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -43,6 +46,59 @@ class TrainingData:
     gl_account: str
 
 
+@dataclass
+class LabelRequest:
+    """A transaction to label with predict_many"""
+    description: str
+    amount: Decimal = Decimal("0")
+    transaction_type: str = "expense"
+    vendor_name: Optional[str] = None
+    additional_context: Optional[Dict[str, Any]] = None
+
+
+# Reference, card and terminal numbers vary between otherwise identical narrations
+_REFERENCE_NUMBER = re.compile(r"\d{4,}")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_description(description: str, vendor_name: Optional[str] = None) -> str:
+    """
+    Text a transaction is matched, classified and cached by.
+    
+    Lowercases, masks numbers of 4+ digits and collapses whitespace, so
+    recurring narrations such as "POS 402113 MTN AIRTIME" share one label.
+    """
+    text = f"{description or ''} {vendor_name or ''}".lower()
+    text = _REFERENCE_NUMBER.sub("#", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def compile_patterns(patterns: List[str]) -> "re.Pattern":
+    """
+    Compile substring patterns into one regex shaped like their trie.
+    
+    finditer() reports, for every position of a text, the longest pattern
+    starting there (the lookahead lets matches overlap), so a text is
+    scanned once instead of once per pattern.
+    """
+    trie: Dict[str, Any] = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A pattern ends here: the longer continuation is optional (greedy)
+        return f"(?:{body})?" if "" in node else body
+    
+    return re.compile(f"(?=({build(trie)}))")
+
+
 class AITransactionLabeller:
     """
     AI-powered transaction labelling service
@@ -184,6 +240,9 @@ class AITransactionLabeller:
         "6950": "Miscellaneous Expense",
     }
     
+    # Recent labels kept in process, per (entity, transaction type, text)
+    LABEL_CACHE_SIZE = 20000
+    
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
@@ -191,10 +250,20 @@ class AITransactionLabeller:
         self.ml_enabled = os.getenv("ML_GL_PREDICTION_ENABLED", "True").lower() == "true"
         self.ai_enabled = os.getenv("AI_TRANSACTION_LABELLING_ENABLED", "True").lower() == "true"
         
-        # ML model cache
+        self.remote_concurrency = int(os.getenv("AI_LABELLING_REMOTE_CONCURRENCY", "8"))
+        
+        # Vendor patterns compiled into a single matcher
+        self._vendor_matcher = compile_patterns(list(self.VENDOR_PATTERNS))
+        self._vendor_order = {pattern: i for i, pattern in enumerate(self.VENDOR_PATTERNS)}
+        
+        # ML model cache (default model, then per-entity models keyed by entity id)
         self._ml_model = None
         self._vectorizer = None
         self._label_encoder = None
+        self._entity_models: Dict[str, Optional[Tuple[Any, Any, Any]]] = {}
+        
+        self._openai_client = None
+        self._label_cache: "OrderedDict[Tuple[Optional[str], str, str], TransactionPrediction]" = OrderedDict()
     
     async def predict_category(
         self,
@@ -202,7 +271,8 @@ class AITransactionLabeller:
         amount: Decimal,
         transaction_type: str = "expense",
         vendor_name: Optional[str] = None,
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Optional[Dict[str, Any]] = None,
+        entity_id: Optional[str] = None
     ) -> TransactionPrediction:
         """
         Predict the category and G/L account for a transaction
@@ -213,124 +283,224 @@ class AITransactionLabeller:
             transaction_type: 'income' or 'expense'
             vendor_name: Optional vendor/payee name
             additional_context: Additional context for prediction
+            entity_id: Entity whose model and past labels to use
             
         Returns:
             TransactionPrediction with category, GL account, and confidence score
         """
+        predictions = await self.predict_many(
+            [LabelRequest(description, amount, transaction_type, vendor_name, additional_context)],
+            entity_id=entity_id
+        )
+        return predictions[0]
+    
+    async def predict_many(
+        self,
+        transactions: List[Union[LabelRequest, Dict[str, Any]]],
+        entity_id: Optional[str] = None
+    ) -> List[TransactionPrediction]:
+        """
+        Predict categories for many transactions (bulk imports, bank statements)
+        
+        Transactions with the same normalized description and type are
+        labelled once. Labels come from, in order: the in-process cache, the
+        entity's persisted past labels, vendor patterns, one batched ML
+        prediction, and finally concurrent OpenAI calls for the residue.
+        
+        Returns:
+            One TransactionPrediction per transaction, in input order
+        """
+        requests = [t if isinstance(t, LabelRequest) else LabelRequest(**t) for t in transactions]
+        entity_id = str(entity_id) if entity_id else None
+        keys = [
+            (r.transaction_type, normalize_description(r.description, r.vendor_name))
+            for r in requests
+        ]
+        unique: Dict[Tuple[str, str], LabelRequest] = {}
+        for key, request in zip(keys, requests):
+            unique.setdefault(key, request)
+        
+        labels: Dict[Tuple[str, str], TransactionPrediction] = {}
+        pending = []
+        for key in unique:
+            cached = self._cache_get(entity_id, key)
+            if cached:
+                labels[key] = cached
+            else:
+                pending.append(key)
+        
+        if pending and entity_id:
+            persisted = await self._load_persisted_labels(entity_id, pending)
+            for key, prediction in persisted.items():
+                labels[key] = prediction
+                self._cache_put(entity_id, key, prediction)
+            pending = [key for key in pending if key not in persisted]
+        
+        new_labels: Dict[Tuple[str, str], TransactionPrediction] = {}
         
         # Step 1: Try pattern matching first (fastest)
-        pattern_result = self._match_vendor_pattern(description, vendor_name)
-        if pattern_result and pattern_result.confidence_score >= 0.90:
-            return pattern_result
-        
-        # Step 2: Try ML model if available
-        if self.ml_enabled:
-            ml_result = await self._predict_with_ml(description, amount, transaction_type)
-            if ml_result and ml_result.confidence_score >= self.confidence_threshold:
-                return ml_result
-        
-        # Step 3: Use OpenAI for complex cases
-        if self.ai_enabled and self.openai_api_key:
-            ai_result = await self._predict_with_openai(
-                description, amount, transaction_type, vendor_name, additional_context
-            )
-            if ai_result:
-                return ai_result
+        pattern_results = {key: self._match_vendor_pattern(key[1]) for key in pending}
+        residue = []
+        for key in pending:
+            pattern_result = pattern_results[key]
+            if pattern_result and pattern_result.confidence_score >= 0.90:
+                new_labels[key] = pattern_result
+            else:
+                residue.append(key)
+        
+        # Step 2: Try ML model if available, one vectorized call for the batch
+        if self.ml_enabled and residue:
+            ml_results = await self._predict_with_ml_many([key[1] for key in residue], entity_id)
+            remaining = []
+            for key, ml_result in zip(residue, ml_results):
+                if ml_result and ml_result.confidence_score >= self.confidence_threshold:
+                    new_labels[key] = ml_result
+                else:
+                    remaining.append(key)
+            residue = remaining
+        
+        # Step 3: Use OpenAI for complex cases, concurrently
+        if self.ai_enabled and self.openai_api_key and residue:
+            ai_results = await self._predict_with_openai_many([unique[key] for key in residue])
+            remaining = []
+            for key, ai_result in zip(residue, ai_results):
+                if ai_result:
+                    new_labels[key] = ai_result
+                else:
+                    remaining.append(key)
+            residue = remaining
         
         # Step 4: Return pattern match if available, otherwise uncategorized
-        if pattern_result:
-            return pattern_result
-        
-        return TransactionPrediction(
-            category_id=None,
-            category_name="Uncategorized",
-            gl_account_code="6950",
-            gl_account_name="Miscellaneous Expense",
-            confidence_score=0.0,
-            reasoning="Unable to determine category. Manual review required."
-        )
+        for key in residue:
+            if pattern_results[key]:
+                new_labels[key] = pattern_results[key]
+            else:
+                labels[key] = TransactionPrediction(
+                    category_id=None,
+                    category_name="Uncategorized",
+                    gl_account_code="6950",
+                    gl_account_name="Miscellaneous Expense",
+                    confidence_score=0.0,
+                    reasoning="Unable to determine category. Manual review required."
+                )
+        
+        for key, prediction in new_labels.items():
+            labels[key] = prediction
+            self._cache_put(entity_id, key, prediction)
+        if entity_id and new_labels:
+            await self._persist_labels(entity_id, new_labels)
+        
+        # Duplicates get their own copy so callers can edit results independently
+        return [replace(labels[key]) for key in keys]
     
-    def _match_vendor_pattern(
-        self,
-        description: str,
-        vendor_name: Optional[str] = None
-    ) -> Optional[TransactionPrediction]:
-        """Match against known vendor patterns"""
+    def _match_vendor_pattern(self, search_text: str) -> Optional[TransactionPrediction]:
+        """Match normalized text against known vendor patterns"""
+        
+        # The longest matching pattern wins; ties go to the first listed
+        best_pattern = None
+        for match in self._vendor_matcher.finditer(search_text):
+            pattern = match.group(1)
+            if best_pattern is None or (
+                (len(pattern), -self._vendor_order[pattern])
+                > (len(best_pattern), -self._vendor_order[best_pattern])
+            ):
+                best_pattern = pattern
+        
+        if best_pattern is None:
+            return None
         
-        search_text = f"{description} {vendor_name or ''}".lower()
+        data = self.VENDOR_PATTERNS[best_pattern]
+        # Score by how much of the text the pattern covers, scaled up but capped at 0.95
+        score = min(len(best_pattern) / len(search_text) * 2, 0.95)
         
-        best_match = None
-        best_score = 0.0
+        tax_implications = {}
+        if data.get("vat_applicable"):
+            tax_implications["vat_rate"] = 7.5
+        if data.get("wht_rate"):
+            tax_implications["wht_rate"] = data["wht_rate"]
         
-        for pattern, data in self.VENDOR_PATTERNS.items():
-            if pattern in search_text:
-                # Calculate match score based on pattern length and position
-                score = len(pattern) / len(search_text) if search_text else 0
-                score = min(score * 2, 0.95)  # Scale up but cap at 0.95
-                
-                if score > best_score:
-                    best_score = score
-                    
-                    tax_implications = {}
-                    if data.get("vat_applicable"):
-                        tax_implications["vat_rate"] = 7.5
-                    if data.get("wht_rate"):
-                        tax_implications["wht_rate"] = data["wht_rate"]
-                    
-                    best_match = TransactionPrediction(
-                        category_id=None,
-                        category_name=data["category"],
-                        gl_account_code=data["gl"],
-                        gl_account_name=self.GL_ACCOUNTS.get(data["gl"], data["category"]),
-                        confidence_score=score,
-                        reasoning=f"Matched pattern: '{pattern}' in transaction description",
-                        tax_implications=tax_implications if tax_implications else None
-                    )
-        
-        return best_match
+        return TransactionPrediction(
+            category_id=None,
+            category_name=data["category"],
+            gl_account_code=data["gl"],
+            gl_account_name=self.GL_ACCOUNTS.get(data["gl"], data["category"]),
+            confidence_score=score,
+            reasoning=f"Matched pattern: '{best_pattern}' in transaction description",
+            tax_implications=tax_implications if tax_implications else None
+        )
     
-    async def _predict_with_ml(
+    async def _predict_with_ml_many(
         self,
-        description: str,
-        amount: Decimal,
-        transaction_type: str
-    ) -> Optional[TransactionPrediction]:
-        """Use ML model for prediction"""
+        texts: List[str],
+        entity_id: Optional[str] = None
+    ) -> List[Optional[TransactionPrediction]]:
+        """Use ML model for prediction: one sparse matrix, one predict_proba call"""
         
         try:
-            # Load or train ML model
-            if not self._ml_model:
-                await self._load_or_train_ml_model()
-            
-            if not self._ml_model:
-                return None
-            
-            # Vectorize the description
-            features = self._vectorizer.transform([description.lower()])
+            model = await self._get_ml_model(entity_id)
+            if not model:
+                return [None] * len(texts)
+            classifier, vectorizer, label_encoder = model
             
-            # Predict
-            prediction = self._ml_model.predict(features)[0]
-            probabilities = self._ml_model.predict_proba(features)[0]
-            confidence = max(probabilities)
+            features = vectorizer.transform(texts)
+            probabilities = classifier.predict_proba(features)
+            best = probabilities.argmax(axis=1)
+            confidences = probabilities.max(axis=1)
+            category_names = label_encoder.inverse_transform(classifier.classes_[best])
             
-            # Decode the label
-            category_name = self._label_encoder.inverse_transform([prediction])[0]
-            
-            # Get GL account
-            gl_code = self._get_gl_for_category(category_name)
-            
-            return TransactionPrediction(
+        except Exception as e:
+            logger.warning(f"ML prediction failed: {e}")
+            return [None] * len(texts)
+        
+        gl_codes: Dict[str, str] = {}
+        predictions = []
+        for category_name, confidence in zip(category_names, confidences):
+            if category_name not in gl_codes:
+                gl_codes[category_name] = self._get_gl_for_category(category_name)
+            gl_code = gl_codes[category_name]
+            predictions.append(TransactionPrediction(
                 category_id=None,
-                category_name=category_name,
+                category_name=str(category_name),
                 gl_account_code=gl_code,
                 gl_account_name=self.GL_ACCOUNTS.get(gl_code, category_name),
                 confidence_score=float(confidence),
-                reasoning=f"ML model prediction based on historical patterns"
-            )
-            
-        except Exception as e:
-            logger.warning(f"ML prediction failed: {e}")
+                reasoning="ML model prediction based on historical patterns"
+            ))
+        return predictions
+    
+    async def _get_ml_model(self, entity_id: Optional[str] = None) -> Optional[Tuple[Any, Any, Any]]:
+        """The entity's own model if it has one, otherwise the default model"""
+        
+        if entity_id:
+            if entity_id not in self._entity_models:
+                self._entity_models[entity_id] = self._load_model_file(
+                    self._entity_model_path(entity_id)
+                )
+            if self._entity_models[entity_id]:
+                return self._entity_models[entity_id]
+        
+        if not self._ml_model:
+            await self._load_or_train_ml_model()
+        if not self._ml_model:
             return None
+        return self._ml_model, self._vectorizer, self._label_encoder
+    
+    async def _predict_with_openai_many(
+        self,
+        requests: List[LabelRequest]
+    ) -> List[Optional[TransactionPrediction]]:
+        """OpenAI predictions for many transactions, a bounded number at a time"""
+        
+        semaphore = asyncio.Semaphore(max(1, self.remote_concurrency))
+        
+        async def predict(request: LabelRequest) -> Optional[TransactionPrediction]:
+            async with semaphore:
+                return await self._predict_with_openai(
+                    request.description, request.amount, request.transaction_type,
+                    request.vendor_name, request.additional_context
+                )
+        
+        return await asyncio.gather(*[predict(request) for request in requests])
     
     async def _predict_with_openai(
         self,
@@ -343,9 +513,7 @@ class AITransactionLabeller:
         """Use OpenAI for intelligent prediction"""
         
         try:
-            import openai
-            
-            client = openai.AsyncOpenAI(api_key=self.openai_api_key)
+            client = self._get_openai_client()
             
             prompt = f"""You are an expert Nigerian accountant familiar with the 2026 Tax Reform.
 Analyze this transaction and suggest the appropriate category and G/L account.
@@ -418,6 +586,92 @@ Respond in JSON format:
             logger.error(f"OpenAI prediction failed: {e}")
             return None
     
+    def _get_openai_client(self):
+        """One OpenAI client (and connection pool) shared by all calls"""
+        if self._openai_client is None:
+            import openai
+            self._openai_client = openai.AsyncOpenAI(api_key=self.openai_api_key)
+        return self._openai_client
+    
+    # Label caches
+    
+    def _cache_get(self, entity_id: Optional[str], key: Tuple[str, str]) -> Optional[TransactionPrediction]:
+        cache_key = (entity_id, *key)
+        prediction = self._label_cache.get(cache_key)
+        if prediction is not None:
+            self._label_cache.move_to_end(cache_key)
+        return prediction
+    
+    def _cache_put(self, entity_id: Optional[str], key: Tuple[str, str], prediction: TransactionPrediction):
+        cache_key = (entity_id, *key)
+        self._label_cache[cache_key] = prediction
+        self._label_cache.move_to_end(cache_key)
+        while len(self._label_cache) > self.LABEL_CACHE_SIZE:
+            self._label_cache.popitem(last=False)
+    
+    @staticmethod
+    def _label_field(key: Tuple[str, str]) -> str:
+        return hashlib.sha1(f"{key[0]}|{key[1]}".encode()).hexdigest()
+    
+    async def _load_persisted_labels(
+        self,
+        entity_id: str,
+        keys: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], TransactionPrediction]:
+        """Past labels for the entity, one Redis round trip for the batch"""
+        from app.services.cache_service import CacheService, get_cache_service
+        
+        fields = {self._label_field(key): key for key in keys}
+        stored = await get_cache_service().hget_many(
+            f"{CacheService.PREFIX_AI_LABEL}:{entity_id}", list(fields)
+        )
+        labels = {}
+        for field, value in stored.items():
+            try:
+                labels[fields[field]] = TransactionPrediction(**json.loads(value))
+            except (TypeError, ValueError):
+                continue
+        return labels
+    
+    async def _persist_labels(self, entity_id: str, labels: Dict[Tuple[str, str], TransactionPrediction]):
+        from app.services.cache_service import CacheService, get_cache_service
+        
+        await get_cache_service().hset_many(
+            f"{CacheService.PREFIX_AI_LABEL}:{entity_id}",
+            {self._label_field(key): json.dumps(asdict(p), default=str) for key, p in labels.items()},
+            ttl=CacheService.TTL_AI_LABEL
+        )
+    
+    async def clear_label_cache(self, entity_id: Optional[str] = None):
+        """Forget cached labels for an entity (e.g. after retraining its model)"""
+        from app.services.cache_service import CacheService, get_cache_service
+        
+        if entity_id is None:
+            self._label_cache.clear()
+            return
+        entity_id = str(entity_id)
+        for cache_key in [k for k in self._label_cache if k[0] == entity_id]:
+            del self._label_cache[cache_key]
+        await get_cache_service().delete(f"{CacheService.PREFIX_AI_LABEL}:{entity_id}")
+    
+    # ML model loading and training
+    
+    @staticmethod
+    def _entity_model_path(entity_id: str) -> str:
+        return f"ml_models/transaction_classifier_{entity_id}.pkl"
+    
+    def _load_model_file(self, model_path: str) -> Optional[Tuple[Any, Any, Any]]:
+        """Load a pickled (model, vectorizer, label encoder), or None"""
+        if not os.path.exists(model_path):
+            return None
+        try:
+            with open(model_path, "rb") as f:
+                model_data = pickle.load(f)
+            return model_data["model"], model_data["vectorizer"], model_data["label_encoder"]
+        except Exception as e:
+            logger.warning(f"Failed to load ML model {model_path}: {e}")
+            return None
+    
     async def _load_or_train_ml_model(self):
         """Load existing ML model or train a new one"""
         
@@ -542,7 +796,7 @@ Respond in JSON format:
             logger.warning(f"Insufficient training data: {len(rows)} samples (need {min_samples})")
             return False
         
-        descriptions = [row[0].description or "" for row in rows]
+        descriptions = [normalize_description(row[0].description or "") for row in rows]
         categories = [row[1].name for row in rows]
         
         try:
@@ -550,32 +804,35 @@ Respond in JSON format:
             from sklearn.naive_bayes import MultinomialNB
             from sklearn.preprocessing import LabelEncoder
             
-            self._vectorizer = TfidfVectorizer(
+            vectorizer = TfidfVectorizer(
                 lowercase=True,
                 stop_words='english',
                 ngram_range=(1, 2),
                 max_features=1000
             )
-            X = self._vectorizer.fit_transform(descriptions)
+            X = vectorizer.fit_transform(descriptions)
             
-            self._label_encoder = LabelEncoder()
-            y = self._label_encoder.fit_transform(categories)
+            label_encoder = LabelEncoder()
+            y = label_encoder.fit_transform(categories)
             
-            self._ml_model = MultinomialNB(alpha=0.1)
-            self._ml_model.fit(X, y)
+            model = MultinomialNB(alpha=0.1)
+            model.fit(X, y)
             
-            # Save entity-specific model
-            model_path = f"ml_models/transaction_classifier_{entity_id}.pkl"
+            # Save entity-specific model; the default model is left as is
+            model_path = self._entity_model_path(entity_id)
             os.makedirs("ml_models", exist_ok=True)
             with open(model_path, "wb") as f:
                 pickle.dump({
-                    "model": self._ml_model,
-                    "vectorizer": self._vectorizer,
-                    "label_encoder": self._label_encoder,
+                    "model": model,
+                    "vectorizer": vectorizer,
+                    "label_encoder": label_encoder,
                     "trained_at": datetime.utcnow().isoformat(),
                     "sample_count": len(rows)
                 }, f)
             
+            self._entity_models[str(entity_id)] = (model, vectorizer, label_encoder)
+            await self.clear_label_cache(entity_id)
+            
             logger.info(f"Trained custom ML model for entity {entity_id} with {len(rows)} samples")
             return True
             
@@ -627,3 +884,4 @@ Respond in JSON format:
 
 # Singleton instance
 ai_transaction_labeller = AITransactionLabeller()
+ai_labelling_service = ai_transaction_labeller
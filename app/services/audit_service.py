@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.audit_consolidated import AuditLog, AuditAction
 from app.models.user import User
+from app.utils.query_optimization import keyset_paginate
 
 
 @dataclass
@@ -32,6 +33,9 @@ class AuditEntry:
 class AuditService:
     """Service for managing audit trail and compliance logging."""
     
+    # Listing sort key, newest first; backed by ix_audit_logs_entity_created_id
+    PAGE_KEY = (AuditLog.created_at, AuditLog.id)
+    
     def __init__(self, db: AsyncSession):
         self.db = db
     
@@ -135,6 +139,7 @@ class AuditService:
         skip: int = 0,
         limit: int = 100,
         return_total: bool = False,
+        cursor: Optional[str] = None,
     ) -> Union[List[AuditLog], Tuple[List[AuditLog], int]]:
         """
         Get audit logs with optional filtering.
@@ -150,6 +155,7 @@ class AuditService:
             skip: Pagination offset
             limit: Pagination limit
             return_total: If True, return (logs, total_count) tuple
+            cursor: Cursor of the previous page; pages by key and ignores skip
         
         Returns:
             List of matching audit logs, or tuple of (logs, total_count) if return_total=True
@@ -184,7 +190,9 @@ class AuditService:
         
         # Get paginated results
         query = select(AuditLog).where(*conditions)
-        query = query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit)
+        query = keyset_paginate(query, self.PAGE_KEY, cursor, limit)
+        if not cursor:
+            query = query.offset(skip)
         
         result = await self.db.execute(query)
         logs = list(result.scalars().all())
@@ -198,27 +198,36 @@ class B2CReportingService:
                 "reported_at": invoice.b2c_reported_at.isoformat(),
             }
         
-        entity = invoice.entity
-        customer_name = invoice.customer.name if invoice.customer else "Walk-in Customer"
-        
         # Submit to NRS
         response = await self.nrs_client.submit_b2c_transaction_report(
-            seller_tin=entity.tin,
-            seller_name=entity.name,
-            transaction_date=invoice.invoice_date.isoformat(),
-            transaction_reference=invoice.invoice_number,
-            customer_name=customer_name,
-            transaction_amount=float(invoice.total_amount),
-            vat_amount=float(invoice.vat_amount),
-            payment_method="cash",  # Default, could be enhanced
-            customer_phone=invoice.customer.phone if invoice.customer else None,
-            customer_email=invoice.customer.email if invoice.customer else None,
+            **self._report_fields(invoice, invoice.entity)
         )
-        
+        result = self._record_report(invoice, response)
+        if result["success"]:
+            await self.db.commit()
+        return result
+    
+    def _report_fields(self, invoice: Invoice, entity: BusinessEntity) -> Dict[str, Any]:
+        """NRS B2C report arguments for an invoice."""
+        customer = invoice.customer
+        return {
+            "seller_tin": entity.tin,
+            "seller_name": entity.name,
+            "transaction_date": invoice.invoice_date.isoformat(),
+            "transaction_reference": invoice.invoice_number,
+            "customer_name": customer.name if customer else "Walk-in Customer",
+            "transaction_amount": float(invoice.total_amount),
+            "vat_amount": float(invoice.vat_amount),
+            "payment_method": "cash",  # Default, could be enhanced
+            "customer_phone": customer.phone if customer else None,
+            "customer_email": customer.email if customer else None,
+        }
+    
+    def _record_report(self, invoice: Invoice, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply an NRS response to the invoice (caller commits)."""
         if response.get("success"):
             invoice.b2c_reported_at = datetime.utcnow()
             invoice.b2c_report_reference = response.get("report_reference")
-            await self.db.commit()
             
             return {
                 "success": True,
@@ -239,33 +248,49 @@ class B2CReportingService:
         self,
         entity_id: uuid.UUID,
     ) -> Dict[str, Any]:
-        """Submit all pending B2C reports for an entity."""
+        """
+        Submit all pending B2C reports for an entity.
+        
+        Reports are sent concurrently through the pooled NRS client (bounded
+        by settings.nrs_bulk_concurrency and its rate limiter); the session is
+        only touched afterwards, with one commit for the whole batch.
+        """
         pending = await self.get_pending_b2c_reports(entity_id)
         
         results = []
-        success_count = 0
-        failed_count = 0
-        
-        for invoice in pending:
-            try:
-                result = await self.submit_b2c_report(invoice.id)
-                results.append(result)
-                if result.get("success"):
-                    success_count += 1
+        if pending:
+            result = await self.db.execute(
+                select(BusinessEntity).where(BusinessEntity.id == entity_id)
+            )
+            entity = result.scalar_one_or_none()
+            if not entity:
+                raise ValueError("Entity not found")
+            
+            responses = await self.nrs_client.run_bulk(
+                pending,
+                lambda invoice: self.nrs_client.submit_b2c_transaction_report(
+                    **self._report_fields(invoice, entity)
+                ),
+            )
+            for invoice, response in zip(pending, responses):
+                if isinstance(response, Exception):
+                    results.append({
+                        "success": False,
+                        "invoice_id": str(invoice.id),
+                        "error": str(response),
+                    })
                 else:
-                    failed_count += 1
-            except Exception as e:
-                results.append({
-                    "success": False,
-                    "invoice_id": str(invoice.id),
-                    "error": str(e),
-                })
-                failed_count += 1
+                    results.append(self._record_report(invoice, response))
+            
+            if any(r["success"] for r in results):
+                await self.db.commit()
+        
+        success_count = sum(1 for r in results if r["success"])
         
         return {
             "total_processed": len(pending),
             "success_count": success_count,
-            "failed_count": failed_count,
+            "failed_count": len(results) - success_count,
             "results": results,
         }
     
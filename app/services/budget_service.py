@@ -20,6 +20,7 @@ from enum import Enum as PyEnum
 from collections import defaultdict
 import logging
 
+import numpy as np
 from sqlalchemy import select, func, and_, or_, case, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -54,6 +55,9 @@ class VarianceType(str, PyEnum):
 class BudgetService:
     """Service for budget operations and variance analysis."""
     
+    # Months of actuals needed before forecasting replaces the run rate
+    MIN_FORECAST_HISTORY_MONTHS = 3
+    
     def __init__(self, db: AsyncSession):
         self.db = db
     
@@ -1014,8 +1018,14 @@ class BudgetService:
         """
         Forecast future budget performance based on current trends.
         
-        Uses historical actuals to project future performance.
+        Monthly actuals of every line item are forecast together in one
+        batch (Holt-Winters, or simple exponential smoothing with less
+        than two years of history); the projected annual figure is YTD
+        actual plus the forecast for the rest of the fiscal year. Falls
+        back to the YTD run rate with under three months of history.
         """
+        from app.services.batch_forecast_service import BatchForecastService
+        
         budget = await self.get_budget(budget_id, include_line_items=True)
         if not budget:
             raise ValueError("Budget not found")
@@ -1025,17 +1035,49 @@ class BudgetService:
         
         # Calculate monthly run rate
         months_elapsed = variance["period"]["months_analyzed"]
+        data_through = date.fromisoformat(variance["period"]["end_date"])
+        remaining_months = max(
+            0,
+            (budget.end_date.year - data_through.year) * 12
+            + budget.end_date.month - data_through.month
+        )
+        
+        # Forecast all line items in one call
+        history, periods = await self._get_monthly_actual_matrix(
+            entity_id, budget.line_items, data_through
+        )
+        batch = None
+        if budget.line_items and len(periods) >= self.MIN_FORECAST_HISTORY_MONTHS:
+            batch = await BatchForecastService().forecast(
+                entity_id,
+                f"budget:{budget_id}:line_items",
+                periods[-1].strftime("%Y-%m"),
+                history,
+                labels=[str(item.id) for item in budget.line_items],
+                forecast_periods=max(forecast_months, remaining_months, 1),
+            )
         
         forecasts = []
-        for item in variance["line_items"]:
-            if months_elapsed > 0:
-                monthly_run_rate = item["ytd_actual"] / months_elapsed
+        for row, item in enumerate(variance["line_items"]):
+            monthly_run_rate = item["ytd_actual"] / months_elapsed if months_elapsed > 0 else 0
+            monthly_forecast = []
+            if batch:
+                row_forecast = batch["forecast"][row]
+                projected_annual = item["ytd_actual"] + sum(row_forecast[:remaining_months])
+                monthly_forecast = [
+                    {
+                        "month": h + 1,
+                        "forecast": row_forecast[h],
+                        "lower_95": batch["lower_95"][row][h],
+                        "upper_95": batch["upper_95"][row][h],
+                    }
+                    for h in range(forecast_months)
+                ]
+            elif months_elapsed > 0:
                 projected_annual = monthly_run_rate * 12
-                projected_variance = projected_annual - item["annual_budget"]
             else:
-                monthly_run_rate = 0
                 projected_annual = 0
-                projected_variance = item["annual_budget"]
+            projected_variance = projected_annual - item["annual_budget"]
             
             forecasts.append({
                 "account_name": item["account_name"],
@@ -1049,6 +1091,7 @@ class BudgetService:
                     (projected_variance / item["annual_budget"] * 100)
                     if item["annual_budget"] else 0
                 ),
+                "monthly_forecast": monthly_forecast,
                 "confidence": "high" if months_elapsed >= 6 else "medium" if months_elapsed >= 3 else "low"
             })
         
@@ -1065,7 +1108,12 @@ class BudgetService:
             "forecast_basis": {
                 "months_elapsed": months_elapsed,
                 "data_through": variance["period"]["end_date"],
-                "methodology": "Linear projection based on YTD run rate"
+                "history_months": len(periods),
+                "methodology": (
+                    f"{'Holt-Winters' if batch['model'] == 'holt_winters' else 'Exponential smoothing'} "
+                    "forecast of monthly actuals for the remaining fiscal months"
+                    if batch else "Linear projection based on YTD run rate"
+                )
             },
             "overall_projection": {
                 "revenue": {
@@ -1092,6 +1140,66 @@ class BudgetService:
             "generated_at": datetime.utcnow().isoformat()
         }
     
+    async def _get_monthly_actual_matrix(
+        self,
+        entity_id: uuid.UUID,
+        line_items: List[BudgetLineItem],
+        end_date: date,
+        history_months: int = 36
+    ) -> Tuple[np.ndarray, List[date]]:
+        """
+        Monthly actuals per line item (line items x months) for up to
+        ``history_months`` months through ``end_date``, from one grouped
+        query. Months before the entity's first activity are dropped.
+        """
+        periods = []
+        year, month = end_date.year, end_date.month
+        for _ in range(history_months):
+            periods.append(date(year, month, 1))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        periods.reverse()
+        columns = {period: i for i, period in enumerate(periods)}
+        
+        month_start = func.date_trunc("month", Transaction.transaction_date)
+        result = await self.db.execute(
+            select(
+                Transaction.category_id,
+                Transaction.transaction_type,
+                month_start.label("month"),
+                func.sum(Transaction.amount).label("total")
+            ).where(
+                and_(
+                    Transaction.entity_id == entity_id,
+                    Transaction.transaction_date >= periods[0],
+                    Transaction.transaction_date <= end_date,
+                    Transaction.transaction_type.in_(["income", "expense"])
+                )
+            ).group_by(Transaction.category_id, Transaction.transaction_type, month_start)
+        )
+        
+        # Same keys as _get_actual_amounts
+        totals: Dict[Tuple[str, str], np.ndarray] = {}
+        for category_id, transaction_type, month_value, total in result.all():
+            key = str(category_id) if category_id else "uncategorized"
+            line_type = "revenue" if transaction_type == "income" else "expense"
+            column = columns.get(date(month_value.year, month_value.month, 1))
+            if column is None:
+                continue
+            series = totals.setdefault((key, line_type), np.zeros(len(periods)))
+            series[column] += float(total or 0)
+        
+        matrix = np.zeros((len(line_items), len(periods)))
+        for row, item in enumerate(line_items):
+            key = item.account_code or str(item.category_id) or item.account_name
+            series = totals.get((key, item.line_type))
+            if series is not None:
+                matrix[row] = series
+        
+        active = np.flatnonzero(matrix.any(axis=0))
+        if not len(active):
+            return matrix[:, :0], []
+        return matrix[:, active[0]:], periods[active[0]:]
+    
     def _assess_budget_risk(
         self,
         forecasts: List[Dict]
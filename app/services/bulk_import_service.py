@@ -0,0 +1,751 @@
+"""
+TekVwarho ProAudit - Bulk Import
+
+Streaming CSV import of transactions, vendors, customers and inventory
+items.
+
+Rows are read from the upload incrementally and handled a chunk
+(settings.bulk_import_chunk_rows) at a time, so memory stays flat however
+large the file is:
+
+1. Validate: each CSV column of the chunk is converted in one pass with a
+   parser derived from its target column (type, length, precision), and
+   rows with any bad cell are reported with their row number.
+2. Load: the valid rows are COPY'd (asyncpg copy_records_to_table) into a
+   temporary staging table.
+3. Merge: one INSERT ... SELECT moves them into the target table, adding
+   the entity, the importing user and the model's column defaults.
+
+COPY bypasses the ORM flush hooks, so the merge keeps the derived stores
+in step itself: it adds the imported rows' daily summary and platform
+metric deltas and upserts their search documents, in the same transaction.
+
+Small uploads are imported inline in one transaction (all or nothing
+unless skip_errors). Large ones become a BulkImportJob that commits each
+chunk together with its progress, so a retried or resumed job continues
+after the last committed row.
+"""
+
+import csv
+import io
+import itertools
+import logging
+import tempfile
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import Boolean, Column, Date, Enum, Integer, MetaData, Numeric, String, Table, Text, cast, insert, literal, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable, DropTable
+
+from app.config import settings
+from app.models.audit_consolidated import AuditAction
+from app.models.bulk_import_job import BulkImportJob, BulkImportStatus
+from app.models.customer import Customer
+from app.models.inventory import InventoryItem
+from app.models.transaction import Transaction, TransactionType
+from app.models.vendor import Vendor
+from app.services import dashboard_rollup_service, platform_metrics_service, search_index_service
+from app.services.file_storage_service import FileCategory, FileStorageService
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Optional[str]]
+RowError = Dict[str, Any]
+
+# Largest magnitude an INTEGER column holds
+INT_MAX = 2**31 - 1
+
+
+class BulkImportError(Exception):
+    """A row failed validation and the import does not skip errors."""
+
+    def __init__(self, error: RowError):
+        self.error = error
+        super().__init__(f"Error on row {error['row']}: {error['error']}")
+
+
+# ===========================================
+# IMPORT SPECIFICATIONS
+# ===========================================
+
+@dataclass(frozen=True)
+class ImportField:
+    """One CSV column and the target column it loads."""
+    header: str
+    column: str
+    required: bool = False
+    default: Any = None  # Value of an empty cell in an optional column
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """How a CSV file maps onto one target table."""
+    model: type
+    fields: Tuple[ImportField, ...]
+    copied: Tuple[Tuple[str, str], ...] = ()  # (target column, loaded column) pairs set row by row
+    verify_tins: bool = False
+    record_tin_results: bool = False  # Store the NRS verification on the row (vendors)
+
+
+IMPORT_SPECS: Dict[str, ImportSpec] = {
+    "transactions": ImportSpec(
+        model=Transaction,
+        fields=(
+            ImportField("date", "transaction_date", required=True),
+            ImportField("description", "description", default=""),
+            ImportField("amount", "amount", required=True),
+            ImportField("type", "transaction_type", default=TransactionType.EXPENSE),
+            ImportField("reference", "reference"),
+        ),
+        # Imported rows are NGN with no VAT, so every total equals the amount
+        copied=(
+            ("total_amount", "amount"),
+            ("functional_amount", "amount"),
+            ("functional_total_amount", "amount"),
+        ),
+    ),
+    "vendors": ImportSpec(
+        model=Vendor,
+        fields=(
+            ImportField("name", "name", required=True),
+            ImportField("email", "email"),
+            ImportField("phone", "phone"),
+            ImportField("address", "address"),
+            ImportField("tin", "tin"),
+            ImportField("contact_person", "contact_person"),
+        ),
+        verify_tins=True,
+        record_tin_results=True,
+    ),
+    "customers": ImportSpec(
+        model=Customer,
+        fields=(
+            ImportField("name", "name", required=True),
+            ImportField("email", "email"),
+            ImportField("phone", "phone"),
+            ImportField("address", "address"),
+            ImportField("tin", "tin"),
+            ImportField("contact_person", "contact_person"),
+        ),
+        verify_tins=True,
+    ),
+    "inventory": ImportSpec(
+        model=InventoryItem,
+        fields=(
+            ImportField("name", "name", required=True),
+            ImportField("sku", "sku", required=True),
+            ImportField("description", "description"),
+            ImportField("quantity", "quantity_on_hand", default=0),
+            ImportField("unit_price", "unit_price", default=Decimal("0")),
+            ImportField("reorder_level", "reorder_level", default=10),
+        ),
+    ),
+}
+
+TEMPLATES: Dict[str, List[str]] = {
+    import_type: [f.header for f in spec.fields] for import_type, spec in IMPORT_SPECS.items()
+}
+
+
+# ===========================================
+# PARSING
+# ===========================================
+
+def iter_csv_chunks(stream: TextIO, chunk_rows: int, skip: int = 0) -> Iterator[List[Tuple[int, Row]]]:
+    """
+    Numbered data rows of a CSV stream, chunk_rows at a time.
+
+    Rows are numbered as the file is (the header is row 1). The first skip
+    data rows are read past without being returned, for resuming.
+    """
+    reader = csv.DictReader(stream)
+    rows = enumerate(itertools.islice(reader, skip, None), start=skip + 2)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _text_parser(length: Optional[int]) -> Callable[[str], str]:
+    def parse(cell: str) -> str:
+        if length is not None and len(cell) > length:
+            raise ValueError(f"longer than {length} characters")
+        return cell
+    return parse
+
+
+def _decimal_parser(precision: Optional[int], scale: Optional[int]) -> Callable[[str], Decimal]:
+    quantum = Decimal(1).scaleb(-scale) if scale is not None else None
+    limit = Decimal(10) ** (precision - scale) if precision is not None and scale is not None else None
+
+    def parse(cell: str) -> Decimal:
+        try:
+            value = Decimal(cell.replace(",", ""))
+        except InvalidOperation:
+            raise ValueError(f"'{cell}' is not a number")
+        if not value.is_finite():
+            raise ValueError(f"'{cell}' is not a number")
+        try:
+            if quantum is not None:
+                value = value.quantize(quantum, rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            raise ValueError(f"{cell} is out of range")
+        if limit is not None and abs(value) >= limit:
+            raise ValueError(f"{cell} is out of range")
+        return value
+    return parse
+
+
+def _integer(cell: str) -> int:
+    try:
+        value = Decimal(cell.replace(",", ""))
+    except InvalidOperation:
+        raise ValueError(f"'{cell}' is not a whole number")
+    if not value.is_finite() or value != value.to_integral_value():
+        raise ValueError(f"'{cell}' is not a whole number")
+    if abs(value) > INT_MAX:
+        raise ValueError(f"{cell} is out of range")
+    return int(value)
+
+
+def _date(cell: str) -> date:
+    try:
+        return date.fromisoformat(cell)
+    except ValueError:
+        raise ValueError(f"'{cell}' is not a YYYY-MM-DD date")
+
+
+def _boolean(cell: str) -> bool:
+    lowered = cell.lower()
+    if lowered in ("true", "yes", "y", "1"):
+        return True
+    if lowered in ("false", "no", "n", "0"):
+        return False
+    raise ValueError(f"'{cell}' is not true or false")
+
+
+def _enum_parser(enum_class: type) -> Callable[[str], Any]:
+    members = {}
+    for member in enum_class:
+        members[member.name.lower()] = member
+        members[str(member.value).lower()] = member
+
+    def parse(cell: str) -> Any:
+        try:
+            return members[cell.lower()]
+        except KeyError:
+            raise ValueError(f"'{cell}' is not one of: {', '.join(str(m.value) for m in enum_class)}")
+    return parse
+
+
+def column_parser(column) -> Callable[[str], Any]:
+    """Parser of stripped, non-empty cells for a target column; raises ValueError with a readable message."""
+    column_type = column.type
+    if isinstance(column_type, Enum):
+        return _enum_parser(column_type.enum_class)
+    if isinstance(column_type, String):
+        return _text_parser(column_type.length)
+    if isinstance(column_type, Numeric):
+        return _decimal_parser(column_type.precision, column_type.scale)
+    if isinstance(column_type, Integer):
+        return _integer
+    if isinstance(column_type, Date):
+        return _date
+    if isinstance(column_type, Boolean):
+        return _boolean
+    raise TypeError(f"No CSV parser for {column.name} ({column_type})")
+
+
+# ===========================================
+# VALIDATION
+# ===========================================
+
+@dataclass
+class ValidatedChunk:
+    """The valid rows of a chunk, column by column, and the errors of the rest."""
+    row_numbers: List[int]
+    columns: Dict[str, List[Any]]
+    errors: List[RowError]
+    size: int  # Rows read, valid or not
+
+
+def _convert(parse: Callable[[str], Any], cells: List[Optional[str]], spec_field: ImportField) -> Tuple[List[Any], Dict[int, str]]:
+    values: List[Any] = []
+    errors: Dict[int, str] = {}
+    for index, cell in enumerate(cells):
+        cell = cell.strip() if cell else ""
+        if not cell:
+            if spec_field.required:
+                errors[index] = "is required"
+            values.append(spec_field.default)
+            continue
+        try:
+            values.append(parse(cell))
+        except ValueError as e:
+            errors[index] = str(e)
+            values.append(None)
+    return values, errors
+
+
+def validate_chunk(spec: ImportSpec, rows: List[Tuple[int, Row]]) -> ValidatedChunk:
+    """
+    Convert a chunk of rows column by column.
+
+    Every cell of a column goes through the same parser in one pass; a row
+    with any bad cell is left out and reported once, with all its problems.
+    """
+    table = spec.model.__table__
+    converted: Dict[str, List[Any]] = {}
+    problems: Dict[int, List[str]] = defaultdict(list)
+    for spec_field in spec.fields:
+        cells = [row.get(spec_field.header) for _, row in rows]
+        values, errors = _convert(column_parser(table.c[spec_field.column]), cells, spec_field)
+        converted[spec_field.column] = values
+        for index, message in errors.items():
+            problems[index].append(f"{spec_field.header}: {message}")
+
+    if problems:
+        valid = [index for index in range(len(rows)) if index not in problems]
+        converted = {name: [values[index] for index in valid] for name, values in converted.items()}
+    else:
+        valid = range(len(rows))
+    for target, source in spec.copied:
+        converted[target] = list(converted[source])
+
+    return ValidatedChunk(
+        row_numbers=[rows[index][0] for index in valid],
+        columns=converted,
+        errors=[
+            {"row": rows[index][0], "error": "; ".join(messages), "data": rows[index][1]}
+            for index, messages in sorted(problems.items())
+        ],
+        size=len(rows),
+    )
+
+
+def first_invalid_row(spec: ImportSpec, stream: TextIO) -> Optional[RowError]:
+    """Error of the first invalid row in a CSV stream, or None; nothing is written."""
+    for rows in iter_csv_chunks(stream, settings.bulk_import_chunk_rows):
+        chunk = validate_chunk(spec, rows)
+        if chunk.errors:
+            return chunk.errors[0]
+    return None
+
+
+async def verify_chunk_tins(db: AsyncSession, spec: ImportSpec, chunk: ValidatedChunk) -> Tuple[List[dict], int]:
+    """
+    NRS verification of the chunk's distinct TINs.
+
+    One deduplicated bulk call: TINs verified recently come from the TIN
+    verification cache (whose rows commit with the chunk) and the rest are
+    checked concurrently. Vendors keep the result on the row. Returns the
+    warnings for invalid TINs and the number of TINs checked.
+    """
+    from app.services.nrs_service import get_nrs_client
+
+    tins = chunk.columns["tin"]
+    distinct = list(dict.fromkeys(tin for tin in tins if tin))
+    if not distinct:
+        return [], 0
+    results = dict(zip(distinct, await get_nrs_client().bulk_validate_tins(distinct, db=db)))
+    verifications = [results[tin] if tin else None for tin in tins]
+
+    if spec.record_tin_results:
+        now = datetime.utcnow()
+        chunk.columns["tin_verified"] = [bool(v and v.is_valid) for v in verifications]
+        chunk.columns["tin_verified_at"] = [now if v and v.is_valid else None for v in verifications]
+        chunk.columns["tin_registered_name"] = [
+            v.registered_name[:255] if v and v.registered_name else None for v in verifications
+        ]
+    warnings = [
+        {"row": row_number, "tin": v.tin, "message": v.message}
+        for row_number, v in zip(chunk.row_numbers, verifications)
+        if v is not None and not v.is_valid
+    ]
+    return warnings, len(distinct)
+
+
+# ===========================================
+# LOAD AND MERGE
+# ===========================================
+
+def staging_table(spec: ImportSpec, columns: List[str]) -> Table:
+    """
+    Temporary table a chunk is COPY'd into, dropped at the end of the transaction.
+
+    Columns have their target's type, except enums, which are loaded as
+    the member name and cast in the merge.
+    """
+    target = spec.model.__table__
+    return Table(
+        f"_import_{target.name}",
+        MetaData(),
+        Column("row_number", Integer),
+        Column("id", UUID(as_uuid=True)),
+        *[
+            Column(name, Text if isinstance(target.c[name].type, Enum) else target.c[name].type)
+            for name in columns
+        ],
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+def merge_values(spec: ImportSpec, constants: Dict[str, Any]) -> Dict[str, Any]:
+    """Values every merged row gets: the model's scalar column defaults, then the constants."""
+    values = {
+        column.name: column.default.arg
+        for column in spec.model.__table__.columns
+        if column.default is not None and column.default.is_scalar
+    }
+    values.update(constants)
+    return values
+
+
+def merge_statement(spec: ImportSpec, staging: Table, constants: Dict[str, Any]):
+    """
+    One INSERT ... SELECT from staging into the target table, in file order.
+
+    Every value is cast to its target column's type: staged enum names
+    become enum values and bound defaults are not left as text.
+    """
+    target = spec.model.__table__
+    values = {column.name: column for column in staging.columns if column.name != "row_number"}
+    for name, value in merge_values(spec, constants).items():
+        values.setdefault(name, literal(value, type_=target.c[name].type))
+    names = list(values)
+    rows = select(*[cast(values[name], target.c[name].type) for name in names]).order_by(staging.c.row_number)
+    return insert(target).from_select(names, rows)
+
+
+async def _driver_connection(db: AsyncSession):
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+def _inserted_rows(spec: ImportSpec, chunk: ValidatedChunk, ids: List[uuid.UUID], constants: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Column values of the merged rows, as the derived stores read them."""
+    base = {column.name: None for column in spec.model.__table__.columns}
+    base.update(merge_values(spec, constants))
+    base["created_at"] = datetime.now(timezone.utc)
+    names = list(chunk.columns)
+    return [
+        {**base, "id": row_id, **dict(zip(names, values))}
+        for row_id, *values in zip(ids, *[chunk.columns[name] for name in names])
+    ]
+
+
+async def _sync_derived_stores(db: AsyncSession, spec: ImportSpec, rows: List[Dict[str, Any]]):
+    """Apply what the flush hooks would have for rows inserted by the merge."""
+    summary_deltas = dashboard_rollup_service.row_deltas(spec.model, rows)
+    if summary_deltas:
+        await db.execute(dashboard_rollup_service.upsert_statement(summary_deltas))
+    metric_deltas = platform_metrics_service.row_deltas(spec.model, rows)
+    if metric_deltas:
+        await db.execute(platform_metrics_service.increment_statement(
+            metric_deltas, platform_metrics_service.random_shard(),
+        ))
+    documents = [
+        document for document in (
+            search_index_service.build_document(spec.model, SimpleNamespace(**values)) for values in rows
+        )
+        if document
+    ]
+    if documents:
+        await db.execute(search_index_service.bulk_upsert_statement(), documents)
+
+
+async def import_chunk(db: AsyncSession, spec: ImportSpec, chunk: ValidatedChunk, constants: Dict[str, Any]) -> int:
+    """
+    COPY the chunk's valid rows into staging and merge them into the target.
+
+    Runs in the caller's transaction; the caller commits. Returns the
+    number of rows inserted.
+    """
+    if not chunk.row_numbers:
+        return 0
+    ids = [uuid.uuid4() for _ in chunk.row_numbers]
+    staging = staging_table(spec, list(chunk.columns))
+    target = spec.model.__table__
+    staged = [
+        [value.name if value is not None else None for value in values]
+        if isinstance(target.c[name].type, Enum) else values
+        for name, values in chunk.columns.items()
+    ]
+
+    await db.execute(CreateTable(staging))
+    connection = await _driver_connection(db)
+    await connection.copy_records_to_table(
+        staging.name,
+        records=list(zip(chunk.row_numbers, ids, *staged)),
+        columns=[column.name for column in staging.columns],
+    )
+    await db.execute(merge_statement(spec, staging, constants))
+    await db.execute(DropTable(staging))
+    await _sync_derived_stores(db, spec, _inserted_rows(spec, chunk, ids, constants))
+    return len(ids)
+
+
+# ===========================================
+# IMPORT
+# ===========================================
+
+@dataclass
+class ImportProgress:
+    """Running totals of an import; errors and warnings are capped, counts are not."""
+    rows_processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    tins_checked: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    tin_warnings: List[dict] = field(default_factory=list)
+
+    def record(self, chunk: ValidatedChunk, inserted: int, tin_warnings: List[dict], tins_checked: int):
+        limit = settings.bulk_import_max_errors
+        self.rows_processed += chunk.size
+        self.successful += inserted
+        self.failed += len(chunk.errors)
+        self.tins_checked += tins_checked
+        self.errors.extend(chunk.errors[:max(limit - len(self.errors), 0)])
+        self.tin_warnings.extend(tin_warnings[:max(limit - len(self.tin_warnings), 0)])
+
+
+async def import_rows(
+    db: AsyncSession,
+    import_type: str,
+    stream: TextIO,
+    entity_id: uuid.UUID,
+    created_by_id: Optional[uuid.UUID] = None,
+    skip_errors: bool = False,
+    validate_tins: bool = True,
+    progress: Optional[ImportProgress] = None,
+    on_chunk: Optional[Callable[[ImportProgress], Awaitable[None]]] = None,
+) -> ImportProgress:
+    """
+    Import a CSV stream chunk by chunk.
+
+    Without skip_errors the first invalid row raises BulkImportError
+    before its chunk is written. on_chunk runs after every chunk (the job
+    runner commits there); otherwise the caller commits. A progress from an
+    earlier run resumes after its rows_processed.
+    """
+    spec = IMPORT_SPECS[import_type]
+    progress = progress or ImportProgress()
+    constants: Dict[str, Any] = {"entity_id": entity_id}
+    if "created_by_id" in spec.model.__table__.c:
+        constants["created_by_id"] = created_by_id
+
+    for rows in iter_csv_chunks(stream, settings.bulk_import_chunk_rows, skip=progress.rows_processed):
+        chunk = validate_chunk(spec, rows)
+        if chunk.errors and not skip_errors:
+            raise BulkImportError(chunk.errors[0])
+        tin_warnings, tins_checked = [], 0
+        if spec.verify_tins and validate_tins:
+            tin_warnings, tins_checked = await verify_chunk_tins(db, spec, chunk)
+        inserted = await import_chunk(db, spec, chunk, constants)
+        progress.record(chunk, inserted, tin_warnings, tins_checked)
+        if on_chunk is not None:
+            await on_chunk(progress)
+    return progress
+
+
+async def log_import(
+    db: AsyncSession,
+    entity_id: uuid.UUID,
+    user_id: Optional[uuid.UUID],
+    import_type: str,
+    progress: ImportProgress,
+):
+    """Audit log entry for a finished import (commits)."""
+    from app.services.audit_service import AuditService
+
+    new_values = {
+        "import_type": import_type,
+        "total_rows": progress.rows_processed,
+        "successful": progress.successful,
+        "failed": progress.failed,
+    }
+    if IMPORT_SPECS[import_type].verify_tins:
+        new_values["tins_checked"] = progress.tins_checked
+        new_values["tins_invalid"] = len(progress.tin_warnings)
+    await AuditService(db).log_action(
+        business_entity_id=entity_id,
+        entity_type="bulk_import",
+        entity_id=f"{import_type}-{date.today().isoformat()}",
+        action=AuditAction.IMPORT,
+        user_id=user_id,
+        new_values=new_values,
+    )
+
+
+# ===========================================
+# BACKGROUND JOBS
+# ===========================================
+
+async def enqueue_bulk_import(
+    db: AsyncSession,
+    entity_id: uuid.UUID,
+    import_type: str,
+    upload: BinaryIO,
+    filename: str,
+    created_by_id: Optional[uuid.UUID] = None,
+    skip_errors: bool = False,
+    validate_tins: bool = True,
+    storage: Optional[FileStorageService] = None,
+) -> BulkImportJob:
+    """Store the upload (streamed, not read into memory), create a QUEUED job and dispatch it."""
+    storage = storage or FileStorageService()
+    stored = await storage.upload_stream(
+        entity_id=entity_id,
+        stream=upload,
+        filename=filename,
+        content_type="text/csv",
+        category=FileCategory.BULK_IMPORT,
+    )
+    job = BulkImportJob(
+        entity_id=entity_id,
+        created_by_id=created_by_id,
+        import_type=import_type,
+        status=BulkImportStatus.QUEUED,
+        file_id=stored["file_id"],
+        filename=filename,
+        options={"skip_errors": skip_errors, "validate_tins": validate_tins},
+    )
+    db.add(job)
+    await db.commit()
+    await dispatch_bulk_import(db, job)
+    return job
+
+
+async def dispatch_bulk_import(db: AsyncSession, job: BulkImportJob):
+    """Send a job to the workers; marks it FAILED if it cannot be sent."""
+    from app.tasks.celery_tasks import bulk_import_task
+
+    try:
+        bulk_import_task.delay(str(job.id))
+    except Exception as e:
+        logger.error(f"Could not dispatch bulk import {job.id}: {e}")
+        job.status = BulkImportStatus.FAILED
+        job.error_message = f"Could not dispatch import job: {e}"
+        await db.commit()
+        raise
+
+
+@asynccontextmanager
+async def open_stored_csv(storage: FileStorageService, file_id: str) -> AsyncIterator[TextIO]:
+    """Text stream over a stored CSV: the file itself on local storage, else a temporary copy."""
+    path = storage.get_local_path(file_id)
+    if path is not None:
+        binary = open(path, "rb")
+    else:
+        binary = tempfile.TemporaryFile()
+        await storage.download_to_file(file_id, binary)
+        binary.seek(0)
+    stream = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+    try:
+        yield stream
+    finally:
+        stream.close()
+
+
+def _store_progress(job: BulkImportJob, progress: ImportProgress):
+    job.rows_processed = progress.rows_processed
+    job.successful = progress.successful
+    job.failed = progress.failed
+    job.tins_checked = progress.tins_checked
+    job.errors = list(progress.errors)
+    job.tin_warnings = list(progress.tin_warnings)
+
+
+async def run_bulk_import_job(
+    db: AsyncSession,
+    job_id: uuid.UUID,
+    storage: Optional[FileStorageService] = None,
+) -> Dict[str, Any]:
+    """
+    Run (or resume) a background import.
+
+    Each chunk commits with the job's counters, so a job picked up again
+    after a crash or a failure continues after rows_processed. Without
+    skip_errors a fresh job first validates the whole file and fails,
+    writing nothing, if any row is invalid. The upload is deleted once the
+    job completes.
+    """
+    job = await db.get(BulkImportJob, job_id)
+    if job is None or job.status == BulkImportStatus.COMPLETED:
+        return {"job_id": str(job_id), "status": job.status.value if job else "not_found"}
+
+    storage = storage or FileStorageService()
+    options = job.options or {}
+    skip_errors = bool(options.get("skip_errors"))
+    job.status = BulkImportStatus.RUNNING
+    job.started_at = job.started_at or datetime.now(timezone.utc)
+    job.error_message = None
+    await db.commit()
+
+    progress = ImportProgress(
+        rows_processed=job.rows_processed or 0,
+        successful=job.successful or 0,
+        failed=job.failed or 0,
+        tins_checked=job.tins_checked or 0,
+        errors=list(job.errors or []),
+        tin_warnings=list(job.tin_warnings or []),
+    )
+
+    async def checkpoint(progress: ImportProgress):
+        _store_progress(job, progress)
+        await db.commit()
+
+    try:
+        async with open_stored_csv(storage, job.file_id) as stream:
+            if not skip_errors and progress.rows_processed == 0:
+                error = first_invalid_row(IMPORT_SPECS[job.import_type], stream)
+                if error is not None:
+                    raise BulkImportError(error)
+                stream.seek(0)
+            await import_rows(
+                db,
+                job.import_type,
+                stream,
+                job.entity_id,
+                job.created_by_id,
+                skip_errors=skip_errors,
+                validate_tins=bool(options.get("validate_tins", True)),
+                progress=progress,
+                on_chunk=checkpoint,
+            )
+    except Exception as e:
+        # The rollback expires the job; only assign to it from here on
+        await db.rollback()
+        job.status = BulkImportStatus.FAILED
+        job.error_message = str(e)[:2000]
+        if isinstance(e, BulkImportError) and progress.rows_processed == 0:
+            job.errors = [e.error]
+            job.failed = 1
+        await db.commit()
+        if not isinstance(e, BulkImportError):
+            raise
+        return {"job_id": str(job_id), "status": BulkImportStatus.FAILED.value, "error": str(e)}
+
+    job.status = BulkImportStatus.COMPLETED
+    job.completed_at = datetime.now(timezone.utc)
+    await db.commit()
+    await log_import(db, job.entity_id, job.created_by_id, job.import_type, progress)
+    await storage.delete_file(job.file_id)
+    return {
+        "job_id": str(job_id),
+        "status": job.status.value,
+        "total_rows": progress.rows_processed,
+        "successful": progress.successful,
+        "failed": progress.failed,
+    }
@@ -38,6 +38,9 @@ class CacheService:
     PREFIX_REPORT = "report"
     PREFIX_USER_SESSION = "session"
     PREFIX_TENANT = "tenant"
+    PREFIX_AI_LABEL = "ai:label"
+    PREFIX_FORECAST = "forecast"
+    PREFIX_OCR_DOCUMENT = "ocr:doc"
     
     # Default TTL values (in seconds)
     TTL_FX_RATE = 3600  # 1 hour - rates change daily
@@ -46,6 +49,8 @@ class CacheService:
     TTL_REPORT = 900  # 15 minutes
     TTL_SESSION = 86400  # 24 hours
     TTL_TENANT = 3600  # 1 hour
+    TTL_AI_LABEL = 7776000  # 90 days - past transaction labels per entity
+    TTL_FORECAST = 86400  # 24 hours - keyed by the last actual period
     
     def __init__(self, redis_url: Optional[str] = None):
         self.redis_url = redis_url or settings.redis_url
@@ -154,6 +159,39 @@ class CacheService:
             logger.warning(f"Cache set_json failed for {key}: {e}")
             return False
     
+    async def hget_many(self, key: str, fields: List[str]) -> Dict[str, str]:
+        """Get several fields of a hash in one round trip (missing fields omitted)."""
+        if not fields:
+            return {}
+        try:
+            client = await self.get_client()
+            values = await client.hmget(key, fields)
+            return {field: value for field, value in zip(fields, values) if value is not None}
+        except Exception as e:
+            logger.warning(f"Cache hmget failed for {key}: {e}")
+            return {}
+    
+    async def hset_many(
+        self,
+        key: str,
+        mapping: Dict[str, str],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Set several fields of a hash, refreshing the hash's TTL."""
+        if not mapping:
+            return True
+        try:
+            client = await self.get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=mapping)
+                if ttl:
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Cache hset failed for {key}: {e}")
+            return False
+    
     # =========================================================================
     # FX RATE CACHING
     # =========================================================================
@@ -343,6 +381,56 @@ class CacheService:
             pattern = f"{self.PREFIX_REPORT}:*"
         return await self.delete_pattern(pattern)
     
+    # =========================================================================
+    # FORECAST CACHING
+    # =========================================================================
+    
+    def _forecast_key(
+        self,
+        entity_id: str,
+        metric: str,
+        last_period: str,
+        params_hash: str,
+    ) -> str:
+        """Generate cache key for a batch forecast."""
+        return f"{self.PREFIX_FORECAST}:{entity_id}:{metric}:{last_period}:{params_hash}"
+    
+    async def get_forecast(
+        self,
+        entity_id: str,
+        metric: str,
+        last_period: str,
+        params_hash: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a cached batch forecast."""
+        key = self._forecast_key(entity_id, metric, last_period, params_hash)
+        return await self.get_json(key)
+    
+    async def set_forecast(
+        self,
+        entity_id: str,
+        metric: str,
+        last_period: str,
+        params_hash: str,
+        data: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Cache a batch forecast."""
+        key = self._forecast_key(entity_id, metric, last_period, params_hash)
+        return await self.set_json(key, data, ttl or self.TTL_FORECAST)
+    
+    async def invalidate_forecasts(
+        self,
+        entity_id: str,
+        metric: Optional[str] = None,
+    ) -> int:
+        """Invalidate cached forecasts of an entity."""
+        if metric:
+            pattern = f"{self.PREFIX_FORECAST}:{entity_id}:{metric}:*"
+        else:
+            pattern = f"{self.PREFIX_FORECAST}:{entity_id}:*"
+        return await self.delete_pattern(pattern)
+    
     # =========================================================================
     # UTILITY METHODS
     # =========================================================================
@@ -23,6 +23,12 @@ import hashlib
 from sqlalchemy import select, and_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.tax_calculators.tax_schedule import (
+    TaxSchedule,
+    compile_tax_schedule,
+    paye_schedule_for,
+)
+
 
 class RuleType(str, Enum):
     """Types of tax rules that can be versioned."""
@@ -353,6 +359,23 @@ class ComplianceReplayEngine:
             })
         return bands
     
+    def get_paye_schedule(self, as_of_date: date) -> TaxSchedule:
+        """Compiled PAYE schedule effective on a date (shared across dates per rule version)."""
+        if self.rules_registry is TAX_RULES_REGISTRY:
+            return paye_schedule_for(as_of_date)
+        bands = self.get_paye_bands(as_of_date)
+        return compile_tax_schedule(
+            tuple(
+                (
+                    Decimal(str(band["lower"])),
+                    Decimal(str(band["upper"])) if band["upper"] else None,
+                    Decimal(str(band["rate"])),
+                )
+                for band in bands
+            ),
+            references=tuple(band["legal_reference"] for band in bands),
+        )
+    
     def get_vat_rate(self, as_of_date: date) -> Decimal:
         """Get VAT rate effective on a specific date."""
         rate = self.get_rule_value(RuleType.VAT_RATE, "standard_rate", as_of_date)
@@ -377,7 +400,7 @@ class ComplianceReplayEngine:
         Uses tax bands and rules that were effective on that date.
         """
         gross = Decimal(str(gross_annual_income))
-        bands = self.get_paye_bands(calculation_date)
+        schedule = self.get_paye_schedule(calculation_date)
         
         # Get CRA rules for the date
         cra_fixed = self.get_rule_value(RuleType.RELIEF_AMOUNT, "cra_fixed", calculation_date)
@@ -398,31 +421,13 @@ class ComplianceReplayEngine:
         taxable = max(Decimal("0"), gross - cra - pension_relief)
         
         # Apply tax bands
-        total_tax = Decimal("0")
+        total_tax = schedule.tax(taxable)
         band_breakdown = []
         
-        for band in bands:
-            lower = Decimal(str(band["lower"]))
-            upper = Decimal(str(band["upper"])) if band["upper"] else None
-            rate = Decimal(str(band["rate"]))
-            
-            if taxable <= lower:
-                tax_in_band = Decimal("0")
-            elif upper is None:
-                tax_in_band = (taxable - lower) * (rate / 100)
-            else:
-                taxable_in_band = min(taxable, upper) - lower
-                tax_in_band = max(Decimal("0"), taxable_in_band) * (rate / 100)
-            
-            if tax_in_band > 0 or taxable > lower:
-                band_breakdown.append({
-                    "range": f"NGN {lower:,.0f} - {'Unlimited' if upper is None else f'NGN {upper:,.0f}'}",
-                    "rate": f"{rate}%",
-                    "tax_amount": float(tax_in_band),
-                    "legal_reference": band["legal_reference"],
-                })
-            
-            total_tax += tax_in_band
+        for i, tax_in_band in schedule.band_amounts(taxable):
+            band_row = schedule.breakdown_row(i, tax_in_band, currency="NGN ", unbounded="Unlimited")
+            band_row["legal_reference"] = schedule.references[i]
+            band_breakdown.append(band_row)
         
         effective_rate = (total_tax / gross * 100) if gross > 0 else Decimal("0")
         
@@ -0,0 +1,306 @@
+"""
+TekVwarho ProAudit - Compute Pool
+
+Runs CPU-bound work off the event loop.
+
+Features:
+- A process pool for pure-Python work that holds the GIL (ReportLab and
+  openpyxl rendering, neural network training)
+- A thread pool for libraries that release the GIL (PIL, hashlib)
+- Named work kinds, each with its own concurrency limit, queue bound and
+  timeout; callers past the queue bound get ComputeBusyException (503)
+  instead of piling up behind a long render
+- Per-kind queue depth, wait time and run time metrics (get_stats)
+
+Process-pool work must be a module-level function with picklable
+arguments; pass plain data (dicts, dataclasses, SimpleNamespace snapshots),
+never ORM objects or sessions.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.utils.error_handling import ComputeBusyException, ComputeTimeoutException
+
+logger = logging.getLogger(__name__)
+
+
+PROCESS = "process"
+THREAD = "thread"
+
+# Payloads below this are hashed inline; the hop to a thread costs more
+HASH_INLINE_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class WorkKind:
+    """Limits for one kind of compute job."""
+    name: str
+    executor: str  # PROCESS or THREAD
+    max_concurrency: int
+    timeout_seconds: float
+    max_queue: int
+
+
+@dataclass
+class KindStats:
+    """Counters for one work kind."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    rejected: int = 0
+    queued: int = 0
+    running: int = 0
+    peak_queued: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+
+
+def default_kinds() -> Dict[str, WorkKind]:
+    """Work kinds built from settings."""
+    queue_limit = settings.compute_queue_limit
+    return {
+        kind.name: kind for kind in (
+            WorkKind("render", PROCESS, settings.compute_render_concurrency,
+                     settings.compute_render_timeout_seconds, queue_limit),
+            WorkKind("ml_training", PROCESS, settings.compute_ml_concurrency,
+                     settings.compute_ml_timeout_seconds, queue_limit),
+            WorkKind("image", THREAD, settings.compute_image_concurrency,
+                     settings.compute_image_timeout_seconds, queue_limit),
+            WorkKind("hash", THREAD, settings.compute_hash_concurrency,
+                     settings.compute_hash_timeout_seconds, queue_limit),
+        )
+    }
+
+
+# ===========================================
+# COMPUTE POOL
+# ===========================================
+
+class ComputePool:
+    """
+    Process and thread executors behind per-kind admission control.
+
+    A job holds its kind's slot until the executor finishes it, even if the
+    caller timed out or was cancelled, so the limits reflect real executor
+    occupancy. Limits are enforced per event loop (the web server has one;
+    a Celery worker's runtime has its own).
+    """
+
+    def __init__(
+        self,
+        kinds: Optional[Dict[str, WorkKind]] = None,
+        process_workers: Optional[int] = None,
+        thread_workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        self.pid = os.getpid()
+        self.kinds = kinds if kinds is not None else default_kinds()
+        self.process_workers = (
+            settings.compute_process_workers if process_workers is None else process_workers
+        )
+        self.thread_workers = max(
+            1, settings.compute_thread_workers if thread_workers is None else thread_workers
+        )
+        self.start_method = start_method or settings.compute_process_start_method
+        self.stats: Dict[str, KindStats] = {name: KindStats() for name in self.kinds}
+
+        self._process_executor: Optional[ProcessPoolExecutor] = None
+        self._thread_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._closed = False
+
+    # ---- executors ----
+
+    def _executor(self, kind: WorkKind) -> Executor:
+        with self._executor_lock:
+            if kind.executor == PROCESS and self.process_workers > 0:
+                if self._process_executor is None:
+                    self._process_executor = ProcessPoolExecutor(
+                        max_workers=self.process_workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                    )
+                return self._process_executor
+            if self._thread_executor is None:
+                self._thread_executor = ThreadPoolExecutor(
+                    max_workers=self.thread_workers, thread_name_prefix="compute-pool"
+                )
+            return self._thread_executor
+
+    def _discard_process_executor(self, broken: ProcessPoolExecutor):
+        # A worker died (OOM, segfault in a C extension); the next job
+        # gets a fresh pool
+        with self._executor_lock:
+            if self._process_executor is broken:
+                self._process_executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(name)
+        if semaphore is None:
+            semaphore = semaphores[name] = asyncio.Semaphore(max(1, self.kinds[name].max_concurrency))
+        return semaphore
+
+    # ---- submission ----
+
+    async def run(self, kind: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on the kind's executor and await the result.
+
+        Raises:
+            ComputeBusyException: The kind's queue is full
+            ComputeTimeoutException: The job ran past the kind's timeout
+        """
+        if self._closed:
+            raise RuntimeError("Compute pool is closed")
+        spec = self.kinds[kind]
+        stats = self.stats[kind]
+        if stats.queued >= spec.max_queue:
+            stats.rejected += 1
+            raise ComputeBusyException(kind, stats.queued)
+
+        stats.submitted += 1
+        semaphore = self._semaphore(kind)
+        queued_at = time.perf_counter()
+        stats.queued += 1
+        stats.peak_queued = max(stats.peak_queued, stats.queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.queued -= 1
+
+        started = time.perf_counter()
+        stats.wait_seconds += started - queued_at
+        stats.running += 1
+        loop = asyncio.get_running_loop()
+
+        def finish(future: Future):
+            stats.running -= 1
+            stats.run_seconds += time.perf_counter() - started
+            semaphore.release()
+
+        def done(future: Future):
+            try:
+                loop.call_soon_threadsafe(finish, future)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        executor = self._executor(spec)
+        try:
+            future = executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException as e:
+            finish(None)
+            if isinstance(e, BrokenProcessPool):
+                stats.failed += 1
+                self._discard_process_executor(executor)
+            raise
+        # Release the slot when the executor is done, not when the caller is
+        future.add_done_callback(done)
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), spec.timeout_seconds)
+        except asyncio.TimeoutError:
+            # A job already running can't be interrupted; it keeps its slot
+            stats.timed_out += 1
+            logger.warning(f"Compute job {kind}:{getattr(fn, '__name__', fn)} timed out")
+            raise ComputeTimeoutException(kind, spec.timeout_seconds) from None
+        except BrokenProcessPool:
+            stats.failed += 1
+            self._discard_process_executor(executor)
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        stats.completed += 1
+        return result
+
+    # ---- lifecycle / metrics ----
+
+    def close(self, wait: bool = False):
+        """Stop the executors; queued jobs are cancelled."""
+        self._closed = True
+        with self._executor_lock:
+            for executor in (self._process_executor, self._thread_executor):
+                if executor is not None:
+                    executor.shutdown(wait=wait, cancel_futures=True)
+            self._process_executor = None
+            self._thread_executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        kinds = {}
+        for name, stats in self.stats.items():
+            finished = stats.completed + stats.failed + stats.timed_out
+            kinds[name] = {
+                **asdict(self.kinds[name]),
+                **asdict(stats),
+                "avg_wait_ms": round(stats.wait_seconds / stats.submitted * 1000, 3)
+                if stats.submitted else 0.0,
+                "avg_run_ms": round(stats.run_seconds / finished * 1000, 3)
+                if finished else 0.0,
+            }
+        return {
+            "pid": self.pid,
+            "process_workers": self.process_workers,
+            "thread_workers": self.thread_workers,
+            "kinds": kinds,
+        }
+
+
+_pool: Optional[ComputePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_compute_pool() -> ComputePool:
+    """Get this process's compute pool (rebuilt after fork)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ComputePool()
+        return _pool
+
+
+def close_compute_pool(wait: bool = False):
+    """Shut down this process's compute pool if one was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.pid == os.getpid():
+            _pool.close(wait=wait)
+        _pool = None
+
+
+async def run_compute(kind: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run CPU-bound ``fn`` on the shared compute pool (see ComputePool.run)."""
+    return await get_compute_pool().run(kind, fn, *args, **kwargs)
+
+
+# ===========================================
+# SHARED JOBS
+# ===========================================
+
+def _sha256_hexdigest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def sha256_hexdigest(data: bytes) -> str:
+    """SHA-256 of a payload; large ones are hashed on the thread pool."""
+    if len(data) < HASH_INLINE_BYTES:
+        return _sha256_hexdigest(data)
+    return await run_compute("hash", _sha256_hexdigest, data)
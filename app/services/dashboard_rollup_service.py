@@ -0,0 +1,354 @@
+"""
+TekVwarho ProAudit - Dashboard Rollups
+
+Keeps entity_daily_summaries in step with transactions and invoices, and
+reads it back for the organization dashboard.
+
+Maintenance is incremental. A before_flush hook turns every inserted,
+modified and deleted Transaction or Invoice into per-(entity, day) deltas
+and applies them with one additive upsert on the flushing connection, so
+the rollup commits or rolls back together with the posting. Statements
+that bypass the ORM (bulk UPDATE/DELETE, COPY) are not seen by the hook:
+their callers apply row_deltas for rows they inserted or run
+rebuild_daily_summaries for the affected range, and a nightly task
+rebuilds the last settings.dashboard_rollup_repair_days days.
+
+The dashboard reads every window it needs (this month, year to date, the
+last three months, all time, overdue) in one conditional-aggregate query
+over the rollup; see load_dashboard_totals.
+"""
+
+import uuid
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, event, func, inspect, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.entity_daily_summary import EntityDailySummary
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.transaction import Transaction, TransactionType
+
+SUMMARY_COLUMNS = tuple(
+    column.name for column in EntityDailySummary.__table__.columns
+    if column.name not in ("id", "entity_id", "day", "created_at", "updated_at")
+)
+
+STATUS_COLUMNS = {status: f"invoices_{status.value}" for status in InvoiceStatus}
+UNPAID_STATUSES = (InvoiceStatus.PENDING, InvoiceStatus.SUBMITTED)
+
+# Source attributes each rollup row depends on
+TRANSACTION_FIELDS = (
+    "entity_id", "transaction_type", "transaction_date", "amount", "vat_amount",
+    "wht_amount", "category_id", "wren_verified_by_id",
+)
+INVOICE_FIELDS = ("entity_id", "status", "due_date", "total_amount")
+
+# Dashboard totals that are counts rather than amounts
+COUNT_TOTALS = ("unverified_expenses", "pending_wren_count", "invoice_count")
+
+Delta = Dict[str, Any]
+DeltaKey = Tuple[uuid.UUID, date]
+
+
+def _money(value: Any) -> Decimal:
+    return Decimal(str(value)) if value is not None else Decimal("0")
+
+
+def transaction_contribution(values: Dict[str, Any]) -> Tuple[Optional[DeltaKey], Delta]:
+    """Rollup key and column amounts of one transaction."""
+    if values["transaction_type"] is None:
+        return None, {}
+    amount = _money(values["amount"])
+    if TransactionType(values["transaction_type"]) == TransactionType.INCOME:
+        delta = {"income_count": 1, "income_amount": amount, "output_vat": _money(values["vat_amount"])}
+    else:
+        pending = values["category_id"] is None or values["wren_verified_by_id"] is None
+        delta = {
+            "expense_count": 1,
+            "expense_amount": amount,
+            "input_vat": _money(values["vat_amount"]),
+            "wht_deducted": _money(values["wht_amount"]),
+            "unverified_expense_count": int(values["wren_verified_by_id"] is None),
+            "pending_wren_count": int(pending),
+            "pending_wren_amount": amount if pending else Decimal("0"),
+        }
+    return (values["entity_id"], values["transaction_date"]), delta
+
+
+def invoice_contribution(values: Dict[str, Any]) -> Tuple[Optional[DeltaKey], Delta]:
+    """Rollup key and column amounts of one invoice (bucketed by due date)."""
+    status = InvoiceStatus(values["status"] or InvoiceStatus.DRAFT)
+    total = _money(values["total_amount"])
+    delta = {"invoice_count": 1, STATUS_COLUMNS[status]: 1}
+    if status == InvoiceStatus.DRAFT:
+        delta["draft_invoice_amount"] = total
+    elif status in UNPAID_STATUSES:
+        delta["unpaid_invoice_amount"] = total
+    return (values["entity_id"], values["due_date"]), delta
+
+
+SOURCES = {
+    Transaction: (TRANSACTION_FIELDS, transaction_contribution),
+    Invoice: (INVOICE_FIELDS, invoice_contribution),
+}
+
+
+def _values(obj: Any, fields: Tuple[str, ...], committed: bool) -> Dict[str, Any]:
+    """Current attribute values, or the values as last loaded from the database."""
+    if not committed:
+        return {name: getattr(obj, name) for name in fields}
+    previous = inspect(obj).committed_state
+    return {name: previous.get(name, getattr(obj, name)) for name in fields}
+
+
+def summary_deltas(new: Iterable[Any], dirty: Iterable[Any], deleted: Iterable[Any]) -> Dict[DeltaKey, Delta]:
+    """
+    Net rollup changes for a flush.
+
+    New rows add their contribution, deleted rows subtract what they
+    contributed when loaded, and modified rows do both, so a moved date or
+    a status change shifts amounts between days and status columns. Keys
+    whose changes cancel out are dropped.
+    """
+    deltas: Dict[DeltaKey, Delta] = defaultdict(lambda: defaultdict(int))
+
+    def apply(obj: Any, committed: bool, sign: int):
+        fields, contribution = SOURCES[type(obj)]
+        key, delta = contribution(_values(obj, fields, committed))
+        if key is None or None in key:
+            return
+        for column, value in delta.items():
+            deltas[key][column] += sign * value
+
+    for obj in new:
+        if type(obj) in SOURCES:
+            apply(obj, committed=False, sign=1)
+    for obj in deleted:
+        if type(obj) in SOURCES:
+            apply(obj, committed=True, sign=-1)
+    for obj in dirty:
+        if type(obj) in SOURCES:
+            apply(obj, committed=True, sign=-1)
+            apply(obj, committed=False, sign=1)
+
+    return {
+        key: {column: value for column, value in delta.items() if value}
+        for key, delta in deltas.items()
+        if any(delta.values())
+    }
+
+
+def row_deltas(model: type, rows: Iterable[Dict[str, Any]]) -> Dict[DeltaKey, Delta]:
+    """Rollup changes for rows inserted without the ORM (e.g. by COPY), given as column values."""
+    if model not in SOURCES:
+        return {}
+    fields, contribution = SOURCES[model]
+    deltas: Dict[DeltaKey, Delta] = defaultdict(lambda: defaultdict(int))
+    for values in rows:
+        key, delta = contribution({name: values.get(name) for name in fields})
+        if key is None or None in key:
+            continue
+        for column, value in delta.items():
+            deltas[key][column] += value
+    return {key: dict(delta) for key, delta in deltas.items()}
+
+
+def upsert_statement(deltas: Dict[DeltaKey, Delta]):
+    """Additive upsert of deltas, in key order so concurrent postings lock rows alike."""
+    statement = pg_insert(EntityDailySummary).values([
+        {
+            "id": uuid.uuid4(),
+            "entity_id": entity_id,
+            "day": day,
+            **{column: delta.get(column, 0) for column in SUMMARY_COLUMNS},
+        }
+        for (entity_id, day), delta in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1]))
+    ])
+    table = EntityDailySummary.__table__
+    return statement.on_conflict_do_update(
+        constraint="uq_entity_daily_summaries_entity_day",
+        set_={
+            **{column: table.c[column] + statement.excluded[column] for column in SUMMARY_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _apply_summary_deltas(session: Session, flush_context, instances):
+    deltas = summary_deltas(session.new, session.dirty, session.deleted)
+    if deltas and session.get_bind().dialect.name == "postgresql":
+        session.connection().execute(upsert_statement(deltas))
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the previous value before an attribute is overwritten, so deltas
+# are exact even for attributes that were expired when they were set
+for _model, (_fields, _) in SOURCES.items():
+    for _name in _fields:
+        event.listen(getattr(_model, _name), "set", _keep_previous_value, active_history=True, retval=True)
+
+
+# ===========================================
+# REBUILD
+# ===========================================
+
+def _sum(expression, condition=None):
+    if condition is not None:
+        expression = func.sum(expression).filter(condition)
+    else:
+        expression = func.sum(expression)
+    return func.coalesce(expression, 0)
+
+
+def _transaction_rollup(entity_id: Optional[uuid.UUID], start: Optional[date], end: Optional[date]):
+    income = Transaction.transaction_type == TransactionType.INCOME
+    expense = Transaction.transaction_type == TransactionType.EXPENSE
+    pending = and_(expense, or_(Transaction.category_id.is_(None), Transaction.wren_verified_by_id.is_(None)))
+    columns = {
+        "income_count": func.count().filter(income),
+        "income_amount": _sum(Transaction.amount, income),
+        "output_vat": _sum(Transaction.vat_amount, income),
+        "expense_count": func.count().filter(expense),
+        "expense_amount": _sum(Transaction.amount, expense),
+        "input_vat": _sum(Transaction.vat_amount, expense),
+        "wht_deducted": _sum(Transaction.wht_amount, expense),
+        "unverified_expense_count": func.count().filter(and_(expense, Transaction.wren_verified_by_id.is_(None))),
+        "pending_wren_count": func.count().filter(pending),
+        "pending_wren_amount": _sum(Transaction.amount, pending),
+    }
+    return _grouped(Transaction.entity_id, Transaction.transaction_date, columns, entity_id, start, end)
+
+
+def _invoice_rollup(entity_id: Optional[uuid.UUID], start: Optional[date], end: Optional[date]):
+    columns = {
+        "invoice_count": func.count(),
+        **{column: func.count().filter(Invoice.status == status) for status, column in STATUS_COLUMNS.items()},
+        "draft_invoice_amount": _sum(Invoice.total_amount, Invoice.status == InvoiceStatus.DRAFT),
+        "unpaid_invoice_amount": _sum(Invoice.total_amount, Invoice.status.in_(UNPAID_STATUSES)),
+    }
+    return _grouped(Invoice.entity_id, Invoice.due_date, columns, entity_id, start, end)
+
+
+def _grouped(entity_column, day_column, columns: Dict[str, Any], entity_id, start, end):
+    """Per-(entity, day) aggregate with every summary column (zero where not applicable)."""
+    statement = select(
+        entity_column.label("entity_id"),
+        day_column.label("day"),
+        *[columns.get(column, literal(0)).label(column) for column in SUMMARY_COLUMNS],
+    ).group_by(entity_column, day_column)
+    return statement.where(*_day_range(entity_column, day_column, entity_id, start, end))
+
+
+def _day_range(entity_column, day_column, entity_id, start, end):
+    conditions = []
+    if entity_id is not None:
+        conditions.append(entity_column == entity_id)
+    if start is not None:
+        conditions.append(day_column >= start)
+    if end is not None:
+        conditions.append(day_column <= end)
+    return conditions
+
+
+async def rebuild_daily_summaries(
+    db: AsyncSession,
+    entity_id: Optional[uuid.UUID] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> int:
+    """
+    Recompute rollup rows from the source tables.
+
+    Deletes the rows in range and writes them again with one INSERT ...
+    SELECT; all bounds are optional (no bounds rebuilds everything). Used
+    for backfill, after bulk statements, and by the nightly repair task.
+    The caller commits. Returns the number of rows written.
+    """
+    await db.execute(
+        delete(EntityDailySummary).where(
+            *_day_range(EntityDailySummary.entity_id, EntityDailySummary.day, entity_id, start, end)
+        )
+    )
+    sources = union_all(_transaction_rollup(entity_id, start, end), _invoice_rollup(entity_id, start, end)).subquery()
+    rollup = select(
+        func.gen_random_uuid(),
+        sources.c.entity_id,
+        sources.c.day,
+        *[func.sum(sources.c[column]) for column in SUMMARY_COLUMNS],
+    ).group_by(sources.c.entity_id, sources.c.day)
+    statement = pg_insert(EntityDailySummary).from_select(["id", "entity_id", "day", *SUMMARY_COLUMNS], rollup)
+    # A posting committed while this runs may have written a row first; take the recount
+    result = await db.execute(statement.on_conflict_do_update(
+        constraint="uq_entity_daily_summaries_entity_day",
+        set_={
+            **{column: statement.excluded[column] for column in SUMMARY_COLUMNS},
+            "updated_at": func.now(),
+        },
+    ))
+    return result.rowcount
+
+
+# ===========================================
+# DASHBOARD READS
+# ===========================================
+
+def dashboard_windows(today: date) -> Dict[str, date]:
+    """Start dates of the dashboard windows ending today."""
+    three_months_ago = date(
+        today.year if today.month > 3 else today.year - 1,
+        today.month - 3 if today.month > 3 else today.month + 9,
+        1,
+    )
+    return {
+        "month_start": today.replace(day=1),
+        "year_start": today.replace(month=1, day=1),
+        "three_months_ago": three_months_ago,
+    }
+
+
+def dashboard_totals_query(entity_id: uuid.UUID, today: date):
+    """Every dashboard figure for one entity as a single conditional aggregate."""
+    windows = dashboard_windows(today)
+    summary = EntityDailySummary
+    this_month = summary.day.between(windows["month_start"], today)
+    year_to_date = summary.day.between(windows["year_start"], today)
+    return select(
+        _sum(summary.income_amount, this_month).label("month_income"),
+        _sum(summary.expense_amount, this_month).label("month_expense"),
+        _sum(summary.output_vat, this_month).label("month_output_vat"),
+        _sum(summary.input_vat, this_month).label("month_input_vat"),
+        _sum(summary.income_amount, year_to_date).label("ytd_income"),
+        _sum(summary.expense_amount, year_to_date).label("ytd_expense"),
+        _sum(summary.expense_amount, summary.day >= windows["three_months_ago"]).label("recent_expense"),
+        _sum(summary.income_amount).label("total_income"),
+        _sum(summary.expense_amount).label("total_expense"),
+        _sum(summary.unverified_expense_count).label("unverified_expenses"),
+        _sum(summary.pending_wren_count).label("pending_wren_count"),
+        _sum(summary.pending_wren_amount).label("pending_wren_amount"),
+        _sum(summary.invoice_count).label("invoice_count"),
+        _sum(summary.draft_invoice_amount + summary.unpaid_invoice_amount).label("outstanding_invoices"),
+        _sum(summary.unpaid_invoice_amount, summary.day < today).label("overdue_invoices"),
+    ).where(summary.entity_id == entity_id)
+
+
+async def load_dashboard_totals(
+    db: AsyncSession,
+    entity_id: uuid.UUID,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Run dashboard_totals_query; amounts are Decimal, counts int."""
+    result = await db.execute(dashboard_totals_query(entity_id, today or date.today()))
+    row = result.one()._mapping
+    return {
+        name: int(value) if name in COUNT_TOTALS else Decimal(value)
+        for name, value in row.items()
+    }
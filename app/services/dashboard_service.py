@@ -13,10 +13,11 @@ NTAA 2025 Compliance Features:
 - Maker-Checker SoD enforcement for sensitive views
 """
 
+import asyncio
 import uuid
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, List, Optional
 from calendar import monthrange
 
 from sqlalchemy import select, func, and_, or_, case
@@ -26,9 +27,11 @@ from app.models.user import User, PlatformRole, UserRole
 from app.models.organization import Organization, VerificationStatus, OrganizationType
 from app.models.entity import BusinessEntity, BusinessType
 from app.models.transaction import Transaction, TransactionType
-from app.models.invoice import Invoice, InvoiceStatus
 from app.models.audit_consolidated import AuditLog, AuditAction
 from app.models.inventory import InventoryItem
+from app.config import settings
+from app.services.dashboard_rollup_service import load_dashboard_totals
+from app.services.platform_metrics_service import load_platform_metrics, metric_group, month_key
 from app.utils.permissions import (
     PlatformPermission,
     OrganizationPermission,
@@ -87,6 +90,10 @@ class DashboardService:
     
     def __init__(self, db: AsyncSession):
         self.db = db
+        # Rollup totals per entity, shared by the widgets of one request
+        self._rollups: Dict[uuid.UUID, Dict[str, Any]] = {}
+        # Materialized platform counters, read once per staff dashboard
+        self._platform_metrics: Optional[Dict[str, Any]] = None
     
     # ===========================================
     # PLATFORM STAFF DASHBOARDS
@@ -133,6 +140,9 @@ class DashboardService:
         # Verification stats
         verification_stats = await self._get_verification_stats()
         
+        # When the platform counters above were last recounted
+        metrics_freshness = await self._get_metrics_freshness()
+        
         # ===== 2. PLATFORM MONITORING & ANALYTICS =====
         platform_health = await self._get_platform_health_detailed()
         
@@ -183,7 +193,7 @@ class DashboardService:
         
         # Support Tickets - Stats and List
         support_service = SupportTicketService(self.db)
-        support_stats = await support_service.get_tickets_stats()
+        support_stats = await self._get_support_ticket_stats()
         support_tickets_list = await support_service.get_all_tickets(limit=20)
         
         return {
@@ -201,6 +211,7 @@ class DashboardService:
                 "total_staff": staff_count,
                 "pending_verifications": pending_verifications,
             },
+            "metrics_freshness": metrics_freshness,
             "staff_by_role": staff_by_role,
             "organizations_by_type": org_by_type,
             "subscription_stats": subscription_stats,
@@ -390,6 +401,7 @@ class DashboardService:
         user_count = await self._get_user_count()
         pending_verifications = await self._get_pending_verification_count()
         verification_stats = await self._get_verification_stats()
+        metrics_freshness = await self._get_metrics_freshness()
         
         # ===== 1. VERIFICATION COMMAND CENTER =====
         pending_verification_queue = await self._get_pending_verification_queue()
@@ -420,6 +432,7 @@ class DashboardService:
                 "total_users": user_count,
                 "pending_verifications": pending_verifications,
             },
+            "metrics_freshness": metrics_freshness,
             # Section 1: Verification Command Center
             "verification_stats": verification_stats,
             "pending_verification_queue": pending_verification_queue,
@@ -543,6 +556,7 @@ class DashboardService:
         
         # ===== 2. IMPERSONATION PORTAL =====
         impersonation_stats = await self._get_impersonation_stats()
+        metrics_freshness = await self._get_metrics_freshness()
         
         # ===== 3. NRS SUBMISSION DEBUGGER =====
         recent_submissions = await self._get_recent_nrs_submissions(limit=10)
@@ -567,6 +581,7 @@ class DashboardService:
             
             # Section 2: Impersonation Portal
             "impersonation_stats": impersonation_stats,
+            "metrics_freshness": metrics_freshness,
             
             # Section 3: NRS Submission Debugger
             "recent_submissions": recent_submissions,
@@ -622,6 +637,9 @@ class DashboardService:
         # Upcoming deadlines (for targeted campaigns)
         upcoming_deadlines = await self._get_upcoming_tax_deadlines()
         
+        # When the counts above were last recounted
+        metrics_freshness = await self._get_metrics_freshness()
+        
         return {
             "dashboard_type": "marketing",
             "user": {
@@ -646,6 +664,7 @@ class DashboardService:
             
             # Upcoming deadlines for campaigns
             "upcoming_deadlines": upcoming_deadlines,
+            "metrics_freshness": metrics_freshness,
             
             "permissions": [p.value for p in get_platform_permissions(PlatformRole.MARKETING)],
             "quick_actions": [
@@ -705,19 +724,40 @@ class DashboardService:
         organization = org_result.scalar_one_or_none()
         org_type = organization.organization_type if organization else OrganizationType.SMALL_BUSINESS
         
+        entity_id = entity.id if entity else None
+        if entity_id:
+            # Financial, invoice, tax, liquidity and threshold widgets all read
+            # the daily rollup; fetch it once for the whole dashboard
+            await self._get_rollup(entity_id)
+        
+        # Widgets that query their own tables run concurrently
+        widgets = {
+            "recent_transactions": lambda service: service._get_recent_transactions(entity_id, limit=5),
+            "org_specific": lambda service: service._get_org_type_specific_dashboard(
+                org_type=org_type,
+                entity=entity,
+                user=user,
+                organization=organization
+            ),
+        }
+        if user.role in [UserRole.OWNER, UserRole.ADMIN]:
+            widgets["team_summary"] = lambda service: service._get_team_summary(user.organization_id)
+        if user.role in [UserRole.INVENTORY_MANAGER, UserRole.OWNER, UserRole.ADMIN]:
+            widgets["inventory_summary"] = lambda service: service._get_inventory_summary(entity_id)
+        if user.role in [UserRole.OWNER, UserRole.ADMIN, UserRole.ACCOUNTANT, UserRole.EXTERNAL_ACCOUNTANT]:
+            widgets["fx_exposure"] = lambda service: service._get_fx_exposure_widget(entity_id)
+            widgets["budget_variance"] = lambda service: service._get_budget_variance_widget(entity_id)
+        if user.role in [UserRole.OWNER, UserRole.ADMIN]:
+            widgets["consolidated_summary"] = lambda service: service._get_consolidated_summary_widget(user.organization_id)
+        fetched = await self._gather_widgets(widgets)
+        
         # ===== CORE WIDGETS (All Organization Types) =====
         
         # Get financial metrics
-        financial_metrics = await self._get_financial_metrics(entity.id if entity else None)
-        
-        # Get recent transactions
-        recent_transactions = await self._get_recent_transactions(
-            entity.id if entity else None, 
-            limit=5
-        )
+        financial_metrics = await self._get_financial_metrics(entity_id)
         
         # Get invoice summary
-        invoice_summary = await self._get_invoice_summary(entity.id if entity else None)
+        invoice_summary = await self._get_invoice_summary(entity_id)
         
         # Get TIN/CAC Vault (2026 compliance)
         tin_cac_vault = await self._get_tin_cac_vault(entity, organization)
@@ -776,43 +816,30 @@ class DashboardService:
             "tin_cac_vault": tin_cac_vault,
             "compliance_health": compliance_health,
             "financial_metrics": financial_metrics,
-            "recent_transactions": recent_transactions,
+            "recent_transactions": fetched["recent_transactions"],
             "invoice_summary": invoice_summary,
             "permissions": permissions,
             "quick_actions": self._get_quick_actions_for_role(user.role, org_type),
         }
         
         # ===== ORGANIZATION-TYPE-SPECIFIC WIDGETS =====
-        org_specific = await self._get_org_type_specific_dashboard(
-            org_type=org_type,
-            entity=entity,
-            user=user,
-            organization=organization
-        )
-        dashboard["org_specific"] = org_specific
+        dashboard["org_specific"] = fetched["org_specific"]
         
         # Add role-specific sections
-        if user.role in [UserRole.OWNER, UserRole.ADMIN]:
-            dashboard["team_summary"] = await self._get_team_summary(user.organization_id)
+        if "team_summary" in fetched:
+            dashboard["team_summary"] = fetched["team_summary"]
         
         if user.role in [UserRole.OWNER, UserRole.ADMIN, UserRole.ACCOUNTANT]:
-            dashboard["tax_summary"] = await self._get_tax_summary(entity.id if entity else None)
+            dashboard["tax_summary"] = await self._get_tax_summary(entity_id)
         
-        if user.role in [UserRole.INVENTORY_MANAGER, UserRole.OWNER, UserRole.ADMIN]:
-            dashboard["inventory_summary"] = await self._get_inventory_summary(entity.id if entity else None)
+        if "inventory_summary" in fetched:
+            dashboard["inventory_summary"] = fetched["inventory_summary"]
         
         # ===== NEW ADVANCED ACCOUNTING WIDGETS =====
-        # Add FX, consolidation, and budget widgets for appropriate roles
-        if user.role in [UserRole.OWNER, UserRole.ADMIN, UserRole.ACCOUNTANT, UserRole.EXTERNAL_ACCOUNTANT]:
-            # FX Exposure Widget - Shows currency exposure and unrealized gains/losses
-            dashboard["fx_exposure"] = await self._get_fx_exposure_widget(entity.id if entity else None)
-            
-            # Budget Variance Widget - Shows YTD budget vs actual performance
-            dashboard["budget_variance"] = await self._get_budget_variance_widget(entity.id if entity else None)
-        
-        # Consolidated Summary Widget - Only for owners/admins with multi-entity groups
-        if user.role in [UserRole.OWNER, UserRole.ADMIN]:
-            dashboard["consolidated_summary"] = await self._get_consolidated_summary_widget(user.organization_id)
+        # FX exposure, budget variance and (multi-entity groups) consolidated summary
+        for name in ("fx_exposure", "budget_variance", "consolidated_summary"):
+            if name in fetched:
+                dashboard[name] = fetched[name]
         
         # Permission-based view restrictions (Maker-Checker SoD)
         dashboard["view_restrictions"] = self._get_view_restrictions(user.role, org_type)
@@ -853,29 +880,73 @@ class DashboardService:
     # HELPER METHODS
     # ===========================================
     
+    async def _get_rollup(self, entity_id: uuid.UUID) -> Dict[str, Any]:
+        """Dashboard totals for the entity from entity_daily_summaries (one query per request)."""
+        if entity_id not in self._rollups:
+            self._rollups[entity_id] = await load_dashboard_totals(self.db, entity_id)
+        return self._rollups[entity_id]
+    
+    async def _gather_widgets(
+        self,
+        widgets: Dict[str, Callable[["DashboardService"], Awaitable[Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Run independent widget loaders concurrently.
+        
+        An AsyncSession runs one statement at a time, so each loader gets a
+        service on its own short-lived session from the same engine, at most
+        settings.dashboard_widget_concurrency at once. Without an engine
+        to draw from, loaders run in turn on this session.
+        """
+        bind = self.db.bind if isinstance(self.db, AsyncSession) else None
+        if bind is None:
+            return {name: await load(self) for name, load in widgets.items()}
+        
+        limit = asyncio.Semaphore(settings.dashboard_widget_concurrency)
+        
+        async def run(load):
+            async with limit:
+                async with AsyncSession(bind, expire_on_commit=False) as session:
+                    service = DashboardService(session)
+                    service._rollups = self._rollups
+                    return await load(service)
+        
+        results = await asyncio.gather(*(run(load) for load in widgets.values()))
+        return dict(zip(widgets, results))
+    
+    async def _get_platform_metrics(self) -> Dict[str, Any]:
+        """Platform counters (see platform_metrics_service), loaded once per request."""
+        if self._platform_metrics is None:
+            self._platform_metrics = await load_platform_metrics(self.db)
+        return self._platform_metrics
+    
+    async def _get_metric(self, name: str) -> int:
+        metrics = await self._get_platform_metrics()
+        return metrics["counts"].get(name, 0)
+    
+    async def _get_metric_group(self, prefix: str) -> Dict[str, int]:
+        metrics = await self._get_platform_metrics()
+        return metric_group(metrics["counts"], prefix)
+    
+    async def _get_metrics_freshness(self) -> Dict[str, Optional[str]]:
+        """When the platform counters were last recounted and last changed."""
+        metrics = await self._get_platform_metrics()
+        return {
+            "refreshed_at": metrics["refreshed_at"].isoformat() if metrics["refreshed_at"] else None,
+            "updated_at": metrics["updated_at"].isoformat() if metrics["updated_at"] else None,
+        }
+    
     async def _get_organization_count(self) -> int:
-        result = await self.db.execute(select(func.count(Organization.id)))
-        return result.scalar() or 0
+        return await self._get_metric("organizations.total")
     
     async def _get_user_count(self) -> int:
-        result = await self.db.execute(
-            select(func.count(User.id)).where(User.is_platform_staff == False)
-        )
-        return result.scalar() or 0
+        return await self._get_metric("users.customers")
     
     async def _get_staff_count(self) -> int:
-        result = await self.db.execute(
-            select(func.count(User.id)).where(User.is_platform_staff == True)
-        )
-        return result.scalar() or 0
+        return await self._get_metric("users.staff")
     
     async def _get_pending_verification_count(self) -> int:
-        result = await self.db.execute(
-            select(func.count(Organization.id)).where(
-                Organization.verification_status == VerificationStatus.SUBMITTED
-            )
-        )
-        return result.scalar() or 0
+        return await self._get_metric(f"organizations.verification.{VerificationStatus.SUBMITTED.value}")
     
     async def _get_tenants_list(self, limit: int = 50) -> List[Dict]:
         """Get list of all organizations (tenants)"""
@@ -901,44 +972,18 @@ class DashboardService:
     
     async def _get_tenant_stats(self) -> Dict[str, int]:
         """Get tenant stats by status"""
-        verified = await self.db.execute(
-            select(func.count(Organization.id)).where(
-                Organization.verification_status == VerificationStatus.VERIFIED
-            )
-        )
-        pending = await self.db.execute(
-            select(func.count(Organization.id)).where(
-                Organization.verification_status == VerificationStatus.PENDING
-            )
-        )
-        suspended = await self.db.execute(
-            select(func.count(Organization.id)).where(
-                Organization.verification_status == VerificationStatus.REJECTED
-            )
-        )
+        by_status = await self._get_verification_stats()
         return {
-            "active": verified.scalar() or 0,
-            "trial": pending.scalar() or 0,
-            "suspended": suspended.scalar() or 0,
+            "active": by_status.get(VerificationStatus.VERIFIED.value, 0),
+            "trial": by_status.get(VerificationStatus.PENDING.value, 0),
+            "suspended": by_status.get(VerificationStatus.REJECTED.value, 0),
         }
     
     async def _get_organizations_by_type(self) -> Dict[str, int]:
-        result = await self.db.execute(
-            select(
-                Organization.organization_type,
-                func.count(Organization.id)
-            ).group_by(Organization.organization_type)
-        )
-        return {row[0].value if row[0] else "unknown": row[1] for row in result.all()}
+        return await self._get_metric_group("organizations.type")
     
     async def _get_verification_stats(self) -> Dict[str, int]:
-        result = await self.db.execute(
-            select(
-                Organization.verification_status,
-                func.count(Organization.id)
-            ).group_by(Organization.verification_status)
-        )
-        return {row[0].value if row[0] else "unknown": row[1] for row in result.all()}
+        return await self._get_metric_group("organizations.verification")
     
     async def _get_recent_platform_activity(self, limit: int = 10) -> List[Dict]:
         # Get recent audit logs
@@ -1045,18 +1090,8 @@ class DashboardService:
         ]
     
     async def _get_user_growth_stats(self) -> Dict[str, Any]:
-        # Get users created in last 30 days
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        
-        result = await self.db.execute(
-            select(func.count(User.id)).where(
-                and_(
-                    User.is_platform_staff == False,
-                    User.created_at >= thirty_days_ago
-                )
-            )
-        )
-        new_users = result.scalar() or 0
+        # Users created in the last 30 days, as of the last metrics refresh
+        new_users = await self._get_metric("users.new_30d")
         
         total_users = await self._get_user_count()
         
@@ -1096,61 +1131,18 @@ class DashboardService:
         if not entity_id:
             return self._empty_financial_metrics()
         
-        today = date.today()
-        start_of_month = today.replace(day=1)
-        start_of_year = today.replace(month=1, day=1)
-        
-        # This month metrics
-        this_month = await self._get_period_metrics(
-            entity_id, start_of_month, today
-        )
-        
-        # Year to date metrics
-        ytd = await self._get_period_metrics(
-            entity_id, start_of_year, today
-        )
+        rollup = await self._get_rollup(entity_id)
         
         return {
-            "this_month": this_month,
-            "year_to_date": ytd,
+            "this_month": self._period_metrics(rollup["month_income"], rollup["month_expense"]),
+            "year_to_date": self._period_metrics(rollup["ytd_income"], rollup["ytd_expense"]),
         }
     
-    async def _get_period_metrics(
-        self, 
-        entity_id: uuid.UUID, 
-        start_date: date, 
-        end_date: date
-    ) -> Dict[str, float]:
-        # Income
-        income_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                and_(
-                    Transaction.entity_id == entity_id,
-                    Transaction.transaction_type == TransactionType.INCOME,
-                    Transaction.transaction_date >= start_date,
-                    Transaction.transaction_date <= end_date,
-                )
-            )
-        )
-        income = float(income_result.scalar() or 0)
-        
-        # Expense
-        expense_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                and_(
-                    Transaction.entity_id == entity_id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                    Transaction.transaction_date >= start_date,
-                    Transaction.transaction_date <= end_date,
-                )
-            )
-        )
-        expense = float(expense_result.scalar() or 0)
-        
+    def _period_metrics(self, income: Decimal, expense: Decimal) -> Dict[str, float]:
         return {
-            "income": income,
-            "expense": expense,
-            "net": income - expense,
+            "income": float(income),
+            "expense": float(expense),
+            "net": float(income - expense),
         }
     
     def _empty_financial_metrics(self) -> Dict[str, Any]:
@@ -1193,58 +1185,21 @@ class DashboardService:
         if not entity_id:
             return {"outstanding": 0, "overdue": 0, "total_count": 0}
         
-        today = date.today()
-        
-        # Outstanding invoices (DRAFT, PENDING, or SUBMITTED but not yet paid)
-        outstanding_result = await self.db.execute(
-            select(func.coalesce(func.sum(Invoice.total_amount), 0)).where(
-                and_(
-                    Invoice.entity_id == entity_id,
-                    Invoice.status.in_([InvoiceStatus.DRAFT, InvoiceStatus.PENDING, InvoiceStatus.SUBMITTED]),
-                )
-            )
-        )
-        outstanding = float(outstanding_result.scalar() or 0)
-        
-        # Overdue invoices (PENDING or SUBMITTED and past due date)
-        overdue_result = await self.db.execute(
-            select(func.coalesce(func.sum(Invoice.total_amount), 0)).where(
-                and_(
-                    Invoice.entity_id == entity_id,
-                    Invoice.status.in_([InvoiceStatus.PENDING, InvoiceStatus.SUBMITTED]),
-                    Invoice.due_date < today,
-                )
-            )
-        )
-        overdue = float(overdue_result.scalar() or 0)
-        
-        # Total count
-        count_result = await self.db.execute(
-            select(func.count(Invoice.id)).where(Invoice.entity_id == entity_id)
-        )
-        total_count = count_result.scalar() or 0
+        # Outstanding: DRAFT, PENDING or SUBMITTED; overdue: PENDING or
+        # SUBMITTED and past due (rollup invoice rows are keyed by due date)
+        rollup = await self._get_rollup(entity_id)
         
         return {
-            "outstanding": outstanding,
-            "overdue": overdue,
-            "total_count": total_count,
+            "outstanding": float(rollup["outstanding_invoices"]),
+            "overdue": float(rollup["overdue_invoices"]),
+            "total_count": rollup["invoice_count"],
         }
     
     async def _get_team_summary(
         self, 
         organization_id: uuid.UUID
     ) -> Dict[str, Any]:
-        result = await self.db.execute(
-            select(func.count(User.id)).where(
-                and_(
-                    User.organization_id == organization_id,
-                    User.is_platform_staff == False,
-                )
-            )
-        )
-        total_members = result.scalar() or 0
-        
-        # Get by role
+        # Members by role; the total is their sum
         role_result = await self.db.execute(
             select(User.role, func.count(User.id))
             .where(
@@ -1258,7 +1213,7 @@ class DashboardService:
         by_role = {row[0].value if row[0] else "unknown": row[1] for row in role_result.all()}
         
         return {
-            "total_members": total_members,
+            "total_members": sum(by_role.values()),
             "by_role": by_role,
         }
     
@@ -1280,35 +1235,11 @@ class DashboardService:
                 "next_filing_date": None,
             }
         
-        # Get current month for VAT calculations
+        # VAT collected on sales and paid on expenses this month
+        rollup = await self._get_rollup(entity_id)
+        vat_collected = rollup["month_output_vat"]
+        vat_paid = rollup["month_input_vat"]
         today = date.today()
-        month_start = date(today.year, today.month, 1)
-        
-        # VAT collected from sales (INCOME transactions)
-        result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.vat_amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity_id,
-                    Transaction.transaction_type == TransactionType.INCOME,
-                    Transaction.transaction_date >= month_start,
-                )
-            )
-        )
-        vat_collected = result.scalar() or Decimal("0.00")
-        
-        # VAT paid on expenses (EXPENSE transactions)
-        result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.vat_amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity_id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                    Transaction.transaction_date >= month_start,
-                )
-            )
-        )
-        vat_paid = result.scalar() or Decimal("0.00")
         
         # Calculate next filing date (21st of following month)
         if today.month == 12:
@@ -1340,55 +1271,25 @@ class DashboardService:
                 "out_of_stock": 0,
             }
         
-        # Total active inventory items
-        result = await self.db.execute(
-            select(func.count(InventoryItem.id))
-            .where(
-                and_(
-                    InventoryItem.entity_id == entity_id,
-                    InventoryItem.is_active == True,
-                    InventoryItem.is_tracked == True,
-                )
-            )
-        )
-        total_items = result.scalar() or 0
-        
-        # Low stock items (quantity <= reorder_level but > 0)
-        result = await self.db.execute(
-            select(func.count(InventoryItem.id))
-            .where(
-                and_(
-                    InventoryItem.entity_id == entity_id,
-                    InventoryItem.is_active == True,
-                    InventoryItem.is_tracked == True,
-                    InventoryItem.quantity_on_hand <= InventoryItem.reorder_level,
-                    InventoryItem.quantity_on_hand > 0,
-                )
-            )
-        )
-        low_stock_items = result.scalar() or 0
-        
-        # Out of stock items
-        result = await self.db.execute(
-            select(func.count(InventoryItem.id))
-            .where(
-                and_(
-                    InventoryItem.entity_id == entity_id,
-                    InventoryItem.is_active == True,
-                    InventoryItem.is_tracked == True,
-                    InventoryItem.quantity_on_hand == 0,
-                )
-            )
-        )
-        out_of_stock = result.scalar() or 0
-        
-        # Total inventory value (quantity * unit_cost)
+        # One pass over the entity's active items; counts cover tracked items only
+        tracked = InventoryItem.is_tracked == True
         result = await self.db.execute(
             select(
+                func.count(InventoryItem.id).filter(tracked).label("total_items"),
+                func.count(InventoryItem.id).filter(
+                    and_(
+                        tracked,
+                        InventoryItem.quantity_on_hand <= InventoryItem.reorder_level,
+                        InventoryItem.quantity_on_hand > 0,
+                    )
+                ).label("low_stock_items"),
+                func.count(InventoryItem.id).filter(
+                    and_(tracked, InventoryItem.quantity_on_hand == 0)
+                ).label("out_of_stock"),
                 func.coalesce(
                     func.sum(InventoryItem.quantity_on_hand * InventoryItem.unit_cost),
                     0
-                )
+                ).label("total_value"),
             )
             .where(
                 and_(
@@ -1397,7 +1298,11 @@ class DashboardService:
                 )
             )
         )
-        total_value = result.scalar() or Decimal("0.00")
+        row = result.one()
+        total_items = row.total_items or 0
+        low_stock_items = row.low_stock_items or 0
+        out_of_stock = row.out_of_stock or 0
+        total_value = row.total_value or Decimal("0.00")
         
         return {
             "total_items": total_items,
@@ -2065,21 +1970,11 @@ class DashboardService:
         if not entity:
             return {}
         
+        rollup = await self._get_rollup(entity.id)
+        
         # Get current turnover YTD
         today = date.today()
-        year_start = date(today.year, 1, 1)
-        
-        result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.INCOME,
-                    Transaction.transaction_date >= year_start,
-                )
-            )
-        )
-        current_turnover = result.scalar() or Decimal("0")
+        current_turnover = rollup["ytd_income"]
         
         # Threshold Monitor
         threshold_50m = Decimal("50000000")
@@ -2119,29 +2014,8 @@ class DashboardService:
         # VAT Recovery Tracker
         month_start = date(today.year, today.month, 1)
         
-        vat_collected_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.vat_amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.INCOME,
-                    Transaction.transaction_date >= month_start,
-                )
-            )
-        )
-        vat_collected = vat_collected_result.scalar() or Decimal("0")
-        
-        vat_paid_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.vat_amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                    Transaction.transaction_date >= month_start,
-                )
-            )
-        )
-        vat_paid = vat_paid_result.scalar() or Decimal("0")
+        vat_collected = rollup["month_output_vat"]
+        vat_paid = rollup["month_input_vat"]
         
         net_vat = vat_collected - vat_paid
         
@@ -2183,35 +2057,8 @@ class DashboardService:
         )
         pending_wren = wren_result.scalars().all()
         
-        total_pending_result = await self.db.execute(
-            select(func.count(Transaction.id))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                    or_(
-                        Transaction.category_id == None,
-                        Transaction.wren_verified_by_id == None,
-                    ),
-                )
-            )
-        )
-        total_pending_count = total_pending_result.scalar() or 0
-        
-        pending_amount_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                    or_(
-                        Transaction.category_id == None,
-                        Transaction.wren_verified_by_id == None,
-                    ),
-                )
-            )
-        )
-        total_pending_amount = pending_amount_result.scalar() or Decimal("0")
+        total_pending_count = rollup["pending_wren_count"]
+        total_pending_amount = rollup["pending_wren_amount"]
         
         # Determine user's WREN role (Maker or Checker)
         can_categorize = user.role in [
@@ -2753,18 +2600,8 @@ class DashboardService:
                 "is_critical": False,
             })
         
-        # Check 3: Pending WREN expenses
-        pending_wren_result = await self.db.execute(
-            select(func.count(Transaction.id))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                    Transaction.wren_verified_by_id == None,
-                )
-            )
-        )
-        pending_wren = pending_wren_result.scalar() or 0
+        # Check 3: Pending WREN expenses (no verifier yet)
+        pending_wren = (await self._get_rollup(entity.id))["unverified_expenses"]
         
         if pending_wren == 0:
             checks.append({
@@ -2986,51 +2823,14 @@ class DashboardService:
                 "trend_direction": "stable",
             }
         
-        # Calculate average monthly expenses (last 3 months)
-        today = date.today()
-        three_months_ago = date(
-            today.year if today.month > 3 else today.year - 1,
-            today.month - 3 if today.month > 3 else today.month + 9,
-            1
-        )
+        rollup = await self._get_rollup(entity.id)
         
-        expense_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                    Transaction.transaction_date >= three_months_ago,
-                )
-            )
-        )
-        total_expenses_3m = expense_result.scalar() or Decimal("0")
+        # Average monthly expenses (last 3 months)
+        total_expenses_3m = rollup["recent_expense"]
         avg_monthly = total_expenses_3m / 3 if total_expenses_3m > 0 else Decimal("1")
         
         # Cash balance (simplified - would integrate with bank feeds)
-        income_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.INCOME,
-                )
-            )
-        )
-        total_income = income_result.scalar() or Decimal("0")
-        
-        expense_total_result = await self.db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0))
-            .where(
-                and_(
-                    Transaction.entity_id == entity.id,
-                    Transaction.transaction_type == TransactionType.EXPENSE,
-                )
-            )
-        )
-        total_expenses = expense_total_result.scalar() or Decimal("0")
-        
-        cash_balance = total_income - total_expenses
+        cash_balance = rollup["total_income"] - rollup["total_expense"]
         
         # Calculate ratio
         ratio = float(cash_balance / avg_monthly) if avg_monthly > 0 else 0
@@ -3064,28 +2864,11 @@ class DashboardService:
     
     async def _get_staff_by_role(self) -> Dict[str, int]:
         """Get count of staff members by platform role."""
-        result = await self.db.execute(
-            select(User.platform_role, func.count(User.id))
-            .where(User.is_platform_staff == True)
-            .group_by(User.platform_role)
-        )
-        return {
-            (row[0].value if row[0] else "unknown"): row[1] 
-            for row in result.all()
-        }
+        return await self._get_metric_group("users.staff_role")
     
     async def _get_subscription_stats(self) -> Dict[str, Any]:
         """Get subscription/plan statistics across all organizations."""
-        from app.models.organization import SubscriptionTier
-        
-        result = await self.db.execute(
-            select(Organization.subscription_tier, func.count(Organization.id))
-            .group_by(Organization.subscription_tier)
-        )
-        by_tier = {
-            (row[0].value if row[0] else "free"): row[1] 
-            for row in result.all()
-        }
+        by_tier = await self._get_metric_group("organizations.tier")
         
         return {
             "by_tier": by_tier,
@@ -3093,11 +2876,22 @@ class DashboardService:
             "total_free": by_tier.get("free", 0),
         }
     
+    async def _get_support_ticket_stats(self) -> Dict[str, Any]:
+        """Support ticket counts (same shape as SupportTicketService.get_tickets_stats)."""
+        return {
+            "open": await self._get_metric("tickets.open"),
+            "critical": await self._get_metric("tickets.critical_open"),
+            "sla_breached": await self._get_metric("tickets.sla_breached"),
+            "resolved_today": await self._get_metric("tickets.resolved_today"),
+            "avg_response_time_minutes": None,
+            "avg_resolution_time_minutes": None,
+        }
+    
     async def _get_platform_health_detailed(self) -> Dict[str, Any]:
         """Get detailed platform health metrics."""
         # Database connection check
         try:
-            await self.db.execute(select(func.count(User.id)))
+            await self.db.execute(select(1))
             db_status = "healthy"
         except Exception:
             db_status = "error"
@@ -3127,28 +2921,13 @@ class DashboardService:
     
     async def _get_nrs_compliance_stats(self) -> Dict[str, Any]:
         """Get NRS e-invoicing compliance statistics."""
-        # Count invoices by NRS status
-        today = date.today()
-        month_start = date(today.year, today.month, 1)
+        month = month_key(datetime.utcnow())
         
         # Total invoices submitted to NRS this month
-        result = await self.db.execute(
-            select(func.count(Invoice.id))
-            .where(
-                and_(
-                    Invoice.nrs_irn.isnot(None),
-                    Invoice.created_at >= month_start,
-                )
-            )
-        )
-        submitted_count = result.scalar() or 0
+        submitted_count = await self._get_metric(f"invoices.nrs_submitted.{month}")
         
         # Locked invoices (72-hour window)
-        result = await self.db.execute(
-            select(func.count(Invoice.id))
-            .where(Invoice.is_nrs_locked == True)
-        )
-        locked_count = result.scalar() or 0
+        locked_count = await self._get_metric("invoices.nrs_locked")
         
         return {
             "submitted_this_month": submitted_count,
@@ -3159,21 +2938,9 @@ class DashboardService:
     
     async def _get_usage_metrics(self) -> Dict[str, Any]:
         """Get platform usage metrics for billing/capacity."""
-        # Count transactions this month
-        today = date.today()
-        month_start = date(today.year, today.month, 1)
-        
-        result = await self.db.execute(
-            select(func.count(Transaction.id))
-            .where(Transaction.created_at >= month_start)
-        )
-        transactions_this_month = result.scalar() or 0
-        
-        result = await self.db.execute(
-            select(func.count(Invoice.id))
-            .where(Invoice.created_at >= month_start)
-        )
-        invoices_this_month = result.scalar() or 0
+        month = month_key(datetime.utcnow())
+        transactions_this_month = await self._get_metric(f"transactions.created.{month}")
+        invoices_this_month = await self._get_metric(f"invoices.created.{month}")
         
         return {
             "transactions_this_month": transactions_this_month,
@@ -3281,32 +3048,19 @@ class DashboardService:
     
     async def _get_entity_health_overview(self) -> Dict[str, Any]:
         """Get entity health overview - compliant vs non-compliant."""
+        by_status = await self._get_verification_stats()
+        
         # Verified (Green)
-        result = await self.db.execute(
-            select(func.count(Organization.id))
-            .where(Organization.verification_status == VerificationStatus.VERIFIED)
-        )
-        verified = result.scalar() or 0
+        verified = by_status.get(VerificationStatus.VERIFIED.value, 0)
         
         # Pending/Submitted (Yellow)
-        result = await self.db.execute(
-            select(func.count(Organization.id))
-            .where(
-                Organization.verification_status.in_([
-                    VerificationStatus.PENDING,
-                    VerificationStatus.SUBMITTED,
-                    VerificationStatus.UNDER_REVIEW,
-                ])
-            )
+        pending = sum(
+            by_status.get(status.value, 0)
+            for status in (VerificationStatus.PENDING, VerificationStatus.SUBMITTED, VerificationStatus.UNDER_REVIEW)
         )
-        pending = result.scalar() or 0
         
         # Rejected (Red)
-        result = await self.db.execute(
-            select(func.count(Organization.id))
-            .where(Organization.verification_status == VerificationStatus.REJECTED)
-        )
-        rejected = result.scalar() or 0
+        rejected = by_status.get(VerificationStatus.REJECTED.value, 0)
         
         total = verified + pending + rejected
         
@@ -3368,7 +3122,7 @@ class DashboardService:
         """Get PostgreSQL database health metrics."""
         try:
             # Test connection
-            await self.db.execute(select(func.count(User.id)))
+            await self.db.execute(select(1))
             status = "healthy"
         except Exception:
             status = "error"
@@ -3448,16 +3202,7 @@ class DashboardService:
     async def _get_impersonation_stats(self) -> Dict[str, Any]:
         """Get user impersonation statistics."""
         # Count users who have granted impersonation
-        result = await self.db.execute(
-            select(func.count(User.id))
-            .where(
-                and_(
-                    User.can_be_impersonated == True,
-                    User.is_platform_staff == False,
-                )
-            )
-        )
-        can_impersonate = result.scalar() or 0
+        can_impersonate = await self._get_metric("users.impersonatable")
         
         return {
             "users_allowing_impersonation": can_impersonate,
@@ -3540,10 +3285,7 @@ class DashboardService:
         total_users = await self._get_user_count()
         
         # Users who sent first invoice
-        result = await self.db.execute(
-            select(func.count(func.distinct(Invoice.created_by_id)))
-        )
-        users_with_invoices = result.scalar() or 0
+        users_with_invoices = await self._get_metric("invoices.creators")
         
         return {
             "stages": [
@@ -3558,11 +3300,7 @@ class DashboardService:
     async def _get_referral_stats(self) -> Dict[str, Any]:
         """Get referral program statistics."""
         # Count organizations with referral codes used
-        result = await self.db.execute(
-            select(func.count(Organization.id))
-            .where(Organization.referred_by_code.isnot(None))
-        )
-        referred = result.scalar() or 0
+        referred = await self._get_metric("organizations.referred")
         
         return {
             "total_referrals": referred,
@@ -3,11 +3,14 @@ TekVwarho ProAudit - Email Service
 
 Handles transactional email sending.
 Supports SendGrid, Mailgun, or SMTP.
+
+Delivery goes through app.services.mail_transport: SMTP uses a pooled,
+thread-isolated sender and HTTP providers share keep-alive clients.
+Use send_batch() to deliver many rendered messages over one session.
 """
 
+import asyncio
 import logging
-import smtplib
-import ssl
 from typing import Any, Dict, List, Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -15,9 +18,13 @@ from email.mime.base import MIMEBase
 from email import encoders
 from dataclasses import dataclass
 
-import httpx
-
 from app.config import settings
+from app.services.mail_transport import (
+    MailEnvelope,
+    SMTPConnectionPool,
+    get_http_client,
+    get_smtp_pool,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +54,7 @@ class EmailMessage:
 class EmailService:
     """Service for sending transactional emails."""
     
-    def __init__(self):
+    def __init__(self, smtp_pool: Optional[SMTPConnectionPool] = None):
         # SMTP settings from config (Outlook/Office365)
         self.smtp_host = settings.mail_server
         self.smtp_port = settings.mail_port
@@ -64,6 +71,13 @@ class EmailService:
         self.sendgrid_api_key = getattr(settings, 'sendgrid_api_key', None)
         self.mailgun_api_key = getattr(settings, 'mailgun_api_key', None)
         self.mailgun_domain = getattr(settings, 'mailgun_domain', None)
+        
+        # Injected pool (tests/benchmarks); otherwise the process-wide pool
+        self._smtp_pool = smtp_pool
+    
+    @property
+    def smtp_pool(self) -> SMTPConnectionPool:
+        return self._smtp_pool or get_smtp_pool()
     
     def _determine_provider(self) -> str:
         """Determine which email provider to use based on configuration."""
@@ -95,6 +109,50 @@ class EmailService:
             logger.error(f"Failed to send email via {provider}: {e}")
             return False
     
+    async def send_batch(self, messages: List[EmailMessage]) -> List[bool]:
+        """
+        Send many rendered messages in one go.
+        
+        SMTP messages share a few pooled sessions; HTTP providers run with
+        bounded concurrency over a shared keep-alive client.
+        
+        Returns:
+            Per-message success flags, in input order.
+        """
+        if not messages:
+            return []
+        
+        provider = self._determine_provider()
+        
+        try:
+            if provider == EmailProvider.SMTP:
+                results = await self.smtp_pool.send_many(
+                    [self._build_envelope(message) for message in messages]
+                )
+            elif provider in (EmailProvider.SENDGRID, EmailProvider.MAILGUN):
+                send = (
+                    self._send_via_sendgrid
+                    if provider == EmailProvider.SENDGRID
+                    else self._send_via_mailgun
+                )
+                semaphore = asyncio.Semaphore(settings.mail_batch_concurrency)
+                
+                async def _bounded(message: EmailMessage) -> bool:
+                    async with semaphore:
+                        return await send(message)
+                
+                results = list(await asyncio.gather(*[_bounded(m) for m in messages]))
+            else:
+                results = [await self._send_mock(message) for message in messages]
+        except Exception as e:
+            logger.error(f"Failed to send email batch via {provider}: {e}")
+            return [False] * len(messages)
+        
+        logger.info(
+            f"Email batch via {provider}: {sum(results)}/{len(messages)} sent"
+        )
+        return results
+    
     async def _send_via_sendgrid(self, message: EmailMessage) -> bool:
         """Send email via SendGrid API."""
         try:
@@ -139,22 +197,22 @@ class EmailService:
             if message.reply_to:
                 payload["reply_to"] = {"email": message.reply_to}
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {self.sendgrid_api_key}",
-                        "Content-Type": "application/json",
-                    },
-                )
-                
-                if response.status_code in [200, 202]:
-                    logger.info(f"Email sent via SendGrid to {message.to}")
-                    return True
-                else:
-                    logger.error(f"SendGrid API error: {response.status_code} - {response.text}")
-                    return False
+            client = get_http_client(EmailProvider.SENDGRID)
+            response = await client.post(
+                url,
+                json=payload,
+                headers={
+                    "Authorization": f"Bearer {self.sendgrid_api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+            
+            if response.status_code in [200, 202]:
+                logger.info(f"Email sent via SendGrid to {message.to}")
+                return True
+            else:
+                logger.error(f"SendGrid API error: {response.status_code} - {response.text}")
+                return False
                     
         except Exception as e:
             logger.error(f"SendGrid send failed: {e}")
@@ -184,82 +242,77 @@ class EmailService:
             if message.reply_to:
                 data["h:Reply-To"] = message.reply_to
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    data=data,
-                    auth=("api", self.mailgun_api_key),
-                )
-                
-                if response.status_code == 200:
-                    logger.info(f"Email sent via Mailgun to {message.to}")
-                    return True
-                else:
-                    logger.error(f"Mailgun API error: {response.status_code} - {response.text}")
-                    return False
+            client = get_http_client(EmailProvider.MAILGUN)
+            response = await client.post(
+                url,
+                data=data,
+                auth=("api", self.mailgun_api_key),
+            )
+            
+            if response.status_code == 200:
+                logger.info(f"Email sent via Mailgun to {message.to}")
+                return True
+            else:
+                logger.error(f"Mailgun API error: {response.status_code} - {response.text}")
+                return False
                     
         except Exception as e:
             logger.error(f"Mailgun send failed: {e}")
             return False
     
+    def _build_envelope(self, message: EmailMessage) -> MailEnvelope:
+        """Render a message to MIME bytes plus its SMTP envelope."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = message.subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = ', '.join(message.to)
+        
+        if message.cc:
+            msg['Cc'] = ', '.join(message.cc)
+        
+        if message.reply_to:
+            msg['Reply-To'] = message.reply_to
+        
+        # Attach text and HTML parts
+        part1 = MIMEText(message.body_text, 'plain')
+        msg.attach(part1)
+        
+        if message.body_html:
+            part2 = MIMEText(message.body_html, 'html')
+            msg.attach(part2)
+        
+        # Handle attachments
+        if message.attachments:
+            for attachment in message.attachments:
+                part = MIMEBase('application', 'octet-stream')
+                part.set_payload(attachment['content'])
+                encoders.encode_base64(part)
+                part.add_header(
+                    'Content-Disposition',
+                    f'attachment; filename="{attachment["filename"]}"'
+                )
+                msg.attach(part)
+        
+        # Get all recipients
+        all_recipients = message.to.copy()
+        if message.cc:
+            all_recipients.extend(message.cc)
+        if message.bcc:
+            all_recipients.extend(message.bcc)
+        
+        return MailEnvelope(
+            sender=self.from_email,
+            recipients=all_recipients,
+            data=msg.as_bytes(),
+        )
+    
     async def _send_via_smtp(self, message: EmailMessage) -> bool:
-        """Send email via SMTP."""
+        """Send email via the pooled SMTP transport."""
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = message.subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = ', '.join(message.to)
-            
-            if message.cc:
-                msg['Cc'] = ', '.join(message.cc)
-            
-            if message.reply_to:
-                msg['Reply-To'] = message.reply_to
-            
-            # Attach text and HTML parts
-            part1 = MIMEText(message.body_text, 'plain')
-            msg.attach(part1)
-            
-            if message.body_html:
-                part2 = MIMEText(message.body_html, 'html')
-                msg.attach(part2)
-            
-            # Handle attachments
-            if message.attachments:
-                for attachment in message.attachments:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment['content'])
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename="{attachment["filename"]}"'
-                    )
-                    msg.attach(part)
-            
-            # Get all recipients
-            all_recipients = message.to.copy()
-            if message.cc:
-                all_recipients.extend(message.cc)
-            if message.bcc:
-                all_recipients.extend(message.bcc)
-            
-            # Send via SMTP
-            if self.smtp_use_tls:
-                context = ssl.create_default_context()
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    server.starttls(context=context)
-                    if self.smtp_username and self.smtp_password:
-                        server.login(self.smtp_username, self.smtp_password)
-                    server.sendmail(self.from_email, all_recipients, msg.as_string())
-            else:
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                    if self.smtp_username and self.smtp_password:
-                        server.login(self.smtp_username, self.smtp_password)
-                    server.sendmail(self.from_email, all_recipients, msg.as_string())
-            
-            logger.info(f"Email sent via SMTP to {message.to}")
-            return True
+            sent = await self.smtp_pool.send(self._build_envelope(message))
+            if sent:
+                logger.info(f"Email sent via SMTP to {message.to}")
+            return sent
             
         except Exception as e:
             logger.error(f"SMTP send failed: {e}")
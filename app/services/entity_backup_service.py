@@ -0,0 +1,725 @@
+"""
+TekVwarho ProAudit - Entity Backup
+
+Full backup of a business entity's data, and restore of such a backup,
+for NDPA data portability, auditor handover and moving an entity between
+environments.
+
+Archive layout (zip, ZIP64):
+
+    manifest.json
+    customers/customers-00001.ndjson
+    transactions/transactions-00001.ndjson
+    transactions/transactions-00002.ndjson
+    ...
+
+Each part holds up to settings.backup_part_rows rows, one JSON object per
+line keyed by column name. The manifest lists every table with its
+columns, row count and the SHA-256 and row count of each part.
+
+Backup reads each table from a server-side cursor (yield_per), all in one
+REPEATABLE READ snapshot, and writes the rows straight into the zip entry,
+so memory stays flat however large the entity is. The archive is spooled
+to a temporary file and streamed into file storage.
+
+Restore checks every part against the manifest before writing anything,
+then inserts the tables parents first, in batches, in one transaction:
+- entity_id is rewritten to the target entity;
+- references between backed-up tables (line items to invoices, payslips
+  to payroll runs...) must point at rows of the target entity, restored
+  earlier in the run or already there, else the restore fails (the
+  uploader computed the digests, so they vouch for nothing);
+- self references (parent accounts, reversed entries) are set once the
+  whole table is in;
+- nullable references to rows outside the backup (users, categories,
+  fiscal periods...) are kept only where that row belongs to the target
+  entity or its organization (see owned_condition), else nulled;
+- audit logs are never restored: the trail is append-only and written by
+  the application, so an uploaded archive cannot add to it. The restore
+  itself is logged (AuditAction.IMPORT) with its job id.
+Rows inserted without the ORM skip the flush hooks, so the daily
+summaries, platform metrics and search documents are brought in step
+afterwards. Row ids are kept, so an archive restores once per database.
+"""
+
+import enum
+import hashlib
+import json
+import logging
+import tempfile
+import uuid
+import zipfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Column, Table, bindparam, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import Base
+from app.models.audit_consolidated import AuditAction
+from app.models.entity import BusinessEntity
+from app.models.entity_backup_job import EntityBackupJob, EntityBackupOperation, EntityBackupStatus
+from app.models.invoice import Invoice
+from app.models.transaction import Transaction
+from app.services import dashboard_rollup_service, platform_metrics_service, search_index_service
+from app.services.file_storage_service import STREAM_BLOCK_SIZE, FileCategory, FileStorageService
+
+logger = logging.getLogger(__name__)
+
+BACKUP_FORMAT = "proaudit-entity-backup"
+BACKUP_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+class BackupError(Exception):
+    """An archive that cannot be restored: bad manifest, corrupt part or conflicting rows."""
+
+
+# ===========================================
+# TABLES
+# ===========================================
+
+@dataclass(frozen=True)
+class BackupTable:
+    """
+    A table in the backup.
+
+    Rows belong to the entity through their entity_id column, or through
+    parent_column referencing a row of the parent table.
+    """
+    name: str
+    parent: Optional[str] = None
+    parent_column: Optional[str] = None
+    audit: bool = False
+
+
+# In restore order: every table comes after the tables it references
+BACKUP_TABLES: Tuple[BackupTable, ...] = (
+    BackupTable("chart_of_accounts"),
+    BackupTable("customers"),
+    BackupTable("vendors"),
+    BackupTable("inventory_items"),
+    BackupTable("stock_movements", "inventory_items", "item_id"),
+    BackupTable("stock_write_offs", "inventory_items", "item_id"),
+    BackupTable("transactions"),
+    BackupTable("invoices"),
+    BackupTable("invoice_line_items", "invoices", "invoice_id"),
+    BackupTable("journal_entries"),
+    BackupTable("journal_entry_lines", "journal_entries", "journal_entry_id"),
+    BackupTable("employees"),
+    BackupTable("employee_bank_accounts", "employees", "employee_id"),
+    BackupTable("employee_loans"),
+    BackupTable("employee_leaves"),
+    BackupTable("payroll_settings"),
+    BackupTable("payroll_runs"),
+    BackupTable("payslips", "payroll_runs", "payroll_run_id"),
+    BackupTable("payslip_items", "payslips", "payslip_id"),
+    BackupTable("audit_logs", audit=True),
+)
+TABLES_BY_NAME = {spec.name: spec for spec in BACKUP_TABLES}
+
+# Tables whose restored rows count towards the platform metrics
+METRIC_MODELS = {"transactions": Transaction, "invoices": Invoice}
+
+
+def _table(name: str) -> Table:
+    return Base.metadata.tables[name]
+
+
+def scope_condition(spec: BackupTable, entity_id: uuid.UUID):
+    """WHERE clause selecting the entity's rows of a table (through its parents if needed)."""
+    table = _table(spec.name)
+    if spec.parent is None:
+        return table.c.entity_id == entity_id
+    parent = _table(spec.parent)
+    return table.c[spec.parent_column].in_(
+        select(parent.c.id).where(scope_condition(TABLES_BY_NAME[spec.parent], entity_id))
+    )
+
+
+# ===========================================
+# ROW ENCODING
+# ===========================================
+
+def encode_value(value: Any) -> Any:
+    """JSON form of a column value; enums by name, as the database stores them."""
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def encode_row(row: Dict[str, Any]) -> bytes:
+    """One NDJSON line."""
+    return json.dumps(
+        {name: encode_value(value) for name, value in row.items()},
+        default=str,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode() + b"\n"
+
+
+def column_decoder(column: Column) -> Optional[Callable[[Any], Any]]:
+    """Inverse of encode_value for a column, or None when the JSON value is used as is."""
+    enum_class = getattr(column.type, "enum_class", None)
+    if enum_class is not None:
+        return lambda value: enum_class[value]
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if python_type in (date, datetime):
+        return python_type.fromisoformat
+    if python_type in (Decimal, uuid.UUID):
+        return python_type
+    return None
+
+
+# ===========================================
+# BACKUP
+# ===========================================
+
+class _TableWriter:
+    """Writes one table's rows into numbered NDJSON parts of the archive."""
+
+    def __init__(self, archive: zipfile.ZipFile, name: str, part_rows: int):
+        self.archive = archive
+        self.name = name
+        self.part_rows = part_rows
+        self.rows = 0
+        self.parts: List[Dict[str, Any]] = []
+        self._entry = None
+        self._digest = None
+
+    def write(self, lines: List[bytes]):
+        while lines:
+            if self._entry is None:
+                path = f"{self.name}/{self.name}-{len(self.parts) + 1:05d}.ndjson"
+                self._entry = self.archive.open(path, "w", force_zip64=True)
+                self._digest = hashlib.sha256()
+                self.parts.append({"path": path, "rows": 0})
+            part = self.parts[-1]
+            room = self.part_rows - part["rows"]
+            batch, lines = lines[:room], lines[room:]
+            data = b"".join(batch)
+            self._entry.write(data)
+            self._digest.update(data)
+            part["rows"] += len(batch)
+            self.rows += len(batch)
+            if part["rows"] == self.part_rows:
+                self._close_part()
+
+    def _close_part(self):
+        self._entry.close()
+        self.parts[-1]["sha256"] = self._digest.hexdigest()
+        self._entry = None
+
+    def close(self, columns: List[str]) -> Dict[str, Any]:
+        if self._entry is not None:
+            self._close_part()
+        return {"name": self.name, "columns": columns, "rows": self.rows, "parts": self.parts}
+
+
+async def write_backup(
+    db: AsyncSession,
+    entity_id: uuid.UUID,
+    sink: BinaryIO,
+    include_audit: bool = True,
+) -> Dict[str, Any]:
+    """
+    Write the entity's backup archive to a binary file object.
+
+    Reads in one REPEATABLE READ snapshot, so start with no transaction
+    open on the session; the caller commits (ending the snapshot). Returns
+    the manifest.
+    """
+    await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    tables = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        for spec in BACKUP_TABLES:
+            if spec.audit and not include_audit:
+                continue
+            table = _table(spec.name)
+            writer = _TableWriter(archive, spec.name, settings.backup_part_rows)
+            query = (
+                select(table)
+                .where(scope_condition(spec, entity_id))
+                .execution_options(yield_per=settings.backup_fetch_rows)
+            )
+            result = await db.stream(query)
+            async for partition in result.mappings().partitions():
+                writer.write([encode_row(row) for row in partition])
+            tables.append(writer.close([column.name for column in table.c]))
+
+        manifest = {
+            "format": BACKUP_FORMAT,
+            "version": BACKUP_VERSION,
+            "entity_id": str(entity_id),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "include_audit": include_audit,
+            "tables": tables,
+        }
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    return manifest
+
+
+# ===========================================
+# RESTORE
+# ===========================================
+
+def read_manifest(archive: zipfile.ZipFile) -> Dict[str, Any]:
+    """Manifest of an archive, checked for format, version and known tables."""
+    try:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+    except KeyError:
+        raise BackupError(f"Not an entity backup: {MANIFEST_NAME} is missing")
+    except ValueError:
+        raise BackupError(f"{MANIFEST_NAME} is not valid JSON")
+    if not isinstance(manifest, dict) or manifest.get("format") != BACKUP_FORMAT:
+        raise BackupError("Not an entity backup archive")
+    if manifest.get("version") != BACKUP_VERSION:
+        raise BackupError(f"Unsupported backup version: {manifest.get('version')}")
+    for table in manifest.get("tables", []):
+        if table.get("name") not in TABLES_BY_NAME:
+            raise BackupError(f"Unknown table in backup: {table.get('name')}")
+    return manifest
+
+
+def verify_archive(archive: zipfile.ZipFile, manifest: Dict[str, Any]):
+    """Check every part's SHA-256 and row count against the manifest (also checks zip CRCs)."""
+    for table in manifest["tables"]:
+        for part in table["parts"]:
+            digest = hashlib.sha256()
+            rows = 0
+            try:
+                with archive.open(part["path"]) as entry:
+                    for block in iter(lambda: entry.read(STREAM_BLOCK_SIZE), b""):
+                        digest.update(block)
+                        rows += block.count(b"\n")
+            except KeyError:
+                raise BackupError(f"Backup part {part['path']} is missing")
+            except zipfile.BadZipFile as e:
+                raise BackupError(f"Backup part {part['path']} is corrupt: {e}")
+            if digest.hexdigest() != part.get("sha256") or rows != part.get("rows"):
+                raise BackupError(f"Backup part {part['path']} does not match its manifest digest")
+
+
+def iter_part_rows(archive: zipfile.ZipFile, path: str) -> Iterator[Dict[str, Any]]:
+    with archive.open(path) as entry:
+        for line in entry:
+            yield json.loads(line)
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def external_references(table: Table, columns: List[str]) -> Dict[str, Column]:
+    """Nullable foreign keys of a table pointing outside the backup, by column."""
+    references = {}
+    for name in columns:
+        column = table.c[name]
+        for foreign_key in column.foreign_keys:
+            target = foreign_key.column.table.name
+            if column.nullable and target not in TABLES_BY_NAME and target != "business_entities":
+                references[name] = foreign_key.column
+    return references
+
+
+def owned_condition(target: Table, entity_id: uuid.UUID, organization_id: Optional[uuid.UUID]):
+    """WHERE clause for the rows of a table outside the backup the target may reference (None: no rows)."""
+    if "entity_id" in target.c:
+        return target.c.entity_id == entity_id
+    if "organization_id" in target.c:
+        return target.c.organization_id == organization_id
+    if target.name == "categories":
+        # One catalogue shared by all tenants; only its system entries are everyone's
+        return target.c.is_system.is_(True)
+    return None
+
+
+def internal_references(table: Table, columns: List[str]) -> Dict[str, BackupTable]:
+    """Foreign keys of a table pointing at another backed-up table, by column."""
+    references = {}
+    for name in columns:
+        for foreign_key in table.c[name].foreign_keys:
+            target = foreign_key.column.table
+            if target is not table and target.name in TABLES_BY_NAME:
+                references[name] = TABLES_BY_NAME[target.name]
+    return references
+
+
+def self_references(table: Table, columns: List[str]) -> List[str]:
+    """Columns referencing another row of the same table."""
+    return [
+        name for name in columns
+        if any(foreign_key.column.table is table for foreign_key in table.c[name].foreign_keys)
+    ]
+
+
+async def _require_entity_rows(
+    db: AsyncSession,
+    spec: BackupTable,
+    ids: Iterable[Any],
+    entity_id: uuid.UUID,
+    known: Dict[Tuple[str, Any], bool],
+    referrer: str,
+):
+    """Raise BackupError unless every id is a row of the table in the target entity (looked up once per id)."""
+    key = f"{spec.name}.id"
+    unknown = {value for value in ids if value is not None and (key, value) not in known}
+    if not unknown:
+        return
+    target = _table(spec.name)
+    found = set((await db.execute(
+        select(target.c.id).where(target.c.id.in_(unknown), scope_condition(spec, entity_id))
+    )).scalars())
+    missing = unknown - found
+    if missing:
+        sample = ", ".join(sorted(str(value) for value in missing)[:3])
+        raise BackupError(f"{referrer} references {spec.name} rows outside this entity: {sample}")
+    known.update({(key, value): True for value in found})
+
+
+async def _keep_owned_references(
+    db: AsyncSession,
+    rows: List[Dict[str, Any]],
+    references: Dict[str, Column],
+    entity_id: uuid.UUID,
+    organization_id: Optional[uuid.UUID],
+    known: Dict[Tuple[str, Any], bool],
+):
+    """Null out references to rows the target does not own (looked up once per value)."""
+    for name, target in references.items():
+        key = f"{target.table.name}.{target.name}"
+        unknown = {row[name] for row in rows if row[name] is not None and (key, row[name]) not in known}
+        if unknown:
+            owned = owned_condition(target.table, entity_id, organization_id)
+            found = set()
+            if owned is not None:
+                found = set((await db.execute(select(target).where(target.in_(unknown), owned))).scalars())
+            known.update({(key, value): value in found for value in unknown})
+        for row in rows:
+            if row[name] is not None and not known[(key, row[name])]:
+                row[name] = None
+
+
+async def restore_table(
+    db: AsyncSession,
+    archive: zipfile.ZipFile,
+    listed: Dict[str, Any],
+    entity_id: uuid.UUID,
+    organization_id: Optional[uuid.UUID],
+    known: Dict[Tuple[str, Any], bool],
+) -> int:
+    """Insert one table's rows from the archive; returns the row count."""
+    table = _table(listed["name"])
+    columns = [name for name in listed["columns"] if name in table.c]
+    decoders = {name: column_decoder(table.c[name]) for name in columns}
+    references = external_references(table, columns)
+    internal = internal_references(table, columns)
+    deferred = {name: [] for name in self_references(table, columns)}
+    metric_model = METRIC_MODELS.get(listed["name"])
+
+    count = 0
+    for part in listed["parts"]:
+        for batch in _batches(iter_part_rows(archive, part["path"]), settings.backup_restore_batch_rows):
+            rows = []
+            for encoded in batch:
+                row = {}
+                for name in columns:
+                    value = encoded.get(name)
+                    decode = decoders[name]
+                    row[name] = decode(value) if value is not None and decode else value
+                if "entity_id" in row:
+                    row["entity_id"] = entity_id
+                for name, pending in deferred.items():
+                    if row[name] is not None:
+                        pending.append({"row_id": row["id"], "target_id": row[name]})
+                        row[name] = None
+                rows.append(row)
+            for name, spec in internal.items():
+                await _require_entity_rows(
+                    db, spec, {row[name] for row in rows}, entity_id, known, f"{table.name}.{name}",
+                )
+            await _keep_owned_references(db, rows, references, entity_id, organization_id, known)
+            await db.execute(insert(table), rows)
+            if metric_model is not None:
+                deltas = platform_metrics_service.row_deltas(metric_model, rows)
+                if deltas:
+                    await db.execute(platform_metrics_service.increment_statement(
+                        deltas, platform_metrics_service.random_shard(),
+                    ))
+            count += len(rows)
+
+    spec = TABLES_BY_NAME[table.name]
+    for name, pending in deferred.items():
+        if pending:
+            await _require_entity_rows(
+                db, spec, {row["target_id"] for row in pending}, entity_id, known, f"{table.name}.{name}",
+            )
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values({name: bindparam("target_id")}),
+                pending,
+            )
+    return count
+
+
+async def restore_backup(
+    db: AsyncSession,
+    archive: zipfile.ZipFile,
+    entity_id: uuid.UUID,
+    manifest: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """
+    Load an archive into an entity, in the session's transaction.
+
+    Verifies the whole archive before the first insert; rows that clash
+    with existing ones, or reference another entity's rows, raise
+    BackupError. Audit tables are skipped. The
+    caller commits (or rolls back) and then rebuilds the entity's search
+    documents. Returns the rows restored per table.
+    """
+    manifest = manifest or read_manifest(archive)
+    verify_archive(archive, manifest)
+    listed = {table["name"]: table for table in manifest["tables"]}
+    organization_id = (await db.execute(
+        select(BusinessEntity.organization_id).where(BusinessEntity.id == entity_id)
+    )).scalar_one_or_none()
+    known: Dict[Tuple[str, Any], bool] = {}
+    restored = {}
+    for spec in BACKUP_TABLES:
+        if spec.audit or spec.name not in listed:
+            continue
+        try:
+            restored[spec.name] = await restore_table(
+                db, archive, listed[spec.name], entity_id, organization_id, known,
+            )
+        except IntegrityError as e:
+            raise BackupError(f"Rows in {spec.name} conflict with existing data: {e.orig}")
+    await dashboard_rollup_service.rebuild_daily_summaries(db, entity_id)
+    return restored
+
+
+# ===========================================
+# BACKGROUND JOBS
+# ===========================================
+
+async def enqueue_backup(
+    db: AsyncSession,
+    entity_id: uuid.UUID,
+    created_by_id: Optional[uuid.UUID] = None,
+    include_audit: bool = True,
+) -> EntityBackupJob:
+    """Create a QUEUED backup job and dispatch it."""
+    job = EntityBackupJob(
+        entity_id=entity_id,
+        created_by_id=created_by_id,
+        operation=EntityBackupOperation.BACKUP,
+        status=EntityBackupStatus.QUEUED,
+        include_audit=include_audit,
+    )
+    db.add(job)
+    await db.commit()
+    await dispatch_backup_job(db, job)
+    return job
+
+
+async def enqueue_restore(
+    db: AsyncSession,
+    entity_id: uuid.UUID,
+    upload: BinaryIO,
+    filename: str,
+    created_by_id: Optional[uuid.UUID] = None,
+    storage: Optional[FileStorageService] = None,
+) -> EntityBackupJob:
+    """Store an uploaded archive (streamed, not read into memory), create a QUEUED restore job and dispatch it."""
+    storage = storage or FileStorageService()
+    stored = await storage.upload_stream(
+        entity_id=entity_id,
+        stream=upload,
+        filename=filename,
+        content_type="application/zip",
+        category=FileCategory.BACKUP,
+    )
+    job = EntityBackupJob(
+        entity_id=entity_id,
+        created_by_id=created_by_id,
+        operation=EntityBackupOperation.RESTORE,
+        status=EntityBackupStatus.QUEUED,
+        include_audit=False,
+        file_id=stored["file_id"],
+        filename=filename,
+        size_bytes=stored["size"],
+    )
+    db.add(job)
+    await db.commit()
+    await dispatch_backup_job(db, job)
+    return job
+
+
+async def dispatch_backup_job(db: AsyncSession, job: EntityBackupJob):
+    """Send a job to the workers; marks it FAILED if it cannot be sent."""
+    from app.tasks.celery_tasks import entity_backup_task
+
+    try:
+        entity_backup_task.delay(str(job.id))
+    except Exception as e:
+        logger.error(f"Could not dispatch entity {job.operation.value} {job.id}: {e}")
+        job.status = EntityBackupStatus.FAILED
+        job.error_message = f"Could not dispatch {job.operation.value} job: {e}"
+        await db.commit()
+        raise
+
+
+@asynccontextmanager
+async def open_stored_archive(storage: FileStorageService, file_id: str) -> AsyncIterator[zipfile.ZipFile]:
+    """Zip archive over a stored file: the file itself on local storage, else a temporary copy."""
+    path = storage.get_local_path(file_id)
+    if path is not None:
+        binary = open(path, "rb")
+    else:
+        binary = tempfile.TemporaryFile()
+        await storage.download_to_file(file_id, binary)
+        binary.seek(0)
+    try:
+        try:
+            archive = zipfile.ZipFile(binary)
+        except zipfile.BadZipFile:
+            raise BackupError("The uploaded file is not a zip archive")
+        with archive:
+            yield archive
+    finally:
+        binary.close()
+
+
+def _table_rows(manifest: Dict[str, Any]) -> Dict[str, int]:
+    return {table["name"]: table["rows"] for table in manifest["tables"]}
+
+
+async def _run_backup(db: AsyncSession, job: EntityBackupJob, storage: FileStorageService):
+    entity_id = job.entity_id
+    filename = f"backup_{entity_id}_{date.today().isoformat()}.zip"
+    with tempfile.TemporaryFile() as spool:
+        manifest = await write_backup(db, entity_id, spool, job.include_audit)
+        await db.commit()
+        spool.seek(0)
+        stored = await storage.upload_stream(
+            entity_id=entity_id,
+            stream=spool,
+            filename=filename,
+            content_type="application/zip",
+            category=FileCategory.BACKUP,
+        )
+    job.file_id = stored["file_id"]
+    job.filename = filename
+    job.size_bytes = stored["size"]
+    job.manifest = manifest
+
+
+async def _run_restore(db: AsyncSession, job: EntityBackupJob, storage: FileStorageService):
+    async with open_stored_archive(storage, job.file_id) as archive:
+        manifest = read_manifest(archive)
+        restored = await restore_backup(db, archive, job.entity_id, manifest)
+    # Record what was loaded: the archive's audit logs are left out
+    job.include_audit = False
+    job.manifest = {**manifest, "tables": [table for table in manifest["tables"] if table["name"] in restored]}
+
+
+async def run_backup_job(
+    db: AsyncSession,
+    job_id: uuid.UUID,
+    storage: Optional[FileStorageService] = None,
+) -> Dict[str, Any]:
+    """
+    Run a queued backup or restore.
+
+    A backup leaves its archive in file storage. A restore commits all of
+    its rows together with the job's completion, so a retried job either
+    finds the job completed or starts over on an untouched entity; the
+    uploaded archive is deleted once it is restored.
+    """
+    job = await db.get(EntityBackupJob, job_id)
+    if job is None or job.status == EntityBackupStatus.COMPLETED:
+        return {"job_id": str(job_id), "status": job.status.value if job else "not_found"}
+
+    storage = storage or FileStorageService()
+    operation = job.operation
+    job.status = EntityBackupStatus.RUNNING
+    job.started_at = datetime.now(timezone.utc)
+    job.error_message = None
+    await db.commit()
+
+    try:
+        if operation == EntityBackupOperation.BACKUP:
+            await _run_backup(db, job, storage)
+        else:
+            await _run_restore(db, job, storage)
+        tables = _table_rows(job.manifest)
+        job.row_count = sum(tables.values())
+        job.status = EntityBackupStatus.COMPLETED
+        job.completed_at = datetime.now(timezone.utc)
+        await db.commit()
+    except Exception as e:
+        # The rollback expires the job; only assign to it from here on
+        await db.rollback()
+        job.status = EntityBackupStatus.FAILED
+        job.error_message = str(e)[:2000]
+        await db.commit()
+        if not isinstance(e, BackupError):
+            raise
+        return {"job_id": str(job_id), "status": EntityBackupStatus.FAILED.value, "error": str(e)}
+
+    if operation == EntityBackupOperation.RESTORE:
+        try:
+            await search_index_service.rebuild_search_documents(db, job.entity_id)
+        except Exception as e:
+            # The data is restored; rebuild_search_index_task can be rerun for the entity
+            logger.error(f"Search rebuild after restore {job_id} failed: {e}")
+            await db.rollback()
+        await storage.delete_file(job.file_id)
+
+    await log_backup(db, job, tables)
+    return {
+        "job_id": str(job_id),
+        "operation": operation.value,
+        "status": EntityBackupStatus.COMPLETED.value,
+        "rows": job.row_count,
+        "tables": tables,
+    }
+
+
+async def log_backup(db: AsyncSession, job: EntityBackupJob, tables: Dict[str, int]):
+    """Audit log entry for a finished backup or restore (commits)."""
+    from app.services.audit_service import AuditService
+
+    await AuditService(db).log_action(
+        business_entity_id=job.entity_id,
+        entity_type="entity_backup",
+        entity_id=str(job.id),
+        action=AuditAction.EXPORT if job.operation == EntityBackupOperation.BACKUP else AuditAction.IMPORT,
+        user_id=job.created_by_id,
+        new_values={
+            "operation": job.operation.value,
+            "filename": job.filename,
+            "rows": job.row_count,
+            "tables": tables,
+        },
+    )
@@ -35,6 +35,7 @@ from app.models.audit_consolidated import (
 )
 from app.models.transaction import Transaction, TransactionType
 from app.models.accounting import JournalEntry, JournalEntryLine, ChartOfAccounts
+from app.services.compute_pool import sha256_hexdigest
 
 
 # Configuration
@@ -91,9 +92,9 @@ class EvidenceCollectionService:
         """Ensure the evidence upload directory exists."""
         EVIDENCE_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     
-    def _calculate_hash(self, data: bytes) -> str:
-        """Calculate SHA-256 hash of binary data."""
-        return hashlib.sha256(data).hexdigest()
+    async def _calculate_hash(self, data: bytes) -> str:
+        """Calculate SHA-256 hash of binary data (large files off the event loop)."""
+        return await sha256_hexdigest(data)
     
     def _calculate_content_hash(self, content: Dict[str, Any]) -> str:
         """Calculate SHA-256 hash of JSON content."""
@@ -163,7 +164,7 @@ class EvidenceCollectionService:
                 )
             
             # Calculate file hash
-            file_hash = self._calculate_hash(file_content)
+            file_hash = await self._calculate_hash(file_content)
             
             # Generate unique filename with hash prefix
             ext = ALLOWED_MIME_TYPES.get(mime_type, ".bin")
@@ -272,7 +273,7 @@ class EvidenceCollectionService:
                 mime_type = "image/gif"
             
             # Calculate hash
-            file_hash = self._calculate_hash(image_content)
+            file_hash = await self._calculate_hash(image_content)
             
             # Generate filename
             ext = ALLOWED_MIME_TYPES.get(mime_type, ".png")
@@ -953,7 +954,7 @@ class EvidenceCollectionService:
             file_path = None
             file_hash = None
             if response_file_content and response_file_name:
-                file_hash = self._calculate_hash(response_file_content)
+                file_hash = await self._calculate_hash(response_file_content)
                 safe_filename = f"confirmation_response_{file_hash[:16]}.pdf"
                 file_path = EVIDENCE_UPLOAD_DIR / str(original.entity_id) / "confirmations" / safe_filename
                 file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1189,7 +1190,7 @@ class EvidenceCollectionService:
             try:
                 async with aiofiles.open(evidence.file_path, "rb") as f:
                     file_content = await f.read()
-                current_file_hash = self._calculate_hash(file_content)
+                current_file_hash = await self._calculate_hash(file_content)
                 
                 file_hash_valid = (current_file_hash == evidence.file_hash)
                 details["file_hash_valid"] = file_hash_valid
@@ -12,7 +12,6 @@ Nigerian Tax Reform 2026 Compliant
 """
 
 import math
-import hashlib
 import json
 from datetime import datetime, date, timedelta
 from decimal import Decimal
@@ -26,6 +25,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc, text
 from sqlalchemy.orm import selectinload
 
+from app.services.compute_pool import sha256_hexdigest
+
 logger = logging.getLogger(__name__)
 
 
@@ -1077,7 +1078,7 @@ class WORMStorageService:
                 "retention_until": (
                     datetime.utcnow() + timedelta(days=retention_years * 365)
                 ).isoformat(),
-                "content_hash": hashlib.sha256(content).hexdigest(),
+                "content_hash": await sha256_hexdigest(content),
             }
         
         # Calculate retention date
@@ -1087,7 +1088,7 @@ class WORMStorageService:
         key = f"worm/{entity_id}/{document_type}/{document_id}"
         
         # Calculate content hash for verification
-        content_hash = hashlib.sha256(content).hexdigest()
+        content_hash = await sha256_hexdigest(content)
         
         try:
             # Store in S3 with Object Lock
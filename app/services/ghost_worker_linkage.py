@@ -0,0 +1,396 @@
+"""
+TekVwarho ProAudit - Ghost Worker Record Linkage
+
+Finds near-duplicate employee records that point to one real person or one
+payment destination: transposed BVN/NIN/account digits, the same account at
+a differently spelled bank, similar names with the same date of birth.
+
+Pipeline:
+1. Blocking - every record emits a handful of keys (interleaved and sorted
+   identifier digits, account suffix, phonetic name key, DOB, phone, email);
+   only records sharing a key are compared. Oversized blocks are compared
+   over a sorted sliding window, so comparisons stay near-linear.
+2. Scoring - each candidate pair gets graded field agreements (exact/near
+   identifiers, Jaro-Winkler name similarity, DOB) summed as log2 match
+   weights (Fellegi-Sunter style).
+3. Ranking - pairs sharing an exact identifier or scoring above
+   MATCH_WEIGHT_THRESHOLD are returned, strongest first.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+# Blocks larger than this are compared over a sliding window
+MAX_BLOCK_SIZE = 30
+BLOCK_WINDOW = 10
+
+# Pairs below this total weight are dropped unless they share an identifier
+MATCH_WEIGHT_THRESHOLD = 8.0
+
+# log2 match weights per field agreement level
+FIELD_WEIGHTS = {
+    "bvn": {"exact": 14.0, "near": 7.0, "differ": -8.0},
+    "nin": {"exact": 14.0, "near": 7.0, "differ": -8.0},
+    "account": {"exact": 9.0, "near": 5.0, "differ": 0.0},
+    "phone": {"exact": 5.0, "differ": 0.0},
+    "email": {"exact": 6.0, "differ": 0.0},
+    "dob": {"exact": 3.0, "differ": -3.0},
+}
+
+# (minimum Jaro-Winkler similarity, weight), checked in order
+NAME_WEIGHTS = [(0.94, 6.0), (0.85, 5.0), (0.75, 1.0), (0.0, -4.0)]
+
+IDENTIFIER_FIELDS = ("bvn", "nin", "account")
+
+# Words dropped when comparing bank names ("GTBank Plc" == "gtbank")
+BANK_NOISE_WORDS = {"bank", "plc", "ltd", "limited", "nigeria", "of", "the", "microfinance", "mfb"}
+BANK_ALIASES = {
+    "guarantytrust": "gtbank",
+    "gtb": "gtbank",
+    "gt": "gtbank",
+    "unitedforafrica": "uba",
+    "firstbank": "first",
+    "stanbic": "stanbicibtc",
+    "ibtc": "stanbicibtc",
+    "firstcitymonument": "fcmb",
+}
+
+
+# ===========================================
+# NORMALIZATION
+# ===========================================
+
+def normalize_name(value: Optional[str]) -> str:
+    """Lowercase ASCII letters and single spaces."""
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z ]", " ", text.lower()).split())
+
+
+def normalize_digits(value: Optional[str]) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def normalize_bank(value: Optional[str]) -> str:
+    """Canonical bank key so spelling variants of one bank compare equal."""
+    words = re.sub(r"[^a-z0-9 ]", " ", (value or "").lower().replace("_", " ")).split()
+    key = "".join(word for word in words if word not in BANK_NOISE_WORDS)
+    return BANK_ALIASES.get(key, key)
+
+
+def soundex(word: str) -> str:
+    """American Soundex code (e.g. "Robert" -> "R163")."""
+    word = re.sub(r"[^a-z]", "", word.lower())
+    if not word:
+        return ""
+    codes = {
+        **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"),
+        **dict.fromkeys("dt", "3"), "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+    }
+    result = word[0].upper()
+    previous = codes.get(word[0], "")
+    for char in word[1:]:
+        code = codes.get(char, "")
+        if code and code != previous:
+            result += code
+        if char not in "hw":
+            previous = code
+    return (result + "000")[:4]
+
+
+# ===========================================
+# STRING DISTANCE
+# ===========================================
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1) -> float:
+    """Jaro-Winkler similarity in [0, 1]."""
+    if a == b:
+        return 1.0 if a else 0.0
+    if not a or not b:
+        return 0.0
+    window = max(0, max(len(a), len(b)) // 2 - 1)
+    a_flags = [False] * len(a)
+    b_flags = [False] * len(b)
+    matches = 0
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not b_flags[j] and b[j] == char:
+                a_flags[i] = b_flags[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    a_matched = [c for c, flag in zip(a, a_flags) if flag]
+    b_matched = [c for c, flag in zip(b, b_flags) if flag]
+    transpositions = sum(x != y for x, y in zip(a_matched, b_matched)) / 2
+    jaro = (matches / len(a) + matches / len(b) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by one substitution, insertion, deletion or adjacent swap."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i, (x, y) in enumerate(zip(a, b)) if x != y]
+        if len(diffs) == 1:
+            return True
+        return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and \
+            a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    for i in range(len(longer)):
+        if longer[:i] + longer[i + 1:] == shorter:
+            return True
+    return False
+
+
+# ===========================================
+# RECORDS AND BLOCKING
+# ===========================================
+
+@dataclass
+class LinkageRecord:
+    """Normalized identity fields of one employee."""
+
+    employee_id: Any
+    display_name: str
+    name: str
+    name_tokens: Tuple[str, ...]
+    dob: Optional[date] = None
+    bvn: str = ""
+    nin: str = ""
+    phone: str = ""
+    email: str = ""
+    accounts: List[Tuple[str, str]] = field(default_factory=list)  # (bank key, number)
+
+    @classmethod
+    def build(
+        cls,
+        employee: Any,
+        accounts: Iterable[Tuple[Optional[str], Optional[str]]] = (),
+    ) -> "LinkageRecord":
+        """From an Employee-like object and its (bank_name, account_number) pairs."""
+        parts = [employee.first_name, getattr(employee, "middle_name", None), employee.last_name]
+        display = " ".join(p for p in parts if p)
+        name = normalize_name(display)
+        phone = normalize_digits(getattr(employee, "phone_number", None))
+        return cls(
+            employee_id=employee.id,
+            display_name=display,
+            name=name,
+            name_tokens=tuple(sorted(name.split())),
+            dob=getattr(employee, "date_of_birth", None),
+            bvn=normalize_digits(getattr(employee, "bvn", None)),
+            nin=normalize_digits(getattr(employee, "nin", None)),
+            phone=phone[-10:],
+            email=(getattr(employee, "email", None) or "").strip().lower(),
+            accounts=[
+                (normalize_bank(bank), normalize_digits(number))
+                for bank, number in accounts if normalize_digits(number)
+            ],
+        )
+
+
+def _digit_keys(prefix: str, value: str) -> Iterator[str]:
+    # The value with every third digit masked, for each of the three
+    # offsets: a substitution survives in the key that masks it, while each
+    # key keeps two thirds of the digits (halves would leave low-entropy
+    # leading digits such as BVN "22" on their own). An adjacent swap keeps
+    # the digit multiset.
+    for offset in range(3):
+        masked = "".join("_" if i % 3 == offset else c for i, c in enumerate(value))
+        yield f"{prefix}:{masked}"
+    yield f"{prefix}:~{''.join(sorted(value))}"
+
+
+def blocking_keys(record: LinkageRecord) -> Set[str]:
+    keys: Set[str] = set()
+    for name in ("bvn", "nin"):
+        value = getattr(record, name)
+        if len(value) >= 6:
+            keys.update(_digit_keys(name, value))
+    for _, number in record.accounts:
+        if len(number) >= 6:
+            keys.update(_digit_keys("acct", number))
+            keys.add(f"acct:*{number[-6:]}")
+    if record.name:
+        words = record.name.split()
+        keys.add("name:" + "/".join(sorted((soundex(words[0]), soundex(words[-1])))))
+        if record.dob:
+            initials = "".join(sorted({words[0][0], words[-1][0]}))
+            keys.add(f"dob:{record.dob.isoformat()}:{initials}")
+    if len(record.phone) >= 7:
+        keys.add(f"phone:{record.phone}")
+    if record.email:
+        keys.add(f"email:{record.email}")
+    return keys
+
+
+def candidate_pairs(records: Sequence[LinkageRecord]) -> Set[Tuple[int, int]]:
+    """Index pairs (i < j) that share at least one blocking key."""
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for index, record in enumerate(records):
+        for key in blocking_keys(record):
+            blocks[key].append(index)
+
+    pairs: Set[Tuple[int, int]] = set()
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) <= MAX_BLOCK_SIZE:
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    pairs.add((i, j) if i < j else (j, i))
+            continue
+        # Sorted neighbourhood within an oversized block
+        ordered = sorted(members, key=lambda i: (records[i].name_tokens, str(records[i].dob)))
+        for position, i in enumerate(ordered):
+            for j in ordered[position + 1:position + 1 + BLOCK_WINDOW]:
+                pairs.add((i, j) if i < j else (j, i))
+    return pairs
+
+
+# ===========================================
+# SCORING
+# ===========================================
+
+@dataclass
+class LinkedPair:
+    """A scored candidate pair."""
+
+    record_1: LinkageRecord
+    record_2: LinkageRecord
+    weight: float
+    features: Dict[str, Any]
+    detection_type: str
+    matched_field: str
+    matched_value: str
+    shares_identifier: bool
+
+    @property
+    def is_flagged(self) -> bool:
+        return self.shares_identifier or self.weight >= MATCH_WEIGHT_THRESHOLD
+
+
+def _compare_identifier(a: str, b: str) -> Optional[str]:
+    if not a or not b:
+        return None
+    if a == b:
+        return "exact"
+    return "near" if within_one_edit(a, b) else "differ"
+
+
+def _compare_accounts(a: LinkageRecord, b: LinkageRecord) -> Tuple[Optional[str], str, bool]:
+    """(level, value, same bank) for the closest pair of accounts."""
+    if not a.accounts or not b.accounts:
+        return None, "", False
+    best: Tuple[Optional[str], str, bool] = ("differ", "", False)
+    for bank_a, number_a in a.accounts:
+        for bank_b, number_b in b.accounts:
+            level = _compare_identifier(number_a, number_b)
+            if level == "exact":
+                return "exact", number_a, bank_a == bank_b
+            if level == "near" and best[0] != "near":
+                best = ("near", f"{number_a} ~ {number_b}", bank_a == bank_b)
+    return best
+
+
+def name_similarity(a: LinkageRecord, b: LinkageRecord) -> float:
+    """Jaro-Winkler on token-sorted names (word order and swaps don't matter)."""
+    if not a.name or not b.name:
+        return 0.0
+    return jaro_winkler(" ".join(a.name_tokens), " ".join(b.name_tokens))
+
+
+def score_pair(
+    a: LinkageRecord,
+    b: LinkageRecord,
+    prune: bool = False,
+) -> Optional[LinkedPair]:
+    """
+    Score a candidate pair. With prune, returns None as soon as the pair
+    cannot be flagged (skips the name comparison for most candidates).
+    """
+    features: Dict[str, Any] = {}
+    weight = 0.0
+
+    for name in ("bvn", "nin"):
+        level = _compare_identifier(getattr(a, name), getattr(b, name))
+        features[name] = level
+        if level:
+            weight += FIELD_WEIGHTS[name][level]
+
+    account_level, account_value, same_bank = _compare_accounts(a, b)
+    features["account"] = account_level
+    features["same_bank"] = same_bank if account_level in ("exact", "near") else None
+    if account_level:
+        weight += FIELD_WEIGHTS["account"][account_level]
+
+    for name in ("phone", "email"):
+        value_a, value_b = getattr(a, name), getattr(b, name)
+        level = None if not value_a or not value_b else ("exact" if value_a == value_b else "differ")
+        features[name] = level
+        if level:
+            weight += FIELD_WEIGHTS[name][level]
+
+    if a.dob and b.dob:
+        features["dob"] = "exact" if a.dob == b.dob else "differ"
+        weight += FIELD_WEIGHTS["dob"][features["dob"]]
+    else:
+        features["dob"] = None
+
+    if prune and "exact" not in (features["bvn"], features["nin"], features["account"]) \
+            and weight + NAME_WEIGHTS[0][1] < MATCH_WEIGHT_THRESHOLD:
+        return None
+
+    similarity = name_similarity(a, b)
+    features["name_similarity"] = round(similarity, 4)
+    weight += next(w for minimum, w in NAME_WEIGHTS if similarity >= minimum)
+
+    # Most telling field names the detection
+    values = {
+        "bvn": a.bvn if features["bvn"] == "exact" else f"{a.bvn} ~ {b.bvn}",
+        "nin": a.nin if features["nin"] == "exact" else f"{a.nin} ~ {b.nin}",
+        "account": account_value,
+    }
+    shares_identifier = False
+    for level in ("exact", "near"):
+        matched = [name for name in IDENTIFIER_FIELDS if features[name] == level]
+        if matched:
+            name = matched[0]
+            shares_identifier = level == "exact"
+            prefix = "duplicate" if level == "exact" else "near_duplicate"
+            field_name = "bank_account" if name == "account" else name
+            return LinkedPair(a, b, weight, features, f"{prefix}_{name}", field_name,
+                              values[name], shares_identifier)
+
+    dob = a.dob.isoformat() if a.dob else "?"
+    return LinkedPair(
+        a, b, weight, features, "similar_identity", "name_dob",
+        f"{a.display_name} ~ {b.display_name} ({dob})", False,
+    )
+
+
+def link_records(records: Sequence[LinkageRecord]) -> List[LinkedPair]:
+    """Flagged pairs, strongest first."""
+    flagged = [
+        pair for pair in (
+            score_pair(records[i], records[j], prune=True) for i, j in candidate_pairs(records)
+        )
+        if pair is not None and pair.is_flagged
+    ]
+    flagged.sort(key=lambda pair: (not pair.shares_identifier, -pair.weight))
+    return flagged
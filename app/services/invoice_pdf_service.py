@@ -37,6 +37,7 @@ except ImportError:
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.services.compute_pool import run_compute
 
 logger = logging.getLogger(__name__)
 
@@ -223,7 +224,8 @@ class InvoicePDFService:
             terms="Payment is due upon receipt. All amounts are in Nigerian Naira (NGN).",
         )
         
-        return self.generate_invoice_pdf(invoice_data)
+        # ReportLab holds the GIL while building the PDF
+        return await run_compute("render", render_invoice_pdf, invoice_data)
     
     def generate_invoice_pdf(self, invoice: InvoiceData) -> bytes:
         """
@@ -318,7 +320,7 @@ class InvoicePDFService:
         
         # Payment info
         if invoice.payment_status != "paid":
-            elements.append(self._build_payment_section(invoice, normal_style, heading_style))
+            elements.extend(self._build_payment_section(invoice, normal_style, heading_style))
             elements.append(Spacer(1, 20))
         
         # Notes and terms
@@ -589,5 +591,10 @@ class InvoicePDFService:
         return "\n".join(lines).encode('utf-8')
 
 
+def render_invoice_pdf(invoice: InvoiceData) -> bytes:
+    """Compute pool entry point: build one invoice PDF."""
+    return InvoicePDFService().generate_invoice_pdf(invoice)
+
+
 # Import timedelta for use in generate_subscription_invoice
 from datetime import timedelta
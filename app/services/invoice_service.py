@@ -6,7 +6,6 @@ Includes full GL integration for double-entry accounting.
 Multi-currency support with IAS 21 compliance.
 """
 
-import json
 import uuid
 from datetime import date, datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
@@ -20,6 +19,7 @@ from app.models.invoice import Invoice, InvoiceLineItem, InvoiceStatus, VATTreat
 from app.models.customer import Customer
 from app.models.entity import BusinessEntity
 from app.models.accounting import ChartOfAccounts, AccountType
+from app.utils.query_optimization import keyset_paginate
 
 if TYPE_CHECKING:
     from app.services.accounting_service import AccountingService
@@ -51,6 +51,9 @@ class InvoiceService:
     # NRS dispute window (72 hours)
     DISPUTE_WINDOW_HOURS = 72
     
+    # Listing sort key, newest first; backed by ix_invoices_entity_date_created_id
+    PAGE_KEY = (Invoice.invoice_date, Invoice.created_at, Invoice.id)
+    
     def __init__(self, db: AsyncSession):
         self.db = db
     
@@ -94,8 +97,14 @@ class InvoiceService:
         search: Optional[str] = None,
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Invoice], int]:
-        """Get invoices for an entity with filters."""
+        """
+        Get invoices for an entity with filters.
+        
+        Pass the cursor of the previous page to page by key instead of
+        page number (page is then ignored).
+        """
         query = (
             select(Invoice)
             .options(
@@ -150,9 +159,9 @@ class InvoiceService:
         total = count_result.scalar() or 0
         
         # Pagination
-        offset = (page - 1) * page_size
-        query = query.order_by(Invoice.invoice_date.desc(), Invoice.created_at.desc())
-        query = query.limit(page_size).offset(offset)
+        query = keyset_paginate(query, self.PAGE_KEY, cursor, page_size)
+        if not cursor:
+            query = query.offset((page - 1) * page_size)
         
         result = await self.db.execute(query)
         invoices = list(result.scalars().all())
@@ -514,11 +523,17 @@ class InvoiceService:
         """
         Finalize a draft invoice (move to PENDING status).
         
+        The NRS submission is queued in the same transaction (see
+        nrs_outbox_service) and sent by a dispatcher worker, so finalizing
+        never waits on the NRS API.
+        
         When post_to_gl=True (default), creates GL journal entry:
             Dr Accounts Receivable (1130)
             Cr Sales Revenue (4100)
             Cr VAT Payable (2130) - if applicable
         """
+        from app.services.nrs_outbox_service import enqueue_nrs_submission, wake_nrs_dispatcher
+        
         invoice = await self.get_invoice_by_id(invoice_id, entity_id)
         
         if not invoice:
@@ -529,9 +544,11 @@ class InvoiceService:
         
         invoice.status = InvoiceStatus.PENDING
         invoice.updated_by = user_id
+        await enqueue_nrs_submission(self.db, invoice, requested_by_id=user_id)
         
         await self.db.commit()
         await self.db.refresh(invoice)
+        wake_nrs_dispatcher()
         
         # Post to General Ledger
         if post_to_gl:
@@ -1022,39 +1039,13 @@ class InvoiceService:
     # NRS E-INVOICING
     # ===========================================
     
-    async def submit_to_nrs(
-        self,
-        invoice_id: uuid.UUID,
-        entity_id: uuid.UUID,
-        user_id: uuid.UUID,
-    ) -> Dict[str, Any]:
+    @staticmethod
+    def nrs_submission_fields(invoice: Invoice, entity: BusinessEntity) -> Dict[str, Any]:
         """
-        Submit invoice to NRS for IRN generation.
+        NRSApiClient.submit_invoice arguments for an invoice.
         
-        Uses the NRS API client to submit the invoice and obtain an IRN.
+        Raises ValueError when a B2B invoice has no customer TIN.
         """
-        from app.services.nrs_service import get_nrs_client
-        
-        invoice = await self.get_invoice_by_id(invoice_id, entity_id)
-        
-        if not invoice:
-            raise ValueError("Invoice not found")
-        
-        if invoice.status not in [InvoiceStatus.PENDING, InvoiceStatus.REJECTED]:
-            raise ValueError("Can only submit PENDING or REJECTED invoices to NRS")
-        
-        # Get entity details for seller information
-        entity_result = await self.db.execute(
-            select(BusinessEntity).where(BusinessEntity.id == entity_id)
-        )
-        entity = entity_result.scalar_one_or_none()
-        
-        if not entity:
-            raise ValueError("Business entity not found")
-        
-        if not entity.tin:
-            raise ValueError("Business entity TIN is required for NRS submission")
-        
         # Validate B2B requirements
         buyer_tin = None
         buyer_name = "Walk-in Customer"
@@ -1090,9 +1081,7 @@ class InvoiceService:
             entity.country,
         ]))
         
-        # Submit to NRS
-        nrs_client = get_nrs_client()
-        result = await nrs_client.submit_invoice(
+        return dict(
             seller_tin=entity.tin,
             seller_name=entity.legal_name or entity.name,
             seller_address=seller_address or "Nigeria",
@@ -1107,42 +1096,59 @@ class InvoiceService:
             line_items=line_items,
             vat_rate=float(invoice.vat_rate),
         )
+    
+    async def submit_to_nrs(
+        self,
+        invoice_id: uuid.UUID,
+        entity_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> Dict[str, Any]:
+        """
+        Queue an invoice for NRS submission (IRN generation).
         
-        if result.success:
-            invoice.status = InvoiceStatus.SUBMITTED
-            invoice.nrs_irn = result.irn
-            invoice.nrs_qr_code_data = result.qr_code_data
-            invoice.nrs_submitted_at = result.submission_timestamp
-            invoice.dispute_deadline = result.dispute_deadline
-            invoice.nrs_response = json.dumps(result.raw_response) if result.raw_response else None
-            invoice.updated_by = user_id
-            
-            await self.db.commit()
-            await self.db.refresh(invoice)
-            
-            return {
-                "success": True,
-                "invoice_id": str(invoice.id),
-                "nrs_irn": result.irn,
-                "qr_code_data": result.qr_code_data,
-                "message": result.message,
-                "submitted_at": result.submission_timestamp,
-                "dispute_deadline": result.dispute_deadline,
-            }
-        else:
-            # Mark as rejected if submission failed
-            invoice.status = InvoiceStatus.REJECTED
-            invoice.nrs_response = json.dumps(result.raw_response) if result.raw_response else result.message
-            invoice.updated_by = user_id
-            
-            await self.db.commit()
-            
-            return {
-                "success": False,
-                "invoice_id": str(invoice.id),
-                "message": result.message,
-                "error_code": result.response_code,
-            }
+        The invoice is validated here and submitted by the outbox
+        dispatcher; the IRN is published over WebSockets (invoice_nrs_status
+        on the invoices channel) once NRS issues it. REJECTED invoices go
+        back to PENDING.
+        """
+        from app.services.nrs_outbox_service import enqueue_nrs_submission, wake_nrs_dispatcher
+        
+        invoice = await self.get_invoice_by_id(invoice_id, entity_id)
+        
+        if not invoice:
+            raise ValueError("Invoice not found")
+        
+        if invoice.status not in [InvoiceStatus.PENDING, InvoiceStatus.REJECTED]:
+            raise ValueError("Can only submit PENDING or REJECTED invoices to NRS")
+        
+        # Get entity details for seller information
+        entity_result = await self.db.execute(
+            select(BusinessEntity).where(BusinessEntity.id == entity_id)
+        )
+        entity = entity_result.scalar_one_or_none()
+        
+        if not entity:
+            raise ValueError("Business entity not found")
+        
+        if not entity.tin:
+            raise ValueError("Business entity TIN is required for NRS submission")
+        
+        # Fail fast on what NRS would reject (e.g. B2B without customer TIN)
+        self.nrs_submission_fields(invoice, entity)
+        
+        invoice.status = InvoiceStatus.PENDING
+        invoice.updated_by = user_id
+        row = await enqueue_nrs_submission(self.db, invoice, requested_by_id=user_id)
+        
+        await self.db.commit()
+        wake_nrs_dispatcher()
+        
+        return {
+            "success": True,
+            "invoice_id": str(invoice.id),
+            "outbox_id": str(row.id),
+            "message": "Invoice queued for NRS submission",
+        }
     
     # ===========================================
     # STATISTICS & REPORTING
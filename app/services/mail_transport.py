@@ -0,0 +1,398 @@
+"""
+TekVwarho ProAudit - Mail Transport
+
+Non-blocking delivery layer used by EmailService.
+
+Features:
+- Pooled, logged-in SMTP connections driven from a dedicated thread pool,
+  so blocking smtplib calls never run on the event loop
+- Batch sending: many rendered messages over a handful of SMTP sessions
+- Shared keep-alive httpx.AsyncClient instances for HTTP providers
+  (SendGrid, Mailgun), one set per event loop
+- LocalSMTPServer: an in-process SMTP stand-in for tests and benchmarks
+"""
+
+import asyncio
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MailEnvelope:
+    """A fully rendered message ready for SMTP delivery."""
+    sender: str
+    recipients: List[str]
+    data: bytes
+
+
+# ===========================================
+# SMTP CONNECTION POOL
+# ===========================================
+
+class SMTPConnectionPool:
+    """
+    Pool of authenticated SMTP connections.
+
+    All socket work happens on a private ThreadPoolExecutor whose size caps
+    the number of concurrent sessions. Idle connections are reused until
+    they exceed ``max_idle_seconds`` or the server drops them.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        pool_size: int = 4,
+        max_idle_seconds: float = 60.0,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.pool_size = max(1, pool_size)
+        self.max_idle_seconds = max_idle_seconds
+        self.timeout = timeout
+
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="smtp-pool"
+        )
+        self._closed = False
+
+        # Metrics
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self.messages_failed = 0
+
+    # ---- connection lifecycle (worker threads only) ----
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls(context=ssl.create_default_context())
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self.connections_opened += 1
+        return server
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used <= self.max_idle_seconds:
+                return server
+            self._quit(server)
+
+    def _checkin(self, server: smtplib.SMTP):
+        if self._closed:
+            self._quit(server)
+        else:
+            self._idle.put((server, time.monotonic()))
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _send_session(self, envelopes: List[MailEnvelope]) -> List[bool]:
+        """Send envelopes sequentially over one pooled connection."""
+        results: List[bool] = []
+        server: Optional[smtplib.SMTP] = None
+        for envelope in envelopes:
+            attempts = 0
+            while True:
+                attempts += 1
+                try:
+                    if server is None:
+                        server = self._checkout()
+                    server.sendmail(envelope.sender, envelope.recipients, envelope.data)
+                    self.messages_sent += 1
+                    results.append(True)
+                    break
+                except smtplib.SMTPServerDisconnected as e:
+                    # Stale pooled connection - reconnect once
+                    server = None
+                    if attempts >= 2:
+                        logger.error(f"SMTP send failed: {e}")
+                        self.messages_failed += 1
+                        results.append(False)
+                        break
+                except smtplib.SMTPRecipientsRefused as e:
+                    logger.error(f"SMTP recipients refused: {e}")
+                    self.messages_failed += 1
+                    results.append(False)
+                    break
+                except Exception as e:
+                    logger.error(f"SMTP send failed: {e}")
+                    if server is not None:
+                        self._quit(server)
+                        server = None
+                    self.messages_failed += 1
+                    results.append(False)
+                    break
+        if server is not None:
+            self._checkin(server)
+        return results
+
+    # ---- async API ----
+
+    async def send(self, envelope: MailEnvelope) -> bool:
+        """Send one message without blocking the event loop."""
+        results = await self.send_many([envelope])
+        return results[0]
+
+    async def send_many(self, envelopes: List[MailEnvelope]) -> List[bool]:
+        """
+        Send many messages over at most ``pool_size`` SMTP sessions.
+
+        Returns:
+            Per-message success flags, in input order.
+        """
+        if not envelopes:
+            return []
+        loop = asyncio.get_running_loop()
+        sessions = min(self.pool_size, len(envelopes))
+        chunks = [envelopes[i::sessions] for i in range(sessions)]
+        chunk_results = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, self._send_session, chunk)
+            for chunk in chunks
+        ])
+
+        # Re-interleave the strided chunks back into input order
+        results: List[bool] = [False] * len(envelopes)
+        for offset, chunk_result in enumerate(chunk_results):
+            for index, ok in enumerate(chunk_result):
+                results[offset + index * sessions] = ok
+        return results
+
+    def close(self):
+        """Quit idle connections and stop the worker threads."""
+        self._closed = True
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(server)
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "pool_size": self.pool_size,
+            "idle_connections": self._idle.qsize(),
+            "connections_opened": self.connections_opened,
+            "messages_sent": self.messages_sent,
+            "messages_failed": self.messages_failed,
+        }
+
+
+_smtp_pool: Optional[SMTPConnectionPool] = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Get the process-wide SMTP pool built from settings."""
+    global _smtp_pool
+    with _smtp_pool_lock:
+        if _smtp_pool is None:
+            _smtp_pool = SMTPConnectionPool(
+                host=settings.mail_server,
+                port=settings.mail_port,
+                username=settings.mail_username,
+                password=settings.mail_password,
+                use_tls=settings.mail_use_tls,
+                pool_size=settings.mail_pool_size,
+                max_idle_seconds=settings.mail_pool_max_idle_seconds,
+                timeout=settings.mail_timeout_seconds,
+            )
+        return _smtp_pool
+
+
+# ===========================================
+# SHARED HTTP CLIENTS
+# ===========================================
+
+# httpx clients are bound to the loop they were created on, so keep one set
+# per loop (the web server has one; Celery tasks may create their own).
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """
+    Get a shared keep-alive AsyncClient for a mail provider.
+
+    Args:
+        name: Provider key, e.g. "sendgrid" or "mailgun"
+    """
+    loop = asyncio.get_running_loop()
+    clients = _http_clients.setdefault(loop, {})
+    client = clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.mail_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=settings.mail_batch_concurrency,
+                max_keepalive_connections=settings.mail_batch_concurrency,
+                keepalive_expiry=settings.mail_pool_max_idle_seconds,
+            ),
+        )
+        clients[name] = client
+    return client
+
+
+async def close_mail_transports():
+    """Close pooled SMTP connections and this loop's HTTP clients."""
+    global _smtp_pool
+    try:
+        loop = asyncio.get_running_loop()
+        for client in _http_clients.pop(loop, {}).values():
+            await client.aclose()
+    except RuntimeError:
+        pass
+    with _smtp_pool_lock:
+        if _smtp_pool is not None:
+            _smtp_pool.close()
+            _smtp_pool = None
+
+
+# ===========================================
+# LOCAL SMTP STAND-IN
+# ===========================================
+
+class LocalSMTPServer:
+    """
+    Minimal in-process SMTP server for tests and benchmarks.
+
+    Speaks enough of RFC 5321 for smtplib (EHLO, AUTH PLAIN, MAIL, RCPT,
+    DATA, RSET, NOOP, QUIT) and records every accepted message. Runs on its
+    own thread and event loop. Use as a context manager:
+
+        with LocalSMTPServer() as server:
+            pool = SMTPConnectionPool("127.0.0.1", server.port, use_tls=False)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.messages: List[MailEnvelope] = []
+        self.sessions = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.sessions += 1
+        sender = ""
+        recipients: List[str] = []
+
+        def reply(line: str):
+            writer.write(f"{line}\r\n".encode())
+
+        reply("220 localhost ESMTP ready")
+        try:
+            while True:
+                await writer.drain()
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode(errors="replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb in ("EHLO", "HELO"):
+                    reply("250-localhost")
+                    reply("250 AUTH PLAIN LOGIN")
+                elif verb == "AUTH":
+                    reply("235 2.7.0 Authentication successful")
+                elif verb == "MAIL":
+                    sender = command.split(":", 1)[1].strip().split(" ")[0].strip("<>")
+                    recipients = []
+                    reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command.split(":", 1)[1].strip().strip("<>"))
+                    reply("250 OK")
+                elif verb == "DATA":
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    await writer.drain()
+                    lines: List[bytes] = []
+                    while True:
+                        line = await reader.readline()
+                        if not line or line == b".\r\n":
+                            break
+                        lines.append(line)
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    self.messages.append(MailEnvelope(sender, recipients, b"".join(lines)))
+                    reply("250 OK queued")
+                elif verb in ("RSET", "NOOP"):
+                    reply("250 OK")
+                elif verb == "QUIT":
+                    reply("221 Bye")
+                    await writer.drain()
+                    break
+                else:
+                    reply("502 Command not implemented")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def start(self) -> "LocalSMTPServer":
+        self._thread = threading.Thread(target=self._run, name="local-smtp", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "LocalSMTPServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
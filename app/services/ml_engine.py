@@ -19,7 +19,7 @@ import math
 import numpy as np
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import Optional, List, Dict, Any, Tuple, Union
+from typing import Optional, List, Dict, Any, Tuple, Union, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict
@@ -254,8 +254,19 @@ class SimpleNeuralNetwork:
         
         return grad_weights, grad_biases
     
-    def fit(self, X: np.ndarray, y: np.ndarray, verbose: bool = True) -> Dict[str, List[float]]:
-        """Train the neural network."""
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        verbose: bool = True,
+        progress_callback: Optional[Callable[[int, float], None]] = None
+    ) -> Dict[str, List[float]]:
+        """
+        Train the neural network.
+        
+        progress_callback, if given, is called with (epoch, loss) after
+        every epoch.
+        """
         m = X.shape[0]
         
         for epoch in range(self.epochs):
@@ -289,6 +300,9 @@ class SimpleNeuralNetwork:
             
             self.loss_history.append(loss)
             
+            if progress_callback is not None:
+                progress_callback(epoch, float(loss))
+            
             if verbose and epoch % 100 == 0:
                 logger.info(f"Epoch {epoch}, Loss: {loss:.6f}")
         
@@ -305,6 +319,40 @@ class SimpleNeuralNetwork:
         """Get prediction probabilities."""
         output, _, _ = self.forward(X)
         return output
+    
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Weights and biases keyed for an .npz archive (w0, b0, w1, ...)."""
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        return arrays
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: Dict[str, np.ndarray],
+        activation: str = "relu",
+        **params
+    ) -> "SimpleNeuralNetwork":
+        """
+        Rebuild a trained network from to_arrays() output for inference.
+        
+        The arrays are used as-is (they may be read-only memory maps) and the
+        global random state is left untouched.
+        """
+        nn = cls.__new__(cls)
+        layers = len([key for key in arrays if key.startswith("w")])
+        nn.weights = [arrays[f"w{i}"] for i in range(layers)]
+        nn.biases = [arrays[f"b{i}"] for i in range(layers)]
+        nn.layer_sizes = [nn.weights[0].shape[0]] + [w.shape[1] for w in nn.weights]
+        nn.activation = activation
+        nn.learning_rate = params.get("learning_rate", 0.01)
+        nn.epochs = params.get("epochs", 0)
+        nn.batch_size = params.get("batch_size", 32)
+        nn.loss_history = []
+        nn.accuracy_history = []
+        return nn
 
 
 # =============================================================================
@@ -445,46 +493,17 @@ class TimeSeriesForecaster:
     
     def decompose(self, data: np.ndarray) -> Dict[str, np.ndarray]:
         """Decompose time series into trend, seasonal, and residual."""
-        n = len(data)
-        
-        # Calculate trend using moving average
-        window = min(self.seasonality_period, n // 2)
-        if window < 2:
-            window = 2
-        
-        trend = np.convolve(data, np.ones(window) / window, mode='valid')
-        
-        # Pad trend to match original length
-        pad_left = (n - len(trend)) // 2
-        pad_right = n - len(trend) - pad_left
-        trend = np.pad(trend, (pad_left, pad_right), mode='edge')
-        
-        # Calculate detrended series
-        detrended = data - trend
-        
-        # Calculate seasonal component
-        if n >= self.seasonality_period:
-            seasonal = np.zeros(self.seasonality_period)
-            for i in range(self.seasonality_period):
-                indices = range(i, n, self.seasonality_period)
-                seasonal[i] = np.mean(detrended[list(indices)])
-            
-            # Repeat seasonal pattern
-            seasonal_full = np.tile(seasonal, n // self.seasonality_period + 1)[:n]
-        else:
-            seasonal_full = np.zeros(n)
-        
-        # Calculate residual
-        residual = data - trend - seasonal_full
+        data = np.asarray(data, dtype=float)
+        batch = self.decompose_batch(data[np.newaxis, :])
         
-        self.trend_component = trend
-        self.seasonal_component = seasonal_full
-        self.residual_component = residual
+        self.trend_component = batch["trend"][0]
+        self.seasonal_component = batch["seasonal"][0]
+        self.residual_component = batch["residual"][0]
         
         return {
-            "trend": trend,
-            "seasonal": seasonal_full,
-            "residual": residual,
+            "trend": self.trend_component,
+            "seasonal": self.seasonal_component,
+            "residual": self.residual_component,
             "original": data
         }
     
@@ -506,95 +525,149 @@ class TimeSeriesForecaster:
             gamma: Seasonal smoothing parameter
             forecast_periods: Number of periods to forecast
         """
-        n = len(data)
+        batch = self.exponential_smoothing_batch(
+            np.asarray(data, dtype=float)[np.newaxis, :], alpha, beta, gamma, forecast_periods
+        )
+        return self.series_result(batch, 0)
+    
+    def arima_forecast(
+        self,
+        data: np.ndarray,
+        p: int = 1,
+        d: int = 1,
+        q: int = 1,
+        forecast_periods: int = 12
+    ) -> Dict[str, Any]:
+        """
+        Simplified ARIMA-like forecasting.
+        Uses differencing and autoregression.
+        """
+        batch = self.arima_forecast_batch(
+            np.asarray(data, dtype=float)[np.newaxis, :], p, d, q, forecast_periods
+        )
+        return self.series_result(batch, 0)
+    
+    # -------------------------------------------------------------------------
+    # Batch forecasting: one row per series, one column per period
+    # -------------------------------------------------------------------------
+    
+    def decompose_batch(self, data: np.ndarray) -> Dict[str, np.ndarray]:
+        """Decompose every row of a (series x periods) array."""
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n = data.shape[1]
+        m = self.seasonality_period
+        
+        # Trend: centred moving average, edge-padded to full length
+        window = max(2, min(m, n // 2))
+        trend = np.lib.stride_tricks.sliding_window_view(data, window, axis=1).mean(axis=2)
+        pad_left = (n - trend.shape[1]) // 2
+        pad_right = n - trend.shape[1] - pad_left
+        trend = np.pad(trend, ((0, 0), (pad_left, pad_right)), mode='edge')
+        
+        detrended = data - trend
+        
+        # Seasonal: mean detrended value per phase, repeated
+        if n >= m:
+            seasonal = np.column_stack([detrended[:, i::m].mean(axis=1) for i in range(m)])
+            seasonal_full = np.tile(seasonal, n // m + 1)[:, :n]
+        else:
+            seasonal_full = np.zeros_like(data)
+        
+        return {
+            "trend": trend,
+            "seasonal": seasonal_full,
+            "residual": data - trend - seasonal_full,
+            "original": data
+        }
+    
+    def exponential_smoothing_batch(
+        self,
+        data: np.ndarray,
+        alpha: float = 0.3,
+        beta: float = 0.1,
+        gamma: float = 0.1,
+        forecast_periods: int = 12
+    ) -> Dict[str, Any]:
+        """
+        Holt-Winters over every row of a (series x periods) array.
+        
+        The smoothing recursion steps through the periods once, updating
+        all series together. Falls back to simple exponential smoothing
+        with fewer than two seasons of data.
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        n = data.shape[1]
         m = self.seasonality_period
         
         if n < m * 2:
-            # Not enough data for seasonal model, use simple exponential smoothing
-            return self._simple_exponential_smoothing(data, alpha, forecast_periods)
+            return self._simple_exponential_smoothing_batch(data, alpha, forecast_periods)
         
-        # Initialize
-        level = np.mean(data[:m])
-        trend = (np.mean(data[m:2*m]) - np.mean(data[:m])) / m
-        seasonal = data[:m] - np.mean(data[:m])
+        # Initialize from the first two seasons
+        first_season = data[:, :m].mean(axis=1)
+        level = first_season
+        trend = (data[:, m:2*m].mean(axis=1) - first_season) / m
+        seasonal = data[:, :m] - first_season[:, np.newaxis]
         
-        # Fitted values
-        fitted = np.zeros(n)
+        fitted = np.empty_like(data)
+        fitted[:, 0] = level + trend + seasonal[:, 0]
         
-        for t in range(n):
+        for t in range(1, n):
             season_idx = t % m
-            
-            if t == 0:
-                fitted[t] = level + trend + seasonal[season_idx]
-            else:
-                old_level = level
-                level = alpha * (data[t] - seasonal[season_idx]) + (1 - alpha) * (level + trend)
-                trend = beta * (level - old_level) + (1 - beta) * trend
-                seasonal[season_idx] = gamma * (data[t] - level) + (1 - gamma) * seasonal[season_idx]
-                fitted[t] = level + trend + seasonal[season_idx]
-        
-        # Forecast
-        forecasts = []
-        for h in range(1, forecast_periods + 1):
-            season_idx = (n + h - 1) % m
-            forecast = level + h * trend + seasonal[season_idx]
-            forecasts.append(forecast)
-        
-        # Calculate confidence intervals
-        residuals = data - fitted
-        std_err = np.std(residuals)
-        
-        forecast_results = []
-        for i, fc in enumerate(forecasts):
-            h = i + 1
-            interval_width = 1.96 * std_err * np.sqrt(h)
-            forecast_results.append({
-                "period": h,
-                "forecast": float(fc),
-                "lower_95": float(fc - interval_width),
-                "upper_95": float(fc + interval_width)
-            })
+            old_level = level
+            level = alpha * (data[:, t] - seasonal[:, season_idx]) + (1 - alpha) * (level + trend)
+            trend = beta * (level - old_level) + (1 - beta) * trend
+            seasonal[:, season_idx] = gamma * (data[:, t] - level) + (1 - gamma) * seasonal[:, season_idx]
+            fitted[:, t] = level + trend + seasonal[:, season_idx]
+        
+        horizons = np.arange(1, forecast_periods + 1)
+        forecast = (
+            level[:, np.newaxis]
+            + horizons * trend[:, np.newaxis]
+            + seasonal[:, (n + horizons - 1) % m]
+        )
+        std_err = (data - fitted).std(axis=1)
+        interval_width = 1.96 * std_err[:, np.newaxis] * np.sqrt(horizons)
         
         return {
-            "fitted": fitted.tolist(),
-            "forecasts": forecast_results,
-            "level": float(level),
-            "trend": float(trend),
-            "seasonal_factors": seasonal.tolist(),
-            "std_error": float(std_err),
+            "fitted": fitted,
+            "forecast": forecast,
+            "lower_95": forecast - interval_width,
+            "upper_95": forecast + interval_width,
+            "level": level,
+            "trend": trend,
+            "seasonal_factors": seasonal,
+            "std_error": std_err,
             "model": "holt_winters"
         }
     
-    def _simple_exponential_smoothing(
+    def _simple_exponential_smoothing_batch(
         self,
         data: np.ndarray,
         alpha: float,
         forecast_periods: int
     ) -> Dict[str, Any]:
         """Simple exponential smoothing for short series."""
-        n = len(data)
-        fitted = np.zeros(n)
-        fitted[0] = data[0]
+        fitted = np.empty_like(data)
+        fitted[:, 0] = data[:, 0]
         
-        for t in range(1, n):
-            fitted[t] = alpha * data[t-1] + (1 - alpha) * fitted[t-1]
+        for t in range(1, data.shape[1]):
+            fitted[:, t] = alpha * data[:, t-1] + (1 - alpha) * fitted[:, t-1]
         
         # Forecast (flat)
-        last_value = fitted[-1]
-        forecasts = [{"period": h, "forecast": float(last_value), 
-                     "lower_95": float(last_value * 0.8), 
-                     "upper_95": float(last_value * 1.2)} 
-                    for h in range(1, forecast_periods + 1)]
+        last_value = fitted[:, -1]
+        forecast = np.repeat(last_value[:, np.newaxis], forecast_periods, axis=1)
         
         return {
-            "fitted": fitted.tolist(),
-            "forecasts": forecasts,
-            "level": float(last_value),
-            "trend": 0.0,
+            "fitted": fitted,
+            "forecast": forecast,
+            "lower_95": forecast * 0.8,
+            "upper_95": forecast * 1.2,
+            "level": last_value,
+            "trend": np.zeros_like(last_value),
             "model": "simple_exponential"
         }
     
-    def arima_forecast(
+    def arima_forecast_batch(
         self,
         data: np.ndarray,
         p: int = 1,
@@ -603,76 +676,101 @@ class TimeSeriesForecaster:
         forecast_periods: int = 12
     ) -> Dict[str, Any]:
         """
-        Simplified ARIMA-like forecasting.
-        Uses differencing and autoregression.
-        """
-        # Differencing
-        if d > 0:
-            diff_data = np.diff(data, n=d)
-        else:
-            diff_data = data.copy()
+        Simplified ARIMA-like forecasting over every row of a
+        (series x periods) array.
         
-        n = len(diff_data)
+        Each series gets its own AR(p) fit on the differenced data; the
+        least-squares problems are solved as one stacked pseudo-inverse.
+        """
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+        diff_data = np.diff(data, n=d, axis=1) if d > 0 else data.copy()
+        n_series, n = diff_data.shape
         
         # Fit AR model using least squares
         if p > 0 and n > p:
-            X = np.column_stack([diff_data[i:n-p+i] for i in range(p)])
-            y = diff_data[p:]
-            
-            # Solve using pseudo-inverse
-            try:
-                ar_coeffs = np.linalg.lstsq(X, y, rcond=None)[0]
-            except:
-                ar_coeffs = np.ones(p) * 0.5
+            lags = np.stack([diff_data[:, i:n-p+i] for i in range(p)], axis=2)
+            target = diff_data[:, p:]
+            ar_coeffs = (np.linalg.pinv(lags) @ target[:, :, np.newaxis])[:, :, 0]
+            residuals = target - np.einsum("stp,sp->st", lags, ar_coeffs)
         else:
-            ar_coeffs = np.array([0.5])
+            ar_coeffs = np.full((n_series, max(p, 1)), 0.5)
+            residuals = diff_data[:, p:] if p == 0 else diff_data[:, :0]
         
-        # Generate forecasts
-        forecasts_diff = []
-        last_values = diff_data[-p:].tolist() if p > 0 else [diff_data[-1]]
-        
-        for _ in range(forecast_periods):
+        # Generate forecasts, all series per step
+        history = diff_data[:, -p:] if p > 0 else diff_data[:, -1:]
+        forecasts_diff = np.empty((n_series, forecast_periods))
+        for h in range(forecast_periods):
             if p > 0:
-                next_val = np.dot(ar_coeffs, last_values[-p:])
+                next_val = (ar_coeffs[:, -history.shape[1]:] * history).sum(axis=1)
+                history = np.column_stack([history[:, 1:], next_val])
             else:
-                next_val = last_values[-1]
-            forecasts_diff.append(next_val)
-            last_values.append(next_val)
+                next_val = history[:, -1]
+            forecasts_diff[:, h] = next_val
         
         # Undo differencing
         if d > 0:
-            forecasts = [data[-1]]
-            for fc in forecasts_diff:
-                forecasts.append(forecasts[-1] + fc)
-            forecasts = forecasts[1:]
+            forecast = data[:, -1:] + np.cumsum(forecasts_diff, axis=1)
         else:
-            forecasts = forecasts_diff
+            forecast = forecasts_diff
         
         # Confidence intervals
-        residuals = diff_data[p:] - np.dot(
-            np.column_stack([diff_data[i:n-p+i] for i in range(p)]) if p > 0 else np.zeros((n-p, 1)),
-            ar_coeffs if p > 0 else np.array([0])
-        )
-        std_err = np.std(residuals) if len(residuals) > 0 else np.std(data) * 0.1
-        
-        forecast_results = []
-        for i, fc in enumerate(forecasts):
-            h = i + 1
-            interval_width = 1.96 * std_err * np.sqrt(h)
-            forecast_results.append({
-                "period": h,
-                "forecast": float(fc),
-                "lower_95": float(fc - interval_width),
-                "upper_95": float(fc + interval_width)
-            })
+        if residuals.shape[1] > 0:
+            std_err = residuals.std(axis=1)
+        else:
+            std_err = data.std(axis=1) * 0.1
+        horizons = np.arange(1, forecast_periods + 1)
+        interval_width = 1.96 * std_err[:, np.newaxis] * np.sqrt(horizons)
         
         return {
-            "forecasts": forecast_results,
-            "ar_coefficients": ar_coeffs.tolist(),
+            "forecast": forecast,
+            "lower_95": forecast - interval_width,
+            "upper_95": forecast + interval_width,
+            "ar_coefficients": ar_coeffs,
             "order": {"p": p, "d": d, "q": q},
-            "std_error": float(std_err),
+            "std_error": std_err,
             "model": "arima"
         }
+    
+    def forecast_batch(
+        self,
+        data: np.ndarray,
+        method: str = "exponential_smoothing",
+        forecast_periods: int = 12,
+        **params
+    ) -> Dict[str, Any]:
+        """Forecast every row of a (series x periods) array with one method."""
+        if method == "exponential_smoothing":
+            return self.exponential_smoothing_batch(data, forecast_periods=forecast_periods, **params)
+        if method == "arima":
+            return self.arima_forecast_batch(data, forecast_periods=forecast_periods, **params)
+        raise ValueError(f"Unknown forecasting method: {method}")
+    
+    @staticmethod
+    def series_result(batch: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """One series of a batch result in the single-series result format."""
+        forecast = batch["forecast"][index]
+        lower = batch["lower_95"][index]
+        upper = batch["upper_95"][index]
+        
+        result = {
+            "forecasts": [
+                {
+                    "period": h + 1,
+                    "forecast": float(forecast[h]),
+                    "lower_95": float(lower[h]),
+                    "upper_95": float(upper[h])
+                }
+                for h in range(len(forecast))
+            ]
+        }
+        for key, value in batch.items():
+            if key in ("forecast", "lower_95", "upper_95"):
+                continue
+            if isinstance(value, np.ndarray):
+                row = value[index]
+                value = row.tolist() if row.ndim else float(row)
+            result[key] = value
+        return result
 
 
 # =============================================================================
@@ -1448,3 +1546,4 @@ class MLEngine:
 
 # Singleton instance
 ml_engine = MLEngine()
+
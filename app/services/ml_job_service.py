@@ -9,7 +9,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
-from sqlalchemy import select, func, and_, or_, desc
+from sqlalchemy import select, func, and_, or_, desc, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.ml_job import (
@@ -36,6 +36,10 @@ class MLJobService:
         organization_id: Optional[uuid.UUID] = None,
         parameters: Optional[Dict[str, Any]] = None,
         scheduled_for: Optional[datetime] = None,
+        input_data_source: Optional[str] = None,
+        input_record_count: int = 0,
+        triggered_by_id: Optional[uuid.UUID] = None,
+        trigger_source: str = "manual",
     ) -> MLJob:
         """Create a new ML job."""
         job_id = await self._generate_job_id()
@@ -54,6 +58,10 @@ class MLJobService:
             organization_id=organization_id,
             parameters=parameters or {},
             scheduled_for=scheduled_for,
+            input_data_source=input_data_source,
+            input_record_count=input_record_count,
+            triggered_by_id=triggered_by_id,
+            trigger_source=trigger_source,
             queued_at=datetime.utcnow(),
         )
         
@@ -189,9 +197,11 @@ class MLJobService:
                 (job.completed_at - job.started_at).total_seconds()
             )
         
-        job.results = results or {}
-        job.metrics = metrics or {}
-        job.output_files = output_files
+        job.results_summary = {
+            **(results or {}),
+            "metrics": metrics or {},
+            "output_files": output_files or [],
+        }
         
         await self.db.commit()
         await self.db.refresh(job)
@@ -203,6 +213,7 @@ class MLJobService:
         job_id: uuid.UUID,
         error_message: str,
         error_details: Optional[Dict[str, Any]] = None,
+        error_traceback: Optional[str] = None,
     ) -> MLJob:
         """Mark an ML job as failed."""
         job = await self.get_ml_job(job_id)
@@ -212,7 +223,9 @@ class MLJobService:
         job.status = MLJobStatus.FAILED
         job.completed_at = datetime.utcnow()
         job.error_message = error_message
-        job.error_details = error_details
+        job.error_traceback = error_traceback
+        if error_details:
+            job.results_summary = {**(job.results_summary or {}), "error_details": error_details}
         job.retry_count = (job.retry_count or 0) + 1
         
         await self.db.commit()
@@ -292,6 +305,77 @@ class MLJobService:
         
         return model
     
+    async def register_model(
+        self,
+        name: str,
+        model_type: MLJobType,
+        algorithm: str,
+        artifact_path: str,
+        framework: str = "numpy",
+        version: Optional[str] = None,
+        description: Optional[str] = None,
+        artifact_size_mb: Optional[float] = None,
+        hyperparameters: Optional[Dict[str, Any]] = None,
+        feature_columns: Optional[List[str]] = None,
+        training_data_size: int = 0,
+        training_duration_seconds: Optional[float] = None,
+        activate: bool = False,
+    ) -> MLModel:
+        """
+        Register a trained model artifact as a new version of ``name``.
+        
+        Versions count up per name (1.0.0, 2.0.0, ...). The new version is
+        inactive unless ``activate`` is set, in which case it replaces the
+        currently active version.
+        """
+        if version is None:
+            existing = await self.db.execute(
+                select(func.count(MLModel.id)).where(MLModel.name == name)
+            )
+            version = f"{(existing.scalar() or 0) + 1}.0.0"
+        
+        model = MLModel(
+            model_code=await self._generate_model_code(),
+            name=name,
+            description=description,
+            model_type=model_type,
+            algorithm=algorithm,
+            framework=framework,
+            version=version,
+            is_active=False,
+            trained_at=datetime.utcnow(),
+            training_data_size=training_data_size,
+            training_duration_seconds=training_duration_seconds,
+            artifact_path=artifact_path,
+            artifact_size_mb=artifact_size_mb,
+            hyperparameters=hyperparameters or {},
+            feature_columns=feature_columns,
+        )
+        self.db.add(model)
+        await self.db.flush()
+        
+        if activate:
+            await self._deactivate_other_versions(model)
+            model.is_active = True
+        
+        await self.db.commit()
+        await self.db.refresh(model)
+        
+        if activate:
+            self._invalidate_loaded_model(model.name)
+        
+        return model
+    
+    async def get_active_model(self, name: str) -> Optional[MLModel]:
+        """Get the active version of a named model."""
+        result = await self.db.execute(
+            select(MLModel)
+            .where(MLModel.name == name, MLModel.is_active == True)
+            .order_by(desc(MLModel.trained_at))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+    
     async def get_model(self, model_id: uuid.UUID) -> Optional[MLModel]:
         """Get an ML model by ID."""
         result = await self.db.execute(
@@ -364,12 +448,14 @@ class MLJobService:
         if not model:
             raise ValueError(f"ML model {model_id} not found")
         
+        await self._deactivate_other_versions(model)
         model.is_active = True
         model.last_used_at = datetime.utcnow()
         
         await self.db.commit()
         await self.db.refresh(model)
         
+        self._invalidate_loaded_model(model.name)
         return model
     
     async def deactivate_model(self, model_id: uuid.UUID) -> MLModel:
@@ -383,8 +469,28 @@ class MLJobService:
         await self.db.commit()
         await self.db.refresh(model)
         
+        self._invalidate_loaded_model(model.name)
         return model
     
+    async def _deactivate_other_versions(self, model: MLModel):
+        """Only one version of a named model is active at a time."""
+        await self.db.execute(
+            update(MLModel)
+            .where(MLModel.name == model.name, MLModel.id != model.id)
+            .values(is_active=False)
+        )
+    
+    def _invalidate_loaded_model(self, name: str):
+        """Drop this process's loaded copy; other processes re-check on their own."""
+        from app.services.ml_model_registry import get_active_model_cache
+        get_active_model_cache().invalidate(name)
+    
+    async def _generate_model_code(self) -> str:
+        """Generate a unique model code."""
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        random_suffix = uuid.uuid4().hex[:6].upper()
+        return f"MDL-{timestamp}-{random_suffix}"
+    
     async def _generate_job_id(self) -> str:
         """Generate a unique job ID."""
         timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
@@ -0,0 +1,224 @@
+"""
+TekVwarho ProAudit - ML Model Registry Artifacts
+
+Trained weights are stored as uncompressed NumPy .npz archives through
+FileStorageService and registered as MLModel rows (see MLJobService).
+
+Inference processes load the active version of a model lazily and
+memory-map its arrays straight out of the archive, so weights are paged in
+on demand and shared between worker processes through the page cache. Each
+process re-checks which version is active at most every
+``ml_model_refresh_seconds`` and swaps to the new artifact when it changes;
+activating a version in this process takes effect immediately.
+"""
+
+import io
+import logging
+import os
+import struct
+import threading
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.ml_job import MLModel
+
+logger = logging.getLogger(__name__)
+
+
+ARTIFACT_CONTENT_TYPE = "application/x-npz"
+
+# Fixed part of a zip local file header; name and extra lengths are its last fields
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+# ===========================================
+# NPZ ARTIFACTS
+# ===========================================
+
+def dump_npz(arrays: Dict[str, np.ndarray]) -> bytes:
+    """Serialize arrays to an uncompressed .npz (members stay mappable)."""
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def load_npz(content: bytes) -> Dict[str, np.ndarray]:
+    """Read every array of an in-memory .npz archive."""
+    with np.load(io.BytesIO(content), allow_pickle=False) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+def load_npz_mmap(path: Path) -> Dict[str, np.ndarray]:
+    """
+    Memory-map each array of an .npz archive read-only.
+
+    ``np.load(mmap_mode=...)`` ignores mmap_mode for .npz files, so the data
+    offset of each stored member is located from its zip and .npy headers.
+    Compressed or empty members are read into memory instead.
+    """
+    path = Path(path)
+    arrays: Dict[str, np.ndarray] = {}
+    with open(path, "rb") as raw, zipfile.ZipFile(raw) as archive:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            with archive.open(info) as member:
+                version = np.lib.format.read_magic(member)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(member)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(member)
+                npy_header_size = member.tell()
+
+                if info.compress_type != zipfile.ZIP_STORED or dtype.hasobject or 0 in shape:
+                    arrays[name] = np.lib.format.read_array(archive.open(info), allow_pickle=False)
+                    continue
+
+            raw.seek(info.header_offset)
+            local_header = _LOCAL_HEADER.unpack(raw.read(_LOCAL_HEADER.size))
+            name_length, extra_length = local_header[-2], local_header[-1]
+            offset = (
+                info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+                + npy_header_size
+            )
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+# ===========================================
+# ACTIVE MODEL CACHE
+# ===========================================
+
+@dataclass
+class LoadedModel:
+    """The active version of a named model, mapped into this process."""
+    model_id: uuid.UUID
+    name: str
+    version: str
+    algorithm: str
+    arrays: Dict[str, np.ndarray]
+    hyperparameters: Dict[str, Any] = field(default_factory=dict)
+    feature_columns: List[str] = field(default_factory=list)
+    loaded_at: float = field(default_factory=time.time)
+
+
+class ActiveModelCache:
+    """
+    Per-process cache of the active version of each named model.
+
+    A lookup costs nothing while the entry is fresh; after
+    ``refresh_seconds`` one indexed query checks the active version id, and
+    the artifact is only mapped again when that id changed.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None, storage=None):
+        self.pid = os.getpid()
+        self.refresh_seconds = (
+            settings.ml_model_refresh_seconds if refresh_seconds is None else refresh_seconds
+        )
+        self._storage = storage
+        self._models: Dict[str, LoadedModel] = {}
+        self._checked_at: Dict[str, float] = {}
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from app.services.file_storage_service import FileStorageService
+            self._storage = FileStorageService()
+        return self._storage
+
+    async def get(self, db: AsyncSession, name: str) -> Optional[LoadedModel]:
+        """The active version of ``name``, or None if none is active."""
+        loaded = self._models.get(name)
+        now = time.monotonic()
+        if loaded is not None and now - self._checked_at.get(name, 0.0) < self.refresh_seconds:
+            return loaded
+
+        result = await db.execute(
+            select(
+                MLModel.id, MLModel.version, MLModel.algorithm, MLModel.artifact_path,
+                MLModel.hyperparameters, MLModel.feature_columns,
+            )
+            .where(
+                MLModel.name == name,
+                MLModel.is_active == True,
+                MLModel.artifact_path.isnot(None),
+            )
+            .order_by(desc(MLModel.trained_at))
+            .limit(1)
+        )
+        row = result.first()
+        self._checked_at[name] = now
+
+        if row is None:
+            self._models.pop(name, None)
+            return None
+        if loaded is not None and loaded.model_id == row.id:
+            return loaded
+
+        path = await self._artifact_file(row.id, row.artifact_path)
+        loaded = LoadedModel(
+            model_id=row.id,
+            name=name,
+            version=row.version,
+            algorithm=row.algorithm,
+            arrays=load_npz_mmap(path),
+            hyperparameters=row.hyperparameters or {},
+            feature_columns=row.feature_columns or [],
+        )
+        self._models[name] = loaded
+        logger.info(f"Loaded model {name} v{row.version} ({row.id}) from {path}")
+        return loaded
+
+    def invalidate(self, name: Optional[str] = None):
+        """Force the next lookup of ``name`` (or of every model) to re-check."""
+        if name is None:
+            self._checked_at.clear()
+        else:
+            self._checked_at.pop(name, None)
+
+    def loaded(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"model_id": str(m.model_id), "version": m.version, "loaded_at": m.loaded_at}
+            for name, m in self._models.items()
+        }
+
+    async def _artifact_file(self, model_id: uuid.UUID, artifact_path: str) -> Path:
+        """Local file for an artifact; remote artifacts are downloaded once."""
+        local = self.storage.get_local_path(artifact_path)
+        if local is not None:
+            return local
+
+        cache_dir = Path(settings.ml_model_cache_dir)
+        path = cache_dir / f"{model_id}.npz"
+        if not path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            content, _ = await self.storage.download_file(artifact_path)
+            partial = path.with_suffix(f".{os.getpid()}.tmp")
+            partial.write_bytes(content)
+            os.replace(partial, path)
+        return path
+
+
+_cache: Optional[ActiveModelCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_active_model_cache() -> ActiveModelCache:
+    """Get this process's active model cache (rebuilt after fork)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None or _cache.pid != os.getpid():
+            _cache = ActiveModelCache()
+        return _cache
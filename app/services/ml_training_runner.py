@@ -0,0 +1,257 @@
+"""
+TekVwarho ProAudit - ML Training Job Runner
+
+Runs neural network training as an MLJob instead of inside a request:
+
+1. ``enqueue_neural_network_training`` stores the training matrix as an
+   .npz in FileStorageService, creates a QUEUED MLJob pointing at it and
+   hands the job id to the ``train_ml_model_task`` Celery task.
+2. ``run_training_job`` (inside the Celery worker) trains on a thread while
+   the event loop reports epoch progress through
+   ``MLJobService.update_progress``, then stores the weights as an .npz
+   artifact and registers them as a new MLModel version.
+
+A job cancelled while it trains stops at the next epoch.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.ml_job import MLJob, MLJobStatus, MLJobType
+from app.services.file_storage_service import FileCategory, FileStorageService
+from app.services.ml_engine import SimpleNeuralNetwork
+from app.services.ml_job_service import MLJobService
+from app.services.ml_model_registry import ARTIFACT_CONTENT_TYPE, dump_npz, load_npz
+
+logger = logging.getLogger(__name__)
+
+
+NEURAL_NETWORK_ALGORITHM = "SimpleNeuralNetwork"
+
+# Storage namespace for artifacts that belong to no organization
+PLATFORM_STORAGE_ID = uuid.UUID(int=0)
+
+
+class TrainingCancelled(Exception):
+    """Raised inside the training thread when the job was cancelled."""
+
+
+class TrainingProgress:
+    """Epoch progress shared between the training thread and the event loop."""
+
+    def __init__(self, epochs: int):
+        self.epochs = epochs
+        self.epoch = 0
+        self.loss: Optional[float] = None
+        self.cancelled = threading.Event()
+
+    def record(self, epoch: int, loss: float):
+        self.epoch = epoch + 1
+        self.loss = loss
+        if self.cancelled.is_set():
+            raise TrainingCancelled()
+
+    @property
+    def percent(self) -> int:
+        # Training is 5-90%; loading and saving take the rest
+        return 5 + int(85 * self.epoch / max(self.epochs, 1))
+
+    @property
+    def step(self) -> str:
+        loss = f", loss {self.loss:.6f}" if self.loss is not None else ""
+        return f"Training epoch {self.epoch}/{self.epochs}{loss}"
+
+
+def registry_model_name(model_name: str, organization_id: Optional[uuid.UUID] = None) -> str:
+    """Registry name of an organization's model (platform models are unprefixed)."""
+    if organization_id is None:
+        return model_name
+    return f"org:{organization_id}/{model_name}"
+
+
+def build_training_matrix(
+    training_data: List[Dict[str, Any]],
+    target_field: str,
+    feature_fields: List[str],
+) -> Dict[str, np.ndarray]:
+    """Feature matrix X and target column y from request records."""
+    X = np.array(
+        [[float(item.get(f, 0)) for f in feature_fields] for item in training_data],
+        dtype=np.float64,
+    ).reshape(len(training_data), len(feature_fields))
+    y = np.array(
+        [float(item.get(target_field, 0)) for item in training_data], dtype=np.float64
+    ).reshape(-1, 1)
+    return {"X": X, "y": y}
+
+
+# ===========================================
+# ENQUEUE
+# ===========================================
+
+async def enqueue_neural_network_training(
+    db: AsyncSession,
+    model_name: str,
+    training_data: List[Dict[str, Any]],
+    target_field: str,
+    feature_fields: List[str],
+    epochs: int = 500,
+    hidden_layers: Optional[List[int]] = None,
+    organization_id: Optional[uuid.UUID] = None,
+    triggered_by_id: Optional[uuid.UUID] = None,
+    activate: bool = True,
+    storage: Optional[FileStorageService] = None,
+) -> MLJob:
+    """Store the training data, create a QUEUED job and dispatch it."""
+    from app.tasks.celery_tasks import train_ml_model_task
+
+    storage = storage or FileStorageService()
+    dataset = await storage.upload_file(
+        entity_id=organization_id or PLATFORM_STORAGE_ID,
+        file_content=dump_npz(build_training_matrix(training_data, target_field, feature_fields)),
+        filename=f"{model_name}_training.npz",
+        content_type=ARTIFACT_CONTENT_TYPE,
+        category=FileCategory.ML_DATASET,
+    )
+
+    service = MLJobService(db)
+    job = await service.create_ml_job(
+        job_type=MLJobType.MODEL_TRAINING,
+        job_name=f"Train {model_name}",
+        organization_id=organization_id,
+        parameters={
+            "model_name": registry_model_name(model_name, organization_id),
+            "algorithm": NEURAL_NETWORK_ALGORITHM,
+            "target_field": target_field,
+            "feature_fields": feature_fields,
+            "epochs": epochs,
+            "hidden_layers": hidden_layers or [16, 8],
+            "activate": activate,
+        },
+        input_data_source=dataset["file_id"],
+        input_record_count=len(training_data),
+        triggered_by_id=triggered_by_id,
+        trigger_source="api",
+    )
+
+    try:
+        train_ml_model_task.delay(str(job.id))
+    except Exception as e:
+        logger.error(f"Could not dispatch training job {job.job_id}: {e}")
+        await service.fail_job(job.id, f"Could not dispatch training job: {e}")
+        raise
+    return job
+
+
+# ===========================================
+# RUN
+# ===========================================
+
+async def run_training_job(
+    db: AsyncSession,
+    job_id: uuid.UUID,
+    worker_id: Optional[str] = None,
+    storage: Optional[FileStorageService] = None,
+) -> Dict[str, Any]:
+    """Train, store and register the model for a QUEUED training job."""
+    service = MLJobService(db)
+    storage = storage or FileStorageService()
+    job = await service.start_job(job_id, worker_id)
+    params = dict(job.parameters or {})
+    model_name = params["model_name"]
+    epochs = int(params.get("epochs", 500))
+    started = time.perf_counter()
+
+    try:
+        await service.update_progress(job_id, 1, "Loading training data")
+        content, _ = await storage.download_file(job.input_data_source)
+        data = load_npz(content)
+        X, y = data["X"], data["y"]
+
+        network = SimpleNeuralNetwork(
+            layer_sizes=[X.shape[1], *params.get("hidden_layers", [16, 8]), 1],
+            activation="relu",
+            learning_rate=0.01,
+            epochs=epochs,
+        )
+        progress = TrainingProgress(epochs)
+        loop = asyncio.get_running_loop()
+        training = loop.run_in_executor(None, lambda: network.fit(X, y, False, progress.record))
+
+        while True:
+            done, _ = await asyncio.wait(
+                {training}, timeout=settings.ml_training_progress_interval_seconds
+            )
+            if done:
+                break
+            job = await service.update_progress(job_id, progress.percent, progress.step)
+            if job.status == MLJobStatus.CANCELLED:
+                progress.cancelled.set()
+        history = training.result()
+        final_loss = float(history["loss"][-1]) if history["loss"] else 0.0
+
+        await service.update_progress(job_id, 92, "Saving model artifact")
+        artifact = dump_npz(network.to_arrays())
+        stored = await storage.upload_file(
+            entity_id=job.organization_id or PLATFORM_STORAGE_ID,
+            file_content=artifact,
+            filename=f"{model_name.rsplit('/', 1)[-1]}.npz",
+            content_type=ARTIFACT_CONTENT_TYPE,
+            category=FileCategory.ML_MODEL,
+        )
+
+        model = await service.register_model(
+            name=model_name,
+            model_type=MLJobType.MODEL_TRAINING,
+            algorithm=NEURAL_NETWORK_ALGORITHM,
+            artifact_path=stored["file_id"],
+            artifact_size_mb=round(len(artifact) / (1024 * 1024), 4),
+            hyperparameters={
+                "layer_sizes": network.layer_sizes,
+                "activation": network.activation,
+                "learning_rate": network.learning_rate,
+                "epochs": epochs,
+                "target_field": params.get("target_field"),
+            },
+            feature_columns=params.get("feature_fields"),
+            training_data_size=int(X.shape[0]),
+            training_duration_seconds=round(time.perf_counter() - started, 3),
+            activate=bool(params.get("activate", True)),
+        )
+
+        job = await service.get_ml_job(job_id)
+        job.model_id = model.id
+        job.output_record_count = int(X.shape[0])
+        await service.complete_job(
+            job_id,
+            results={"model_id": str(model.id), "model_version": model.version},
+            metrics={"final_loss": final_loss, "epochs_trained": len(history["loss"])},
+            output_files=[stored["file_id"]],
+        )
+        logger.info(f"Training job {job.job_id} registered {model_name} v{model.version}")
+        return {
+            "success": True,
+            "job_id": str(job_id),
+            "model_id": str(model.id),
+            "model_version": model.version,
+            "final_loss": final_loss,
+        }
+
+    except TrainingCancelled:
+        logger.info(f"Training job {job_id} cancelled")
+        return {"success": False, "job_id": str(job_id), "error": "cancelled"}
+
+    except Exception as e:
+        logger.error(f"Training job {job_id} failed: {e}")
+        await db.rollback()
+        await service.fail_job(job_id, str(e), error_traceback=traceback.format_exc())
+        return {"success": False, "job_id": str(job_id), "error": str(e)}
@@ -3,14 +3,20 @@ TekVwarho ProAudit - Notification Service
 
 Handles in-app notifications and email alerts.
 Fully integrated with database for persistent notification storage.
+
+Bulk fan-out (scheduled tasks): build BulkNotification tuples of
+(recipient, template, payload) and pass them to notify_bulk(). Recipients
+are resolved with one join, rows are written with multi-row INSERTs, and
+emails go out through EmailService.send_batch().
 """
 
 import uuid
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
-from sqlalchemy import select, and_, update, func, delete
+from sqlalchemy import select, and_, update, func, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -20,14 +26,138 @@ from app.models.notification import (
     NotificationPriority,
     NotificationChannel,
 )
+from app.models.user import User, UserEntityAccess
 from app.services.email_service import EmailService, EmailMessage
+from app.utils.query_optimization import keyset_paginate
 
 logger = logging.getLogger(__name__)
 
 
+# ===========================================
+# BULK NOTIFICATION TYPES
+# ===========================================
+
+@dataclass(frozen=True)
+class EntityAudience:
+    """All active users with access to a business entity."""
+    entity_id: uuid.UUID
+
+
+@dataclass(frozen=True)
+class OrganizationAudience:
+    """All active users of an organization."""
+    organization_id: uuid.UUID
+
+
+Recipient = Union[uuid.UUID, EntityAudience, OrganizationAudience]
+
+
+@dataclass(frozen=True)
+class NotificationTemplate:
+    """Renders notification content from a payload dict."""
+    notification_type: Callable[[Dict[str, Any]], NotificationType]
+    title: str
+    message: Callable[[Dict[str, Any]], str]
+    priority: Callable[[Dict[str, Any]], NotificationPriority] = (
+        lambda payload: NotificationPriority.NORMAL
+    )
+    action_url: Optional[str] = None
+    action_label: Optional[str] = None
+    
+    def render(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Return column values for a notification row."""
+        return {
+            "notification_type": self.notification_type(payload),
+            "priority": self.priority(payload),
+            "title": self.title.format(**payload),
+            "message": self.message(payload),
+            "action_url": self.action_url.format(**payload) if self.action_url else None,
+            "action_label": self.action_label,
+        }
+
+
+NOTIFICATION_TEMPLATES: Dict[str, NotificationTemplate] = {
+    "invoice_overdue": NotificationTemplate(
+        notification_type=lambda p: NotificationType.INVOICE_OVERDUE,
+        priority=lambda p: NotificationPriority.HIGH,
+        title="Invoice Overdue",
+        message=lambda p: (
+            f"Invoice {p['invoice_number']} for {p['customer_name']} "
+            f"(₦{p['amount']:,.2f}) is {p['days_overdue']} days overdue."
+        ),
+        action_url="/invoices?search={invoice_number}",
+        action_label="View Invoice",
+    ),
+    "low_stock": NotificationTemplate(
+        notification_type=lambda p: NotificationType.LOW_STOCK_ALERT,
+        priority=lambda p: NotificationPriority.HIGH,
+        title="Low Stock Alert",
+        message=lambda p: (
+            f"{p['item_name']} is running low. Current stock: {p['current_stock']} "
+            f"(Reorder at: {p['reorder_level']})"
+        ),
+        action_url="/inventory?filter=low_stock",
+        action_label="View Inventory",
+    ),
+    "vat_reminder": NotificationTemplate(
+        notification_type=lambda p: NotificationType.VAT_REMINDER,
+        priority=lambda p: (
+            NotificationPriority.URGENT if p["days_until"] <= 3 else NotificationPriority.HIGH
+        ),
+        title="VAT Filing Reminder",
+        message=lambda p: (
+            f"VAT return for {p['period']} is due on {p['deadline']} "
+            f"({p['days_until']} days remaining)."
+            + (f" Estimated VAT: ₦{p['vat_amount']:,.2f}" if p.get("vat_amount") else "")
+        ),
+        action_url="/reports?tab=tax",
+        action_label="View VAT Report",
+    ),
+    "paye_reminder": NotificationTemplate(
+        notification_type=lambda p: NotificationType.PAYE_REMINDER,
+        title="PAYE Filing Reminder",
+        message=lambda p: (
+            f"PAYE remittance for {p['period']} is due on {p['deadline']} "
+            f"({p['days_until']} days remaining)."
+        ),
+        action_url="/reports?tab=tax",
+        action_label="View PAYE Report",
+    ),
+    "usage_alert": NotificationTemplate(
+        notification_type=lambda p: {
+            "100": NotificationType.WARNING,
+            "90": NotificationType.WARNING,
+        }.get(p["threshold"], NotificationType.INFO),
+        priority=lambda p: {
+            "100": NotificationPriority.URGENT,
+            "90": NotificationPriority.HIGH,
+        }.get(p["threshold"], NotificationPriority.NORMAL),
+        title="Usage Alert: {metric_name}",
+        message=lambda p: p["message"],
+    ),
+}
+
+
+class BulkNotification(NamedTuple):
+    """
+    One (recipient, template, payload) item for NotificationService.notify_bulk.
+    
+    ``recipient`` is a user id or an audience that expands to many users.
+    ``entity_id`` defaults to the audience's entity when there is one.
+    """
+    recipient: Recipient
+    template: str
+    payload: Dict[str, Any]
+    entity_id: Optional[uuid.UUID] = None
+    send_email: bool = False
+
+
 class NotificationService:
     """Service for managing notifications with full database integration."""
     
+    # Listing sort key, newest first; backed by ix_notifications_user_created_id
+    PAGE_KEY = (NotificationModel.created_at, NotificationModel.id)
+    
     def __init__(self, db: AsyncSession):
         self.db = db
         self.email_service = EmailService()
@@ -134,10 +264,14 @@ class NotificationService:
         priority: Optional[NotificationPriority] = None,
         limit: int = 50,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[NotificationModel], int]:
         """
         Get notifications for a user with optional filters.
         
+        Pass the cursor of the previous page to page by key instead of
+        offset (offset is then ignored).
+        
         Returns:
             Tuple of (notifications, total_count)
         """
@@ -177,12 +311,9 @@ class NotificationService:
         total = count_result.scalar() or 0
         
         # Apply pagination and ordering
-        query = (
-            query
-            .order_by(NotificationModel.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
+        query = keyset_paginate(query, self.PAGE_KEY, cursor, limit)
+        if not cursor:
+            query = query.offset(offset)
         
         result = await self.db.execute(query)
         notifications = list(result.scalars().all())
@@ -329,6 +460,156 @@ class NotificationService:
         preferences.update(kwargs)
         return preferences
     
+    # ===========================================
+    # BULK FAN-OUT
+    # ===========================================
+    
+    # Rows per multi-row INSERT / IN-list chunk (asyncpg caps bind params at 32767)
+    BULK_CHUNK_SIZE = 1000
+    
+    async def _resolve_recipients(
+        self,
+        items: List[BulkNotification],
+    ) -> Dict[Recipient, List[Tuple[uuid.UUID, Optional[str]]]]:
+        """Expand every recipient to active (user_id, email) pairs in one query per kind."""
+        entity_ids = {i.recipient.entity_id for i in items if isinstance(i.recipient, EntityAudience)}
+        org_ids = {i.recipient.organization_id for i in items if isinstance(i.recipient, OrganizationAudience)}
+        user_ids = {i.recipient for i in items if isinstance(i.recipient, uuid.UUID)}
+        
+        resolved: Dict[Recipient, List[Tuple[uuid.UUID, Optional[str]]]] = {}
+        
+        async def _collect(query_for, keys, wrap):
+            keys = list(keys)
+            for start in range(0, len(keys), self.BULK_CHUNK_SIZE):
+                result = await self.db.execute(query_for(keys[start:start + self.BULK_CHUNK_SIZE]))
+                for key, user_id, email in result.all():
+                    resolved.setdefault(wrap(key), []).append((user_id, email))
+        
+        if entity_ids:
+            await _collect(
+                lambda chunk: (
+                    select(UserEntityAccess.entity_id, User.id, User.email)
+                    .join(User, User.id == UserEntityAccess.user_id)
+                    .where(UserEntityAccess.entity_id.in_(chunk))
+                    .where(User.is_active == True)
+                ),
+                entity_ids,
+                EntityAudience,
+            )
+        if org_ids:
+            await _collect(
+                lambda chunk: (
+                    select(User.organization_id, User.id, User.email)
+                    .where(User.organization_id.in_(chunk))
+                    .where(User.is_active == True)
+                ),
+                org_ids,
+                OrganizationAudience,
+            )
+        if user_ids:
+            await _collect(
+                lambda chunk: (
+                    select(User.id, User.id, User.email)
+                    .where(User.id.in_(chunk))
+                    .where(User.is_active == True)
+                ),
+                user_ids,
+                lambda key: key,
+            )
+        
+        return resolved
+    
+    async def notify_bulk(
+        self,
+        items: Iterable[Union[BulkNotification, Tuple]],
+        commit: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Create many notifications with a constant number of round trips.
+        
+        Args:
+            items: BulkNotification (or plain (recipient, template, payload)) tuples
+            commit: Commit when done (pass False to join the caller's transaction)
+        
+        Returns:
+            Counts of notifications created and emails sent/failed
+        """
+        items = [i if isinstance(i, BulkNotification) else BulkNotification(*i) for i in items]
+        if not items:
+            return {"notifications_created": 0, "emails_sent": 0, "emails_failed": 0}
+        
+        recipients = await self._resolve_recipients(items)
+        
+        rows: List[Dict[str, Any]] = []
+        emails: List[Tuple[uuid.UUID, EmailMessage]] = []
+        
+        for item in items:
+            template = NOTIFICATION_TEMPLATES[item.template]
+            content = template.render(item.payload)
+            entity_id = item.entity_id or (
+                item.recipient.entity_id if isinstance(item.recipient, EntityAudience) else None
+            )
+            
+            for user_id, email in recipients.get(item.recipient, []):
+                notification_id = uuid.uuid4()
+                rows.append({
+                    "id": notification_id,
+                    "user_id": user_id,
+                    "entity_id": entity_id,
+                    "channels": ["in_app", "email"] if item.send_email else ["in_app"],
+                    "extra_data": item.payload,
+                    "is_read": False,
+                    "email_sent": False,
+                    **content,
+                })
+                if item.send_email and email:
+                    emails.append((notification_id, self._render_email(content, email)))
+        
+        for start in range(0, len(rows), self.BULK_CHUNK_SIZE):
+            await self.db.execute(
+                insert(NotificationModel).values(rows[start:start + self.BULK_CHUNK_SIZE])
+            )
+        
+        emails_sent = 0
+        if emails:
+            results = await self.email_service.send_batch([message for _, message in emails])
+            sent_ids = [notification_id for (notification_id, _), ok in zip(emails, results) if ok]
+            emails_sent = len(sent_ids)
+            now = datetime.utcnow()
+            for start in range(0, len(sent_ids), self.BULK_CHUNK_SIZE):
+                await self.db.execute(
+                    update(NotificationModel)
+                    .where(NotificationModel.id.in_(sent_ids[start:start + self.BULK_CHUNK_SIZE]))
+                    .values(email_sent=True, email_sent_at=now)
+                )
+        
+        if commit:
+            await self.db.commit()
+        
+        logger.info(
+            f"Bulk notifications: {len(rows)} created from {len(items)} items, "
+            f"{emails_sent}/{len(emails)} emails sent"
+        )
+        return {
+            "notifications_created": len(rows),
+            "emails_sent": emails_sent,
+            "emails_failed": len(emails) - emails_sent,
+        }
+    
+    @staticmethod
+    def _render_email(content: Dict[str, Any], email_address: str) -> EmailMessage:
+        """Render the email counterpart of a notification."""
+        action_url = content["action_url"]
+        return EmailMessage(
+            to=[email_address],
+            subject=content["title"],
+            body_text=content["message"],
+            body_html=f"<p>{content['message']}</p>" + (
+                f'<p><a href="{action_url}">{content["action_label"] or "View Details"}</a></p>'
+                if action_url else ""
+            ),
+        )
+    
     # ===========================================
     # CONVENIENCE METHODS FOR SPECIFIC NOTIFICATIONS
     # ===========================================
@@ -344,23 +625,19 @@ class NotificationService:
         email_address: Optional[str] = None,
     ) -> NotificationModel:
         """Send invoice overdue notification."""
+        payload = {
+            "invoice_number": invoice_number,
+            "customer_name": customer_name,
+            "amount": amount,
+            "days_overdue": days_overdue,
+        }
         return await self.create_notification(
             user_id=user_id,
             entity_id=entity_id,
-            notification_type=NotificationType.INVOICE_OVERDUE,
-            priority=NotificationPriority.HIGH,
-            title="Invoice Overdue",
-            message=f"Invoice {invoice_number} for {customer_name} (₦{amount:,.2f}) is {days_overdue} days overdue.",
-            action_url=f"/invoices?search={invoice_number}",
-            action_label="View Invoice",
-            metadata={
-                "invoice_number": invoice_number,
-                "customer_name": customer_name,
-                "amount": amount,
-                "days_overdue": days_overdue,
-            },
+            metadata=payload,
             send_email=email_address is not None,
             email_address=email_address,
+            **NOTIFICATION_TEMPLATES["invoice_overdue"].render(payload),
         )
     
     async def notify_low_stock(
@@ -373,21 +650,17 @@ class NotificationService:
         item_id: Optional[uuid.UUID] = None,
     ) -> NotificationModel:
         """Send low stock notification."""
+        payload = {
+            "item_id": str(item_id) if item_id else None,
+            "item_name": item_name,
+            "current_stock": current_stock,
+            "reorder_level": reorder_level,
+        }
         return await self.create_notification(
             user_id=user_id,
             entity_id=entity_id,
-            notification_type=NotificationType.LOW_STOCK_ALERT,
-            priority=NotificationPriority.HIGH,
-            title="Low Stock Alert",
-            message=f"{item_name} is running low. Current stock: {current_stock} (Reorder at: {reorder_level})",
-            action_url="/inventory?filter=low_stock",
-            action_label="View Inventory",
-            metadata={
-                "item_id": str(item_id) if item_id else None,
-                "item_name": item_name,
-                "current_stock": current_stock,
-                "reorder_level": reorder_level,
-            },
+            metadata=payload,
+            **NOTIFICATION_TEMPLATES["low_stock"].render(payload),
         )
     
     async def notify_vat_reminder(
@@ -401,27 +674,19 @@ class NotificationService:
         email_address: Optional[str] = None,
     ) -> NotificationModel:
         """Send VAT filing reminder."""
-        priority = NotificationPriority.URGENT if days_until <= 3 else NotificationPriority.HIGH
-        
+        payload = {
+            "period": period,
+            "deadline": deadline,
+            "days_until": days_until,
+            "vat_amount": vat_amount,
+        }
         return await self.create_notification(
             user_id=user_id,
             entity_id=entity_id,
-            notification_type=NotificationType.VAT_REMINDER,
-            priority=priority,
-            title="VAT Filing Reminder",
-            message=f"VAT return for {period} is due on {deadline} ({days_until} days remaining)." + (
-                f" Estimated VAT: ₦{vat_amount:,.2f}" if vat_amount else ""
-            ),
-            action_url="/reports?tab=tax",
-            action_label="View VAT Report",
-            metadata={
-                "period": period,
-                "deadline": deadline,
-                "days_until": days_until,
-                "vat_amount": vat_amount,
-            },
+            metadata=payload,
             send_email=email_address is not None,
             email_address=email_address,
+            **NOTIFICATION_TEMPLATES["vat_reminder"].render(payload),
         )
     
     async def notify_nrs_success(
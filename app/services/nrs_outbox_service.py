@@ -0,0 +1,297 @@
+"""
+TekVwarho ProAudit - NRS Submission Outbox
+
+Decouples invoice finalization from the NRS API.
+
+Finalizing (or resubmitting) an invoice only writes an NRSOutbox row in
+the same transaction (enqueue_nrs_submission), so the request never waits
+on NRS. Dispatchers - the nrs_dispatch_outbox_task Celery task, as many in
+parallel as there are workers on the "nrs" queue - drain the outbox:
+
+1. Claim a batch of due PENDING rows with SELECT ... FOR UPDATE SKIP LOCKED,
+   so concurrent dispatchers get disjoint batches without waiting on each
+   other; push their next_attempt_at forward by a lease and commit.
+2. Submit the invoices concurrently through the pooled NRS client.
+3. Record every outcome in one transaction: the IRN on the invoice and the
+   row DELIVERED, the invoice REJECTED when NRS refuses it, or the row
+   rescheduled with exponential backoff and full jitter.
+4. Publish the outcome to the organization over WebSockets (through the
+   Redis relay, since dispatchers run outside the web process).
+"""
+
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.nrs_outbox import NRSOutbox, NRSOutboxStatus
+
+logger = logging.getLogger(__name__)
+
+# NRS refused the invoice itself; resubmitting the same payload cannot succeed
+PERMANENT_STATUS_CODES = frozenset({400, 409, 422})
+
+
+def backoff_delay(attempts: int, base: Optional[float] = None, cap: Optional[float] = None,
+                  rng: random.Random = random) -> float:
+    """
+    Seconds to wait after failed attempt number `attempts` (1-based).
+
+    Full jitter: uniform over [0, min(cap, base * 2**(attempts - 1))], which
+    spreads the retries of invoices that failed together.
+    """
+    base = settings.nrs_outbox_backoff_base_seconds if base is None else base
+    cap = settings.nrs_outbox_backoff_max_seconds if cap is None else cap
+    return rng.uniform(0, min(cap, base * 2 ** min(attempts - 1, 32)))
+
+
+def is_permanent_failure(response) -> bool:
+    """True when NRS rejected the invoice rather than failing to process it."""
+    raw = response.raw_response or {}
+    return raw.get("status_code") in PERMANENT_STATUS_CODES
+
+
+async def enqueue_nrs_submission(
+    db: AsyncSession,
+    invoice: Invoice,
+    requested_by_id=None,
+) -> NRSOutbox:
+    """
+    Queue an invoice for NRS submission in the caller's transaction.
+
+    The caller commits. An invoice that is already queued keeps its row,
+    which is made due immediately.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(NRSOutbox)
+        .where(NRSOutbox.invoice_id == invoice.id)
+        .where(NRSOutbox.status == NRSOutboxStatus.PENDING)
+    )
+    row = result.scalar_one_or_none()
+    if row is not None:
+        row.next_attempt_at = now
+        return row
+
+    row = NRSOutbox(
+        invoice_id=invoice.id,
+        entity_id=invoice.entity_id,
+        requested_by_id=requested_by_id,
+        status=NRSOutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=now,
+    )
+    db.add(row)
+    return row
+
+
+def wake_nrs_dispatcher():
+    """
+    Ask a dispatcher to drain the outbox now.
+
+    Best effort: if the broker is unreachable the beat schedule picks the
+    rows up within a minute.
+    """
+    try:
+        from app.tasks.celery_tasks import nrs_dispatch_outbox_task
+        nrs_dispatch_outbox_task.apply_async(retry=False)
+    except Exception as e:
+        logger.warning(f"Could not wake the NRS outbox dispatcher: {e}")
+
+
+@dataclass
+class DispatchResult:
+    """Outcome counts of dispatcher passes."""
+    claimed: int = 0
+    delivered: int = 0
+    rejected: int = 0
+    retried: int = 0
+    skipped: int = 0
+
+    def add(self, other: "DispatchResult"):
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class NRSOutboxDispatcher:
+    """Claims, submits and settles batches of NRS outbox rows."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        nrs_client=None,
+        broadcaster=None,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        from app.services.nrs_service import get_nrs_client
+        from app.services.websocket_manager import get_relay_broadcaster
+
+        self.db = db
+        self.nrs_client = nrs_client or get_nrs_client()
+        self.broadcaster = broadcaster or get_relay_broadcaster()
+        self.batch_size = batch_size or settings.nrs_outbox_batch_size
+        self.max_attempts = max_attempts or settings.nrs_outbox_max_attempts
+
+    @staticmethod
+    def claim_statement(batch_size: int):
+        """Due PENDING rows, oldest first, skipping rows other dispatchers hold."""
+        return (
+            select(NRSOutbox)
+            .where(NRSOutbox.status == NRSOutboxStatus.PENDING)
+            .where(NRSOutbox.next_attempt_at <= func.now())
+            .order_by(NRSOutbox.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def claim(self) -> List[Tuple[NRSOutbox, Optional[Invoice]]]:
+        """Lease a batch of rows with their invoices, in one short transaction."""
+        result = await self.db.execute(self.claim_statement(self.batch_size))
+        rows = result.scalars().all()
+        if not rows:
+            await self.db.commit()
+            return []
+
+        lease_until = datetime.now(timezone.utc) + timedelta(seconds=settings.nrs_outbox_lease_seconds)
+        for row in rows:
+            row.attempts += 1
+            row.next_attempt_at = lease_until
+
+        result = await self.db.execute(
+            select(Invoice)
+            .options(
+                selectinload(Invoice.entity),
+                selectinload(Invoice.customer),
+                selectinload(Invoice.line_items),
+            )
+            .where(Invoice.id.in_([row.invoice_id for row in rows]))
+        )
+        invoices = {invoice.id: invoice for invoice in result.scalars().all()}
+        await self.db.commit()
+        return [(row, invoices.get(row.invoice_id)) for row in rows]
+
+    async def dispatch_batch(self) -> DispatchResult:
+        """Claim one batch, submit it and record the outcomes."""
+        from app.services.invoice_service import InvoiceService
+
+        claimed = await self.claim()
+        outcome = DispatchResult(claimed=len(claimed))
+        events: List[Tuple[Invoice, Optional[str]]] = []
+        submissions = []
+
+        for row, invoice in claimed:
+            if invoice is None or invoice.status != InvoiceStatus.PENDING or invoice.nrs_irn:
+                row.status = NRSOutboxStatus.FAILED
+                row.last_error = "Invoice is no longer pending NRS submission"
+                outcome.skipped += 1
+                continue
+            try:
+                if not invoice.entity.tin:
+                    raise ValueError("Business entity TIN is required for NRS submission")
+                submissions.append((row, invoice, InvoiceService.nrs_submission_fields(invoice, invoice.entity)))
+            except ValueError as e:
+                self._reject(row, invoice, str(e), None)
+                events.append((invoice, str(e)))
+                outcome.rejected += 1
+
+        responses = await self.nrs_client.run_bulk(
+            submissions, lambda submission: self.nrs_client.submit_invoice(**submission[2])
+        )
+
+        for (row, invoice, _), response in zip(submissions, responses):
+            if isinstance(response, Exception):
+                message = str(response) or type(response).__name__
+            elif response.success and response.irn:
+                self._deliver(row, invoice, response)
+                events.append((invoice, response.message))
+                outcome.delivered += 1
+                continue
+            elif is_permanent_failure(response):
+                self._reject(row, invoice, response.message, response.raw_response)
+                events.append((invoice, response.message))
+                outcome.rejected += 1
+                continue
+            else:
+                message = response.message
+
+            if row.attempts >= self.max_attempts:
+                self._reject(row, invoice, f"Gave up after {row.attempts} attempts: {message}", None)
+                events.append((invoice, message))
+                outcome.rejected += 1
+            else:
+                row.last_error = message
+                row.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=backoff_delay(row.attempts))
+                outcome.retried += 1
+
+        await self.db.commit()
+
+        for invoice, message in events:
+            await self.broadcaster.notify_invoice_nrs_status(
+                tenant_id=invoice.entity.organization_id,
+                invoice_id=invoice.id,
+                invoice_number=invoice.invoice_number,
+                status=invoice.status.value,
+                nrs_irn=invoice.nrs_irn,
+                qr_code_data=invoice.nrs_qr_code_data,
+                message=message,
+            )
+
+        return outcome
+
+    def _deliver(self, row: NRSOutbox, invoice: Invoice, response):
+        invoice.status = InvoiceStatus.SUBMITTED
+        invoice.nrs_irn = response.irn
+        invoice.nrs_qr_code_data = response.qr_code_data
+        invoice.nrs_submitted_at = response.submission_timestamp
+        invoice.dispute_deadline = response.dispute_deadline
+        invoice.nrs_response = response.raw_response
+        row.status = NRSOutboxStatus.DELIVERED
+        row.nrs_irn = response.irn
+        row.delivered_at = datetime.now(timezone.utc)
+        row.last_error = None
+
+    def _reject(self, row: NRSOutbox, invoice: Invoice, message: str, raw_response: Optional[Dict[str, Any]]):
+        invoice.status = InvoiceStatus.REJECTED
+        invoice.nrs_response = raw_response or {"error": True, "message": message}
+        row.status = NRSOutboxStatus.FAILED
+        row.last_error = message
+
+
+async def drain_nrs_outbox(
+    db: AsyncSession,
+    time_budget: Optional[float] = None,
+    **dispatcher_options,
+) -> Dict[str, Any]:
+    """
+    Dispatch batches until the outbox has nothing due or the budget is spent.
+
+    Safe to run in any number of workers at once.
+    """
+    time_budget = settings.nrs_outbox_drain_seconds if time_budget is None else time_budget
+    dispatcher = NRSOutboxDispatcher(db, **dispatcher_options)
+    deadline = time.monotonic() + time_budget
+    total = DispatchResult()
+    batches = 0
+
+    while True:
+        outcome = await dispatcher.dispatch_batch()
+        total.add(outcome)
+        batches += 1
+        if outcome.claimed < dispatcher.batch_size or time.monotonic() >= deadline:
+            break
+
+    if total.claimed:
+        logger.info(f"NRS outbox drained: {total.to_dict()} in {batches} batches")
+    return {**total.to_dict(), "batches": batches}
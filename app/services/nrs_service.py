@@ -14,13 +14,20 @@ Features:
 - 72-hour buyer dispute window handling
 """
 
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
 import uuid
 import hashlib
 import hmac
 import json
-from datetime import datetime, timedelta
+import weakref
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
 from enum import Enum
 
 import httpx
@@ -28,6 +35,11 @@ from pydantic import BaseModel, Field
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class NRSEnvironment(str, Enum):
     """NRS API environment."""
@@ -124,6 +136,169 @@ class NRSDisputeResponse(BaseModel):
     raw_response: Optional[Dict[str, Any]] = None
 
 
+# ===========================================
+# SHARED HTTP CLIENTS
+# ===========================================
+
+# One keep-alive client per (environment base URL, event loop): httpx
+# clients are bound to the loop they were created on, and reusing one per
+# environment saves a TCP+TLS handshake on every invoice.
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_http2_warned = False
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 if configured and the optional h2 package is installed."""
+    global _http2_warned
+    if not settings.nrs_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        if not _http2_warned:
+            logger.warning("nrs_http2 is set but the h2 package is not installed; using HTTP/1.1")
+            _http2_warned = True
+        return False
+    return True
+
+
+def get_nrs_http_client(base_url: str) -> httpx.AsyncClient:
+    """Get the pooled AsyncClient for an NRS environment on this loop."""
+    loop = asyncio.get_running_loop()
+    clients = _http_clients.setdefault(loop, {})
+    client = clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=_http2_enabled(),
+            timeout=httpx.Timeout(settings.nrs_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=settings.nrs_max_connections,
+                max_keepalive_connections=settings.nrs_max_connections,
+                keepalive_expiry=settings.nrs_keepalive_seconds,
+            ),
+        )
+        clients[base_url] = client
+    return client
+
+
+async def close_nrs_http_clients():
+    """Close this loop's pooled NRS clients."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    for client in _http_clients.pop(loop, {}).values():
+        await client.aclose()
+
+
+# ===========================================
+# ADAPTIVE RATE CONTROL
+# ===========================================
+
+class NRSRateLimiter:
+    """
+    Token bucket shared by every request to one NRS environment.
+    
+    The refill rate starts at the configured ceiling, is halved on a 429 or
+    5xx response (at most once per second, so one burst of rejections
+    counts once) and climbs back additively on successes (AIMD). A
+    Retry-After header pauses all callers until it expires. The bucket
+    state is guarded by a thread lock held only for arithmetic, so one
+    limiter serves every event loop in the process.
+    """
+    
+    def __init__(self, rate: float, burst: int, min_rate: float = 0.5):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = float("-inf")
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.throttled = 0
+        self.waited_seconds = 0.0
+    
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            if start > self._updated:
+                self._tokens = min(self.burst, self._tokens + (start - self._updated) * self.rate)
+                self._updated = start
+            self._tokens -= 1
+            wait = start - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+    
+    async def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+    
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+    
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Back off after a 429/5xx; ``retry_after`` pauses every caller."""
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            if now - self._decreased_at >= 1.0:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._decreased_at = now
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._tokens = min(self._tokens, 0.0)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+_rate_limiters: Dict[str, NRSRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_nrs_rate_limiter(base_url: str) -> NRSRateLimiter:
+    """Get the process-wide limiter for an NRS environment."""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(base_url)
+        if limiter is None:
+            limiter = NRSRateLimiter(settings.nrs_rate_limit_per_second, settings.nrs_rate_burst)
+            _rate_limiters[base_url] = limiter
+        return limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
 # ===========================================
 # NRS API CLIENT
 # ===========================================
@@ -149,20 +324,23 @@ class NRSApiClient:
         "dispute_status": "/api/v1/dispute/status",
     }
     
-    # Timeout for API calls (seconds)
-    REQUEST_TIMEOUT = 30
-    
-    def __init__(self, api_key: Optional[str] = None, sandbox_mode: Optional[bool] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        sandbox_mode: Optional[bool] = None,
+        base_url: Optional[str] = None,
+    ):
         """
         Initialize NRS API client.
         
         Args:
             api_key: API key for authentication. Defaults to settings.
             sandbox_mode: Whether to use sandbox. Defaults to settings.
+            base_url: Override the environment URL (e.g. a LocalNRSServer).
         """
         self.api_key = api_key or settings.nrs_api_key
         self.sandbox_mode = sandbox_mode if sandbox_mode is not None else settings.nrs_sandbox_mode
-        self.base_url = settings.nrs_api_url if self.sandbox_mode else settings.nrs_api_url_prod
+        self.base_url = base_url or (settings.nrs_api_url if self.sandbox_mode else settings.nrs_api_url_prod)
     
     @property
     def environment(self) -> NRSEnvironment:
@@ -202,36 +380,55 @@ class NRSApiClient:
         """
         Make HTTP request to NRS API.
         
+        Uses the environment's pooled keep-alive client and rate limiter.
+        429 and 503 responses are retried (up to settings.nrs_max_retries)
+        after their Retry-After delay; other failures are returned as is,
+        since a resubmitted invoice may already have been processed.
+        
         Returns:
             Tuple of (success, response_data)
         """
-        url = f"{self.base_url}{endpoint}"
         headers = self._get_headers()
         
         # Add request signature if payload exists
         if payload:
             headers["X-Request-Signature"] = self._generate_request_signature(payload)
         
+        client = get_nrs_http_client(self.base_url)
+        limiter = get_nrs_rate_limiter(self.base_url)
+        
         try:
-            async with httpx.AsyncClient(timeout=self.REQUEST_TIMEOUT) as client:
+            for attempt in range(settings.nrs_max_retries + 1):
+                await limiter.acquire()
                 if method.upper() == "GET":
-                    response = await client.get(url, headers=headers, params=payload)
+                    response = await client.get(endpoint, headers=headers, params=payload)
                 else:
-                    response = await client.post(url, headers=headers, json=payload)
-                
-                response_data = response.json()
+                    response = await client.post(endpoint, headers=headers, json=payload)
                 
-                # Check for successful response
-                if response.status_code == 200:
-                    return True, response_data
+                if response.status_code == 429 or response.status_code >= 500:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    limiter.on_throttle(retry_after)
+                    if response.status_code in (429, 503) and attempt < settings.nrs_max_retries:
+                        if retry_after is None:
+                            await asyncio.sleep(0.5 * 2 ** attempt)
+                        continue
                 else:
-                    return False, {
-                        "error": True,
-                        "status_code": response.status_code,
-                        "message": response_data.get("message", "Unknown error"),
-                        "raw": response_data,
-                    }
-                    
+                    limiter.on_success()
+                break
+            
+            response_data = response.json()
+            
+            # Check for successful response
+            if response.status_code == 200:
+                return True, response_data
+            else:
+                return False, {
+                    "error": True,
+                    "status_code": response.status_code,
+                    "message": response_data.get("message", "Unknown error"),
+                    "raw": response_data,
+                }
+                
         except httpx.TimeoutException:
             return False, {
                 "error": True,
@@ -248,6 +445,27 @@ class NRSApiClient:
                 "message": "Invalid JSON response from NRS API",
             }
     
+    async def run_bulk(
+        self,
+        items: Sequence[T],
+        operation: Callable[[T], Awaitable[R]],
+        concurrency: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Run ``operation`` for every item with bounded concurrency.
+        
+        Results come back in input order; an exception raised for one item
+        is returned in its place instead of failing the batch. Requests
+        still pass through the shared rate limiter.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.nrs_bulk_concurrency)
+        
+        async def run(item: T):
+            async with semaphore:
+                return await operation(item)
+        
+        return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+    
     # ===========================================
     # INVOICE OPERATIONS
     # ===========================================
@@ -402,13 +620,19 @@ class NRSApiClient:
         self,
         tin: str,
         name: Optional[str] = None,
+        db=None,
     ) -> NRSTINValidationResponse:
         """
         Validate a Tax Identification Number (TIN).
         
+        Answers come from the TIN verification cache while fresh; only a
+        stale or unknown TIN is sent to NRS.
+        
         Args:
             tin: The TIN to validate
             name: Optional business name to cross-verify
+            db: Optional session for the shared tin_verifications table
+                (the caller commits)
             
         Returns:
             NRSTINValidationResponse with validation result
@@ -425,6 +649,18 @@ class NRSApiClient:
         if self.sandbox_mode and not self.api_key:
             return self._simulate_tin_validation(tin, name)
         
+        from app.services.tin_verification_cache import get_tin_cache, lookup_tins, normalize_tin
+        
+        clean_tin = normalize_tin(tin)
+        answers = await lookup_tins(
+            get_tin_cache("nrs"), [clean_tin], lambda key: self._fetch_tin(key, name), db=db,
+        )
+        return self._tin_response(tin, answers[clean_tin])
+    
+    async def _fetch_tin(self, tin: str, name: Optional[str] = None):
+        """Ask NRS about one TIN: a cacheable CachedTIN, or an error response."""
+        from app.services.tin_verification_cache import CachedTIN
+        
         payload = {
             "tin": tin,
             "name": name,
@@ -436,24 +672,50 @@ class NRSApiClient:
             payload,
         )
         
-        if success:
+        if not success:
             return NRSTINValidationResponse(
-                is_valid=response.get("is_valid", False),
+                is_valid=False,
                 tin=tin,
-                registered_name=response.get("registered_name"),
-                business_type=response.get("business_type"),
-                registration_date=response.get("registration_date"),
-                status=response.get("status"),
-                message=response.get("message", "TIN validated"),
+                message=response.get("message", "TIN validation failed"),
                 raw_response=response,
             )
-        else:
+        
+        is_valid = bool(response.get("is_valid", False))
+        return CachedTIN(
+            tin=tin,
+            is_valid=is_valid,
+            status=str(response.get("status") or ("ACTIVE" if is_valid else "NOT_FOUND"))[:20],
+            registered_name=response.get("registered_name"),
+            details={
+                "business_type": response.get("business_type"),
+                "registration_date": response.get("registration_date"),
+                "message": response.get("message", "TIN validated"),
+            },
+        )
+    
+    def _tin_response(self, tin: str, outcome) -> NRSTINValidationResponse:
+        """Validation response for `tin` from a lookup_tins answer."""
+        from app.services.tin_verification_cache import CachedTIN
+        
+        if isinstance(outcome, Exception):
             return NRSTINValidationResponse(
                 is_valid=False,
                 tin=tin,
-                message=response.get("message", "TIN validation failed"),
-                raw_response=response,
+                message=f"TIN validation failed: {outcome}",
             )
+        if not isinstance(outcome, CachedTIN):
+            return outcome.model_copy(update={"tin": tin})
+        
+        return NRSTINValidationResponse(
+            is_valid=outcome.is_valid,
+            tin=tin,
+            registered_name=outcome.registered_name,
+            business_type=outcome.details.get("business_type"),
+            registration_date=outcome.details.get("registration_date"),
+            status=outcome.status,
+            message=outcome.details.get("message") or "TIN validated",
+            raw_response={"cached": True, "checked_at": outcome.checked_at.isoformat()},
+        )
     
     def _is_valid_tin_format(self, tin: str) -> bool:
         """
@@ -512,14 +774,31 @@ class NRSApiClient:
     async def bulk_validate_tins(
         self,
         tins: List[str],
+        db=None,
     ) -> List[NRSTINValidationResponse]:
         """
         Validate multiple TINs in bulk.
+        
+        Inputs are deduplicated (ignoring hyphens and spaces) and answered
+        from the TIN verification cache; only stale or unknown TINs go to
+        NRS, concurrently. With `db` the caller commits the cache rows.
         """
+        from app.services.tin_verification_cache import get_tin_cache, lookup_tins, normalize_tin
+        
+        if self.sandbox_mode and not self.api_key:
+            return [await self.validate_tin(tin) for tin in tins]
+        
+        well_formed = [tin for tin in tins if self._is_valid_tin_format(tin)]
+        answers = await lookup_tins(
+            get_tin_cache("nrs"), [normalize_tin(tin) for tin in well_formed], self._fetch_tin, db=db,
+        )
+        
         results = []
         for tin in tins:
-            result = await self.validate_tin(tin)
-            results.append(result)
+            if self._is_valid_tin_format(tin):
+                results.append(self._tin_response(tin, answers[normalize_tin(tin)]))
+            else:
+                results.append(await self.validate_tin(tin))
         return results
     
     # ===========================================
@@ -711,10 +990,167 @@ class NRSApiClient:
 def get_nrs_client(
     api_key: Optional[str] = None,
     sandbox_mode: Optional[bool] = None,
+    base_url: Optional[str] = None,
 ) -> NRSApiClient:
     """
     Factory function to get NRS API client.
     
-    Uses settings by default, but allows overrides for testing.
+    Uses settings by default, but allows overrides for testing. Clients
+    are cheap: connections and rate limits live in the shared pool.
     """
-    return NRSApiClient(api_key=api_key, sandbox_mode=sandbox_mode)
+    return NRSApiClient(api_key=api_key, sandbox_mode=sandbox_mode, base_url=base_url)
+
+
+# ===========================================
+# LOCAL NRS STAND-IN
+# ===========================================
+
+class LocalNRSServer:
+    """
+    Minimal in-process NRS API for tests and benchmarks.
+    
+    Speaks HTTP/1.1 with keep-alive, answers the invoice, TIN and B2C
+    endpoints with plausible JSON, and can add latency or enforce a
+    requests-per-second limit with 429 + Retry-After. Runs on its own
+    thread and event loop. Use as a context manager:
+    
+        with LocalNRSServer(latency=0.02) as server:
+            client = get_nrs_client(api_key="test", base_url=server.url)
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limit: Optional[float] = None,
+        retry_after: str = "1",
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.connections = 0
+        self.requests: List[Tuple[str, str, Dict[str, Any]]] = []
+        self.throttled = 0
+        self._window_start = 0.0
+        self._window_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    def _over_limit(self) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        return self._window_count > self.rate_limit
+    
+    def _respond(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        if path.startswith("/api/v1/invoice/submit"):
+            irn = f"NGN{datetime.utcnow():%Y%m%d%H%M%S}{uuid.uuid4().hex[:8].upper()}"
+            return 200, {
+                "response_code": NRSErrorCode.SUCCESS.value,
+                "message": "Invoice accepted",
+                "irn": irn,
+                "qr_code_data": json.dumps({"irn": irn, "inv": body.get("invoice_number")}),
+            }
+        if path.startswith("/api/v1/tin/validate"):
+            if str(body.get("tin", "")).startswith("0"):
+                return 200, {"is_valid": False, "status": "NOT_FOUND", "message": "TIN not found in registry"}
+            return 200, {
+                "is_valid": True,
+                "registered_name": f"Registered Business {str(body.get('tin', ''))[-4:]}",
+                "status": "ACTIVE",
+                "message": "TIN validated",
+            }
+        if path.startswith("/api/v1/b2c/report"):
+            return 200, {"message": "B2C transaction reported", "report_reference": f"B2C-{uuid.uuid4().hex[:10].upper()}"}
+        return 200, {"success": True, "message": "OK"}
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target = request_line.decode().split(" ")[:2]
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                raw = await reader.readexactly(int(headers.get("content-length", 0)))
+                body = json.loads(raw) if raw else {}
+                
+                extra = ""
+                if self._over_limit():
+                    self.throttled += 1
+                    status, data = 429, {"message": "Too many requests"}
+                    extra = f"Retry-After: {self.retry_after}\r\n"
+                else:
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    path = target.split("?", 1)[0]
+                    self.requests.append((method, path, body))
+                    status, data = self._respond(method, path, body)
+                
+                payload = json.dumps(data).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n{extra}\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        handlers = asyncio.all_tasks(self._loop)
+        for task in handlers:
+            task.cancel()
+        self._loop.run_until_complete(asyncio.gather(*handlers, return_exceptions=True))
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+    
+    def start(self) -> "LocalNRSServer":
+        self._thread = threading.Thread(target=self._run, name="local-nrs", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+    
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+    
+    def __enter__(self) -> "LocalNRSServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
@@ -17,14 +17,14 @@ Extracts:
 """
 
 import uuid
-import re
-from datetime import date, datetime
+from datetime import date
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
 from app.config import settings
+from app.services.advanced_ocr_service import TextExtractor
 
 
 class OCRProvider(str, Enum):
@@ -99,6 +99,7 @@ class OCRService:
         self.azure_endpoint = getattr(settings, 'azure_form_recognizer_endpoint', None)
         self.azure_key = getattr(settings, 'azure_form_recognizer_key', None)
         self.provider = self._determine_provider()
+        self.text_extractor = TextExtractor()
     
     def _determine_provider(self) -> OCRProvider:
         """Determine which OCR provider to use."""
@@ -282,65 +283,21 @@ class OCRService:
             provider="mock",
         )
     
+    # Text extraction shares the single-pass scanner of the advanced OCR
+    # service (see TextExtractor.scan)
+    
     def extract_tin_from_text(self, text: str) -> Optional[str]:
         """
         Extract TIN (Tax Identification Number) from text.
         
         Nigerian TIN format: 10 digits or 10 digits with hyphen
         """
-        # Pattern for Nigerian TIN
-        patterns = [
-            r'\b(\d{10})\b',  # 10 consecutive digits
-            r'\b(\d{8}-\d{2})\b',  # 8 digits, hyphen, 2 digits
-            r'TIN[:\s]*(\d{10})',  # TIN: followed by 10 digits
-            r'TIN[:\s]*(\d{8}-\d{2})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).replace("-", "")
-        
-        return None
+        return self.text_extractor.extract_tin(text)
     
     def extract_date_from_text(self, text: str) -> Optional[date]:
         """Extract date from text using common formats."""
-        date_patterns = [
-            (r'(\d{1,2})/(\d{1,2})/(\d{4})', '%d/%m/%Y'),
-            (r'(\d{1,2})-(\d{1,2})-(\d{4})', '%d-%m-%Y'),
-            (r'(\d{4})-(\d{1,2})-(\d{1,2})', '%Y-%m-%d'),
-            (r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})', None),
-        ]
-        
-        for pattern, fmt in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    if fmt:
-                        date_str = match.group(0)
-                        return datetime.strptime(date_str, fmt).date()
-                except ValueError:
-                    continue
-        
-        return None
+        return self.text_extractor.extract_date(text)
     
     def extract_amount_from_text(self, text: str) -> Optional[float]:
-        """Extract monetary amount from text."""
-        # Patterns for Nigerian Naira amounts
-        patterns = [
-            r'₦\s*([\d,]+\.?\d*)',
-            r'NGN\s*([\d,]+\.?\d*)',
-            r'N\s*([\d,]+\.?\d*)',
-            r'Total[:\s]*([\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    amount_str = match.group(1).replace(",", "")
-                    return float(amount_str)
-                except ValueError:
-                    continue
-        
-        return None
+        """Extract the receipt total (labelled total, else the largest amount)."""
+        return self.text_extractor.extract_all(text)["total_amount"]
@@ -25,7 +25,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.payroll import (
-    Employee, PayrollRun, Payslip, StatutoryRemittance,
+    Employee, EmployeeBankAccount, PayrollRun, Payslip, StatutoryRemittance,
     EmploymentStatus, PayrollStatus
 )
 from app.models.payroll_advanced import (
@@ -39,6 +39,9 @@ from app.schemas.payroll_advanced import (
     ComplianceStatusItem, ComplianceSnapshotResponse,
     ComplianceSnapshotCreate
 )
+from app.services.ghost_worker_linkage import LinkageRecord, link_records
+from app.services.salary_scenario_engine import SalaryScenario, SalaryScenarioEngine
+from app.utils.query_optimization import bulk_insert_rows
 
 
 # ===========================================
@@ -2927,6 +2930,48 @@ Employer Contributions (Not deducted from your pay):
         result = await self.db.execute(query)
         return list(result.scalars().all()), total
 
+    async def load_salary_scenario_engine(
+        self,
+        entity_id: uuid.UUID,
+    ) -> SalaryScenarioEngine:
+        """Load the entity's active salary matrix once for scenario evaluation."""
+        from app.services.payroll_engine import PayrollBatchEngine
+        from app.services.payroll_service import PayrollService
+        
+        result = await self.db.execute(
+            select(
+                Employee.id,
+                Employee.department,
+                Employee.job_grade,
+                Employee.basic_salary,
+                Employee.housing_allowance,
+                Employee.transport_allowance,
+                Employee.other_allowances,
+                Employee.is_pension_exempt,
+                Employee.is_nhf_exempt,
+            ).where(
+                and_(
+                    Employee.entity_id == entity_id,
+                    Employee.employment_status == EmploymentStatus.ACTIVE,
+                )
+            )
+        )
+        payroll_service = PayrollService(self.db)
+        batch_engine = PayrollBatchEngine(
+            payroll_service.paye_calculator,
+            payroll_service.calculate_salary_breakdown,
+        )
+        return SalaryScenarioEngine(result.all(), batch_engine)
+    
+    async def sweep_salary_scenarios(
+        self,
+        entity_id: uuid.UUID,
+        scenarios: List[SalaryScenario],
+    ) -> List[Dict[str, Any]]:
+        """Evaluate many salary scenarios over one load of the salary matrix."""
+        engine = await self.load_salary_scenario_engine(entity_id)
+        return [result.to_dict() for result in engine.evaluate_many(scenarios)]
+    
     async def run_salary_increase_simulation(
         self,
         entity_id: uuid.UUID,
@@ -2934,61 +2979,39 @@ Employer Contributions (Not deducted from your pay):
         simulation_name: str,
         increase_type: str,  # "percentage" or "flat_amount"
         increase_value: Decimal,
-        apply_to: str = "all",  # "all", "department", "employee_list"
+        apply_to: str = "all",  # "all", "department", "job_grade", "employee_list"
         department: Optional[str] = None,
         employee_ids: Optional[List[uuid.UUID]] = None,
         description: Optional[str] = None,
         save_simulation: bool = False,
+        job_grade: Optional[str] = None,
     ) -> WhatIfSimulation:
-        """Run a salary increase simulation."""
-        # Get baseline data
-        employees_query = select(Employee).where(
-            and_(
-                Employee.entity_id == entity_id,
-                Employee.employment_status == EmploymentStatus.ACTIVE,
-            )
-        )
-        
-        if apply_to == "department" and department:
-            employees_query = employees_query.where(Employee.department == department)
-        elif apply_to == "employee_list" and employee_ids:
-            employees_query = employees_query.where(Employee.id.in_(employee_ids))
-        
-        emp_result = await self.db.execute(employees_query)
-        employees = list(emp_result.scalars().all())
-        
-        # Calculate baseline
-        baseline_gross = sum(e.basic_salary for e in employees)
-        baseline_paye = Decimal("0")  # Simplified - would need full tax calculation
-        baseline_employer_cost = baseline_gross * Decimal("1.15")  # Approximate
-        baseline_ctc = baseline_gross * Decimal("1.20")  # Approximate
-        
-        # Calculate projected
-        if increase_type == "percentage":
-            increase_multiplier = 1 + (increase_value / 100)
-            projected_gross = baseline_gross * increase_multiplier
-        else:
-            projected_gross = baseline_gross + (increase_value * len(employees))
-        
-        projected_employer_cost = projected_gross * Decimal("1.15")
-        projected_ctc = projected_gross * Decimal("1.20")
-        
-        # Calculate impacts
-        gross_impact = projected_gross - baseline_gross
-        employer_cost_impact = projected_employer_cost - baseline_employer_cost
-        ctc_impact = projected_ctc - baseline_ctc
+        """
+        Run a salary increase simulation.
         
-        gross_impact_percent = (gross_impact / baseline_gross * 100).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        ) if baseline_gross > 0 else Decimal("0")
-        ctc_impact_percent = (ctc_impact / baseline_ctc * 100).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        ) if baseline_ctc > 0 else Decimal("0")
+        Baseline and projected figures are exact monthly payroll totals
+        (PAYE, pensions, NHF, NSITF, ITF) for the selected employees; CTC
+        follows the CostToCompanySnapshot definition.
+        """
+        scenario = SalaryScenario(
+            name=simulation_name,
+            increase_type=increase_type,
+            increase_value=increase_value,
+            apply_to=apply_to,
+            department=department,
+            job_grade=job_grade,
+            employee_ids=employee_ids,
+        )
+        engine = await self.load_salary_scenario_engine(entity_id)
+        result = engine.evaluate(scenario)
+        baseline, projected, impact = result.baseline, result.projected, result.impact
         
         # Build summary
         impact_summary = f"Salary increase simulation: {increase_value}{'%' if increase_type == 'percentage' else ' NGN'} "
-        impact_summary += f"for {len(employees)} employees. "
-        impact_summary += f"Total cost impact: ₦{ctc_impact:,.2f} ({ctc_impact_percent}% increase)."
+        impact_summary += f"for {baseline.headcount} employees. "
+        impact_summary += f"Total cost impact: ₦{impact['employer_cost']:,.2f} "
+        impact_summary += f"({result.impact_percent('employer_cost')}% increase), "
+        impact_summary += f"PAYE impact: ₦{impact['paye']:,.2f}."
         
         simulation = WhatIfSimulation(
             entity_id=entity_id,
@@ -3000,22 +3023,26 @@ Employer Contributions (Not deducted from your pay):
                 "increase_value": float(increase_value),
                 "apply_to": apply_to,
                 "department": department,
-                "employee_count": len(employees),
+                "job_grade": job_grade,
+                "employee_count": baseline.headcount,
+                "baseline": baseline.to_dict(),
+                "projected": projected.to_dict(),
+                "impact": {name: float(value) for name, value in impact.items()},
             },
-            baseline_gross=baseline_gross,
-            baseline_paye=baseline_paye,
-            baseline_employer_cost=baseline_employer_cost,
-            baseline_ctc=baseline_ctc,
-            projected_gross=projected_gross,
-            projected_paye=Decimal("0"),
-            projected_employer_cost=projected_employer_cost,
-            projected_ctc=projected_ctc,
-            gross_impact=gross_impact,
-            paye_impact=Decimal("0"),
-            employer_cost_impact=employer_cost_impact,
-            ctc_impact=ctc_impact,
-            gross_impact_percent=gross_impact_percent,
-            ctc_impact_percent=ctc_impact_percent,
+            baseline_gross=baseline.gross,
+            baseline_paye=baseline.paye,
+            baseline_employer_cost=baseline.employer_cost,
+            baseline_ctc=baseline.employer_cost,
+            projected_gross=projected.gross,
+            projected_paye=projected.paye,
+            projected_employer_cost=projected.employer_cost,
+            projected_ctc=projected.employer_cost,
+            gross_impact=impact["gross"],
+            paye_impact=impact["paye"],
+            employer_cost_impact=impact["employer_cost"],
+            ctc_impact=impact["employer_cost"],
+            gross_impact_percent=result.impact_percent("gross"),
+            ctc_impact_percent=result.impact_percent("employer_cost"),
             impact_summary=impact_summary,
             created_by_id=user_id,
             is_saved=save_simulation,
@@ -3116,95 +3143,117 @@ Employer Contributions (Not deducted from your pay):
         entity_id: uuid.UUID,
     ) -> Dict[str, Any]:
         """
-        Scan for ghost workers by detecting duplicates.
-        Checks BVN, NIN, bank account numbers.
+        Scan for ghost workers by linking near-duplicate employee records.
+        
+        Candidate pairs come from blocking keys (BVN/NIN/account digits,
+        phonetic names, DOB, phone, email) and are scored on string-distance
+        features; see app.services.ghost_worker_linkage. Pairs sharing an
+        exact BVN, NIN or account number are critical; other pairs above
+        the match threshold are warnings. Pairs with an open detection are
+        not flagged again.
         """
-        # Get all active employees
-        result = await self.db.execute(
-            select(Employee).where(
+        employee_result = await self.db.execute(
+            select(
+                Employee.id,
+                Employee.first_name,
+                Employee.middle_name,
+                Employee.last_name,
+                Employee.date_of_birth,
+                Employee.bvn,
+                Employee.nin,
+                Employee.phone_number,
+                Employee.email,
+            ).where(
                 and_(
                     Employee.entity_id == entity_id,
                     Employee.employment_status == EmploymentStatus.ACTIVE,
                 )
             )
         )
-        employees = list(result.scalars().all())
+        employees = employee_result.all()
         
-        detections = []
+        account_result = await self.db.execute(
+            select(
+                EmployeeBankAccount.employee_id,
+                EmployeeBankAccount.bank_name,
+                EmployeeBankAccount.bank_name_other,
+                EmployeeBankAccount.account_number,
+            )
+            .join(Employee, Employee.id == EmployeeBankAccount.employee_id)
+            .where(
+                and_(
+                    Employee.entity_id == entity_id,
+                    Employee.employment_status == EmploymentStatus.ACTIVE,
+                    EmployeeBankAccount.is_active == True,
+                )
+            )
+        )
+        accounts: Dict[uuid.UUID, List[Tuple[str, str]]] = {}
+        for employee_id, bank_name, bank_name_other, account_number in account_result.all():
+            bank = bank_name_other if bank_name == "other" and bank_name_other else bank_name
+            accounts.setdefault(employee_id, []).append((bank, account_number))
         
-        # Check for duplicate BVNs
-        bvn_map = {}
-        for emp in employees:
-            if emp.bvn:
-                if emp.bvn in bvn_map:
-                    detection = GhostWorkerDetection(
-                        entity_id=entity_id,
-                        detection_type="duplicate_bvn",
-                        employee_1_id=bvn_map[emp.bvn].id,
-                        employee_2_id=emp.id,
-                        duplicate_field="bvn",
-                        duplicate_value=emp.bvn,
-                        severity=ExceptionSeverity.CRITICAL,
-                    )
-                    self.db.add(detection)
-                    detections.append(detection)
-                else:
-                    bvn_map[emp.bvn] = emp
+        open_result = await self.db.execute(
+            select(
+                GhostWorkerDetection.employee_1_id,
+                GhostWorkerDetection.employee_2_id,
+            ).where(
+                and_(
+                    GhostWorkerDetection.entity_id == entity_id,
+                    GhostWorkerDetection.is_resolved == False,
+                )
+            )
+        )
+        already_open = {frozenset(pair) for pair in open_result.all()}
         
-        # Check for duplicate bank accounts
-        account_map = {}
-        for emp in employees:
-            if emp.account_number and emp.bank_name:
-                key = f"{emp.bank_name}:{emp.account_number}"
-                if key in account_map:
-                    detection = GhostWorkerDetection(
-                        entity_id=entity_id,
-                        detection_type="duplicate_account",
-                        employee_1_id=account_map[key].id,
-                        employee_2_id=emp.id,
-                        duplicate_field="bank_account",
-                        duplicate_value=key,
-                        severity=ExceptionSeverity.CRITICAL,
-                    )
-                    self.db.add(detection)
-                    detections.append(detection)
-                else:
-                    account_map[key] = emp
-        
-        # Check for duplicate NINs
-        nin_map = {}
-        for emp in employees:
-            if hasattr(emp, 'nin') and emp.nin:
-                if emp.nin in nin_map:
-                    detection = GhostWorkerDetection(
-                        entity_id=entity_id,
-                        detection_type="duplicate_nin",
-                        employee_1_id=nin_map[emp.nin].id,
-                        employee_2_id=emp.id,
-                        duplicate_field="nin",
-                        duplicate_value=emp.nin,
-                        severity=ExceptionSeverity.CRITICAL,
-                    )
-                    self.db.add(detection)
-                    detections.append(detection)
-                else:
-                    nin_map[emp.nin] = emp
+        records = [LinkageRecord.build(e, accounts.get(e.id, ())) for e in employees]
+        pairs = [
+            pair for pair in link_records(records)
+            if frozenset((pair.record_1.employee_id, pair.record_2.employee_id)) not in already_open
+        ]
         
+        detected_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "entity_id": entity_id,
+                "detection_type": pair.detection_type,
+                "employee_1_id": pair.record_1.employee_id,
+                "employee_2_id": pair.record_2.employee_id,
+                "duplicate_field": pair.matched_field,
+                "duplicate_value": pair.matched_value[:255],
+                "severity": (
+                    ExceptionSeverity.CRITICAL if pair.shares_identifier
+                    else ExceptionSeverity.WARNING
+                ),
+                "is_resolved": False,
+                "detected_at": detected_at,
+            }
+            for pair in pairs
+        ]
+        await bulk_insert_rows(self.db, GhostWorkerDetection, rows)
         await self.db.commit()
         
-        # Refresh all detections
-        for d in detections:
-            await self.db.refresh(d)
+        detections = []
+        for row, pair in zip(rows, pairs):
+            detection = self.format_ghost_detection_response(
+                GhostWorkerDetection(**row),
+                employee_1_name=pair.record_1.display_name,
+                employee_2_name=pair.record_2.display_name,
+            )
+            detection["match_score"] = round(pair.weight, 2)
+            detection["features"] = pair.features
+            detections.append(detection)
         
-        critical_count = sum(1 for d in detections if d.severity == ExceptionSeverity.CRITICAL)
+        critical_count = sum(1 for row in rows if row["severity"] == ExceptionSeverity.CRITICAL)
         
         return {
             "entity_id": str(entity_id),
-            "scan_date": datetime.now(timezone.utc).isoformat(),
+            "scan_date": detected_at.isoformat(),
             "total_employees_scanned": len(employees),
             "detections_found": len(detections),
             "critical_detections": critical_count,
-            "detections": [self.format_ghost_detection_response(d) for d in detections],
+            "detections": detections,
         }
 
     async def resolve_ghost_detection(
@@ -0,0 +1,428 @@
+"""
+TekVwarho ProAudit - Batch Payroll Engine
+
+Computes payslip figures for a whole payroll run at once.
+
+PayrollService.calculate_salary_breakdown works one employee at a time in
+Decimal. For large headcounts the engine instead evaluates every employee in
+one pass over NumPy int64 arrays:
+
+- Earnings, pension, NHF, NSITF and ITF in kobo
+- CRA, reliefs and taxable income in 1e-5 naira (the finest unit the
+  calculator's percentages produce)
+- PAYE in 1e-7 naira via the calculator's compiled TaxSchedule
+  (integer-percent rates)
+
+All rounding mirrors the per-employee path (ROUND_HALF_UP at each quantize),
+so figures match it exactly. Rows the integer path cannot reproduce exactly
+(sub-kobo allowances, negative amounts, annual gross above
+MAX_VECTOR_ANNUAL_GROSS, or a non-integer band rate) are computed with the
+per-employee breakdown instead.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.payroll_service import (
+    ITF_RATE,
+    NHF_RATE,
+    NSITF_RATE,
+    PENSION_EMPLOYEE_RATE,
+    PENSION_EMPLOYER_RATE,
+)
+from app.services.tax_calculators.paye_service import (
+    CRA_FIXED_AMOUNT,
+    CRA_PERCENTAGE,
+    MAX_PENSION_PERCENTAGE,
+    NHF_PERCENTAGE,
+    PAYECalculator,
+)
+from app.services.tax_calculators.tax_schedule import TaxSchedule
+
+
+# Fixed-point scales (units per naira)
+KOBO = 100
+RELIEF_UNITS = 100_000      # reliefs / taxable income
+TAX_UNITS = 10_000_000      # PAYE: relief units x integer percent
+
+# Keeps taxable income x band rate (in TAX_UNITS) well inside int64; larger
+# annual gross goes through the scalar path.
+MAX_VECTOR_ANNUAL_GROSS = Decimal("100000000000")
+
+# calculate_paye falls back to 60% of gross as "basic" when basic is zero
+DEFAULT_BASIC_SHARE = Decimal("0.6")
+
+CENT = Decimal("0.01")
+
+
+def _round_half_up(numerator: np.ndarray, denominator) -> np.ndarray:
+    """ROUND_HALF_UP integer division for non-negative numerators."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def _integral(value: Decimal) -> int:
+    """Exact int for a Decimal scale factor; ValueError if it has a fraction."""
+    if value != value.to_integral_value():
+        raise ValueError(f"{value} is not integral")
+    return int(value)
+
+
+def _to_kobo(value: Any) -> Optional[int]:
+    """Whole kobo for a money value, or None if it has sub-kobo digits."""
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    kobo = amount * KOBO
+    if kobo != kobo.to_integral_value():
+        return None
+    return int(kobo)
+
+
+def _money(units: int, scale: int) -> Decimal:
+    return Decimal(units) / scale
+
+
+class CompiledBandTable:
+    """
+    A TaxSchedule as integer arrays over relief units.
+
+    tax(x) = base_tax[i] + (x - lowers[i]) * rates[i], with i the band
+    containing x (found by searchsorted), in TAX_UNITS.
+    """
+
+    def __init__(self, schedule: TaxSchedule):
+        if schedule.lowers[0] != 0:
+            raise ValueError("First band must start at zero")
+        if list(schedule.uppers[:-1]) != list(schedule.lowers[1:]):
+            raise ValueError("Bands must be contiguous")
+        if schedule.uppers[-1] is not None:
+            raise ValueError("Top band must be open-ended")
+
+        self.lowers = np.array(
+            [_integral(lower * RELIEF_UNITS) for lower in schedule.lowers], dtype=np.int64
+        )
+        self.rates = np.array([_integral(rate) for rate in schedule.rates], dtype=np.int64)
+        widths = np.diff(self.lowers)
+        self.base_tax = np.concatenate(
+            ([0], np.cumsum(widths * self.rates[:-1]))
+        ).astype(np.int64)
+
+    def tax(self, taxable_units: np.ndarray) -> np.ndarray:
+        band = np.searchsorted(self.lowers, taxable_units, side="right") - 1
+        band = np.maximum(band, 0)
+        return self.base_tax[band] + (taxable_units - self.lowers[band]) * self.rates[band]
+
+
+@dataclass
+class PayslipFigures:
+    """Full-period payslip amounts for one employee (all Decimal naira)."""
+
+    basic_salary: Decimal
+    housing_allowance: Decimal
+    transport_allowance: Decimal
+    other_allowances: Dict[str, Decimal]
+    other_earnings: Decimal
+    gross_pay: Decimal
+    paye_tax: Decimal
+    pension_employee: Decimal
+    nhf: Decimal
+    total_deductions: Decimal
+    net_pay: Decimal
+    pension_employer: Decimal
+    nsitf: Decimal
+    itf: Decimal
+    consolidated_relief: Decimal
+    taxable_income: Decimal
+    annual_gross: Decimal
+    annual_paye: Decimal
+    effective_tax_rate: Decimal
+    paye_breakdown: List[Dict[str, Any]]
+
+
+class PayrollBatchEngine:
+    """
+    Vectorized payslip computation for PayrollService.create_payroll_run.
+
+    Args:
+        paye_calculator: Calculator whose bands define PAYE
+        scalar_breakdown: Per-employee fallback, i.e.
+            PayrollService.calculate_salary_breakdown
+    """
+
+    def __init__(
+        self,
+        paye_calculator: PAYECalculator,
+        scalar_breakdown: Callable[..., Dict[str, Any]],
+    ):
+        self.scalar_breakdown = scalar_breakdown
+        self.max_gross_kobo = int(MAX_VECTOR_ANNUAL_GROSS * KOBO)
+        self.vectorized_count = 0
+        self.fallback_count = 0
+        try:
+            self.bands: Optional[CompiledBandTable] = CompiledBandTable(paye_calculator.schedule)
+            # Integer multipliers from kobo / relief units (see module docstring)
+            self._pension_relief_factor = _integral(
+                min(PENSION_EMPLOYEE_RATE, MAX_PENSION_PERCENTAGE) * RELIEF_UNITS / KOBO / 100
+            )
+            self._nhf_relief_factor = _integral(NHF_PERCENTAGE * RELIEF_UNITS / KOBO / 100)
+            self._default_nhf_factor = _integral(
+                DEFAULT_BASIC_SHARE * NHF_PERCENTAGE * RELIEF_UNITS / KOBO / 100
+            )
+            self._cra_floor_factor = _integral(Decimal("0.01") * RELIEF_UNITS / KOBO)
+            self._cra_rate_factor = _integral(CRA_PERCENTAGE * RELIEF_UNITS / KOBO / 100)
+            self._cra_fixed = _integral(CRA_FIXED_AMOUNT * RELIEF_UNITS)
+            self._rates = {
+                # percent -> (numerator, denominator) on kobo
+                name: (_integral(rate * 10), 1000)
+                for name, rate in (
+                    ("pension_employee", PENSION_EMPLOYEE_RATE),
+                    ("pension_employer", PENSION_EMPLOYER_RATE),
+                    ("nhf", NHF_RATE),
+                    ("nsitf", NSITF_RATE),
+                    ("itf", ITF_RATE),
+                )
+            }
+        except ValueError:
+            # Rates the integer path can't represent exactly: scalar for everyone
+            self.bands = None
+
+    def _apply_rate(self, name: str, base_kobo: np.ndarray, extra_divisor: int = 1) -> np.ndarray:
+        numerator, denominator = self._rates[name]
+        return _round_half_up(base_kobo * numerator, denominator * extra_divisor)
+
+    # ===========================================
+    # ENTRY POINT
+    # ===========================================
+
+    def compute(self, employees: List[Any]) -> List[PayslipFigures]:
+        """Payslip figures for each employee, in input order."""
+        figures: List[Optional[PayslipFigures]] = [None] * len(employees)
+        vector_rows: List[int] = []
+        columns: Dict[str, list] = {
+            "basic": [], "housing": [], "transport": [], "other": [],
+            "pension_exempt": [], "nhf_exempt": [],
+        }
+        other_kobo: List[Dict[str, int]] = []
+
+        for index, employee in enumerate(employees):
+            row = self.vector_row(employee)
+            if row is None:
+                figures[index] = self.scalar_figures(employee)
+                continue
+            basic, housing, transport, other_total, allowances = row
+            vector_rows.append(index)
+            columns["basic"].append(basic)
+            columns["housing"].append(housing)
+            columns["transport"].append(transport)
+            columns["other"].append(other_total)
+            columns["pension_exempt"].append(bool(employee.is_pension_exempt))
+            columns["nhf_exempt"].append(bool(employee.is_nhf_exempt))
+            other_kobo.append(allowances)
+
+        if vector_rows:
+            for index, result in zip(vector_rows, self._compute_vector(columns, other_kobo)):
+                figures[index] = result
+
+        self.vectorized_count += len(vector_rows)
+        self.fallback_count += len(employees) - len(vector_rows)
+        return figures
+
+    def vector_row(self, employee):
+        """
+        (basic, housing, transport, other_total, {name: kobo}) in kobo, or
+        None if the employee must go through the scalar path.
+        """
+        row = self._extract(employee) if self.bands is not None else None
+        if row is None or row[0] < 0 or row[1] < 0 or row[2] < 0 or \
+                12 * (row[0] + row[1] + row[2] + row[3]) > self.max_gross_kobo:
+            return None
+        return row
+
+    def _extract(self, employee):
+        """(basic, housing, transport, other_total, {name: kobo}) or None if not whole kobo."""
+        amounts = [
+            _to_kobo(employee.basic_salary),
+            _to_kobo(employee.housing_allowance),
+            _to_kobo(employee.transport_allowance),
+        ]
+        if None in amounts:
+            return None
+        allowances = {}
+        for name, value in (employee.other_allowances or {}).items():
+            kobo = _to_kobo(value)
+            if kobo is None or kobo < 0:
+                return None
+            allowances[name] = kobo
+        return (*amounts, sum(allowances.values()), allowances)
+
+    # ===========================================
+    # VECTOR PATH
+    # ===========================================
+
+    def compute_arrays(
+        self,
+        basic: np.ndarray,
+        housing: np.ndarray,
+        transport: np.ndarray,
+        other: np.ndarray,
+        pension_exempt: np.ndarray,
+        nhf_exempt: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Payslip amounts for kobo salary columns (rows accepted by vector_row).
+
+        Money is in kobo except cra/taxable (RELIEF_UNITS), annual_paye
+        (TAX_UNITS) and effective_rate (hundredths of a percent).
+        """
+        # Earnings and statutory deductions (kobo)
+        gross = basic + housing + transport + other
+        annual_gross = gross * 12
+        pensionable = basic + housing + transport
+
+        pension_employee = np.where(
+            pension_exempt, 0, self._apply_rate("pension_employee", pensionable)
+        )
+        nhf = np.where(nhf_exempt, 0, self._apply_rate("nhf", basic))
+        pension_employer = np.where(
+            pension_exempt, 0, self._apply_rate("pension_employer", pensionable)
+        )
+        nsitf = self._apply_rate("nsitf", gross)
+        itf = self._apply_rate("itf", annual_gross, 12)
+
+        # PAYECalculator.calculate_paye reliefs (relief units). Note the
+        # calculator always deducts its own NHF relief on basic, and the
+        # service passes its NHF again as other_reliefs.
+        cra = np.maximum(self._cra_fixed, annual_gross * self._cra_floor_factor) \
+            + annual_gross * self._cra_rate_factor
+        pension_relief = np.where(pension_exempt, 0, annual_gross * self._pension_relief_factor)
+        calculator_nhf = np.where(
+            basic > 0,
+            basic * 12 * self._nhf_relief_factor,
+            annual_gross * self._default_nhf_factor,
+        )
+        other_reliefs = np.where(nhf_exempt, 0, nhf * 12 * (RELIEF_UNITS // KOBO))
+        taxable = np.maximum(
+            0,
+            annual_gross * (RELIEF_UNITS // KOBO)
+            - (cra + pension_relief + calculator_nhf + other_reliefs),
+        )
+
+        annual_paye = self.bands.tax(taxable)  # TAX_UNITS
+        monthly_paye = _round_half_up(annual_paye, 12 * (TAX_UNITS // KOBO))
+        # Effective rate in hundredths of a percent
+        effective_rate = np.where(
+            annual_gross > 0,
+            _round_half_up(annual_paye, np.maximum(annual_gross, 1) * (TAX_UNITS // KOBO // 10_000)),
+            0,
+        )
+
+        total_deductions = monthly_paye + pension_employee + nhf
+
+        return {
+            "basic": basic, "housing": housing, "transport": transport, "other": other,
+            "gross": gross, "paye": monthly_paye, "pension_employee": pension_employee,
+            "nhf": nhf, "total_deductions": total_deductions,
+            "net": gross - total_deductions, "pension_employer": pension_employer,
+            "nsitf": nsitf, "itf": itf, "cra": cra, "taxable": taxable,
+            "annual_gross": annual_gross, "annual_paye": annual_paye,
+            "effective_rate": effective_rate,
+        }
+
+    def _compute_vector(self, columns: Dict[str, list], other_kobo: List[Dict[str, int]]):
+        result = self.compute_arrays(
+            np.array(columns["basic"], dtype=np.int64),
+            np.array(columns["housing"], dtype=np.int64),
+            np.array(columns["transport"], dtype=np.int64),
+            np.array(columns["other"], dtype=np.int64),
+            np.array(columns["pension_exempt"], dtype=bool),
+            np.array(columns["nhf_exempt"], dtype=bool),
+        )
+        arrays = [result[name] for name in (
+            "basic", "housing", "transport", "other", "gross", "paye", "pension_employee",
+            "nhf", "total_deductions", "net", "pension_employer", "nsitf", "itf", "cra",
+            "taxable", "annual_gross", "annual_paye", "effective_rate",
+        )]
+        for position, row in enumerate(zip(*(a.tolist() for a in arrays))):
+            (basic_k, housing_k, transport_k, other_k, gross_k, paye_k, pension_k,
+             nhf_k, deductions_k, net_k, employer_k, nsitf_k, itf_k, cra_u, taxable_u,
+             annual_gross_k, annual_paye_t, rate_bp) = row
+            yield PayslipFigures(
+                basic_salary=_money(basic_k, KOBO),
+                housing_allowance=_money(housing_k, KOBO),
+                transport_allowance=_money(transport_k, KOBO),
+                other_allowances={
+                    name: _money(kobo, KOBO) for name, kobo in other_kobo[position].items()
+                },
+                other_earnings=_money(other_k, KOBO),
+                gross_pay=_money(gross_k, KOBO),
+                paye_tax=_money(paye_k, KOBO),
+                pension_employee=_money(pension_k, KOBO),
+                nhf=_money(nhf_k, KOBO),
+                total_deductions=_money(deductions_k, KOBO),
+                net_pay=_money(net_k, KOBO),
+                pension_employer=_money(employer_k, KOBO),
+                nsitf=_money(nsitf_k, KOBO),
+                itf=_money(itf_k, KOBO),
+                consolidated_relief=_money(cra_u, RELIEF_UNITS),
+                taxable_income=_money(taxable_u, RELIEF_UNITS),
+                annual_gross=_money(annual_gross_k, KOBO),
+                annual_paye=_money(annual_paye_t, TAX_UNITS),
+                effective_tax_rate=_money(rate_bp, 100),
+                paye_breakdown=[],
+            )
+
+    # ===========================================
+    # SCALAR FALLBACK
+    # ===========================================
+
+    def scalar_figures(self, employee) -> PayslipFigures:
+        """Figures for one employee via the per-employee breakdown (full period)."""
+        breakdown = self.scalar_breakdown(
+            basic_salary=employee.basic_salary,
+            housing_allowance=employee.housing_allowance,
+            transport_allowance=employee.transport_allowance,
+            other_allowances=employee.other_allowances,
+            is_pension_exempt=employee.is_pension_exempt,
+            is_nhf_exempt=employee.is_nhf_exempt,
+        )
+
+        def cents(value: Decimal) -> Decimal:
+            return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+        basic = cents(employee.basic_salary)
+        housing = cents(employee.housing_allowance)
+        transport = cents(employee.transport_allowance)
+        allowances = {
+            name: cents(Decimal(str(value)))
+            for name, value in (employee.other_allowances or {}).items()
+        }
+        other = sum(allowances.values(), Decimal("0"))
+        gross = basic + housing + transport + other
+        paye = cents(breakdown["monthly_paye"])
+        pension_employee = cents(breakdown["pension_employee"])
+        nhf = cents(breakdown["nhf"])
+        total_deductions = paye + pension_employee + nhf
+
+        return PayslipFigures(
+            basic_salary=basic,
+            housing_allowance=housing,
+            transport_allowance=transport,
+            other_allowances=allowances,
+            other_earnings=other,
+            gross_pay=gross,
+            paye_tax=paye,
+            pension_employee=pension_employee,
+            nhf=nhf,
+            total_deductions=total_deductions,
+            net_pay=gross - total_deductions,
+            pension_employer=cents(breakdown["pension_employer"]),
+            nsitf=cents(breakdown["nsitf"]),
+            itf=cents(breakdown["itf"]),
+            consolidated_relief=breakdown["consolidated_relief_allowance"],
+            taxable_income=breakdown["annual_taxable_income"],
+            annual_gross=breakdown["annual_gross"],
+            annual_paye=breakdown["annual_paye"],
+            effective_tax_rate=breakdown["effective_tax_rate"],
+            paye_breakdown=breakdown["paye_breakdown"],
+        )
@@ -42,6 +42,7 @@ from app.models.payroll import (
     PayItemType, PayItemCategory, EmployeeLoan, LoanStatus, LoanType
 )
 from app.services.tax_calculators.paye_service import PAYECalculator
+from app.utils.query_optimization import bulk_insert_rows
 
 
 # ===========================================
@@ -302,11 +303,13 @@ class PayrollService:
         pension_percentage: Decimal = PENSION_EMPLOYEE_RATE,
         is_pension_exempt: bool = False,
         is_nhf_exempt: bool = False,
+        include_paye_breakdown: bool = False,
     ) -> Dict[str, Any]:
         """
         Calculate complete salary breakdown with Nigerian compliance.
         
-        Returns monthly and annual figures for all components.
+        Returns monthly and annual figures for all components. The per-band
+        PAYE breakdown is only built when include_paye_breakdown is set.
         """
         # Convert other allowances
         other_allowances_decimal = {}
@@ -346,20 +349,21 @@ class PayrollService:
             nhf_relief = monthly_nhf * 12
         
         # Use PAYE calculator for tax
-        paye_result = self.paye_calculator.calculate_paye(
-            gross_annual_income=float(annual_gross),
-            basic_salary=float(basic_salary * 12),
-            pension_percentage=float(pension_percentage) if not is_pension_exempt else 0,
-            other_reliefs=float(nhf_relief) if not is_nhf_exempt else 0,
+        paye_result = self.paye_calculator.compute_paye(
+            gross_annual_income=annual_gross,
+            basic_salary=basic_salary * 12,
+            pension_percentage=pension_percentage if not is_pension_exempt else Decimal("0"),
+            other_reliefs=nhf_relief,
+            include_breakdown=include_paye_breakdown,
         )
         
-        annual_paye = Decimal(str(paye_result["annual_tax"]))
+        annual_paye = paye_result["annual_tax"]
         monthly_paye = (annual_paye / 12).quantize(
             Decimal("0.01"), rounding=ROUND_HALF_UP
         )
         
-        cra = Decimal(str(paye_result["reliefs"]["consolidated_relief"]))
-        annual_taxable = Decimal(str(paye_result["taxable_income"]))
+        cra = paye_result["reliefs"]["consolidated_relief"]
+        annual_taxable = paye_result["taxable_income"]
         
         # Total reliefs
         total_reliefs = cra + pension_relief + nhf_relief
@@ -423,7 +427,7 @@ class PayrollService:
             # Tax (PAYE)
             "annual_paye": annual_paye,
             "monthly_paye": monthly_paye,
-            "paye_breakdown": paye_result.get("band_breakdown", []),
+            "paye_breakdown": paye_result["band_breakdown"],
             "effective_tax_rate": effective_rate,
             
             # Deductions (Monthly)
@@ -537,41 +541,29 @@ class PayrollService:
         # Calculate days in period
         days_in_period = (period_end - period_start).days + 1
         
-        # Generate payslips
-        payslip_sequence = 0
-        total_gross = Decimal("0")
-        total_deductions = Decimal("0")
-        total_net = Decimal("0")
-        total_employer_contributions = Decimal("0")
-        total_paye = Decimal("0")
-        total_pension_employee = Decimal("0")
-        total_pension_employer = Decimal("0")
-        total_nhf = Decimal("0")
-        total_nsitf = Decimal("0")
-        total_itf = Decimal("0")
-        
-        for employee in employees:
-            payslip_sequence += 1
-            payslip = await self._generate_payslip(
-                payroll_run=payroll_run,
-                employee=employee,
-                payslip_number=f"{payroll_code}-{payslip_sequence:04d}",
-                days_in_period=days_in_period,
-            )
-            
-            # Accumulate totals
-            total_gross += payslip.gross_pay
-            total_deductions += payslip.total_deductions
-            total_net += payslip.net_pay
-            total_employer_contributions += (
-                payslip.pension_employer + payslip.nsitf + payslip.itf
-            )
-            total_paye += payslip.paye_tax
-            total_pension_employee += payslip.pension_employee
-            total_pension_employer += payslip.pension_employer
-            total_nhf += payslip.nhf
-            total_nsitf += payslip.nsitf
-            total_itf += payslip.itf
+        # Compute every payslip in one vectorized pass, then bulk insert
+        payslip_rows, item_rows = self._build_payslip_rows(
+            payroll_run=payroll_run,
+            employees=employees,
+            payroll_code=payroll_code,
+            days_in_period=days_in_period,
+        )
+        await self._bulk_insert(Payslip, payslip_rows)
+        await self._bulk_insert(PayslipItem, item_rows)
+        
+        def total(field: str) -> Decimal:
+            return sum((row[field] for row in payslip_rows), Decimal("0"))
+        
+        total_gross = total("gross_pay")
+        total_deductions = total("total_deductions")
+        total_net = total("net_pay")
+        total_paye = total("paye_tax")
+        total_pension_employee = total("pension_employee")
+        total_pension_employer = total("pension_employer")
+        total_nhf = total("nhf")
+        total_nsitf = total("nsitf")
+        total_itf = total("itf")
+        total_employer_contributions = total_pension_employer + total_nsitf + total_itf
         
         # Update payroll run totals
         payroll_run.total_employees = len(employees)
@@ -591,6 +583,129 @@ class PayrollService:
         
         return payroll_run
     
+    async def _bulk_insert(self, model, rows: List[Dict[str, Any]]):
+        """Insert rows with chunked multi-row INSERT statements."""
+        await bulk_insert_rows(self.db, model, rows)
+    
+    def _build_payslip_rows(
+        self,
+        payroll_run: PayrollRun,
+        employees: List[Employee],
+        payroll_code: str,
+        days_in_period: int,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Full-period payslip and payslip item rows for a payroll run.
+        
+        Produces the same values as _generate_payslip/_create_payslip_items,
+        computed for all employees at once by PayrollBatchEngine.
+        """
+        from app.services.payroll_engine import PayrollBatchEngine
+        
+        engine = PayrollBatchEngine(self.paye_calculator, self.calculate_salary_breakdown)
+        all_figures = engine.compute(employees)
+        
+        payslip_rows = []
+        item_rows = []
+        for sequence, (employee, figures) in enumerate(zip(employees, all_figures), start=1):
+            payslip_id = uuid.uuid4()
+            
+            primary_bank = None
+            for ba in employee.bank_accounts:
+                if ba.is_primary and ba.is_active:
+                    primary_bank = ba
+                    break
+            
+            payslip_rows.append({
+                "id": payslip_id,
+                "payroll_run_id": payroll_run.id,
+                "employee_id": employee.id,
+                "payslip_number": f"{payroll_code}-{sequence:04d}",
+                "days_in_period": days_in_period,
+                "days_worked": days_in_period,
+                "days_absent": 0,
+                "basic_salary": figures.basic_salary,
+                "housing_allowance": figures.housing_allowance,
+                "transport_allowance": figures.transport_allowance,
+                "other_earnings": figures.other_earnings,
+                "gross_pay": figures.gross_pay,
+                "paye_tax": figures.paye_tax,
+                "pension_employee": figures.pension_employee,
+                "nhf": figures.nhf,
+                "other_deductions": Decimal("0"),
+                "total_deductions": figures.total_deductions,
+                "net_pay": figures.net_pay,
+                "pension_employer": figures.pension_employer,
+                "nsitf": figures.nsitf,
+                "itf": figures.itf,
+                "consolidated_relief": figures.consolidated_relief,
+                "taxable_income": figures.taxable_income,
+                "earnings_breakdown": {
+                    "basic_salary": float(figures.basic_salary),
+                    "housing_allowance": float(figures.housing_allowance),
+                    "transport_allowance": float(figures.transport_allowance),
+                    **{name: float(amount) for name, amount in figures.other_allowances.items()},
+                },
+                "deductions_breakdown": {
+                    "paye_tax": float(figures.paye_tax),
+                    "pension_employee": float(figures.pension_employee),
+                    "nhf": float(figures.nhf),
+                },
+                "tax_calculation": {
+                    "annual_gross": float(figures.annual_gross),
+                    "annual_taxable": float(figures.taxable_income),
+                    "annual_paye": float(figures.annual_paye),
+                    "cra": float(figures.consolidated_relief),
+                    "effective_rate": float(figures.effective_tax_rate),
+                    "bands": figures.paye_breakdown,
+                },
+                "bank_name": primary_bank.bank_name if primary_bank else None,
+                "account_number": primary_bank.account_number if primary_bank else None,
+                "account_name": primary_bank.account_name if primary_bank else None,
+                "is_paid": False,
+                "is_emailed": False,
+            })
+            item_rows.extend(self._payslip_item_rows(payslip_id, figures))
+        
+        return payslip_rows, item_rows
+    
+    def _payslip_item_rows(self, payslip_id: uuid.UUID, figures) -> List[Dict[str, Any]]:
+        """Line item rows for one payslip, in _create_payslip_items order."""
+        lines = [
+            (PayItemType.EARNING, PayItemCategory.BASIC_SALARY, "Basic Salary", figures.basic_salary, False, True, True),
+            (PayItemType.EARNING, PayItemCategory.HOUSING_ALLOWANCE, "Housing Allowance", figures.housing_allowance, False, True, True),
+            (PayItemType.EARNING, PayItemCategory.TRANSPORT_ALLOWANCE, "Transport Allowance", figures.transport_allowance, False, True, True),
+        ]
+        for name, amount in figures.other_allowances.items():
+            lines.append((PayItemType.EARNING, PayItemCategory.OTHER_EARNING,
+                          name.replace("_", " ").title(), amount, False, True, False))
+        lines += [
+            (PayItemType.DEDUCTION, PayItemCategory.PAYE_TAX, "PAYE Tax", figures.paye_tax, True, False, False),
+            (PayItemType.DEDUCTION, PayItemCategory.PENSION_EMPLOYEE, "Pension (Employee 8%)", figures.pension_employee, True, False, False),
+            (PayItemType.DEDUCTION, PayItemCategory.NHF, "NHF (2.5%)", figures.nhf, True, False, False),
+            (PayItemType.EMPLOYER_CONTRIBUTION, PayItemCategory.PENSION_EMPLOYER, "Pension (Employer 10%)", figures.pension_employer, True, False, False),
+            (PayItemType.EMPLOYER_CONTRIBUTION, PayItemCategory.NSITF, "NSITF (1%)", figures.nsitf, True, False, False),
+            (PayItemType.EMPLOYER_CONTRIBUTION, PayItemCategory.ITF, "ITF (1%)", figures.itf, True, False, False),
+        ]
+        
+        rows = []
+        for item_type, category, name, amount, statutory, taxable, pensionable in lines:
+            if amount > 0:
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "payslip_id": payslip_id,
+                    "item_type": item_type,
+                    "category": category,
+                    "name": name,
+                    "amount": amount,
+                    "is_percentage": False,
+                    "is_statutory": statutory,
+                    "is_taxable": taxable,
+                    "is_pensionable": pensionable,
+                    "sort_order": len(rows) + 1,
+                })
+        return rows
+    
     async def _generate_payslip(
         self,
         payroll_run: PayrollRun,
@@ -0,0 +1,362 @@
+"""
+TekVwarho ProAudit - Platform Metrics
+
+Materialized platform-wide counters for the staff dashboards (super admin,
+admin, customer service, marketing), so a page load reads a few dozen
+counter rows instead of counting users, organizations, invoices and
+tickets.
+
+Counters move with domain events. A before_flush hook turns every
+inserted, modified and deleted Organization, User, Invoice, Transaction or
+SupportTicket into counter deltas and adds them with one upsert on the
+flushing connection, so counters commit or roll back with the change. Each
+flush writes to a random one of settings.platform_metric_shards rows per
+counter, which keeps signups and postings in different tenants from
+queueing on one hot row.
+
+Windowed figures (new users in 30 days, tickets resolved today, SLA
+breaches) and distinct counts cannot be maintained this way; they, and
+any drift from statements that bypass the ORM, are corrected by
+refresh_platform_metrics, which recounts everything from the source tables
+on a schedule. Readers get the time of that recount with the counters.
+"""
+
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.invoice import Invoice
+from app.models.organization import Organization, SubscriptionTier
+from app.models.platform_metric import PlatformMetric
+from app.models.support_ticket import SupportTicket, TicketPriority, TicketStatus
+from app.models.transaction import Transaction
+from app.models.user import User
+
+# Ticket statuses counted as open (matches SupportTicketService)
+OPEN_TICKET_STATUSES = (
+    TicketStatus.OPEN,
+    TicketStatus.IN_PROGRESS,
+    TicketStatus.PENDING_CUSTOMER,
+    TicketStatus.ON_HOLD,
+)
+
+Counts = Dict[str, int]
+
+
+def _label(value: Any, fallback: str = "unknown") -> str:
+    if value is None:
+        return fallback
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def month_key(moment: Optional[datetime]) -> str:
+    """Counter suffix for the calendar month (UTC) of a timestamp."""
+    return (moment or datetime.utcnow()).strftime("%Y-%m")
+
+
+def organization_contribution(values: Dict[str, Any]) -> Counts:
+    return {
+        "organizations.total": 1,
+        f"organizations.verification.{_label(values['verification_status'])}": 1,
+        f"organizations.type.{_label(values['organization_type'])}": 1,
+        f"organizations.tier.{_label(values['subscription_tier'], SubscriptionTier.FREE.value)}": 1,
+        "organizations.referred": int(values["referred_by_code"] is not None),
+    }
+
+
+def user_contribution(values: Dict[str, Any]) -> Counts:
+    if values["is_platform_staff"]:
+        return {"users.staff": 1, f"users.staff_role.{_label(values['platform_role'])}": 1}
+    return {"users.customers": 1, "users.impersonatable": int(bool(values["can_be_impersonated"]))}
+
+
+def invoice_contribution(values: Dict[str, Any]) -> Counts:
+    month = month_key(values["created_at"])
+    return {
+        f"invoices.created.{month}": 1,
+        f"invoices.nrs_submitted.{month}": int(values["nrs_irn"] is not None),
+        "invoices.nrs_locked": int(bool(values["is_nrs_locked"])),
+    }
+
+
+def transaction_contribution(values: Dict[str, Any]) -> Counts:
+    return {f"transactions.created.{month_key(values['created_at'])}": 1}
+
+
+def ticket_contribution(values: Dict[str, Any]) -> Counts:
+    is_open = values["status"] in OPEN_TICKET_STATUSES
+    return {
+        "tickets.open": int(is_open),
+        "tickets.critical_open": int(is_open and values["priority"] == TicketPriority.CRITICAL),
+    }
+
+
+# Source attributes each counter depends on
+SOURCES: Dict[type, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Counts]]] = {
+    Organization: (
+        ("verification_status", "organization_type", "subscription_tier", "referred_by_code"),
+        organization_contribution,
+    ),
+    User: (("is_platform_staff", "platform_role", "can_be_impersonated"), user_contribution),
+    Invoice: (("created_at", "nrs_irn", "is_nrs_locked"), invoice_contribution),
+    Transaction: (("created_at",), transaction_contribution),
+    SupportTicket: (("status", "priority"), ticket_contribution),
+}
+
+
+def _values(obj: Any, fields: Tuple[str, ...], committed: bool) -> Dict[str, Any]:
+    """Attribute values, or as last loaded; unset attributes of new rows take their column default."""
+    if committed:
+        previous = inspect(obj).committed_state
+        return {name: previous.get(name, getattr(obj, name)) for name in fields}
+    values = {}
+    for name in fields:
+        value = getattr(obj, name)
+        default = obj.__table__.c[name].default
+        if value is None and default is not None and default.is_scalar:
+            value = default.arg
+        values[name] = value
+    return values
+
+
+def metric_deltas(new: Iterable[Any], dirty: Iterable[Any], deleted: Iterable[Any]) -> Counts:
+    """
+    Net counter changes for a flush.
+
+    New rows add their contribution, deleted rows subtract what they
+    contributed when loaded, and modified rows do both; modified rows none
+    of whose counted attributes changed are skipped without loading
+    anything.
+    """
+    deltas: Counts = defaultdict(int)
+
+    def apply(obj: Any, committed: bool, sign: int):
+        fields, contribution = SOURCES[type(obj)]
+        for metric, value in contribution(_values(obj, fields, committed)).items():
+            deltas[metric] += sign * value
+
+    for obj in new:
+        if type(obj) in SOURCES:
+            apply(obj, committed=False, sign=1)
+    for obj in deleted:
+        if type(obj) in SOURCES:
+            apply(obj, committed=True, sign=-1)
+    for obj in dirty:
+        if type(obj) in SOURCES:
+            changed = inspect(obj).committed_state
+            if any(name in changed for name in SOURCES[type(obj)][0]):
+                apply(obj, committed=True, sign=-1)
+                apply(obj, committed=False, sign=1)
+
+    return {metric: value for metric, value in deltas.items() if value}
+
+
+def row_deltas(model: type, rows: Iterable[Dict[str, Any]]) -> Counts:
+    """Counter changes for rows inserted without the ORM (e.g. by COPY), given as column values."""
+    if model not in SOURCES:
+        return {}
+    fields, contribution = SOURCES[model]
+    deltas: Counts = defaultdict(int)
+    for values in rows:
+        for metric, value in contribution({name: values.get(name) for name in fields}).items():
+            deltas[metric] += value
+    return {metric: value for metric, value in deltas.items() if value}
+
+
+def random_shard() -> int:
+    """Shard a writer adds its increments to."""
+    return random.randrange(max(settings.platform_metric_shards, 1))
+
+
+def increment_statement(deltas: Counts, shard: int):
+    """Additive upsert of deltas into one shard, in metric order so writers lock rows alike."""
+    statement = pg_insert(PlatformMetric).values([
+        {"id": uuid.uuid4(), "metric": metric, "shard": shard, "value": value}
+        for metric, value in sorted(deltas.items())
+    ])
+    return statement.on_conflict_do_update(
+        constraint="uq_platform_metrics_metric_shard",
+        set_={
+            "value": PlatformMetric.__table__.c.value + statement.excluded.value,
+            "updated_at": func.now(),
+        },
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _apply_metric_deltas(session: Session, flush_context, instances):
+    deltas = metric_deltas(session.new, session.dirty, session.deleted)
+    if deltas and session.get_bind().dialect.name == "postgresql":
+        session.connection().execute(increment_statement(deltas, random_shard()))
+
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    return value
+
+
+# Load the previous value before an attribute is overwritten, so deltas
+# are exact even for attributes that were expired when they were set
+for _model, (_fields, _) in SOURCES.items():
+    for _name in _fields:
+        event.listen(getattr(_model, _name), "set", _keep_previous_value, active_history=True, retval=True)
+
+
+# ===========================================
+# REFRESH
+# ===========================================
+
+def _add(counts: Counts, contribution: Counts, times: int = 1):
+    for metric, value in contribution.items():
+        counts[metric] += value * times
+
+
+async def count_platform_metrics(db: AsyncSession, now: Optional[datetime] = None) -> Counts:
+    """Every counter recounted from the source tables (five aggregate queries)."""
+    now = now or datetime.utcnow()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month = month_key(now)
+    counts: Counts = defaultdict(int)
+
+    result = await db.execute(
+        select(
+            Organization.verification_status,
+            Organization.organization_type,
+            Organization.subscription_tier,
+            func.count(),
+            func.count().filter(Organization.referred_by_code.isnot(None)),
+        ).group_by(Organization.verification_status, Organization.organization_type, Organization.subscription_tier)
+    )
+    for status, org_type, tier, total, referred in result.all():
+        _add(counts, organization_contribution({
+            "verification_status": status, "organization_type": org_type,
+            "subscription_tier": tier, "referred_by_code": None,
+        }), total)
+        counts["organizations.referred"] += referred
+
+    result = await db.execute(
+        select(
+            User.is_platform_staff,
+            User.platform_role,
+            User.can_be_impersonated,
+            func.count(),
+            func.count().filter(User.created_at >= now - timedelta(days=30)),
+        ).group_by(User.is_platform_staff, User.platform_role, User.can_be_impersonated)
+    )
+    for is_staff, role, impersonatable, total, recent in result.all():
+        _add(counts, user_contribution({
+            "is_platform_staff": is_staff, "platform_role": role, "can_be_impersonated": impersonatable,
+        }), total)
+        if not is_staff:
+            counts["users.new_30d"] += recent
+
+    result = await db.execute(
+        select(
+            func.count().filter(Invoice.created_at >= month_start),
+            func.count().filter(and_(Invoice.created_at >= month_start, Invoice.nrs_irn.isnot(None))),
+            func.count().filter(Invoice.is_nrs_locked == True),
+            func.count(Invoice.created_by_id.distinct()),
+        )
+    )
+    created, submitted, locked, creators = result.one()
+    counts[f"invoices.created.{month}"] = created
+    counts[f"invoices.nrs_submitted.{month}"] = submitted
+    counts["invoices.nrs_locked"] = locked
+    counts["invoices.creators"] = creators
+
+    result = await db.execute(select(func.count()).where(Transaction.created_at >= month_start))
+    counts[f"transactions.created.{month}"] = result.scalar() or 0
+
+    is_open = SupportTicket.status.in_(OPEN_TICKET_STATUSES)
+    result = await db.execute(
+        select(
+            func.count().filter(is_open),
+            func.count().filter(and_(is_open, SupportTicket.priority == TicketPriority.CRITICAL)),
+            func.count().filter(and_(
+                is_open, SupportTicket.sla_due_at < now, SupportTicket.sla_breached == True,
+            )),
+            func.count().filter(and_(
+                SupportTicket.status == TicketStatus.RESOLVED, SupportTicket.resolved_at >= day_start,
+            )),
+        )
+    )
+    (counts["tickets.open"], counts["tickets.critical_open"],
+     counts["tickets.sla_breached"], counts["tickets.resolved_today"]) = result.one()
+
+    return dict(counts)
+
+
+async def refresh_platform_metrics(db: AsyncSession, now: Optional[datetime] = None) -> int:
+    """
+    Replace every counter with a recount from the source tables.
+
+    Counters are written to shard 0 with refreshed_at set; the other shards
+    and counters for past months are dropped. An increment committed
+    between the recount and the rewrite is lost until the next refresh.
+    The caller commits. Returns the number of counters written.
+    """
+    counts = await count_platform_metrics(db, now)
+    await db.execute(delete(PlatformMetric))
+    statement = pg_insert(PlatformMetric).values([
+        {"id": uuid.uuid4(), "metric": metric, "shard": 0, "value": value, "refreshed_at": func.now()}
+        for metric, value in sorted(counts.items())
+    ])
+    # An increment committed since the delete may have written a row first; take the recount
+    await db.execute(statement.on_conflict_do_update(
+        constraint="uq_platform_metrics_metric_shard",
+        set_={
+            "value": statement.excluded.value,
+            "refreshed_at": statement.excluded.refreshed_at,
+            "updated_at": func.now(),
+        },
+    ))
+    return len(counts)
+
+
+# ===========================================
+# DASHBOARD READS
+# ===========================================
+
+async def load_platform_metrics(db: AsyncSession) -> Dict[str, Any]:
+    """
+    All counters with their freshness, in one query over the metric rows.
+
+    Returns {"counts": {metric: value}, "refreshed_at": last recount,
+    "updated_at": last change}; both times are None before the first
+    refresh.
+    """
+    result = await db.execute(
+        select(
+            PlatformMetric.metric,
+            func.sum(PlatformMetric.value),
+            func.max(PlatformMetric.refreshed_at),
+            func.max(PlatformMetric.updated_at),
+        ).group_by(PlatformMetric.metric)
+    )
+    counts: Counts = {}
+    refreshed_at = updated_at = None
+    for metric, value, refreshed, updated in result.all():
+        counts[metric] = int(value or 0)
+        if refreshed is not None and (refreshed_at is None or refreshed > refreshed_at):
+            refreshed_at = refreshed
+        if updated is not None and (updated_at is None or updated > updated_at):
+            updated_at = updated
+    return {"counts": counts, "refreshed_at": refreshed_at, "updated_at": updated_at}
+
+
+def metric_group(counts: Counts, prefix: str) -> Counts:
+    """Non-zero counters under prefix, keyed by the remaining name."""
+    prefix = prefix.rstrip(".") + "."
+    return {
+        metric[len(prefix):]: value
+        for metric, value in counts.items()
+        if metric.startswith(prefix) and value
+    }
@@ -18,6 +18,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum as PyEnum
+from types import SimpleNamespace
 
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -50,6 +51,7 @@ from app.models.accounting import (
     FiscalYear, FiscalPeriod, AccountBalance
 )
 from app.models.entity import BusinessEntity
+from app.services.compute_pool import run_compute
 
 
 class ReportFormat(str, PyEnum):
@@ -146,9 +148,13 @@ class FinancialReportExportService:
         data = await self._get_balance_sheet_data(entity_id, as_of_date, comparative_date)
         
         if format == ReportFormat.PDF:
-            return self._generate_balance_sheet_pdf(entity, data, as_of_date, comparative_date)
+            return await self._render(
+                "_generate_balance_sheet_pdf", entity, data, as_of_date, comparative_date
+            )
         elif format == ReportFormat.EXCEL:
-            return self._generate_balance_sheet_excel(entity, data, as_of_date, comparative_date)
+            return await self._render(
+                "_generate_balance_sheet_excel", entity, data, as_of_date, comparative_date
+            )
         else:
             return self._generate_balance_sheet_csv(entity, data, as_of_date)
     
@@ -170,9 +176,13 @@ class FinancialReportExportService:
         )
         
         if format == ReportFormat.PDF:
-            return self._generate_income_statement_pdf(entity, data, start_date, end_date)
+            return await self._render(
+                "_generate_income_statement_pdf", entity, data, start_date, end_date
+            )
         elif format == ReportFormat.EXCEL:
-            return self._generate_income_statement_excel(entity, data, start_date, end_date)
+            return await self._render(
+                "_generate_income_statement_excel", entity, data, start_date, end_date
+            )
         else:
             return self._generate_income_statement_csv(entity, data, start_date, end_date)
     
@@ -190,9 +200,13 @@ class FinancialReportExportService:
         data = await self._get_trial_balance_data(entity_id, as_of_date, include_zero_balances)
         
         if format == ReportFormat.PDF:
-            return self._generate_trial_balance_pdf(entity, data, as_of_date)
+            return await self._render(
+                "_generate_trial_balance_pdf", entity, data, as_of_date
+            )
         elif format == ReportFormat.EXCEL:
-            return self._generate_trial_balance_excel(entity, data, as_of_date)
+            return await self._render(
+                "_generate_trial_balance_excel", entity, data, as_of_date
+            )
         else:
             return self._generate_trial_balance_csv(entity, data, as_of_date)
     
@@ -211,12 +225,29 @@ class FinancialReportExportService:
         data = await self._get_general_ledger_data(entity_id, start_date, end_date, account_id)
         
         if format == ReportFormat.PDF:
-            return self._generate_general_ledger_pdf(entity, data, start_date, end_date)
+            return await self._render(
+                "_generate_general_ledger_pdf", entity, data, start_date, end_date
+            )
         elif format == ReportFormat.EXCEL:
-            return self._generate_general_ledger_excel(entity, data, start_date, end_date)
+            return await self._render(
+                "_generate_general_ledger_excel", entity, data, start_date, end_date
+            )
         else:
             return self._generate_general_ledger_csv(entity, data, start_date, end_date)
     
+    async def _render(self, renderer: str, *args) -> Tuple[bytes, str]:
+        """
+        Run a synchronous PDF/Excel renderer on the compute pool.
+        
+        ReportLab and openpyxl hold the GIL for the whole render, so they run
+        in a worker process; an entity is passed as a name-only snapshot.
+        """
+        args = tuple(
+            SimpleNamespace(name=arg.name) if isinstance(arg, BusinessEntity) else arg
+            for arg in args
+        )
+        return await run_compute("render", render_financial_report, renderer, *args)
+    
     # =========================================================================
     # DATA RETRIEVAL METHODS
     # =========================================================================
@@ -1727,11 +1758,13 @@ class FinancialReportExportService:
         group_name = group.name if group else "Consolidated Group"
         
         if format == ReportFormat.PDF:
-            return await self._generate_consolidated_balance_sheet_pdf(
+            return await self._render(
+                "_generate_consolidated_balance_sheet_pdf",
                 data, group_name, as_of_date, include_minority_interest
             )
         elif format == ReportFormat.EXCEL:
-            return await self._generate_consolidated_balance_sheet_excel(
+            return await self._render(
+                "_generate_consolidated_balance_sheet_excel",
                 data, group_name, as_of_date, include_minority_interest
             )
         else:  # CSV
@@ -1739,7 +1772,7 @@ class FinancialReportExportService:
                 data, group_name, as_of_date
             )
     
-    async def _generate_consolidated_balance_sheet_pdf(
+    def _generate_consolidated_balance_sheet_pdf(
         self,
         data: Dict[str, Any],
         group_name: str,
@@ -1824,7 +1857,7 @@ class FinancialReportExportService:
         filename = f"consolidated_balance_sheet_{group_name.replace(' ', '_')}_{as_of_date.strftime('%Y%m%d')}.pdf"
         return content, filename
     
-    async def _generate_consolidated_balance_sheet_excel(
+    def _generate_consolidated_balance_sheet_excel(
         self,
         data: Dict[str, Any],
         group_name: str,
@@ -1949,11 +1982,13 @@ class FinancialReportExportService:
         group_name = group.name if group else "Consolidated Group"
         
         if format == ReportFormat.PDF:
-            return await self._generate_consolidated_income_statement_pdf(
+            return await self._render(
+                "_generate_consolidated_income_statement_pdf",
                 data, group_name, start_date, end_date
             )
         elif format == ReportFormat.EXCEL:
-            return await self._generate_consolidated_income_statement_excel(
+            return await self._render(
+                "_generate_consolidated_income_statement_excel",
                 data, group_name, start_date, end_date
             )
         else:  # CSV
@@ -1961,7 +1996,7 @@ class FinancialReportExportService:
                 data, group_name, start_date, end_date
             )
     
-    async def _generate_consolidated_income_statement_pdf(
+    def _generate_consolidated_income_statement_pdf(
         self,
         data: Dict[str, Any],
         group_name: str,
@@ -2034,7 +2069,7 @@ class FinancialReportExportService:
         filename = f"consolidated_income_statement_{group_name.replace(' ', '_')}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.pdf"
         return content, filename
     
-    async def _generate_consolidated_income_statement_excel(
+    def _generate_consolidated_income_statement_excel(
         self,
         data: Dict[str, Any],
         group_name: str,
@@ -2147,13 +2182,17 @@ class FinancialReportExportService:
         group_name = group.name if group else "Consolidated Group"
         
         if format == ReportFormat.PDF:
-            return await self._generate_consolidated_trial_balance_pdf(data, group_name, as_of_date)
+            return await self._render(
+                "_generate_consolidated_trial_balance_pdf", data, group_name, as_of_date
+            )
         elif format == ReportFormat.EXCEL:
-            return await self._generate_consolidated_trial_balance_excel(data, group_name, as_of_date)
+            return await self._render(
+                "_generate_consolidated_trial_balance_excel", data, group_name, as_of_date
+            )
         else:  # CSV
             return await self._generate_consolidated_trial_balance_csv(data, group_name, as_of_date)
     
-    async def _generate_consolidated_trial_balance_pdf(
+    def _generate_consolidated_trial_balance_pdf(
         self,
         data: Dict[str, Any],
         group_name: str,
@@ -2217,7 +2256,7 @@ class FinancialReportExportService:
         filename = f"consolidated_trial_balance_{group_name.replace(' ', '_')}_{as_of_date.strftime('%Y%m%d')}.pdf"
         return content, filename
     
-    async def _generate_consolidated_trial_balance_excel(
+    def _generate_consolidated_trial_balance_excel(
         self,
         data: Dict[str, Any],
         group_name: str,
@@ -2283,4 +2322,9 @@ class FinancialReportExportService:
         
         content = buffer.getvalue().encode('utf-8')
         filename = f"consolidated_trial_balance_{group_name.replace(' ', '_')}_{as_of_date.strftime('%Y%m%d')}.csv"
-        return content, filename
\ No newline at end of file
+        return content, filename
+
+
+def render_financial_report(renderer: str, *args) -> Tuple[bytes, str]:
+    """Compute pool entry point: call one of the service's sync renderers."""
+    return getattr(FinancialReportExportService(None), renderer)(*args)
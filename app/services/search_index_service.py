@@ -0,0 +1,343 @@
+"""
+TekVwarho ProAudit - Search Index
+
+Keeps search_documents in step with transactions, invoices, customers,
+vendors and inventory items, and answers global search from it with one
+ranked query.
+
+An after_flush hook writes the document of every inserted or modified
+source row (only when a searchable or displayed field changed) and
+removes the documents of deleted rows, on the flushing connection, so the
+index commits or rolls back with the change. Statements that bypass the
+ORM are not seen; their callers, and the initial backfill, run
+rebuild_search_documents.
+
+Matching combines three indexed predicates over one entity's documents:
+full-text prefix matching on search_vector ("inv 204" finds
+"INV-2026-0204"), trigram word similarity for typos ("adebyo" finds
+"Adebayo Stores"), and substring LIKE for fragments in the middle of
+numbers. Candidates are capped at settings.search_candidate_limit before
+ranking, which bounds latency for very broad terms.
+"""
+
+import re
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, event, exists, func, inspect, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.customer import Customer
+from app.models.inventory import InventoryItem
+from app.models.invoice import Invoice
+from app.models.search_document import SearchDocument
+from app.models.transaction import Transaction
+from app.models.vendor import Vendor
+
+# Query parameter names (as accepted by the search endpoint) -> resource types
+SEARCH_TYPES = {
+    "transactions": "transaction",
+    "invoices": "invoice",
+    "customers": "customer",
+    "vendors": "vendor",
+    "inventory": "inventory",
+}
+
+RESULT_URLS = {
+    "transaction": "/transactions/{id}",
+    "invoice": "/invoices/{id}",
+    "customer": "/customers/{id}",
+    "vendor": "/vendors/{id}",
+    "inventory": "/inventory/{id}",
+}
+
+Document = Dict[str, Any]
+
+
+def _search_text(*parts: Any) -> str:
+    return " ".join(str(part).lower() for part in parts if part)
+
+
+def _naira(value: Any) -> str:
+    return f"₦{Decimal(str(value or 0)):,.2f}"
+
+
+def _label(value: Any) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def transaction_document(row: Any) -> Document:
+    return {
+        "title": row.description or "Transaction",
+        "subtitle": f"{_naira(row.amount)} - {row.transaction_date}",
+        "search_text": _search_text(row.description, row.reference),
+    }
+
+
+def invoice_document(row: Any) -> Document:
+    return {
+        "title": row.invoice_number,
+        "subtitle": f"{_naira(row.total_amount)} - {_label(row.status)}",
+        "search_text": _search_text(row.invoice_number, row.notes),
+    }
+
+
+def customer_document(row: Any) -> Document:
+    return {
+        "title": row.name,
+        "subtitle": row.email or row.phone,
+        "search_text": _search_text(row.name, row.email, row.phone),
+    }
+
+
+def vendor_document(row: Any) -> Document:
+    return {
+        "title": row.name,
+        "subtitle": row.email or row.tin,
+        "search_text": _search_text(row.name, row.email, row.tin),
+    }
+
+
+def inventory_document(row: Any) -> Document:
+    return {
+        "title": row.name,
+        "subtitle": f"SKU: {row.sku} - Qty: {row.quantity_on_hand}",
+        "search_text": _search_text(row.name, row.sku, row.description),
+    }
+
+
+# Model -> (resource type, attributes the document is built from, builder)
+SOURCES: Dict[type, Tuple[str, Tuple[str, ...], Callable[[Any], Document]]] = {
+    Transaction: (
+        "transaction",
+        ("description", "reference", "amount", "transaction_date"),
+        transaction_document,
+    ),
+    Invoice: ("invoice", ("invoice_number", "notes", "total_amount", "status"), invoice_document),
+    Customer: ("customer", ("name", "email", "phone"), customer_document),
+    Vendor: ("vendor", ("name", "email", "tin"), vendor_document),
+    InventoryItem: ("inventory", ("name", "sku", "description", "quantity_on_hand"), inventory_document),
+}
+
+
+def build_document(model: type, row: Any) -> Optional[Document]:
+    """search_documents row for a source object or a selected row with the same attribute names."""
+    resource_type, _, builder = SOURCES[model]
+    if row.id is None or row.entity_id is None:
+        return None
+    document = builder(row)
+    return {
+        "id": uuid.uuid4(),
+        "entity_id": row.entity_id,
+        "resource_type": resource_type,
+        "resource_id": row.id,
+        "title": str(document["title"] or resource_type.title())[:500],
+        "subtitle": str(document["subtitle"])[:500] if document["subtitle"] else None,
+        "search_text": document["search_text"],
+    }
+
+
+def document_changes(
+    new: Iterable[Any], dirty: Iterable[Any], deleted: Iterable[Any]
+) -> Tuple[List[Document], List[Tuple[str, uuid.UUID]]]:
+    """
+    Documents to write and (resource_type, resource_id) pairs to remove for a flush.
+
+    Modified rows are rewritten only when a field their document is built
+    from changed, so status-only or bookkeeping updates cost nothing.
+    """
+    documents: List[Document] = []
+    for obj in new:
+        if type(obj) in SOURCES:
+            documents.append(build_document(type(obj), obj))
+    for obj in dirty:
+        if type(obj) in SOURCES:
+            changed = inspect(obj).committed_state
+            if any(name in changed for name in ("entity_id", *SOURCES[type(obj)][1])):
+                documents.append(build_document(type(obj), obj))
+    removed = [(SOURCES[type(obj)][0], obj.id) for obj in deleted if type(obj) in SOURCES]
+    return [document for document in documents if document], removed
+
+
+def upsert_statement(documents: List[Document]):
+    """Insert or replace documents, in resource order so concurrent writers lock rows alike."""
+    return _replace_existing(pg_insert(SearchDocument).values(
+        sorted(documents, key=lambda document: (document["resource_type"], str(document["resource_id"])))
+    ))
+
+
+def bulk_upsert_statement():
+    """
+    upsert_statement taking the documents as executemany parameters.
+
+    For thousands of documents at a time (bulk imports): the driver
+    batches the rows instead of SQLAlchemy building one statement with a
+    VALUES entry per document.
+    """
+    return _replace_existing(pg_insert(SearchDocument.__table__))
+
+
+def _replace_existing(statement):
+    return statement.on_conflict_do_update(
+        constraint="uq_search_documents_resource",
+        set_={
+            "entity_id": statement.excluded.entity_id,
+            "title": statement.excluded.title,
+            "subtitle": statement.excluded.subtitle,
+            "search_text": statement.excluded.search_text,
+            "updated_at": func.now(),
+        },
+    )
+
+
+def removal_statement(removed: List[Tuple[str, uuid.UUID]]):
+    return delete(SearchDocument).where(
+        tuple_(SearchDocument.resource_type, SearchDocument.resource_id).in_(removed)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_documents(session: Session, flush_context):
+    # New rows have their ids here; attribute history is still pre-flush
+    documents, removed = document_changes(session.new, session.dirty, session.deleted)
+    if not (documents or removed) or session.get_bind().dialect.name != "postgresql":
+        return
+    connection = session.connection()
+    if removed:
+        connection.execute(removal_statement(removed))
+    if documents:
+        connection.execute(upsert_statement(documents))
+
+
+# ===========================================
+# REBUILD
+# ===========================================
+
+async def rebuild_search_documents(
+    db: AsyncSession,
+    entity_id: Optional[uuid.UUID] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Rewrite search documents from the source tables.
+
+    Walks each source table in id order (keyset batches of
+    settings.search_backfill_batch_size), upserting documents and
+    committing after every batch so a backfill over millions of rows never
+    holds one long transaction; then removes documents whose source row no
+    longer exists. Optionally limited to one entity. Returns the number of
+    documents written.
+    """
+    batch_size = batch_size or settings.search_backfill_batch_size
+    written = 0
+    for model, (resource_type, fields, _) in SOURCES.items():
+        columns = [model.id, model.entity_id, *[getattr(model, name) for name in fields]]
+        last_id = None
+        while True:
+            query = select(*columns).order_by(model.id).limit(batch_size)
+            if entity_id is not None:
+                query = query.where(model.entity_id == entity_id)
+            if last_id is not None:
+                query = query.where(model.id > last_id)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+            documents = [document for document in (build_document(model, row) for row in rows) if document]
+            if documents:
+                await db.execute(upsert_statement(documents))
+                written += len(documents)
+            await db.commit()
+            last_id = rows[-1].id
+
+        orphaned = delete(SearchDocument).where(
+            SearchDocument.resource_type == resource_type,
+            ~exists().where(model.id == SearchDocument.resource_id),
+        )
+        if entity_id is not None:
+            orphaned = orphaned.where(SearchDocument.entity_id == entity_id)
+        await db.execute(orphaned)
+        await db.commit()
+    return written
+
+
+# ===========================================
+# SEARCH
+# ===========================================
+
+def prefix_query(q: str) -> Optional[str]:
+    """to_tsquery text matching every word of q as a prefix, or None if q has no words."""
+    words = re.findall(r"\w+", q.lower())
+    return " & ".join(f"{word}:*" for word in words) or None
+
+
+def search_statement(entity_id: uuid.UUID, q: str, resource_types: Iterable[str], limit: int):
+    """
+    Ranked matches for one entity, at most limit per resource type.
+
+    Rank is trigram word similarity plus full-text cover density, with
+    title words weighted above the other searchable fields.
+    """
+    document = SearchDocument
+    text = q.strip().lower()
+    prefixes = prefix_query(text)
+    tsquery = func.to_tsquery("simple", prefixes) if prefixes else None
+
+    matches = [document.search_text.op("%>")(text)]
+    if tsquery is not None:
+        matches.append(document.search_vector.op("@@")(tsquery))
+    if len(text) >= 3:
+        # Trigram indexes serve LIKE only from three characters
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        matches.append(document.search_text.like(f"%{escaped}%", escape="\\"))
+
+    candidates = (
+        select(
+            document.resource_type,
+            document.resource_id,
+            document.title,
+            document.subtitle,
+            document.search_text,
+            document.search_vector,
+        )
+        .where(
+            and_(
+                document.entity_id == entity_id,
+                document.resource_type.in_(list(resource_types)),
+                or_(*matches),
+            )
+        )
+        .limit(settings.search_candidate_limit)
+        .subquery()
+    )
+    score = func.word_similarity(text, candidates.c.search_text)
+    if tsquery is not None:
+        score = score + func.ts_rank_cd(candidates.c.search_vector, tsquery)
+    ranked = select(
+        candidates.c.resource_type,
+        candidates.c.resource_id,
+        candidates.c.title,
+        candidates.c.subtitle,
+        score.label("score"),
+        func.row_number().over(partition_by=candidates.c.resource_type, order_by=score.desc()).label("position"),
+    ).subquery()
+    return (
+        select(ranked.c.resource_type, ranked.c.resource_id, ranked.c.title, ranked.c.subtitle, ranked.c.score)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.score.desc(), ranked.c.title)
+    )
+
+
+async def search_documents(
+    db: AsyncSession,
+    entity_id: uuid.UUID,
+    q: str,
+    resource_types: Iterable[str],
+    limit: int,
+) -> List[Any]:
+    """Run search_statement; rows have resource_type, resource_id, title, subtitle and score."""
+    result = await db.execute(search_statement(entity_id, q, resource_types, limit))
+    return list(result.all())
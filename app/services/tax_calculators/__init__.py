@@ -68,7 +68,7 @@ def calculate_paye(annual_income: Decimal) -> Decimal:
         Total PAYE tax amount
     """
     calculator = PAYECalculator()
-    total_tax, _ = calculator.calculate_tax(annual_income)
+    total_tax, _ = calculator.calculate_tax(annual_income, include_breakdown=False)
     return total_tax
 
 
@@ -25,6 +25,8 @@ from enum import Enum
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.tax_calculators.tax_schedule import RateTiers
+
 
 class CompanySize(str, Enum):
     """Company size classification for CIT purposes."""
@@ -64,6 +66,13 @@ CIT_RATES = [
     ),
 ]
 
+# Tiers keyed on each size's inclusive turnover ceiling (bisect lookup)
+CIT_TIERS = RateTiers(
+    ceilings=tuple(r.turnover_max for r in CIT_RATES if r.turnover_max is not None),
+    rates=tuple(r.rate for r in CIT_RATES),
+)
+CIT_TIER_SIZES = tuple(r.size for r in CIT_RATES)
+
 # Tertiary Education Tax rate
 TET_RATE = Decimal("3")  # 3% of assessable profit
 
@@ -89,14 +98,7 @@ class CITCalculator:
         Returns:
             CompanySize enum value
         """
-        t = Decimal(str(turnover))
-        
-        if t <= Decimal("25000000"):
-            return CompanySize.SMALL
-        elif t <= Decimal("100000000"):
-            return CompanySize.MEDIUM
-        else:
-            return CompanySize.LARGE
+        return CIT_TIER_SIZES[CIT_TIERS.tier_index(Decimal(str(turnover)))]
     
     @staticmethod
     def get_cit_rate(turnover: float) -> Decimal:
@@ -109,16 +111,7 @@ class CITCalculator:
         Returns:
             CIT rate as percentage
         """
-        t = Decimal(str(turnover))
-        
-        for rate_info in CIT_RATES:
-            if rate_info.turnover_max is None:
-                if t >= rate_info.turnover_min:
-                    return rate_info.rate
-            elif rate_info.turnover_min <= t <= rate_info.turnover_max:
-                return rate_info.rate
-        
-        return Decimal("30")  # Default to large company rate
+        return CIT_TIERS.rate(Decimal(str(turnover)))
     
     @staticmethod
     def calculate_cit(
@@ -26,6 +26,7 @@ from sqlalchemy import select, func, extract
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.tax import PAYERecord
+from app.services.tax_calculators.tax_schedule import TaxSchedule, compile_tax_schedule
 
 
 @dataclass
@@ -76,11 +77,15 @@ class PAYECalculator:
     """
     PAYE (Pay As You Earn) calculator for Nigerian tax system.
     
-    Implements the 2026 tax reform rates.
+    Implements the 2026 tax reform rates. Bands are compiled into a shared
+    TaxSchedule, so building a calculator per request is cheap.
     """
     
-    def __init__(self, tax_bands: List[PAYETaxBand] = None):
+    def __init__(self, tax_bands: List[PAYETaxBand] = None, schedule: Optional[TaxSchedule] = None):
         self.tax_bands = tax_bands or NIGERIA_2026_PAYE_BANDS
+        self.schedule = schedule or compile_tax_schedule(
+            tuple((band.lower, band.upper, band.rate) for band in self.tax_bands)
+        )
     
     def calculate_cra(self, gross_annual_income: Decimal) -> Decimal:
         """
@@ -145,29 +150,62 @@ class PAYECalculator:
         
         return taxable_income, relief_breakdown
     
-    def calculate_tax(self, taxable_income: Decimal) -> Tuple[Decimal, List[Dict[str, Any]]]:
+    def calculate_tax(
+        self,
+        taxable_income: Decimal,
+        include_breakdown: bool = True,
+    ) -> Tuple[Decimal, List[Dict[str, Any]]]:
         """
         Calculate PAYE tax using progressive tax bands.
         
+        Args:
+            taxable_income: Annual taxable income
+            include_breakdown: Build the per-band breakdown (skip when only
+                the total is needed)
+        
         Returns:
             Tuple of (total_tax, band_breakdown)
         """
-        total_tax = Decimal("0")
-        band_breakdown = []
+        total_tax = self.schedule.tax(taxable_income)
+        band_breakdown = self.schedule.breakdown(taxable_income) if include_breakdown else []
+        return total_tax, band_breakdown
+    
+    def compute_paye(
+        self,
+        gross_annual_income: Decimal,
+        basic_salary: Optional[Decimal] = None,
+        pension_percentage: Decimal = Decimal("8"),
+        other_reliefs: Decimal = Decimal("0"),
+        include_breakdown: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        PAYE with all reliefs, in Decimal throughout.
         
-        for band in self.tax_bands:
-            tax_in_band = band.calculate_tax(taxable_income)
-            
-            if tax_in_band > 0 or taxable_income > band.lower:
-                band_breakdown.append({
-                    "range": f"₦{band.lower:,.0f} - {'∞' if band.upper is None else f'₦{band.upper:,.0f}'}",
-                    "rate": f"{band.rate}%",
-                    "tax_amount": float(tax_in_band),
-                })
-            
-            total_tax += tax_in_band
+        calculate_paye wraps this with float inputs/outputs for the API;
+        internal callers (payroll, simulators) use it directly.
+        """
+        gross = gross_annual_income
+        basic = basic_salary if basic_salary else gross * Decimal("0.6")
         
-        return total_tax, band_breakdown
+        # Calculate reliefs
+        pension_relief = self.calculate_pension_relief(gross, pension_percentage)
+        nhf_relief = self.calculate_nhf_relief(basic)
+        
+        # Calculate taxable income
+        taxable_income, relief_breakdown = self.calculate_taxable_income(
+            gross, pension_relief, nhf_relief, other_reliefs
+        )
+        
+        annual_tax, band_breakdown = self.calculate_tax(taxable_income, include_breakdown)
+        
+        return {
+            "gross_annual_income": gross,
+            "basic_salary": basic,
+            "reliefs": relief_breakdown,
+            "taxable_income": taxable_income,
+            "annual_tax": annual_tax,
+            "band_breakdown": band_breakdown,
+        }
     
     def calculate_paye(
         self,
@@ -188,21 +226,19 @@ class PAYECalculator:
         Returns:
             Complete PAYE calculation breakdown
         """
-        gross = Decimal(str(gross_annual_income))
-        basic = Decimal(str(basic_salary)) if basic_salary else gross * Decimal("0.6")
-        
-        # Calculate reliefs
-        pension_relief = self.calculate_pension_relief(gross, Decimal(str(pension_percentage)))
-        nhf_relief = self.calculate_nhf_relief(basic)
-        other = Decimal(str(other_reliefs))
-        
-        # Calculate taxable income
-        taxable_income, relief_breakdown = self.calculate_taxable_income(
-            gross, pension_relief, nhf_relief, other
+        result = self.compute_paye(
+            gross_annual_income=Decimal(str(gross_annual_income)),
+            basic_salary=Decimal(str(basic_salary)) if basic_salary else None,
+            pension_percentage=Decimal(str(pension_percentage)),
+            other_reliefs=Decimal(str(other_reliefs)),
+            include_breakdown=True,
         )
-        
-        # Calculate tax
-        annual_tax, band_breakdown = self.calculate_tax(taxable_income)
+        gross = result["gross_annual_income"]
+        basic = result["basic_salary"]
+        relief_breakdown = result["reliefs"]
+        taxable_income = result["taxable_income"]
+        annual_tax = result["annual_tax"]
+        band_breakdown = result["band_breakdown"]
         monthly_tax = annual_tax / 12
         
         # Effective tax rate
@@ -321,7 +357,7 @@ class PAYEService:
         taxable_income, _ = self.calculator.calculate_taxable_income(
             gross, pension, nhf, other
         )
-        annual_tax, _ = self.calculator.calculate_tax(taxable_income)
+        annual_tax, _ = self.calculator.calculate_tax(taxable_income, include_breakdown=False)
         monthly_tax = annual_tax / 12
         
         paye_record = PAYERecord(
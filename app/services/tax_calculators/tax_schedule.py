@@ -0,0 +1,201 @@
+"""
+TekVwarho ProAudit - Compiled Tax Schedules
+
+Progressive tax bands compiled once per rule version.
+
+A TaxSchedule stores each band's lower bound, rate and the cumulative tax
+due on every band below it, so tax on any income is one bisect plus one
+multiply-add instead of a walk over all bands. The per-band breakdown is only
+built when a caller asks for it.
+
+Schedules are shared by PAYECalculator, PayrollService, the salary
+simulators and ComplianceReplayEngine:
+
+- compile_tax_schedule(): cached per band table / rule version
+- paye_schedule_for(date): cached per date, resolving the PAYE rule version
+  effective on that date from the compliance rules registry
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# (lower, upper or None for the open top band, rate in percent)
+Band = Tuple[Decimal, Optional[Decimal], Decimal]
+
+
+@dataclass(frozen=True)
+class TaxSchedule:
+    """Compiled progressive band table for one rule version."""
+
+    version: str
+    lowers: Tuple[Decimal, ...]
+    uppers: Tuple[Optional[Decimal], ...]
+    rates: Tuple[Decimal, ...]
+    base_tax: Tuple[Decimal, ...]  # tax accrued on all bands below band i
+    references: Tuple[str, ...] = ()
+
+    @classmethod
+    def compile(
+        cls,
+        bands: Sequence[Band],
+        version: str = "",
+        references: Sequence[str] = (),
+    ) -> "TaxSchedule":
+        """Build a schedule from (lower, upper, rate) bands in any order."""
+        order = sorted(range(len(bands)), key=lambda i: bands[i][0])
+        lowers, uppers, rates, base_tax = [], [], [], []
+        accrued = Decimal("0")
+        for i in order:
+            lower, upper, rate = (Decimal(str(v)) if v is not None else None for v in bands[i])
+            lowers.append(lower)
+            uppers.append(upper)
+            rates.append(rate)
+            base_tax.append(accrued)
+            if upper is not None:
+                accrued += (upper - lower) * (rate / 100)
+        refs = tuple(references[i] for i in order) if references else ()
+        return cls(version, tuple(lowers), tuple(uppers), tuple(rates), tuple(base_tax), refs)
+
+    def band_index(self, income: Decimal) -> int:
+        """Index of the band containing income (-1 below the first band)."""
+        return bisect_right(self.lowers, income) - 1
+
+    def tax(self, income: Decimal) -> Decimal:
+        """Total tax on income: O(log bands)."""
+        i = self.band_index(income)
+        if i < 0 or income <= self.lowers[i]:
+            return self.base_tax[i] if i >= 0 else Decimal("0")
+        upper = self.uppers[i]
+        in_band = income - self.lowers[i] if upper is None else min(income, upper) - self.lowers[i]
+        return self.base_tax[i] + in_band * (self.rates[i] / 100)
+
+    def marginal_rate(self, income: Decimal) -> Decimal:
+        i = self.band_index(income)
+        return self.rates[i] if i >= 0 else Decimal("0")
+
+    def band_amounts(self, income: Decimal) -> Iterator[Tuple[int, Decimal]]:
+        """Yield (band index, tax in band) for each band income reaches."""
+        top = self.band_index(income)
+        for i in range(top + 1):
+            lower, upper = self.lowers[i], self.uppers[i]
+            if income <= lower:
+                break
+            in_band = income - lower if upper is None else min(income, upper) - lower
+            yield i, in_band * (self.rates[i] / 100)
+
+    def breakdown(
+        self,
+        income: Decimal,
+        currency: str = "₦",
+        unbounded: str = "∞",
+    ) -> List[Dict[str, Any]]:
+        """Per-band breakdown in the calculators' display format."""
+        return [
+            self.breakdown_row(i, amount, currency, unbounded)
+            for i, amount in self.band_amounts(income)
+        ]
+
+    def breakdown_row(
+        self,
+        i: int,
+        amount: Decimal,
+        currency: str = "₦",
+        unbounded: str = "∞",
+    ) -> Dict[str, Any]:
+        upper = self.uppers[i]
+        return {
+            "range": f"{currency}{self.lowers[i]:,.0f} - "
+                     f"{unbounded if upper is None else f'{currency}{upper:,.0f}'}",
+            "rate": f"{self.rates[i]}%",
+            "tax_amount": float(amount),
+        }
+
+
+@dataclass(frozen=True)
+class RateTiers:
+    """
+    Flat rate chosen by which tier an amount falls in (e.g. CIT by turnover).
+
+    ceilings are inclusive upper bounds for all but the last tier.
+    """
+
+    ceilings: Tuple[Decimal, ...]
+    rates: Tuple[Decimal, ...]
+
+    def tier_index(self, amount: Decimal) -> int:
+        return bisect_left(self.ceilings, amount)
+
+    def rate(self, amount: Decimal) -> Decimal:
+        return self.rates[self.tier_index(amount)]
+
+
+def bands_from_widths(
+    widths: Sequence[Tuple[Optional[Decimal], Decimal]],
+    open_top: bool = True,
+) -> Tuple[Band, ...]:
+    """
+    Convert "first X at r1, next Y at r2, ..." (width, rate%) tables into
+    (lower, upper, rate) bands; the last band is left open when open_top.
+    """
+    bands = []
+    lower = Decimal("0")
+    for position, (width, rate) in enumerate(widths):
+        is_top = position == len(widths) - 1
+        upper = None if width is None or (open_top and is_top) else lower + width
+        bands.append((lower, upper, rate))
+        if upper is None:
+            break
+        lower = upper
+    return tuple(bands)
+
+
+# ===========================================
+# CACHES
+# ===========================================
+
+@lru_cache(maxsize=64)
+def compile_tax_schedule(
+    bands: Tuple[Band, ...],
+    version: str = "",
+    references: Tuple[str, ...] = (),
+) -> TaxSchedule:
+    """Compile (or reuse) the schedule for a band table."""
+    return TaxSchedule.compile(bands, version, references)
+
+
+@lru_cache(maxsize=4096)
+def paye_schedule_for(as_of_date: date) -> TaxSchedule:
+    """
+    PAYE schedule effective on a date, from the compliance rules registry.
+
+    Dates resolving to the same rule version share one compiled schedule.
+    """
+    from app.services.compliance_replay_service import RuleType, TAX_RULES_REGISTRY
+
+    rules = sorted(
+        (
+            rule for rule in TAX_RULES_REGISTRY
+            if rule.rule_type == RuleType.PAYE_BAND and rule.is_effective_on(as_of_date)
+        ),
+        key=lambda r: r.value.get("lower", 0),
+    )
+    version = "paye:" + ",".join(f"{r.rule_key}@{r.effective_from.isoformat()}" for r in rules)
+    bands = tuple(
+        (
+            Decimal(str(r.value["lower"])),
+            Decimal(str(r.value["upper"])) if r.value["upper"] else None,
+            Decimal(str(r.value["rate"])),
+        )
+        for r in rules
+    )
+    return compile_tax_schedule(bands, version, tuple(r.legal_reference for r in rules))
+
+
+def clear_schedule_cache():
+    """Drop compiled schedules (after editing the rules registry)."""
+    paye_schedule_for.cache_clear()
+    compile_tax_schedule.cache_clear()
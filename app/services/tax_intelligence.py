@@ -20,6 +20,8 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, extract
 
+from app.services.tax_calculators.tax_schedule import bands_from_widths, compile_tax_schedule
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,6 +98,9 @@ class TaxIntelligenceService:
         (Decimal("6000000"), Decimal("25")),  # Next 6M - 25%
         (Decimal("999999999999"), Decimal("30")),  # Above - 30% (effectively infinite)
     ]
+    PAYE_SCHEDULE_2026 = compile_tax_schedule(
+        bands_from_widths(PAYE_BRACKETS_2026), "tax_intelligence:paye_2026"
+    )
     
     async def calculate_etr(
         self,
@@ -519,17 +524,7 @@ class TaxIntelligenceService:
         
         taxable_income = max(annual_income - cra, Decimal("0"))
         
-        tax = Decimal("0")
-        remaining = taxable_income
-        
-        for threshold, rate in self.PAYE_BRACKETS_2026:
-            if remaining <= 0:
-                break
-            taxable_in_bracket = min(remaining, threshold)
-            tax += taxable_in_bracket * (rate / 100)
-            remaining -= taxable_in_bracket
-        
-        return tax
+        return self.PAYE_SCHEDULE_2026.tax(taxable_income)
     
     def _generate_tax_recommendations(
         self,
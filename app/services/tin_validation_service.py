@@ -112,8 +112,8 @@ class TINValidationService:
     2026 Compliance Features:
     - Real-time TIN validation
     - Support for individuals (NIN-based) and all corporate entity types
-    - Validation caching to reduce API calls
-    - Bulk validation support
+    - Validation caching to reduce API calls (tin_verification_cache)
+    - Bulk validation support (deduplicated and concurrent)
     - Audit trail for all validation attempts
     """
     
@@ -135,20 +135,27 @@ class TINValidationService:
     # Request timeout
     TIMEOUT = 30
     
-    # Validation cache duration (24 hours)
-    CACHE_DURATION_HOURS = 24
+    # Key of this registry in the TIN verification cache
+    CACHE_SOURCE = "taxid"
     
-    def __init__(self, db: Optional[AsyncSession] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        db: Optional[AsyncSession] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ):
         """
         Initialize TIN validation service.
         
         Args:
             db: Database session for caching/logging
             api_key: API key for NRS TaxID portal
+            base_url: TaxID API URL. Defaults to settings.
         """
         self.db = db
         self.api_key = api_key or getattr(settings, 'nrs_tin_api_key', settings.nrs_api_key)
         self.sandbox_mode = getattr(settings, 'nrs_sandbox_mode', True)
+        self.base_url = base_url or settings.nrs_tin_api_url
     
     def _get_headers(self) -> Dict[str, str]:
         """Get API request headers."""
@@ -201,6 +208,9 @@ class TINValidationService:
         """
         Validate a TIN via NRS TaxID Portal.
         
+        Fresh answers come from the TIN verification cache; only a stale
+        or unknown TIN is sent to the portal.
+        
         Args:
             tin: Tax Identification Number to validate
             entity_type: Type of entity (individual, company, etc.)
@@ -224,18 +234,100 @@ class TINValidationService:
         if self.sandbox_mode and not self.api_key:
             return self._simulate_validation(tin, entity_type, search_term)
         
-        # Make API request
+        from app.services.tin_verification_cache import get_tin_cache, lookup_tins, normalize_tin
+        
+        clean_tin = normalize_tin(tin)
+        answers = await lookup_tins(
+            get_tin_cache(self.CACHE_SOURCE),
+            [clean_tin],
+            lambda key: self._fetch_tin(key, entity_type, search_term),
+            db=self.db,
+        )
+        await self._commit_cache()
+        return self._to_result(tin, answers[clean_tin])
+    
+    async def _fetch_tin(
+        self,
+        tin: str,
+        entity_type: Optional[TINEntityType] = None,
+        search_term: Optional[str] = None,
+    ):
+        """Ask the TaxID portal about one TIN: a cacheable CachedTIN, or an error result."""
+        from app.services.tin_verification_cache import CachedTIN
+        
         try:
             result = await self._call_taxid_api(tin, entity_type, search_term)
-            return result
         except Exception as e:
-            return TINValidationResult(
+            result = TINValidationResult(
                 is_valid=False,
                 tin=tin,
                 status=TINValidationStatus.ERROR,
                 message=f"Validation error: {str(e)}",
                 validated_at=datetime.utcnow(),
             )
+        if result.status == TINValidationStatus.ERROR:
+            return result
+        
+        return CachedTIN(
+            tin=tin,
+            is_valid=result.is_valid,
+            status=result.status.value,
+            registered_name=result.registered_name,
+            details={
+                "entity_type": result.entity_type.value if result.entity_type else None,
+                "rc_number": result.rc_number,
+                "registration_date": result.registration_date,
+                "address": result.address,
+                "tax_office": result.tax_office,
+                "vat_registered": result.vat_registered,
+                "message": result.message,
+            },
+        )
+    
+    def _to_result(self, tin: str, outcome) -> TINValidationResult:
+        """Validation result for `tin` from a lookup_tins answer."""
+        from app.services.tin_verification_cache import CachedTIN
+        
+        if isinstance(outcome, Exception):
+            return TINValidationResult(
+                is_valid=False,
+                tin=tin,
+                status=TINValidationStatus.ERROR,
+                message=f"Validation error: {str(outcome)}",
+                validated_at=datetime.utcnow(),
+            )
+        if not isinstance(outcome, CachedTIN):
+            outcome.tin = tin
+            return outcome
+        
+        details = outcome.details
+        return TINValidationResult(
+            is_valid=outcome.is_valid,
+            tin=tin,
+            status=TINValidationStatus(outcome.status),
+            entity_type=TINEntityType(details["entity_type"]) if details.get("entity_type") else None,
+            registered_name=outcome.registered_name,
+            rc_number=details.get("rc_number"),
+            registration_date=details.get("registration_date"),
+            address=details.get("address"),
+            tax_office=details.get("tax_office"),
+            vat_registered=details.get("vat_registered"),
+            message=details.get("message") or "Validation complete",
+            validated_at=outcome.checked_at,
+        )
+    
+    async def _commit_cache(self):
+        """Persist new cache rows written to the service's session."""
+        if self.db is not None:
+            await self.db.commit()
+    
+    @staticmethod
+    def _parse_status(data: Dict[str, Any]) -> TINValidationStatus:
+        """Portal status, falling back to is_valid for values we do not know (e.g. ACTIVE)."""
+        try:
+            return TINValidationStatus(str(data.get("status", "")).lower())
+        except ValueError:
+            return TINValidationStatus.VALID if data.get("is_valid") else TINValidationStatus.INVALID
     
     async def _call_taxid_api(
         self,
@@ -245,8 +337,11 @@ class TINValidationService:
     ) -> TINValidationResult:
         """
         Make API call to NRS TaxID Portal.
+        
+        Uses the pooled keep-alive client and adaptive rate limiter shared
+        with the NRS API client.
         """
-        url = f"{self.TAXID_API_BASE_URL}{self.ENDPOINTS['validate']}"
+        from app.services.nrs_service import get_nrs_http_client, get_nrs_rate_limiter, parse_retry_after
         
         payload = {
             "tin": tin.replace("-", "").replace(" ", ""),
@@ -254,40 +349,44 @@ class TINValidationService:
             "search_term": search_term,
         }
         
+        limiter = get_nrs_rate_limiter(self.base_url)
         try:
-            async with httpx.AsyncClient(timeout=self.TIMEOUT) as client:
-                response = await client.post(
-                    url,
-                    headers=self._get_headers(),
-                    json=payload,
+            await limiter.acquire()
+            response = await get_nrs_http_client(self.base_url).post(
+                self.ENDPOINTS['validate'],
+                headers=self._get_headers(),
+                json=payload,
+            )
+            
+            if response.status_code == 200:
+                limiter.on_success()
+                data = response.json()
+                return TINValidationResult(
+                    is_valid=data.get("is_valid", False),
+                    tin=tin,
+                    status=self._parse_status(data),
+                    entity_type=TINEntityType(data["entity_type"]) if data.get("entity_type") else None,
+                    registered_name=data.get("registered_name"),
+                    rc_number=data.get("rc_number"),
+                    registration_date=data.get("registration_date"),
+                    address=data.get("address"),
+                    tax_office=data.get("tax_office"),
+                    vat_registered=data.get("vat_registered"),
+                    message=data.get("message", "Validation complete"),
+                    validated_at=datetime.utcnow(),
+                    raw_response=data,
+                )
+            else:
+                if response.status_code == 429:
+                    limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                return TINValidationResult(
+                    is_valid=False,
+                    tin=tin,
+                    status=TINValidationStatus.ERROR,
+                    message=f"API error: {response.status_code}",
+                    validated_at=datetime.utcnow(),
                 )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return TINValidationResult(
-                        is_valid=data.get("is_valid", False),
-                        tin=tin,
-                        status=TINValidationStatus(data.get("status", "invalid")),
-                        entity_type=TINEntityType(data["entity_type"]) if data.get("entity_type") else None,
-                        registered_name=data.get("registered_name"),
-                        rc_number=data.get("rc_number"),
-                        registration_date=data.get("registration_date"),
-                        address=data.get("address"),
-                        tax_office=data.get("tax_office"),
-                        vat_registered=data.get("vat_registered"),
-                        message=data.get("message", "Validation complete"),
-                        validated_at=datetime.utcnow(),
-                        raw_response=data,
-                    )
-                else:
-                    return TINValidationResult(
-                        is_valid=False,
-                        tin=tin,
-                        status=TINValidationStatus.ERROR,
-                        message=f"API error: {response.status_code}",
-                        validated_at=datetime.utcnow(),
-                    )
-                    
         except httpx.TimeoutException:
             return TINValidationResult(
                 is_valid=False,
@@ -437,16 +536,36 @@ class TINValidationService:
         """
         Validate multiple TINs in bulk.
         
+        Inputs are deduplicated (ignoring hyphens and spaces) and answered
+        from the TIN verification cache; only stale or unknown TINs go to
+        the portal, concurrently.
+        
         Args:
             tins: List of TINs to validate
         
         Returns:
             List of TINValidationResult for each TIN
         """
+        from app.services.tin_verification_cache import get_tin_cache, lookup_tins, normalize_tin
+        
+        if self.sandbox_mode and not self.api_key:
+            return [await self.validate_tin(tin) for tin in tins]
+        
+        well_formed = [tin for tin in tins if self._validate_tin_format(tin)[0]]
+        answers = await lookup_tins(
+            get_tin_cache(self.CACHE_SOURCE),
+            [normalize_tin(tin) for tin in well_formed],
+            self._fetch_tin,
+            db=self.db,
+        )
+        await self._commit_cache()
+        
         results = []
         for tin in tins:
-            result = await self.validate_tin(tin)
-            results.append(result)
+            if self._validate_tin_format(tin)[0]:
+                results.append(self._to_result(tin, answers[normalize_tin(tin)]))
+            else:
+                results.append(await self.validate_tin(tin))
         return results
     
     async def check_vendor_compliance(
@@ -0,0 +1,233 @@
+"""
+TekVwarho ProAudit - TIN Verification Cache
+
+Answers repeated TIN checks without calling the registry.
+
+Lookups go through three tiers, per registry (source):
+
+1. An in-process LRU of settings.tin_cache_local_entries TINs
+2. The shared tin_verifications table, read for all LRU misses in one query
+3. The upstream registry, called only for TINs missing or stale in both,
+   concurrently (settings.nrs_bulk_concurrency) and once per distinct TIN
+
+Freshness policy: registered (valid) TINs are trusted for
+settings.tin_cache_valid_ttl_hours. Invalid, not-found and suspended
+answers form a negative cache with the shorter
+settings.tin_cache_invalid_ttl_hours, so a new registration shows up
+quickly. Upstream errors are never cached.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.tin_verification import TINVerification
+
+
+@dataclass
+class CachedTIN:
+    """One registry answer, as stored in tin_verifications."""
+    tin: str
+    is_valid: bool
+    status: str
+    registered_name: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+    checked_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def normalize_tin(tin: str) -> str:
+    """TIN digits without hyphens or spaces (the cache key)."""
+    return tin.replace("-", "").replace(" ", "").strip()
+
+
+class TINVerificationCache:
+    """LRU plus shared table for one registry, with the freshness policy."""
+
+    CHUNK_SIZE = 1000  # TINs per IN (...) lookup or upsert statement
+
+    def __init__(
+        self,
+        source: str,
+        max_entries: Optional[int] = None,
+        valid_ttl: Optional[timedelta] = None,
+        invalid_ttl: Optional[timedelta] = None,
+    ):
+        self.source = source
+        self.max_entries = max_entries or settings.tin_cache_local_entries
+        self.valid_ttl = valid_ttl or timedelta(hours=settings.tin_cache_valid_ttl_hours)
+        self.invalid_ttl = invalid_ttl or timedelta(hours=settings.tin_cache_invalid_ttl_hours)
+        self._local: "OrderedDict[str, CachedTIN]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.local_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def is_fresh(self, entry: CachedTIN, now: Optional[datetime] = None) -> bool:
+        ttl = self.valid_ttl if entry.is_valid else self.invalid_ttl
+        return (now or datetime.now(timezone.utc)) - entry.checked_at < ttl
+
+    def _get_local(self, tin: str, now: datetime) -> Optional[CachedTIN]:
+        with self._lock:
+            entry = self._local.get(tin)
+            if entry is None:
+                return None
+            if not self.is_fresh(entry, now):
+                del self._local[tin]
+                return None
+            self._local.move_to_end(tin)
+            return entry
+
+    def _put_local(self, entry: CachedTIN):
+        with self._lock:
+            self._local[entry.tin] = entry
+            self._local.move_to_end(entry.tin)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    async def get_many(self, tins: Iterable[str], db: Optional[AsyncSession] = None) -> Dict[str, CachedTIN]:
+        """Fresh entries for normalized TINs; TINs without one are absent."""
+        now = datetime.now(timezone.utc)
+        found: Dict[str, CachedTIN] = {}
+        missing: List[str] = []
+        for tin in dict.fromkeys(tins):
+            entry = self._get_local(tin, now)
+            if entry is not None:
+                found[tin] = entry
+            else:
+                missing.append(tin)
+        self.local_hits += len(found)
+
+        if missing and db is not None:
+            for start in range(0, len(missing), self.CHUNK_SIZE):
+                result = await db.execute(
+                    select(TINVerification)
+                    .where(TINVerification.source == self.source)
+                    .where(TINVerification.tin.in_(missing[start:start + self.CHUNK_SIZE]))
+                )
+                for row in result.scalars().all():
+                    entry = CachedTIN(
+                        tin=row.tin,
+                        is_valid=row.is_valid,
+                        status=row.status,
+                        registered_name=row.registered_name,
+                        details=row.details or {},
+                        checked_at=row.checked_at,
+                    )
+                    if self.is_fresh(entry, now):
+                        found[row.tin] = entry
+                        self._put_local(entry)
+                        self.db_hits += 1
+
+        self.misses += len(dict.fromkeys(tins)) - len(found)
+        return found
+
+    async def put_many(self, entries: Iterable[CachedTIN], db: Optional[AsyncSession] = None):
+        """Remember registry answers; the table upsert joins the caller's transaction."""
+        entries = list(entries)
+        for entry in entries:
+            self._put_local(entry)
+        if db is None or not entries:
+            return
+
+        for start in range(0, len(entries), self.CHUNK_SIZE):
+            statement = pg_insert(TINVerification).values([
+                {
+                    "id": uuid.uuid4(),
+                    "source": self.source,
+                    "tin": entry.tin,
+                    "is_valid": entry.is_valid,
+                    "status": entry.status,
+                    "registered_name": entry.registered_name,
+                    "details": entry.details,
+                    "checked_at": entry.checked_at,
+                }
+                for entry in entries[start:start + self.CHUNK_SIZE]
+            ])
+            await db.execute(statement.on_conflict_do_update(
+                constraint="uq_tin_verifications_source_tin",
+                set_={
+                    "is_valid": statement.excluded.is_valid,
+                    "status": statement.excluded.status,
+                    "registered_name": statement.excluded.registered_name,
+                    "details": statement.excluded.details,
+                    "checked_at": statement.excluded.checked_at,
+                    "updated_at": func.now(),
+                },
+            ))
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.db_hits + self.misses
+        return {
+            "source": self.source,
+            "local_entries": len(self._local),
+            "local_hits": self.local_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.local_hits + self.db_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+async def lookup_tins(
+    cache: TINVerificationCache,
+    tins: Iterable[str],
+    fetch: Callable[[str], Awaitable[Any]],
+    db: Optional[AsyncSession] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Answers for normalized TINs, calling `fetch` only for stale or missing ones.
+
+    `fetch` returns a CachedTIN for a registry answer (which is cached) or
+    any other object - typically an error result - which is passed through.
+    Exceptions raised by `fetch` are returned in place.
+    """
+    tins = list(dict.fromkeys(tins))
+    answers: Dict[str, Any] = dict(await cache.get_many(tins, db))
+    missing = [tin for tin in tins if tin not in answers]
+    if not missing:
+        return answers
+
+    semaphore = asyncio.Semaphore(concurrency or settings.nrs_bulk_concurrency)
+
+    async def run(tin: str):
+        async with semaphore:
+            return await fetch(tin)
+
+    fetched = await asyncio.gather(*(run(tin) for tin in missing), return_exceptions=True)
+    answers.update(zip(missing, fetched))
+    await cache.put_many([answer for answer in fetched if isinstance(answer, CachedTIN)], db)
+    return answers
+
+
+_caches: Dict[str, TINVerificationCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_tin_cache(source: str) -> TINVerificationCache:
+    """Process-wide cache for a registry ("nrs" or "taxid")."""
+    with _caches_lock:
+        if source not in _caches:
+            _caches[source] = TINVerificationCache(source)
+        return _caches[source]
+
+
+def clear_tin_caches():
+    """Drop all in-process entries (the table is untouched)."""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear_local()
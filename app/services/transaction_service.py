@@ -26,6 +26,7 @@ from sqlalchemy.orm import selectinload
 from app.models.transaction import Transaction, TransactionType, WRENStatus
 from app.models.category import Category
 from app.models.vendor import Vendor
+from app.utils.query_optimization import keyset_paginate
 
 if TYPE_CHECKING:
     from app.services.fx_service import FXService
@@ -52,6 +53,9 @@ class TransactionService:
     # Nigeria VAT rate (7.5% per 2026 Tax Reform)
     VAT_RATE = Decimal("0.075")
     
+    # Listing sort key, newest first; backed by ix_transactions_entity_date_id
+    PAGE_KEY = (Transaction.transaction_date, Transaction.id)
+    
     def __init__(self, db: AsyncSession):
         self.db = db
     
@@ -82,8 +86,14 @@ class TransactionService:
         is_paid: Optional[bool] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> tuple[List[Transaction], int]:
-        """Get transactions for an entity with filters."""
+        """
+        Get transactions for an entity with filters.
+        
+        Pass the cursor of the previous page to page by key instead of
+        offset (offset is then ignored).
+        """
         query = (
             select(Transaction)
             .options(
@@ -117,8 +127,9 @@ class TransactionService:
         count_result = await self.db.execute(count_query)
         total = count_result.scalar() or 0
         
-        query = query.order_by(Transaction.transaction_date.desc())
-        query = query.limit(limit).offset(offset)
+        query = keyset_paginate(query, self.PAGE_KEY, cursor, limit)
+        if not cursor:
+            query = query.offset(offset)
         
         result = await self.db.execute(query)
         transactions = list(result.scalars().all())
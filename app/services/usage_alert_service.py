@@ -439,77 +439,42 @@ class UsageAlertService:
     
     async def _notify_in_app(self, alerts: List[UsageAlert]) -> Dict[str, Any]:
         """Store alerts for in-app notification display."""
-        from app.models.notification import (
-            Notification, 
-            NotificationType, 
-            NotificationPriority,
+        from app.services.notification_service import (
+            BulkNotification,
+            NotificationService,
+            OrganizationAudience,
         )
-        from app.models.user import User
-        from sqlalchemy import select
-        
-        stored_count = 0
-        errors = []
         
+        # One notification per active user of each alerting organization,
+        # fanned out in bulk; the calling task owns the transaction.
+        items = []
         for alert in alerts:
-            try:
-                # Get admin users for the organization
-                admin_result = await self.db.execute(
-                    select(User)
-                    .where(User.organization_id == alert.organization_id)
-                    .where(User.is_active == True)
-                )
-                admin_users = admin_result.scalars().all()
-                
-                if not admin_users:
-                    errors.append(f"No users found for org: {alert.organization_id}")
-                    continue
-                
-                # Determine notification type and priority based on threshold
-                if alert.threshold == AlertThreshold.EXCEEDED_100:
-                    notification_type = NotificationType.WARNING
-                    priority = NotificationPriority.URGENT
-                elif alert.threshold == AlertThreshold.CRITICAL_90:
-                    notification_type = NotificationType.WARNING
-                    priority = NotificationPriority.HIGH
-                else:
-                    notification_type = NotificationType.INFO
-                    priority = NotificationPriority.NORMAL
-                
-                metric_name = self.METRIC_DISPLAY_NAMES.get(alert.metric_type, alert.metric_type.value)
-                
-                # Create notification for each user in the organization
-                for user in admin_users:
-                    notification = Notification(
-                        user_id=user.id,
-                        title=f"Usage Alert: {metric_name}",
-                        message=alert.message,
-                        notification_type=notification_type,
-                        priority=priority,
-                        channels=["in_app"],
-                        metadata={
-                            "alert_type": "usage_alert",
-                            "metric_type": alert.metric_type.value,
-                            "current_usage": alert.current_usage,
-                            "limit": alert.limit,
-                            "percentage": alert.percentage,
-                            "threshold": alert.threshold.value,
-                        },
-                    )
-                    self.db.add(notification)
-                    stored_count += 1
-                
-                logger.info(f"Stored in-app alert for org {alert.organization_id}: {metric_name} at {alert.percentage:.1f}%")
-                
-            except Exception as e:
-                logger.error(f"Error storing in-app notification: {e}")
-                errors.append(str(e))
-        
-        await self.db.flush()
+            metric_name = self.METRIC_DISPLAY_NAMES.get(alert.metric_type, alert.metric_type.value)
+            items.append(BulkNotification(
+                recipient=OrganizationAudience(alert.organization_id),
+                template="usage_alert",
+                payload={
+                    "alert_type": "usage_alert",
+                    "metric_name": metric_name,
+                    "metric_type": alert.metric_type.value,
+                    "current_usage": alert.current_usage,
+                    "limit": alert.limit,
+                    "percentage": alert.percentage,
+                    "threshold": alert.threshold.value,
+                    "message": alert.message,
+                },
+            ))
+        
+        try:
+            summary = await NotificationService(self.db).notify_bulk(items, commit=False)
+        except Exception as e:
+            logger.error(f"Error storing in-app notifications: {e}")
+            return {"status": "error", "stored_count": 0, "errors": [str(e)]}
         
         return {
-            "status": "success" if not errors else "partial",
-            "stored_count": stored_count,
-            "errors": errors if errors else None,
+            "status": "success",
+            "stored_count": summary["notifications_created"],
+            "errors": None,
         }
     
     async def _notify_webhook(self, alerts: List[UsageAlert]) -> Dict[str, Any]:
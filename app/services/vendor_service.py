@@ -169,7 +169,7 @@ class VendorService:
         from app.services.nrs_service import get_nrs_client
         
         nrs_client = get_nrs_client()
-        result = await nrs_client.validate_tin(vendor.tin, vendor.name)
+        result = await nrs_client.validate_tin(vendor.tin, vendor.name, db=self.db)
         
         if result.is_valid:
             vendor.tin_verified = True
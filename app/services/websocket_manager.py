@@ -9,6 +9,11 @@ Features:
 - Broadcast to specific users, tenants, or all connections
 - Heartbeat and automatic reconnection support
 - Message queuing for offline users
+- Non-blocking fan-out: each message is serialized once and handed to a
+  bounded per-connection send queue drained by its own writer task, so a
+  slow client never delays delivery to the others
+- Cross-process relay: Celery workers publish sends to Redis and each web
+  process replays them on its own connections
 
 Channels:
 - budget_alerts: Budget variance and threshold alerts
@@ -22,13 +27,17 @@ import asyncio
 import uuid
 import json
 import logging
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Set, Optional, Any, List
+from typing import Deque, Dict, Set, Optional, Any, List
 from dataclasses import dataclass, field
 from enum import Enum
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +54,91 @@ class NotificationChannel(str, Enum):
     RECONCILIATION = "reconciliation"
 
 
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's send queue is full."""
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued frame
+    COALESCE = "coalesce"        # Replace a queued frame with the same key, else drop oldest
+    DISCONNECT = "disconnect"    # Close the slow connection
+
+
+@dataclass
+class OutboundFrame:
+    """A serialized message ready to be written to one or more sockets."""
+    payload: str
+    event_type: str
+    coalesce_key: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def encode_message(event_type: str, data: Dict[str, Any]) -> str:
+    """Serialize an event envelope once so it can be shared by every recipient."""
+    return json.dumps(
+        {
+            "event": event_type,
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat(),
+        },
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+class ConnectionSendQueue:
+    """
+    Bounded FIFO of outbound frames for a single connection.
+    
+    Enqueueing never awaits, so broadcasters are never blocked by the
+    socket. When the queue is full the slow-consumer policy decides
+    whether to drop, coalesce, or ask the manager to disconnect.
+    """
+    
+    def __init__(self, maxsize: int, policy: SlowConsumerPolicy):
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self._frames: Deque[OutboundFrame] = deque()
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+    
+    def __len__(self) -> int:
+        return len(self._frames)
+    
+    def put(self, frame: OutboundFrame) -> bool:
+        """
+        Enqueue a frame.
+        
+        Returns:
+            False if the consumer is too slow and must be disconnected.
+        """
+        if len(self._frames) >= self.maxsize:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                self.dropped += 1
+                return False
+            if self.policy == SlowConsumerPolicy.COALESCE and frame.coalesce_key:
+                for index, queued in enumerate(self._frames):
+                    if queued.coalesce_key == frame.coalesce_key:
+                        # Newer state supersedes the queued one; keep its position
+                        frame.enqueued_at = queued.enqueued_at
+                        self._frames[index] = frame
+                        self.coalesced += 1
+                        return True
+            self._frames.popleft()
+            self.dropped += 1
+        
+        self._frames.append(frame)
+        self.high_water = max(self.high_water, len(self._frames))
+        self._ready.set()
+        return True
+    
+    async def get(self) -> OutboundFrame:
+        """Wait for and return the next frame."""
+        while not self._frames:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
+
 @dataclass
 class WebSocketConnection:
     """Represents a WebSocket connection."""
@@ -55,6 +149,21 @@ class WebSocketConnection:
     channels: Set[str] = field(default_factory=set)
     connected_at: datetime = field(default_factory=datetime.utcnow)
     last_heartbeat: datetime = field(default_factory=datetime.utcnow)
+    send_queue: Optional[ConnectionSendQueue] = None
+    writer_task: Optional[asyncio.Task] = None
+    closing: bool = False
+    messages_sent: int = 0
+    send_latency_ms_avg: float = 0.0
+    send_latency_ms_max: float = 0.0
+    
+    def record_send(self, latency_ms: float):
+        """Track enqueue-to-write latency (EWMA and max)."""
+        self.messages_sent += 1
+        if self.messages_sent == 1:
+            self.send_latency_ms_avg = latency_ms
+        else:
+            self.send_latency_ms_avg = 0.9 * self.send_latency_ms_avg + 0.1 * latency_ms
+        self.send_latency_ms_max = max(self.send_latency_ms_max, latency_ms)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -63,6 +172,10 @@ class WebSocketConnection:
             "entity_id": str(self.entity_id) if self.entity_id else None,
             "channels": list(self.channels),
             "connected_at": self.connected_at.isoformat(),
+            "queue_depth": len(self.send_queue) if self.send_queue else 0,
+            "messages_sent": self.messages_sent,
+            "send_latency_ms_avg": round(self.send_latency_ms_avg, 3),
+            "send_latency_ms_max": round(self.send_latency_ms_max, 3),
         }
 
 
@@ -86,6 +199,7 @@ class WebSocketManager:
     - Channel-based pub/sub
     - Message broadcasting
     - Offline message queuing
+    - Per-connection writer tasks with bounded, policy-driven send queues
     """
     
     _instance: Optional["WebSocketManager"] = None
@@ -119,6 +233,19 @@ class WebSocketManager:
         # Lock for thread safety
         self._lock = asyncio.Lock()
         
+        # Delivery settings
+        self.send_queue_size = settings.ws_send_queue_size
+        self.slow_consumer_policy = SlowConsumerPolicy(settings.ws_slow_consumer_policy)
+        self.send_timeout = settings.ws_send_timeout_seconds
+        
+        # Counters for connections that have already gone away
+        self._slow_consumer_disconnects = 0
+        self._total_dropped = 0
+        self._total_coalesced = 0
+        
+        # Strong references to fire-and-forget close tasks
+        self._background_tasks: Set[asyncio.Task] = set()
+        
         self._initialized = True
         logger.info("WebSocketManager initialized")
     
@@ -147,6 +274,12 @@ class WebSocketManager:
                 tenant_id=tenant_id,
                 entity_id=entity_id,
                 channels=set(channels or [NotificationChannel.SYSTEM.value]),
+                send_queue=ConnectionSendQueue(
+                    self.send_queue_size, self.slow_consumer_policy
+                ),
+            )
+            connection.writer_task = asyncio.create_task(
+                self._writer(connection_id, connection)
             )
             
             # Store connection
@@ -218,6 +351,15 @@ class WebSocketManager:
             
             # Remove connection
             del self._connections[connection_id]
+            
+            if connection.send_queue:
+                self._total_dropped += connection.send_queue.dropped
+                self._total_coalesced += connection.send_queue.coalesced
+        
+        # Stop the writer (unless it is the one tearing the connection down)
+        task = connection.writer_task
+        if task and task is not asyncio.current_task() and not task.done():
+            task.cancel()
         
         logger.info(f"WebSocket disconnected: connection_id={connection_id}")
     
@@ -260,30 +402,97 @@ class WebSocketManager:
             {"channels": channels}
         )
     
+    async def _writer(self, connection_id: str, connection: WebSocketConnection):
+        """Drain a connection's send queue onto its socket."""
+        queue = connection.send_queue
+        try:
+            while True:
+                frame = await queue.get()
+                await asyncio.wait_for(
+                    connection.websocket.send_text(frame.payload),
+                    timeout=self.send_timeout,
+                )
+                connection.record_send((time.monotonic() - frame.enqueued_at) * 1000)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending to connection {connection_id}: {e}")
+            await self.disconnect(connection_id)
+    
+    def _enqueue(self, connection_id: str, frame: OutboundFrame) -> bool:
+        """Hand a frame to a connection's writer without awaiting the socket."""
+        connection = self._connections.get(connection_id)
+        if connection is None or connection.send_queue is None or connection.closing:
+            return False
+        
+        if not connection.send_queue.put(frame):
+            connection.closing = True
+            logger.warning(
+                f"Disconnecting slow WebSocket consumer {connection_id} "
+                f"(queue depth {len(connection.send_queue)})"
+            )
+            self._slow_consumer_disconnects += 1
+            task = asyncio.create_task(self._close_slow_consumer(connection_id, connection))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+            return False
+        return True
+    
+    async def _close_slow_consumer(self, connection_id: str, connection: WebSocketConnection):
+        """Drop a consumer that cannot keep up with its send queue."""
+        await self.disconnect(connection_id)
+        try:
+            await connection.websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+    
+    def _fan_out(
+        self,
+        connection_ids: List[str],
+        event_type: str,
+        data: Dict[str, Any],
+        coalesce_key: Optional[str] = None,
+    ) -> int:
+        """
+        Serialize once and enqueue the shared frame for every connection.
+        
+        Returns:
+            Number of connections the frame was enqueued for (see
+            send_to_connection: enqueued is not delivered)
+        """
+        if not connection_ids:
+            return 0
+        payload = encode_message(event_type, data)
+        enqueued = 0
+        for connection_id in connection_ids:
+            frame = OutboundFrame(
+                payload=payload,
+                event_type=event_type,
+                coalesce_key=coalesce_key,
+            )
+            if self._enqueue(connection_id, frame):
+                enqueued += 1
+        return enqueued
+    
     async def send_to_connection(
         self,
         connection_id: str,
         event_type: str,
         data: Dict[str, Any]
     ) -> bool:
-        """Send a message to a specific connection."""
-        if connection_id not in self._connections:
-            return False
-        
-        connection = self._connections[connection_id]
+        """
+        Queue a message for a specific connection.
         
-        try:
-            message = {
-                "event": event_type,
-                "data": data,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-            await connection.websocket.send_json(message)
-            return True
-        except Exception as e:
-            logger.error(f"Error sending to connection {connection_id}: {e}")
-            await self.disconnect(connection_id)
+        Returns:
+            True if the message was enqueued for the connection's writer.
+            This is not a delivery ack: the frame can still be dropped by
+            the slow-consumer policy or never sent if the client
+            disconnects. Delivered frames are counted in
+            get_delivery_stats()["messages_sent"].
+        """
+        if connection_id not in self._connections:
             return False
+        return self._fan_out([connection_id], event_type, data) == 1
     
     async def send_to_user(
         self,
@@ -291,7 +500,8 @@ class WebSocketManager:
         event_type: str,
         data: Dict[str, Any],
         channel: Optional[str] = None,
-        queue_if_offline: bool = True
+        queue_if_offline: bool = True,
+        coalesce_key: Optional[str] = None
     ):
         """
         Send a message to all connections for a user.
@@ -302,6 +512,9 @@ class WebSocketManager:
             data: Event data
             channel: Optional channel filter
             queue_if_offline: Whether to queue if user is offline
+            coalesce_key: Frames sharing this key may replace each other in
+                a full send queue (only pass one for state updates such as
+                progress; without it a full queue drops its oldest frame)
         """
         connection_ids = self._user_connections.get(user_id, set())
         
@@ -310,13 +523,13 @@ class WebSocketManager:
             await self._queue_message(user_id, channel or "system", event_type, data)
             return
         
-        for connection_id in list(connection_ids):
-            connection = self._connections.get(connection_id)
-            if connection:
-                # Check channel subscription if specified
-                if channel and channel not in connection.channels:
-                    continue
-                await self.send_to_connection(connection_id, event_type, data)
+        targets = [
+            connection_id
+            for connection_id in list(connection_ids)
+            if connection_id in self._connections
+            and (not channel or channel in self._connections[connection_id].channels)
+        ]
+        self._fan_out(targets, event_type, data, coalesce_key)
     
     async def send_to_tenant(
         self,
@@ -328,12 +541,13 @@ class WebSocketManager:
         """Send a message to all users in a tenant."""
         connection_ids = self._tenant_connections.get(tenant_id, set())
         
-        for connection_id in list(connection_ids):
-            connection = self._connections.get(connection_id)
-            if connection:
-                if channel and channel not in connection.channels:
-                    continue
-                await self.send_to_connection(connection_id, event_type, data)
+        targets = [
+            connection_id
+            for connection_id in list(connection_ids)
+            if connection_id in self._connections
+            and (not channel or channel in self._connections[connection_id].channels)
+        ]
+        self._fan_out(targets, event_type, data)
     
     async def broadcast_to_channel(
         self,
@@ -345,17 +559,17 @@ class WebSocketManager:
         """Broadcast a message to all connections subscribed to a channel."""
         connection_ids = self._channel_connections.get(channel, set())
         
-        for connection_id in list(connection_ids):
-            connection = self._connections.get(connection_id)
-            if connection:
-                if exclude_user and connection.user_id == exclude_user:
-                    continue
-                await self.send_to_connection(connection_id, event_type, data)
+        targets = [
+            connection_id
+            for connection_id in list(connection_ids)
+            if connection_id in self._connections
+            and not (exclude_user and self._connections[connection_id].user_id == exclude_user)
+        ]
+        self._fan_out(targets, event_type, data)
     
     async def broadcast_all(self, event_type: str, data: Dict[str, Any]):
         """Broadcast to all connections (e.g., system announcements)."""
-        for connection_id in list(self._connections.keys()):
-            await self.send_to_connection(connection_id, event_type, data)
+        self._fan_out(list(self._connections.keys()), event_type, data)
     
     async def _queue_message(
         self,
@@ -415,6 +629,36 @@ class WebSocketManager:
         """Get number of connections for a user."""
         return len(self._user_connections.get(user_id, set()))
     
+    def get_delivery_stats(self) -> Dict[str, Any]:
+        """Get send-queue depth, drop and latency metrics."""
+        connections = list(self._connections.values())
+        depths = [len(c.send_queue) for c in connections if c.send_queue]
+        sent = sum(c.messages_sent for c in connections)
+        return {
+            "policy": self.slow_consumer_policy.value,
+            "queue_size_limit": self.send_queue_size,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "queue_high_water": max(
+                (c.send_queue.high_water for c in connections if c.send_queue),
+                default=0,
+            ),
+            "messages_sent": sent,
+            "messages_dropped": self._total_dropped + sum(
+                c.send_queue.dropped for c in connections if c.send_queue
+            ),
+            "messages_coalesced": self._total_coalesced + sum(
+                c.send_queue.coalesced for c in connections if c.send_queue
+            ),
+            "slow_consumer_disconnects": self._slow_consumer_disconnects,
+            "send_latency_ms_avg": round(
+                sum(c.send_latency_ms_avg * c.messages_sent for c in connections) / sent, 3
+            ) if sent else 0.0,
+            "send_latency_ms_max": round(
+                max((c.send_latency_ms_max for c in connections), default=0.0), 3
+            ),
+        }
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get WebSocket manager statistics."""
         return {
@@ -428,6 +672,7 @@ class WebSocketManager:
             "queued_messages": sum(
                 len(msgs) for msgs in self._message_queue.values()
             ),
+            "delivery": self.get_delivery_stats(),
         }
 
 
@@ -599,6 +844,33 @@ class NotificationBroadcaster:
             channel=NotificationChannel.INVOICES.value
         )
     
+    async def notify_invoice_nrs_status(
+        self,
+        tenant_id: uuid.UUID,
+        invoice_id: uuid.UUID,
+        invoice_number: str,
+        status: str,
+        nrs_irn: Optional[str] = None,
+        qr_code_data: Optional[str] = None,
+        message: Optional[str] = None
+    ):
+        """Send the outcome of an NRS submission (IRN or rejection)."""
+        data = {
+            "invoice_id": str(invoice_id),
+            "invoice_number": invoice_number,
+            "status": status,
+            "nrs_irn": nrs_irn,
+            "qr_code_data": qr_code_data,
+            "message": message,
+        }
+        
+        await self.ws_manager.send_to_tenant(
+            tenant_id,
+            "invoice_nrs_status",
+            data,
+            channel=NotificationChannel.INVOICES.value
+        )
+    
     async def notify_payment_received(
         self,
         tenant_id: uuid.UUID,
@@ -651,6 +923,29 @@ class NotificationBroadcaster:
             channel=NotificationChannel.CONSOLIDATION.value
         )
     
+    async def notify_ocr_batch_progress(
+        self,
+        user_id: uuid.UUID,
+        batch_id: str,
+        progress: Dict[str, Any]
+    ):
+        """
+        Send OCR batch progress (one event per finished file).
+        
+        Not queued for offline users; a slow client only gets the latest
+        progress of each batch.
+        """
+        data = {"batch_id": batch_id, **progress}
+        
+        await self.ws_manager.send_to_user(
+            user_id,
+            "ocr_batch_progress",
+            data,
+            channel=NotificationChannel.SYSTEM.value,
+            queue_if_offline=False,
+            coalesce_key=f"ocr_batch_progress:{batch_id}"
+        )
+    
     async def notify_system_announcement(
         self,
         title: str,
@@ -682,3 +977,107 @@ def get_ws_manager() -> WebSocketManager:
 def get_notification_broadcaster() -> NotificationBroadcaster:
     """Get the global notification broadcaster instance."""
     return notification_broadcaster
+
+
+# ===========================================
+# CROSS-PROCESS RELAY
+# ===========================================
+
+WS_RELAY_CHANNEL = "ws:relay"
+
+
+class WebSocketRelayPublisher:
+    """
+    Stand-in for WebSocketManager in processes without sockets.
+    
+    Celery workers hold no WebSocket connections, so their sends are
+    published to Redis and replayed on every web process's manager by
+    run_ws_relay(). Use through get_relay_broadcaster(). Delivery is
+    best effort: a Redis error is logged, not raised.
+    """
+    
+    def __init__(self, redis_client=None):
+        self._client = redis_client
+    
+    async def _publish(self, method: str, **kwargs):
+        try:
+            if self._client is None:
+                from app.services.cache_service import get_cache_service
+                self._client = await get_cache_service().get_client()
+            payload = json.dumps({"method": method, "kwargs": kwargs}, default=str)
+            await self._client.publish(WS_RELAY_CHANNEL, payload)
+        except Exception as e:
+            logger.warning(f"WebSocket relay publish failed ({method}): {e}")
+    
+    async def send_to_user(self, user_id: uuid.UUID, event_type: str, data: Dict[str, Any], **options):
+        await self._publish("send_to_user", user_id=user_id, event_type=event_type, data=data, **options)
+    
+    async def send_to_tenant(self, tenant_id: uuid.UUID, event_type: str, data: Dict[str, Any], **options):
+        await self._publish("send_to_tenant", tenant_id=tenant_id, event_type=event_type, data=data, **options)
+    
+    async def broadcast_to_channel(self, channel: str, event_type: str, data: Dict[str, Any], **options):
+        await self._publish("broadcast_to_channel", channel=channel, event_type=event_type, data=data, **options)
+    
+    async def broadcast_all(self, event_type: str, data: Dict[str, Any]):
+        await self._publish("broadcast_all", event_type=event_type, data=data)
+
+
+async def replay_relayed_message(manager: WebSocketManager, payload: str):
+    """Apply one relayed send to a local manager."""
+    message = json.loads(payload)
+    method = message["method"]
+    if method not in ("send_to_user", "send_to_tenant", "broadcast_to_channel", "broadcast_all"):
+        raise ValueError(f"Not a relayable method: {method}")
+    kwargs = message["kwargs"]
+    for key in ("user_id", "tenant_id", "exclude_user"):
+        if kwargs.get(key):
+            kwargs[key] = uuid.UUID(kwargs[key])
+    await getattr(manager, method)(**kwargs)
+
+
+async def run_ws_relay(
+    manager: Optional[WebSocketManager] = None,
+    redis_client=None,
+    reconnect_seconds: float = 5.0,
+):
+    """
+    Replay relayed sends on this process's manager until cancelled.
+    
+    Started from the web app's lifespan; resubscribes after Redis errors.
+    """
+    manager = manager or ws_manager
+    
+    while True:
+        try:
+            client = redis_client
+            if client is None:
+                from app.services.cache_service import get_cache_service
+                client = await get_cache_service().get_client()
+            pubsub = client.pubsub()
+            await pubsub.subscribe(WS_RELAY_CHANNEL)
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        await replay_relayed_message(manager, message["data"])
+                    except Exception as e:
+                        logger.warning(f"Dropped relayed WebSocket message: {e}")
+            finally:
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"WebSocket relay disconnected, retrying in {reconnect_seconds}s: {e}")
+            await asyncio.sleep(reconnect_seconds)
+
+
+_relay_broadcaster: Optional[NotificationBroadcaster] = None
+
+
+def get_relay_broadcaster() -> NotificationBroadcaster:
+    """Broadcaster for Celery workers, delivering through the Redis relay."""
+    global _relay_broadcaster
+    if _relay_broadcaster is None:
+        _relay_broadcaster = NotificationBroadcaster(WebSocketRelayPublisher())
+    return _relay_broadcaster
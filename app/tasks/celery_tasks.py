@@ -4,26 +4,24 @@ TekVwarho ProAudit - Celery Tasks
 Background tasks for scheduled operations.
 """
 
-import asyncio
 import logging
 from datetime import date, datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from uuid import UUID
 
 from celery import shared_task
 
-from app.database import async_session_factory
-
-logger = logging.getLogger(__name__)
+from app.config import settings
+from app.tasks.fanout import dispatch_sharded_job, register_sharded_job
+from app.tasks.worker_runtime import run_async, task_session
 
+# Tasks write through the ORM too: register the flush hooks that keep the
+# dashboard rollups, platform metrics and search index current
+import app.services.dashboard_rollup_service  # noqa: F401
+import app.services.platform_metrics_service  # noqa: F401
+import app.services.search_index_service  # noqa: F401
 
-def run_async(coro):
-    """Helper to run async functions in Celery tasks."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+logger = logging.getLogger(__name__)
 
 
 # ===========================================
@@ -39,70 +37,62 @@ def check_overdue_invoices_task() -> Dict[str, Any]:
 async def _check_overdue_invoices() -> Dict[str, Any]:
     """Async implementation of overdue invoice check."""
     from app.models.invoice import Invoice, InvoiceStatus
-    from app.models.user import User, UserEntityAccess
-    from app.services.notification_service import NotificationService
-    from sqlalchemy import select
+    from app.services.notification_service import (
+        BulkNotification,
+        EntityAudience,
+        NotificationService,
+    )
+    from sqlalchemy import select, update
+    from sqlalchemy.orm import selectinload
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         today = date.today()
         
         # Find finalized invoices past due date
         result = await db.execute(
             select(Invoice)
+            .options(selectinload(Invoice.customer))
             .where(Invoice.status.in_([InvoiceStatus.PENDING, InvoiceStatus.SUBMITTED, InvoiceStatus.ACCEPTED]))
             .where(Invoice.due_date < today)
         )
         
         overdue_invoices = result.scalars().all()
-        notifications_sent = 0
-        invoices_updated = 0
         
-        notification_service = NotificationService(db)
+        # Flip status for every overdue invoice in one statement
+        to_update = [inv.id for inv in overdue_invoices if inv.status != InvoiceStatus.OVERDUE]
+        for start in range(0, len(to_update), NotificationService.BULK_CHUNK_SIZE):
+            await db.execute(
+                update(Invoice)
+                .where(Invoice.id.in_(to_update[start:start + NotificationService.BULK_CHUNK_SIZE]))
+                .values(status=InvoiceStatus.OVERDUE)
+                .execution_options(synchronize_session=False)
+            )
+        invoices_updated = len(to_update)
         
+        # Notify all users with access to each invoice's entity
+        notifications = []
         for invoice in overdue_invoices:
             days_overdue = (today - invoice.due_date).days
-            
-            # Update invoice status if needed
-            if invoice.status != InvoiceStatus.OVERDUE:
-                invoice.status = InvoiceStatus.OVERDUE
-                invoices_updated += 1
-            
-            # Get users with access to this entity
-            users_result = await db.execute(
-                select(UserEntityAccess)
-                .where(UserEntityAccess.entity_id == invoice.entity_id)
-            )
-            user_accesses = users_result.scalars().all()
-            
-            # Send notifications to all users with access
-            for access in user_accesses:
-                user_result = await db.execute(
-                    select(User).where(User.id == access.user_id)
-                )
-                user = user_result.scalar_one_or_none()
-                
-                if user and user.is_active:
-                    customer_name = "Unknown"
-                    if invoice.customer:
-                        customer_name = invoice.customer.name
-                    
-                    await notification_service.notify_invoice_overdue(
-                        user_id=user.id,
-                        entity_id=invoice.entity_id,
-                        invoice_number=invoice.invoice_number,
-                        customer_name=customer_name,
-                        amount=float(invoice.total_amount),
-                        days_overdue=days_overdue,
-                        email_address=user.email if days_overdue in [1, 7, 14, 30] else None,
-                    )
-                    notifications_sent += 1
-        
-        await db.commit()
+            notifications.append(BulkNotification(
+                recipient=EntityAudience(invoice.entity_id),
+                template="invoice_overdue",
+                payload={
+                    "invoice_number": invoice.invoice_number,
+                    "customer_name": invoice.customer.name if invoice.customer else "Unknown",
+                    "amount": float(invoice.total_amount),
+                    "days_overdue": days_overdue,
+                },
+                send_email=days_overdue in [1, 7, 14, 30],
+            ))
+        
+        summary = await NotificationService(db).notify_bulk(notifications)
+        notifications_sent = summary["notifications_created"]
         
         logger.info(f"Overdue check complete: {invoices_updated} invoices updated, {notifications_sent} notifications sent")
         return {
             "invoices_updated": invoices_updated,
             "notifications_sent": notifications_sent,
+            "emails_sent": summary["emails_sent"],
         }
 
 
@@ -119,11 +109,14 @@ def check_low_stock_task() -> Dict[str, Any]:
 async def _check_low_stock() -> Dict[str, Any]:
     """Async implementation of low stock check."""
     from app.models.inventory import InventoryItem
-    from app.models.user import User, UserEntityAccess
-    from app.services.notification_service import NotificationService
+    from app.services.notification_service import (
+        BulkNotification,
+        EntityAudience,
+        NotificationService,
+    )
     from sqlalchemy import select
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         result = await db.execute(
             select(InventoryItem)
             .where(InventoryItem.quantity_on_hand <= InventoryItem.reorder_level)
@@ -131,36 +124,21 @@ async def _check_low_stock() -> Dict[str, Any]:
         )
         
         low_stock_items = result.scalars().all()
-        notifications_sent = 0
         
-        notification_service = NotificationService(db)
-        
-        for item in low_stock_items:
-            # Get users with access to this entity
-            users_result = await db.execute(
-                select(UserEntityAccess)
-                .where(UserEntityAccess.entity_id == item.entity_id)
+        summary = await NotificationService(db).notify_bulk([
+            BulkNotification(
+                recipient=EntityAudience(item.entity_id),
+                template="low_stock",
+                payload={
+                    "item_id": str(item.id),
+                    "item_name": item.name,
+                    "current_stock": item.quantity_on_hand,
+                    "reorder_level": item.reorder_level,
+                },
             )
-            user_accesses = users_result.scalars().all()
-            
-            for access in user_accesses:
-                user_result = await db.execute(
-                    select(User).where(User.id == access.user_id)
-                )
-                user = user_result.scalar_one_or_none()
-                
-                if user and user.is_active:
-                    await notification_service.notify_low_stock(
-                        user_id=user.id,
-                        entity_id=item.entity_id,
-                        item_name=item.name,
-                        current_stock=item.quantity_on_hand,
-                        reorder_level=item.reorder_level,
-                        item_id=item.id,
-                    )
-                    notifications_sent += 1
-        
-        await db.commit()
+            for item in low_stock_items
+        ])
+        notifications_sent = summary["notifications_created"]
         
         logger.info(f"Low stock check complete: {len(low_stock_items)} items low, {notifications_sent} notifications sent")
         return {
@@ -182,11 +160,14 @@ def check_vat_deadlines_task() -> Dict[str, Any]:
 async def _check_vat_deadlines() -> Dict[str, Any]:
     """Async implementation of VAT deadline check."""
     from app.models.entity import BusinessEntity
-    from app.models.user import User, UserEntityAccess
-    from app.services.notification_service import NotificationService
+    from app.services.notification_service import (
+        BulkNotification,
+        EntityAudience,
+        NotificationService,
+    )
     from sqlalchemy import select
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         today = date.today()
         
         # VAT is due by 21st of the following month
@@ -202,43 +183,30 @@ async def _check_vat_deadlines() -> Dict[str, Any]:
         if days_until > 7 or days_until < 0:
             return {"status": "no_action_needed", "days_until": days_until}
         
-        notification_service = NotificationService(db)
-        notifications_sent = 0
-        
         # Get all active VAT-registered entities
         result = await db.execute(
-            select(BusinessEntity)
+            select(BusinessEntity.id)
             .where(BusinessEntity.is_active == True)
             .where(BusinessEntity.is_vat_registered == True)
         )
-        entities = result.scalars().all()
+        entity_ids = result.scalars().all()
         
-        for entity in entities:
-            # Get users with access
-            users_result = await db.execute(
-                select(UserEntityAccess)
-                .where(UserEntityAccess.entity_id == entity.id)
+        payload = {
+            "period": period,
+            "deadline": deadline.strftime('%B %d, %Y'),
+            "days_until": days_until,
+            "vat_amount": None,
+        }
+        summary = await NotificationService(db).notify_bulk([
+            BulkNotification(
+                recipient=EntityAudience(entity_id),
+                template="vat_reminder",
+                payload=payload,
+                send_email=days_until <= 3,
             )
-            user_accesses = users_result.scalars().all()
-            
-            for access in user_accesses:
-                user_result = await db.execute(
-                    select(User).where(User.id == access.user_id)
-                )
-                user = user_result.scalar_one_or_none()
-                
-                if user and user.is_active:
-                    await notification_service.notify_vat_reminder(
-                        user_id=user.id,
-                        entity_id=entity.id,
-                        period=period,
-                        deadline=deadline.strftime('%B %d, %Y'),
-                        days_until=days_until,
-                        email_address=user.email if days_until <= 3 else None,
-                    )
-                    notifications_sent += 1
-        
-        await db.commit()
+            for entity_id in entity_ids
+        ])
+        notifications_sent = summary["notifications_created"]
         
         logger.info(f"VAT reminder sent: {notifications_sent} notifications, {days_until} days until deadline")
         return {
@@ -257,12 +225,14 @@ def check_paye_deadlines_task() -> Dict[str, Any]:
 async def _check_paye_deadlines() -> Dict[str, Any]:
     """Async implementation of PAYE deadline check."""
     from app.models.entity import BusinessEntity
-    from app.models.user import User, UserEntityAccess
-    from app.services.notification_service import NotificationService
-    from app.models.notification import NotificationType
+    from app.services.notification_service import (
+        BulkNotification,
+        EntityAudience,
+        NotificationService,
+    )
     from sqlalchemy import select
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         today = date.today()
         
         # PAYE is due by 10th of the following month
@@ -278,44 +248,28 @@ async def _check_paye_deadlines() -> Dict[str, Any]:
         if days_until > 7 or days_until < 0:
             return {"status": "no_action_needed", "days_until": days_until}
         
-        notification_service = NotificationService(db)
-        notifications_sent = 0
-        
         # Get all active entities
         result = await db.execute(
-            select(BusinessEntity)
+            select(BusinessEntity.id)
             .where(BusinessEntity.is_active == True)
         )
-        entities = result.scalars().all()
+        entity_ids = result.scalars().all()
         
-        for entity in entities:
-            users_result = await db.execute(
-                select(UserEntityAccess)
-                .where(UserEntityAccess.entity_id == entity.id)
+        payload = {
+            "period": period,
+            "deadline": deadline.strftime('%B %d, %Y'),
+            "days_until": days_until,
+        }
+        summary = await NotificationService(db).notify_bulk([
+            BulkNotification(
+                recipient=EntityAudience(entity_id),
+                template="paye_reminder",
+                payload=payload,
+                send_email=days_until <= 3,
             )
-            user_accesses = users_result.scalars().all()
-            
-            for access in user_accesses:
-                user_result = await db.execute(
-                    select(User).where(User.id == access.user_id)
-                )
-                user = user_result.scalar_one_or_none()
-                
-                if user and user.is_active:
-                    await notification_service.create_notification(
-                        user_id=user.id,
-                        entity_id=entity.id,
-                        notification_type=NotificationType.PAYE_REMINDER,
-                        title="PAYE Filing Reminder",
-                        message=f"PAYE remittance for {period} is due on {deadline.strftime('%B %d, %Y')} ({days_until} days remaining).",
-                        action_url="/reports?tab=tax",
-                        action_label="View PAYE Report",
-                        send_email=days_until <= 3,
-                        email_address=user.email if days_until <= 3 else None,
-                    )
-                    notifications_sent += 1
-        
-        await db.commit()
+            for entity_id in entity_ids
+        ])
+        notifications_sent = summary["notifications_created"]
         
         logger.info(f"PAYE reminder sent: {notifications_sent} notifications")
         return {
@@ -329,61 +283,30 @@ async def _check_paye_deadlines() -> Dict[str, Any]:
 # NRS TASKS
 # ===========================================
 
+@shared_task(name='app.tasks.celery_tasks.nrs_dispatch_outbox_task')
+def nrs_dispatch_outbox_task() -> Dict[str, Any]:
+    """Submit due NRS outbox rows (any number may run at once)."""
+    return run_async(_dispatch_nrs_outbox())
+
+
 @shared_task(name='app.tasks.celery_tasks.retry_failed_nrs_submissions_task')
 def retry_failed_nrs_submissions_task() -> Dict[str, Any]:
-    """Retry failed NRS invoice submissions."""
-    return run_async(_retry_failed_nrs_submissions())
+    """Alias of nrs_dispatch_outbox_task, kept for already-queued beat messages."""
+    return run_async(_dispatch_nrs_outbox())
 
 
-async def _retry_failed_nrs_submissions() -> Dict[str, Any]:
-    """Async implementation of NRS submission retry."""
-    from app.models.invoice import Invoice, InvoiceStatus
-    from app.services.nrs_service import NRSService
-    from sqlalchemy import select
+async def _dispatch_nrs_outbox() -> Dict[str, Any]:
+    """
+    Async implementation of the NRS outbox dispatcher.
     
-    async with async_session_factory() as db:
-        # Find invoices pending NRS submission (failed previously)
-        result = await db.execute(
-            select(Invoice)
-            .where(Invoice.status == InvoiceStatus.PENDING)
-            .where(Invoice.nrs_irn == None)
-            .where(Invoice.nrs_submission_attempts < 5)  # Max 5 retries
-        )
-        
-        pending_invoices = result.scalars().all()
-        successful = 0
-        failed = 0
-        
-        nrs_service = NRSService()
-        
-        for invoice in pending_invoices:
-            try:
-                # Attempt submission
-                response = await nrs_service.submit_invoice(invoice)
-                
-                if response.success and response.irn:
-                    invoice.nrs_irn = response.irn
-                    invoice.nrs_qr_code_data = response.qr_code_data
-                    invoice.nrs_submission_date = datetime.utcnow()
-                    invoice.status = InvoiceStatus.SUBMITTED
-                    successful += 1
-                else:
-                    invoice.nrs_submission_attempts = (invoice.nrs_submission_attempts or 0) + 1
-                    invoice.nrs_last_error = response.message
-                    failed += 1
-            except Exception as e:
-                invoice.nrs_submission_attempts = (invoice.nrs_submission_attempts or 0) + 1
-                invoice.nrs_last_error = str(e)
-                failed += 1
-        
-        await db.commit()
-        
-        logger.info(f"NRS retry complete: {successful} successful, {failed} failed")
-        return {
-            "successful": successful,
-            "failed": failed,
-            "total_pending": len(pending_invoices),
-        }
+    Claims batches with SELECT ... FOR UPDATE SKIP LOCKED until nothing is
+    due or settings.nrs_outbox_drain_seconds is spent; failed submissions
+    are rescheduled with exponential backoff (see nrs_outbox_service).
+    """
+    from app.services.nrs_outbox_service import drain_nrs_outbox
+    
+    async with task_session() as db:
+        return await drain_nrs_outbox(db)
 
 
 # ===========================================
@@ -400,7 +323,7 @@ async def _cleanup_notifications() -> Dict[str, Any]:
     """Delete notifications older than 90 days."""
     from app.services.notification_service import NotificationService
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         notification_service = NotificationService(db)
         deleted_count = await notification_service.delete_old_notifications(days_old=90)
         
@@ -419,7 +342,7 @@ async def _archive_audit_logs() -> Dict[str, Any]:
     from app.models.audit_consolidated import AuditLog
     from sqlalchemy import select, func
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         cutoff = datetime.utcnow() - timedelta(days=365 * 5)
         
         # Count logs to archive (but don't delete - NTAA requires 5-year retention)
@@ -453,7 +376,7 @@ async def _generate_monthly_tax_summary() -> Dict[str, Any]:
     from app.models.notification import NotificationType
     from sqlalchemy import select
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         today = date.today()
         
         # Generate for previous month
@@ -512,6 +435,110 @@ async def _generate_monthly_tax_summary() -> Dict[str, Any]:
         }
 
 
+@shared_task(name='app.tasks.celery_tasks.repair_dashboard_rollups_task')
+def repair_dashboard_rollups_task() -> Dict[str, Any]:
+    """Rebuild recent dashboard rollup rows from transactions and invoices."""
+    return run_async(_repair_dashboard_rollups())
+
+
+async def _repair_dashboard_rollups() -> Dict[str, Any]:
+    """
+    Async implementation of the rollup repair.
+    
+    Postings keep entity_daily_summaries current as they flush; this pass
+    corrects drift from statements that bypass the ORM (bulk UPDATEs such
+    as the overdue sweep) over the last settings.dashboard_rollup_repair_days.
+    """
+    from app.services.dashboard_rollup_service import rebuild_daily_summaries
+    
+    start = date.today() - timedelta(days=settings.dashboard_rollup_repair_days)
+    async with task_session() as db:
+        rows = await rebuild_daily_summaries(db, start=start)
+        await db.commit()
+    
+    logger.info(f"Rebuilt {rows} dashboard rollup rows since {start}")
+    return {"since": start.isoformat(), "rows": rows}
+
+
+@shared_task(name='app.tasks.celery_tasks.refresh_platform_metrics_task')
+def refresh_platform_metrics_task() -> Dict[str, Any]:
+    """Recount the staff dashboard platform metrics from source tables."""
+    return run_async(_refresh_platform_metrics())
+
+
+async def _refresh_platform_metrics() -> Dict[str, Any]:
+    """
+    Async implementation of the platform metrics refresh.
+    
+    Counters move with every flush; this pass recomputes the windowed
+    figures (new users, tickets resolved today) and corrects drift.
+    """
+    from app.services.platform_metrics_service import refresh_platform_metrics
+    
+    async with task_session() as db:
+        metrics = await refresh_platform_metrics(db)
+        await db.commit()
+    
+    logger.info(f"Refreshed {metrics} platform metrics")
+    return {"metrics": metrics}
+
+
+@shared_task(name='app.tasks.celery_tasks.rebuild_search_index_task')
+def rebuild_search_index_task(entity_id: Optional[str] = None) -> Dict[str, Any]:
+    """Rebuild global search documents (all entities, or one)."""
+    return run_async(_rebuild_search_index(entity_id))
+
+
+async def _rebuild_search_index(entity_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Async implementation of the search index backfill.
+    
+    Run once after the search_documents migration, and for an entity after
+    writes that bypass the ORM. Commits batch by batch.
+    """
+    from app.services.search_index_service import rebuild_search_documents
+    
+    async with task_session() as db:
+        documents = await rebuild_search_documents(db, UUID(entity_id) if entity_id else None)
+    
+    logger.info(f"Indexed {documents} search documents" + (f" for entity {entity_id}" if entity_id else ""))
+    return {"entity_id": entity_id, "documents": documents}
+
+
+@shared_task(name='app.tasks.celery_tasks.bulk_import_task')
+def bulk_import_task(job_id: str) -> Dict[str, Any]:
+    """Run a queued BulkImportJob, resuming after its last committed chunk."""
+    return run_async(_bulk_import(job_id))
+
+
+async def _bulk_import(job_id: str) -> Dict[str, Any]:
+    """Async implementation of a background CSV import."""
+    from app.services.bulk_import_service import run_bulk_import_job
+    
+    async with task_session() as db:
+        result = await run_bulk_import_job(db, UUID(job_id))
+    
+    logger.info(f"Bulk import {job_id}: {result}")
+    return result
+
+
+@shared_task(name='app.tasks.celery_tasks.entity_backup_task')
+def entity_backup_task(job_id: str) -> Dict[str, Any]:
+    """Run a queued EntityBackupJob (backup or restore)."""
+    return run_async(_entity_backup(job_id))
+
+
+async def _entity_backup(job_id: str) -> Dict[str, Any]:
+    """Async implementation of a background entity backup or restore."""
+    from app.services.entity_backup_service import run_backup_job
+    
+    async with task_session() as db:
+        result = await run_backup_job(db, UUID(job_id))
+    
+    logger.info(f"Entity backup job {job_id}: {result}")
+    return result
+
+
 # ===========================================
 # EMAIL TASKS
 # ===========================================
@@ -547,12 +574,45 @@ def check_trial_expirations_task() -> Dict[str, Any]:
     - Trials with payment method: Attempt first charge
     - Trials without payment method: Downgrade to free/disabled
     - Send notifications before and on expiry
+    
+    Fans out one subtask per page of organizations (see app.tasks.fanout).
     """
-    return run_async(_check_trial_expirations())
+    return dispatch_sharded_job("check_trial_expirations")
+
+
+TRIAL_GRACE_PERIOD_DAYS = 3
+TRIAL_WARNING_DAYS = [3, 1]
 
 
-async def _check_trial_expirations() -> Dict[str, Any]:
-    """Async implementation of trial expiration check."""
+def _trial_organization_ids(params: Dict[str, Any]):
+    """Organizations with a trial expired within grace or inside the warning window."""
+    from app.models.sku import TenantSKU
+    from sqlalchemy import select
+    
+    now = datetime.utcnow()
+    window_end = (now + timedelta(days=max(TRIAL_WARNING_DAYS))).replace(hour=23, minute=59, second=59)
+    return (
+        select(TenantSKU.organization_id)
+        .where(TenantSKU.is_active == True)
+        .where(TenantSKU.trial_ends_at != None)
+        .where(TenantSKU.trial_ends_at >= now - timedelta(days=TRIAL_GRACE_PERIOD_DAYS))
+        .where(TenantSKU.trial_ends_at <= window_end)
+        .distinct()
+    )
+
+
+@register_sharded_job("check_trial_expirations", _trial_organization_ids, queue="billing")
+async def _trial_expirations_shard(ids: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+    return await _check_trial_expirations([UUID(i) for i in ids])
+
+
+async def _check_trial_expirations(organization_ids: Optional[List[UUID]] = None) -> Dict[str, Any]:
+    """
+    Async implementation of trial expiration check.
+    
+    Args:
+        organization_ids: Restrict to these organizations (one shard). None checks all.
+    """
     from app.models.sku import TenantSKU, SKUTier
     from app.models.organization import Organization
     from app.models.user import User
@@ -560,20 +620,25 @@ async def _check_trial_expirations() -> Dict[str, Any]:
     from app.services.dunning_service import DunningService
     from sqlalchemy import select, and_
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         now = datetime.utcnow()
         
         # Find trials expiring today or already expired (within grace period)
-        grace_period_days = 3
+        grace_period_days = TRIAL_GRACE_PERIOD_DAYS
         grace_cutoff = now - timedelta(days=grace_period_days)
         
-        result = await db.execute(
+        def in_shard(query):
+            if organization_ids is None:
+                return query
+            return query.where(TenantSKU.organization_id.in_(organization_ids))
+        
+        result = await db.execute(in_shard(
             select(TenantSKU)
             .where(TenantSKU.is_active == True)
             .where(TenantSKU.trial_ends_at != None)
             .where(TenantSKU.trial_ends_at <= now)
             .where(TenantSKU.trial_ends_at >= grace_cutoff)
-        )
+        ))
         
         expiring_trials = result.scalars().all()
         
@@ -633,19 +698,18 @@ async def _check_trial_expirations() -> Dict[str, Any]:
                 trials_disabled += 1
         
         # Also check for trials expiring soon (3 days, 1 day warnings)
-        warning_days = [3, 1]
-        for days_until in warning_days:
+        for days_until in TRIAL_WARNING_DAYS:
             warning_date = now + timedelta(days=days_until)
             warning_start = warning_date.replace(hour=0, minute=0, second=0)
             warning_end = warning_date.replace(hour=23, minute=59, second=59)
             
-            upcoming_result = await db.execute(
+            upcoming_result = await db.execute(in_shard(
                 select(TenantSKU)
                 .where(TenantSKU.is_active == True)
                 .where(TenantSKU.trial_ends_at != None)
                 .where(TenantSKU.trial_ends_at >= warning_start)
                 .where(TenantSKU.trial_ends_at <= warning_end)
-            )
+            ))
             
             upcoming_trials = upcoming_result.scalars().all()
             
@@ -696,13 +760,46 @@ def process_subscription_renewals_task() -> Dict[str, Any]:
     - Initiate payment charges via Paystack
     - Update subscription periods
     - Handle failures with dunning
+    
+    Fans out one subtask per page of organizations (see app.tasks.fanout).
     """
-    return run_async(_process_subscription_renewals())
+    return dispatch_sharded_job("process_subscription_renewals")
 
 
-async def _process_subscription_renewals() -> Dict[str, Any]:
-    """Async implementation of subscription renewal processing."""
-    from app.models.sku import TenantSKU, SKUTier, PaymentTransaction
+def _renewal_due_condition():
+    from app.models.sku import TenantSKU, SKUTier
+    from sqlalchemy import and_
+    
+    # Period ended today or earlier, not on trial; Core tier is free and doesn't renew
+    return and_(
+        TenantSKU.is_active == True,
+        TenantSKU.trial_ends_at == None,
+        TenantSKU.current_period_end != None,
+        TenantSKU.current_period_end <= datetime.utcnow().date(),
+        TenantSKU.tier != SKUTier.CORE,
+    )
+
+
+def _renewal_organization_ids(params: Dict[str, Any]):
+    from app.models.sku import TenantSKU
+    from sqlalchemy import select
+    
+    return select(TenantSKU.organization_id).where(_renewal_due_condition()).distinct()
+
+
+@register_sharded_job("process_subscription_renewals", _renewal_organization_ids, queue="billing")
+async def _subscription_renewals_shard(ids: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+    return await _process_subscription_renewals([UUID(i) for i in ids])
+
+
+async def _process_subscription_renewals(organization_ids: Optional[List[UUID]] = None) -> Dict[str, Any]:
+    """
+    Async implementation of subscription renewal processing.
+    
+    Args:
+        organization_ids: Restrict to these organizations (one shard). None processes all.
+    """
+    from app.models.sku import TenantSKU, PaymentTransaction
     from app.models.organization import Organization
     from app.models.user import User
     from app.services.billing_service import BillingService, BillingCycle
@@ -711,20 +808,15 @@ async def _process_subscription_renewals() -> Dict[str, Any]:
     from app.config.sku_config import TIER_PRICING
     from sqlalchemy import select
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         now = datetime.utcnow()
-        today = now.date()
         
         # Find subscriptions where current_period_end is today or past
         # and they're not on trial
-        result = await db.execute(
-            select(TenantSKU)
-            .where(TenantSKU.is_active == True)
-            .where(TenantSKU.trial_ends_at == None)  # Not on trial
-            .where(TenantSKU.current_period_end != None)
-            .where(TenantSKU.current_period_end <= today)
-            .where(TenantSKU.tier != SKUTier.CORE)  # Core tier is free/doesn't renew
-        )
+        query = select(TenantSKU).where(_renewal_due_condition())
+        if organization_ids is not None:
+            query = query.where(TenantSKU.organization_id.in_(organization_ids))
+        result = await db.execute(query)
         
         due_subscriptions = result.scalars().all()
         
@@ -838,7 +930,7 @@ async def _retry_failed_payments() -> Dict[str, Any]:
     from app.services.dunning_service import DunningService, DunningLevel
     from sqlalchemy import select, and_
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         now = datetime.utcnow()
         
         dunning_service = DunningService(db)
@@ -964,7 +1056,7 @@ async def _send_payment_reminders() -> Dict[str, Any]:
     from app.services.billing_email_service import BillingEmailService
     from sqlalchemy import select, and_
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         now = datetime.utcnow()
         today = now.date()
         
@@ -1078,7 +1170,7 @@ async def _process_scheduled_cancellations() -> Dict[str, Any]:
     """Async implementation of scheduled cancellation processing."""
     from app.tasks.scheduled_tasks import process_scheduled_cancellations
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         result = await process_scheduled_cancellations(db)
         await db.commit()
         return result
@@ -1103,7 +1195,7 @@ async def _check_usage_alerts() -> Dict[str, Any]:
     """Async implementation of usage alert checking."""
     from app.tasks.scheduled_tasks import check_usage_alerts
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         result = await check_usage_alerts(db)
         await db.commit()
         return result
@@ -1130,7 +1222,7 @@ async def _auto_resume_paused_subscriptions() -> Dict[str, Any]:
     """Async implementation of auto-resume paused subscriptions."""
     from app.tasks.scheduled_tasks import auto_resume_paused_subscriptions
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         result = await auto_resume_paused_subscriptions(db)
         await db.commit()
         return result
@@ -1157,7 +1249,7 @@ async def _update_exchange_rates() -> Dict[str, Any]:
     """Async implementation of exchange rate update."""
     from app.tasks.scheduled_tasks import update_exchange_rates
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         result = await update_exchange_rates(db)
         await db.commit()
         return result
@@ -1184,7 +1276,7 @@ async def _process_scheduled_usage_reports() -> Dict[str, Any]:
     """Async implementation of scheduled usage reports processing."""
     from app.tasks.scheduled_tasks import process_scheduled_usage_reports
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         result = await process_scheduled_usage_reports(db)
         await db.commit()
         return result
@@ -1213,7 +1305,7 @@ async def _fx_rate_daily_update() -> Dict[str, Any]:
     """Async implementation of FX rate daily update."""
     from decimal import Decimal
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         try:
             from app.services.fx_service import FXService
             
@@ -1313,19 +1405,33 @@ def fx_revaluation_task(entity_ids: List[str] = None) -> Dict[str, Any]:
     - Updates unrealized FX gain/loss accounts
     
     Args:
-        entity_ids: Optional list of entity IDs to revalue. If None, processes all entities.
+        entity_ids: Optional list of entity IDs to revalue. If None, fans out
+            over all active entities in shards (see app.tasks.fanout).
     
     Should run monthly at period-end or on-demand when rates change significantly.
     """
-    return run_async(_fx_revaluation(entity_ids))
+    if entity_ids:
+        return run_async(_fx_revaluation(entity_ids))
+    return dispatch_sharded_job("fx_revaluation")
+
+
+def _active_entity_ids(params: Dict[str, Any]):
+    from app.models.entity import BusinessEntity
+    from sqlalchemy import select
+    
+    return select(BusinessEntity.id).where(BusinessEntity.is_active == True)
+
+
+@register_sharded_job("fx_revaluation", _active_entity_ids)
+async def _fx_revaluation_shard(ids: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+    return await _fx_revaluation(ids)
 
 
 async def _fx_revaluation(entity_ids: List[str] = None) -> Dict[str, Any]:
     """Async implementation of FX revaluation."""
     from decimal import Decimal
-    from uuid import UUID
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         try:
             from app.services.fx_service import FXService
             from app.models.entity import BusinessEntity
@@ -1414,7 +1520,7 @@ async def _consolidation_schedule(group_id: str = None) -> Dict[str, Any]:
     """Async implementation of scheduled consolidation."""
     from uuid import UUID
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         try:
             from app.services.consolidation_service import ConsolidationService
             from app.models.multi_entity import EntityGroup
@@ -1497,20 +1603,44 @@ def budget_variance_alert_task(alert_threshold: float = 10.0) -> Dict[str, Any]:
     Args:
         alert_threshold: Percentage threshold for triggering alerts (default 10%)
     
-    Should run weekly or monthly based on business requirements.
+    Should run weekly or monthly based on business requirements. Fans out one
+    subtask per page of entities with approved budgets (see app.tasks.fanout).
     """
-    return run_async(_budget_variance_alert(alert_threshold))
+    return dispatch_sharded_job("budget_variance_alert", {"alert_threshold": alert_threshold})
+
+
+def _budgeted_entity_ids(params: Dict[str, Any]):
+    from app.models.advanced_accounting import Budget
+    from sqlalchemy import select
+    
+    return select(Budget.entity_id).where(Budget.status == "approved").distinct()
+
+
+@register_sharded_job("budget_variance_alert", _budgeted_entity_ids)
+async def _budget_variance_alert_shard(ids: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+    return await _budget_variance_alert(
+        params.get("alert_threshold", 10.0), [UUID(i) for i in ids]
+    )
 
 
-async def _budget_variance_alert(alert_threshold: float = 10.0) -> Dict[str, Any]:
-    """Async implementation of budget variance alert."""
+async def _budget_variance_alert(
+    alert_threshold: float = 10.0,
+    entity_ids: Optional[List[UUID]] = None,
+) -> Dict[str, Any]:
+    """
+    Async implementation of budget variance alert.
+    
+    Args:
+        alert_threshold: Percentage threshold for triggering alerts
+        entity_ids: Restrict to budgets of these entities (one shard). None checks all.
+    """
     from decimal import Decimal
     
-    async with async_session_factory() as db:
+    async with task_session() as db:
         try:
             from app.services.budget_service import BudgetService
             from app.services.notification_service import NotificationService
-            from app.models.budget import Budget, BudgetStatus
+            from app.models.advanced_accounting import Budget
             from app.models.user import User, UserEntityAccess
             from sqlalchemy import select
             
@@ -1518,9 +1648,10 @@ async def _budget_variance_alert(alert_threshold: float = 10.0) -> Dict[str, Any
             notification_service = NotificationService(db)
             
             # Get active budgets
-            result = await db.execute(
-                select(Budget).where(Budget.status == BudgetStatus.APPROVED)
-            )
+            query = select(Budget).where(Budget.status == "approved")
+            if entity_ids is not None:
+                query = query.where(Budget.entity_id.in_(entity_ids))
+            result = await db.execute(query)
             active_budgets = result.scalars().all()
             
             alerts_created = 0
@@ -1628,7 +1759,7 @@ def year_end_reminder_task() -> Dict[str, Any]:
 
 async def _year_end_reminder() -> Dict[str, Any]:
     """Async implementation of year-end reminder."""
-    async with async_session_factory() as db:
+    async with task_session() as db:
         try:
             from app.models.accounting import FiscalYear, FiscalYearStatus
             from app.services.notification_service import NotificationService
@@ -1723,3 +1854,26 @@ async def _year_end_reminder() -> Dict[str, Any]:
                 "error": str(e),
                 "timestamp": datetime.utcnow().isoformat()
             }
+
+
+# ===========================================
+# ML TRAINING TASKS
+# ===========================================
+
+@shared_task(
+    name='app.tasks.celery_tasks.train_ml_model_task',
+    bind=True,
+    soft_time_limit=settings.ml_training_time_limit_seconds,
+    time_limit=settings.ml_training_time_limit_seconds + 60,
+)
+def train_ml_model_task(self, job_id: str) -> Dict[str, Any]:
+    """Run a queued MLJob that trains a model and registers its artifact."""
+    return run_async(_train_ml_model(job_id, self.request.hostname))
+
+
+async def _train_ml_model(job_id: str, worker_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async implementation of the training job."""
+    from app.services.ml_training_runner import run_training_job
+    
+    async with task_session() as db:
+        return await run_training_job(db, UUID(job_id), worker_id=worker_id)
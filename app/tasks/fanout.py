@@ -0,0 +1,305 @@
+"""
+TekVwarho ProAudit - Sharded Task Fan-out
+
+Shard-and-chord pattern for periodic jobs that walk every tenant or entity.
+
+A single beat task looping over all tenants grows linearly with the platform
+and eventually hits task_time_limit. Jobs registered here instead:
+
+- Page the ids they cover with a keyset query (coordinator, runs in the beat task)
+- Dispatch one subtask per page, each with its own idempotency key and retries
+- Merge the per-shard summaries in a chord callback
+
+Wall time then scales with worker count rather than tenant count, and a
+retried or redelivered shard that already completed returns its recorded
+summary instead of running again.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import redis
+from celery import chord, shared_task
+from sqlalchemy import Select
+
+from app.config import settings
+from app.tasks.worker_runtime import run_async, task_session
+
+logger = logging.getLogger(__name__)
+
+
+ShardHandler = Callable[[List[str], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class ShardedJob:
+    """A periodic job split into id-range shards."""
+
+    name: str
+    id_query: Callable[[Dict[str, Any]], Select]  # SELECT of one sortable id column
+    handler: ShardHandler
+    queue: str = "default"
+    page_size: Optional[int] = None
+
+    @property
+    def shard_size(self) -> int:
+        return self.page_size or settings.celery_shard_size
+
+
+SHARDED_JOBS: Dict[str, ShardedJob] = {}
+
+
+def register_sharded_job(
+    name: str,
+    id_query: Callable[[Dict[str, Any]], Select],
+    queue: str = "default",
+    page_size: Optional[int] = None,
+):
+    """Decorator registering an async ``handler(ids, params)`` as a sharded job."""
+    def decorator(handler: ShardHandler) -> ShardHandler:
+        SHARDED_JOBS[name] = ShardedJob(name, id_query, handler, queue, page_size)
+        return handler
+    return decorator
+
+
+# ===========================================
+# COORDINATOR
+# ===========================================
+
+async def iter_id_pages(db, statement: Select, page_size: int) -> AsyncIterator[List[Any]]:
+    """
+    Yield ids from a single-column SELECT in keyset-ordered pages.
+
+    Each page is one ``WHERE id > :last ORDER BY id LIMIT :n`` query, so the
+    cost per page stays flat however many tenants there are.
+    """
+    column = statement.selected_columns[0]
+    last = None
+    while True:
+        page_stmt = statement.order_by(column).limit(page_size)
+        if last is not None:
+            page_stmt = page_stmt.where(column > last)
+        ids = [row[0] for row in (await db.execute(page_stmt)).all()]
+        if not ids:
+            return
+        yield ids
+        if len(ids) < page_size:
+            return
+        last = ids[-1]
+
+
+async def _collect_shards(job: ShardedJob, params: Dict[str, Any]) -> List[List[str]]:
+    shards = []
+    async with task_session() as db:
+        async for ids in iter_id_pages(db, job.id_query(params), job.shard_size):
+            shards.append([str(i) for i in ids])
+    return shards
+
+
+def shard_key(job_name: str, run_key: str, ids: List[str]) -> str:
+    """Idempotency key for one shard: stable for the same job run and id set."""
+    digest = hashlib.sha1(",".join(sorted(ids)).encode()).hexdigest()[:16]
+    return f"shard:{job_name}:{run_key}:{digest}"
+
+
+def default_run_key(params: Dict[str, Any]) -> str:
+    """One run per job, day and parameter set."""
+    params_digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()[:8]
+    return f"{date.today().isoformat()}:{params_digest}"
+
+
+def dispatch_sharded_job(
+    name: str,
+    params: Optional[Dict[str, Any]] = None,
+    run_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Page the job's ids and fan out one subtask per page under a chord.
+
+    Returns a dispatch summary immediately; the merged result is produced by
+    collect_shard_results_task once every shard has finished.
+    """
+    job = SHARDED_JOBS[name]
+    params = params or {}
+    run_key = run_key or default_run_key(params)
+
+    shards = run_async(_collect_shards(job, params))
+    if not shards:
+        logger.info(f"Sharded job {name}: nothing to do")
+        return {"job": name, "run_key": run_key, "shards": 0, "ids": 0}
+
+    header = [
+        run_shard_task.s(name, ids, params, shard_key(name, run_key, ids)).set(queue=job.queue)
+        for ids in shards
+    ]
+    callback = collect_shard_results_task.s(name, run_key).set(queue=job.queue)
+    result = chord(header)(callback)
+
+    total = sum(len(ids) for ids in shards)
+    logger.info(f"Sharded job {name} ({run_key}): {total} ids in {len(shards)} shards")
+    return {
+        "job": name,
+        "run_key": run_key,
+        "shards": len(shards),
+        "ids": total,
+        "chord_id": result.id,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+# ===========================================
+# SHARD LEDGER (idempotency)
+# ===========================================
+
+class ShardLedger:
+    """
+    Redis record of claimed and completed shards.
+
+    A claim (SET NX with the task time limit as TTL) stops two workers running
+    the same shard at once; a completion record lets a redelivered message or
+    a re-dispatched run return the earlier summary.
+    """
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+        return self._client
+
+    def completed(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(f"{key}:done")
+        return json.loads(raw) if raw else None
+
+    def claim(self, key: str, ttl: int) -> bool:
+        return bool(self.client.set(f"{key}:lock", "1", nx=True, ex=ttl))
+
+    def release(self, key: str):
+        self.client.delete(f"{key}:lock")
+
+    def complete(self, key: str, summary: Dict[str, Any]):
+        self.client.set(
+            f"{key}:done",
+            json.dumps(summary, default=str),
+            ex=settings.celery_shard_result_ttl_seconds,
+        )
+        self.release(key)
+
+
+_ledger: Optional[ShardLedger] = None
+
+
+def get_shard_ledger() -> ShardLedger:
+    global _ledger
+    if _ledger is None:
+        _ledger = ShardLedger()
+    return _ledger
+
+
+# ===========================================
+# SUBTASKS
+# ===========================================
+
+class ShardBusy(Exception):
+    """Another worker currently holds the shard's claim."""
+
+
+@shared_task(
+    name='app.tasks.fanout.run_shard_task',
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=3,
+)
+def run_shard_task(
+    self, job_name: str, ids: List[str], params: Dict[str, Any], key: str
+) -> Dict[str, Any]:
+    """Run one shard of a registered job, at most once per idempotency key."""
+    ledger = get_shard_ledger()
+    previous = ledger.completed(key)
+    if previous is not None:
+        logger.info(f"Shard {key} already completed, reusing summary")
+        return previous
+
+    try:
+        lock_ttl = self.app.conf.task_time_limit or 300
+        if not ledger.claim(key, lock_ttl):
+            raise ShardBusy(key)
+        try:
+            summary = run_async(SHARDED_JOBS[job_name].handler(ids, params))
+        except Exception:
+            ledger.release(key)
+            raise
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            # Report instead of raising so the chord callback still runs
+            logger.error(f"Shard {key} failed after {self.request.retries} retries: {e}")
+            return {"shard_failed": True, "failed_ids": ids, "error": str(e)}
+        raise
+
+    ledger.complete(key, summary)
+    return summary
+
+
+def merge_summaries(summaries: List[Dict[str, Any]], list_limit: int = 500) -> Dict[str, Any]:
+    """
+    Combine per-shard summaries into one job summary.
+
+    Numbers are summed, booleans AND-ed and lists concatenated (capped at
+    list_limit); other values keep the last shard's value.
+    """
+    merged: Dict[str, Any] = {}
+    failed_ids: List[str] = []
+    errors: List[str] = []
+    shards_failed = 0
+
+    for summary in summaries:
+        if summary.get("shard_failed"):
+            shards_failed += 1
+            failed_ids.extend(summary.get("failed_ids", []))
+            errors.append(summary.get("error", ""))
+            continue
+        for key, value in summary.items():
+            current = merged.get(key)
+            if isinstance(value, bool):
+                merged[key] = value if current is None else (current and value)
+            elif isinstance(value, (int, float)):
+                merged[key] = (current or 0) + value
+            elif isinstance(value, list):
+                merged[key] = ((current or []) + value)[:list_limit]
+            else:
+                merged[key] = value
+
+    merged["shards"] = len(summaries)
+    merged["shards_failed"] = shards_failed
+    if failed_ids:
+        merged["failed_ids"] = failed_ids
+        merged["errors"] = errors[:10]
+    return merged
+
+
+@shared_task(name='app.tasks.fanout.collect_shard_results_task')
+def collect_shard_results_task(
+    summaries: List[Dict[str, Any]], job_name: str, run_key: str
+) -> Dict[str, Any]:
+    """Chord callback: merge shard summaries and log the job outcome."""
+    merged = merge_summaries(summaries)
+    merged["job"] = job_name
+    merged["run_key"] = run_key
+    merged["timestamp"] = datetime.utcnow().isoformat()
+    log = logger.warning if merged["shards_failed"] else logger.info
+    log(
+        f"Sharded job {job_name} ({run_key}) complete: "
+        f"{merged['shards'] - merged['shards_failed']}/{merged['shards']} shards succeeded"
+    )
+    return merged
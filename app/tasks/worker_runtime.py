@@ -0,0 +1,197 @@
+"""
+TekVwarho ProAudit - Celery Worker Async Runtime
+
+One long-lived event loop and database engine per worker process.
+
+Previously every task built and closed its own event loop, which stranded
+the module-level engine's pooled connections on dead loops and forced a
+fresh connect on every run. The runtime instead:
+
+- Starts a single event loop on a background thread per worker process
+  (from Celery's worker_process_init signal, or lazily on first use)
+- Owns a dedicated worker engine/pool bound to that loop
+- Runs task coroutines on it via run_async()
+- Disposes the pool, mail transports, NRS clients, compute pool and loop on
+  worker shutdown
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, Optional
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRuntime:
+    """Persistent event loop + engine shared by all tasks in one process."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.engine: Optional[AsyncEngine] = None
+        self.session_factory: Optional[async_sessionmaker] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+        # Metrics
+        self.tasks_run = 0
+        self.task_seconds = 0.0
+        self.started_at: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.loop is not None and self.loop.is_running()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self._started.set()
+        self.loop.run_forever()
+
+    def start(self) -> "WorkerRuntime":
+        """Start the loop thread and build the worker engine."""
+        if self.is_running:
+            return self
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="celery-async-runtime", daemon=True
+        )
+        self._thread.start()
+        self._started.wait(timeout=5)
+
+        self.engine = create_async_engine(
+            settings.async_database_url,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=settings.celery_db_pool_size,
+            max_overflow=settings.celery_db_max_overflow,
+            pool_recycle=settings.celery_db_pool_recycle_seconds,
+        )
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+        self.started_at = time.monotonic()
+        logger.info(f"Worker async runtime started (pid={self.pid})")
+        return self
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        If the calling thread is interrupted (e.g. SoftTimeLimitExceeded),
+        the coroutine is cancelled before the exception propagates.
+        """
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        started = time.perf_counter()
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self.tasks_run += 1
+            self.task_seconds += time.perf_counter() - started
+
+    async def _aclose(self):
+        from app.services.compute_pool import close_compute_pool
+        from app.services.mail_transport import close_mail_transports
+        from app.services.nrs_service import close_nrs_http_clients
+
+        if self.engine is not None:
+            await self.engine.dispose()
+        await close_mail_transports()
+        await close_nrs_http_clients()
+        close_compute_pool()
+
+    def stop(self, timeout: float = 10.0):
+        """Dispose the pool and stop the loop."""
+        if not self.is_running:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose(), self.loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Worker runtime cleanup failed: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.loop.close()
+        logger.info(
+            f"Worker async runtime stopped (pid={self.pid}, tasks={self.tasks_run})"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        pool = self.engine.pool if self.engine is not None else None
+        return {
+            "pid": self.pid,
+            "running": self.is_running,
+            "tasks_run": self.tasks_run,
+            "avg_task_ms": round(self.task_seconds / self.tasks_run * 1000, 3)
+            if self.tasks_run else 0.0,
+            "pool_status": pool.status() if pool is not None else None,
+        }
+
+
+_runtime: Optional[WorkerRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_worker_runtime() -> WorkerRuntime:
+    """Get (and lazily start) this process's runtime; restarts after fork."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None or _runtime.pid != os.getpid() or not _runtime.is_running:
+            _runtime = WorkerRuntime().start()
+        return _runtime
+
+
+def shutdown_worker_runtime():
+    """Stop this process's runtime if one is running."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is not None and _runtime.pid == os.getpid():
+            _runtime.stop()
+        _runtime = None
+
+
+def run_async(coro: Coroutine) -> Any:
+    """Run an async task body on the worker's persistent loop."""
+    return get_worker_runtime().run(coro)
+
+
+def task_session() -> AsyncSession:
+    """Open a session on the worker engine (use as ``async with task_session()``)."""
+    return get_worker_runtime().session_factory()
+
+
+def install_worker_signals():
+    """Hook runtime start/stop into Celery's worker process lifecycle."""
+    from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+    @worker_process_init.connect(weak=False)
+    def _start_runtime(**kwargs):
+        get_worker_runtime()
+
+    @worker_process_shutdown.connect(weak=False)
+    def _stop_runtime_child(**kwargs):
+        shutdown_worker_runtime()
+
+    @worker_shutdown.connect(weak=False)
+    def _stop_runtime(**kwargs):
+        shutdown_worker_runtime()
@@ -96,6 +96,10 @@ class ErrorCode(str, Enum):
     RATE_LIMITED = "RATE_LIMITED"
     TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
     
+    # Compute Capacity (503/504)
+    COMPUTE_BUSY = "COMPUTE_BUSY"
+    COMPUTE_TIMEOUT = "COMPUTE_TIMEOUT"
+    
     # External Service Errors (502/503)
     EXTERNAL_SERVICE_ERROR = "EXTERNAL_SERVICE_ERROR"
     FIRS_API_ERROR = "FIRS_API_ERROR"
@@ -689,6 +693,34 @@ class RateLimitException(AppException):
         )
 
 
+# ============================================================================
+# Compute Capacity Exceptions
+# ============================================================================
+
+class ComputeBusyException(AppException):
+    """Too many jobs of one kind already waiting for the compute pool"""
+    
+    def __init__(self, kind: str, queued: int, retry_after: int = 5):
+        super().__init__(
+            code=ErrorCode.COMPUTE_BUSY,
+            message=f"The server is busy with other {kind} jobs. Please try again shortly.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"kind": kind, "queued": queued, "retry_after_seconds": retry_after},
+        )
+
+
+class ComputeTimeoutException(AppException):
+    """A compute pool job ran past its kind's time limit"""
+    
+    def __init__(self, kind: str, timeout_seconds: float):
+        super().__init__(
+            code=ErrorCode.COMPUTE_TIMEOUT,
+            message=f"The {kind} job did not finish within {timeout_seconds:g} seconds.",
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            details={"kind": kind, "timeout_seconds": timeout_seconds},
+        )
+
+
 # ============================================================================
 # Exception Handlers
 # ============================================================================
@@ -5,20 +5,25 @@ Performance optimization utilities for database queries including:
 - Eager loading configurations
 - Query hints
 - Batch processing utilities
+- Keyset (cursor) pagination
 - Index recommendations
 
 Author: TekVwarho ProAudit Team
 Date: January 2026
 """
 
+import base64
+import binascii
+import json
 import logging
-from datetime import date
+import uuid
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Type, TypeVar, Callable
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar, Callable
 from functools import wraps
 import time
 
-from sqlalchemy import select, func, and_, Index, text
+from sqlalchemy import select, func, and_, Index, insert, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload, load_only
 from sqlalchemy.sql import Select
@@ -108,6 +113,33 @@ async def batch_insert(
     return total
 
 
+# Rows per multi-row INSERT are capped so columns x rows stays under
+# asyncpg's 32767 bind parameter limit
+BULK_PARAMETER_LIMIT = 32767
+
+
+async def bulk_insert_rows(
+    db: AsyncSession,
+    model: Any,
+    rows: List[Dict[str, Any]],
+) -> int:
+    """
+    Insert row dicts with chunked multi-row INSERT statements.
+    
+    Unlike batch_insert this bypasses the unit of work (no ORM objects,
+    no per-row flush); the caller commits.
+    
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    chunk_size = max(1, BULK_PARAMETER_LIMIT // (len(rows[0]) + 4))
+    for start in range(0, len(rows), chunk_size):
+        await db.execute(insert(model).values(rows[start:start + chunk_size]))
+    return len(rows)
+
+
 # =========================================================================
 # OPTIMIZED SELECT BUILDERS
 # =========================================================================
@@ -165,6 +197,91 @@ class OptimizedQueryBuilder:
         return select(model).where(column == True)
 
 
+# =========================================================================
+# KEYSET PAGINATION
+# =========================================================================
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded for a listing."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = [
+        value.isoformat() if isinstance(value, (date, datetime))
+        else str(value) if isinstance(value, (uuid.UUID, Decimal))
+        else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    Decode a cursor back into sort key values typed like ``columns``.
+    
+    Raises:
+        InvalidCursorError: The cursor is malformed or was issued for a
+            listing with a different sort key.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursorError("Invalid pagination cursor")
+    
+    values = []
+    for column, value in zip(columns, payload):
+        python_type = column.type.python_type
+        try:
+            if python_type in (date, datetime, uuid.UUID, Decimal):
+                parse = python_type.fromisoformat if python_type in (date, datetime) else python_type
+                value = parse(value)
+            elif not isinstance(value, python_type):
+                raise TypeError
+        except (TypeError, ValueError, ArithmeticError):
+            raise InvalidCursorError("Invalid pagination cursor")
+        values.append(value)
+    return values
+
+
+def keyset_paginate(
+    query: Select,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: int,
+) -> Select:
+    """
+    Order a query newest first by ``columns`` and take the page after ``cursor``.
+    
+    The last column must be unique (normally the primary key) so the order
+    is total. Instead of skipping rows with OFFSET, the page starts with a
+    row-value comparison against the previous page's last key, which an
+    index on (filter columns..., *columns) answers with a single range
+    scan; page N costs the same as page 1.
+    
+    Args:
+        query: Select with the listing's filters applied
+        columns: Sort key, most significant first
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size
+    """
+    if cursor:
+        query = query.where(tuple_(*columns) < tuple_(*decode_cursor(cursor, columns)))
+    return query.order_by(*(column.desc() for column in columns)).limit(limit)
+
+
+def next_page_cursor(items: Sequence[Any], limit: int, columns: Sequence[Any]) -> Optional[str]:
+    """Return the cursor for the page after ``items``, or None on a short (last) page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor([getattr(last, column.key) for column in columns])
+
+
 # =========================================================================
 # EAGER LOADING CONFIGURATIONS
 # =========================================================================
@@ -4,6 +4,7 @@ TekVwarho ProAudit - FastAPI Application Entry Point
 This is the main entry point for the FastAPI application.
 """
 
+import asyncio
 import logging
 import traceback
 from contextlib import asynccontextmanager
@@ -95,12 +96,28 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Test Entity seeding skipped: {e}")
     
+    # Deliver WebSocket notifications sent by Celery workers (e.g. NRS IRNs)
+    from app.services.websocket_manager import run_ws_relay
+    ws_relay = asyncio.create_task(run_ws_relay())
+    
     yield
     
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}...")
+    ws_relay.cancel()
+    await asyncio.gather(ws_relay, return_exceptions=True)
+    
     await close_db()
     logger.info("Database connections closed")
+    
+    from app.services.mail_transport import close_mail_transports
+    await close_mail_transports()
+    
+    from app.services.nrs_service import close_nrs_http_clients
+    await close_nrs_http_clients()
+    
+    from app.services.compute_pool import close_compute_pool
+    close_compute_pool()
 
 
 # Create FastAPI application
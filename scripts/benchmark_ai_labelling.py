@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Measure bulk transaction labelling: per-item loop vs predict_many.
+
+Generates bank-statement style narrations (vendor names, reference
+numbers, repeated payees) and labels them with the previous one-at-a-time
+pipeline (a substring scan per vendor pattern, then one ML call per
+transaction) and with predict_many. OpenAI and the persistent label cache
+are not involved.
+
+    python scripts/benchmark_ai_labelling.py --transactions 10000 --payees 400
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ai_labelling import AITransactionLabeller, LabelRequest
+
+NARRATIONS = [
+    "POS {ref} {vendor} LAGOS", "TRF/{ref}/{vendor} PAYMENT", "{vendor} subscription renewal",
+    "WEB PURCHASE {vendor} {ref}", "office stationery {ref}", "diesel for generator {ref}",
+    "staff welfare {ref}", "consulting fee {vendor}", "sms alert fee", "courier delivery {ref}",
+]
+VENDORS = list(AITransactionLabeller.VENDOR_PATTERNS) + [
+    "chicken republic", "bolt", "uber", "kilimanjaro", "mr biggs", "slot", "pointek",
+]
+
+
+def build_requests(count: int, payees: int):
+    random.seed(42)
+    templates = [
+        (random.choice(NARRATIONS), random.choice(VENDORS).upper()) for _ in range(payees)
+    ]
+    requests = []
+    for _ in range(count):
+        narration, vendor = random.choice(templates)
+        requests.append(LabelRequest(
+            description=narration.format(ref=random.randint(100000, 999999), vendor=vendor),
+            amount=random.randint(500, 500000),
+        ))
+    return requests
+
+
+async def per_item(labeller: AITransactionLabeller, requests):
+    """The previous pipeline: a pattern loop and an ML call per transaction."""
+    classifier, vectorizer, label_encoder = await labeller._get_ml_model()
+    labels = []
+    for request in requests:
+        text = f"{request.description} {request.vendor_name or ''}".lower()
+        best = max(
+            (p for p in labeller.VENDOR_PATTERNS if p in text), key=len, default=None
+        )
+        if best and min(len(best) / len(text) * 2, 0.95) >= 0.90:
+            labels.append(labeller.VENDOR_PATTERNS[best]["category"])
+            continue
+        features = vectorizer.transform([request.description.lower()])
+        prediction = classifier.predict(features)[0]
+        classifier.predict_proba(features)
+        labels.append(label_encoder.inverse_transform([prediction])[0])
+    return labels
+
+
+async def main(count: int, payees: int):
+    requests = build_requests(count, payees)
+    labeller = AITransactionLabeller()
+    labeller.openai_api_key = None
+    await labeller._get_ml_model()  # load or train the default model once
+
+    started = time.perf_counter()
+    await per_item(labeller, requests)
+    baseline = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await labeller.predict_many(requests)
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await labeller.predict_many(requests)
+    warm = time.perf_counter() - started
+
+    print(f"{count} transactions, {payees} payee templates")
+    print(f"per-item loop          {baseline * 1000:9.1f} ms  {count / baseline:10.0f} tx/s")
+    print(f"predict_many (cold)    {cold * 1000:9.1f} ms  {count / cold:10.0f} tx/s")
+    print(f"predict_many (cached)  {warm * 1000:9.1f} ms  {count / warm:10.0f} tx/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=10000)
+    parser.add_argument("--payees", type=int, default=400, help="Distinct narration templates")
+    args = parser.parse_args()
+    asyncio.run(main(args.transactions, args.payees))
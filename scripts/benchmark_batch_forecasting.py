@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Measure multi-account forecasting: per-series loop vs one batch call.
+
+Generates monthly actuals with level, trend and seasonality for many
+accounts and forecasts them with TimeSeriesForecaster one series at a
+time, with the batch methods, and through BatchForecastService with a
+warm (in-memory) cache.
+
+    python scripts/benchmark_batch_forecasting.py --accounts 500 --months 36
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.batch_forecast_service import BatchForecastService
+from app.services.ml_engine import TimeSeriesForecaster
+
+
+class MemoryCache:
+    """Process-local stand-in for the Redis forecast cache."""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get_forecast(self, *key):
+        cached = self.entries.get(key)
+        return dict(cached) if cached else None
+
+    async def set_forecast(self, *args, ttl=None):
+        *key, data = args
+        self.entries[tuple(key)] = dict(data)
+        return True
+
+
+def build_actuals(accounts: int, months: int) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    t = np.arange(months)
+    return (
+        rng.uniform(1e4, 1e6, (accounts, 1))
+        + rng.normal(0, 2e3, (accounts, 1)) * t
+        + rng.uniform(0, 1e5, (accounts, 1)) * np.sin(2 * np.pi * t / 12)
+        + rng.normal(0, 5e3, (accounts, months))
+    )
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def main(accounts: int, months: int, periods: int):
+    data = build_actuals(accounts, months)
+    forecaster = TimeSeriesForecaster()
+    service = BatchForecastService(cache=MemoryCache())
+
+    rows = [
+        ("holt-winters per series", lambda: [forecaster.exponential_smoothing(row, forecast_periods=periods) for row in data]),
+        ("holt-winters batch", lambda: forecaster.exponential_smoothing_batch(data, forecast_periods=periods)),
+        ("arima per series", lambda: [forecaster.arima_forecast(row, forecast_periods=periods) for row in data]),
+        ("arima batch", lambda: forecaster.arima_forecast_batch(data, forecast_periods=periods)),
+    ]
+
+    print(f"{accounts} accounts x {months} months, {periods} periods ahead")
+    for label, fn in rows:
+        print(f"{label:28} {timed(fn) * 1000:9.2f} ms")
+
+    started = time.perf_counter()
+    await service.forecast("bench", "expense_by_account", "2026-09", data, forecast_periods=periods)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    await service.forecast("bench", "expense_by_account", "2026-09", data, forecast_periods=periods)
+    warm = time.perf_counter() - started
+    print(f"{'service (cold)':28} {cold * 1000:9.2f} ms")
+    print(f"{'service (cached)':28} {warm * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--periods", type=int, default=12, help="Periods to forecast")
+    args = parser.parse_args()
+    asyncio.run(main(args.accounts, args.months, args.periods))
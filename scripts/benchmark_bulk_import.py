@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Measure the CPU side of bulk CSV import.
+
+Parses and prepares a generated transactions file two ways: the previous
+per-row path (read the whole upload, decode it, build one Transaction ORM
+object per row, before any flush) and import_rows against a session that
+discards its statements (chunked parsing, column-wise validation, COPY
+records, and the rollup, metric and search document rows written with the
+merge). The COPY and the merge themselves need Postgres and are not
+exercised here. Peak memory is traced for both.
+
+    python scripts/benchmark_bulk_import.py --rows 200000 --chunk 5000
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.transaction import Transaction, TransactionType
+from app.services import bulk_import_service
+from app.services.bulk_import_service import import_rows
+
+
+def generate_csv(rows: int) -> bytes:
+    rng = random.Random(7)
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["date", "description", "amount", "type", "reference"])
+    start = date(2026, 1, 1)
+    for n in range(rows):
+        writer.writerow([
+            (start + timedelta(days=rng.randrange(290))).isoformat(),
+            rng.choice(["Diesel", "Office rent", "Consulting fee", "Airtime", "Generator repair"]),
+            f"{rng.uniform(100, 2_000_000):.2f}",
+            rng.choice(["expense", "expense", "income"]),
+            f"REF-{n:07d}",
+        ])
+    return output.getvalue().encode("utf-8")
+
+
+def per_row(content: bytes, entity_id: uuid.UUID):
+    reader = csv.DictReader(io.StringIO(content.decode("utf-8")))
+    objects = []
+    for row in reader:
+        objects.append(Transaction(
+            entity_id=entity_id,
+            transaction_date=date.fromisoformat(row["date"]),
+            description=row["description"],
+            amount=float(row["amount"]),
+            transaction_type=TransactionType(row["type"]),
+            reference=row["reference"],
+        ))
+    return len(objects)
+
+
+class NullSession:
+    """Session stand-in that accepts statements and COPYs without a database."""
+
+    async def execute(self, statement, parameters=None):
+        return None
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return SimpleNamespace(driver_connection=self)
+
+    async def copy_records_to_table(self, table_name, records, columns):
+        return None
+
+
+def pipeline(content: bytes, entity_id: uuid.UUID):
+    stream = io.TextIOWrapper(io.BytesIO(content), encoding="utf-8-sig", newline="")
+    progress = asyncio.run(import_rows(NullSession(), "transactions", stream, entity_id))
+    return progress.successful
+
+
+def measure(label: str, run):
+    started = time.perf_counter()
+    imported = run()
+    elapsed = time.perf_counter() - started
+    # Peak memory from a second, traced run (tracing slows the first down)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:24} {elapsed:7.2f} s  {imported / elapsed * 60:12,.0f} rows/min  peak {peak / 2**20:8.1f} MiB")
+
+
+def main(rows: int, chunk_rows: int):
+    bulk_import_service.settings.bulk_import_chunk_rows = chunk_rows
+    content = generate_csv(rows)
+    entity_id = uuid.uuid4()
+    print(f"{rows} rows, {len(content) / 2**20:.1f} MiB, chunks of {chunk_rows}")
+    measure("per row (ORM objects)", lambda: per_row(content, entity_id))
+    measure("streaming pipeline", lambda: pipeline(content, entity_id))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.rows, args.chunk)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measure per-task overhead of the Celery async runtime.
+
+Compares the old pattern (new event loop per task, engine pool stranded on
+the dead loop) with the persistent worker runtime. Without --db the task body
+is a no-op, isolating loop setup cost; with --db each task runs SELECT 1 so
+connection setup is included (needs DATABASE_URL to point at a live server).
+
+    python scripts/benchmark_celery_runtime.py --tasks 500 --db
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.tasks.worker_runtime import WorkerRuntime
+
+
+def legacy_run_async(coro):
+    """The previous celery_tasks.run_async."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def report(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(samples_ms):8.3f} ms   "
+          f"p50 {statistics.median(samples_ms):8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def main(tasks: int, use_db: bool):
+    # ---- before: fresh loop per task; a new engine each time mirrors the
+    # effective behaviour (pooled connections die with their loop) ----
+    async def legacy_body():
+        if use_db:
+            engine = create_async_engine(settings.async_database_url, pool_size=5)
+            factory = async_sessionmaker(engine, class_=AsyncSession)
+            async with factory() as db:
+                await db.execute(text("SELECT 1"))
+            await engine.dispose()
+
+    samples = []
+    for _ in range(tasks):
+        start = time.perf_counter()
+        legacy_run_async(legacy_body())
+        samples.append(time.perf_counter() - start)
+    report("new loop per task", samples)
+
+    # ---- after: persistent runtime ----
+    runtime = WorkerRuntime().start()
+
+    async def runtime_body():
+        if use_db:
+            async with runtime.session_factory() as db:
+                await db.execute(text("SELECT 1"))
+
+    samples = []
+    for _ in range(tasks):
+        start = time.perf_counter()
+        runtime.run(runtime_body())
+        samples.append(time.perf_counter() - start)
+    runtime.stop()
+    report("persistent runtime", samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--db", action="store_true", help="Include a SELECT 1 round trip")
+    args = parser.parse_args()
+    main(args.tasks, args.db)
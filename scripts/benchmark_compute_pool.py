@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Measure event-loop latency of light requests while heavy PDFs render.
+
+Light requests (a small JSON response every few milliseconds) run on one
+event loop alongside a stream of invoice PDF renders. Renders run either
+inline on the loop (the previous behaviour) or on the compute pool, and the
+light request latency distribution is reported for each.
+
+    python scripts/benchmark_compute_pool.py --renders 8 --lines 1500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.compute_pool import ComputePool, default_kinds
+from app.services.invoice_pdf_service import InvoiceData, InvoiceLineItem, render_invoice_pdf
+
+
+def build_invoice(lines: int) -> InvoiceData:
+    items = [
+        InvoiceLineItem(description=f"Line {i}", quantity=1, unit_price_naira=1000, total_naira=1000)
+        for i in range(lines)
+    ]
+    return InvoiceData(
+        invoice_number="INV-BENCH", invoice_date=date.today(), due_date=date.today(),
+        customer_name="Benchmark Ltd", customer_email="", line_items=items,
+        subtotal_naira=1000 * lines, vat_naira=75 * lines, total_naira=1075 * lines,
+    )
+
+
+def report(label, samples, elapsed):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p99 = samples_ms[max(0, int(len(samples_ms) * 0.99) - 1)]
+    print(f"{label:<10} light requests {len(samples_ms):5d}   p50 {statistics.median(samples_ms):8.3f} ms   "
+          f"p99 {p99:8.3f} ms   max {samples_ms[-1]:8.3f} ms   renders done in {elapsed:6.2f} s")
+
+
+async def run(mode: str, renders: int, lines: int, concurrency: int, interval: float):
+    invoice = build_invoice(lines)
+    pool = ComputePool() if mode == "pool" else None
+    if pool is not None:
+        # Start the worker processes before measuring
+        await asyncio.gather(*[
+            pool.run("render", render_invoice_pdf, build_invoice(1)) for _ in range(pool.process_workers)
+        ])
+
+    latencies = []
+    stop = asyncio.Event()
+
+    async def light_request(scheduled: float):
+        await asyncio.sleep(0)
+        json.dumps({"status": "ok", "ts": scheduled})
+        latencies.append(time.perf_counter() - scheduled)
+
+    async def light_traffic():
+        # Open-loop arrivals: latency counts from when a request was due,
+        # so time spent blocked behind a render is included
+        tasks = []
+        due = time.perf_counter()
+        while not stop.is_set():
+            now = time.perf_counter()
+            while due <= now:
+                tasks.append(asyncio.create_task(light_request(due)))
+                due += interval
+            await asyncio.sleep(due - now)
+        await asyncio.gather(*tasks)
+
+    async def render():
+        await asyncio.sleep(0)  # Each render arrives as its own request
+        if pool is None:
+            render_invoice_pdf(invoice)
+        else:
+            await pool.run("render", render_invoice_pdf, invoice)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited_render():
+        async with semaphore:
+            await render()
+
+    traffic = asyncio.create_task(light_traffic())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*[limited_render() for _ in range(renders)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await traffic
+    if pool is not None:
+        pool.close(wait=True)
+    report(mode, latencies, elapsed)
+
+
+def main(renders: int, lines: int, interval_ms: float):
+    concurrency = default_kinds()["render"].max_concurrency
+    for mode in ("inline", "pool"):
+        asyncio.run(run(mode, renders, lines, concurrency, interval_ms / 1000))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=8)
+    parser.add_argument("--lines", type=int, default=1500, help="Invoice line items per render")
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="Gap between light requests")
+    args = parser.parse_args()
+    main(args.renders, args.lines, args.interval_ms)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pooled mail transport against per-message SMTP sessions.
+
+Runs entirely against LocalSMTPServer, so no real mail server is needed:
+
+    python scripts/benchmark_email_transport.py --messages 500 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import os
+import smtplib
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.mail_transport import LocalSMTPServer, MailEnvelope, SMTPConnectionPool
+
+
+def legacy_send(port: int, envelopes):
+    """Old behaviour: new connection + login per message, on the caller's thread."""
+    for envelope in envelopes:
+        with smtplib.SMTP("127.0.0.1", port) as server:
+            server.login("user", "pass")
+            server.sendmail(envelope.sender, envelope.recipients, envelope.data)
+
+
+async def measure_loop_stall(coro):
+    """Run coro while sampling how late a 1 ms ticker fires (event-loop blocking)."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, time.perf_counter() - start - 0.001)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)  # let the ticker arm its first timer
+    await coro
+    done = True
+    await task
+    return worst
+
+
+async def main(messages: int, latency: float, pool_size: int):
+    envelopes = [
+        MailEnvelope("noreply@tekvwarho.com", [f"user{i}@example.com"],
+                     f"Subject: Reminder {i}\r\n\r\nYour invoice is overdue.".encode())
+        for i in range(messages)
+    ]
+
+    with LocalSMTPServer(latency=latency) as server:
+        async def run_legacy():
+            legacy_send(server.port, envelopes)
+
+        start = time.perf_counter()
+        stall = await measure_loop_stall(run_legacy())
+        legacy = time.perf_counter() - start
+        print(f"per-message sessions : {legacy:7.3f}s  "
+              f"{messages / legacy:8.0f} msg/s  max loop stall {stall * 1000:8.1f} ms  "
+              f"sessions={server.sessions}")
+
+    with LocalSMTPServer(latency=latency) as server:
+        pool = SMTPConnectionPool("127.0.0.1", server.port, "user", "pass",
+                                  use_tls=False, pool_size=pool_size)
+        start = time.perf_counter()
+        stall = await measure_loop_stall(pool.send_many(envelopes))
+        pooled = time.perf_counter() - start
+        pool.close()
+        print(f"pooled batch         : {pooled:7.3f}s  "
+              f"{messages / pooled:8.0f} msg/s  max loop stall {stall * 1000:8.1f} ms  "
+              f"sessions={server.sessions}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="Simulated server time per DATA command (seconds)")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.latency, args.pool_size))
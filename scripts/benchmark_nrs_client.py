@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measure NRS invoice submission throughput against a local mock NRS API.
+
+Submits invoices to LocalNRSServer three ways: one new httpx client per
+request, one at a time (the previous behaviour), the pooled keep-alive
+client one at a time, and the pooled client through run_bulk with bounded
+concurrency. The mock speaks plain HTTP, so the per-request client pays
+only a TCP handshake here; against the real API it also pays TLS.
+
+    python scripts/benchmark_nrs_client.py --invoices 300 --latency 0.02 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import nrs_service
+from app.services.nrs_service import LocalNRSServer, close_nrs_http_clients, get_nrs_client
+
+
+def invoice(number: int) -> dict:
+    return dict(
+        seller_tin="1234567890", seller_name="Benchmark Ltd", seller_address="Lagos",
+        buyer_name="Walk-in Customer", invoice_number=f"BENCH-{number}", invoice_date="2026-10-01",
+        subtotal=10000.0, vat_amount=750.0, total_amount=10750.0,
+        line_items=[{"description": "Item", "quantity": 1, "unit_price": 10000.0, "total": 10750.0}],
+    )
+
+
+async def per_request_clients(url: str, count: int):
+    for n in range(count):
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(f"{url}/api/v1/invoice/submit", json=invoice(n))
+            response.json()
+
+
+async def pooled_sequential(url: str, count: int):
+    client = get_nrs_client(api_key="bench", base_url=url)
+    for n in range(count):
+        await client.submit_invoice(**invoice(n))
+
+
+async def pooled_bulk(url: str, count: int):
+    client = get_nrs_client(api_key="bench", base_url=url)
+    await client.run_bulk(range(count), lambda n: client.submit_invoice(**invoice(n)))
+
+
+async def main(invoices: int, latency: float, concurrency: int):
+    nrs_service.settings.nrs_bulk_concurrency = concurrency
+    nrs_service.settings.nrs_rate_limit_per_second = 10_000.0
+    nrs_service.settings.nrs_rate_burst = concurrency
+
+    print(f"{invoices} invoices, {latency * 1000:.0f} ms server latency, concurrency {concurrency}")
+    for label, run in (
+        ("client per request", per_request_clients),
+        ("pooled, sequential", pooled_sequential),
+        ("pooled, run_bulk", pooled_bulk),
+    ):
+        with LocalNRSServer(latency=latency) as server:
+            started = time.perf_counter()
+            await run(server.url, invoices)
+            elapsed = time.perf_counter() - started
+            await close_nrs_http_clients()
+            print(f"{label:22} {invoices / elapsed:8.1f} invoices/s  {server.connections:4} connections")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock server latency (seconds)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.invoices, args.latency, args.concurrency))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark payslip computation: per-employee path vs the batch payroll engine.
+
+Times building all payslip/item values for synthetic headcounts (no database;
+persistence cost is a handful of multi-row INSERTs instead of one flush per
+employee plus per-item adds):
+
+    python scripts/benchmark_payroll_engine.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.payroll_service import PayrollService
+
+
+def make_employees(count: int, seed: int = 2026):
+    rng = random.Random(seed)
+    employees = []
+    for _ in range(count):
+        employees.append(SimpleNamespace(
+            id=uuid.uuid4(),
+            basic_salary=Decimal(rng.randint(7_000_000, 300_000_000)) / 100,
+            housing_allowance=Decimal(rng.randint(0, 100_000_000)) / 100,
+            transport_allowance=Decimal(rng.randint(0, 30_000_000)) / 100,
+            other_allowances={"leave_allowance": rng.randint(0, 50_000)} if rng.random() < 0.3 else None,
+            is_pension_exempt=rng.random() < 0.1,
+            is_nhf_exempt=rng.random() < 0.1,
+            bank_accounts=[],
+        ))
+    return employees
+
+
+async def per_employee(service, payroll_run, employees):
+    for sequence, employee in enumerate(employees, start=1):
+        await service._generate_payslip(
+            payroll_run=payroll_run,
+            employee=employee,
+            payslip_number=f"PAY-2026-10-001-{sequence:04d}",
+            days_in_period=31,
+        )
+
+
+def main(sizes):
+    db = MagicMock()
+    db.flush = AsyncMock()
+    service = PayrollService(db)
+    payroll_run = SimpleNamespace(id=uuid.uuid4())
+
+    print(f"{'employees':>10} {'per-employee':>14} {'batch engine':>14} {'speedup':>9}")
+    for size in sizes:
+        employees = make_employees(size)
+
+        start = time.perf_counter()
+        asyncio.run(per_employee(service, payroll_run, employees))
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        service._build_payslip_rows(payroll_run, employees, "PAY-2026-10-001", 31)
+        batch = time.perf_counter() - start
+
+        print(f"{size:>10} {scalar:>13.2f}s {batch:>13.2f}s {scalar / batch:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+    main(args.sizes)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measure Peppol batch export throughput and memory.
+
+Exports synthetic invoices of one entity two ways: building every UBL
+document with to_ubl_xml (an ElementTree plus minidom pretty-printing per
+invoice) and keeping the strings for a zip, as a month-end export did, and
+streaming them through PeppolBatchExporter into a zip. JSON is measured the
+same way against NDJSON. Peak memory is traced with tracemalloc in a
+second pass.
+
+    python scripts/benchmark_peppol_export.py --invoices 5000 --lines 5
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.peppol_export_service import (
+    InvoiceTypeCode,
+    PeppolBatchExporter,
+    PeppolExportService,
+    PeppolInvoice,
+    PeppolLineItem,
+    PeppolParty,
+)
+
+SELLER = PeppolParty(
+    name="Benchmark Ltd", tin="1234567890", street_address="1 Marina", city="Lagos", state="Lagos",
+    contact_email="accounts@benchmark.ng",
+)
+
+
+def invoices(count: int, lines: int):
+    for n in range(count):
+        items = [
+            PeppolLineItem(
+                item_id=f"SKU-{k}", description=f"Item {k}", quantity=Decimal("2"), unit_code="EA",
+                unit_price=Decimal("1500.00"), line_total=Decimal("3000.00"), vat_rate=Decimal("7.5"),
+                vat_amount=Decimal("225.00"),
+            )
+            for k in range(lines)
+        ]
+        subtotal = Decimal("3000.00") * lines
+        yield PeppolInvoice(
+            invoice_number=f"INV-{n:06d}", invoice_date=date(2026, 10, 1) + timedelta(days=n % 30),
+            due_date=date(2026, 11, 30), invoice_type=InvoiceTypeCode.COMMERCIAL_INVOICE, seller=SELLER,
+            buyer=PeppolParty(name=f"Customer {n % 200}", tin=f"{9000000000 + n % 200}", city="Abuja"),
+            line_items=items, subtotal=subtotal, total_vat=subtotal * Decimal("0.075"),
+            total_amount=subtotal * Decimal("1.075"), nrs_irn=f"NGN{n:010d}",
+        )
+
+
+def per_invoice(count: int, lines: int, fmt: str) -> int:
+    service = PeppolExportService()
+    render = service.to_ubl_xml if fmt == "xml" else service.to_json
+    documents = [(invoice.invoice_number, render(invoice)) for invoice in invoices(count, lines)]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, document in documents:
+            archive.writestr(f"{name}.{fmt}", document)
+    return buffer.tell()
+
+
+def streamed(count: int, lines: int, fmt: str) -> int:
+    exporter = PeppolBatchExporter()
+    if fmt == "xml":
+        chunks = exporter.iter_zip(invoices(count, lines), "xml")
+    else:
+        chunks = exporter.iter_ndjson(invoices(count, lines))
+    return sum(len(chunk) for chunk in chunks)
+
+
+def main(count: int, lines: int):
+    print(f"{count} invoices, {lines} lines each")
+    for label, run, fmt in (
+        ("xml, per-invoice trees", per_invoice, "xml"),
+        ("xml, streamed zip", streamed, "xml"),
+        ("json, per-invoice dumps", per_invoice, "json"),
+        ("json, streamed ndjson", streamed, "json"),
+    ):
+        started = time.perf_counter()
+        size = run(count, lines, fmt)
+        elapsed = time.perf_counter() - started
+        # Separate traced pass: tracemalloc slows allocation-heavy code
+        tracemalloc.start()
+        run(count, lines, fmt)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:26} {count / elapsed:9.0f} invoices/s  peak {peak / 2**20:7.1f} MiB  output {size / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=5000)
+    parser.add_argument("--lines", type=int, default=5)
+    args = parser.parse_args()
+    main(args.invoices, args.lines)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Measure OCR text post-processing: per-field regex passes vs one scan.
+
+Generates receipt-like OCR texts and extracts the structured fields with
+the previous approach (one regex pass per field and pattern, reproduced
+below as the baseline) and with TextExtractor.extract_all, which reads
+the text once.
+
+    python scripts/benchmark_text_extraction.py --receipts 2000 --items 15
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.advanced_ocr_service import NigerianDocumentPatterns, TextExtractor
+
+
+# Previous per-field patterns, each applied in its own pass over the text
+PER_FIELD_PATTERNS = {
+    "tin": [r'\b(\d{8}-\d{4})\b', r'\b(\d{10})\b', r'TIN[:\s#]*(\d{10})', r'Tax\s*ID[:\s#]*(\d{10})'],
+    "phone": [r'\b(0[789][01]\d{8})\b', r'\b(\+234[789][01]\d{8})\b', r'\b(234[789][01]\d{8})\b'],
+    "money": [r'(?:NGN|₦|N)\s*([\d,]+(?:\.\d{2})?)', r'([\d,]+(?:\.\d{2})?)\s*(?:NGN|₦|Naira)',
+              r'Total[:\s]*([\d,]+(?:\.\d{2})?)', r'Amount[:\s]*([\d,]+(?:\.\d{2})?)'],
+    "vat": [r'VAT[:\s@]*(\d+(?:\.\d+)?)\s*%', r'(\d+(?:\.\d+)?)\s*%\s*VAT', r'VAT[:\s]*([\d,]+(?:\.\d{2})?)'],
+    "date": [r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})', r'(\d{4})[/\-](\d{1,2})[/\-](\d{1,2})',
+             r'(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*[,\s]+(\d{4})'],
+    "invoice": [r'(?:Invoice|Inv)[#:\s-]*([A-Z0-9\-]+)', r'(?:Receipt|Rcpt)[#:\s-]*([A-Z0-9\-]+)',
+                r'(?:Reference|Ref)[#:\s-]*([A-Z0-9\-]+)'],
+}
+
+
+def per_field_extract(text: str) -> dict:
+    fields = {}
+    for pattern in PER_FIELD_PATTERNS["tin"]:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match and len(match.group(1).replace("-", "")) == 10:
+            fields["tin"] = match.group(1)
+            break
+    fields["phones"] = {p for pattern in PER_FIELD_PATTERNS["phone"] for p in re.findall(pattern, text)}
+    fields["amounts"] = [
+        (m.group(0), float(m.group(1).replace(",", "") or 0))
+        for pattern in PER_FIELD_PATTERNS["money"]
+        for m in re.finditer(pattern, text, re.IGNORECASE)
+        if m.group(1).replace(",", "")
+    ]
+    for pattern in PER_FIELD_PATTERNS["vat"]:
+        re.search(pattern, text, re.IGNORECASE)
+    for pattern in PER_FIELD_PATTERNS["date"]:
+        if re.search(pattern, text, re.IGNORECASE):
+            break
+    for pattern in PER_FIELD_PATTERNS["invoice"]:
+        if re.search(pattern, text, re.IGNORECASE):
+            break
+    for state in NigerianDocumentPatterns.NIGERIAN_STATES:
+        if state.lower() in text.lower():
+            fields["address"] = re.search(rf'([^.]*{state}[^.]*)', text, re.IGNORECASE)
+            break
+    fields["email"] = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    fields["vendor"] = next((line for line in lines[:5] if len(line) > 3), None)
+    return fields
+
+
+def build_receipts(count: int, items: int) -> list:
+    rng = random.Random(7)
+    vendors = ["SHOPRITE NIGERIA LTD", "Chicken Republic", "MTN Nigeria", "Total Energies", "Jumia Foods"]
+    products = ["Rice 5kg", "Vegetable oil", "Bread", "Sachet water", "Detergent", "Airtime", "Diesel"]
+    states = ["Lagos", "Abuja", "Rivers", "Kano", "Oyo"]
+    receipts = []
+    for n in range(count):
+        lines = [
+            rng.choice(vendors),
+            f"{rng.randint(1, 99)} Allen Avenue, Ikeja, {rng.choice(states)}",
+            f"TIN: {rng.randint(10**9, 10**10 - 1)}  Tel: 080{rng.randint(10**7, 10**8 - 1)}",
+            f"RECEIPT No: RCP-{rng.randint(100000, 999999)}",
+            f"Date: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026",
+        ]
+        subtotal = 0.0
+        for _ in range(items):
+            amount = round(rng.uniform(200, 20000), 2)
+            subtotal += amount
+            lines.append(f"{rng.choice(products):20} x{rng.randint(1, 4)}   N{amount:,.2f}")
+        vat = round(subtotal * 0.075, 2)
+        lines += [
+            f"Subtotal: {subtotal:,.2f}",
+            f"VAT (7.5%): {vat:,.2f}",
+            f"Total: NGN {subtotal + vat:,.2f}",
+            f"Cashier {n % 12}. Thank you for shopping with us",
+        ]
+        receipts.append("\n".join(lines))
+    return receipts
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(receipts: int, items: int):
+    texts = build_receipts(receipts, items)
+    extractor = TextExtractor()
+
+    per_field = timed(lambda: [per_field_extract(text) for text in texts])
+    single_pass = timed(lambda: [extractor.extract_all(text) for text in texts])
+
+    print(f"{receipts} receipts x {items} line items ({sum(map(len, texts)) // receipts} chars each)")
+    print(f"{'per-field passes':20} {per_field * 1000:9.2f} ms  {per_field / receipts * 1e6:7.1f} us/receipt")
+    print(f"{'single scan':20} {single_pass * 1000:9.2f} ms  {single_pass / receipts * 1e6:7.1f} us/receipt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--receipts", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=15, help="Line items per receipt")
+    args = parser.parse_args()
+    main(args.receipts, args.items)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measure bulk TIN validation against a local mock NRS API.
+
+Validates an import-sized list of TINs (with repeats, as vendor and
+customer files have) three ways: one call per row in sequence (the
+previous behaviour), the cached bulk path with a cold cache (distinct TINs
+only, concurrently), and the same bulk call again with the in-process LRU
+warm. The shared table tier needs Postgres and is not exercised here.
+
+    python scripts/benchmark_tin_validation.py --rows 2000 --distinct 1500 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import nrs_service
+from app.services.nrs_service import LocalNRSServer, close_nrs_http_clients, get_nrs_client
+from app.services.tin_verification_cache import clear_tin_caches
+
+
+async def per_row(client, tins):
+    for tin in tins:
+        await client._fetch_tin(tin)
+
+
+async def bulk(client, tins):
+    await client.bulk_validate_tins(tins)
+
+
+async def main(rows: int, distinct: int, latency: float, concurrency: int):
+    nrs_service.settings.nrs_bulk_concurrency = concurrency
+    nrs_service.settings.nrs_rate_limit_per_second = 10_000.0
+    nrs_service.settings.nrs_rate_burst = concurrency
+
+    rng = random.Random(7)
+    pool = [f"{rng.randrange(10**9, 10**10)}" for _ in range(distinct)]
+    tins = pool + [rng.choice(pool) for _ in range(rows - distinct)]
+    rng.shuffle(tins)
+
+    print(f"{rows} rows, {distinct} distinct TINs, {latency * 1000:.0f} ms server latency, concurrency {concurrency}")
+    clear_tin_caches()
+    with LocalNRSServer(latency=latency) as server:
+        client = get_nrs_client(api_key="bench", base_url=server.url)
+        for label, run in (
+            ("per row, sequential", per_row),
+            ("bulk, cold cache", bulk),
+            ("bulk, warm LRU", bulk),
+        ):
+            before = len(server.requests)
+            started = time.perf_counter()
+            await run(client, tins)
+            elapsed = time.perf_counter() - started
+            print(f"{label:22} {elapsed:8.2f} s  {rows / elapsed:10.1f} rows/s  {len(server.requests) - before:6} upstream calls")
+        await close_nrs_http_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=1500)
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock server latency (seconds)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, min(args.distinct, args.rows), args.latency, args.concurrency))
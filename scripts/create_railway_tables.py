@@ -14,6 +14,7 @@ from sqlalchemy import create_engine, text
 
 # Import Base first
 from app.models.base import BaseModel
+from app.database import create_extensions
 
 # Import ALL models to register them with Base.metadata
 # This ensures all tables are created
@@ -84,8 +85,10 @@ def create_tables():
             conn.commit()
         print("✓ Schema cleaned")
         
-        # Create all tables
+        # Create all tables (extensions first: the schema drop removed them)
         print("\n[2/4] Creating tables from SQLAlchemy models...")
+        with engine.begin() as conn:
+            create_extensions(conn)
         BaseModel.metadata.create_all(bind=engine)
         print("✓ All tables created")
         
@@ -12,6 +12,9 @@ CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 -- Enable btree_gist for range types
 CREATE EXTENSION IF NOT EXISTS "btree_gist";
 
+-- Enable btree_gin for composite GIN indexes (search_documents)
+CREATE EXTENSION IF NOT EXISTS "btree_gin";
+
 -- Create test database if not exists (for pytest)
 SELECT 'CREATE DATABASE tekvwarho_proaudit_test'
 WHERE NOT EXISTS (SELECT FROM pg_database WHERE datname = 'tekvwarho_proaudit_test')\gexec
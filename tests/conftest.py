@@ -16,7 +16,7 @@ import httpx
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
-from app.database import Base, get_async_session
+from app.database import Base, create_extensions, get_async_session
 from app.config import settings
 from app.models.user import User, UserRole
 from app.models.organization import Organization
@@ -65,6 +65,7 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     )
     
     async with test_engine.begin() as conn:
+        await conn.run_sync(create_extensions)
         await conn.run_sync(Base.metadata.create_all)
     
     async with TestSessionLocal() as session:
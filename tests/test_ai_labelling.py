@@ -0,0 +1,198 @@
+"""
+TekVwarho ProAudit - AI Transaction Labelling Tests
+
+Tests for batched labelling: the compiled vendor pattern matcher,
+deduplication, one ML call per batch, label caches and concurrent
+remote calls for the residue.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import asyncio
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.services import ai_labelling
+from app.services.ai_labelling import (
+    AITransactionLabeller,
+    LabelRequest,
+    TransactionPrediction,
+    normalize_description,
+)
+
+
+class FakeCache:
+    """In-memory stand-in for the Redis hash helpers of CacheService."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hget_many(self, key, fields):
+        stored = self.hashes.get(key, {})
+        return {f: stored[f] for f in fields if f in stored}
+
+    async def hset_many(self, key, mapping, ttl=None):
+        self.hashes.setdefault(key, {}).update(mapping)
+        return True
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr("app.services.cache_service.get_cache_service", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def labeller():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.preprocessing import LabelEncoder
+
+    descriptions = ["office stationery purchase", "printer cartridge", "staff salary payment",
+                    "monthly salary staff", "courier delivery charge", "dispatch rider delivery"]
+    categories = ["Office Supplies", "Office Supplies", "Salaries and Wages",
+                  "Salaries and Wages", "Freight and Shipping", "Freight and Shipping"]
+    labeller = AITransactionLabeller()
+    labeller.openai_api_key = None
+    labeller.confidence_threshold = 0.5
+    labeller._vectorizer = TfidfVectorizer()
+    X = labeller._vectorizer.fit_transform(descriptions)
+    labeller._label_encoder = LabelEncoder()
+    labeller._ml_model = MultinomialNB(alpha=0.1).fit(X, labeller._label_encoder.fit_transform(categories))
+    return labeller
+
+
+def _spy_ml(labeller):
+    calls = []
+    original = labeller._predict_with_ml_many
+
+    async def spy(texts, entity_id=None):
+        calls.append(list(texts))
+        return await original(texts, entity_id)
+
+    labeller._predict_with_ml_many = spy
+    return calls
+
+
+class TestVendorPatterns:
+    """Test the compiled vendor pattern matcher."""
+
+    def test_matches_longest_pattern_like_a_full_scan(self, labeller):
+        words = list(labeller.VENDOR_PATTERNS) + ["payment", "pos", "lagos", "gtbankx", "firstbank"]
+        random.seed(3)
+
+        for _ in range(3000):
+            text = " ".join(random.choice(words) for _ in range(random.randint(1, 5)))
+            found = [p for p in labeller.VENDOR_PATTERNS if p in text]
+            expected = max(found, key=len) if found else None  # first listed wins ties
+
+            result = labeller._match_vendor_pattern(text)
+
+            assert (result.reasoning.split("'")[1] if result else None) == expected
+
+    def test_normalization_masks_reference_numbers(self):
+        assert normalize_description("POS  402113 MTN   Airtime ") == "pos # mtn airtime"
+        assert normalize_description("9mobile data", "Emerging Markets") == "9mobile data emerging markets"
+
+
+class TestPredictMany:
+    """Test batched labelling."""
+
+    @pytest.mark.asyncio
+    async def test_dedupes_and_predicts_in_one_ml_call(self, labeller):
+        calls = _spy_ml(labeller)
+        requests = [
+            LabelRequest("Office stationery 10023", Decimal("5000")),
+            LabelRequest("MTN", Decimal("1000")),
+            LabelRequest("office stationery 99881", Decimal("7000")),
+            {"description": "Staff salary payment", "amount": Decimal("250000")},
+        ]
+
+        labels = await labeller.predict_many(requests)
+
+        assert [l.category_name for l in labels] == [
+            "Office Supplies", "Utilities: Telecommunications", "Office Supplies", "Salaries and Wages",
+        ]
+        assert calls == [["office stationery #", "staff salary payment"]]
+        assert labels[0] is not labels[2]
+
+    @pytest.mark.asyncio
+    async def test_repeat_batches_hit_the_lru(self, labeller):
+        calls = _spy_ml(labeller)
+        requests = [LabelRequest(f"courier delivery {1000 + i}") for i in range(50)]
+
+        await labeller.predict_many(requests)
+        again = await labeller.predict_many(requests)
+
+        assert len(calls) == 1
+        assert {l.category_name for l in again} == {"Freight and Shipping"}
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded(self, labeller):
+        labeller.LABEL_CACHE_SIZE = 10
+
+        await labeller.predict_many([LabelRequest(f"printer cartridge {chr(97 + i)}x") for i in range(25)])
+
+        assert len(labeller._label_cache) == 10
+
+    @pytest.mark.asyncio
+    async def test_entity_labels_persist_across_processes(self, labeller, cache):
+        await labeller.predict_many([LabelRequest("staff salary payment")], entity_id="ent-1")
+
+        fresh = AITransactionLabeller()
+        fresh.ml_enabled = False
+        labels = await fresh.predict_many(
+            [LabelRequest("Staff salary  payment")], entity_id="ent-1"
+        )
+        other_entity = await fresh.predict_many(
+            [LabelRequest("staff salary payment")], entity_id="ent-2"
+        )
+
+        assert labels[0].category_name == "Salaries and Wages"
+        assert other_entity[0].category_name == "Uncategorized"
+
+        await fresh.clear_label_cache("ent-1")
+        assert "ai:label:ent-1" not in cache.hashes and "ai:label:ent-2" not in cache.hashes
+
+    @pytest.mark.asyncio
+    async def test_remote_calls_only_for_residue_with_bounded_concurrency(self, labeller):
+        labeller.openai_api_key = "sk-test"
+        labeller.remote_concurrency = 3
+        labeller.confidence_threshold = 0.99
+        running, peak, seen = 0, 0, []
+
+        async def fake_openai(description, amount, transaction_type, vendor_name, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            seen.append(description)
+            return TransactionPrediction(None, "Miscellaneous", "6950", "Miscellaneous Expense", 0.8, "ai")
+
+        labeller._predict_with_openai = fake_openai
+        requests = [LabelRequest("DSTV")] + [
+            LabelRequest(f"unknown payee {chr(97 + i)} {n}") for i in range(10) for n in (11111, 22222)
+        ]
+
+        labels = await labeller.predict_many(requests)
+
+        assert labels[0].category_name == "Utilities: Cable/Internet"
+        assert len(seen) == 10 and "DSTV" not in seen
+        assert peak == 3
+        assert all(l.category_name == "Miscellaneous" for l in labels[1:])
+
+    @pytest.mark.asyncio
+    async def test_predict_category_uses_the_batch_path(self, labeller):
+        prediction = await labeller.predict_category("EKEDC", Decimal("20000"))
+
+        assert prediction.gl_account_code == "6100"
+        assert ai_labelling.ai_labelling_service is ai_labelling.ai_transaction_labeller
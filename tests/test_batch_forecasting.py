@@ -0,0 +1,204 @@
+"""
+TekVwarho ProAudit - Batch Forecasting Tests
+
+Tests for forecasting (series x periods) matrices in one call: parity
+with the single-series forecaster, the (entity, metric, last period)
+cache and the batched budget forecast.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.services.batch_forecast_service import BatchForecastService
+from app.services.budget_service import BudgetService
+from app.services.ml_engine import TimeSeriesForecaster
+
+
+def _series(count, periods, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(periods)
+    season = np.sin(2 * np.pi * t / 12)
+    return (
+        rng.uniform(1e4, 1e6, (count, 1))
+        + rng.normal(0, 500, (count, 1)) * t
+        + rng.uniform(0, 5e4, (count, 1)) * season
+        + rng.normal(0, 2e3, (count, periods))
+    )
+
+
+def _assert_same_forecast(single, batch, row):
+    for h, expected in enumerate(single["forecasts"]):
+        assert batch["forecast"][row][h] == pytest.approx(expected["forecast"])
+        assert batch["lower_95"][row][h] == pytest.approx(expected["lower_95"])
+        assert batch["upper_95"][row][h] == pytest.approx(expected["upper_95"])
+
+
+class FakeCache:
+    """In-memory stand-in for CacheService forecast caching."""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get_forecast(self, entity_id, metric, last_period, params_hash):
+        return self.entries.get((entity_id, metric, last_period, params_hash))
+
+    async def set_forecast(self, entity_id, metric, last_period, params_hash, data, ttl=None):
+        self.entries[(entity_id, metric, last_period, params_hash)] = dict(data)
+        return True
+
+
+class TestBatchForecaster:
+    """Test batch methods against the single-series forecaster."""
+
+    @pytest.mark.parametrize("periods", [8, 30])
+    def test_exponential_smoothing_matches_per_series(self, periods):
+        data = _series(20, periods)
+        forecaster = TimeSeriesForecaster()
+
+        batch = forecaster.exponential_smoothing_batch(data, forecast_periods=6)
+
+        assert batch["model"] == ("holt_winters" if periods >= 24 else "simple_exponential")
+        for row in range(len(data)):
+            _assert_same_forecast(forecaster.exponential_smoothing(data[row], forecast_periods=6), batch, row)
+
+    @pytest.mark.parametrize("p,d", [(1, 1), (3, 1), (2, 0), (0, 1)])
+    def test_arima_matches_per_series(self, p, d):
+        data = _series(15, 18, seed=p)
+        forecaster = TimeSeriesForecaster()
+
+        batch = forecaster.arima_forecast_batch(data, p=p, d=d, forecast_periods=4)
+
+        for row in range(len(data)):
+            single = forecaster.arima_forecast(data[row], p=p, d=d, forecast_periods=4)
+            _assert_same_forecast(single, batch, row)
+            np.testing.assert_allclose(batch["ar_coefficients"][row], single["ar_coefficients"])
+
+    def test_decompose_matches_per_series(self):
+        data = _series(5, 40)
+        forecaster = TimeSeriesForecaster()
+
+        batch = forecaster.decompose_batch(data)
+
+        for row in range(len(data)):
+            single = forecaster.decompose(data[row])
+            for part in ("trend", "seasonal", "residual"):
+                np.testing.assert_allclose(batch[part][row], single[part])
+
+    def test_series_result_keeps_single_series_format(self):
+        forecaster = TimeSeriesForecaster()
+
+        result = forecaster.exponential_smoothing(_series(1, 30)[0], forecast_periods=3)
+
+        assert [f["period"] for f in result["forecasts"]] == [1, 2, 3]
+        assert isinstance(result["level"], float) and len(result["seasonal_factors"]) == 12
+        assert result["model"] == "holt_winters"
+
+
+class TestBatchForecastService:
+    """Test the cached batch forecasting service."""
+
+    @pytest.mark.asyncio
+    async def test_cached_by_entity_metric_and_last_period(self):
+        cache = FakeCache()
+        service = BatchForecastService(cache=cache)
+        service.forecast_matrix = MagicMock(wraps=service.forecast_matrix)
+        data = _series(500, 36)
+
+        first = await service.forecast("ent-1", "expense_by_account", "2026-09", data, forecast_periods=3)
+        again = await service.forecast("ent-1", "expense_by_account", "2026-09", data, forecast_periods=3)
+        next_period = await service.forecast("ent-1", "expense_by_account", "2026-10", data, forecast_periods=3)
+
+        assert first["cached"] is False and again["cached"] is True
+        assert next_period["cached"] is False
+        assert service.forecast_matrix.call_count == 2
+        assert again["forecast"] == first["forecast"]
+        assert len(first["forecast"]) == 500 and len(first["forecast"][0]) == 3
+
+    @pytest.mark.asyncio
+    async def test_changed_history_is_not_served_from_cache(self):
+        service = BatchForecastService(cache=FakeCache())
+        data = _series(3, 12)
+
+        await service.forecast("ent-1", "revenue", "2026-09", data)
+        data[0, 4] += 1000  # late posting into an earlier month
+        result = await service.forecast("ent-1", "revenue", "2026-09", data)
+
+        assert result["cached"] is False
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_method(self):
+        with pytest.raises(ValueError):
+            await BatchForecastService(cache=FakeCache()).forecast(
+                "ent-1", "revenue", "2026-09", _series(2, 12), method="prophet"
+            )
+
+
+class TestBudgetForecast:
+    """Test forecast_budget_performance on monthly actuals."""
+
+    def _service(self, rows, line_items, months_elapsed=9):
+        result = MagicMock()
+        result.all.return_value = rows
+        service = BudgetService(MagicMock(execute=AsyncMock(return_value=result)))
+        budget = SimpleNamespace(
+            id=uuid.uuid4(), name="FY2026", fiscal_year=2026, end_date=date(2026, 12, 31),
+            line_items=line_items,
+        )
+        service.get_budget = AsyncMock(return_value=budget)
+        service.get_budget_vs_actual = AsyncMock(return_value={
+            "period": {"months_analyzed": months_elapsed, "end_date": "2026-09-30"},
+            "line_items": [
+                {"account_name": item.account_name, "line_type": item.line_type,
+                 "annual_budget": 1200.0, "ytd_actual": 900.0}
+                for item in line_items
+            ],
+        })
+        return service, budget
+
+    @pytest.mark.asyncio
+    async def test_forecasts_all_line_items_in_one_batch(self, monkeypatch):
+        cache = FakeCache()
+        monkeypatch.setattr("app.services.cache_service.get_cache_service", lambda: cache)
+        categories = [uuid.uuid4(), uuid.uuid4()]
+        items = [
+            SimpleNamespace(id=uuid.uuid4(), account_code=None, category_id=categories[0],
+                            account_name="Rent", line_type="expense"),
+            SimpleNamespace(id=uuid.uuid4(), account_code=None, category_id=categories[1],
+                            account_name="Sales", line_type="revenue"),
+        ]
+        rows = [(categories[0], "expense", datetime(2026, m, 1), 100) for m in range(1, 10)]
+        rows += [(categories[1], "income", datetime(2026, m, 1), 50 * m) for m in range(1, 10)]
+        service, budget = self._service(rows, items)
+
+        result = await service.forecast_budget_performance(uuid.uuid4(), budget.id, forecast_months=2)
+
+        rent, sales = result["line_item_forecasts"]
+        assert result["forecast_basis"]["history_months"] == 9
+        assert "Exponential smoothing" in result["forecast_basis"]["methodology"]
+        assert rent["projected_annual"] == pytest.approx(900 + 3 * 100)
+        assert [f["month"] for f in rent["monthly_forecast"]] == [1, 2]
+        assert sales["projected_annual"] > 900
+        assert service.db.execute.await_count == 1
+        assert len(cache.entries) == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_run_rate_without_history(self, monkeypatch):
+        monkeypatch.setattr("app.services.cache_service.get_cache_service", lambda: FakeCache())
+        items = [SimpleNamespace(id=uuid.uuid4(), account_code="6100", category_id=None,
+                                 account_name="Power", line_type="expense")]
+        service, budget = self._service([], items)
+
+        result = await service.forecast_budget_performance(uuid.uuid4(), budget.id)
+
+        forecast = result["line_item_forecasts"][0]
+        assert forecast["projected_annual"] == pytest.approx(900 / 9 * 12)
+        assert forecast["monthly_forecast"] == []
+        assert result["forecast_basis"]["methodology"] == "Linear projection based on YTD run rate"
@@ -0,0 +1,364 @@
+"""
+TekVwarho ProAudit - Bulk Import Tests
+
+Tests for the streaming CSV import: column-wise chunk validation, the
+staging table and set-based merge, COPY of each chunk with the derived
+stores kept in step, resumable background jobs, and the choice between
+inline and background imports.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import io
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.models.bulk_import_job import BulkImportJob, BulkImportStatus
+from app.models.transaction import TransactionType
+from app.services import bulk_import_service
+from app.services.bulk_import_service import (
+    IMPORT_SPECS,
+    BulkImportError,
+    import_rows,
+    iter_csv_chunks,
+    merge_statement,
+    run_bulk_import_job,
+    staging_table,
+    validate_chunk,
+)
+
+ENTITY = uuid.uuid4()
+USER = uuid.uuid4()
+
+TRANSACTIONS_CSV = (
+    "date,description,amount,type,reference\n"
+    "2026-10-01,Diesel,\"1,500.505\",expense,REF-1\n"
+    "2026-10-02,Consulting fee,250000,INCOME,\n"
+    "2026-10-02,Generator repair,12000,,REF-3\n"
+)
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class FakeDriverConnection:
+    def __init__(self):
+        self.copies = []
+
+    async def copy_records_to_table(self, table_name, records, columns):
+        self.copies.append((table_name, columns, list(records)))
+
+
+class FakeSession:
+    """Async session stand-in recording statements, COPYs and commits."""
+
+    def __init__(self, job=None):
+        self.job = job
+        self.statements = []
+        self.parameters = []
+        self.driver = FakeDriverConnection()
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, parameters=None):
+        self.statements.append(statement)
+        if parameters is not None:
+            self.parameters.append(parameters)
+
+    async def connection(self):
+        session = self
+
+        class Connection:
+            async def get_raw_connection(self):
+                return SimpleNamespace(driver_connection=session.driver)
+
+        return Connection()
+
+    async def get(self, model, ident):
+        return self.job
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    def sql(self):
+        return [_sql(statement) for statement in self.statements]
+
+
+class TestValidation:
+    """Test column-wise conversion of a chunk."""
+
+    def test_columns_are_converted_and_bad_rows_reported(self):
+        rows = [
+            (2, {"date": "2026-10-01", "description": "Diesel", "amount": "1,500.505", "type": "expense"}),
+            (3, {"date": "01/10/2026", "description": "Fuel", "amount": "abc", "type": "refund"}),
+            (4, {"date": "2026-10-02", "description": "", "amount": "250000", "type": "INCOME"}),
+        ]
+
+        chunk = validate_chunk(IMPORT_SPECS["transactions"], rows)
+
+        assert chunk.row_numbers == [2, 4] and chunk.size == 3
+        assert chunk.columns["amount"] == [Decimal("1500.51"), Decimal("250000.00")]
+        assert chunk.columns["transaction_type"] == [TransactionType.EXPENSE, TransactionType.INCOME]
+        assert chunk.columns["description"] == ["Diesel", ""]
+        assert chunk.columns["total_amount"] == chunk.columns["amount"]
+        assert chunk.errors == [{
+            "row": 3,
+            "error": "date: '01/10/2026' is not a YYYY-MM-DD date; amount: 'abc' is not a number; "
+                     "type: 'refund' is not one of: income, expense",
+            "data": rows[1][1],
+        }]
+
+    def test_required_cells_and_column_limits(self):
+        rows = [
+            (2, {"name": "", "phone": "+234"}),
+            (3, {"name": "Dangote Supplies", "phone": "0" * 21}),
+            (4, {"name": "Ikeja Stores", "tin": " 12345678-0001 "}),
+        ]
+
+        chunk = validate_chunk(IMPORT_SPECS["vendors"], rows)
+
+        assert [error["error"] for error in chunk.errors] == [
+            "name: is required", "phone: longer than 20 characters",
+        ]
+        assert chunk.columns["tin"] == ["12345678-0001"]
+
+    def test_inventory_quantities_load_quantity_on_hand(self):
+        chunk = validate_chunk(IMPORT_SPECS["inventory"], [
+            (2, {"name": "Generator", "sku": "GEN-5KVA", "quantity": "3", "unit_price": ""}),
+            (3, {"name": "Cable", "sku": "CBL-1", "quantity": "2.5"}),
+        ])
+
+        assert chunk.columns["quantity_on_hand"] == [3]
+        assert chunk.columns["unit_price"] == [Decimal("0")] and chunk.columns["reorder_level"] == [10]
+        assert chunk.errors[0]["error"] == "quantity: '2.5' is not a whole number"
+
+    def test_chunks_are_numbered_and_resume_after_skip(self):
+        chunks = list(iter_csv_chunks(io.StringIO(TRANSACTIONS_CSV), 2))
+        resumed = list(iter_csv_chunks(io.StringIO(TRANSACTIONS_CSV), 2, skip=2))
+
+        assert [[number for number, _ in chunk] for chunk in chunks] == [[2, 3], [4]]
+        assert [[number for number, _ in chunk] for chunk in resumed] == [[4]]
+        assert resumed[0][0][1]["description"] == "Generator repair"
+
+
+class TestMerge:
+    """Test the staging table and the set-based merge."""
+
+    def test_staging_is_temporary_and_stages_enums_as_text(self):
+        spec = IMPORT_SPECS["transactions"]
+        ddl = str(CreateTable(staging_table(spec, ["transaction_date", "amount", "transaction_type"])).compile(
+            dialect=postgresql.dialect()
+        ))
+
+        assert "CREATE TEMPORARY TABLE _import_transactions" in ddl
+        assert "transaction_type TEXT" in ddl and "amount NUMERIC(15, 2)" in ddl
+        assert "ON COMMIT DROP" in ddl
+
+    def test_merge_adds_constants_and_column_defaults(self):
+        spec = IMPORT_SPECS["transactions"]
+        staging = staging_table(spec, ["transaction_date", "amount", "transaction_type"])
+        statement = merge_statement(spec, staging, {"entity_id": ENTITY, "created_by_id": USER})
+        sql = _sql(statement)
+        params = statement.compile(dialect=postgresql.dialect()).params
+
+        assert sql.startswith("INSERT INTO transactions (id, transaction_date, amount, transaction_type,")
+        assert "CAST(_import_transactions.transaction_type AS transactiontype)" in sql
+        assert "AS wrenstatus)" in sql
+        assert sql.endswith("FROM _import_transactions ORDER BY _import_transactions.row_number")
+        assert ENTITY in params.values() and USER in params.values() and "NGN" in params.values()
+
+
+class TestImportRows:
+    """Test the chunked COPY pipeline."""
+
+    async def test_each_chunk_is_copied_merged_and_indexed(self, monkeypatch):
+        monkeypatch.setattr(bulk_import_service.settings, "bulk_import_chunk_rows", 2)
+        db = FakeSession()
+
+        progress = await import_rows(db, "transactions", io.StringIO(TRANSACTIONS_CSV), ENTITY, USER)
+
+        assert (progress.rows_processed, progress.successful, progress.failed) == (3, 3, 0)
+        assert [len(records) for _, _, records in db.driver.copies] == [2, 1]
+        table_name, columns, records = db.driver.copies[0]
+        assert table_name == "_import_transactions"
+        assert columns[:3] == ["row_number", "id", "transaction_date"]
+        assert records[0][0] == 2 and records[0][2] == date(2026, 10, 1)
+        assert records[1][columns.index("transaction_type")] == "INCOME"
+
+        sql = db.sql()
+        assert [statement.split(" (")[0].split(" ON")[0] for statement in sql[:6]] == [
+            "\nCREATE TEMPORARY TABLE _import_transactions",
+            "INSERT INTO transactions",
+            "\nDROP TABLE _import_transactions",
+            "INSERT INTO entity_daily_summaries",
+            "INSERT INTO platform_metrics",
+            "INSERT INTO search_documents",
+        ]
+        assert [document["title"] for document in db.parameters[0]] == ["Diesel", "Consulting fee"]
+        assert db.commits == 0  # inline imports are committed by the caller
+
+    async def test_invalid_row_stops_an_import_that_does_not_skip_errors(self):
+        db = FakeSession()
+        content = TRANSACTIONS_CSV + "2026-10-03,Bad,12x,expense,\n"
+
+        with pytest.raises(BulkImportError, match="Error on row 5: amount: '12x' is not a number"):
+            await import_rows(db, "transactions", io.StringIO(content), ENTITY, USER)
+
+        assert db.driver.copies == []
+
+    async def test_skip_errors_imports_the_rest(self):
+        db = FakeSession()
+        content = TRANSACTIONS_CSV + "2026-10-03,Bad,12x,expense,\n"
+
+        progress = await import_rows(db, "transactions", io.StringIO(content), ENTITY, USER, skip_errors=True)
+
+        assert (progress.successful, progress.failed) == (3, 1)
+        assert progress.errors[0]["row"] == 5
+
+    async def test_vendor_tin_results_are_stored_on_the_row(self, monkeypatch):
+        from app.services import nrs_service
+
+        checked = []
+
+        class FakeClient:
+            async def bulk_validate_tins(self, tins, db=None):
+                checked.append(tins)
+                return [
+                    SimpleNamespace(tin=tin, is_valid=tin.startswith("1"), registered_name="REGISTERED LTD",
+                                    message="TIN not found")
+                    for tin in tins
+                ]
+
+        monkeypatch.setattr(nrs_service, "get_nrs_client", lambda: FakeClient())
+        db = FakeSession()
+        content = "name,tin\nAda Ltd,1234567890\nBola Ltd,0000000000\nAda Ltd (Ikeja),1234567890\n"
+
+        progress = await import_rows(db, "vendors", io.StringIO(content), ENTITY, USER)
+
+        _, columns, records = db.driver.copies[0]
+        verified = [record[columns.index("tin_verified")] for record in records]
+        assert checked == [["1234567890", "0000000000"]]
+        assert verified == [True, False, True]
+        assert progress.tins_checked == 2
+        assert progress.tin_warnings == [{"row": 3, "tin": "0000000000", "message": "TIN not found"}]
+
+
+class TestBackgroundJob:
+    """Test resumable background imports."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        path = tmp_path / "upload.csv"
+        path.write_text(TRANSACTIONS_CSV, encoding="utf-8")
+        deleted = []
+
+        async def delete_file(file_id):
+            deleted.append(file_id)
+
+        return SimpleNamespace(get_local_path=lambda file_id: path, delete_file=delete_file, deleted=deleted)
+
+    def _job(self, **values):
+        fields = dict(
+            id=uuid.uuid4(), entity_id=ENTITY, created_by_id=USER, import_type="transactions",
+            status=BulkImportStatus.QUEUED, file_id="bulk/upload.csv", filename="upload.csv",
+            options={"skip_errors": False, "validate_tins": True}, rows_processed=0, successful=0,
+            failed=0, tins_checked=0, errors=None, tin_warnings=None, started_at=None,
+        )
+        fields.update(values)
+        return BulkImportJob(**fields)
+
+    async def test_job_commits_per_chunk_and_resumes(self, storage, monkeypatch):
+        monkeypatch.setattr(bulk_import_service.settings, "bulk_import_chunk_rows", 1)
+        logged = []
+
+        async def log_import(db, entity_id, user_id, import_type, progress):
+            logged.append(progress.rows_processed)
+
+        monkeypatch.setattr(bulk_import_service, "log_import", log_import)
+        job = self._job(status=BulkImportStatus.FAILED, rows_processed=2, successful=2)
+        db = FakeSession(job)
+
+        result = await run_bulk_import_job(db, job.id, storage=storage)
+
+        assert [records[0][0] for _, _, records in db.driver.copies] == [4]  # rows 2 and 3 were committed
+        assert result["status"] == "completed" and result["successful"] == 3
+        assert job.status == BulkImportStatus.COMPLETED and job.rows_processed == 3
+        assert db.commits == 3  # running, the chunk, completed
+        assert logged == [3] and storage.deleted == ["bulk/upload.csv"]
+
+    async def test_invalid_file_fails_before_writing(self, storage, tmp_path):
+        (tmp_path / "upload.csv").write_text(TRANSACTIONS_CSV + "bad-date,x,1,expense,\n", encoding="utf-8")
+        job = self._job()
+        db = FakeSession(job)
+
+        result = await run_bulk_import_job(db, job.id, storage=storage)
+
+        assert result["status"] == "failed" and "Error on row 5" in result["error"]
+        assert db.driver.copies == [] and storage.deleted == []
+        assert job.status == BulkImportStatus.FAILED and job.errors[0]["row"] == 5
+
+
+class TestImportEndpoint:
+    """Test the inline/background choice of the import endpoints."""
+
+    async def test_large_upload_is_queued(self, monkeypatch):
+        from starlette.datastructures import UploadFile
+        from app.routers import bulk_operations
+
+        queued = []
+
+        async def allow(*args):
+            return None
+
+        async def enqueue(db, **kwargs):
+            queued.append(kwargs)
+            return SimpleNamespace(id=uuid.uuid4(), status=BulkImportStatus.QUEUED)
+
+        monkeypatch.setattr(bulk_operations, "verify_entity_access", allow)
+        monkeypatch.setattr(bulk_operations, "enqueue_bulk_import", enqueue)
+        monkeypatch.setattr(bulk_operations.settings, "bulk_import_inline_max_bytes", 10)
+        upload = UploadFile(io.BytesIO(TRANSACTIONS_CSV.encode()), filename="big.csv", size=len(TRANSACTIONS_CSV))
+        response = SimpleNamespace(status_code=200)
+
+        result = await bulk_operations.bulk_import_transactions(
+            ENTITY, response, file=upload, skip_errors=True, background=None,
+            current_user=SimpleNamespace(id=USER), db=None,
+        )
+
+        assert response.status_code == 202
+        assert result.status == "queued" and result.status_url.endswith(f"/bulk/imports/{result.job_id}")
+        assert queued[0]["import_type"] == "transactions" and queued[0]["skip_errors"] is True
+
+    async def test_small_upload_is_imported_inline(self, monkeypatch):
+        from starlette.datastructures import UploadFile
+        from app.routers import bulk_operations
+
+        async def allow(*args):
+            return None
+
+        async def log_import(*args):
+            return None
+
+        monkeypatch.setattr(bulk_operations, "verify_entity_access", allow)
+        monkeypatch.setattr(bulk_operations, "log_import", log_import)
+        upload = UploadFile(io.BytesIO(TRANSACTIONS_CSV.encode()), filename="small.csv", size=len(TRANSACTIONS_CSV))
+        db = FakeSession()
+
+        result = await bulk_operations.bulk_import_transactions(
+            ENTITY, SimpleNamespace(status_code=200), file=upload, skip_errors=False, background=None,
+            current_user=SimpleNamespace(id=USER), db=db,
+        )
+
+        assert (result.total_rows, result.successful, result.status) == (3, 3, "completed")
+        assert db.commits == 1 and not upload.file.closed
@@ -0,0 +1,187 @@
+"""
+TekVwarho ProAudit - Compute Pool Tests
+
+Tests for per-kind admission control, timeouts and keeping the event loop
+responsive while CPU-bound work runs.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.entity import BusinessEntity
+from app.services import compute_pool
+from app.services.compute_pool import PROCESS, THREAD, ComputePool, WorkKind
+from app.services.invoice_pdf_service import InvoiceData, InvoiceLineItem, render_invoice_pdf
+from app.services.report_export_service import FinancialReportExportService, ReportFormat
+from app.utils.error_handling import ComputeBusyException, ComputeTimeoutException
+
+
+def _invoice(lines=1):
+    items = [
+        InvoiceLineItem(description=f"Item {i}", quantity=1, unit_price_naira=1000, total_naira=1000)
+        for i in range(lines)
+    ]
+    return InvoiceData(
+        invoice_number="INV-202610-TEST", invoice_date=date(2026, 10, 18),
+        due_date=date(2026, 10, 25), customer_name="Acme Ltd", customer_email="ap@acme.ng",
+        line_items=items, subtotal_naira=1000 * lines, vat_naira=75 * lines,
+        total_naira=1075 * lines,
+    )
+
+
+def _pool(executor=THREAD, concurrency=1, timeout=5.0, queue=8, process_workers=1):
+    return ComputePool(
+        kinds={"job": WorkKind("job", executor, concurrency, timeout, queue)},
+        process_workers=process_workers,
+        thread_workers=4,
+    )
+
+
+class Tracker:
+    """Records the peak number of concurrently running calls."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+        return seconds
+
+
+class TestAdmissionControl:
+    """Test concurrency limits, queue bounds and timeouts."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_per_kind(self):
+        pool, tracker = _pool(concurrency=2), Tracker()
+
+        results = await asyncio.gather(*[pool.run("job", tracker.sleep, 0.05) for _ in range(6)])
+
+        stats = pool.get_stats()["kinds"]["job"]
+        pool.close()
+        assert results == [0.05] * 6
+        assert tracker.peak == 2
+        assert stats["completed"] == 6 and stats["running"] == 0
+        assert stats["peak_queued"] == 4
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        pool, tracker = _pool(queue=1), Tracker()
+
+        results = await asyncio.gather(
+            *[pool.run("job", tracker.sleep, 0.05) for _ in range(3)], return_exceptions=True
+        )
+
+        pool.close()
+        rejected = [r for r in results if isinstance(r, ComputeBusyException)]
+        assert len(rejected) == 1
+        assert rejected[0].status_code == 503
+        assert pool.stats["job"].rejected == 1 and pool.stats["job"].completed == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_slot_until_job_finishes(self):
+        pool, tracker = _pool(timeout=0.05), Tracker()
+
+        with pytest.raises(ComputeTimeoutException):
+            await pool.run("job", tracker.sleep, 0.3)
+
+        # The job is still running in its thread and still holds the slot
+        assert pool.stats["job"].running == 1
+        await asyncio.sleep(0.4)
+        assert pool.stats["job"].running == 0
+        assert await pool.run("job", tracker.sleep, 0) == 0
+        pool.close()
+        assert pool.stats["job"].timed_out == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self):
+        pool = _pool()
+
+        with pytest.raises(ValueError):
+            await pool.run("job", int, "not a number")
+
+        pool.close()
+        assert pool.stats["job"].failed == 1
+
+
+class TestOffLoopExecution:
+    """Test work runs off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive_during_render(self):
+        pool = _pool(executor=PROCESS)
+        await pool.run("job", render_invoice_pdf, _invoice())  # start the worker
+        lags = []
+
+        async def ticker(stop):
+            while not stop.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - started - 0.005)
+
+        stop = asyncio.Event()
+        ticks = asyncio.create_task(ticker(stop))
+        started = time.perf_counter()
+        pdf = await pool.run("job", render_invoice_pdf, _invoice(lines=1500))
+        render_seconds = time.perf_counter() - started
+        stop.set()
+        await ticks
+        pool.close()
+
+        assert pdf.startswith(b"%PDF")
+        assert len(lags) > 10
+        assert max(lags) < min(0.1, render_seconds / 2)
+
+    @pytest.mark.asyncio
+    async def test_sha256_hexdigest(self):
+        small, large = b"x" * 10, b"y" * (compute_pool.HASH_INLINE_BYTES + 1)
+        pool = compute_pool.get_compute_pool()
+        before = pool.stats["hash"].completed
+
+        assert await compute_pool.sha256_hexdigest(small) == hashlib.sha256(small).hexdigest()
+        assert await compute_pool.sha256_hexdigest(large) == hashlib.sha256(large).hexdigest()
+        assert pool.stats["hash"].completed == before + 1
+        compute_pool.close_compute_pool()
+
+    @pytest.mark.asyncio
+    async def test_report_export_renders_in_worker_process(self):
+        service = FinancialReportExportService(MagicMock())
+        service._get_entity = AsyncMock(return_value=BusinessEntity(id=uuid.uuid4(), name="Acme Ltd"))
+        service._get_trial_balance_data = AsyncMock(return_value={
+            "accounts": [{
+                "account_code": "1000", "account_name": "Cash", "account_type": "asset",
+                "debit": Decimal("5000"), "credit": Decimal("0"),
+            }],
+            "total_debits": Decimal("5000"),
+            "total_credits": Decimal("0"),
+            "is_balanced": False,
+            "difference": Decimal("5000"),
+        })
+
+        content, filename = await service.export_trial_balance(
+            uuid.uuid4(), date(2026, 9, 30), format=ReportFormat.PDF
+        )
+
+        stats = compute_pool.get_compute_pool().stats["render"]
+        compute_pool.close_compute_pool()
+        assert content.startswith(b"%PDF")
+        assert "trial_balance" in filename.lower()
+        assert stats.completed == 1
@@ -0,0 +1,146 @@
+"""
+TekVwarho ProAudit - Mail Transport Tests
+
+Tests for the pooled SMTP sender, batch sending and the local SMTP
+stand-in used by EmailService.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.email_service import EmailMessage, EmailProvider, EmailService
+from app.services.mail_transport import (
+    LocalSMTPServer,
+    MailEnvelope,
+    SMTPConnectionPool,
+    get_http_client,
+)
+
+
+@pytest.fixture
+def smtp_server():
+    with LocalSMTPServer() as server:
+        yield server
+
+
+@pytest.fixture
+def pool(smtp_server):
+    pool = SMTPConnectionPool("127.0.0.1", smtp_server.port, use_tls=False, pool_size=2)
+    yield pool
+    pool.close()
+
+
+def _service(pool: SMTPConnectionPool) -> EmailService:
+    service = EmailService(smtp_pool=pool)
+    service.smtp_host = "127.0.0.1"
+    service.sendgrid_api_key = None
+    service.mailgun_api_key = None
+    service.from_email = "noreply@tekvwarho.com"
+    return service
+
+
+class TestSMTPConnectionPool:
+    """Test connection reuse and batch delivery."""
+
+    @pytest.mark.asyncio
+    async def test_send_reuses_connection(self, smtp_server, pool):
+        for i in range(5):
+            envelope = MailEnvelope("a@x.com", ["b@x.com"], f"Subject: {i}\r\n\r\nhi".encode())
+            assert await pool.send(envelope)
+
+        assert len(smtp_server.messages) == 5
+        assert pool.connections_opened == 1
+        assert smtp_server.sessions == 1
+
+    @pytest.mark.asyncio
+    async def test_send_many_preserves_order_and_bounds_sessions(self, smtp_server, pool):
+        envelopes = [
+            MailEnvelope("a@x.com", [f"user{i}@x.com"], b"Subject: t\r\n\r\nbody")
+            for i in range(7)
+        ]
+        results = await pool.send_many(envelopes)
+
+        assert results == [True] * 7
+        assert pool.connections_opened <= 2
+        assert sorted(m.recipients[0] for m in smtp_server.messages) == sorted(
+            e.recipients[0] for e in envelopes
+        )
+
+    @pytest.mark.asyncio
+    async def test_stale_connection_is_replaced(self, smtp_server, pool):
+        pool.max_idle_seconds = 0
+        await pool.send(MailEnvelope("a@x.com", ["b@x.com"], b"x"))
+        await asyncio.sleep(0.01)
+        await pool.send(MailEnvelope("a@x.com", ["b@x.com"], b"y"))
+        assert pool.connections_opened == 2
+
+
+class TestEmailServiceBatch:
+    """Test EmailService batch API over the pooled transport."""
+
+    @pytest.mark.asyncio
+    async def test_send_email_via_pool(self, smtp_server, pool):
+        service = _service(pool)
+        ok = await service.send_email(EmailMessage(
+            to=["customer@example.com"],
+            subject="Invoice INV-001",
+            body_text="Hello",
+            body_html="<p>Hello</p>",
+            bcc=["audit@example.com"],
+        ))
+        assert ok
+        message = smtp_server.messages[0]
+        assert message.recipients == ["customer@example.com", "audit@example.com"]
+        assert b"Invoice INV-001" in message.data
+
+    @pytest.mark.asyncio
+    async def test_send_batch_smtp(self, smtp_server, pool):
+        service = _service(pool)
+        messages = [
+            EmailMessage(to=[f"user{i}@example.com"], subject=f"Reminder {i}", body_text="x")
+            for i in range(20)
+        ]
+        results = await service.send_batch(messages)
+
+        assert results == [True] * 20
+        assert len(smtp_server.messages) == 20
+        assert smtp_server.sessions <= pool.pool_size
+
+    @pytest.mark.asyncio
+    async def test_send_batch_empty(self, pool):
+        assert await _service(pool).send_batch([]) == []
+
+    @pytest.mark.asyncio
+    async def test_send_batch_sendgrid_uses_shared_client(self):
+        service = EmailService()
+        service.sendgrid_api_key = "SG.test"
+
+        response = MagicMock(status_code=202)
+        client = MagicMock()
+        client.post = AsyncMock(return_value=response)
+
+        with patch("app.services.email_service.get_http_client", return_value=client) as getter:
+            results = await service.send_batch([
+                EmailMessage(to=["a@example.com"], subject="s", body_text="b")
+                for _ in range(3)
+            ])
+
+        assert results == [True, True, True]
+        assert client.post.await_count == 3
+        assert all(call.args == (EmailProvider.SENDGRID,) for call in getter.call_args_list)
+
+
+class TestSharedHTTPClient:
+    """Test provider HTTP client reuse."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_per_loop(self):
+        first = get_http_client("sendgrid")
+        second = get_http_client("sendgrid")
+        assert first is second
+        assert get_http_client("mailgun") is not first
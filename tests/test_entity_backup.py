@@ -0,0 +1,445 @@
+"""
+TekVwarho ProAudit - Entity Backup Tests
+
+Tests for the streaming entity backup archive (NDJSON parts with a
+SHA-256 manifest), its verified single-transaction restore, the
+background backup and restore jobs, and who may run them.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import io
+import json
+import uuid
+import zipfile
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+
+from app.models.entity_backup_job import EntityBackupJob, EntityBackupOperation, EntityBackupStatus
+from app.models.transaction import TransactionType, WRENStatus
+from app.models.user import UserRole
+from app.services import entity_backup_service
+from app.services.entity_backup_service import (
+    BACKUP_TABLES,
+    MANIFEST_NAME,
+    TABLES_BY_NAME,
+    BackupError,
+    column_decoder,
+    encode_row,
+    owned_condition,
+    read_manifest,
+    restore_backup,
+    run_backup_job,
+    scope_condition,
+    verify_archive,
+    write_backup,
+)
+
+SOURCE = uuid.uuid4()
+TARGET = uuid.uuid4()
+USER = uuid.uuid4()
+CATEGORY = uuid.uuid4()
+ACCOUNT_PARENT = uuid.uuid4()
+ACCOUNT_CHILD = uuid.uuid4()
+ORGANIZATION = uuid.uuid4()
+CREATED = datetime(2026, 10, 1, 9, 30, 15, 250000, tzinfo=timezone.utc)
+
+
+def _transaction(n, amount):
+    return {
+        "id": uuid.uuid4(),
+        "entity_id": SOURCE,
+        "transaction_type": TransactionType.EXPENSE,
+        "transaction_date": date(2026, 10, n),
+        "amount": Decimal(amount),
+        "description": f"Diesel {n}",
+        "category_id": CATEGORY,
+        "created_by_id": USER,
+        "wren_status": WRENStatus.REVIEW_REQUIRED,
+        "created_at": CREATED,
+    }
+
+
+SOURCE_ROWS = {
+    "chart_of_accounts": [
+        # The child comes first: its parent is set once the table is in
+        {"id": ACCOUNT_CHILD, "entity_id": SOURCE, "account_code": "1110", "parent_id": ACCOUNT_PARENT},
+        {"id": ACCOUNT_PARENT, "entity_id": SOURCE, "account_code": "1100", "parent_id": None},
+    ],
+    "transactions": [_transaction(1, "1500.50"), _transaction(2, "20.00"), _transaction(3, "7.25")],
+    "audit_logs": [{"id": uuid.uuid4(), "entity_id": SOURCE, "changes": {"amount": ["1", "2"]}}],
+}
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class FakeSession:
+    """Async session stand-in: streams canned rows per table and records writes."""
+
+    def __init__(self, rows=None, existing=(), job=None):
+        self.rows = rows or {}
+        self.existing = set(existing)
+        self.job = job
+        self.executed = []
+        self.inserted = {}
+        self.lookups = []
+        self.isolation = None
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def connection(self, execution_options=None):
+        self.isolation = (execution_options or {}).get("isolation_level")
+
+    async def stream(self, query):
+        rows = self.rows.get(query.get_final_froms()[0].name, [])
+
+        class Result:
+            def mappings(self):
+                return self
+
+            async def partitions(self):
+                for start in range(0, len(rows), 2):
+                    yield rows[start:start + 2]
+
+        return Result()
+
+    async def execute(self, statement, parameters=None):
+        if isinstance(statement, Select):
+            # Id lookups find the rows restored so far plus the pre-existing ones
+            self.lookups.append(_sql(statement))
+            found = self.inserted.get(statement.get_final_froms()[0].name, set()) | self.existing
+            return SimpleNamespace(scalars=lambda: list(found), scalar_one_or_none=lambda: ORGANIZATION)
+        self.executed.append((statement, parameters))
+        if getattr(statement, "is_insert", False) and parameters:
+            self.inserted.setdefault(statement.table.name, set()).update(row["id"] for row in parameters)
+        return SimpleNamespace(rowcount=0)
+
+    async def get(self, model, ident):
+        return self.job
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    def writes(self, table_name):
+        return [
+            parameters for statement, parameters in self.executed
+            if getattr(statement, "table", None) is not None and statement.table.name == table_name
+        ]
+
+
+async def _archive(include_audit=True) -> bytes:
+    sink = io.BytesIO()
+    await write_backup(FakeSession(SOURCE_ROWS), SOURCE, sink, include_audit=include_audit)
+    return sink.getvalue()
+
+
+class TestEncoding:
+    """Test row encoding and scoping."""
+
+    def test_rows_round_trip_through_column_types(self):
+        from app.database import Base
+
+        table = Base.metadata.tables["transactions"]
+        row = SOURCE_ROWS["transactions"][0]
+
+        encoded = json.loads(encode_row(row))
+        decoded = {
+            name: (column_decoder(table.c[name]) or (lambda value: value))(value)
+            for name, value in encoded.items()
+        }
+
+        assert encoded["transaction_type"] == "EXPENSE" and encoded["amount"] == "1500.50"
+        assert decoded == row
+
+    def test_child_tables_are_scoped_through_their_parents(self):
+        sql = _sql(scope_condition(TABLES_BY_NAME["payslip_items"], SOURCE))
+
+        assert sql.startswith("payslip_items.payslip_id IN (SELECT payslips.id")
+        assert "payslips.payroll_run_id IN (SELECT payroll_runs.id" in sql
+        assert "payroll_runs.entity_id = " in sql
+
+
+class TestBackup:
+    """Test the archive."""
+
+    async def test_tables_are_split_into_parts_with_digests(self, monkeypatch):
+        monkeypatch.setattr(entity_backup_service.settings, "backup_part_rows", 2)
+        db = FakeSession(SOURCE_ROWS)
+        sink = io.BytesIO()
+
+        manifest = await write_backup(db, SOURCE, sink)
+
+        assert db.isolation == "REPEATABLE READ"
+        tables = {table["name"]: table for table in manifest["tables"]}
+        assert list(tables) == [spec.name for spec in BACKUP_TABLES]
+        assert tables["customers"]["rows"] == 0 and tables["customers"]["parts"] == []
+        assert [part["rows"] for part in tables["transactions"]["parts"]] == [2, 1]
+        assert tables["transactions"]["parts"][1]["path"] == "transactions/transactions-00002.ndjson"
+
+        with zipfile.ZipFile(sink) as archive:
+            assert read_manifest(archive) == manifest
+            verify_archive(archive, manifest)
+            lines = archive.read("transactions/transactions-00001.ndjson").splitlines()
+            assert json.loads(lines[0])["description"] == "Diesel 1"
+
+    async def test_audit_logs_are_optional(self):
+        with zipfile.ZipFile(io.BytesIO(await _archive(include_audit=False))) as archive:
+            manifest = read_manifest(archive)
+
+        assert "audit_logs" not in [table["name"] for table in manifest["tables"]]
+        assert manifest["include_audit"] is False
+
+
+class TestRestore:
+    """Test restoring an archive into another entity."""
+
+    async def test_rows_are_remapped_and_references_resolved(self):
+        db = FakeSession(existing={CATEGORY})
+
+        with zipfile.ZipFile(io.BytesIO(await _archive())) as archive:
+            restored = await restore_backup(db, archive, TARGET)
+
+        assert restored["transactions"] == 3 and restored["chart_of_accounts"] == 2
+        assert "audit_logs" not in restored
+        accounts = db.writes("chart_of_accounts")
+        assert [row["parent_id"] for row in accounts[0]] == [None, None]
+        assert accounts[1] == [{"row_id": ACCOUNT_CHILD, "target_id": ACCOUNT_PARENT}]
+
+        rows = db.writes("transactions")[0]
+        assert {row["entity_id"] for row in rows} == {TARGET}
+        assert rows[0]["amount"] == Decimal("1500.50") and rows[0]["transaction_type"] == TransactionType.EXPENSE
+        assert rows[0]["created_at"] == CREATED and rows[0]["transaction_date"] == date(2026, 10, 1)
+        # The category exists here; the user does not
+        assert {row["category_id"] for row in rows} == {CATEGORY}
+        assert {row["created_by_id"] for row in rows} == {None}
+        # One lookup per referenced table, values cached after that
+        lookups = {sql.split("FROM ")[1].split()[0]: sql for sql in db.lookups}
+        assert list(lookups) == ["business_entities", "chart_of_accounts", "categories", "users"]
+        assert "chart_of_accounts.entity_id = " in lookups["chart_of_accounts"]
+        # Only the target's own (or shared) rows may be referenced
+        assert "users.organization_id = " in lookups["users"]
+        assert "categories.is_system IS true" in lookups["categories"]
+
+        assert db.writes("audit_logs") == []  # the trail is never taken from an upload
+        tables = [statement.table.name for statement, _ in db.executed]
+        assert tables.index("platform_metrics") == tables.index("transactions") + 1
+        assert tables[-2:] == ["entity_daily_summaries", "entity_daily_summaries"]
+        assert db.commits == 0  # the caller commits
+
+    @pytest.mark.parametrize("table, owned", [
+        ("fiscal_periods", "fiscal_periods.entity_id = "),
+        ("users", "users.organization_id = "),
+        ("categories", "categories.is_system IS true"),
+        ("bank_reconciliations", None),
+    ])
+    def test_external_references_are_limited_to_owned_rows(self, table, owned):
+        from app.database import Base
+
+        condition = owned_condition(Base.metadata.tables[table], TARGET, ORGANIZATION)
+
+        assert (condition is None) if owned is None else owned in _sql(condition)
+
+    async def test_references_to_another_entity_are_rejected(self):
+        foreign_invoice = uuid.uuid4()
+        rows = {
+            "invoice_line_items": [
+                {"id": uuid.uuid4(), "invoice_id": foreign_invoice, "description": "Diesel", "amount": Decimal("1")},
+            ],
+        }
+        sink = io.BytesIO()
+        await write_backup(FakeSession(rows), SOURCE, sink)
+        db = FakeSession(existing={CATEGORY})
+
+        with zipfile.ZipFile(sink) as archive:
+            with pytest.raises(BackupError, match=f"invoice_line_items.invoice_id references invoices rows outside this entity: {foreign_invoice}"):
+                await restore_backup(db, archive, TARGET)
+
+        assert db.writes("invoice_line_items") == []
+        assert "invoices.entity_id = " in db.lookups[-1]
+
+    async def test_corrupt_part_is_rejected_before_writing(self):
+        original = zipfile.ZipFile(io.BytesIO(await _archive()))
+        tampered = io.BytesIO()
+        with zipfile.ZipFile(tampered, "w") as archive:
+            for name in original.namelist():
+                data = original.read(name)
+                if name.startswith("transactions/"):
+                    data = data.replace(b"1500.50", b"9500.50")
+                archive.writestr(name, data)
+        db = FakeSession()
+
+        with zipfile.ZipFile(tampered) as archive:
+            with pytest.raises(BackupError, match="transactions-00001.ndjson does not match"):
+                await restore_backup(db, archive, TARGET)
+
+        assert db.executed == []
+
+    async def test_foreign_archives_are_rejected(self):
+        sink = io.BytesIO()
+        with zipfile.ZipFile(sink, "w") as archive:
+            archive.writestr(MANIFEST_NAME, json.dumps({"format": "proaudit-entity-backup", "version": 99}))
+
+        with zipfile.ZipFile(sink) as archive:
+            with pytest.raises(BackupError, match="Unsupported backup version: 99"):
+                read_manifest(archive)
+
+
+class TestJobs:
+    """Test background backups and restores."""
+
+    def _job(self, operation, **values):
+        fields = dict(
+            id=uuid.uuid4(), entity_id=SOURCE, created_by_id=USER, operation=operation,
+            status=EntityBackupStatus.QUEUED, include_audit=True, file_id=None, filename=None,
+        )
+        fields.update(values)
+        return EntityBackupJob(**fields)
+
+    @pytest.fixture
+    def logged(self, monkeypatch):
+        logged = []
+
+        async def log_backup(db, job, tables):
+            logged.append(tables)
+
+        monkeypatch.setattr(entity_backup_service, "log_backup", log_backup)
+        return logged
+
+    async def test_backup_job_stores_the_archive(self, logged):
+        stored = {}
+
+        async def upload_stream(entity_id, stream, filename, content_type, category):
+            stored["data"] = stream.read()
+            return {"file_id": f"backup/{filename}", "size": len(stored["data"])}
+
+        job = self._job(EntityBackupOperation.BACKUP)
+        db = FakeSession(SOURCE_ROWS, job=job)
+
+        result = await run_backup_job(db, job.id, storage=SimpleNamespace(upload_stream=upload_stream))
+
+        assert result["status"] == "completed" and result["rows"] == 6
+        assert job.status == EntityBackupStatus.COMPLETED and job.size_bytes == len(stored["data"])
+        assert job.file_id.startswith("backup/backup_") and job.manifest["entity_id"] == str(SOURCE)
+        with zipfile.ZipFile(io.BytesIO(stored["data"])) as archive:
+            assert read_manifest(archive) == job.manifest
+        assert db.commits == 3  # running, end of the snapshot, completed
+        assert logged[0]["transactions"] == 3
+
+    async def test_failed_restore_leaves_the_upload(self, tmp_path, logged):
+        path = tmp_path / "backup.zip"
+        path.write_bytes(b"not a zip")
+        deleted = []
+
+        async def delete_file(file_id):
+            deleted.append(file_id)
+
+        storage = SimpleNamespace(get_local_path=lambda file_id: path, delete_file=delete_file)
+        job = self._job(EntityBackupOperation.RESTORE, entity_id=TARGET, file_id="backup/backup.zip")
+        db = FakeSession(job=job)
+
+        result = await run_backup_job(db, job.id, storage=storage)
+
+        assert result["status"] == "failed" and "not a zip archive" in result["error"]
+        assert job.status == EntityBackupStatus.FAILED and db.rollbacks == 1
+        assert deleted == [] and logged == []
+
+    async def test_restore_job_commits_with_its_rows(self, tmp_path, logged, monkeypatch):
+        path = tmp_path / "backup.zip"
+        path.write_bytes(await _archive())
+        rebuilt = []
+
+        async def rebuild_search_documents(db, entity_id):
+            rebuilt.append((entity_id, db.commits))
+
+        async def delete_file(file_id):
+            return None
+
+        monkeypatch.setattr(entity_backup_service.search_index_service, "rebuild_search_documents", rebuild_search_documents)
+        storage = SimpleNamespace(get_local_path=lambda file_id: path, delete_file=delete_file)
+        job = self._job(EntityBackupOperation.RESTORE, entity_id=TARGET, file_id="backup/backup.zip")
+        db = FakeSession(job=job)
+
+        result = await run_backup_job(db, job.id, storage=storage)
+
+        assert result["status"] == "completed" and result["tables"]["transactions"] == 3
+        assert job.row_count == 5 and db.commits == 2  # running; rows with completion
+        assert job.include_audit is False and "audit_logs" not in [table["name"] for table in job.manifest["tables"]]
+        assert rebuilt == [(TARGET, 2)]
+        assert "audit_logs" not in logged[0]
+
+
+class TestPermissions:
+    """Test who may back up, download and restore."""
+
+    @pytest.fixture
+    def exports(self, monkeypatch):
+        from app.routers import exports
+
+        async def allow(*args):
+            return None
+
+        async def enqueue(*args, **kwargs):
+            raise AssertionError("job queued")
+
+        monkeypatch.setattr(exports, "verify_entity_access", allow)
+        monkeypatch.setattr(exports, "enqueue_backup", enqueue)
+        monkeypatch.setattr(exports, "enqueue_restore", enqueue)
+        return exports
+
+    def _upload(self):
+        from starlette.datastructures import UploadFile
+
+        return UploadFile(io.BytesIO(b"PK"), filename="backup.zip")
+
+    async def test_backup_and_download_need_export_permission(self, exports):
+        from fastapi import HTTPException
+
+        auditor = SimpleNamespace(id=USER, role=UserRole.AUDITOR)
+
+        with pytest.raises(HTTPException) as backup:
+            await exports.export_full_backup(SOURCE, include_audit=True, current_user=auditor, db=None)
+        with pytest.raises(HTTPException) as download:
+            await exports.download_backup(SOURCE, uuid.uuid4(), current_user=auditor, db=None)
+
+        assert backup.value.status_code == download.value.status_code == 403
+
+    @pytest.mark.parametrize("role", [UserRole.ACCOUNTANT, UserRole.AUDITOR, UserRole.PAYROLL_MANAGER])
+    async def test_restore_is_owner_or_admin_only(self, exports, role):
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException) as error:
+            await exports.restore_backup(
+                TARGET, file=self._upload(), current_user=SimpleNamespace(id=USER, role=role), db=None,
+            )
+
+        assert error.value.status_code == 403
+
+    async def test_admin_can_restore(self, exports, monkeypatch):
+        queued = []
+        job = EntityBackupJob(
+            id=uuid.uuid4(), entity_id=TARGET, operation=EntityBackupOperation.RESTORE,
+            status=EntityBackupStatus.QUEUED, include_audit=False, filename="backup.zip",
+        )
+
+        async def enqueue(db, entity_id, upload, filename, created_by_id=None):
+            queued.append(filename)
+            return job
+
+        monkeypatch.setattr(exports, "enqueue_restore", enqueue)
+
+        result = await exports.restore_backup(
+            TARGET, file=self._upload(), current_user=SimpleNamespace(id=USER, role=UserRole.ADMIN), db=None,
+        )
+
+        assert queued == ["backup.zip"] and result.status == "queued"
@@ -0,0 +1,168 @@
+"""
+TekVwarho ProAudit - Ghost Worker Record Linkage Tests
+
+Tests for blocking, string-distance scoring and the bulk-inserting ghost
+worker scan.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import random
+import string
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.payroll_advanced import ExceptionSeverity
+from app.services.ghost_worker_linkage import (
+    LinkageRecord,
+    candidate_pairs,
+    jaro_winkler,
+    link_records,
+    normalize_bank,
+    soundex,
+    within_one_edit,
+)
+from app.services.payroll_advanced_service import PayrollAdvancedService
+
+
+def _employee(first, last, dob=None, bvn=None, nin=None, **extra):
+    return SimpleNamespace(
+        id=uuid.uuid4(), first_name=first, middle_name=extra.get("middle"),
+        last_name=last, date_of_birth=dob, bvn=bvn, nin=nin,
+        phone_number=extra.get("phone"), email=extra.get("email"),
+    )
+
+
+def _random_staff(rng, count):
+    names = ["Adebayo", "Chinedu", "Ngozi", "Emeka", "Funke", "Tunde", "Aisha", "Ibrahim",
+             "Kemi", "Olu", "Yusuf", "Zainab", "Bola", "Segun", "Amaka", "Uche"]
+    staff = []
+    for n in range(count):
+        employee = _employee(
+            rng.choice(names) + rng.choice(string.ascii_lowercase),
+            rng.choice(names) + "".join(rng.choices(string.ascii_lowercase, k=3)),
+            dob=date(1970, 1, 1) + timedelta(days=rng.randint(0, 12000)),
+            bvn="22" + "".join(rng.choices(string.digits, k=9)),
+            email=f"staff{n}@example.com",
+        )
+        staff.append(LinkageRecord.build(
+            employee, [("access_bank", "".join(rng.choices(string.digits, k=10)))]
+        ))
+    return staff
+
+
+class TestStringFeatures:
+    """Test normalization and string-distance helpers."""
+
+    def test_soundex(self):
+        assert soundex("Robert") == soundex("Rupert") == "R163"
+        assert soundex("Ashcraft") == "A261"
+        assert soundex("Tymczak") == "T522"
+
+    def test_jaro_winkler(self):
+        assert round(jaro_winkler("martha", "marhta"), 3) == 0.961
+        assert round(jaro_winkler("dwayne", "duane"), 2) == 0.84
+        assert jaro_winkler("abc", "xyz") == 0.0
+
+    def test_within_one_edit(self):
+        assert within_one_edit("22123456789", "22123456798")  # adjacent swap
+        assert within_one_edit("22123456789", "22123456780")  # substitution
+        assert within_one_edit("0123456789", "012345678")  # deletion
+        assert not within_one_edit("22123456789", "22123459876")
+
+    def test_bank_spellings_normalize_together(self):
+        assert normalize_bank("GTBank Plc") == normalize_bank("Guaranty Trust Bank") == normalize_bank("gtbank")
+        assert normalize_bank("first_bank") == normalize_bank("First Bank of Nigeria")
+        assert normalize_bank("zenith_bank") != normalize_bank("uba")
+
+
+class TestRecordLinkage:
+    """Test candidate generation and ranking."""
+
+    def test_flags_near_duplicates(self):
+        dob = date(1988, 4, 12)
+        records = [
+            LinkageRecord.build(_employee("Chinedu", "Okafor", dob, bvn="22123456789")),
+            LinkageRecord.build(_employee("Chinedu", "Okafor", dob, bvn="22123456798")),
+            LinkageRecord.build(_employee("Funke", "Adeyemi"), [("GTBank Plc", "0123456789")]),
+            LinkageRecord.build(_employee("Tayo", "Bello"), [("Guaranty Trust Bank", "0123456789")]),
+            LinkageRecord.build(_employee("Oluwaseun", "Adebayo", date(1990, 1, 5))),
+            LinkageRecord.build(_employee("Oluwasegun", "Adebayo", date(1990, 1, 5))),
+            LinkageRecord.build(_employee("Ngozi", "Eze", date(1975, 3, 3), bvn="22999999999")),
+        ]
+
+        pairs = link_records(records)
+        found = {
+            frozenset((p.record_1.display_name, p.record_2.display_name)): p for p in pairs
+        }
+
+        account = found[frozenset(("Funke Adeyemi", "Tayo Bello"))]
+        assert account.detection_type == "duplicate_account"
+        assert account.shares_identifier and account.features["same_bank"] is True
+        assert found[frozenset(("Chinedu Okafor",))].detection_type == "near_duplicate_bvn"
+        similar = found[frozenset(("Oluwaseun Adebayo", "Oluwasegun Adebayo"))]
+        assert similar.detection_type == "similar_identity"
+        assert len(pairs) == 3
+        # Shared identifiers rank first
+        assert pairs[0] is account
+
+    def test_different_bvns_outweigh_similar_names(self):
+        dob = date(1990, 1, 5)
+        records = [
+            LinkageRecord.build(_employee("Amaka", "Obi", dob, bvn="22111111111")),
+            LinkageRecord.build(_employee("Amaka", "Obi", dob, bvn="22555555555")),
+        ]
+
+        assert link_records(records) == []
+
+    def test_candidate_pairs_stay_near_linear(self):
+        records = _random_staff(random.Random(34), 20_000)
+
+        pairs = candidate_pairs(records)
+
+        assert len(pairs) < 15 * len(records)
+
+
+class TestGhostWorkerScan:
+    """Test the scan persists detections in bulk."""
+
+    @pytest.mark.asyncio
+    async def test_scan_bulk_inserts_and_skips_open_detections(self):
+        dob = date(1985, 6, 1)
+        first = _employee("Emeka", "Nwosu", dob, bvn="22100000001")
+        second = _employee("Emeka", "Nwosu", dob, bvn="22100000001")
+        third = _employee("Emeka", "Nwosu", dob, bvn="22100000010")
+        statements = []
+
+        async def execute(statement, *args, **kwargs):
+            statements.append(statement)
+            result = MagicMock()
+            if len(statements) == 1:
+                result.all.return_value = [first, second, third]
+            elif len(statements) == 2:
+                result.all.return_value = []
+            elif len(statements) == 3:
+                result.all.return_value = [(second.id, first.id)]
+            return result
+
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=execute)
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+
+        summary = await PayrollAdvancedService(db).run_ghost_worker_scan(uuid.uuid4())
+
+        inserts = [s for s in statements if s.is_insert]
+        assert len(inserts) == 1
+        db.refresh.assert_not_awaited()
+        # first/second already has an open detection
+        assert summary["detections_found"] == 2
+        assert summary["critical_detections"] == 0
+        assert {d["detection_type"] for d in summary["detections"]} == {"near_duplicate_bvn"}
+        assert summary["detections"][0]["severity"] == ExceptionSeverity.WARNING.value
+        assert summary["detections"][0]["employee_1_name"] == "Emeka Nwosu"
@@ -0,0 +1,149 @@
+"""
+TekVwarho ProAudit - Keyset Pagination Tests
+
+Tests for opaque cursors, the keyset page query, and the cursor mode of
+the list services.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.transaction import Transaction
+from app.services.audit_service import AuditService
+from app.services.invoice_service import InvoiceService
+from app.services.notification_service import NotificationService
+from app.services.transaction_service import TransactionService
+from app.utils.query_optimization import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+    next_page_cursor,
+)
+
+ENTITY = uuid.uuid4()
+
+
+def _compile(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+class RecordingSession:
+    """Async session stand-in that records queries and returns no rows."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(
+            scalar=lambda: 0,
+            scalars=lambda: SimpleNamespace(all=lambda: []),
+        )
+
+
+class TestCursor:
+    """Test cursor encoding."""
+
+    def test_round_trip_restores_column_types(self):
+        key = (date(2026, 10, 1), datetime(2026, 10, 1, 8, 30, 0, 123456, tzinfo=timezone.utc), uuid.uuid4())
+
+        cursor = encode_cursor(key)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, InvoiceService.PAGE_KEY) == list(key)
+
+    @pytest.mark.parametrize("cursor", [
+        "not base64!",
+        "bm90IGpzb24",  # "not json"
+        encode_cursor(["2026-10-01"]),
+        encode_cursor(["2026-10-01", "not-a-uuid"]),
+        encode_cursor([20261001, str(uuid.uuid4())]),
+    ])
+    def test_malformed_or_foreign_cursors_are_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, TransactionService.PAGE_KEY)
+
+    def test_next_cursor_only_for_full_pages(self):
+        rows = [SimpleNamespace(transaction_date=date(2026, 10, n), id=uuid.uuid4()) for n in (3, 2)]
+
+        assert next_page_cursor(rows, 3, TransactionService.PAGE_KEY) is None
+        assert next_page_cursor([], 2, TransactionService.PAGE_KEY) is None
+        cursor = next_page_cursor(rows, 2, TransactionService.PAGE_KEY)
+        assert decode_cursor(cursor, TransactionService.PAGE_KEY) == [date(2026, 10, 2), rows[1].id]
+
+
+class TestKeysetQuery:
+    """Test the page query."""
+
+    def test_first_page_orders_by_full_key(self):
+        query = keyset_paginate(select(Transaction.id), TransactionService.PAGE_KEY, None, 50)
+        sql = str(_compile(query))
+
+        assert "ORDER BY transactions.transaction_date DESC, transactions.id DESC" in sql
+        assert "WHERE" not in sql and "OFFSET" not in sql
+
+    def test_later_pages_seek_past_the_cursor(self):
+        last_id = uuid.uuid4()
+        cursor = encode_cursor([date(2026, 10, 2), last_id])
+
+        compiled = _compile(keyset_paginate(
+            select(Transaction.id).where(Transaction.entity_id == ENTITY),
+            TransactionService.PAGE_KEY,
+            cursor,
+            50,
+        ))
+
+        assert "(transactions.transaction_date, transactions.id) < (" in str(compiled)
+        assert "OFFSET" not in str(compiled)
+        assert date(2026, 10, 2) in compiled.params.values() and last_id in compiled.params.values()
+
+
+class TestServices:
+    """Test the cursor mode of the list services."""
+
+    async def test_cursor_replaces_offset(self):
+        db = RecordingSession()
+        cursor = encode_cursor([date(2026, 10, 2), uuid.uuid4()])
+
+        await TransactionService(db).get_transactions_for_entity(ENTITY, offset=500, cursor=cursor)
+        await TransactionService(db).get_transactions_for_entity(ENTITY, offset=500)
+
+        keyset, offset = (str(_compile(statement)) for statement in db.statements[1::2])
+        assert "(transactions.transaction_date, transactions.id) <" in keyset and "OFFSET" not in keyset
+        assert "OFFSET" in offset and "transactions.id DESC" in offset
+
+    @pytest.mark.parametrize("service, call", [
+        (InvoiceService, lambda service, cursor: service.get_invoices_for_entity(ENTITY, cursor=cursor)),
+        (AuditService, lambda service, cursor: service.get_audit_logs(ENTITY, cursor=cursor)),
+        (NotificationService, lambda service, cursor: service.get_user_notifications(ENTITY, cursor=cursor)),
+    ])
+    async def test_list_services_page_by_their_key(self, service, call):
+        db = RecordingSession()
+        key = [column.type.python_type for column in service.PAGE_KEY]
+        values = [
+            datetime(2026, 10, 2, tzinfo=timezone.utc) if python_type is datetime
+            else date(2026, 10, 2) if python_type is date
+            else uuid.uuid4()
+            for python_type in key
+        ]
+
+        await call(service(db), encode_cursor(values))
+
+        sql = str(_compile(db.statements[-1]))
+        columns = ", ".join(f"{column.class_.__tablename__}.{column.key}" for column in service.PAGE_KEY)
+        assert f"({columns}) <" in sql and "OFFSET" not in sql
+
+    async def test_invalid_cursor_raises_before_querying(self):
+        db = RecordingSession()
+
+        with pytest.raises(InvalidCursorError):
+            await AuditService(db).get_audit_logs(ENTITY, cursor="garbage")
@@ -0,0 +1,268 @@
+"""
+TekVwarho ProAudit - ML Training Job Tests
+
+Tests for the background training runner, .npz model artifacts and the
+memory-mapped active model cache.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.models.ml_job import MLJobStatus
+from app.services import ml_training_runner
+from app.services.ml_engine import SimpleNeuralNetwork
+from app.services.ml_model_registry import ActiveModelCache, dump_npz, load_npz_mmap
+from app.services.ml_training_runner import build_training_matrix, run_training_job
+
+
+def _records(n=40):
+    return [{"a": i, "b": i % 7, "target": 2 * i + i % 7} for i in range(n)]
+
+
+class FakeStorage:
+    """Local-disk stand-in for FileStorageService."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.uploads = []
+
+    async def upload_file(self, entity_id, file_content, filename, content_type, category, metadata=None):
+        file_id = f"{entity_id}/{category.value}/{len(self.uploads)}_{filename}"
+        path = self.root / file_id
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(file_content)
+        self.uploads.append(file_id)
+        return {"file_id": file_id, "url": f"/uploads/{file_id}"}
+
+    async def download_file(self, file_id):
+        return (self.root / file_id).read_bytes(), "application/x-npz"
+
+    def get_local_path(self, file_id):
+        return self.root / file_id
+
+
+class FakeJobService:
+    """Records MLJobService calls made by the runner."""
+
+    cancel_after_updates = None
+
+    def __init__(self, job):
+        self.job = job
+        self.progress = []
+        self.registered = None
+        self.completed = None
+        self.failed = None
+
+    async def start_job(self, job_id, worker_id=None):
+        self.job.status = MLJobStatus.RUNNING
+        return self.job
+
+    async def get_ml_job(self, job_id):
+        return self.job
+
+    async def update_progress(self, job_id, percent, step=None):
+        self.progress.append((percent, step))
+        if self.cancel_after_updates and len(self.progress) > self.cancel_after_updates:
+            self.job.status = MLJobStatus.CANCELLED
+        return self.job
+
+    async def register_model(self, **kwargs):
+        self.registered = kwargs
+        return SimpleNamespace(id=uuid.uuid4(), version="1.0.0")
+
+    async def complete_job(self, job_id, results=None, metrics=None, output_files=None):
+        self.completed = {"results": results, "metrics": metrics, "output_files": output_files}
+        self.job.status = MLJobStatus.COMPLETED
+
+    async def fail_job(self, job_id, error_message, error_details=None, error_traceback=None):
+        self.failed = error_message
+        self.job.status = MLJobStatus.FAILED
+
+
+async def _queued_job(storage, epochs=300):
+    data = build_training_matrix(_records(), "target", ["a", "b"])
+    dataset = await storage.upload_file(
+        uuid.UUID(int=0), dump_npz(data), "ds.npz", "application/x-npz",
+        ml_training_runner.FileCategory.ML_DATASET,
+    )
+    return SimpleNamespace(
+        id=uuid.uuid4(), job_id="MLJ-TEST", status=MLJobStatus.QUEUED, organization_id=None,
+        input_data_source=dataset["file_id"], model_id=None, output_record_count=0,
+        parameters={
+            "model_name": "revenue", "target_field": "target", "feature_fields": ["a", "b"],
+            "epochs": epochs, "hidden_layers": [8], "activate": True,
+        },
+    )
+
+
+class TestArtifacts:
+    """Test .npz artifacts and network serialization."""
+
+    def test_npz_members_are_memory_mapped(self, tmp_path):
+        arrays = {"w0": np.arange(12, dtype=np.float64).reshape(3, 4),
+                  "b0": np.ones((1, 4), dtype=np.float32),
+                  "f": np.asfortranarray(np.arange(6).reshape(2, 3))}
+        path = tmp_path / "model.npz"
+        path.write_bytes(dump_npz(arrays))
+
+        loaded = load_npz_mmap(path)
+
+        assert set(loaded) == set(arrays)
+        for name, array in arrays.items():
+            assert isinstance(loaded[name], np.memmap)
+            assert loaded[name].dtype == array.dtype
+            np.testing.assert_array_equal(loaded[name], array)
+
+    def test_network_round_trip_does_not_reseed(self, tmp_path):
+        X = np.random.rand(20, 3)
+        network = SimpleNeuralNetwork([3, 5, 1], epochs=5)
+        network.fit(X, X.sum(axis=1, keepdims=True), verbose=False)
+        path = tmp_path / "nn.npz"
+        path.write_bytes(dump_npz(network.to_arrays()))
+
+        np.random.seed(7)
+        restored = SimpleNeuralNetwork.from_arrays(load_npz_mmap(path), activation="relu")
+        draw = np.random.rand()
+
+        np.random.seed(7)
+        assert draw == np.random.rand()
+        assert restored.layer_sizes == [3, 5, 1]
+        np.testing.assert_allclose(restored.predict(X), network.predict(X))
+
+    def test_fit_reports_progress_each_epoch(self):
+        calls = []
+        network = SimpleNeuralNetwork([2, 4, 1], epochs=12)
+
+        network.fit(np.random.rand(10, 2), np.random.rand(10, 1), False, lambda e, l: calls.append(e))
+
+        assert calls == list(range(12))
+
+
+class TestTrainingRunner:
+    """Test the Celery-side training job runner."""
+
+    @pytest.mark.asyncio
+    async def test_trains_stores_and_registers(self, tmp_path, monkeypatch):
+        storage = FakeStorage(tmp_path)
+        job = await _queued_job(storage, epochs=2000)
+        service = FakeJobService(job)
+        monkeypatch.setattr(ml_training_runner, "MLJobService", lambda db: service)
+        monkeypatch.setattr(ml_training_runner.settings, "ml_training_progress_interval_seconds", 0.01)
+
+        result = await run_training_job(MagicMock(), job.id, storage=storage)
+
+        assert result["success"] is True
+        assert job.status == MLJobStatus.COMPLETED
+        training_steps = [s for _, s in service.progress if s.startswith("Training epoch")]
+        assert training_steps, "progress was not reported while training"
+        percents = [p for p, _ in service.progress]
+        assert percents == sorted(percents)
+
+        registered = service.registered
+        assert registered["name"] == "revenue" and registered["activate"] is True
+        assert registered["feature_columns"] == ["a", "b"]
+        assert registered["hyperparameters"]["layer_sizes"] == [2, 8, 1]
+        assert service.completed["output_files"] == [registered["artifact_path"]]
+
+        weights = load_npz_mmap(storage.get_local_path(registered["artifact_path"]))
+        assert sorted(weights) == ["b0", "b1", "w0", "w1"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_stops_training(self, tmp_path, monkeypatch):
+        storage = FakeStorage(tmp_path)
+        job = await _queued_job(storage, epochs=5000)
+        service = FakeJobService(job)
+        service.cancel_after_updates = 2
+        monkeypatch.setattr(ml_training_runner, "MLJobService", lambda db: service)
+        monkeypatch.setattr(ml_training_runner.settings, "ml_training_progress_interval_seconds", 0.01)
+
+        result = await run_training_job(MagicMock(), job.id, storage=storage)
+
+        assert result == {"success": False, "job_id": str(job.id), "error": "cancelled"}
+        assert service.registered is None and service.completed is None
+        assert job.status == MLJobStatus.CANCELLED
+
+    @pytest.mark.asyncio
+    async def test_failure_marks_job_failed(self, tmp_path, monkeypatch):
+        storage = FakeStorage(tmp_path)
+        job = await _queued_job(storage)
+        job.input_data_source = "missing.npz"
+        service = FakeJobService(job)
+        monkeypatch.setattr(ml_training_runner, "MLJobService", lambda db: service)
+        db = MagicMock(rollback=AsyncMock())
+
+        result = await run_training_job(db, job.id, storage=storage)
+
+        assert result["success"] is False
+        assert job.status == MLJobStatus.FAILED and service.failed
+
+
+class TestActiveModelCache:
+    """Test lazy loading and version switching."""
+
+    def _db(self, rows):
+        result = MagicMock()
+        result.first.side_effect = lambda: rows[0]
+        return MagicMock(execute=AsyncMock(return_value=result))
+
+    async def _artifact(self, storage, scale):
+        network = SimpleNeuralNetwork([2, 3, 1])
+        arrays = {k: v * scale for k, v in network.to_arrays().items()}
+        stored = await storage.upload_file(
+            uuid.UUID(int=0), dump_npz(arrays), "m.npz", "application/x-npz",
+            ml_training_runner.FileCategory.ML_MODEL,
+        )
+        return stored["file_id"]
+
+    def _row(self, artifact_path, version):
+        return SimpleNamespace(
+            id=uuid.uuid4(), version=version, algorithm="SimpleNeuralNetwork",
+            artifact_path=artifact_path, hyperparameters={"activation": "relu"},
+            feature_columns=["a", "b"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_reloads_when_new_version_is_activated(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        rows = [self._row(await self._artifact(storage, 1.0), "1.0.0")]
+        db = self._db(rows)
+        cache = ActiveModelCache(refresh_seconds=60, storage=storage)
+
+        first = await cache.get(db, "revenue")
+        assert await cache.get(db, "revenue") is first
+        assert db.execute.await_count == 1
+        assert isinstance(first.arrays["w0"], np.memmap)
+
+        # Another process activates version 2; visible after invalidation/refresh
+        rows[0] = self._row(await self._artifact(storage, 2.0), "2.0.0")
+        assert await cache.get(db, "revenue") is first
+        cache.invalidate("revenue")
+        second = await cache.get(db, "revenue")
+
+        assert second.version == "2.0.0" and second is not first
+        np.testing.assert_allclose(second.arrays["w0"], first.arrays["w0"] * 2)
+
+    @pytest.mark.asyncio
+    async def test_same_version_is_not_remapped(self, tmp_path):
+        storage = FakeStorage(tmp_path)
+        db = self._db([self._row(await self._artifact(storage, 1.0), "1.0.0")])
+        cache = ActiveModelCache(refresh_seconds=0, storage=storage)
+
+        first = await cache.get(db, "revenue")
+        again = await cache.get(db, "revenue")
+
+        assert again is first and db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_no_active_model(self, tmp_path):
+        cache = ActiveModelCache(refresh_seconds=0, storage=FakeStorage(tmp_path))
+
+        assert await cache.get(self._db([None]), "revenue") is None
@@ -0,0 +1,166 @@
+"""
+TekVwarho ProAudit - Bulk Notification Tests
+
+Tests for NotificationService.notify_bulk: recipient resolution, multi-row
+inserts, batched email delivery and template rendering.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.notification import NotificationPriority, NotificationType
+from app.services.notification_service import (
+    NOTIFICATION_TEMPLATES,
+    BulkNotification,
+    EntityAudience,
+    NotificationService,
+    OrganizationAudience,
+)
+
+
+def _result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def _make_service(resolution_rows):
+    """NotificationService over a mock session whose first query resolves recipients."""
+    db = MagicMock()
+    statements = []
+
+    async def execute(statement, *args, **kwargs):
+        statements.append(statement)
+        if len(statements) == 1:
+            return _result(resolution_rows)
+        return _result([])
+
+    db.execute = AsyncMock(side_effect=execute)
+    db.commit = AsyncMock()
+    service = NotificationService(db)
+    service.email_service = MagicMock()
+    service.email_service.send_batch = AsyncMock(side_effect=lambda msgs: [True] * len(msgs))
+    return service, db, statements
+
+
+class TestNotificationTemplates:
+    """Test template rendering matches the single-notification helpers."""
+
+    def test_invoice_overdue_render(self):
+        content = NOTIFICATION_TEMPLATES["invoice_overdue"].render({
+            "invoice_number": "INV-001",
+            "customer_name": "Dangote Ltd",
+            "amount": 150000.0,
+            "days_overdue": 7,
+        })
+        assert content["notification_type"] == NotificationType.INVOICE_OVERDUE
+        assert content["priority"] == NotificationPriority.HIGH
+        assert content["message"] == "Invoice INV-001 for Dangote Ltd (₦150,000.00) is 7 days overdue."
+        assert content["action_url"] == "/invoices?search=INV-001"
+
+    def test_vat_priority_depends_on_days(self):
+        template = NOTIFICATION_TEMPLATES["vat_reminder"]
+        base = {"period": "May 2026", "deadline": "June 21, 2026", "vat_amount": None}
+        assert template.render({**base, "days_until": 2})["priority"] == NotificationPriority.URGENT
+        assert template.render({**base, "days_until": 6})["priority"] == NotificationPriority.HIGH
+
+    def test_usage_alert_title(self):
+        content = NOTIFICATION_TEMPLATES["usage_alert"].render({
+            "metric_name": "Invoices", "threshold": "100", "message": "Limit reached",
+        })
+        assert content["title"] == "Usage Alert: Invoices"
+        assert content["priority"] == NotificationPriority.URGENT
+
+    @pytest.mark.parametrize("threshold, notification_type, priority", [
+        ("80", NotificationType.INFO, NotificationPriority.NORMAL),
+        ("90", NotificationType.WARNING, NotificationPriority.HIGH),
+        ("100", NotificationType.WARNING, NotificationPriority.URGENT),
+    ])
+    def test_usage_alert_type_depends_on_threshold(self, threshold, notification_type, priority):
+        content = NOTIFICATION_TEMPLATES["usage_alert"].render({
+            "metric_name": "Invoices", "threshold": threshold, "message": "Usage is high",
+        })
+        assert content["notification_type"] == notification_type
+        assert content["priority"] == priority
+
+
+class TestNotifyBulk:
+    """Test bulk fan-out round trips."""
+
+    @pytest.mark.asyncio
+    async def test_constant_round_trips(self):
+        entity_a, entity_b = uuid.uuid4(), uuid.uuid4()
+        users = [(entity_a, uuid.uuid4(), f"a{i}@x.com") for i in range(3)]
+        users += [(entity_b, uuid.uuid4(), "b@x.com")]
+        service, db, statements = _make_service(users)
+
+        items = [
+            BulkNotification(
+                EntityAudience(entity),
+                "low_stock",
+                {"item_id": None, "item_name": f"Item {n}", "current_stock": 1, "reorder_level": 5},
+            )
+            for n, entity in enumerate([entity_a, entity_a, entity_b] * 10)
+        ]
+        summary = await service.notify_bulk(items)
+
+        # 20 items for entity A (3 users) + 10 for entity B (1 user)
+        assert summary["notifications_created"] == 70
+        # 1 recipient join + 1 multi-row insert, independent of item count
+        assert len(statements) == 2
+        db.commit.assert_awaited_once()
+
+        insert_sql = str(statements[1].compile(dialect=postgresql.dialect()))
+        assert insert_sql.startswith("INSERT INTO notifications")
+        assert insert_sql.count("VALUES") == 1
+
+    @pytest.mark.asyncio
+    async def test_emails_batched_and_marked(self):
+        entity = uuid.uuid4()
+        service, db, statements = _make_service([
+            (entity, uuid.uuid4(), "owner@x.com"),
+            (entity, uuid.uuid4(), None),
+        ])
+
+        summary = await service.notify_bulk([
+            BulkNotification(
+                EntityAudience(entity),
+                "invoice_overdue",
+                {"invoice_number": "INV-9", "customer_name": "C", "amount": 10.0, "days_overdue": 1},
+                send_email=True,
+            ),
+        ])
+
+        assert summary == {"notifications_created": 2, "emails_sent": 1, "emails_failed": 0}
+        service.email_service.send_batch.assert_awaited_once()
+        (messages,), _ = service.email_service.send_batch.call_args
+        assert messages[0].to == ["owner@x.com"]
+        # resolve + insert + email_sent update
+        assert len(statements) == 3
+
+    @pytest.mark.asyncio
+    async def test_plain_tuples_and_no_commit(self):
+        org = uuid.uuid4()
+        service, db, _ = _make_service([(org, uuid.uuid4(), "u@x.com")])
+
+        summary = await service.notify_bulk(
+            [(OrganizationAudience(org), "usage_alert",
+              {"metric_name": "Users", "threshold": "80", "message": "80% used"})],
+            commit=False,
+        )
+
+        assert summary["notifications_created"] == 1
+        db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_empty_items(self):
+        service, db, statements = _make_service([])
+        summary = await service.notify_bulk([])
+        assert summary["notifications_created"] == 0
+        assert statements == []
@@ -0,0 +1,175 @@
+"""
+TekVwarho ProAudit - NRS Client Pooling Tests
+
+Tests for the pooled NRS client against LocalNRSServer: keep-alive
+connection reuse, bounded bulk concurrency, the adaptive token bucket
+with Retry-After, and the concurrent B2C reporting batch.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services import nrs_service
+from app.services.b2c_reporting_service import B2CReportingService
+from app.services.nrs_service import (
+    LocalNRSServer,
+    NRSRateLimiter,
+    close_nrs_http_clients,
+    get_nrs_client,
+    get_nrs_rate_limiter,
+    parse_retry_after,
+)
+from app.services.tin_verification_cache import clear_tin_caches
+
+
+@pytest.fixture
+def server():
+    with LocalNRSServer(latency=0.02) as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+async def close_clients():
+    clear_tin_caches()
+    yield
+    await close_nrs_http_clients()
+
+
+def _submit(client, number):
+    return client.submit_invoice(
+        seller_tin="1234567890", seller_name="Seller", seller_address="Lagos",
+        buyer_name="Buyer", invoice_number=f"INV-{number}", invoice_date="2026-10-01",
+        subtotal=100.0, vat_amount=7.5, total_amount=107.5, line_items=[],
+    )
+
+
+class TestPooledClient:
+    """Test connection reuse and bounded concurrency."""
+
+    async def test_sequential_requests_share_one_connection(self, server):
+        client = get_nrs_client(api_key="test", base_url=server.url)
+
+        results = [await _submit(client, n) for n in range(10)]
+        again = await _submit(get_nrs_client(api_key="test", base_url=server.url), 10)
+
+        assert all(r.success and r.irn for r in results + [again])
+        assert server.connections == 1 and len(server.requests) == 11
+
+    async def test_bulk_runs_concurrently_within_the_bound(self, server, monkeypatch):
+        monkeypatch.setattr(nrs_service.settings, "nrs_bulk_concurrency", 8)
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_limit_per_second", 1000.0)
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_burst", 100)
+        client = get_nrs_client(api_key="test", base_url=server.url)
+        tins = [f"12345678{n:02d}" for n in range(32)]
+
+        started = time.perf_counter()
+        results = await client.bulk_validate_tins(tins + tins[:5])
+        elapsed = time.perf_counter() - started
+
+        assert [r.tin for r in results] == tins + tins[:5]
+        assert all(r.is_valid for r in results)
+        assert len(server.requests) == 32  # duplicates share one call
+        assert server.connections == 8
+        assert elapsed < 32 * server.latency / 2
+
+    async def test_bulk_returns_exceptions_in_place(self, server):
+        client = get_nrs_client(api_key="test", base_url=server.url)
+
+        async def operation(n):
+            if n == 1:
+                raise RuntimeError("boom")
+            return n
+
+        assert [repr(r) for r in await client.run_bulk([0, 1, 2], operation)] == [
+            "0", "RuntimeError('boom')", "2",
+        ]
+
+
+class TestRateControl:
+    """Test the adaptive token bucket."""
+
+    async def test_throttled_requests_are_retried_after_retry_after(self, monkeypatch):
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_limit_per_second", 100.0)
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_burst", 100)
+        with LocalNRSServer(rate_limit=5) as server:
+            client = get_nrs_client(api_key="test", base_url=server.url)
+
+            started = time.perf_counter()
+            results = await client.run_bulk(range(8), lambda n: _submit(client, n))
+            elapsed = time.perf_counter() - started
+
+            limiter = get_nrs_rate_limiter(server.url)
+            assert all(r.success for r in results)
+            assert server.throttled >= 1 and limiter.throttled >= 1
+            assert limiter.rate < limiter.max_rate
+            assert len(server.requests) == 8
+            assert elapsed < 3
+
+    async def test_gives_up_after_max_retries(self, monkeypatch):
+        monkeypatch.setattr(nrs_service.settings, "nrs_max_retries", 1)
+        with LocalNRSServer(rate_limit=1, retry_after="0") as server:
+            client = get_nrs_client(api_key="test", base_url=server.url)
+            await _submit(client, 0)
+
+            result = await _submit(client, 1)
+
+            assert not result.success and result.raw_response["status_code"] == 429
+            assert server.throttled == 2
+
+    def test_bucket_rate_and_pause(self):
+        limiter = NRSRateLimiter(rate=10, burst=2)
+
+        waits = [limiter._reserve() for _ in range(4)]
+        limiter.on_throttle(retry_after=1.0)
+        paused = limiter._reserve()
+        for _ in range(40):
+            limiter.on_success()
+
+        assert waits[:2] == [0, 0] and waits[3] == pytest.approx(0.2, abs=0.01)
+        assert paused == pytest.approx(1.0, abs=0.01)
+        assert limiter.rate == limiter.max_rate and limiter.throttled == 1
+
+    def test_parse_retry_after(self):
+        future = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        assert parse_retry_after("2") == 2.0
+        assert parse_retry_after(format_datetime(future, usegmt=True)) == pytest.approx(30, abs=2)
+        assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+
+
+class TestBulkCallers:
+    """Test the B2C batch on the pooled client."""
+
+    def _invoice(self, n, entity):
+        return SimpleNamespace(
+            id=uuid.uuid4(), invoice_number=f"INV-{n}", invoice_date=date(2026, 10, 1),
+            total_amount=75000, subtotal=69767.44, vat_amount=5232.56, vat_rate=7.5,
+            customer=None, entity=entity, line_items=[], status="pending", nrs_irn=None,
+            nrs_response=None, b2c_reported_at=None, b2c_report_reference=None,
+        )
+
+    async def test_b2c_reports_are_sent_concurrently_and_committed_once(self, server):
+        entity = SimpleNamespace(id=uuid.uuid4(), tin="1234567890", name="Shop Ltd")
+        invoices = [self._invoice(n, entity) for n in range(12)]
+        entity_result = MagicMock()
+        entity_result.scalar_one_or_none.return_value = entity
+        db = MagicMock(execute=AsyncMock(return_value=entity_result), commit=AsyncMock())
+        service = B2CReportingService(db)
+        service.nrs_client = get_nrs_client(api_key="test", base_url=server.url)
+        service.get_pending_b2c_reports = AsyncMock(return_value=invoices)
+
+        result = await service.submit_all_pending_reports(entity.id)
+
+        assert result["success_count"] == 12 and result["failed_count"] == 0
+        assert all(inv.b2c_report_reference.startswith("B2C-") for inv in invoices)
+        assert db.commit.await_count == 1
+        assert 1 < server.connections <= 10
@@ -0,0 +1,253 @@
+"""
+TekVwarho ProAudit - NRS Outbox Tests
+
+Tests for the NRS submission outbox: enqueueing in the finalize
+transaction, the SKIP LOCKED claim, dispatch outcomes with backoff, and
+the Redis relay that carries IRN notifications to the web process.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import json
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.invoice import InvoiceStatus
+from app.models.nrs_outbox import NRSOutbox, NRSOutboxStatus
+from app.services import nrs_outbox_service
+from app.services.invoice_service import InvoiceService
+from app.services.nrs_outbox_service import (
+    DispatchResult,
+    NRSOutboxDispatcher,
+    backoff_delay,
+    drain_nrs_outbox,
+)
+from app.services.nrs_service import LocalNRSServer, NRSInvoiceResponse, close_nrs_http_clients, get_nrs_client
+from app.services.websocket_manager import (
+    NotificationBroadcaster,
+    WebSocketRelayPublisher,
+    replay_relayed_message,
+)
+
+
+class FakeSession:
+    """Async session stand-in: execute() answers with queued result lists."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.log = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        rows = self.results.pop(0) if self.results else []
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows
+        result.scalar_one_or_none.return_value = rows[0] if rows else None
+        return result
+
+    def add(self, obj):
+        self.log.append(("add", obj))
+
+    async def commit(self):
+        self.log.append(("commit", None))
+
+    async def refresh(self, obj):
+        pass
+
+
+class Broadcaster:
+    def __init__(self):
+        self.events = []
+
+    async def notify_invoice_nrs_status(self, **event):
+        self.events.append(event)
+
+
+ORGANIZATION_ID = uuid.uuid4()
+
+
+def _invoice(n, status=InvoiceStatus.PENDING):
+    entity = SimpleNamespace(
+        tin="1234567890", name="Seller", legal_name=None, address_line1="1 Marina", address_line2=None,
+        city="Lagos", state="Lagos", country="Nigeria", organization_id=ORGANIZATION_ID,
+    )
+    return SimpleNamespace(
+        id=uuid.uuid4(), entity_id=uuid.uuid4(), entity=entity, invoice_number=f"INV-{n}",
+        invoice_date=date(2026, 10, 1), subtotal=1000, vat_amount=75, total_amount=1075, vat_rate=7.5,
+        customer=None, line_items=[], status=status, nrs_irn=None, nrs_qr_code_data=None, nrs_response=None,
+    )
+
+
+def _row(invoice, attempts=0):
+    return NRSOutbox(
+        id=uuid.uuid4(), invoice_id=invoice.id, entity_id=invoice.entity_id,
+        status=NRSOutboxStatus.PENDING, attempts=attempts, next_attempt_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture(autouse=True)
+async def close_clients():
+    yield
+    await close_nrs_http_clients()
+
+
+class TestEnqueue:
+    """Test that finalizing and resubmitting only write the outbox."""
+
+    async def test_finalize_writes_outbox_row_in_the_same_commit(self, monkeypatch):
+        invoice = _invoice(1, status=InvoiceStatus.DRAFT)
+        db = FakeSession([])
+        service = InvoiceService(db)
+        service.get_invoice_by_id = AsyncMock(return_value=invoice)
+        monkeypatch.setattr(nrs_outbox_service, "wake_nrs_dispatcher", lambda: db.log.append(("wake", None)))
+        user_id = uuid.uuid4()
+
+        await service.finalize_invoice(invoice.id, invoice.entity_id, user_id, post_to_gl=False)
+
+        assert [event for event, _ in db.log] == ["add", "commit", "wake"]
+        row = db.log[0][1]
+        assert (row.invoice_id, row.entity_id, row.requested_by_id) == (invoice.id, invoice.entity_id, user_id)
+        assert row.status == NRSOutboxStatus.PENDING and row.attempts == 0
+        assert invoice.status == InvoiceStatus.PENDING
+
+    async def test_resubmit_requeues_without_calling_nrs(self, monkeypatch):
+        invoice = _invoice(2, status=InvoiceStatus.REJECTED)
+        queued = _row(invoice, attempts=3)
+        queued.next_attempt_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        db = FakeSession([invoice.entity], [queued])
+        service = InvoiceService(db)
+        service.get_invoice_by_id = AsyncMock(return_value=invoice)
+        monkeypatch.setattr(nrs_outbox_service, "wake_nrs_dispatcher", lambda: None)
+
+        result = await service.submit_to_nrs(invoice.id, invoice.entity_id, uuid.uuid4())
+
+        assert result["success"] and result["outbox_id"] == str(queued.id)
+        assert invoice.status == InvoiceStatus.PENDING
+        assert queued.next_attempt_at <= datetime.now(timezone.utc)  # made due, not duplicated
+        assert [event for event, _ in db.log] == ["commit"]
+
+    async def test_resubmit_validates_b2b_customer_tin(self):
+        invoice = _invoice(3)
+        invoice.customer = SimpleNamespace(name="Buyer Ltd", address=None, is_business=True, tin=None)
+        service = InvoiceService(FakeSession([invoice.entity]))
+        service.get_invoice_by_id = AsyncMock(return_value=invoice)
+
+        with pytest.raises(ValueError, match="customer TIN"):
+            await service.submit_to_nrs(invoice.id, invoice.entity_id, uuid.uuid4())
+
+
+class TestDispatcher:
+    """Test claiming and settling outbox batches."""
+
+    def test_claim_skips_rows_locked_by_other_dispatchers(self):
+        sql = str(NRSOutboxDispatcher.claim_statement(25).compile(dialect=postgresql.dialect()))
+
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "nrs_outbox.next_attempt_at <= now()" in sql
+        assert "ORDER BY nrs_outbox.next_attempt_at" in sql and "LIMIT" in sql
+
+    async def test_delivers_irns_and_publishes_them(self):
+        invoices = [_invoice(n) for n in range(5)]
+        rows = [_row(invoice) for invoice in invoices]
+        db = FakeSession(rows, invoices)
+        broadcaster = Broadcaster()
+
+        with LocalNRSServer(latency=0.01) as server:
+            client = get_nrs_client(api_key="test", base_url=server.url)
+            outcome = await NRSOutboxDispatcher(db, nrs_client=client, broadcaster=broadcaster).dispatch_batch()
+
+        assert outcome == DispatchResult(claimed=5, delivered=5)
+        assert all(inv.status == InvoiceStatus.SUBMITTED and inv.nrs_irn for inv in invoices)
+        assert all(row.status == NRSOutboxStatus.DELIVERED and row.attempts == 1 for row in rows)
+        assert [row.nrs_irn for row in rows] == [inv.nrs_irn for inv in invoices]
+        assert [event for event, _ in db.log] == ["commit", "commit"]  # claim, settle
+        assert [e["nrs_irn"] for e in broadcaster.events] == [inv.nrs_irn for inv in invoices]
+        assert {e["tenant_id"] for e in broadcaster.events} == {ORGANIZATION_ID}
+        assert len(server.requests) == 5
+
+    async def test_outcomes_retry_reject_and_skip(self, monkeypatch):
+        transient, refused, broken, exhausted, cancelled = invoices = [_invoice(n) for n in range(5)]
+        cancelled.status = InvoiceStatus.CANCELLED
+        rows = [_row(inv, attempts=7 if inv is exhausted else 0) for inv in invoices]
+        db = FakeSession(rows, invoices)
+        broadcaster = Broadcaster()
+        client = get_nrs_client(api_key="test", base_url="http://127.0.0.1:9")
+
+        async def submit_invoice(invoice_number, **fields):
+            if invoice_number == broken.invoice_number:
+                raise RuntimeError("connection reset")
+            status_code = 422 if invoice_number == refused.invoice_number else 503
+            return NRSInvoiceResponse(
+                success=False, response_code="99", message=f"HTTP {status_code}",
+                raw_response={"error": True, "status_code": status_code},
+            )
+
+        monkeypatch.setattr(client, "submit_invoice", submit_invoice)
+        started = datetime.now(timezone.utc)
+
+        outcome = await NRSOutboxDispatcher(
+            db, nrs_client=client, broadcaster=broadcaster, max_attempts=8,
+        ).dispatch_batch()
+
+        assert outcome == DispatchResult(claimed=5, rejected=2, retried=2, skipped=1)
+        for inv, row in ((transient, rows[0]), (broken, rows[2])):
+            assert inv.status == InvoiceStatus.PENDING and row.status == NRSOutboxStatus.PENDING
+            assert started < row.next_attempt_at <= started + timedelta(seconds=31)
+        assert rows[2].last_error == "connection reset"
+        assert refused.status == InvoiceStatus.REJECTED and refused.nrs_response["status_code"] == 422
+        assert exhausted.status == InvoiceStatus.REJECTED and rows[3].last_error.startswith("Gave up after 8")
+        assert rows[4].status == NRSOutboxStatus.FAILED and cancelled.status == InvoiceStatus.CANCELLED
+        assert [e["invoice_number"] for e in broadcaster.events] == ["INV-1", "INV-3"]
+        assert {e["status"] for e in broadcaster.events} == {"rejected"}
+
+    def test_backoff_has_full_jitter_under_an_exponential_cap(self):
+        rng = random.Random(3)
+
+        delays = {n: [backoff_delay(n, base=10, cap=300, rng=rng) for _ in range(200)] for n in (1, 3, 6, 40)}
+
+        assert all(0 <= d <= 10 for d in delays[1]) and max(delays[1]) > 9
+        assert all(0 <= d <= 40 for d in delays[3]) and max(delays[3]) > 35
+        assert max(delays[6]) <= 300 and max(delays[40]) <= 300
+        assert len({round(d, 6) for d in delays[3]}) == 200  # no two invoices retry together
+
+    async def test_drain_stops_when_a_batch_is_not_full(self, monkeypatch):
+        passes = iter([DispatchResult(claimed=2, delivered=2), DispatchResult(claimed=2, retried=2),
+                       DispatchResult(claimed=1, delivered=1)])
+        monkeypatch.setattr(NRSOutboxDispatcher, "dispatch_batch", lambda self: AsyncMock(return_value=next(passes))())
+
+        summary = await drain_nrs_outbox(FakeSession(), nrs_client=MagicMock(), broadcaster=Broadcaster(), batch_size=2)
+
+        assert summary == {"claimed": 5, "delivered": 3, "rejected": 0, "retried": 2, "skipped": 0, "batches": 3}
+
+
+class TestRelay:
+    """Test the worker -> web process WebSocket relay."""
+
+    async def test_broadcast_from_worker_reaches_local_manager(self):
+        redis = MagicMock(publish=AsyncMock())
+        invoice_id = uuid.uuid4()
+
+        await NotificationBroadcaster(WebSocketRelayPublisher(redis)).notify_invoice_nrs_status(
+            tenant_id=ORGANIZATION_ID, invoice_id=invoice_id, invoice_number="INV-9",
+            status="submitted", nrs_irn="NGN123",
+        )
+        channel, payload = redis.publish.await_args.args
+        manager = MagicMock(send_to_tenant=AsyncMock())
+        await replay_relayed_message(manager, payload)
+
+        assert channel == "ws:relay"
+        kwargs = manager.send_to_tenant.await_args.kwargs
+        assert kwargs["tenant_id"] == ORGANIZATION_ID and kwargs["event_type"] == "invoice_nrs_status"
+        assert kwargs["data"]["nrs_irn"] == "NGN123" and kwargs["channel"] == "invoices"
+
+    async def test_relay_only_replays_send_methods(self):
+        with pytest.raises(ValueError):
+            await replay_relayed_message(MagicMock(), json.dumps({"method": "disconnect", "kwargs": {}}))
@@ -0,0 +1,199 @@
+"""
+TekVwarho ProAudit - OCR Batch Pipeline Tests
+
+Tests for concurrent batch OCR: in-batch deduplication, the content-hash
+result cache, bounded provider concurrency, page-level parallelism for
+multi-page TIFFs and progress events.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import asyncio
+import io
+
+import pytest
+
+from app.services import advanced_ocr_service as ocr
+from app.services.advanced_ocr_service import (
+    AdvancedOCRService,
+    DocumentType,
+    ExtractedAddress,
+    ExtractedDocument,
+    ExtractedLineItem,
+    ExtractedVendor,
+    OCRProvider,
+)
+
+
+class FakeCache:
+    """In-memory stand-in for the CacheService JSON helpers."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get_json(self, key):
+        return self.values.get(key)
+
+    async def set_json(self, key, value, ttl=None):
+        self.values[key] = value
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr("app.services.cache_service.get_cache_service", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def service(cache, monkeypatch):
+    monkeypatch.setattr(AdvancedOCRService, "_determine_provider", lambda self: OCRProvider.INTERNAL)
+    service = AdvancedOCRService()
+    service.calls = []
+    service.running = service.peak = 0
+
+    async def fake_internal(file_content, filename):
+        service.calls.append(filename)
+        page = len(service.calls)
+        service.running += 1
+        service.peak = max(service.peak, service.running)
+        await asyncio.sleep(0.02)
+        service.running -= 1
+        if b"corrupt" in file_content:
+            raise RuntimeError("unreadable document")
+        return ExtractedDocument(
+            document_type=DocumentType.RECEIPT,
+            vendor=ExtractedVendor(name="Shoprite", address=ExtractedAddress(full_address="Lekki")),
+            line_items=[ExtractedLineItem(description=f"Item {page}", amount=100.0)],
+            total_amount=100.0 * page,
+            raw_text=f"page {page}",
+            confidence_score=0.8,
+        )
+
+    service._process_internal = fake_internal
+    return service
+
+
+def _tiff(pages):
+    from PIL import Image
+
+    frames = [Image.new("L", (40, 20), color=40 * i) for i in range(pages)]
+    output = io.BytesIO()
+    frames[0].save(output, format="TIFF", save_all=True, append_images=frames[1:])
+    return output.getvalue()
+
+
+class TestBatchProcess:
+    """Test concurrent batch processing."""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_in_a_batch_are_processed_once(self, service):
+        events = []
+
+        async def progress(event):
+            events.append(event)
+
+        results = await service.batch_process(
+            [(b"receipt-a", "a.jpg", "image/jpeg"), (b"receipt-b", "b.jpg", "image/jpeg"),
+             (b"receipt-a", "a-again.jpg", "image/jpeg")],
+            preprocess=False,
+            progress_callback=progress,
+        )
+
+        assert sorted(service.calls) == ["a.jpg", "b.jpg"]
+        assert [r.cache_hit for r in results] == [False, False, True]
+        assert results[2].document_id == results[0].document_id
+        assert results[2] is not results[0]
+        assert [e["completed"] for e in events] == [1, 2, 3]
+        assert {e["filename"]: e["status"] for e in events} == {
+            "a.jpg": "processed", "b.jpg": "processed", "a-again.jpg": "cached",
+        }
+
+    @pytest.mark.asyncio
+    async def test_provider_concurrency_is_bounded(self, service, monkeypatch):
+        monkeypatch.setattr(ocr.settings, "ocr_provider_concurrency", 2)
+        files = [(f"receipt-{i}".encode(), f"{i}.png", "image/png") for i in range(6)]
+
+        results = await service.batch_process(files, preprocess=False)
+
+        assert len(service.calls) == 6 and all(not r.cache_hit for r in results)
+        assert service.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_file_does_not_fail_the_batch(self, service):
+        results = await service.batch_process(
+            [(b"corrupt", "bad.png", "image/png"), (b"fine", "ok.png", "image/png")],
+            preprocess=False,
+        )
+
+        assert results[0].provider == "error" and "unreadable document" in results[0].warnings
+        assert results[1].total_amount is not None
+        # Failures are not cached, the next attempt retries
+        await service.batch_process([(b"corrupt", "bad.png", "image/png")], preprocess=False)
+        assert service.calls.count("bad.png") == 2
+
+
+class TestResultCache:
+    """Test the content-hash result cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_upload_is_served_from_cache(self, service):
+        first = await service.process_document(b"receipt", "r.jpg", "image/jpeg", preprocess=False)
+        first.total_amount = -1  # callers may mutate their copy
+        again = await service.process_document(b"receipt", "r2.jpg", "image/jpeg", preprocess=False)
+
+        assert service.calls == ["r.jpg"]
+        assert again.cache_hit and again.total_amount == 100.0
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_survives_a_new_process(self, service, cache, monkeypatch):
+        first = await service.process_document(b"receipt", "r.jpg", "image/jpeg", DocumentType.RECEIPT, False)
+        fresh = AdvancedOCRService()
+
+        again = await fresh.process_document(b"receipt", "r.jpg", "image/jpeg", DocumentType.RECEIPT, False)
+
+        assert again.cache_hit
+        assert again.vendor == first.vendor and again.line_items == first.line_items
+        assert again.document_type == DocumentType.RECEIPT
+
+    @pytest.mark.asyncio
+    async def test_document_type_is_part_of_the_key(self, service):
+        await service.process_document(b"doc", "d.pdf", "image/png", DocumentType.RECEIPT, False)
+        await service.process_document(b"doc", "d.pdf", "image/png", DocumentType.INVOICE, False)
+
+        assert len(service.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded(self, service, monkeypatch):
+        monkeypatch.setattr(ocr.settings, "ocr_result_cache_size", 3)
+
+        await service.batch_process(
+            [(f"r{i}".encode(), f"{i}.png", "image/png") for i in range(5)], preprocess=False
+        )
+
+        assert len(service._result_cache) == 3
+
+
+class TestPageSplitting:
+    """Test page-level parallelism for multi-page documents."""
+
+    @pytest.mark.asyncio
+    async def test_multi_page_tiff_pages_run_in_parallel(self, service):
+        result = await service.process_document(_tiff(3), "scan.tiff", "image/tiff", preprocess=False)
+
+        assert result.page_count == 3 and len(service.calls) == 3
+        assert service.peak == 3
+        assert [item.description for item in result.line_items] == ["Item 1", "Item 2", "Item 3"]
+        assert result.total_amount == 300.0  # totals from the last page
+        assert result.vendor.name == "Shoprite"
+        assert result.raw_text == "page 1\npage 2\npage 3"
+
+    def test_single_page_and_unknown_documents_are_not_split(self):
+        single = _tiff(1)
+
+        assert AdvancedOCRService().preprocessor.split_pages(single, "image/tiff", 50) == [(single, "image/tiff")]
+        assert AdvancedOCRService().preprocessor.split_pages(b"%PDF-broken", "application/pdf", 50) == [
+            (b"%PDF-broken", "application/pdf")
+        ]
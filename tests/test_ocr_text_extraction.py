@@ -0,0 +1,125 @@
+"""
+TekVwarho ProAudit - OCR Text Extraction Tests
+
+Tests for the single-pass field scanner behind TextExtractor: field
+candidates with positions, label/value pairing and the fields shared
+with OCRService.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+from datetime import date
+
+import pytest
+
+from app.services.advanced_ocr_service import TextExtractor
+from app.services.ocr_service import OCRService
+
+
+RECEIPT = """SHOPRITE NIGERIA LTD
+Plot 5, Admiralty Way, Lekki, Lagos
+TIN: 12345678-01   Tel: 08031234567, +2348091234567
+Email: info@shoprite.ng
+RECEIPT No: RCP-204511
+Date: 15/01/2026
+Rice 5kg        N 12,500.00
+Kitchen 2 towels     3,000
+Subtotal:      15,500.00
+VAT (7.5%):     1,162.50
+Total Amount: NGN 16,662.50
+Acct 0123456789 GTBank
+"""
+
+
+@pytest.fixture
+def extractor():
+    return TextExtractor()
+
+
+class TestScan:
+    """Test the candidate stream of a single scan."""
+
+    def test_candidates_carry_positions(self, extractor):
+        candidates = extractor.scan(RECEIPT)
+
+        for candidate in candidates:
+            assert RECEIPT[candidate.start:candidate.end] == candidate.text_in(RECEIPT)
+        assert [c.start for c in candidates] == sorted(c.start for c in candidates)
+        email = next(c for c in candidates if c.field == "email")
+        assert RECEIPT[email.start:email.end] == "info@shoprite.ng"
+
+    def test_labels_pair_with_the_following_value(self, extractor):
+        amounts = [(c.label, c.value) for c in extractor.scan(RECEIPT) if c.field == "amount"]
+
+        # "Kitchen 2 towels 3,000" has no currency or label, so no amount
+        assert amounts == [("currency", 12500.0), ("subtotal", 15500.0), ("total", 16662.5)]
+
+    def test_label_value_may_sit_on_the_next_line(self, extractor):
+        fields = extractor.extract_all("Grand Total\n  45,000.00\nWHT 5%\n")
+
+        assert fields["total_amount"] == 45000.0
+        assert fields["wht_rate"] == 5.0
+
+    def test_trailing_currency_and_percent_before_label(self, extractor):
+        fields = extractor.extract_all("Paid 2,500 Naira\n7.5% VAT applied")
+
+        assert fields["amounts"] == [("2,500 Naira", 2500.0)]
+        assert fields["vat_rate"] == 7.5
+
+
+class TestExtractAll:
+    """Test extract_all on complete receipts."""
+
+    def test_receipt(self, extractor):
+        fields = extractor.extract_all(RECEIPT)
+
+        assert fields["vendor_name"] == "SHOPRITE NIGERIA LTD"
+        assert fields["tin"] == "1234567801"  # labelled TIN wins over the account number
+        assert fields["phone_numbers"] == ["08031234567", "+2348091234567"]
+        assert fields["email"] == "info@shoprite.ng"
+        assert fields["invoice_number"] == "RCP-204511"
+        assert fields["transaction_date"] == date(2026, 1, 15)
+        assert fields["address"].state == "Lagos"
+        assert fields["address"].full_address == "Plot 5, Admiralty Way, Lekki, Lagos"
+        assert (fields["subtotal"], fields["vat_rate"], fields["total_amount"]) == (15500.0, 7.5, 16662.5)
+
+    @pytest.mark.parametrize("text,field,expected", [
+        ("Invoice #: INV-2026-0042", "invoice_number", "INV-2026-0042"),
+        ("RECEIPT\nChicken Republic", "invoice_number", None),
+        ("Made in Nigeria", "address", None),
+        ("Tax ID 1234567890", "tin", "1234567890"),
+        ("Date 31/02/2026 paid 2026-03-01", "transaction_date", date(2026, 3, 1)),
+        ("Issued 5 March, 2026", "transaction_date", date(2026, 3, 5)),
+        ("VAT: 750.00", "vat_amount", 750.0),
+        ("Total VAT: 750.00", "total_amount", None),
+        ("Sub-Total 900\nTotal 1,000\nChange 0", "total_amount", 1000.0),
+    ])
+    def test_fields(self, extractor, text, field, expected):
+        value = extractor.extract_all(text)[field]
+
+        assert value == expected
+
+    def test_largest_amount_without_a_total_label(self, extractor):
+        assert extractor.extract_all("Bread ₦1,200\nMilk ₦2,300")["total_amount"] == 2300.0
+
+    def test_helpers_agree_with_extract_all(self, extractor):
+        fields = extractor.extract_all(RECEIPT)
+
+        assert extractor.extract_tin(RECEIPT) == fields["tin"]
+        assert extractor.extract_phone(RECEIPT) == fields["phone_numbers"]
+        assert extractor.extract_money(RECEIPT) == fields["amounts"]
+        assert extractor.extract_vat(RECEIPT) == (fields["vat_rate"], fields["vat_amount"])
+        assert extractor.extract_address(RECEIPT) == fields["address"]
+
+
+class TestOCRServiceExtraction:
+    """Test that the receipt OCR service shares the scanner."""
+
+    def test_text_helpers(self):
+        service = OCRService()
+        text = "Ikeja Mall\nTIN 12345678-01\n5 March 2026\nTotal: N5,000.00"
+
+        assert service.extract_tin_from_text(text) == "1234567801"
+        assert service.extract_date_from_text(text) == date(2026, 3, 5)
+        assert service.extract_amount_from_text(text) == 5000.0
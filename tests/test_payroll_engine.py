@@ -0,0 +1,190 @@
+"""
+TekVwarho ProAudit - Batch Payroll Engine Tests
+
+Regression tests: the vectorized payroll run must produce exactly the
+payslips and line items of the per-employee _generate_payslip path.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import random
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.models.payroll import Payslip, PayslipItem
+from app.services.payroll_engine import CompiledBandTable, PayrollBatchEngine
+from app.services.payroll_service import PayrollService
+from app.services.tax_calculators.paye_service import PAYECalculator
+
+
+PAYSLIP_FIELDS = [
+    "basic_salary", "housing_allowance", "transport_allowance", "other_earnings",
+    "gross_pay", "paye_tax", "pension_employee", "nhf", "other_deductions",
+    "total_deductions", "net_pay", "pension_employer", "nsitf", "itf",
+    "consolidated_relief", "taxable_income", "earnings_breakdown",
+    "deductions_breakdown", "tax_calculation", "bank_name", "account_number",
+    "days_in_period", "days_worked", "days_absent", "payslip_number",
+]
+ITEM_FIELDS = [
+    "item_type", "category", "name", "amount", "is_statutory", "is_taxable",
+    "is_pensionable", "sort_order",
+]
+
+
+def _naira(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _employee(rng, **overrides):
+    employee = SimpleNamespace(
+        id=uuid.uuid4(),
+        basic_salary=_naira(rng, 30_000, 3_000_000),
+        housing_allowance=_naira(rng, 0, 1_000_000),
+        transport_allowance=_naira(rng, 0, 300_000),
+        other_allowances=None,
+        is_pension_exempt=rng.random() < 0.15,
+        is_nhf_exempt=rng.random() < 0.15,
+        bank_accounts=[],
+    )
+    if rng.random() < 0.4:
+        employee.other_allowances = {
+            "leave_allowance": float(_naira(rng, 0, 200_000)),
+            "entertainment": float(_naira(rng, 1, 50_000)),
+        }
+    if rng.random() < 0.3:
+        employee.bank_accounts = [SimpleNamespace(
+            is_primary=True, is_active=True, bank_name="GTBank",
+            account_number="0123456789", account_name="Test Staff",
+        )]
+    for key, value in overrides.items():
+        setattr(employee, key, value)
+    return employee
+
+
+def _population(seed=2026, size=400):
+    rng = random.Random(seed)
+    employees = [_employee(rng) for _ in range(size)]
+    # Edge cases: zero basic (calculator's 60% default), minimum wage,
+    # sub-kobo allowance, very high earners (near MAX_VECTOR_ANNUAL_GROSS)
+    # and a gross above it (scalar fallback)
+    employees += [
+        _employee(rng, basic_salary=Decimal("0.00")),
+        _employee(rng, basic_salary=Decimal("70000.00"), housing_allowance=Decimal("0.00"),
+                  transport_allowance=Decimal("0.00")),
+        _employee(rng, other_allowances={"bonus": 1000.125}),
+        _employee(rng, basic_salary=Decimal("40000000.00")),
+        _employee(rng, basic_salary=Decimal("8000000000.01")),
+        _employee(rng, basic_salary=Decimal("12000000000.00")),
+        _employee(rng, basic_salary=Decimal("66666.67"), is_pension_exempt=True, is_nhf_exempt=True),
+    ]
+    return employees
+
+
+async def _per_employee_path(service, payroll_run, employees, days):
+    added = []
+    service.db.add = MagicMock(side_effect=added.append)
+    service.db.flush = AsyncMock()
+    for sequence, employee in enumerate(employees, start=1):
+        await service._generate_payslip(
+            payroll_run=payroll_run,
+            employee=employee,
+            payslip_number=f"PAY-2026-10-001-{sequence:04d}",
+            days_in_period=days,
+        )
+    payslips = [obj for obj in added if isinstance(obj, Payslip)]
+    items = [obj for obj in added if isinstance(obj, PayslipItem)]
+    return payslips, items
+
+
+class TestPayrollBatchEngine:
+    """Test the vectorized engine against the per-employee path."""
+
+    @pytest.mark.asyncio
+    async def test_matches_per_employee_path(self):
+        service = PayrollService(MagicMock())
+        payroll_run = SimpleNamespace(id=uuid.uuid4())
+        employees = _population()
+
+        expected_payslips, expected_items = await _per_employee_path(
+            service, payroll_run, employees, days=31
+        )
+        payslip_rows, item_rows = service._build_payslip_rows(
+            payroll_run, employees, "PAY-2026-10-001", days_in_period=31
+        )
+
+        assert len(payslip_rows) == len(expected_payslips)
+        for row, expected in zip(payslip_rows, expected_payslips):
+            for field in PAYSLIP_FIELDS:
+                assert row[field] == getattr(expected, field), (field, expected.payslip_number)
+
+        assert len(item_rows) == len(expected_items)
+        for row, expected in zip(item_rows, expected_items):
+            for field in ITEM_FIELDS:
+                assert row[field] == getattr(expected, field), field
+
+    def test_fallback_rows(self):
+        service = PayrollService(MagicMock())
+        engine = PayrollBatchEngine(service.paye_calculator, service.calculate_salary_breakdown)
+        rng = random.Random(1)
+
+        engine.compute([
+            _employee(rng),
+            _employee(rng, other_allowances={"bonus": 0.005}),
+            _employee(rng, basic_salary=Decimal("50000000.00")),
+            _employee(rng, basic_salary=Decimal("10000000000.00")),
+        ])
+
+        assert engine.vectorized_count == 2
+        assert engine.fallback_count == 2
+
+    def test_band_table_matches_calculator(self):
+        calculator = PAYECalculator()
+        table = CompiledBandTable(calculator.schedule)
+        incomes = [Decimal("0"), Decimal("800000"), Decimal("800000.00001"),
+                   Decimal("2400000"), Decimal("5123456.78901"), Decimal("99000000")]
+
+        units = np.array([int(i * 100_000) for i in incomes], dtype=np.int64)
+        for income, tax_units in zip(incomes, table.tax(units).tolist()):
+            expected, _ = calculator.calculate_tax(income)
+            assert Decimal(tax_units) / 10_000_000 == expected
+
+    @pytest.mark.asyncio
+    async def test_create_payroll_run_bulk_inserts(self):
+        rng = random.Random(7)
+        employees = [_employee(rng) for _ in range(2500)]
+        db = MagicMock()
+        statements = []
+
+        async def execute(statement, *args, **kwargs):
+            statements.append(statement)
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = None
+            result.scalar.return_value = 0
+            result.scalars.return_value.all.return_value = employees
+            return result
+
+        db.execute = AsyncMock(side_effect=execute)
+        db.flush = AsyncMock()
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.add = MagicMock()
+
+        service = PayrollService(db)
+        payroll_run = await service.create_payroll_run(
+            entity_id=uuid.uuid4(), name="October", period_start=date(2026, 10, 1),
+            period_end=date(2026, 10, 31), payment_date=date(2026, 10, 28),
+        )
+
+        inserts = [s for s in statements if s.is_insert]
+        # A few chunked multi-row inserts instead of 2500 flushes + ~22k adds
+        assert 2 <= len(inserts) <= 20
+        db.flush.assert_awaited_once()
+        assert payroll_run.total_employees == 2500
+        assert payroll_run.total_net_pay == payroll_run.total_gross_pay - payroll_run.total_deductions
@@ -0,0 +1,166 @@
+"""
+TekVwarho ProAudit - Peppol Batch Export Tests
+
+Tests for the streaming Peppol exporter: parity of the incremental UBL
+writer and the spliced JSON with the per-invoice exports, CSID and QR data
+computed in one pass, party block caching, the zip and NDJSON containers,
+and conversion from invoice rows.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import io
+import json
+import uuid
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.models.invoice import VATTreatment
+from app.services.peppol_export_service import (
+    InvoiceTypeCode,
+    PeppolBatchExporter,
+    PeppolExportService,
+    PeppolInvoice,
+    PeppolLineItem,
+    PeppolParty,
+    TaxCategoryCode,
+)
+
+SELLER = PeppolParty(
+    name="Adebayo & Sons <Trading>", tin="1234567890", registration_name="Adebayo and Sons Ltd",
+    street_address="12 Marina", city="Lagos", state="Lagos", postal_code="100001",
+    contact_name="Tunde", contact_email="accounts@adebayo.ng", contact_phone="+2348000000000",
+)
+
+
+def _invoice(n, buyer_tin="9876543210", stamped=True):
+    items = [
+        PeppolLineItem(
+            item_id=f"SKU-{k}", description=f"Cement bag \"grade {k}\" & sand", quantity=Decimal("3"),
+            unit_code="BG", unit_price=Decimal("5000.00"), line_total=Decimal("15000.00"),
+            vat_rate=Decimal("7.5"), vat_amount=Decimal("1125.00"),
+            item_classification_code="2523.29" if k == 1 else None,
+        )
+        for k in range(1, 4)
+    ]
+    invoice = PeppolInvoice(
+        invoice_number=f"INV/2026/{n:05d}", invoice_date=date(2026, 10, 1), due_date=date(2026, 10, 31),
+        invoice_type=InvoiceTypeCode.COMMERCIAL_INVOICE, seller=SELLER,
+        buyer=PeppolParty(name=f"Buyer {n % 3}", tin=buyer_tin, city="Abuja"),
+        line_items=items, subtotal=Decimal("45000.00"), total_vat=Decimal("3375.00"),
+        total_amount=Decimal("48375.00"), payment_terms="Net 30", nrs_irn=f"NGN{n:08d}", notes="Thanks <3",
+    )
+    if stamped:
+        service = PeppolExportService()
+        invoice.nrs_csid = service.generate_csid(invoice)
+        invoice.nrs_qr_code_data = service.generate_qr_code_data(invoice)
+    return invoice
+
+
+def _canonical(xml):
+    return ET.canonicalize(xml, strip_text=True)
+
+
+class TestRendering:
+    """Test that batch documents match the per-invoice exports."""
+
+    def test_ubl_matches_tree_export(self):
+        service = PeppolExportService()
+        b2c = _invoice(2, buyer_tin=None)
+        b2c.payment_terms = b2c.notes = None
+        for invoice in (_invoice(1), b2c):
+            batch = PeppolBatchExporter(service).render_ubl(invoice)
+
+            assert batch.startswith(b'<?xml version="1.0" encoding="UTF-8"?>')
+            assert _canonical(batch.decode()) == _canonical(service.to_ubl_xml(invoice))
+
+    def test_json_matches_tree_export(self):
+        service = PeppolExportService()
+        invoice = _invoice(3)
+
+        line = PeppolBatchExporter(service).render_json(invoice)
+
+        assert b"\n" not in line
+        assert json.loads(line) == json.loads(service.to_json(invoice))
+
+    def test_csid_and_qr_are_computed_once_per_invoice(self):
+        generated_at = datetime(2026, 10, 18, 12, 0, 0)
+        invoice = _invoice(4, stamped=False)
+        exporter = PeppolBatchExporter(generated_at=generated_at)
+
+        csid, qr_data = exporter.stamp(invoice)
+        document = ET.fromstring(exporter.render_ubl(invoice))
+        notes = [note.text for note in document.iter("{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Note")]
+
+        assert csid == PeppolExportService().generate_csid(invoice)
+        assert json.loads(qr_data)["csid"] == csid and json.loads(qr_data)["ts"] == generated_at.isoformat()
+        assert f"NRS-CSID:{csid}" in notes and f"NRS-QR:{qr_data}" in notes
+        assert json.loads(exporter.render_json(invoice))["nrs_compliance"]["qr_code_data"] == qr_data
+
+    def test_party_blocks_are_cached(self):
+        exporter = PeppolBatchExporter()
+
+        for n in range(30):
+            exporter.render_ubl(_invoice(n))
+            exporter.render_json(_invoice(n))
+
+        assert len(exporter._parties) == 4  # one seller, three buyers
+
+
+class TestContainers:
+    """Test the zip and NDJSON streams."""
+
+    def test_zip_is_written_incrementally(self):
+        invoices = [_invoice(n) for n in range(40)]
+
+        chunks = list(PeppolBatchExporter().iter_zip(iter(invoices), "xml"))
+
+        assert len(chunks) > 2  # entries are flushed as they are written
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            assert archive.namelist() == [f"INV_2026_{n:05d}.xml" for n in range(40)]
+            assert archive.testzip() is None
+            root = ET.fromstring(archive.read("INV_2026_00007.xml"))
+        assert root.find("{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}ID").text == "INV/2026/00007"
+
+    async def test_async_ndjson_stream(self):
+        async def source():
+            for n in range(5):
+                yield _invoice(n)
+
+        lines = b"".join([chunk async for chunk in PeppolBatchExporter().aiter_ndjson(source())]).splitlines()
+
+        assert [json.loads(line)["invoice"]["id"] for line in lines] == [f"INV/2026/{n:05d}" for n in range(5)]
+
+
+class TestModelConversion:
+    """Test building Peppol invoices from invoice rows."""
+
+    def test_invoice_from_model(self):
+        entity = SimpleNamespace(
+            name="Shop", legal_name="Shop Nigeria Ltd", tin="1234567890", address_line1="1 Broad St",
+            address_line2="Suite 4", city="Lagos", state="Lagos", email="hi@shop.ng", phone="0800",
+        )
+        row = SimpleNamespace(
+            invoice_number="INV-9", invoice_date=date(2026, 10, 2), due_date=None, is_credit_note=True,
+            entity=entity, customer=None, vat_treatment=VATTreatment.ZERO_RATED, vat_rate=Decimal("0"),
+            line_items=[SimpleNamespace(
+                id=uuid.uuid4(), description="Rice", quantity=Decimal("2"), unit_price=Decimal("100"),
+                subtotal=Decimal("200"), vat_amount=Decimal("0"), total=Decimal("200"),
+            )],
+            currency="NGN", subtotal=Decimal("200"), vat_amount=Decimal("0"), total_amount=Decimal("200"),
+            terms=None, nrs_irn="NGN1", nrs_cryptographic_stamp=None, nrs_qr_code_data=None, notes=None,
+        )
+
+        invoice = PeppolExportService().invoice_from_model(row)
+
+        assert invoice.invoice_type == InvoiceTypeCode.CREDIT_NOTE and invoice.due_date == date(2026, 10, 2)
+        assert invoice.seller.street_address == "1 Broad St, Suite 4"
+        assert invoice.seller.registration_name == "Shop Nigeria Ltd"
+        assert invoice.buyer.name == "Walk-in Customer" and invoice.buyer.tin is None
+        assert invoice.line_items[0].tax_category == TaxCategoryCode.ZERO_RATED
+        assert invoice.line_items[0].line_total == Decimal("200")
+        assert PeppolBatchExporter().render_ubl(invoice)  # renders without a customer
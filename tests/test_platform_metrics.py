@@ -0,0 +1,237 @@
+"""
+TekVwarho ProAudit - Platform Metrics Tests
+
+Tests for the materialized platform counters behind the staff dashboards:
+flush deltas for organizations, users, invoices and tickets, the sharded
+increment and the refresh statements, and dashboard widgets served by one
+read with a freshness timestamp.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.invoice import Invoice
+from app.models.organization import Organization, OrganizationType, SubscriptionTier, VerificationStatus
+from app.models.support_ticket import SupportTicket, TicketPriority, TicketStatus
+from app.models.transaction import Transaction
+from app.models.user import PlatformRole, User
+from app.services.dashboard_service import DashboardService
+from app.services.platform_metrics_service import (
+    increment_statement,
+    metric_deltas,
+    month_key,
+    refresh_platform_metrics,
+)
+
+NOW = datetime(2026, 10, 19, 9, 30)
+
+
+def _persistent(session, obj):
+    """Attach obj as if loaded from the database."""
+    make_transient_to_detached(obj)
+    session.add(obj)
+    return obj
+
+
+def _organization(**values):
+    fields = dict(
+        id=uuid.uuid4(), name="Acme", verification_status=VerificationStatus.SUBMITTED,
+        organization_type=OrganizationType.SME, subscription_tier=SubscriptionTier.FREE, referred_by_code=None,
+    )
+    fields.update(values)
+    return Organization(**fields)
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class QueuedSession:
+    """Async session stand-in returning prepared results in order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        result = MagicMock()
+        rows = self.results.pop(0) if self.results else []
+        result.all.return_value = rows
+        result.one.return_value = rows[0] if rows else None
+        result.scalar.return_value = rows[0][0] if rows else None
+        return result
+
+
+class TestFlushDeltas:
+    """Test the counter deltas computed from a flush."""
+
+    def test_new_rows_use_column_defaults(self):
+        session = Session()
+        session.add_all([
+            Organization(name="New Co", referred_by_code="FRIEND"),
+            User(email="a@example.com", hashed_password="x", first_name="A", last_name="B"),
+            User(email="s@example.com", hashed_password="x", first_name="S", last_name="T",
+                 is_platform_staff=True, platform_role=PlatformRole.MARKETING),
+            SupportTicket(subject="Help", description="Stuck", status=TicketStatus.OPEN,
+                          priority=TicketPriority.CRITICAL),
+        ])
+
+        deltas = metric_deltas(session.new, session.dirty, session.deleted)
+
+        assert deltas == {
+            "organizations.total": 1, "organizations.verification.pending": 1,
+            "organizations.type.small_business": 1, "organizations.tier.free": 1, "organizations.referred": 1,
+            "users.customers": 1, "users.staff": 1, "users.staff_role.marketing": 1,
+            "tickets.open": 1, "tickets.critical_open": 1,
+        }
+
+    def test_status_changes_move_counts(self):
+        session = Session()
+        organization = _persistent(session, _organization())
+        ticket = _persistent(session, SupportTicket(
+            id=uuid.uuid4(), subject="Help", description="Stuck",
+            status=TicketStatus.IN_PROGRESS, priority=TicketPriority.HIGH,
+        ))
+
+        organization.verification_status = VerificationStatus.VERIFIED
+        ticket.status = TicketStatus.RESOLVED
+        deltas = metric_deltas(session.new, session.dirty, session.deleted)
+
+        assert deltas == {
+            "organizations.verification.submitted": -1, "organizations.verification.verified": 1,
+            "tickets.open": -1,
+        }
+
+    def test_invoice_submission_counts_in_its_creation_month(self):
+        session = Session()
+        created = datetime(2026, 9, 30, 23, 0, tzinfo=timezone.utc)
+        invoice = _persistent(session, Invoice(
+            id=uuid.uuid4(), entity_id=uuid.uuid4(), created_at=created, nrs_irn=None, is_nrs_locked=False,
+        ))
+
+        invoice.nrs_irn = "IRN-001"
+        invoice.is_nrs_locked = True
+
+        assert metric_deltas(session.new, session.dirty, session.deleted) == {
+            "invoices.nrs_submitted.2026-09": 1, "invoices.nrs_locked": 1,
+        }
+
+    def test_edits_to_uncounted_attributes_are_ignored(self):
+        session = Session()
+        organization = _persistent(session, _organization())
+        transaction = _persistent(session, Transaction(id=uuid.uuid4(), description="Diesel"))
+
+        organization.name = "Acme Nigeria"
+        organization.verification_status = VerificationStatus.SUBMITTED
+        transaction.description = "Diesel for generator"
+
+        assert metric_deltas(session.new, session.dirty, session.deleted) == {}
+
+    def test_deleted_rows_subtract(self):
+        session = Session()
+        organization = _persistent(session, _organization(referred_by_code="FRIEND"))
+
+        assert metric_deltas([], [], [organization]) == {
+            "organizations.total": -1, "organizations.verification.submitted": -1,
+            "organizations.type.sme": -1, "organizations.tier.free": -1, "organizations.referred": -1,
+        }
+
+
+class TestStatements:
+    """Test the increment and refresh SQL."""
+
+    def test_increment_adds_to_one_shard(self):
+        statement = increment_statement({"users.customers": 2, "organizations.total": 1}, shard=3)
+        sql = _sql(statement)
+        params = statement.compile(dialect=postgresql.dialect()).params
+
+        assert "ON CONFLICT ON CONSTRAINT uq_platform_metrics_metric_shard DO UPDATE" in sql
+        assert "value = (platform_metrics.value + excluded.value)" in sql
+        assert [params["metric_m0"], params["metric_m1"]] == ["organizations.total", "users.customers"]
+        assert params["shard_m0"] == params["shard_m1"] == 3
+
+    async def test_refresh_recounts_and_replaces_every_counter(self):
+        db = QueuedSession(
+            [(VerificationStatus.VERIFIED, OrganizationType.SME, SubscriptionTier.PROFESSIONAL, 4, 1),
+             (VerificationStatus.PENDING, OrganizationType.SCHOOL, None, 2, 0)],
+            [(False, None, True, 10, 3), (True, PlatformRole.ADMIN, False, 2, 2)],
+            [(7, 5, 1, 6)],
+            [(40,)],
+            [(3, 1, 0, 2)],
+        )
+
+        written = await refresh_platform_metrics(db, now=NOW)
+        counted = [_sql(statement) for statement in db.statements[:5]]
+        cleared, inserted = db.statements[5:]
+        params = inserted.compile(dialect=postgresql.dialect()).params
+        values = {params[f"metric_m{n}"]: params[f"value_m{n}"] for n in range(written)}
+
+        assert "GROUP BY organizations.verification_status" in counted[0]
+        assert "count(DISTINCT invoices.created_by_id)" in counted[2]
+        assert _sql(cleared) == "DELETE FROM platform_metrics"
+        assert "refreshed_at = excluded.refreshed_at" in _sql(inserted)
+        assert values["organizations.total"] == 6 and values["organizations.tier.free"] == 2
+        assert values["organizations.verification.verified"] == 4 and values["organizations.referred"] == 1
+        assert values["users.customers"] == 10 and values["users.impersonatable"] == 10
+        assert values["users.new_30d"] == 3 and values["users.staff_role.admin"] == 2
+        assert values["invoices.created.2026-10"] == 7 and values["invoices.creators"] == 6
+        assert values["transactions.created.2026-10"] == 40
+        assert values["tickets.open"] == 3 and values["tickets.resolved_today"] == 2
+
+
+class TestStaffDashboardWidgets:
+    """Test that staff widgets share one read of the counters."""
+
+    async def test_widgets_read_counters_once(self):
+        refreshed = datetime(2026, 10, 19, 9, 15, tzinfo=timezone.utc)
+        month = month_key(datetime.utcnow())
+        db = QueuedSession([
+            ("organizations.total", 12, refreshed, refreshed),
+            ("organizations.verification.verified", 9, refreshed, refreshed),
+            ("organizations.verification.submitted", 3, refreshed, refreshed),
+            ("organizations.tier.free", 5, refreshed, refreshed),
+            ("organizations.tier.professional", 7, refreshed, refreshed),
+            ("users.customers", 40, None, datetime(2026, 10, 19, 9, 20, tzinfo=timezone.utc)),
+            ("users.new_30d", 8, refreshed, refreshed),
+            ("invoices.creators", 10, refreshed, refreshed),
+            (f"transactions.created.{month}", 300, refreshed, refreshed),
+            ("tickets.open", 0, refreshed, refreshed),
+        ])
+        service = DashboardService(db)
+
+        overview = [
+            await service._get_organization_count(), await service._get_user_count(),
+            await service._get_pending_verification_count(),
+        ]
+        tenants = await service._get_tenant_stats()
+        subscriptions = await service._get_subscription_stats()
+        growth = await service._get_user_growth_stats()
+        funnel = await service._get_conversion_funnel()
+        usage = await service._get_usage_metrics()
+        health = await service._get_entity_health_overview()
+        freshness = await service._get_metrics_freshness()
+
+        assert len(db.statements) == 1
+        assert "FROM platform_metrics GROUP BY platform_metrics.metric" in _sql(db.statements[0])
+        assert overview == [12, 40, 3]
+        assert tenants == {"active": 9, "trial": 0, "suspended": 0}
+        assert subscriptions == {"by_tier": {"free": 5, "professional": 7}, "total_paid": 7, "total_free": 5}
+        assert growth == {"total_users": 40, "new_users_30d": 8, "growth_rate": "20.0%"}
+        assert funnel["stages"][-1] == {"name": "First E-Invoice", "count": 10, "rate": "25%"}
+        assert usage["transactions_this_month"] == 300 and usage["invoices_this_month"] == 0
+        assert health["green"]["count"] == 9 and health["yellow"]["count"] == 3
+        assert freshness == {"refreshed_at": refreshed.isoformat(), "updated_at": "2026-10-19T09:20:00+00:00"}
+
+    async def test_freshness_is_empty_before_first_refresh(self):
+        service = DashboardService(QueuedSession([]))
+
+        assert await service._get_organization_count() == 0
+        assert await service._get_metrics_freshness() == {"refreshed_at": None, "updated_at": None}
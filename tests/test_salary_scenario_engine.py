@@ -0,0 +1,188 @@
+"""
+TekVwarho ProAudit - Salary Scenario Engine Tests
+
+Tests that vectorized what-if scenarios give the same totals as running
+the per-employee payslip computation on the adjusted salaries.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import random
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.payroll_advanced_service import PayrollAdvancedService
+from app.services.payroll_engine import PayrollBatchEngine
+from app.services.payroll_service import PayrollService
+from app.services.salary_scenario_engine import (
+    TOTAL_SOURCES,
+    SalaryScenario,
+    SalaryScenarioEngine,
+)
+
+
+def _naira(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _staff(seed=33, size=300):
+    rng = random.Random(seed)
+    staff = []
+    for _ in range(size):
+        staff.append(SimpleNamespace(
+            id=uuid.uuid4(),
+            department=rng.choice(["Finance", "Sales", "Ops", None]),
+            job_grade=rng.choice(["GL-08", "GL-10", "GL-12"]),
+            basic_salary=_naira(rng, 30_000, 2_000_000),
+            housing_allowance=_naira(rng, 0, 500_000),
+            transport_allowance=_naira(rng, 0, 150_000),
+            other_allowances={"leave": float(_naira(rng, 0, 80_000))} if rng.random() < 0.3 else None,
+            is_pension_exempt=rng.random() < 0.1,
+            is_nhf_exempt=rng.random() < 0.1,
+        ))
+    # Scalar-path rows: sub-kobo allowance, and a salary an increase pushes
+    # past the vector bound
+    staff[0].other_allowances = {"bonus": 1000.125}
+    staff[1].basic_salary = Decimal("8000000000.00")
+    staff[1].department = "Finance"
+    return staff
+
+
+def _batch_engine():
+    service = PayrollService(MagicMock())
+    return PayrollBatchEngine(service.paye_calculator, service.calculate_salary_breakdown)
+
+
+def _expected_totals(batch_engine, staff, selected, scenario):
+    """Totals from the per-employee path on adjusted salaries."""
+    baseline = {name: Decimal("0") for name in TOTAL_SOURCES}
+    projected = {name: Decimal("0") for name in TOTAL_SOURCES}
+    for employee in staff:
+        if not selected(employee):
+            continue
+        adjusted = SimpleNamespace(**vars(employee))
+        adjusted.basic_salary = scenario.new_basic(employee.basic_salary)
+        before = batch_engine.scalar_figures(employee)
+        after = batch_engine.scalar_figures(adjusted)
+        for name, (_, attribute) in TOTAL_SOURCES.items():
+            baseline[name] += getattr(before, attribute)
+            projected[name] += getattr(after, attribute)
+    return baseline, projected
+
+
+class TestSalaryScenarioEngine:
+    """Test scenario totals against the per-employee path."""
+
+    @pytest.mark.parametrize("scenario, selected", [
+        (SalaryScenario("all +10%", "percentage", Decimal("10")), lambda e: True),
+        (SalaryScenario("finance +7.25%", "percentage", Decimal("7.25"),
+                        apply_to="department", department="Finance"),
+         lambda e: e.department == "Finance"),
+        (SalaryScenario("GL-10 +25k", "flat_amount", Decimal("25000"),
+                        apply_to="job_grade", job_grade="GL-10"),
+         lambda e: e.job_grade == "GL-10"),
+        (SalaryScenario("cut", "flat_amount", Decimal("-50000.005")), lambda e: True),
+    ])
+    def test_matches_per_employee_path(self, scenario, selected):
+        staff = _staff()
+        batch_engine = _batch_engine()
+        engine = SalaryScenarioEngine(staff, batch_engine)
+
+        result = engine.evaluate(scenario)
+        baseline, projected = _expected_totals(batch_engine, staff, selected, scenario)
+
+        assert result.baseline.headcount == sum(1 for e in staff if selected(e))
+        for name in TOTAL_SOURCES:
+            assert getattr(result.baseline, name) == baseline[name], name
+            assert getattr(result.projected, name) == projected[name], name
+
+    def test_employee_list_and_impact(self):
+        staff = _staff(size=50)
+        engine = SalaryScenarioEngine(staff, _batch_engine())
+        chosen = [staff[5].id, staff[9].id]
+
+        result = engine.evaluate(SalaryScenario(
+            "two staff", "percentage", Decimal("20"),
+            apply_to="employee_list", employee_ids=chosen,
+        ))
+
+        assert result.baseline.headcount == result.projected.headcount == 2
+        assert result.impact["gross"] == result.projected.gross - result.baseline.gross
+        assert result.impact["paye"] > 0
+        assert result.impact["employer_cost"] == (
+            result.impact["gross"] + result.impact["pension_employer"]
+            + result.impact["nsitf"] + result.impact["itf"]
+        )
+
+    @pytest.mark.parametrize("apply_to", ["department", "job_grade", "employee_list"])
+    def test_filter_without_value_selects_everyone(self, apply_to):
+        staff = _staff(size=40)
+        engine = SalaryScenarioEngine(staff, _batch_engine())
+
+        for employee_ids in (None, []):
+            result = engine.evaluate(SalaryScenario(
+                "unfiltered", "percentage", Decimal("5"), apply_to=apply_to, employee_ids=employee_ids,
+            ))
+            assert result.baseline.headcount == len(staff)
+
+    def test_rejects_unknown_increase_type(self):
+        with pytest.raises(ValueError):
+            SalaryScenario("bad", "multiplier", Decimal("2"))
+
+
+class TestSalaryIncreaseSimulation:
+    """Test the service uses exact figures instead of gross multipliers."""
+
+    @pytest.mark.asyncio
+    async def test_simulation_records_exact_totals(self):
+        staff = _staff(size=40)
+        db = MagicMock()
+        result = MagicMock()
+        result.all.return_value = staff
+        db.execute = AsyncMock(return_value=result)
+        db.commit = AsyncMock()
+        db.refresh = AsyncMock()
+        db.add = MagicMock()
+
+        simulation = await PayrollAdvancedService(db).run_salary_increase_simulation(
+            entity_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            simulation_name="10% across the board",
+            increase_type="percentage",
+            increase_value=Decimal("10"),
+        )
+
+        expected = SalaryScenarioEngine(staff, _batch_engine()).evaluate(
+            SalaryScenario("x", "percentage", Decimal("10"))
+        )
+        assert db.execute.await_count == 1
+        assert simulation.baseline_paye == expected.baseline.paye > 0
+        assert simulation.paye_impact == expected.impact["paye"]
+        assert simulation.projected_ctc == expected.projected.employer_cost
+        assert simulation.parameters["employee_count"] == 40
+
+    @pytest.mark.asyncio
+    async def test_invalid_scenario_is_a_bad_request(self):
+        from fastapi import HTTPException
+
+        from app.routers.payroll_advanced import run_salary_increase_simulation
+        from app.schemas.payroll_advanced import WhatIfSimulationRequest
+
+        request = WhatIfSimulationRequest(
+            simulation_name="cut everything",
+            scenario_type="salary_increase",
+            salary_increase={"increase_type": "percentage", "increase_value": "-150", "apply_to": "all"},
+        )
+
+        with pytest.raises(HTTPException) as error:
+            await run_salary_increase_simulation(
+                request, db=MagicMock(), current_user=SimpleNamespace(id=uuid.uuid4()), entity_id=uuid.uuid4(),
+            )
+
+        assert error.value.status_code == 400
+        assert "cannot exceed 100%" in error.value.detail
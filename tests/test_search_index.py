@@ -0,0 +1,191 @@
+"""
+TekVwarho ProAudit - Search Index Tests
+
+Tests for the global search index: documents written and removed on
+flush, the ranked single-query search, the keyset backfill, and the search
+endpoint built on it.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.customer import Customer
+from app.models.inventory import InventoryItem
+from app.models.invoice import Invoice, InvoiceStatus
+from app.models.transaction import Transaction
+from app.services.search_index_service import (
+    document_changes,
+    prefix_query,
+    rebuild_search_documents,
+    search_statement,
+    upsert_statement,
+)
+
+ENTITY = uuid.uuid4()
+
+
+def _persistent(session, obj):
+    """Attach obj as if loaded from the database."""
+    make_transient_to_detached(obj)
+    session.add(obj)
+    return obj
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestFlushDocuments:
+    """Test the documents written for a flush."""
+
+    def test_new_rows_get_documents(self):
+        invoice = Invoice(
+            id=uuid.uuid4(), entity_id=ENTITY, invoice_number="INV-2026-0204",
+            total_amount=Decimal("15000"), status=InvoiceStatus.PENDING, notes="Diesel supply",
+        )
+        item = InventoryItem(
+            id=uuid.uuid4(), entity_id=ENTITY, sku="GEN-5KVA", name="Generator", quantity_on_hand=3,
+        )
+
+        documents, removed = document_changes([invoice, item], [], [])
+
+        assert removed == []
+        assert [(d["resource_type"], d["title"], d["subtitle"], d["search_text"]) for d in documents] == [
+            ("invoice", "INV-2026-0204", "₦15,000.00 - pending", "inv-2026-0204 diesel supply"),
+            ("inventory", "Generator", "SKU: GEN-5KVA - Qty: 3", "generator gen-5kva"),
+        ]
+        assert documents[0]["resource_id"] == invoice.id and documents[0]["entity_id"] == ENTITY
+
+    def test_only_searchable_changes_rewrite_documents(self):
+        session = Session()
+        renamed = _persistent(session, Customer(
+            id=uuid.uuid4(), entity_id=ENTITY, name="Adebayo", email="ade@example.com", phone=None,
+        ))
+        untouched = _persistent(session, Transaction(
+            id=uuid.uuid4(), entity_id=ENTITY, description="Fuel", amount=Decimal("100"),
+            transaction_date=date(2026, 10, 1), reference=None, wht_amount=Decimal("0"),
+        ))
+
+        renamed.name = "Adebayo Stores"
+        untouched.wht_amount = Decimal("5")
+        documents, _ = document_changes(session.new, session.dirty, session.deleted)
+
+        assert [(d["title"], d["search_text"]) for d in documents] == [
+            ("Adebayo Stores", "adebayo stores ade@example.com"),
+        ]
+
+    def test_deleted_rows_are_removed(self):
+        customer = Customer(id=uuid.uuid4(), entity_id=ENTITY, name="Gone")
+
+        documents, removed = document_changes([], [], [customer])
+
+        assert documents == [] and removed == [("customer", customer.id)]
+
+    def test_upsert_replaces_existing_documents(self):
+        documents, _ = document_changes([Customer(id=uuid.uuid4(), entity_id=ENTITY, name="Ada")], [], [])
+        sql = _sql(upsert_statement(documents))
+
+        assert "ON CONFLICT ON CONSTRAINT uq_search_documents_resource DO UPDATE" in sql
+        assert "search_text = excluded.search_text" in sql
+
+
+class TestSearchQuery:
+    """Test the ranked search statement."""
+
+    def test_prefix_query_matches_every_word(self):
+        assert prefix_query("INV 204") == "inv:* & 204:*"
+        assert prefix_query("--") is None
+
+    def test_one_statement_ranks_and_limits_per_type(self):
+        sql = _sql(search_statement(ENTITY, "Adebyo 50%", ["customer", "vendor"], 10))
+
+        assert sql.count("SELECT") == 3  # candidates, ranking, per-type cut
+        assert "search_documents.search_text %%> " in sql  # %> escaped for pyformat
+        assert "search_documents.search_vector @@ to_tsquery(" in sql
+        assert "search_documents.search_text LIKE " in sql and "ESCAPE" in sql
+        assert "word_similarity(" in sql and "ts_rank_cd(" in sql
+        assert "row_number() OVER (PARTITION BY anon_2.resource_type" in sql
+        params = search_statement(ENTITY, "Adebyo 50%", ["customer"], 10).compile(dialect=postgresql.dialect()).params
+        assert "%adebyo 50\\%%" in params.values()
+
+    def test_short_terms_skip_the_substring_match(self):
+        assert " LIKE " not in _sql(search_statement(ENTITY, "ab", ["customer"], 10))
+
+
+class TestBackfill:
+    """Test the keyset batch rebuild."""
+
+    async def test_rebuild_walks_sources_in_batches(self):
+        customers = [
+            SimpleNamespace(id=uuid.UUID(int=n), entity_id=ENTITY, name=f"Customer {n}", email=None, phone=None)
+            for n in (1, 2, 3)
+        ]
+        statements = []
+
+        class BatchSession:
+            commits = 0
+
+            async def execute(self, statement):
+                statements.append(statement)
+                result = MagicMock()
+                sql = _sql(statement)
+                if sql.startswith("SELECT customers.id") and "customers.id > " not in sql:
+                    result.all.return_value = customers[:2]
+                elif sql.startswith("SELECT customers.id") and len([s for s in statements if "FROM customers" in _sql(s)]) == 2:
+                    result.all.return_value = customers[2:]
+                else:
+                    result.all.return_value = []
+                return result
+
+            async def commit(self):
+                BatchSession.commits += 1
+
+        written = await rebuild_search_documents(BatchSession(), ENTITY, batch_size=2)
+
+        customer_selects = [_sql(s) for s in statements if _sql(s).startswith("SELECT customers.id")]
+        assert written == 3
+        assert len(customer_selects) == 3 and "customers.id > " in customer_selects[1]
+        assert any(_sql(s).startswith("DELETE FROM search_documents") for s in statements)
+
+
+class TestSearchEndpoint:
+    """Test that the endpoint maps ranked rows to results."""
+
+    async def test_results_and_counts_by_type(self, monkeypatch):
+        from app.routers import search_analytics
+
+        customer_id, invoice_id = uuid.uuid4(), uuid.uuid4()
+        calls = []
+
+        async def allow(*args):
+            return None
+
+        async def fake_search(db, entity_id, q, resource_types, limit):
+            calls.append((q, list(resource_types), limit))
+            return [
+                SimpleNamespace(resource_type="customer", resource_id=customer_id, title="Adebayo Stores",
+                                subtitle="ade@example.com", score=0.91234),
+                SimpleNamespace(resource_type="invoice", resource_id=invoice_id, title="INV-1",
+                                subtitle=None, score=0.5),
+            ]
+
+        monkeypatch.setattr(search_analytics, "verify_entity_access", allow)
+        monkeypatch.setattr(search_analytics, "search_documents", fake_search)
+
+        response = await search_analytics.global_search(
+            ENTITY, q="adebyo", types="customers,invoices,unknown", limit=20, current_user=None, db=None,
+        )
+
+        assert calls == [("adebyo", ["customer", "invoice"], 20)]
+        assert response.by_type == {"customers": 1, "invoices": 1}
+        assert response.results[0].url == f"/customers/{customer_id}"
+        assert response.results[0].relevance_score == 0.9123
@@ -0,0 +1,172 @@
+"""
+TekVwarho ProAudit - Sharded Task Fan-out Tests
+
+Tests for keyset id paging, shard idempotency, retries and summary merging
+of the shard-and-chord periodic jobs.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+import app.tasks.celery_tasks  # noqa: F401 - registers the sharded jobs
+from app.models.entity import BusinessEntity
+from app.tasks import fanout
+from app.tasks.fanout import (
+    SHARDED_JOBS,
+    ShardLedger,
+    iter_id_pages,
+    merge_summaries,
+    register_sharded_job,
+    run_shard_task,
+    shard_key,
+)
+
+
+class DictRedis:
+    """Minimal in-memory client for the get/set/delete calls ShardLedger makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    ledger = ShardLedger(DictRedis())
+    monkeypatch.setattr(fanout, "_ledger", ledger)
+    return ledger
+
+
+@pytest.fixture
+def counting_job():
+    calls = []
+
+    async def handler(ids, params):
+        calls.append(ids)
+        if params.get("fail"):
+            raise RuntimeError("database unavailable")
+        return {"processed": len(ids), "success": True}
+
+    register_sharded_job("test_counting_job", lambda params: None)(handler)
+    yield calls
+    SHARDED_JOBS.pop("test_counting_job", None)
+
+
+class TestIdPaging:
+    """Test the coordinator's keyset pagination."""
+
+    @pytest.mark.asyncio
+    async def test_pages_until_short_page(self):
+        ids = [uuid.UUID(int=n) for n in range(1, 6)]
+        pages = [ids[:2], ids[2:4], ids[4:]]
+        statements = []
+
+        async def execute(statement):
+            statements.append(statement)
+            result = MagicMock()
+            result.all.return_value = [(i,) for i in pages[len(statements) - 1]]
+            return result
+
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=execute)
+
+        statement = select(BusinessEntity.id).where(BusinessEntity.is_active == True)
+        collected = [page async for page in iter_id_pages(db, statement, page_size=2)]
+
+        assert collected == pages
+        assert len(statements) == 3
+        first = str(statements[0].compile(dialect=postgresql.dialect()))
+        later = str(statements[1].compile(dialect=postgresql.dialect()))
+        assert "ORDER BY business_entities.id" in first and "LIMIT" in first
+        assert "business_entities.id >" not in first
+        assert "business_entities.id >" in later
+
+    def test_registered_jobs_compile(self):
+        for name in ("fx_revaluation", "budget_variance_alert",
+                     "process_subscription_renewals", "check_trial_expirations"):
+            job = SHARDED_JOBS[name]
+            sql = str(job.id_query({}).compile(dialect=postgresql.dialect()))
+            assert sql.startswith("SELECT")
+        assert SHARDED_JOBS["process_subscription_renewals"].queue == "billing"
+
+
+class TestShardExecution:
+    """Test idempotency keys, retries and the chord callback merge."""
+
+    def test_shard_key_is_order_independent(self):
+        assert shard_key("job", "2026-10-18", ["b", "a"]) == shard_key("job", "2026-10-18", ["a", "b"])
+        assert shard_key("job", "2026-10-18", ["a"]) != shard_key("job", "2026-10-19", ["a"])
+
+    def test_completed_shard_is_not_rerun(self, ledger, counting_job):
+        args = ("test_counting_job", ["a", "b"], {}, "shard:test:1")
+
+        first = run_shard_task.apply(args=args).get()
+        second = run_shard_task.apply(args=args).get()
+
+        assert first == second == {"processed": 2, "success": True}
+        assert counting_job == [["a", "b"]]
+
+    def test_exhausted_retries_report_failure(self, ledger, counting_job):
+        result = run_shard_task.apply(
+            args=("test_counting_job", ["a"], {"fail": True}, "shard:test:2")
+        ).get()
+
+        assert result["shard_failed"] is True
+        assert result["failed_ids"] == ["a"]
+        assert len(counting_job) == run_shard_task.max_retries + 1
+        # Failed shards leave no claim or completion record behind
+        assert ledger.client.data == {}
+
+    def test_merge_summaries(self):
+        merged = merge_summaries([
+            {"success": True, "renewed": 3, "results": [1, 2]},
+            {"success": False, "renewed": 1, "results": [3]},
+            {"shard_failed": True, "failed_ids": ["x"], "error": "boom"},
+        ])
+
+        assert merged["renewed"] == 4
+        assert merged["success"] is False
+        assert merged["results"] == [1, 2, 3]
+        assert merged["shards"] == 3
+        assert merged["shards_failed"] == 1
+        assert merged["failed_ids"] == ["x"]
+
+    def test_dispatch_builds_one_subtask_per_page(self, monkeypatch, counting_job):
+        monkeypatch.setattr(fanout, "run_async", lambda coro: (coro.close(), [["a", "b"], ["c"]])[1])
+        submitted = {}
+
+        def fake_chord(header):
+            submitted["header"] = header
+
+            def apply(callback):
+                submitted["callback"] = callback
+                return MagicMock(id="chord-1")
+            return apply
+
+        monkeypatch.setattr(fanout, "chord", fake_chord)
+
+        summary = fanout.dispatch_sharded_job("test_counting_job", run_key="run-1")
+
+        assert summary["shards"] == 2 and summary["ids"] == 3
+        keys = [sig.args[3] for sig in submitted["header"]]
+        assert keys == [shard_key("test_counting_job", "run-1", ["a", "b"]),
+                        shard_key("test_counting_job", "run-1", ["c"])]
+        assert submitted["callback"].args == ("test_counting_job", "run-1")
@@ -0,0 +1,126 @@
+"""
+TekVwarho ProAudit - Compiled Tax Schedule Tests
+
+Tests that bisect evaluation over compiled band tables matches the band
+walk it replaces, and that schedules are shared per rule version.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import random
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from app.services.compliance_replay_service import ComplianceReplayEngine
+from app.services.tax_calculators.cit_service import CITCalculator, CompanySize
+from app.services.tax_calculators.paye_service import NIGERIA_2026_PAYE_BANDS, PAYECalculator
+from app.services.tax_calculators.tax_schedule import (
+    TaxSchedule,
+    bands_from_widths,
+    paye_schedule_for,
+)
+
+
+def _walk_bands(bands, income):
+    """The per-band loop the schedules replace."""
+    total = Decimal("0")
+    for lower, upper, rate in bands:
+        if income <= lower:
+            continue
+        in_band = income - lower if upper is None else min(income, upper) - lower
+        total += max(Decimal("0"), in_band) * (rate / 100)
+    return total
+
+
+class TestTaxSchedule:
+    """Test bisect evaluation against the band walk."""
+
+    def test_matches_band_walk(self):
+        bands = [(b.lower, b.upper, b.rate) for b in NIGERIA_2026_PAYE_BANDS]
+        schedule = TaxSchedule.compile(bands)
+        rng = random.Random(2026)
+        incomes = [Decimal(rng.randint(0, 10**10)) / 100 for _ in range(2000)]
+        incomes += [lower for lower, _, _ in bands] + [Decimal("-5"), Decimal("0.01")]
+
+        for income in incomes:
+            assert schedule.tax(income) == _walk_bands(bands, income), income
+
+    def test_gapped_and_unsorted_bands(self):
+        bands = [
+            (Decimal("1000"), None, Decimal("10")),
+            (Decimal("0"), Decimal("500"), Decimal("5")),
+        ]
+        schedule = TaxSchedule.compile(bands)
+
+        for income in ("0", "250", "500", "750", "1000", "1500"):
+            amount = Decimal(income)
+            assert schedule.tax(amount) == _walk_bands(sorted(bands, key=lambda b: b[0]), amount)
+
+    def test_breakdown_only_reaches_touched_bands(self):
+        calculator = PAYECalculator()
+
+        tax, breakdown = calculator.calculate_tax(Decimal("1000000"))
+        total_only, empty = calculator.calculate_tax(Decimal("1000000"), include_breakdown=False)
+
+        assert tax == total_only == Decimal("30000")
+        assert empty == []
+        assert [row["rate"] for row in breakdown] == ["0%", "15%"]
+        assert breakdown[1]["range"] == "₦800,000 - ₦2,400,000"
+
+    def test_bands_from_widths(self):
+        bands = bands_from_widths([
+            (Decimal("800000"), Decimal("0")),
+            (Decimal("2000000"), Decimal("15")),
+            (Decimal("999999999999"), Decimal("30")),
+        ])
+
+        assert bands == (
+            (Decimal("0"), Decimal("800000"), Decimal("0")),
+            (Decimal("800000"), Decimal("2800000"), Decimal("15")),
+            (Decimal("2800000"), None, Decimal("30")),
+        )
+
+
+class TestScheduleSharing:
+    """Test per-version caching and the consumers that share schedules."""
+
+    def test_dates_in_one_version_share_a_schedule(self):
+        assert paye_schedule_for(date(2026, 3, 1)) is paye_schedule_for(date(2026, 10, 18))
+        assert paye_schedule_for(date(2021, 5, 1)) is not paye_schedule_for(date(2026, 5, 1))
+        assert paye_schedule_for(date(2021, 5, 1)).rates[0] == Decimal("7")
+
+    def test_calculators_share_compiled_schedule(self):
+        assert PAYECalculator().schedule is PAYECalculator().schedule
+
+    def test_replay_uses_effective_schedule(self):
+        engine = ComplianceReplayEngine()
+
+        result = engine.replay_paye_calculation(
+            entity_id=uuid.uuid4(),
+            gross_annual_income=5_000_000,
+            calculation_date=date(2026, 10, 18),
+        )
+
+        # CRA 1.2M + pension 400K leaves 3.4M taxable
+        assert result["taxable_income"] == 3_400_000
+        assert result["annual_tax"] == 440_000
+        assert result["tax_bands_applied"][1] == {
+            "range": "NGN 800,000 - NGN 2,400,000",
+            "rate": "15%",
+            "tax_amount": 240_000.0,
+            "legal_reference": engine.get_paye_bands(date(2026, 10, 18))[1]["legal_reference"],
+        }
+
+    def test_cit_tiers(self):
+        cases = [
+            ("0", "0", CompanySize.SMALL),
+            ("25000000", "0", CompanySize.SMALL),
+            ("25000000.005", "20", CompanySize.MEDIUM),
+            ("100000000", "20", CompanySize.MEDIUM),
+            ("100000000.01", "30", CompanySize.LARGE),
+        ]
+        for turnover, rate, size in cases:
+            assert CITCalculator.get_cit_rate(float(turnover)) == Decimal(rate), turnover
+            assert CITCalculator.get_company_size(float(turnover)) == size, turnover
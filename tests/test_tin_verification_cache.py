@@ -0,0 +1,178 @@
+"""
+TekVwarho ProAudit - TIN Verification Cache Tests
+
+Tests for the TIN verification cache: LRU and freshness policy, the
+negative cache, the shared-table upsert, and bulk validation that only
+sends stale or unknown TINs upstream.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.tin_verification import TINVerification
+from app.services import nrs_service
+from app.services.nrs_service import LocalNRSServer, close_nrs_http_clients, get_nrs_client
+from app.services.tin_validation_service import TINValidationService, TINValidationStatus
+from app.services.tin_verification_cache import (
+    CachedTIN,
+    TINVerificationCache,
+    clear_tin_caches,
+    get_tin_cache,
+)
+
+
+class FakeSession:
+    """Async session stand-in recording statements; SELECTs answer with queued rows."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        rows = self.results.pop(0) if self.results and statement.is_select else []
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = rows
+        return result
+
+    async def commit(self):
+        self.commits += 1
+
+    @property
+    def upserts(self):
+        return [s for s in self.statements if s.is_insert]
+
+
+def _entry(tin, is_valid=True, age=timedelta(0)):
+    return CachedTIN(
+        tin=tin, is_valid=is_valid, status="ACTIVE" if is_valid else "NOT_FOUND",
+        checked_at=datetime.now(timezone.utc) - age,
+    )
+
+
+@pytest.fixture(autouse=True)
+async def fresh_caches():
+    clear_tin_caches()
+    yield
+    await close_nrs_http_clients()
+
+
+@pytest.fixture
+def server():
+    with LocalNRSServer(latency=0.01) as server:
+        yield server
+
+
+class TestCachePolicy:
+    """Test the LRU tier and the freshness policy."""
+
+    async def test_lru_evicts_least_recently_used(self):
+        cache = TINVerificationCache("nrs", max_entries=2)
+        await cache.put_many([_entry("1000000001"), _entry("1000000002")])
+        await cache.get_many(["1000000001"])  # touch: 0002 becomes the oldest
+
+        await cache.put_many([_entry("1000000003")])
+
+        assert set(await cache.get_many(["1000000001", "1000000002", "1000000003"])) == {"1000000001", "1000000003"}
+
+    async def test_invalid_answers_expire_sooner(self):
+        cache = TINVerificationCache("nrs", valid_ttl=timedelta(days=30), invalid_ttl=timedelta(hours=24))
+        await cache.put_many([
+            _entry("1000000001", age=timedelta(days=2)),
+            _entry("0100000002", is_valid=False, age=timedelta(hours=2)),
+            _entry("0100000003", is_valid=False, age=timedelta(days=2)),
+            _entry("1000000004", age=timedelta(days=31)),
+        ])
+
+        fresh = await cache.get_many(["1000000001", "0100000002", "0100000003", "1000000004"])
+
+        assert set(fresh) == {"1000000001", "0100000002"}
+        assert cache.get_stats()["local_entries"] == 2  # stale entries are dropped on read
+
+    async def test_table_is_read_once_for_lru_misses(self):
+        row = TINVerification(
+            source="nrs", tin="1000000002", is_valid=True, status="ACTIVE",
+            registered_name="Acme Ltd", details={}, checked_at=datetime.now(timezone.utc),
+        )
+        db = FakeSession([row])
+        cache = TINVerificationCache("nrs")
+        await cache.put_many([_entry("1000000001")])
+
+        first = await cache.get_many(["1000000001", "1000000002", "1000000003"], db)
+        second = await cache.get_many(["1000000002"], db)
+
+        assert set(first) == {"1000000001", "1000000002"} and first["1000000002"].registered_name == "Acme Ltd"
+        assert set(second) == {"1000000002"}
+        assert len(db.statements) == 1  # the table row warmed the LRU
+        assert cache.get_stats() == {
+            "source": "nrs", "local_entries": 2, "local_hits": 2, "db_hits": 1, "misses": 1, "hit_rate": 0.75,
+        }
+
+    async def test_upsert_refreshes_existing_rows(self):
+        db = FakeSession()
+        cache = TINVerificationCache("nrs")
+
+        await cache.put_many([_entry("1000000001")], db)
+        sql = str(db.upserts[0].compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT ON CONSTRAINT uq_tin_verifications_source_tin DO UPDATE" in sql
+        assert "checked_at = excluded.checked_at" in sql
+
+
+class TestBulkValidation:
+    """Test that bulk validation dedupes and only fetches what the cache lacks."""
+
+    async def test_nrs_bulk_sends_each_unknown_tin_once(self, server, monkeypatch):
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_limit_per_second", 1000.0)
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_burst", 100)
+        client = get_nrs_client(api_key="test", base_url=server.url)
+        tins = [f"12345678{n:02d}" for n in range(20)] + ["0123456789"]
+        db = FakeSession([])
+
+        results = await client.bulk_validate_tins(tins + ["1234-5678-00", "12345678 01", "bad"], db=db)
+
+        assert len(server.requests) == 21
+        assert [r.tin for r in results[-3:]] == ["1234-5678-00", "12345678 01", "bad"]
+        assert results[-3].registered_name == results[0].registered_name
+        assert not results[20].is_valid and results[20].status == "NOT_FOUND"
+        assert not results[-1].is_valid and "format" in results[-1].message
+        assert len(db.upserts) == 1 and db.commits == 0  # the caller commits
+
+        again = await client.bulk_validate_tins(tins[:10] + ["0123456789", "9876543210"])
+
+        assert len(server.requests) == 22  # only the new TIN went upstream
+        assert not again[10].is_valid  # served from the negative cache
+        assert again[0].raw_response["cached"] is True
+
+    async def test_upstream_errors_are_not_cached(self, monkeypatch):
+        monkeypatch.setattr(nrs_service.settings, "nrs_max_retries", 0)
+        client = get_nrs_client(api_key="test", base_url="http://127.0.0.1:9")
+
+        results = await client.bulk_validate_tins(["1234567890", "1234567891"])
+
+        assert not any(r.is_valid for r in results)
+        assert get_tin_cache("nrs").get_stats()["local_entries"] == 0
+
+    async def test_taxid_bulk_uses_cache_and_commits(self, server, monkeypatch):
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_limit_per_second", 1000.0)
+        monkeypatch.setattr(nrs_service.settings, "nrs_rate_burst", 100)
+        db = FakeSession([])
+        service = TINValidationService(db, api_key="test", base_url=server.url)
+
+        results = await service.bulk_validate_tins(["1234567890", "1234-567-890", "0123456789"])
+        single = await service.validate_tin("1234567890")
+
+        assert len(server.requests) == 2
+        assert [r.status for r in results] == [
+            TINValidationStatus.VALID, TINValidationStatus.VALID, TINValidationStatus.NOT_FOUND,
+        ]
+        assert results[1].tin == "1234-567-890"
+        assert single.is_valid and single.registered_name == results[0].registered_name
+        assert db.commits == 2
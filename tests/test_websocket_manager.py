@@ -0,0 +1,180 @@
+"""
+TekVwarho ProAudit - WebSocket Manager Tests
+
+Tests for non-blocking broadcast delivery: shared serialization,
+per-connection send queues, slow-consumer policies and delivery metrics.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from app.services import websocket_manager as ws_module
+from app.services.websocket_manager import (
+    ConnectionSendQueue,
+    OutboundFrame,
+    SlowConsumerPolicy,
+    WebSocketManager,
+)
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed_code = code
+
+
+@pytest.fixture
+def manager():
+    """Fresh (non-singleton) manager per test."""
+    original = WebSocketManager._instance
+    WebSocketManager._instance = None
+    mgr = WebSocketManager()
+    yield mgr
+    WebSocketManager._instance = original
+
+
+async def _drain(ms: float = 20):
+    await asyncio.sleep(ms / 1000)
+
+
+class TestConnectionSendQueue:
+    """Test bounded queue and slow-consumer policies."""
+
+    def test_drop_oldest_when_full(self):
+        queue = ConnectionSendQueue(2, SlowConsumerPolicy.DROP_OLDEST)
+        for i in range(3):
+            assert queue.put(OutboundFrame(payload=str(i), event_type="e"))
+        assert len(queue) == 2
+        assert queue.dropped == 1
+        assert [f.payload for f in queue._frames] == ["1", "2"]
+
+    def test_coalesce_replaces_same_key(self):
+        queue = ConnectionSendQueue(2, SlowConsumerPolicy.COALESCE)
+        queue.put(OutboundFrame(payload="fx-1", event_type="fx", coalesce_key="fx"))
+        queue.put(OutboundFrame(payload="sys", event_type="sys", coalesce_key="sys"))
+        queue.put(OutboundFrame(payload="fx-2", event_type="fx", coalesce_key="fx"))
+        assert [f.payload for f in queue._frames] == ["fx-2", "sys"]
+        assert queue.coalesced == 1
+        assert queue.dropped == 0
+
+    def test_disconnect_policy_rejects(self):
+        queue = ConnectionSendQueue(1, SlowConsumerPolicy.DISCONNECT)
+        assert queue.put(OutboundFrame(payload="a", event_type="e"))
+        assert not queue.put(OutboundFrame(payload="b", event_type="e"))
+
+
+class TestBroadcastDelivery:
+    """Test fan-out through per-connection writer tasks."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_serializes_once(self, manager):
+        tenant = uuid.uuid4()
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for ws in sockets:
+            await manager.connect(ws, uuid.uuid4(), tenant, channels=["system"])
+        await _drain()
+
+        with patch.object(ws_module.json, "dumps", wraps=json.dumps) as dumps:
+            await manager.broadcast_to_channel("system", "announcement", {"msg": "hi"})
+            assert dumps.call_count == 1
+        await _drain()
+
+        for ws in sockets:
+            message = json.loads(ws.sent[-1])
+            assert message["event"] == "announcement"
+            assert message["data"] == {"msg": "hi"}
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_broadcast(self, manager):
+        tenant = uuid.uuid4()
+        slow = FakeWebSocket(delay=0.5)
+        fast = FakeWebSocket()
+        await manager.connect(slow, uuid.uuid4(), tenant)
+        await manager.connect(fast, uuid.uuid4(), tenant)
+
+        started = time.monotonic()
+        await manager.send_to_tenant(tenant, "invoice_status", {"n": 1})
+        assert time.monotonic() - started < 0.05
+
+        await _drain(50)
+        assert any("invoice_status" in m for m in fast.sent)
+        assert not any("invoice_status" in m for m in slow.sent)
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_drops_slow_consumer(self, manager):
+        manager.send_queue_size = 2
+        manager.slow_consumer_policy = SlowConsumerPolicy.DISCONNECT
+        slow = FakeWebSocket(delay=1.0)
+        user = uuid.uuid4()
+        await manager.connect(slow, user, uuid.uuid4())
+
+        for i in range(5):
+            await manager.send_to_user(user, "tick", {"i": i})
+        await _drain()
+
+        assert manager.get_connection_count() == 0
+        assert slow.closed_code == 1013
+        assert manager.get_delivery_stats()["slow_consumer_disconnects"] == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_only_merges_explicit_keys(self, manager):
+        manager.send_queue_size = 2
+        manager.slow_consumer_policy = SlowConsumerPolicy.COALESCE
+        user = uuid.uuid4()
+        await manager.connect(FakeWebSocket(delay=1.0), user, uuid.uuid4())
+        await _drain()  # the writer is now stuck sending "connected"
+        queue = next(iter(manager._connections.values())).send_queue
+
+        for invoice in ("INV-1", "INV-2", "INV-3"):
+            await manager.send_to_user(user, "invoice_status", {"invoice": invoice})
+        assert (queue.coalesced, queue.dropped) == (0, 1)
+
+        for percent in (10, 20):
+            await manager.send_to_user(user, "ocr_batch_progress", {"percent": percent}, coalesce_key="batch")
+        assert queue.coalesced == 1
+        assert [json.loads(f.payload)["data"] for f in queue._frames] == [{"invoice": "INV-3"}, {"percent": 20}]
+
+    @pytest.mark.asyncio
+    async def test_delivery_stats(self, manager):
+        ws = FakeWebSocket()
+        user = uuid.uuid4()
+        await manager.connect(ws, user, uuid.uuid4())
+        await manager.send_to_user(user, "ping", {})
+        await _drain()
+
+        stats = manager.get_stats()["delivery"]
+        assert stats["messages_sent"] == 2  # connected + ping
+        assert stats["queue_depth_total"] == 0
+        assert stats["send_latency_ms_max"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_send_failure_disconnects(self, manager):
+        class BrokenWebSocket(FakeWebSocket):
+            async def send_text(self, text):
+                raise RuntimeError("socket closed")
+
+        await manager.connect(BrokenWebSocket(), uuid.uuid4(), uuid.uuid4())
+        await _drain()
+        assert manager.get_connection_count() == 0
@@ -0,0 +1,80 @@
+"""
+TekVwarho ProAudit - Celery Worker Runtime Tests
+
+Tests for the per-process persistent event loop used by Celery tasks.
+
+Author: TekVwarho ProAudit Team
+Date: October 2026
+"""
+
+import asyncio
+
+import pytest
+
+from app.tasks import worker_runtime
+from app.tasks.worker_runtime import WorkerRuntime, get_worker_runtime, run_async
+
+
+@pytest.fixture
+def runtime():
+    rt = WorkerRuntime().start()
+    yield rt
+    rt.stop()
+
+
+class TestWorkerRuntime:
+    """Test loop reuse, engine ownership and shutdown."""
+
+    def test_tasks_share_one_loop(self, runtime):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+        assert first is second is runtime.loop
+        assert runtime.tasks_run == 2
+
+    def test_session_factory_bound_to_worker_engine(self, runtime):
+        session = runtime.session_factory()
+        assert session.bind is runtime.engine
+        assert runtime.engine.pool.size() == worker_runtime.settings.celery_db_pool_size
+
+    def test_exceptions_propagate(self, runtime):
+        async def boom():
+            raise ValueError("task failed")
+
+        with pytest.raises(ValueError):
+            runtime.run(boom())
+        # Loop survives a failing task
+        assert runtime.run(asyncio.sleep(0, result="ok")) == "ok"
+
+    def test_timeout_cancels_coroutine(self, runtime):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        with pytest.raises(Exception):
+            runtime.run(slow(), timeout=0.05)
+        runtime.run(asyncio.sleep(0.05))
+        assert cancelled == [True]
+
+    def test_stop_closes_loop(self):
+        rt = WorkerRuntime().start()
+        rt.stop()
+        assert not rt.is_running
+        assert rt.loop.is_closed()
+
+    def test_module_run_async_reuses_runtime(self):
+        try:
+            async def loop_id():
+                return id(asyncio.get_running_loop())
+
+            assert run_async(loop_id()) == run_async(loop_id())
+            assert get_worker_runtime() is get_worker_runtime()
+        finally:
+            worker_runtime.shutdown_worker_runtime()